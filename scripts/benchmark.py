@@ -1408,6 +1408,120 @@ def benchmark_score_only(scorer: TelemetryScorer) -> Tuple[List[AttackChain], di
     return chains, art_results
 
 
+# ── Ingest Throughput ──────────────────────────────────────────────
+
+
+def _build_ingest_wal(wal_path: str, envelopes: int, events_per_envelope: int) -> int:
+    """Fill a WAL with synthetic process/flow/DNS observation envelopes."""
+    from amoskys.proto import universal_telemetry_pb2 as telemetry_pb2
+
+    conn = sqlite3.connect(wal_path)
+    conn.execute(
+        "CREATE TABLE IF NOT EXISTS wal (id INTEGER PRIMARY KEY AUTOINCREMENT, "
+        "idem TEXT UNIQUE, ts_ns INTEGER NOT NULL, bytes BLOB NOT NULL, checksum BLOB)"
+    )
+    base_ns = time.time_ns()
+    total = 0
+    for n in range(envelopes):
+        env = telemetry_pb2.UniversalEnvelope()
+        env.ts_ns = base_ns + n
+        env.idempotency_key = f"bench-{n}"
+        dt = env.device_telemetry
+        dt.device_id = f"bench-host-{n % 8}"
+        dt.device_type = "HOST"
+        dt.collection_agent = "macos_process"
+        dt.agent_version = "bench"
+        dt.timestamp_ns = base_ns + n
+        for i in range(events_per_envelope):
+            ev = dt.events.add()
+            ev.event_id = f"bench-{n}-{i}"
+            ev.event_type = "OBSERVATION"
+            ev.severity = "INFO"
+            ev.event_timestamp_ns = base_ns + n
+            ev.source_component = "bench"
+            kind = i % 3
+            if kind == 0:
+                ev.attributes["_domain"] = "process"
+                ev.attributes["pid"] = str(1000 + (n * events_per_envelope + i) % 5000)
+                ev.attributes["exe"] = "/usr/bin/bench"
+                ev.attributes["cmdline"] = f"bench --worker {n % 50}"
+                ev.attributes["username"] = "root"
+            elif kind == 1:
+                ev.attributes["_domain"] = "flow"
+                ev.attributes["src_ip"] = "10.0.0.5"
+                ev.attributes["dst_ip"] = f"203.0.113.{(n + i) % 250}"
+                ev.attributes["dst_port"] = "443"
+                ev.attributes["protocol"] = "TCP"
+                ev.attributes["state"] = "ESTABLISHED"
+            else:
+                ev.attributes["_domain"] = "dns"
+                ev.attributes["domain"] = f"host{(n + i) % 997}.example.com"
+                ev.attributes["query_type"] = "A"
+            total += 1
+        conn.execute(
+            "INSERT INTO wal (idem, ts_ns, bytes) VALUES (?, ?, ?)",
+            (env.idempotency_key, env.ts_ns, env.SerializeToString()),
+        )
+    conn.commit()
+    conn.close()
+    return total
+
+
+def benchmark_ingest(envelopes: int, events_per_envelope: int, batch_size: int) -> dict:
+    """Measure WALProcessor.process_batch throughput, per-row vs staged writes.
+
+    Each mode drains an identical synthetic WAL into a fresh store inside a
+    scratch directory (the processor's intel DBs use relative paths).
+    """
+    import tempfile
+
+    from amoskys.storage.wal_processor import WALProcessor
+
+    log.info("=" * 60)
+    log.info(
+        "MODE: INGEST (%d envelopes × %d events, batch=%d)",
+        envelopes,
+        events_per_envelope,
+        batch_size,
+    )
+    log.info("=" * 60)
+
+    results = {}
+    cwd = os.getcwd()
+    for label, bulk in (("per-row", False), ("staged", True)):
+        with tempfile.TemporaryDirectory(prefix="amoskys-ingest-") as tmp:
+            os.chdir(tmp)
+            try:
+                total = _build_ingest_wal("wal.db", envelopes, events_per_envelope)
+                proc = WALProcessor(
+                    wal_path="wal.db", store_path="telemetry.db", bulk_writes=bulk
+                )
+                start = time.perf_counter()
+                while proc.process_batch(batch_size=batch_size):
+                    pass
+                elapsed = time.perf_counter() - start
+                proc.store.close()
+            finally:
+                os.chdir(cwd)
+        results[label] = {
+            "seconds": round(elapsed, 3),
+            "envelopes_per_sec": round(envelopes / elapsed, 1),
+            "events_per_sec": round(total / elapsed, 1),
+        }
+        log.info(
+            "  %-8s %8.2fs  %10.1f events/sec  %8.1f envelopes/sec",
+            label,
+            elapsed,
+            total / elapsed,
+            envelopes / elapsed,
+        )
+
+    speedup = results["per-row"]["seconds"] / max(results["staged"]["seconds"], 1e-9)
+    results["speedup"] = round(speedup, 2)
+    log.info("  staged speedup: %.2fx", speedup)
+    return results
+
+
 # ── Entry Point ────────────────────────────────────────────────────
 
 
@@ -1423,11 +1537,12 @@ Examples:
   benchmark.py kali                           Run Kali attack chains
   benchmark.py full                           All modes in sequence
   benchmark.py score-only                     Score existing DB
+  benchmark.py ingest --events 20000          WAL ingest events/sec (per-row vs staged)
         """,
     )
     parser.add_argument(
         "mode",
-        choices=["local", "art", "kali", "full", "score-only"],
+        choices=["local", "art", "kali", "full", "score-only", "ingest"],
         help="Benchmark mode",
     )
     parser.add_argument(
@@ -1461,8 +1576,37 @@ Examples:
         action="store_true",
         help="Also output JSON scorecard",
     )
+    parser.add_argument(
+        "--events",
+        type=int,
+        default=20000,
+        help="Synthetic events for ingest mode",
+    )
+    parser.add_argument(
+        "--events-per-envelope",
+        type=int,
+        default=10,
+        help="Events packed into each WAL envelope for ingest mode",
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=500,
+        help="WALProcessor.process_batch size for ingest mode",
+    )
     args = parser.parse_args()
 
+    if args.mode == "ingest":
+        per_env = max(args.events_per_envelope, 1)
+        results = benchmark_ingest(
+            envelopes=max(args.events // per_env, 1),
+            events_per_envelope=per_env,
+            batch_size=args.batch_size,
+        )
+        if args.json:
+            print(json.dumps(results, indent=2))
+        return
+
     start_time = time.time()
 
     # Optionally clear DB
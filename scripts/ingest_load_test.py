@@ -0,0 +1,187 @@
+#!/usr/bin/env python3
+"""
+AMOSKYS Command Center — Ingest Load Test
+
+Registers N synthetic devices against a running command center and has
+each one POST telemetry batches to /api/v1/telemetry as fast as the
+server acks them, then reports sustained events/sec, latency percentiles
+and how often the server pushed back (202 queued / 503 queue full).
+
+Start a local instance first, e.g.:
+  CC_DB_PATH=/tmp/cc_load.db python server/command_center.py
+
+Usage:
+  python scripts/ingest_load_test.py
+  python scripts/ingest_load_test.py --url http://127.0.0.1:8443 \\
+      --devices 16 --batch 500 --duration 30 --mode columnar
+"""
+
+import argparse
+import json
+import random
+import sys
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Dict, List
+
+import requests
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from amoskys.shipper import COLUMNAR_CONTENT_TYPE, encode_columnar_batch  # noqa: E402
+
+CATEGORIES = ["process_spawn", "network_connection", "dns_query", "file_modified"]
+
+
+def _security_row(source_id: int, rng: random.Random) -> Dict:
+    ts_ns = time.time_ns()
+    return {
+        "id": source_id,
+        "timestamp_ns": ts_ns,
+        "timestamp_dt": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "event_category": rng.choice(CATEGORIES),
+        "event_action": "observed",
+        "risk_score": round(rng.random(), 3),
+        "confidence": 0.8,
+        "collection_agent": "load_test",
+        "description": f"synthetic event {source_id}",
+        "process_name": rng.choice(["bash", "python3", "curl", "sshd"]),
+        "remote_ip": f"10.{rng.randrange(256)}.{rng.randrange(256)}.{rng.randrange(256)}",
+    }
+
+
+class DeviceWorker(threading.Thread):
+    """One synthetic agent posting back-to-back batches."""
+
+    def __init__(self, url: str, batch: int, mode: str, deadline: float, seed: int):
+        super().__init__(daemon=True)
+        self.url = url
+        self.batch = batch
+        self.mode = mode
+        self.deadline = deadline
+        self.rng = random.Random(seed)
+        self.device_id = f"loadtest-{uuid.uuid4().hex[:12]}"
+        self.session = requests.Session()
+        self.next_id = 1
+        self.stored = 0
+        self.statuses: Dict[int, int] = {}
+        self.latencies: List[float] = []
+
+    def register(self):
+        resp = self.session.post(
+            f"{self.url}/api/v1/register",
+            json={"device_id": self.device_id, "hostname": self.device_id},
+            timeout=10,
+        )
+        resp.raise_for_status()
+        self.session.headers["Authorization"] = f"Bearer {resp.json()['api_key']}"
+
+    def _body(self, rows: List[Dict]):
+        if self.mode == "columnar":
+            columns = list(rows[0])
+            body = encode_columnar_batch(
+                self.device_id,
+                {
+                    "security_events": (
+                        columns,
+                        [tuple(r[c] for c in columns) for r in rows],
+                    )
+                },
+            )
+            headers = {
+                "Content-Type": COLUMNAR_CONTENT_TYPE,
+                "Content-Encoding": "gzip",
+            }
+            return body, headers
+        body = json.dumps({"table": "security_events", "events": rows})
+        return body, {"Content-Type": "application/json"}
+
+    def run(self):
+        while time.monotonic() < self.deadline:
+            rows = [
+                _security_row(self.next_id + i, self.rng) for i in range(self.batch)
+            ]
+            body, headers = self._body(rows)
+            started = time.monotonic()
+            try:
+                resp = self.session.post(
+                    f"{self.url}/api/v1/telemetry",
+                    data=body,
+                    headers=headers,
+                    timeout=60,
+                )
+                status = resp.status_code
+            except requests.RequestException:
+                status = 0
+            self.latencies.append(time.monotonic() - started)
+            self.statuses[status] = self.statuses.get(status, 0) + 1
+            if status == 200:
+                self.stored += resp.json().get("stored", 0)
+                self.next_id += self.batch
+            elif status == 503:
+                time.sleep(float(resp.headers.get("Retry-After", "1")))
+            # 202: re-send the same ids next round; the server dedups them
+
+
+def _percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Command center ingest load test")
+    parser.add_argument("--url", default="http://127.0.0.1:8443")
+    parser.add_argument("--devices", type=int, default=8)
+    parser.add_argument("--batch", type=int, default=500, help="Events per POST")
+    parser.add_argument("--duration", type=float, default=20.0, help="Seconds")
+    parser.add_argument("--mode", choices=["json", "columnar"], default="columnar")
+    args = parser.parse_args()
+
+    url = args.url.rstrip("/")
+    deadline = time.monotonic() + args.duration
+    workers = [
+        DeviceWorker(url, args.batch, args.mode, deadline, seed)
+        for seed in range(args.devices)
+    ]
+    for w in workers:
+        w.register()
+
+    print(
+        f"Load test: {args.devices} devices x {args.batch} events/batch, "
+        f"{args.mode}, {args.duration:.0f}s against {url}"
+    )
+    started = time.monotonic()
+    for w in workers:
+        w.start()
+    for w in workers:
+        w.join()
+    elapsed = time.monotonic() - started
+
+    stored = sum(w.stored for w in workers)
+    latencies = [lat for w in workers for lat in w.latencies]
+    statuses: Dict[int, int] = {}
+    for w in workers:
+        for status, count in w.statuses.items():
+            statuses[status] = statuses.get(status, 0) + count
+
+    print(f"  stored:      {stored:,} events in {elapsed:.1f}s")
+    print(f"  throughput:  {stored / elapsed:,.0f} events/sec sustained")
+    print(
+        f"  latency:     p50={_percentile(latencies, 50) * 1000:.0f}ms "
+        f"p99={_percentile(latencies, 99) * 1000:.0f}ms"
+    )
+    print(f"  responses:   {dict(sorted(statuses.items()))}")
+    try:
+        health = requests.get(f"{url}/health", timeout=5).json()
+        print(f"  queue depth: {health.get('ingest_queue', 'n/a')}")
+    except requests.RequestException:
+        pass
+
+
+if __name__ == "__main__":
+    main()
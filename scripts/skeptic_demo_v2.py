@@ -235,11 +235,12 @@ def main():
     header(2, TOTAL_STEPS, "Segment WAL & seal Merkle checkpoints")
 
     seg_mgr = SegmentManager(wal_path, segment_size=SEGMENT_SIZE)
-    segments = seg_mgr.scan_segments()
+    seg_mgr.refresh()
+    segments = seg_mgr.sealed_segments()
     ok(f"WAL partitioned into {len(segments)} segments")
 
     signer = CheckpointSigner(manifest_path=manifest_path, signing_key_path=sk_path)
-    checkpoints = signer.seal_all(segments)
+    checkpoints = signer.seal_pending(seg_mgr)
     ok(f"{len(checkpoints)} checkpoints sealed with Ed25519")
 
     # Compute checkpoint hashes for evidence chain
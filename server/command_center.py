@@ -14,10 +14,14 @@ Architecture:
 Endpoints:
     POST /api/v1/register     — Device registration + API key issuance
     POST /api/v1/telemetry    — Receive batched events from agents
+                                (JSON per table, or gzip'd columnar multi-table;
+                                written by a single ingest writer thread)
     GET  /api/v1/devices      — List all registered devices
     GET  /api/v1/devices/:id  — Device detail + recent events
     GET  /api/v1/events       — Query events across all devices
     GET  /api/v1/fleet/status — Fleet-wide posture summary
+    GET  /api/v1/sync/high-water — Per-table cursors for delta fleet sync
+    GET  /api/v1/sync/<table> — Rows newer than a cursor (paged, gzip)
     GET  /dashboard/          — Fleet dashboard UI
 
 Usage:
@@ -33,18 +37,23 @@ Usage:
 
 from __future__ import annotations
 
+import functools
+import gzip
 import hashlib
 import json
 import logging
 import os
+import queue
 import secrets
 import sqlite3
+import threading
 import time
+import zlib
 from datetime import datetime, timezone
 from functools import wraps
 from pathlib import Path
 
-from flask import Flask, g, jsonify, render_template_string, request
+from flask import Flask, Response, g, jsonify, render_template_string, request
 
 # ── Logging ────────────────────────────────────────────────────────
 
@@ -144,7 +153,6 @@ CREATE INDEX IF NOT EXISTS idx_se_device ON security_events(device_id);
 CREATE INDEX IF NOT EXISTS idx_se_ts ON security_events(timestamp_ns);
 CREATE INDEX IF NOT EXISTS idx_se_risk ON security_events(risk_score);
 CREATE INDEX IF NOT EXISTS idx_se_category ON security_events(event_category);
-CREATE INDEX IF NOT EXISTS idx_se_dedup ON security_events(source_id, device_id);
 
 -- Process events (from all devices)
 CREATE TABLE IF NOT EXISTS process_events (
@@ -173,7 +181,6 @@ CREATE TABLE IF NOT EXISTS process_events (
 );
 CREATE INDEX IF NOT EXISTS idx_pe_device ON process_events(device_id);
 CREATE INDEX IF NOT EXISTS idx_pe_ts ON process_events(timestamp_ns);
-CREATE INDEX IF NOT EXISTS idx_pe_dedup ON process_events(source_id, device_id);
 
 -- Network flow events (from all devices)
 CREATE TABLE IF NOT EXISTS flow_events (
@@ -205,7 +212,6 @@ CREATE TABLE IF NOT EXISTS flow_events (
 );
 CREATE INDEX IF NOT EXISTS idx_fe_device ON flow_events(device_id);
 CREATE INDEX IF NOT EXISTS idx_fe_ts ON flow_events(timestamp_ns);
-CREATE INDEX IF NOT EXISTS idx_fe_dedup ON flow_events(source_id, device_id);
 
 -- DNS events (from all devices)
 CREATE TABLE IF NOT EXISTS dns_events (
@@ -230,7 +236,6 @@ CREATE TABLE IF NOT EXISTS dns_events (
     received_at REAL NOT NULL
 );
 CREATE INDEX IF NOT EXISTS idx_de_device ON dns_events(device_id);
-CREATE INDEX IF NOT EXISTS idx_de_dedup ON dns_events(source_id, device_id);
 CREATE INDEX IF NOT EXISTS idx_de_ts ON dns_events(timestamp_ns);
 
 -- Persistence events (from all devices)
@@ -251,7 +256,6 @@ CREATE TABLE IF NOT EXISTS persistence_events (
     received_at REAL NOT NULL
 );
 CREATE INDEX IF NOT EXISTS idx_pers_device ON persistence_events(device_id);
-CREATE INDEX IF NOT EXISTS idx_pers_dedup ON persistence_events(source_id, device_id);
 CREATE INDEX IF NOT EXISTS idx_pers_ts ON persistence_events(timestamp_ns);
 
 -- FIM events (from all devices)
@@ -276,7 +280,6 @@ CREATE TABLE IF NOT EXISTS fim_events (
     received_at REAL NOT NULL
 );
 CREATE INDEX IF NOT EXISTS idx_fim_device ON fim_events(device_id);
-CREATE INDEX IF NOT EXISTS idx_fim_dedup ON fim_events(source_id, device_id);
 CREATE INDEX IF NOT EXISTS idx_fim_ts ON fim_events(timestamp_ns);
 
 -- Audit events (from all devices)
@@ -302,7 +305,6 @@ CREATE TABLE IF NOT EXISTS audit_events (
     received_at REAL NOT NULL
 );
 CREATE INDEX IF NOT EXISTS idx_audit_device ON audit_events(device_id);
-CREATE INDEX IF NOT EXISTS idx_audit_dedup ON audit_events(source_id, device_id);
 CREATE INDEX IF NOT EXISTS idx_audit_ts ON audit_events(timestamp_ns);
 
 -- Observation events (from all devices)
@@ -343,7 +345,6 @@ CREATE TABLE IF NOT EXISTS peripheral_events (
     received_at REAL NOT NULL
 );
 CREATE INDEX IF NOT EXISTS idx_periph_device ON peripheral_events(device_id);
-CREATE INDEX IF NOT EXISTS idx_periph_dedup ON peripheral_events(source_id, device_id);
 CREATE INDEX IF NOT EXISTS idx_periph_ts ON peripheral_events(timestamp_ns);
 
 -- Fleet-level incidents (cross-device correlation)
@@ -442,6 +443,12 @@ def init_db():
                 db.execute(f"ALTER TABLE {m_table} ADD COLUMN {col} {ctype}")
             except sqlite3.OperationalError:
                 pass  # column already exists
+    _ensure_dedup_indexes(db)
+    # Keyset index for the delta-sync "rescored" stream (last_scored, id)
+    db.execute(
+        "CREATE INDEX IF NOT EXISTS idx_se_scored "
+        "ON security_events(last_scored, id)"
+    )
     # Command queue table (MCP server → device agent)
     db.executescript(
         """
@@ -471,6 +478,227 @@ def init_db():
     logger.info("Fleet database initialized: %s", DB_PATH)
 
 
+def _ensure_dedup_indexes(db: sqlite3.Connection):
+    """Create the UNIQUE(device_id, source_id) index ingest dedups on.
+
+    Replaces the old non-unique *_dedup indexes. Rows duplicated before the
+    constraint existed are collapsed to the oldest copy first, otherwise
+    the CREATE would fail. Idempotent; only does work once per table.
+    """
+    for table in ALLOWED_TABLES:
+        index = f"uq_{table}_source"
+        exists = db.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'index' AND name = ?",
+            (index,),
+        ).fetchone()
+        if exists:
+            continue
+        try:
+            removed = db.execute(
+                f"DELETE FROM {table} WHERE source_id IS NOT NULL AND id NOT IN "
+                f"(SELECT MIN(id) FROM {table} WHERE source_id IS NOT NULL "
+                f"GROUP BY device_id, source_id)"
+            ).rowcount
+            db.execute(f"CREATE UNIQUE INDEX {index} ON {table}(device_id, source_id)")
+            for (old,) in db.execute(
+                "SELECT name FROM sqlite_master WHERE type = 'index' "
+                "AND tbl_name = ? AND name LIKE 'idx_%_dedup'",
+                (table,),
+            ).fetchall():
+                db.execute(f"DROP INDEX IF EXISTS {old}")
+            db.commit()
+            if removed:
+                logger.info("Dedup index %s: removed %d duplicate rows", index, removed)
+        except sqlite3.Error as e:
+            db.rollback()
+            logger.error("Cannot create dedup index %s: %s", index, e)
+
+
+# ── Columnar batch decoding ────────────────────────────────────────
+#
+# The shipper's pipelined mode posts several tables in one request:
+#
+#   Content-Type: application/vnd.amoskys.columnar+json
+#   Content-Encoding: gzip
+#   {"v": 1, "device_id": "...",
+#    "tables": {"flow_events": {"count": N, "columns": {"id": [...], ...}}}}
+#
+# Each column is an array of N values. Decoded rows go through the same
+# whitelist/dedup insert path as the per-table JSON format.
+
+COLUMNAR_CONTENT_TYPE = "application/vnd.amoskys.columnar+json"
+COLUMNAR_VERSION = 1
+MAX_DECODED_BYTES = int(os.getenv("CC_MAX_DECODED_BYTES", str(64 * 1024 * 1024)))
+
+
+def _decode_columnar(raw: bytes, content_encoding: str) -> dict[str, list[dict]]:
+    """Decode a columnar batch into {table: [event dict, ...]}.
+
+    Raises ValueError on any malformed, oversized, or unsupported body.
+    """
+    if content_encoding == "gzip":
+        inflater = zlib.decompressobj(16 + zlib.MAX_WBITS)
+        try:
+            raw = inflater.decompress(raw, MAX_DECODED_BYTES)
+        except zlib.error as e:
+            raise ValueError(f"bad gzip body: {e}") from e
+        if inflater.unconsumed_tail:
+            raise ValueError("decoded batch exceeds size limit")
+    elif content_encoding not in ("", "identity"):
+        raise ValueError(f"unsupported Content-Encoding: {content_encoding}")
+
+    try:
+        body = json.loads(raw)
+    except (UnicodeDecodeError, json.JSONDecodeError) as e:
+        raise ValueError(f"bad JSON body: {e}") from e
+    if not isinstance(body, dict) or body.get("v") != COLUMNAR_VERSION:
+        raise ValueError("unsupported columnar batch version")
+
+    tables = body.get("tables")
+    if not isinstance(tables, dict):
+        raise ValueError("tables must be an object")
+
+    decoded: dict[str, list[dict]] = {}
+    for table, block in tables.items():
+        columns = block.get("columns") if isinstance(block, dict) else None
+        count = block.get("count") if isinstance(block, dict) else None
+        if not isinstance(columns, dict) or not isinstance(count, int):
+            raise ValueError(f"{table}: columns/count missing")
+        names = list(columns)
+        if any(
+            not isinstance(columns[n], list) or len(columns[n]) != count for n in names
+        ):
+            raise ValueError(f"{table}: column lengths do not match count")
+        decoded[table] = [
+            dict(zip(names, values)) for values in zip(*(columns[n] for n in names))
+        ]
+    return decoded
+
+
+# ── Ingest Writer ──────────────────────────────────────────────────
+#
+# HTTP workers never write telemetry themselves. receive_telemetry decodes
+# and validates the batch, hands it to the single writer thread through a
+# bounded queue and waits (up to INGEST_WAIT_S) for its commit:
+#
+#   200 — committed; per-table stored/failed counts
+#   202 — still queued when the wait expired; the shipper re-sends and the
+#         UNIQUE(device_id, source_id) index drops whatever already landed
+#   503 — queue full (Retry-After) or the write transaction failed
+#
+# The writer drains up to INGEST_GROUP_MAX queued batches per transaction
+# (group commit), so the SQLite writer lock is taken once per group.
+
+INGEST_QUEUE_MAX = int(os.getenv("CC_INGEST_QUEUE", "256"))  # Queued batches
+INGEST_WAIT_S = float(os.getenv("CC_INGEST_WAIT_S", "10"))
+INGEST_GROUP_MAX = 32  # Batches committed per write transaction
+INGEST_RETRY_AFTER_S = 2
+LAST_SEEN_REFRESH_S = 30  # Auth refreshes devices.last_seen at most this often
+
+
+class IngestJob:
+    """One request's decoded batches, completed by the writer thread."""
+
+    __slots__ = ("batches", "device_id", "received_at", "done", "results", "error")
+
+    def __init__(self, batches: dict[str, list], device_id: str, received_at: float):
+        self.batches = batches
+        self.device_id = device_id
+        self.received_at = received_at
+        self.done = threading.Event()
+        self.results: dict[str, tuple[int, int]] = {}
+        self.error = ""
+
+
+class IngestWriter:
+    """Single writer thread draining a bounded queue of IngestJobs."""
+
+    def __init__(self, maxsize: int = INGEST_QUEUE_MAX):
+        self._queue: queue.Queue[IngestJob] = queue.Queue(maxsize=maxsize)
+        self._thread: threading.Thread | None = None
+        self._lock = threading.Lock()
+
+    @property
+    def depth(self) -> int:
+        return self._queue.qsize()
+
+    def submit(self, job: IngestJob) -> bool:
+        """Queue *job*; False when the queue is full (caller sheds load)."""
+        self._ensure_started()
+        try:
+            self._queue.put_nowait(job)
+        except queue.Full:
+            return False
+        return True
+
+    def _ensure_started(self):
+        # Started lazily so a pre-forking server (gunicorn --preload) gets
+        # one writer per worker process, not a dead thread from the parent.
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(
+                    target=self._run, name="ingest-writer", daemon=True
+                )
+                self._thread.start()
+
+    def _connect(self) -> sqlite3.Connection:
+        Path(DB_PATH).parent.mkdir(parents=True, exist_ok=True)
+        db = sqlite3.connect(DB_PATH, timeout=30.0, cached_statements=512)
+        db.row_factory = sqlite3.Row
+        db.execute("PRAGMA journal_mode=WAL")
+        db.execute("PRAGMA synchronous=NORMAL")
+        _ensure_dedup_indexes(db)
+        return db
+
+    def _run(self):
+        db = self._connect()
+        while True:
+            jobs = [self._queue.get()]
+            while len(jobs) < INGEST_GROUP_MAX:
+                try:
+                    jobs.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            self._write(db, jobs)
+
+    def _write(self, db: sqlite3.Connection, jobs: list[IngestJob]):
+        orgs: dict[str, str | None] = {}
+        try:
+            for job in jobs:
+                if job.device_id not in orgs:
+                    row = db.execute(
+                        "SELECT org_id FROM devices WHERE device_id = ?",
+                        (job.device_id,),
+                    ).fetchone()
+                    orgs[job.device_id] = row["org_id"] if row else None
+                job.results = {
+                    table: _store_events(
+                        db,
+                        table,
+                        events,
+                        job.device_id,
+                        orgs[job.device_id],
+                        job.received_at,
+                    )
+                    for table, events in job.batches.items()
+                    if events
+                }
+            db.commit()
+        except sqlite3.Error as e:
+            db.rollback()
+            logger.error("Ingest write of %d batch(es) failed: %s", len(jobs), e)
+            for job in jobs:
+                job.results = {}
+                job.error = str(e)
+        for job in jobs:
+            job.done.set()
+
+
+_ingest_writer = IngestWriter()
+
+
 # ── Auth ───────────────────────────────────────────────────────────
 
 
@@ -493,19 +721,25 @@ def require_device_auth(f):
 
         # Verify API key matches device
         row = db.execute(
-            "SELECT device_id FROM devices WHERE api_key = ?", (api_key,)
+            "SELECT device_id, last_seen, status FROM devices WHERE api_key = ?",
+            (api_key,),
         ).fetchone()
 
         if not row:
             logger.warning("AUTH_FAIL: key=%s (len=%d)", api_key, len(api_key))
             return jsonify({"error": "Invalid API key"}), 403
 
-        # Update last_seen
-        db.execute(
-            "UPDATE devices SET last_seen = ?, status = 'online' WHERE api_key = ?",
-            (time.time(), api_key),
-        )
-        db.commit()
+        # Update last_seen — at most every LAST_SEEN_REFRESH_S per device, so
+        # a busy shipper does not add a write transaction to every request.
+        now = time.time()
+        stale = now - (row["last_seen"] or 0) > LAST_SEEN_REFRESH_S
+        if stale or row["status"] != "online":
+            db.execute(
+                "UPDATE devices SET last_seen = ?, status = 'online' "
+                "WHERE api_key = ?",
+                (now, api_key),
+            )
+            db.commit()
 
         g.authenticated_device = row["device_id"]
         return f(*args, **kwargs)
@@ -710,96 +944,144 @@ def receive_telemetry():
         "events": [...],
         "batch_size": N
     }
+
+    or a columnar multi-table batch (COLUMNAR_CONTENT_TYPE, optionally
+    gzip Content-Encoding), answered with per-table counts under "tables".
     """
-    data = request.get_json()
-    if not data:
-        return jsonify({"error": "JSON body required"}), 400
+    columnar = request.mimetype == COLUMNAR_CONTENT_TYPE
+    if columnar:
+        try:
+            batches = _decode_columnar(
+                request.get_data(),
+                request.headers.get("Content-Encoding", "").strip().lower(),
+            )
+        except ValueError as e:
+            return jsonify({"error": f"Bad columnar batch: {e}"}), 400
+        device_id = g.authenticated_device
+    else:
+        data = request.get_json()
+        if not data:
+            return jsonify({"error": "JSON body required"}), 400
+        batches = {data.get("table", ""): data.get("events", [])}
+        # Use the authenticated device_id (from API key lookup) — not what
+        # the shipper claims.  This handles device ID changes after reinstall.
+        device_id = g.authenticated_device or data.get("device_id", "")
+
+    for table in batches:
+        if table not in ALLOWED_TABLES:
+            return jsonify({"error": f"Unknown table: {table}"}), 400
+
+    if not any(batches.values()):
+        return jsonify({"status": "ok", "stored": 0})
 
-    table = data.get("table", "")
-    events = data.get("events", [])
-    # Use the authenticated device_id (from API key lookup) — not what
-    # the shipper claims.  This handles device ID changes after reinstall.
-    device_id = g.authenticated_device or data.get("device_id", "")
+    job = IngestJob(batches, device_id, time.time())
+    if not _ingest_writer.submit(job):
+        logger.warning("Ingest queue full — shedding batch from %s", device_id[:8])
+        response = jsonify({"error": "Ingest queue full"})
+        response.headers["Retry-After"] = str(INGEST_RETRY_AFTER_S)
+        return response, 503
+    if not job.done.wait(INGEST_WAIT_S):
+        return jsonify({"status": "queued"}), 202
+    if job.error:
+        response = jsonify({"error": "Ingest write failed"})
+        response.headers["Retry-After"] = str(INGEST_RETRY_AFTER_S)
+        return response, 503
+
+    results = job.results
+    stored = sum(r[0] for r in results.values())
+    failed = sum(r[1] for r in results.values())
+    response = {"status": "ok", "stored": stored, "failed": failed}
+    if columnar:
+        response["tables"] = {
+            table: {"stored": r[0], "failed": r[1]} for table, r in results.items()
+        }
+    return jsonify(response)
 
-    if table not in ALLOWED_TABLES:
-        return jsonify({"error": f"Unknown table: {table}"}), 400
 
-    if not events:
-        return jsonify({"status": "ok", "stored": 0})
+@functools.lru_cache(maxsize=512)
+def _insert_sql(table: str, cols: tuple[str, ...]) -> str:
+    """INSERT for one column signature; identical text reuses the prepared statement."""
+    return (
+        f"INSERT INTO {table} ({', '.join(cols)}) "
+        f"VALUES ({', '.join('?' * len(cols))}) "
+        f"ON CONFLICT(device_id, source_id) DO NOTHING"
+    )
 
-    db = get_db()
-    now = time.time()
+
+def _store_events(
+    db: sqlite3.Connection,
+    table: str,
+    events: list,
+    device_id: str,
+    org_id: str | None,
+    now: float,
+) -> tuple[int, int]:
+    """Insert one table's events; returns (stored, failed). Caller commits.
+
+    Events are grouped by column signature and each group goes through one
+    executemany. Duplicates (same device_id + source_id) are dropped by the
+    unique index and count as neither stored nor failed. If a group fails,
+    it is rolled back to its savepoint and replayed row by row so only the
+    bad rows are dropped.
+    """
     stored = 0
     failed = 0
-
-    # Look up org_id for this device (cached per request)
-    device_row = db.execute(
-        "SELECT org_id FROM devices WHERE device_id = ?", (device_id,)
-    ).fetchone()
-    org_id = device_row["org_id"] if device_row else None
-
-    # Pre-fetch existing source_ids for this device in one query (batch dedup)
-    # Instead of N individual SELECT queries, do one set lookup.
-    source_ids = [e.get("id") for e in events if e.get("id") is not None]
-    existing_ids: set = set()
-    if source_ids:
-        # Query in batches of 500 to avoid SQLite variable limit
-        for i in range(0, len(source_ids), 500):
-            batch = source_ids[i : i + 500]
-            placeholders = ",".join("?" * len(batch))
-            try:
-                rows = db.execute(
-                    f"SELECT source_id FROM {table} WHERE device_id = ? "
-                    f"AND source_id IN ({placeholders})",
-                    [device_id] + batch,
-                ).fetchall()
-                existing_ids.update(r[0] for r in rows)
-            except Exception:
-                pass
-
     allowed_cols = ALLOWED_TABLES[table]
 
+    # Server-controlled columns go last in every row (prevent spoofing)
+    forced = ("source_id", "device_id", "org_id", "received_at")
+    columns_for: dict[tuple, tuple[str, ...]] = {}  # key order → event columns
+    groups: dict[tuple[str, ...], list[tuple]] = {}
     for event in events:
-        # Defined up-front so the failure handler can always reference it,
-        # even if the exception fires before the pop below.
-        source_id = event.get("id") if isinstance(event, dict) else None
-        try:
-            # Force device_id and org_id from server context (prevent spoofing)
-            event["device_id"] = device_id
-            event["org_id"] = org_id
-            event["received_at"] = now
-            source_id = event.pop("id", None)
-            event["source_id"] = source_id
-
-            # Batch dedup: skip if source_id already exists
-            if source_id is not None and source_id in existing_ids:
-                continue
-
-            # Build INSERT dynamically from event keys
-            cols = [k for k in event.keys() if k in allowed_cols]
-            vals = [event[k] for k in cols]
-            placeholders = ", ".join(["?"] * len(cols))
-            col_names = ", ".join(cols)
-
-            db.execute(
-                f"INSERT INTO {table} ({col_names}) VALUES ({placeholders})",
-                vals,
-            )
-            stored += 1
-        except Exception as e:
-            # A clean log must mean healthy, not blind: surface per-event
-            # store failures so silently-dropped data is visible.
+        if not isinstance(event, dict):
             failed += 1
             logger.error(
-                "INGEST_DROP: table=%s device=%s source_id=%s err=%s: %s",
+                "INGEST_DROP: table=%s device=%s source_id=None err=TypeError: "
+                "event is %s",
                 table,
                 device_id[:8],
-                source_id,
-                type(e).__name__,
-                e,
+                type(event).__name__,
             )
+            continue
+        keys = tuple(event)
+        cols = columns_for.get(keys)
+        if cols is None:
+            cols = columns_for[keys] = tuple(
+                k for k in keys if k in allowed_cols and k not in forced
+            )
+        groups.setdefault(cols, []).append(
+            (*[event[k] for k in cols], event.get("id"), device_id, org_id, now)
+        )
 
-    db.commit()
+    if groups and not db.in_transaction:
+        db.execute("BEGIN")
+    for cols, rows in groups.items():
+        sql = _insert_sql(table, cols + forced)
+        db.execute("SAVEPOINT ingest_group")
+        try:
+            stored += db.executemany(sql, rows).rowcount
+            db.execute("RELEASE ingest_group")
+            continue
+        except Exception:
+            db.execute("ROLLBACK TO ingest_group")
+            db.execute("RELEASE ingest_group")
+
+        source_idx = len(cols)
+        for row in rows:
+            try:
+                stored += db.execute(sql, row).rowcount
+            except Exception as e:
+                # A clean log must mean healthy, not blind: surface per-event
+                # store failures so silently-dropped data is visible.
+                failed += 1
+                logger.error(
+                    "INGEST_DROP: table=%s device=%s source_id=%s err=%s: %s",
+                    table,
+                    device_id[:8],
+                    row[source_idx],
+                    type(e).__name__,
+                    e,
+                )
 
     if failed > 0:
         # Pipeline-health summary — only when data was actually dropped.
@@ -820,7 +1102,7 @@ def receive_telemetry():
         device_id[:8],
     )
 
-    return jsonify({"status": "ok", "stored": stored, "failed": failed})
+    return stored, failed
 
 
 @app.route("/api/v1/devices/<device_id>", methods=["DELETE"])
@@ -1769,9 +2051,191 @@ def bulk_export():
     return jsonify(result)
 
 
+# ── Delta Sync ─────────────────────────────────────────────────────
+#
+# Incremental replacement for bulk-export. The caller keeps a cursor per
+# table and pulls only rows past it:
+#
+#   GET /api/v1/sync/high-water          → {"tables": {t: {"max_id", ...}}}
+#   GET /api/v1/sync/<table>?after=<id>  → {"rows", "cursor", "more"}
+#
+# Rows are paged in id order (the PK, so each page is a range scan) and
+# limited to the caller's time window. security_events also has a
+# "scored" stream keyed on (last_scored, id) so rows re-scored after they
+# were first synced are re-sent. Devices are paged by last_seen.
+
+SYNC_TABLES = (
+    "security_events",
+    "process_events",
+    "flow_events",
+    "dns_events",
+    "persistence_events",
+    "audit_events",
+    "fim_events",
+    "peripheral_events",
+    "observation_events",
+)
+SYNC_PAGE_SIZE = 5000
+SYNC_MAX_PAGE_SIZE = 20_000
+SYNC_MAX_HOURS = 72
+
+
+def _sync_ts_col(table: str) -> str:
+    return "event_timestamp_ns" if table == "observation_events" else "timestamp_ns"
+
+
+def _sync_response(payload: dict) -> Response:
+    """JSON response, gzip'd when the caller accepts it."""
+    body = json.dumps(payload, separators=(",", ":"), default=str).encode("utf-8")
+    headers = {"Content-Type": "application/json"}
+    if "gzip" in request.headers.get("Accept-Encoding", "").lower():
+        body = gzip.compress(body, compresslevel=6)
+        headers["Content-Encoding"] = "gzip"
+        headers["Vary"] = "Accept-Encoding"
+    return Response(body, status=200, headers=headers)
+
+
+@app.route("/api/v1/sync/high-water", methods=["GET"])
+def sync_high_water():
+    """Per-table high-water marks so callers skip tables with nothing new."""
+    db = get_db()
+    tables = {}
+    for table in SYNC_TABLES:
+        try:
+            row = db.execute(f"SELECT MAX(id) FROM {table}").fetchone()
+            tables[table] = {"max_id": row[0] or 0}
+        except sqlite3.Error:
+            continue
+    try:
+        row = db.execute("SELECT MAX(last_scored) FROM security_events").fetchone()
+        tables["security_events"]["max_scored"] = row[0]
+    except (sqlite3.Error, KeyError):
+        pass
+    try:
+        row = db.execute("SELECT MAX(last_seen) FROM devices").fetchone()
+        tables["devices"] = {"max_seen": row[0] or 0}
+    except sqlite3.Error:
+        pass
+    return _sync_response({"tables": tables, "server_time": time.time()})
+
+
+@app.route("/api/v1/sync/<table>", methods=["GET"])
+def sync_table(table):
+    """Page of rows past the caller's cursor.
+
+    Query params:
+        after:      last id already held (default 0 = start of window)
+        stream:     "scored" (security_events only) pages by
+                    (last_scored, id) from after_scored/after instead
+        after_scored: last_scored half of the scored cursor
+        hours:      window; rows older than this are never sent (default 6)
+        limit:      page size (default 5000, max 20000)
+        device_id:  optional device filter
+
+    Response: {"table", "rows", "cursor": {...}, "more": bool}
+    """
+    if table != "devices" and table not in SYNC_TABLES:
+        return jsonify({"error": f"unknown table: {table}"}), 404
+
+    db = get_db()
+    after = request.args.get("after", 0, type=int)
+    hours = min(request.args.get("hours", 6, type=int), SYNC_MAX_HOURS)
+    limit = max(
+        1, min(request.args.get("limit", SYNC_PAGE_SIZE, type=int), SYNC_MAX_PAGE_SIZE)
+    )
+    device_id = request.args.get("device_id")
+    stream = request.args.get("stream", "")
+
+    clauses, params = [], []
+    if device_id:
+        clauses.append("device_id = ?")
+        params.append(device_id)
+
+    if table == "devices":
+        # Sanitized column list only — never api_key / deploy_token_hash.
+        since = request.args.get("after_seen", 0, type=float)
+        query = (
+            "SELECT device_id, hostname, os, os_version, arch, agent_version, "
+            "status, last_seen, first_seen, org_id FROM devices WHERE last_seen > ?"
+        )
+        if device_id:
+            query += " AND device_id = ?"
+        rows = [
+            dict(r)
+            for r in db.execute(
+                query + " ORDER BY last_seen LIMIT ?",
+                [since, *params, limit],
+            ).fetchall()
+        ]
+        cursor = {"after_seen": rows[-1]["last_seen"] if rows else since}
+        return _sync_response(
+            {"table": table, "rows": rows, "cursor": cursor, "more": len(rows) == limit}
+        )
+
+    cutoff_ns = int((time.time() - hours * 3600) * 1e9)
+    clauses.append(f"{_sync_ts_col(table)} > ?")
+    params.append(cutoff_ns)
+
+    try:
+        if stream == "scored":
+            if table != "security_events":
+                return jsonify({"error": "scored stream is security_events only"}), 400
+            after_scored = request.args.get("after_scored", "")
+            clauses.append("last_scored IS NOT NULL")
+            clauses.append("(last_scored, id) > (?, ?)")
+            params += [after_scored, after]
+            order = "last_scored, id"
+        else:
+            if after <= 0:
+                # First pull: start at the window instead of walking old ids.
+                row = db.execute(
+                    f"SELECT MIN(id) FROM {table} WHERE {_sync_ts_col(table)} > ?",
+                    (cutoff_ns,),
+                ).fetchone()
+                after = (row[0] or 1) - 1
+            clauses.append("id > ?")
+            params.append(after)
+            order = "id"
+            # Read before the page: every id up to here is already visible
+            high_water = db.execute(f"SELECT MAX(id) FROM {table}").fetchone()[0]
+        rows = [
+            dict(r)
+            for r in db.execute(
+                f"SELECT * FROM {table} WHERE {' AND '.join(clauses)} "
+                f"ORDER BY {order} LIMIT ?",
+                [*params, limit],
+            ).fetchall()
+        ]
+    except sqlite3.Error as e:
+        logger.warning("Sync query failed for %s: %s", table, e)
+        return jsonify({"error": "query failed"}), 500
+
+    more = len(rows) == limit
+    if stream == "scored":
+        cursor = (
+            {"after_scored": rows[-1]["last_scored"], "after": rows[-1]["id"]}
+            if rows
+            else {"after_scored": after_scored, "after": after}
+        )
+    else:
+        # A short page means no in-window row up to the pre-read high
+        # water is left, so the cursor can skip out-of-window ids too.
+        last = rows[-1]["id"] if rows else after
+        cursor = {"after": last if more else max(last, high_water or 0)}
+    return _sync_response(
+        {"table": table, "rows": rows, "cursor": cursor, "more": more}
+    )
+
+
 @app.route("/health")
 def health():
-    return jsonify({"status": "ok", "version": "0.9.1-beta"})
+    return jsonify(
+        {
+            "status": "ok",
+            "version": "0.9.1-beta",
+            "ingest_queue": _ingest_writer.depth,
+        }
+    )
 
 
 # ── Main ───────────────────────────────────────────────────────────
@@ -1000,9 +1000,30 @@ class HardenedAgentBase(abc.ABC):
 
         drained = 0
         try:
+            # Prefer one PublishBatch round-trip per drain when both the
+            # publisher and the queue support it (per-envelope acks).
+            publish_batch = getattr(self.eventbus_publisher, "publish_batch", None)
+            if publish_batch is not None and hasattr(self.local_queue, "drain_batch"):
+                try:
+                    self.circuit_breaker.allow_call()
+                except CircuitBreakerOpen:
+                    return 0
+
+                def publish_batch_fn(envelopes):
+                    try:
+                        acks = publish_batch(envelopes)
+                    except Exception:
+                        self.circuit_breaker.record_failure()
+                        raise
+                    self.circuit_breaker.record_success()
+                    return acks
+
+                drained = self.local_queue.drain_batch(
+                    publish_batch_fn=publish_batch_fn, limit=limit
+                )
             # Adapt to your LocalQueue interface
             # Expects: drain(publish_fn, limit) -> int
-            if hasattr(self.local_queue, "drain"):
+            elif hasattr(self.local_queue, "drain"):
                 drained = self.local_queue.drain(
                     publish_fn=self._publish_with_retry, limit=limit
                 )
@@ -0,0 +1,64 @@
+"""PublishBatch support shared by the agents' EventBus publishers.
+
+Publishers that own a ``UniversalEventBusStub`` mix in
+:class:`BatchPublisherMixin` to get ``publish_batch``, which
+``HardenedAgentBase._drain_local_queue`` uses to drain the local queue in one
+round-trip.  The host class provides ``_ensure_channel()`` and ``_stub``.
+"""
+
+import logging
+
+import grpc
+
+from amoskys.proto import universal_telemetry_pb2 as telemetry_pb2
+
+logger = logging.getLogger(__name__)
+
+
+class BatchPublisherMixin:
+    """``publish_batch`` over the PublishBatch RPC, with fallbacks.
+
+    - An EventBus that predates PublishBatch (UNIMPLEMENTED) is remembered
+      and served with per-envelope PublishTelemetry calls from then on.
+    - A batch rejected as too large (RESOURCE_EXHAUSTED) is split in half
+      and each half sent on its own.
+    """
+
+    _batch_supported = True
+
+    def publish_batch(self, envelopes: list) -> list:
+        """Publish signed envelopes with one PublishBatch RPC.
+
+        Returns one UniversalAck per envelope, in order.  Falls back to
+        per-envelope PublishTelemetry when the EventBus predates PublishBatch.
+        """
+        self._ensure_channel()
+
+        if self._batch_supported:
+            try:
+                ack = self._stub.PublishBatch(
+                    telemetry_pb2.TelemetryBatch(envelopes=envelopes), timeout=10.0
+                )
+            except grpc.RpcError as e:
+                if (
+                    e.code() == grpc.StatusCode.RESOURCE_EXHAUSTED
+                    and len(envelopes) > 1
+                ):
+                    half = len(envelopes) // 2
+                    logger.info("PublishBatch too large; splitting %d", len(envelopes))
+                    return self.publish_batch(envelopes[:half]) + self.publish_batch(
+                        envelopes[half:]
+                    )
+                if e.code() != grpc.StatusCode.UNIMPLEMENTED:
+                    raise
+                logger.info("EventBus has no PublishBatch; using PublishTelemetry")
+                self._batch_supported = False
+            else:
+                if len(ack.envelope_acks) == len(envelopes):
+                    return list(ack.envelope_acks)
+                # Whole batch answered at once (e.g. overload): keep rows queued
+                if ack.status == telemetry_pb2.UniversalAck.RETRY:
+                    return [ack] * len(envelopes)
+                raise Exception(f"EventBus returned status: {ack.status}")
+
+        return [self._stub.PublishTelemetry(env, timeout=5.0) for env in envelopes]
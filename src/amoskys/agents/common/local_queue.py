@@ -54,6 +54,14 @@ CREATE UNIQUE INDEX IF NOT EXISTS queue_idem ON queue(idem);
 CREATE INDEX IF NOT EXISTS queue_ts ON queue(ts_ns);
 """
 
+# Payload bytes per drain_signed_batch call, below gRPC's 4 MiB default
+# message limit with room for the envelope fields around each event.
+MAX_BATCH_BYTES = 3 * 1024 * 1024
+
+# Per-envelope overhead (idempotency key, timestamps, framing) on top of the
+# telemetry and signature bytes.
+_ENVELOPE_OVERHEAD = 256
+
 # Columns added in the signing update.  Used by _migrate_schema().
 _SIGNING_COLUMNS = {
     "content_hash": "BLOB DEFAULT NULL",
@@ -62,6 +70,14 @@ _SIGNING_COLUMNS = {
 }
 
 
+def _row_size(row: tuple) -> int:
+    """Approximate envelope size of a queue row as fetched by the drains."""
+    _rowid, blob, _retries, idem, _ts_ns, *signing = row
+    return (
+        _ENVELOPE_OVERHEAD + len(idem) + len(blob) + sum(len(b) for b in signing if b)
+    )
+
+
 class LocalQueue:
     """SQLite-backed queue for agent telemetry during EventBus downtime.
 
@@ -222,6 +238,116 @@ class LocalQueue:
         """
         return self._drain_impl(publish_fn, limit)
 
+    def drain_signed_batch(
+        self,
+        publish_batch_fn: Callable[[list], list],
+        limit: int = 100,
+        max_batch_bytes: int = MAX_BATCH_BYTES,
+    ) -> int:
+        """Drain up to ``limit`` rows with a single batch publish call.
+
+        ``publish_batch_fn`` receives a list of
+        ``(telemetry, idem_key, ts_ns, content_hash, sig, prev_sig)`` tuples
+        in FIFO order and must return one ack per tuple, in the same order.
+        The batch is cut once its serialized size would pass
+        ``max_batch_bytes`` (it always holds at least one row).  Acks are
+        applied with the same rules as :meth:`drain`:
+
+            - OK: delete the row
+            - RETRY: keep the row untouched for the next drain
+            - any other status: permanent failure, delete the row
+
+        If the call itself raises, the failure is charged to the head row
+        only, as :meth:`drain` does (it is dropped once past
+        ``max_retries``); the rest of the batch stays untouched.
+        """
+        with self._lock:
+            rows = self.db.execute(
+                "SELECT id, bytes, retries, idem, ts_ns, content_hash, sig, prev_sig "
+                "FROM queue ORDER BY id LIMIT ?",
+                (limit,),
+            ).fetchall()
+        if not rows:
+            return 0
+
+        total = 0
+        for i, row in enumerate(rows):
+            total += _row_size(row)
+            if total > max_batch_bytes and i > 0:
+                rows = rows[:i]
+                break
+
+        batch = []
+        for _rowid, blob, _retries, idem, ts_ns, content_hash, sig, prev_sig in rows:
+            telemetry = pb.DeviceTelemetry()
+            telemetry.ParseFromString(bytes(blob))
+            batch.append(
+                (
+                    telemetry,
+                    idem,
+                    ts_ns,
+                    bytes(content_hash) if content_hash else None,
+                    bytes(sig) if sig else None,
+                    bytes(prev_sig) if prev_sig else None,
+                )
+            )
+
+        try:
+            acks = list(publish_batch_fn(batch))
+            if len(acks) != len(rows):
+                raise Exception(
+                    f"Batch ack count mismatch ({len(acks)} acks for {len(rows)} events)"
+                )
+            if not all(hasattr(ack, "status") for ack in acks):
+                raise Exception("No valid ack received")
+        except Exception as e:
+            logger.warning(f"Batch publish failed: {len(rows)} events, error={e}")
+            rowid, _blob, retries, idem, *_rest = rows[0]
+            if self._on_drain_failure:
+                self._on_drain_failure(idem, e)
+            with self._lock:
+                if retries + 1 > self.max_retries:
+                    logger.error(
+                        "MAX_RETRY_DROP: %s exceeded %d retries, "
+                        "event permanently lost",
+                        idem,
+                        self.max_retries,
+                    )
+                    self.db.execute("DELETE FROM queue WHERE id = ?", (rowid,))
+                    if self._on_max_retry_drop:
+                        self._on_max_retry_drop(idem)
+                else:
+                    self.db.execute(
+                        "UPDATE queue SET retries = ? WHERE id = ?",
+                        (retries + 1, rowid),
+                    )
+            return 0
+
+        drained = 0
+        to_delete = []
+        for (rowid, _blob, _retries, idem, *_rest), ack in zip(rows, acks):
+            status = ack.status
+            if status == 0:  # OK
+                to_delete.append((rowid,))
+                drained += 1
+            elif status == 1:  # RETRY - keep for the next drain
+                logger.debug(f"EventBus RETRY: {idem}")
+            else:  # ERROR - permanent failure
+                logger.warning(f"EventBus ERROR: {idem}, status={status}")
+                to_delete.append((rowid,))
+
+        if to_delete:
+            with self._lock:
+                self.db.execute("BEGIN")
+                self.db.executemany("DELETE FROM queue WHERE id = ?", to_delete)
+                self.db.execute("COMMIT")
+
+        # P0-11: Notify drain success
+        if drained > 0 and self._on_drain_success:
+            self._on_drain_success(drained)
+
+        return drained
+
     def _drain_impl(
         self,
         publish_fn: Callable,
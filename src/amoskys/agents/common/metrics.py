@@ -6,6 +6,7 @@ Provides AgentMetrics container for tracking agent health and performance:
     - Event emission counts (total events, probe events)
     - Error tracking (probe errors, last error details)
     - Timestamp tracking (last success, last failure)
+    - Per-probe scan latency (p50/p99 over a sliding window)
 
 Architecture:
     - HardenedAgentBase: Tracks loop-level metrics
@@ -29,9 +30,10 @@ Usage:
 from __future__ import annotations
 
 import time
+from collections import deque
 from dataclasses import asdict, dataclass, field
 from enum import Enum
-from typing import Optional
+from typing import Deque, Dict, Optional
 
 # ---------------------------------------------------------------------------
 # AOC-1 / EAC-1 Enums — shared vocabulary for all hardening phases
@@ -79,6 +81,15 @@ class SubprocessOutcome(str, Enum):
 #: Schema version for all framework dataclasses (P0-19).
 SCHEMA_VERSION = "1.0.0"
 
+#: Scan durations kept per probe for the latency percentiles.
+PROBE_LATENCY_WINDOW = 256
+
+
+def _percentile(ordered: list, pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    idx = min(len(ordered) - 1, max(0, int(round(pct / 100.0 * len(ordered))) - 1))
+    return ordered[idx]
+
 
 @dataclass
 class AgentMetrics:
@@ -146,6 +157,15 @@ class AgentMetrics:
     subprocess_failures: int = 0
     subprocess_access_denied: int = 0
 
+    # Probe scheduling (concurrent probe execution)
+    probe_deadline_misses: int = 0
+    probes_shed: int = 0
+
+    # Recent scan durations (seconds) per probe; exported as percentiles
+    _probe_scan_seconds: Dict[str, Deque[float]] = field(
+        default_factory=dict, repr=False
+    )
+
     def record_loop_start(self) -> None:
         """Record the start of a collection loop."""
         self.loops_started += 1
@@ -246,13 +266,44 @@ class AgentMetrics:
         if access_denied:
             self.subprocess_access_denied += 1
 
+    def record_probe_scan(self, probe_name: str, seconds: float) -> None:
+        """Record one probe scan's wall-clock duration."""
+        window = self._probe_scan_seconds.get(probe_name)
+        if window is None:
+            window = self._probe_scan_seconds[probe_name] = deque(
+                maxlen=PROBE_LATENCY_WINDOW
+            )
+        window.append(seconds)
+
+    def record_probe_deadline_miss(self) -> None:
+        """Record a probe scan that overran its scan_deadline."""
+        self.probe_deadline_misses += 1
+
+    def probe_scan_latency_ms(self) -> Dict[str, Dict[str, float]]:
+        """p50/p99 scan latency (ms) per probe over the recent window."""
+        result: Dict[str, Dict[str, float]] = {}
+        for name, window in list(self._probe_scan_seconds.items()):
+            ordered = sorted(window)
+            if not ordered:
+                continue
+            result[name] = {
+                "p50": round(_percentile(ordered, 50) * 1000, 3),
+                "p99": round(_percentile(ordered, 99) * 1000, 3),
+                "samples": len(ordered),
+            }
+        return result
+
     def to_dict(self) -> dict:
         """Convert metrics to dictionary for serialization.
 
         Returns:
-            Dictionary with all metric fields (using dataclasses.asdict)
+            Dictionary with all metric fields (using dataclasses.asdict);
+            raw latency samples are replaced by probe_scan_latency_ms
         """
-        return asdict(self)
+        d = asdict(self)
+        d.pop("_probe_scan_seconds", None)
+        d["probe_scan_latency_ms"] = self.probe_scan_latency_ms()
+        return d
 
     @property
     def success_rate(self) -> float:
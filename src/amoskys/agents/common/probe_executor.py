@@ -0,0 +1,285 @@
+"""Concurrent probe execution with per-probe deadlines.
+
+MicroProbeAgentMixin runs probes serially in the agent thread by default.
+In ``concurrent`` mode (``probe_execution = "concurrent"`` on the agent, or
+AMOSKYS_PROBE_EXECUTION=concurrent) each cycle's scans are submitted to
+process-wide pools according to the probe's declared ``scan_kind``:
+
+    io / subprocess -> shared thread pool (blocking syscalls and child
+                       processes release the GIL)
+    cpu             -> shared process pool when the probe is
+                       ``process_safe`` (keeps its cross-cycle state in
+                       context.previous_state), otherwise the thread pool
+
+Every scan gets ``scan_deadline`` seconds. A scan that has not started by
+then (the pools are saturated) is cancelled; that says nothing about the
+probe, so it does not count as an overrun. A running one cannot be
+pre-empted (threads cannot be killed), so it is left to finish: the probe
+is not resubmitted while it is still running, and its late events are
+delivered on the first cycle after it completes. Probes that overrun
+repeatedly are shed for an exponentially growing number of cycles. Outcomes are always returned in job order, so
+the merged event list is deterministic regardless of completion order.
+"""
+
+from __future__ import annotations
+
+import logging
+import multiprocessing
+import os
+import pickle
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeout
+from dataclasses import dataclass, field, replace
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Set, Tuple
+
+if TYPE_CHECKING:
+    from amoskys.agents.common.probes import MicroProbe, ProbeContext, TelemetryEvent
+
+logger = logging.getLogger(__name__)
+
+EXECUTION_SERIAL = "serial"
+EXECUTION_CONCURRENT = "concurrent"
+
+SCAN_KINDS = ("io", "subprocess", "cpu")
+
+# (probe, scan callable, may run in a child process)
+ScanJob = Tuple["MicroProbe", Callable[["ProbeContext"], List["TelemetryEvent"]], bool]
+
+# ---------------------------------------------------------------------------
+# Shared pools
+# ---------------------------------------------------------------------------
+
+_pools_lock = threading.Lock()
+_thread_pool: Optional[ThreadPoolExecutor] = None
+_process_pool: Optional[ProcessPoolExecutor] = None
+
+
+def get_probe_thread_pool() -> ThreadPoolExecutor:
+    """Process-wide thread pool for io/subprocess-bound scans."""
+    global _thread_pool
+    with _pools_lock:
+        if _thread_pool is None:
+            workers = int(
+                os.environ.get(
+                    "AMOSKYS_PROBE_THREADS", min(32, (os.cpu_count() or 1) + 4)
+                )
+            )
+            _thread_pool = ThreadPoolExecutor(
+                max_workers=workers, thread_name_prefix="probe-scan"
+            )
+        return _thread_pool
+
+
+def get_probe_process_pool() -> ProcessPoolExecutor:
+    """Process-wide pool for cpu-bound, process-safe scans.
+
+    Uses spawn: agents are multi-threaded and forking them is unsafe.
+    """
+    global _process_pool
+    with _pools_lock:
+        if _process_pool is None:
+            workers = int(
+                os.environ.get("AMOSKYS_PROBE_PROCESSES", max(1, os.cpu_count() or 1))
+            )
+            _process_pool = ProcessPoolExecutor(
+                max_workers=workers, mp_context=multiprocessing.get_context("spawn")
+            )
+        return _process_pool
+
+
+def shutdown_probe_pools() -> None:
+    """Tear down the shared pools (tests, agent shutdown)."""
+    global _thread_pool, _process_pool
+    with _pools_lock:
+        pools, _thread_pool, _process_pool = (_thread_pool, _process_pool), None, None
+    for pool in pools:
+        if pool is not None:
+            pool.shutdown(wait=False, cancel_futures=True)
+
+
+def _timed_scan(fn: Callable, context: "ProbeContext") -> Tuple[List, float]:
+    start = time.perf_counter()
+    events = fn(context)
+    return events, time.perf_counter() - start
+
+
+def _scan_pickled(payload: bytes) -> Tuple[List, Dict[str, Any], float]:
+    """Child-process entry point: scan and hand previous_state back."""
+    probe, context = pickle.loads(payload)
+    start = time.perf_counter()
+    events = probe.scan(context)
+    return events, context.previous_state, time.perf_counter() - start
+
+
+# ---------------------------------------------------------------------------
+# Scheduler
+# ---------------------------------------------------------------------------
+
+
+@dataclass
+class ScanOutcome:
+    """Result of one probe's scan in a cycle.
+
+    status: "ok", "error", "timeout" (missed its deadline this cycle),
+    "queued" (cancelled before it started), "busy" (previous scan still
+    running) or "shed" (skipped by backoff).
+    """
+
+    status: str = "ok"
+    events: List["TelemetryEvent"] = field(default_factory=list)
+    error: Optional[BaseException] = None
+    duration: Optional[float] = None
+    late: bool = False  # events are from a scan that overran an earlier cycle
+
+
+@dataclass
+class _Inflight:
+    future: Future
+    in_process: bool
+    started: float
+
+
+class ProbeScheduler:
+    """Per-agent deadline, in-flight and shedding bookkeeping.
+
+    Args:
+        shed_after: Consecutive overruns before a probe is shed
+        max_shed_cycles: Cap on the exponential shed backoff
+        clock: Monotonic clock
+    """
+
+    def __init__(
+        self,
+        shed_after: int = 3,
+        max_shed_cycles: int = 32,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.shed_after = shed_after
+        self.max_shed_cycles = max_shed_cycles
+        self._clock = clock
+        self._cycle = 0
+        self._inflight: Dict[str, _Inflight] = {}
+        self._overruns: Dict[str, int] = {}
+        self._shed_until: Dict[str, int] = {}
+        self._no_process: Set[str] = set()
+
+    def run(
+        self,
+        jobs: List[ScanJob],
+        context: "ProbeContext",
+        probe_state: Dict[str, Dict[str, Any]],
+    ) -> List[ScanOutcome]:
+        """Run one cycle of scans concurrently; outcomes in job order.
+
+        Each scan gets its own shallow copy of ``context`` whose
+        previous_state is the probe's entry in ``probe_state``.
+        """
+        self._cycle += 1
+        outcomes: List[Optional[ScanOutcome]] = [None] * len(jobs)
+        pending: List[Tuple[int, "MicroProbe", _Inflight]] = []
+
+        for i, (probe, fn, process_ok) in enumerate(jobs):
+            name = probe.name
+            inflight = self._inflight.get(name)
+            if inflight is not None:
+                if inflight.future.done():
+                    del self._inflight[name]
+                    outcomes[i] = self._collect(probe, inflight, probe_state, True)
+                else:
+                    outcomes[i] = ScanOutcome(status="busy")
+                continue
+            if self._shed_until.get(name, 0) >= self._cycle:
+                outcomes[i] = ScanOutcome(status="shed")
+                continue
+            ctx = replace(context, previous_state=probe_state.setdefault(name, {}))
+            pending.append((i, probe, self._submit(probe, fn, ctx, process_ok)))
+
+        for i, probe, inflight in pending:
+            remaining = inflight.started + probe.scan_deadline - self._clock()
+            try:
+                inflight.future.result(timeout=max(0.0, remaining))
+            except FutureTimeout:
+                if inflight.future.cancel():
+                    outcomes[i] = ScanOutcome(status="queued")
+                    continue
+                self._inflight[probe.name] = inflight
+                self._overrun(probe.name)
+                outcomes[i] = ScanOutcome(
+                    status="timeout", duration=self._clock() - inflight.started
+                )
+                continue
+            except Exception:
+                pass  # surfaced by _collect
+            self._overruns.pop(probe.name, None)
+            outcomes[i] = self._collect(probe, inflight, probe_state, False)
+
+        return [o if o is not None else ScanOutcome(status="shed") for o in outcomes]
+
+    def _submit(
+        self, probe: "MicroProbe", fn: Callable, ctx: "ProbeContext", process_ok: bool
+    ) -> _Inflight:
+        if (
+            process_ok
+            and probe.scan_kind == "cpu"
+            and probe.process_safe
+            and probe.name not in self._no_process
+        ):
+            try:
+                payload = pickle.dumps((probe, ctx))
+            except Exception as e:
+                self._no_process.add(probe.name)
+                logger.warning(
+                    "Probe %s cannot run in a child process (%s); using threads",
+                    probe.name,
+                    e,
+                )
+            else:
+                future = get_probe_process_pool().submit(_scan_pickled, payload)
+                return _Inflight(future, True, self._clock())
+        future = get_probe_thread_pool().submit(_timed_scan, fn, ctx)
+        return _Inflight(future, False, self._clock())
+
+    def _collect(
+        self,
+        probe: "MicroProbe",
+        inflight: _Inflight,
+        probe_state: Dict[str, Dict[str, Any]],
+        late: bool,
+    ) -> ScanOutcome:
+        try:
+            result = inflight.future.result(timeout=0)
+        except Exception as e:
+            return ScanOutcome(status="error", error=e, late=late)
+        if inflight.in_process:
+            events, new_state, duration = result
+            # Keep the dict the agent handed out; probes may hold onto it
+            state = probe_state.setdefault(probe.name, {})
+            state.clear()
+            state.update(new_state)
+        else:
+            events, duration = result
+        return ScanOutcome(events=list(events or []), duration=duration, late=late)
+
+    def _overrun(self, name: str) -> None:
+        count = self._overruns.get(name, 0) + 1
+        self._overruns[name] = count
+        if count >= self.shed_after:
+            cycles = min(2 ** (count - self.shed_after + 1), self.max_shed_cycles)
+            self._shed_until[name] = self._cycle + cycles
+            logger.warning(
+                "Probe %s overran its deadline %d times in a row; "
+                "shedding it for %d cycles",
+                name,
+                count,
+                cycles,
+            )
+
+    def shed_probes(self) -> List[str]:
+        """Probes currently skipped by the overrun backoff."""
+        return sorted(n for n, until in self._shed_until.items() if until > self._cycle)
+
+    def busy_probes(self) -> List[str]:
+        """Probes whose overrunning scan is still running."""
+        return sorted(self._inflight)
@@ -47,6 +47,7 @@ from __future__ import annotations
 
 import abc
 import logging
+import os
 import platform as _platform
 import time
 from dataclasses import dataclass, field
@@ -65,6 +66,13 @@ from typing import (
     Type,
 )
 
+from amoskys.agents.common.probe_executor import (
+    EXECUTION_CONCURRENT,
+    EXECUTION_SERIAL,
+    ProbeScheduler,
+    ScanJob,
+    ScanOutcome,
+)
 from amoskys.observability.probe_registry import get_probe_contract_registry
 
 if TYPE_CHECKING:
@@ -273,6 +281,10 @@ class MicroProbe(abc.ABC):
         scan_interval: Recommended seconds between scans
         requires_root: Whether probe requires elevated privileges
         platforms: Supported platforms ("linux", "darwin", "windows")
+        scan_kind: What bounds scan() — "io", "subprocess" or "cpu"
+        scan_deadline: Seconds a scan may take in concurrent execution
+        process_safe: scan() may run in a child process (all cross-cycle
+            state lives in context.previous_state)
 
     Methods to Override:
         scan(): Perform detection and return TelemetryEvents
@@ -291,6 +303,12 @@ class MicroProbe(abc.ABC):
     requires_root: bool = False
     platforms: List[str] = ["linux", "darwin", "windows"]
 
+    # --- Execution (used when the agent runs probes concurrently) ---
+
+    scan_kind: str = "io"
+    scan_deadline: float = 10.0
+    process_safe: bool = False
+
     # --- Observability Contract (override in subclasses) ---
     # These declarations form the probe's dependency graph.
     # The system enforces them at runtime, blocking BROKEN probes
@@ -709,6 +727,11 @@ class MicroProbeAgentMixin:
     # Type hint for metrics - will be provided by HardenedAgentBase when mixed
     metrics: "AgentMetrics"
 
+    # "serial" runs probes one by one in the agent thread; "concurrent" runs
+    # them on shared pools with per-probe deadlines (see probe_executor).
+    # None defers to AMOSKYS_PROBE_EXECUTION (default serial).
+    probe_execution: Optional[str] = None
+
     def __init__(
         self, *args, probes: Optional[List[MicroProbe]] = None, **kwargs
     ) -> None:
@@ -932,18 +955,18 @@ class MicroProbeAgentMixin:
                         )
                     probe.readiness = new_readiness
 
-        for probe in self._probes:
-            if not probe.enabled:
+        jobs: List[ScanJob] = [(p, p.scan, True) for p in self._probes if p.enabled]
+        outcomes = self._execute_probe_scans(jobs, context)
+
+        for (probe, _, _), outcome in zip(jobs, outcomes):
+            if outcome.error is not None:
+                self._record_probe_failure(probe, outcome.error)
                 continue
+            if outcome.status != "ok":
+                continue  # timed out, queued, still running or shed this cycle
 
             try:
-                # Update context with probe-specific state
-                context.previous_state = self._probe_state.get(probe.name, {})
-
-                # Run probe scan
-                start_time = time.time()
-                events = probe.scan(context)
-                scan_duration = time.time() - start_time
+                events = outcome.events
 
                 # Update probe metrics
                 probe.last_scan = datetime.now(timezone.utc)
@@ -968,20 +991,91 @@ class MicroProbeAgentMixin:
 
                 logger.debug(
                     f"Probe {probe.name} returned {len(events)} events "
-                    f"in {scan_duration:.3f}s"
+                    f"in {outcome.duration or 0.0:.3f}s"
                 )
 
             except Exception as e:
-                probe.error_count += 1
-                probe.last_error = str(e)
+                self._record_probe_failure(probe, e)
 
-                # Track probe errors (if agent has metrics)
-                if hasattr(self, "metrics"):
-                    self.metrics.record_probe_error()
+        return all_events
 
-                logger.error(f"Probe {probe.name} scan failed: {e}")
+    # --- Probe execution ---
 
-        return all_events
+    def _probe_execution_mode(self) -> str:
+        mode = self.probe_execution or os.environ.get(
+            "AMOSKYS_PROBE_EXECUTION", EXECUTION_SERIAL
+        )
+        return (
+            EXECUTION_CONCURRENT if mode == EXECUTION_CONCURRENT else EXECUTION_SERIAL
+        )
+
+    def _execute_probe_scans(
+        self, jobs: List[ScanJob], context: ProbeContext
+    ) -> List[ScanOutcome]:
+        """Run the scans for one cycle; outcomes come back in job order.
+
+        Serial mode hands each probe the shared context with its
+        previous_state swapped in, exactly as the agent always has.
+        Concurrent mode delegates to a per-agent ProbeScheduler.
+        """
+        if self._probe_execution_mode() == EXECUTION_CONCURRENT:
+            scheduler = getattr(self, "_probe_scheduler", None)
+            if scheduler is None:
+                scheduler = self._probe_scheduler = ProbeScheduler()
+            outcomes = scheduler.run(jobs, context, self._probe_state)
+        else:
+            scheduler = None
+            outcomes = []
+            for probe, fn, _ in jobs:
+                context.previous_state = self._probe_state.get(probe.name, {})
+                start = time.perf_counter()
+                try:
+                    events = fn(context)
+                except Exception as e:
+                    outcomes.append(ScanOutcome(status="error", error=e))
+                    continue
+                outcomes.append(
+                    ScanOutcome(events=events, duration=time.perf_counter() - start)
+                )
+
+        metrics = getattr(self, "metrics", None)
+        for (probe, _, _), outcome in zip(jobs, outcomes):
+            if outcome.status == "timeout":
+                probe.last_error = f"scan exceeded {probe.scan_deadline:.1f}s deadline"
+                logger.warning(
+                    "Probe %s missed its %.1fs deadline",
+                    probe.name,
+                    probe.scan_deadline,
+                )
+                if metrics is not None:
+                    metrics.record_probe_deadline_miss()
+            elif outcome.status == "queued":
+                logger.warning(
+                    "Probe %s did not start within its %.1fs deadline "
+                    "(probe pools saturated)",
+                    probe.name,
+                    probe.scan_deadline,
+                )
+            elif outcome.duration is not None and metrics is not None:
+                metrics.record_probe_scan(probe.name, outcome.duration)
+        if scheduler is not None and metrics is not None:
+            metrics.probes_shed = len(scheduler.shed_probes())
+        return outcomes
+
+    def _record_probe_failure(
+        self, probe: MicroProbe, error: BaseException, exc_info: bool = False
+    ) -> None:
+        probe.error_count += 1
+        probe.last_error = str(error)
+
+        # Track probe errors (if agent has metrics)
+        if hasattr(self, "metrics"):
+            self.metrics.record_probe_error()
+
+        logger.error(
+            f"Probe {probe.name} scan failed: {error}",
+            exc_info=error if exc_info else None,
+        )
 
     def _create_probe_context(self) -> ProbeContext:
         """Create context for probe scans.
@@ -1064,15 +1158,20 @@ class MicroProbeAgentMixin:
         Returns:
             List of TelemetryEvents from all probes
         """
-        all_events: List[TelemetryEvent] = []
+        # Pre-check events for each probe, in probe order; scans run after
+        # all checks (concurrently if enabled) and are merged back in order.
+        slots: List[Tuple[MicroProbe, List[TelemetryEvent], bool]] = []
+        jobs: List[ScanJob] = []
+        agent_bus = getattr(self, "agent_bus", None)
 
         for probe in self._probes:
             if not probe.enabled:
                 continue
 
+            pre_events: List[TelemetryEvent] = []
             try:
                 if not self._probe_contract_registry.is_registered(probe.name):
-                    all_events.append(
+                    pre_events.append(
                         TelemetryEvent(
                             event_type="probe_contract_unregistered",
                             severity=Severity.HIGH,
@@ -1088,6 +1187,7 @@ class MicroProbeAgentMixin:
                             ],
                         )
                     )
+                    slots.append((probe, pre_events, False))
                     continue
                 self._probe_contract_registry.refresh_probe(probe.name)
 
@@ -1098,7 +1198,7 @@ class MicroProbeAgentMixin:
 
                     if readiness.status == "BROKEN":
                         # Emit blindness telemetry — system reports its own gaps
-                        all_events.append(
+                        pre_events.append(
                             TelemetryEvent(
                                 event_type="probe_contract_violation",
                                 severity=Severity.DEBUG,
@@ -1117,19 +1217,43 @@ class MicroProbeAgentMixin:
                                 ],
                             )
                         )
+                        slots.append((probe, pre_events, False))
                         continue  # Skip scan — contract unsatisfied
+            except Exception as e:
+                self._record_probe_failure(probe, e, exc_info=True)
+                continue
 
-                # Update context with probe-specific state
-                context.previous_state = self._probe_state.get(probe.name, {})
+            # Run probe scan — use scan_with_context() if AgentBus available.
+            # Probes that override scan_with_context need the bus and so
+            # always stay in this process.
+            if agent_bus is not None:
+                jobs.append(
+                    (
+                        probe,
+                        lambda ctx, p=probe: p.scan_with_context(ctx, agent_bus),
+                        type(probe).scan_with_context is MicroProbe.scan_with_context,
+                    )
+                )
+            else:
+                jobs.append((probe, probe.scan, True))
+            slots.append((probe, pre_events, True))
 
-                # Run probe scan — use scan_with_context() if AgentBus available
-                start_time = time.time()
-                agent_bus = getattr(self, "agent_bus", None)
-                if agent_bus is not None:
-                    events = probe.scan_with_context(context, agent_bus)
-                else:
-                    events = probe.scan(context)
-                scan_duration = time.time() - start_time
+        outcomes = iter(self._execute_probe_scans(jobs, context))
+
+        all_events: List[TelemetryEvent] = []
+        for probe, pre_events, scanned in slots:
+            all_events.extend(pre_events)
+            if not scanned:
+                continue
+            outcome = next(outcomes)
+            if outcome.error is not None:
+                self._record_probe_failure(probe, outcome.error, exc_info=True)
+                continue
+            if outcome.status != "ok":
+                continue  # timed out, queued, still running or shed this cycle
+
+            try:
+                events = outcome.events
 
                 # P0-7: Tag DEGRADED probe events + emit companion event
                 if probe.readiness and probe.readiness.status == "DEGRADED":
@@ -1194,18 +1318,11 @@ class MicroProbeAgentMixin:
 
                 logger.debug(
                     f"Probe {probe.name} returned {len(events)} events "
-                    f"in {scan_duration:.3f}s"
+                    f"in {outcome.duration or 0.0:.3f}s"
                 )
 
             except Exception as e:
-                probe.error_count += 1
-                probe.last_error = str(e)
-
-                # Track probe errors (if agent has metrics)
-                if hasattr(self, "metrics"):
-                    self.metrics.record_probe_error()
-
-                logger.error(f"Probe {probe.name} scan failed: {e}", exc_info=True)
+                self._record_probe_failure(probe, e, exc_info=True)
 
         return all_events
 
@@ -89,12 +89,36 @@ def _resolve_agent_key(signing_key_path: str, agent_name: str) -> tuple[Any, str
     return _load_signing_key(signing_key_path), agent_name
 
 
+def _wrap_envelope(
+    telemetry: pb.DeviceTelemetry,
+    idem: str,
+    ts_ns: int,
+    sig: Optional[bytes],
+    prev_sig: Optional[bytes],
+) -> pb.UniversalEnvelope:
+    """Wrap a drained DeviceTelemetry row in its signed UniversalEnvelope."""
+    envelope = pb.UniversalEnvelope()
+    envelope.version = "1.0"
+    envelope.ts_ns = ts_ns
+    envelope.idempotency_key = idem
+    envelope.device_telemetry.CopyFrom(telemetry)
+    envelope.schema_version = 1
+
+    if sig:
+        envelope.sig = sig
+        envelope.signing_algorithm = "Ed25519"
+    if prev_sig:
+        envelope.prev_sig = prev_sig
+    return envelope
+
+
 class LocalQueueAdapter:
     """Adapter for LocalQueue to work with HardenedAgentBase.
 
     Provides a simplified interface where:
         - enqueue(event) automatically generates idempotency keys
         - drain(publish_fn, limit) handles the publish callback
+        - drain(..., publish_batch_fn=...) drains through PublishBatch
 
     When *signing_key_path* is provided and the key file exists, every
     enqueued event is signed with Ed25519.  A SHA-256 ``content_hash``
@@ -234,7 +258,12 @@ class LocalQueueAdapter:
 
         return result
 
-    def drain(self, publish_fn: Callable, limit: int = 100) -> int:
+    def drain(
+        self,
+        publish_fn: Callable,
+        limit: int = 100,
+        publish_batch_fn: Optional[Callable] = None,
+    ) -> int:
         """Drain queue, wrapping each event in a signed UniversalEnvelope.
 
         Args:
@@ -243,31 +272,46 @@ class LocalQueueAdapter:
                 or a raw ``DeviceTelemetry`` for backward compat when no
                 signature data exists on the row.
             limit: Maximum events to drain
+            publish_batch_fn: Optional batch publisher (e.g. a publisher's
+                ``publish_batch`` backed by the PublishBatch RPC).  When given,
+                the whole drain goes out in one call — see :meth:`drain_batch`.
 
         Returns:
             Number of events successfully drained
         """
+        if publish_batch_fn is not None:
+            return self.drain_batch(publish_batch_fn, limit=limit)
 
         def _wrap_and_publish(telemetry, idem, ts_ns, content_hash, sig, prev_sig):
             """Wrap DeviceTelemetry in UniversalEnvelope with signature."""
-            envelope = pb.UniversalEnvelope()
-            envelope.version = "1.0"
-            envelope.ts_ns = ts_ns
-            envelope.idempotency_key = idem
-            envelope.device_telemetry.CopyFrom(telemetry)
-            envelope.schema_version = 1
-
-            if sig:
-                envelope.sig = sig
-                envelope.signing_algorithm = "Ed25519"
-            if prev_sig:
-                envelope.prev_sig = prev_sig
-
-            publish_fn([envelope])
+            publish_fn([_wrap_envelope(telemetry, idem, ts_ns, sig, prev_sig)])
             return type("Ack", (), {"status": 0})()
 
         return self.queue.drain_signed(_wrap_and_publish, limit=limit)
 
+    def drain_batch(self, publish_batch_fn: Callable, limit: int = 100) -> int:
+        """Drain queue through a single batch publish call.
+
+        Args:
+            publish_batch_fn: Takes a list of signed ``UniversalEnvelope``s and
+                returns one ack per envelope, in order (``UniversalAck``
+                entries of a PublishBatch response).  Rows acked OK are
+                deleted, RETRY rows stay queued, other statuses are dropped.
+            limit: Maximum events to drain
+
+        Returns:
+            Number of events successfully drained
+        """
+
+        def _wrap_and_publish_batch(rows):
+            envelopes = [
+                _wrap_envelope(telemetry, idem, ts_ns, sig, prev_sig)
+                for telemetry, idem, ts_ns, _content_hash, sig, prev_sig in rows
+            ]
+            return publish_batch_fn(envelopes)
+
+        return self.queue.drain_signed_batch(_wrap_and_publish_batch, limit=limit)
+
     def size(self) -> int:
         """Get number of events in queue."""
         return self.queue.size()
@@ -14,6 +14,8 @@ from .agent_types import (
 )
 from .collector import (
     AuditdLogCollector,
+    AuditdSocketCollector,
+    AuditEventAssembler,
     BaseKernelAuditCollector,
     StubKernelAuditCollector,
     create_kernel_audit_collector,
@@ -54,6 +56,8 @@ __all__ = [
     "PERMISSION_SYSCALLS",
     "BaseKernelAuditCollector",
     "AuditdLogCollector",
+    "AuditdSocketCollector",
+    "AuditEventAssembler",
     "StubKernelAuditCollector",
     "create_kernel_audit_collector",
     "ExecveHighRiskProbe",
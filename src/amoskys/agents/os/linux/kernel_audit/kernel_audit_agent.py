@@ -44,6 +44,7 @@ from typing import Any, Dict, List, Optional, Sequence
 import grpc
 
 from amoskys.agents.common.base import HardenedAgentBase
+from amoskys.agents.common.batch_publisher import BatchPublisherMixin
 from amoskys.agents.common.probes import (
     MicroProbe,
     MicroProbeAgentMixin,
@@ -75,7 +76,7 @@ QUEUE_PATH = getattr(
 # =============================================================================
 
 
-class EventBusPublisher:
+class EventBusPublisher(BatchPublisherMixin):
     """Wrapper for EventBus gRPC client."""
 
     MANDATE_DATA_FIELDS = ("pid", "process_name", "event_category")
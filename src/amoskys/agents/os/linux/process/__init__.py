@@ -1,14 +1,23 @@
 """AMOSKYS Linux Process Observatory — Linux process monitoring.
 
-Status: SCAFFOLD — collector not yet implemented.
-Roadmap: Port from amoskys.agents.os.macos.process via Igris multi-platform engine.
-
-Data sources (when implemented):
-    - psutil (cross-platform, works immediately)
-    - /proc/{pid}/ (Linux-specific: maps, fd, environ, cgroup)
-    - auditd execve events (if auditd configured)
+Data sources:
+    - /proc/{pid}/ stat, status, cmdline, exe, cgroup — read incrementally
+      by LinuxProcessCollector
+    - auditd execve events (planned, if auditd configured)
 """
 
 from amoskys.agents.os.linux.process.agent import LinuxProcessAgent
+from amoskys.agents.os.linux.process.collector import (
+    LinuxProcessCollector,
+    LinuxProcessSnapshot,
+    ProcessChange,
+    ProcessTree,
+)
 
-__all__ = ["LinuxProcessAgent"]
+__all__ = [
+    "LinuxProcessAgent",
+    "LinuxProcessCollector",
+    "LinuxProcessSnapshot",
+    "ProcessChange",
+    "ProcessTree",
+]
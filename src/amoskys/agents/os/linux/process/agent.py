@@ -1,24 +1,33 @@
 """Linux Process Agent — Process Observatory for Linux.
 
-Scaffold agent — uses the same probe set as macOS but with a
-Linux-specific collector that leverages /proc and auditd.
+Runs the platform-agnostic subset of the macOS process probes on top of
+LinuxProcessCollector, which reads /proc incrementally.
 
-To implement:
-    1. Build LinuxProcessCollector in collector.py
-    2. The probes from macOS work as-is (they read shared_data dicts)
-    3. Test on a Linux device with ground-truth verification
+Data flow:
+    1. LinuxProcessCollector.collect() → processes + spawned/exited/changed
+    2. Observation events for the deltas only (a full inventory on the
+       first cycle) — an idle host produces no observation traffic
+    3. Probes.scan(context) → TelemetryEvents (detections)
+    4. Agent converts events → DeviceTelemetry protobuf
 """
 
 from __future__ import annotations
 
+import json
 import logging
+import platform
 import socket
+import time
 from pathlib import Path
-from typing import Any, Sequence
+from typing import Any, Dict, List, Sequence
 
 from amoskys.agents.common.base import HardenedAgentBase, ValidationResult
-from amoskys.agents.common.probes import MicroProbeAgentMixin
+from amoskys.agents.common.probes import MicroProbeAgentMixin, Severity, TelemetryEvent
 from amoskys.agents.common.queue_adapter import LocalQueueAdapter
+from amoskys.agents.os.linux.process.collector import (
+    LinuxProcessCollector,
+    LinuxProcessSnapshot,
+)
 from amoskys.agents.os.macos.process.probes import create_process_probes
 from amoskys.config import get_config
 
@@ -27,12 +36,21 @@ logger = logging.getLogger(__name__)
 config = get_config()
 QUEUE_PATH = "data/queue/linux_process.db"
 
+# macOS process probes whose logic only reads the shared_data process list
+# and holds on Linux too (the rest check codesign, dylibs, Apple paths...)
+LINUX_PORTABLE_PROBES = (
+    "macos_process_spawn",
+    "macos_resource_abuse",
+    "macos_script_interpreter",
+    "macos_binary_from_temp",
+)
+
 
 class LinuxProcessAgent(MicroProbeAgentMixin, HardenedAgentBase):
-    """Linux Process Observatory agent (scaffold).
+    """Linux Process Observatory agent.
 
-    Uses the same 10 probes as macOS — detection logic is platform-agnostic.
-    Only the collector needs Linux-specific implementation.
+    Reuses the macOS process probes that are platform-agnostic; the
+    collector is Linux-specific.
     """
 
     MANDATE_DATA_FIELDS = (
@@ -62,21 +80,22 @@ class LinuxProcessAgent(MicroProbeAgentMixin, HardenedAgentBase):
             collection_interval=collection_interval,
             queue_adapter=queue_adapter,
         )
-        # Probes are platform-agnostic — same as macOS
-        self.register_probes(create_process_probes())
-        logger.info(
-            "LinuxProcessAgent initialized (scaffold): %d probes", len(self._probes)
-        )
+        self.collector = LinuxProcessCollector(device_id=device_id)
+        self._baseline_sent = False
+        self.register_probes(_linux_process_probes())
+        logger.info("LinuxProcessAgent initialized: %d probes", len(self._probes))
 
     def setup(self) -> bool:
-        import platform
-
         if platform.system() != "Linux":
             logger.error("LinuxProcessAgent requires Linux")
             return False
         return self.setup_probes(
             collector_shared_data_keys=[
                 "processes",
+                "spawned",
+                "exited",
+                "changed",
+                "process_tree",
                 "own_user_count",
                 "total_count",
                 "collection_time_ms",
@@ -84,16 +103,192 @@ class LinuxProcessAgent(MicroProbeAgentMixin, HardenedAgentBase):
         )
 
     def collect_data(self) -> Sequence[Any]:
-        raise NotImplementedError(
-            "LinuxProcessAgent collector not yet implemented. "
-            "Port MacOSProcessCollector to use /proc + auditd."
+        """Run collector + probes, emit process deltas + detections."""
+        snapshot = self.collector.collect()
+
+        if self._baseline_sent:
+            obs_events = self._delta_observations(snapshot)
+        else:
+            obs_events = self._make_observation_events(
+                snapshot["processes"],
+                domain="process",
+                field_mapper=lambda p: self._process_to_obs(p, "baseline"),
+            )
+            self._baseline_sent = True
+
+        context = self._create_probe_context()
+        context.shared_data = snapshot
+        probe_events = self.run_probes(context)
+
+        all_events = obs_events + probe_events
+        all_events.append(
+            TelemetryEvent(
+                event_type="collection_metadata",
+                severity=Severity.DEBUG,
+                probe_name="linux_process_collector",
+                data={
+                    "total_processes": snapshot["total_count"],
+                    "own_user_processes": snapshot["own_user_count"],
+                    "collection_time_ms": snapshot["collection_time_ms"],
+                    "spawned": len(snapshot["spawned"]),
+                    "exited": len(snapshot["exited"]),
+                    "changed": len(snapshot["changed"]),
+                    "files_read": snapshot["files_read"],
+                    "probe_events": len(probe_events),
+                    "observation_events": len(obs_events),
+                },
+            )
+        )
+
+        logger.info(
+            "Collected: %d processes (+%d -%d ~%d) in %.1fms, %d probe events",
+            snapshot["total_count"],
+            len(snapshot["spawned"]),
+            len(snapshot["exited"]),
+            len(snapshot["changed"]),
+            snapshot["collection_time_ms"],
+            len(probe_events),
+        )
+        return [self._events_to_telemetry(all_events)]
+
+    def _delta_observations(self, snapshot: Dict[str, Any]) -> List[TelemetryEvent]:
+        obs = self._make_observation_events(
+            snapshot["spawned"],
+            domain="process",
+            field_mapper=lambda p: self._process_to_obs(p, "spawn"),
+        )
+        obs += self._make_observation_events(
+            snapshot["exited"],
+            domain="process",
+            field_mapper=lambda p: self._process_to_obs(p, "exit"),
+        )
+        for change in snapshot["changed"]:
+            [event] = self._make_observation_events(
+                [change.process],
+                domain="process",
+                field_mapper=lambda p: self._process_to_obs(p, "change"),
+            ) or [None]
+            if event is None:
+                continue
+            event.data["changed_fields"] = ",".join(sorted(change.changes))
+            for name, (old, _) in change.changes.items():
+                event.data[f"previous_{name}"] = (
+                    json.dumps(old) if isinstance(old, list) else str(old)
+                )
+            obs.append(event)
+        return obs
+
+    @staticmethod
+    def _process_to_obs(proc: LinuxProcessSnapshot, delta: str) -> Dict[str, Any]:
+        """Map a LinuxProcessSnapshot to observation data dict."""
+        return {
+            "delta": delta,
+            "pid": str(proc.pid),
+            "name": proc.name,
+            "exe": proc.exe,
+            "cmdline": json.dumps(proc.cmdline) if proc.cmdline else "",
+            "username": proc.username,
+            "uid": str(proc.uid),
+            "ppid": str(proc.ppid),
+            "parent_name": proc.parent_name,
+            "create_time": str(proc.create_time),
+            "cgroup": proc.cgroup,
+            "cpu_percent": (
+                str(proc.cpu_percent) if proc.cpu_percent is not None else ""
+            ),
+            "memory_percent": (
+                str(proc.memory_percent) if proc.memory_percent is not None else ""
+            ),
+            "num_threads": proc.num_threads if proc.num_threads is not None else 0,
+            "status": proc.status,
+            "is_own_user": str(proc.is_own_user),
+            "process_guid": proc.process_guid,
+        }
+
+    def _events_to_telemetry(self, events: List[TelemetryEvent]) -> Any:
+        """Convert TelemetryEvents to protobuf DeviceTelemetry."""
+        from amoskys.proto import universal_telemetry_pb2 as telemetry_pb2
+
+        timestamp_ns = int(time.time() * 1e9)
+        proto_events = []
+
+        for idx, event in enumerate(events):
+            if event.event_type == "collection_metadata":
+                proto_event = telemetry_pb2.TelemetryEvent(
+                    event_id=f"linux_process_meta_{timestamp_ns}",
+                    event_type="METRIC",
+                    severity="INFO",
+                    event_timestamp_ns=timestamp_ns,
+                    source_component="linux_process_collector",
+                    metric_data=telemetry_pb2.MetricData(
+                        metric_name="process_collection",
+                        metric_type="GAUGE",
+                        numeric_value=float(event.data.get("total_processes", 0)),
+                        unit="processes",
+                    ),
+                )
+            elif event.event_type.startswith("obs_"):
+                proto_event = telemetry_pb2.TelemetryEvent(
+                    event_id=f"linux_process_obs_{idx}_{timestamp_ns}",
+                    event_type="OBSERVATION",
+                    severity="INFO",
+                    event_timestamp_ns=timestamp_ns,
+                    source_component="process_collector",
+                    confidence_score=0.0,
+                )
+                for k, v in event.data.items():
+                    proto_event.attributes[k] = str(v)
+            else:
+                security_event = telemetry_pb2.SecurityEvent(
+                    event_category=event.event_type,
+                    risk_score=event.confidence,
+                    analyst_notes=str(event.data),
+                )
+                if event.mitre_techniques:
+                    security_event.mitre_techniques.extend(event.mitre_techniques)
+
+                proto_event = telemetry_pb2.TelemetryEvent(
+                    event_id=f"{event.probe_name}_{event.event_type}_{timestamp_ns}",
+                    event_type="SECURITY",
+                    severity=event.severity.value,
+                    event_timestamp_ns=timestamp_ns,
+                    source_component=event.probe_name,
+                    security_event=security_event,
+                    confidence_score=event.confidence,
+                    tags=event.tags,
+                )
+                for k, v in event.data.items():
+                    proto_event.attributes[k] = str(v)
+
+            proto_events.append(proto_event)
+
+        return telemetry_pb2.DeviceTelemetry(
+            device_id=self.device_id,
+            device_type="HOST",
+            protocol="LINUX_PROCESS",
+            events=proto_events,
+            timestamp_ns=timestamp_ns,
+            collection_agent="linux_process",
+            agent_version="2.0.0",
         )
 
     def validate_event(self, event: Any) -> ValidationResult:
         errors = []
         if not hasattr(event, "device_id") or not event.device_id:
             errors.append("Missing device_id")
+        if not hasattr(event, "timestamp_ns") or event.timestamp_ns == 0:
+            errors.append("Missing timestamp_ns")
         return ValidationResult(is_valid=len(errors) == 0, errors=errors)
 
     def shutdown(self) -> None:
         logger.info("LinuxProcessAgent shutting down")
+
+
+def _linux_process_probes() -> List[Any]:
+    """The portable macOS process probes, enabled for Linux."""
+    probes = []
+    for probe in create_process_probes():
+        if probe.name in LINUX_PORTABLE_PROBES:
+            probe.platforms = [*probe.platforms, "linux"]
+            probes.append(probe)
+    return probes
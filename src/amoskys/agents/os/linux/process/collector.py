@@ -0,0 +1,525 @@
+"""Linux Process Collector — incremental /proc snapshots.
+
+Reads process state straight from procfs instead of going through psutil,
+and keeps it between cycles so a cycle costs roughly what changed on the
+host rather than how many processes there are:
+
+    - one directory listing of /proc finds spawned and exited PIDs
+    - new PIDs get a full read: stat, status, cmdline, exe, cgroup
+    - known PIDs are revalidated a bounded slice at a time (stat, status,
+      cmdline); exe and cgroup are only re-read when those changed
+    - fields fixed for the life of a process (create_time, GUID) are cached
+      under (pid, starttime), so a recycled PID is a new process
+
+Each cycle reports deltas (spawned, exited, changed) next to the full
+``processes`` list the probes already consume, plus a parent-chain index.
+
+Revalidation is what catches exec() and setuid() in a process we already
+know; with ``revalidate_per_cycle`` = B every process is looked at again at
+least every ceil(N / B) cycles. A PID that exits and is reused between two
+looks shows up as an exit + spawn once it is revalidated.
+
+CPU usage needs a fresh stat read, so processes that used CPU since their
+last look are re-read (stat only) every cycle until they go idle.  The
+cost follows the number of busy processes; an idle process that starts
+spinning is picked up by its next revalidation.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import pwd
+import time
+from collections import deque
+from dataclasses import dataclass, replace
+from typing import Any, Deque, Dict, Iterator, List, Optional, Set, Tuple
+
+from amoskys.agents.os.macos.process.collector import ProcessSnapshot, _make_guid
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_REVALIDATE_PER_CYCLE = 256
+
+# Fields whose change is reported as a delta (ppid changes on reparenting
+# are tracked in the tree and reported too)
+TRACKED_FIELDS = ("name", "exe", "cmdline", "username", "ppid")
+
+_STATE_NAMES = {
+    "R": "running",
+    "S": "sleeping",
+    "D": "disk-sleep",
+    "Z": "zombie",
+    "T": "stopped",
+    "t": "tracing-stop",
+    "X": "dead",
+    "I": "idle",
+}
+
+
+@dataclass
+class LinuxProcessSnapshot(ProcessSnapshot):
+    """ProcessSnapshot with the Linux-only fields."""
+
+    uid: int = -1
+    starttime: int = 0  # clock ticks since boot (/proc/[pid]/stat field 22)
+    cgroup: str = ""
+
+
+@dataclass
+class ProcessChange:
+    """A known process whose identity fields changed (exec, setuid, reparent)."""
+
+    process: LinuxProcessSnapshot
+    changes: Dict[str, Tuple[Any, Any]]  # field -> (old, new)
+
+
+@dataclass
+class _Stat:
+    comm: str
+    state: str
+    ppid: int
+    cpu_ticks: int
+    num_threads: int
+    starttime: int
+    rss_pages: int
+
+
+@dataclass
+class _Entry:
+    snap: LinuxProcessSnapshot
+    cpu_ticks: int
+    sampled_at: float
+
+
+class ProcessTree:
+    """Parent-chain index over the live processes, updated incrementally."""
+
+    def __init__(self) -> None:
+        self._parent: Dict[int, int] = {}
+        self._children: Dict[int, Set[int]] = {}
+
+    def add(self, pid: int, ppid: int) -> None:
+        self._parent[pid] = ppid
+        self._children.setdefault(ppid, set()).add(pid)
+
+    def remove(self, pid: int) -> None:
+        ppid = self._parent.pop(pid, None)
+        if ppid is not None:
+            siblings = self._children.get(ppid)
+            if siblings is not None:
+                siblings.discard(pid)
+                if not siblings:
+                    del self._children[ppid]
+
+    def reparent(self, pid: int, ppid: int) -> None:
+        self.remove(pid)
+        self.add(pid, ppid)
+
+    def __contains__(self, pid: int) -> bool:
+        return pid in self._parent
+
+    def __len__(self) -> int:
+        return len(self._parent)
+
+    def parent(self, pid: int) -> Optional[int]:
+        return self._parent.get(pid)
+
+    def children(self, pid: int) -> List[int]:
+        return sorted(self._children.get(pid, ()))
+
+    def ancestors(self, pid: int, max_depth: int = 64) -> List[int]:
+        """Parent chain from the immediate parent up to the root."""
+        chain: List[int] = []
+        seen = {pid}
+        ppid = self._parent.get(pid)
+        while ppid is not None and ppid not in seen and len(chain) < max_depth:
+            chain.append(ppid)
+            seen.add(ppid)
+            ppid = self._parent.get(ppid)
+        return chain
+
+    def descendants(self, pid: int) -> List[int]:
+        """Every process below ``pid``, breadth first."""
+        out: List[int] = []
+        queue = deque(self.children(pid))
+        seen = {pid}
+        while queue:
+            child = queue.popleft()
+            if child in seen:
+                continue
+            seen.add(child)
+            out.append(child)
+            queue.extend(self.children(child))
+        return out
+
+
+class LinuxProcessCollector:
+    """Collects incremental process snapshots from /proc.
+
+    Returns shared_data dict with keys:
+        processes: List[LinuxProcessSnapshot] — all live processes
+        spawned: List[LinuxProcessSnapshot] — new since the last cycle
+        exited: List[LinuxProcessSnapshot] — gone since (last known state)
+        changed: List[ProcessChange] — exec/setuid/reparent in known processes
+        process_tree: ProcessTree — parent-chain index
+        own_user_count: int — processes with full visibility
+        total_count: int — total process count
+        collection_time_ms: float — how long collection took
+        current_uid: int — our UID
+        files_read: int — procfs reads this cycle
+
+    Args:
+        device_id: Used for process GUIDs
+        proc_root: procfs mount point
+        revalidate_per_cycle: Known processes re-read per cycle
+    """
+
+    def __init__(
+        self,
+        device_id: str = "",
+        proc_root: str = "/proc",
+        revalidate_per_cycle: int = DEFAULT_REVALIDATE_PER_CYCLE,
+    ) -> None:
+        self.device_id = device_id or os.uname().nodename
+        self.proc_root = proc_root
+        self.revalidate_per_cycle = revalidate_per_cycle
+        self._current_uid = os.getuid()
+        self._clk_tck = os.sysconf("SC_CLK_TCK") if hasattr(os, "sysconf") else 100
+        self._page_size = os.sysconf("SC_PAGE_SIZE") if hasattr(os, "sysconf") else 4096
+        self._boot_time: Optional[float] = None
+        self._mem_total: Optional[int] = None
+        self._entries: Dict[int, _Entry] = {}
+        self._revalidate: Deque[int] = deque()
+        self._queued: Set[int] = set()
+        self._busy: Set[int] = set()  # used CPU at their last look
+        self._users: Dict[int, str] = {}
+        self._processes: List[LinuxProcessSnapshot] = []
+        self._own_user_count = 0
+        self._dirty = True
+        self._reads = 0
+        self.tree = ProcessTree()
+
+    # ------------------------------------------------------------------
+    # procfs access
+    # ------------------------------------------------------------------
+
+    def _read(self, *parts: str) -> Optional[bytes]:
+        self._reads += 1
+        try:
+            fd = os.open(os.path.join(self.proc_root, *parts), os.O_RDONLY)
+        except OSError:
+            return None
+        try:
+            chunks = []
+            while True:
+                chunk = os.read(fd, 65536)
+                if not chunk:
+                    break
+                chunks.append(chunk)
+            return b"".join(chunks)
+        except OSError:
+            return None
+        finally:
+            os.close(fd)
+
+    def _readlink(self, *parts: str) -> str:
+        self._reads += 1
+        try:
+            return os.readlink(os.path.join(self.proc_root, *parts))
+        except OSError:
+            return ""
+
+    def _list_pids(self) -> Set[int]:
+        try:
+            with os.scandir(self.proc_root) as it:
+                return {int(e.name) for e in it if e.name.isdigit()}
+        except OSError as e:
+            logger.error("Cannot list %s: %s", self.proc_root, e)
+            return set()
+
+    def _read_stat(self, pid: str) -> Optional[_Stat]:
+        raw = self._read(pid, "stat")
+        if not raw:
+            return None
+        text = raw.decode("utf-8", "replace")
+        # comm may contain spaces and parens; it ends at the last ')'
+        open_, close = text.find("("), text.rfind(")")
+        if open_ < 0 or close < 0:
+            return None
+        rest = text[close + 2 :].split()
+        try:
+            return _Stat(
+                comm=text[open_ + 1 : close],
+                state=rest[0],
+                ppid=int(rest[1]),
+                cpu_ticks=int(rest[11]) + int(rest[12]),
+                num_threads=int(rest[17]),
+                starttime=int(rest[19]),
+                rss_pages=int(rest[21]),
+            )
+        except (IndexError, ValueError):
+            return None
+
+    def _read_uid(self, pid: str) -> int:
+        raw = self._read(pid, "status")
+        if raw:
+            for line in raw.split(b"\n"):
+                if line.startswith(b"Uid:"):
+                    try:
+                        return int(line.split()[1])  # real uid
+                    except (IndexError, ValueError):
+                        break
+        return -1
+
+    def _read_cmdline(self, pid: str) -> List[str]:
+        raw = self._read(pid, "cmdline")
+        if not raw:
+            return []
+        return [a.decode("utf-8", "replace") for a in raw.rstrip(b"\0").split(b"\0")]
+
+    def _read_cgroup(self, pid: str) -> str:
+        raw = self._read(pid, "cgroup")
+        if not raw:
+            return ""
+        # cgroup v2 has a single "0::/path" line; v1 lists one per hierarchy
+        lines = raw.decode("utf-8", "replace").strip().splitlines()
+        for line in lines:
+            if line.startswith("0::"):
+                return line[3:]
+        return lines[0].split(":", 2)[-1] if lines else ""
+
+    def _host_info(self) -> None:
+        if self._boot_time is None:
+            raw = self._read("stat") or b""
+            for line in raw.split(b"\n"):
+                if line.startswith(b"btime"):
+                    self._boot_time = float(line.split()[1])
+                    break
+            else:
+                self._boot_time = 0.0
+        if self._mem_total is None:
+            raw = self._read("meminfo") or b""
+            for line in raw.split(b"\n"):
+                if line.startswith(b"MemTotal:"):
+                    self._mem_total = int(line.split()[1]) * 1024
+                    break
+            else:
+                self._mem_total = 0
+
+    def _username(self, uid: int) -> str:
+        name = self._users.get(uid)
+        if name is None:
+            try:
+                name = pwd.getpwuid(uid).pw_name
+            except (KeyError, OverflowError):
+                name = str(uid) if uid >= 0 else ""
+            self._users[uid] = name
+        return name
+
+    # ------------------------------------------------------------------
+    # Snapshot building
+    # ------------------------------------------------------------------
+
+    def _resources(
+        self, stat: _Stat, prev: Optional[_Entry], now: float
+    ) -> Tuple[Optional[float], Optional[float]]:
+        cpu = None
+        if prev is not None and now > prev.sampled_at:
+            used = (stat.cpu_ticks - prev.cpu_ticks) / self._clk_tck
+            cpu = round(100.0 * used / (now - prev.sampled_at), 1)
+        mem = None
+        if self._mem_total:
+            mem = round(100.0 * stat.rss_pages * self._page_size / self._mem_total, 2)
+        return cpu, mem
+
+    def _new_entry(self, pid: int, stat: _Stat, now: float) -> _Entry:
+        spid = str(pid)
+        uid = self._read_uid(spid)
+        create_time = (self._boot_time or 0.0) + stat.starttime / self._clk_tck
+        _, mem = self._resources(stat, None, now)
+        snap = LinuxProcessSnapshot(
+            pid=pid,
+            name=stat.comm,
+            exe=self._readlink(spid, "exe"),
+            cmdline=self._read_cmdline(spid),
+            username=self._username(uid),
+            ppid=stat.ppid,
+            parent_name="",
+            create_time=create_time,
+            cpu_percent=None,
+            memory_percent=mem,
+            num_threads=stat.num_threads,
+            num_fds=None,
+            status=_STATE_NAMES.get(stat.state, stat.state),
+            cwd="",
+            environ=None,
+            is_own_user=self._current_uid == 0 or uid == self._current_uid,
+            process_guid=_make_guid(self.device_id, pid, create_time),
+            uid=uid,
+            starttime=stat.starttime,
+            cgroup=self._read_cgroup(spid),
+        )
+        return _Entry(snap, stat.cpu_ticks, now)
+
+    def _sample(self, entry: _Entry, stat: _Stat, now: float) -> None:
+        """Update the volatile fields of a known process from its stat."""
+        snap = entry.snap
+        snap.cpu_percent, snap.memory_percent = self._resources(stat, entry, now)
+        snap.num_threads = stat.num_threads
+        snap.status = _STATE_NAMES.get(stat.state, stat.state)
+        if stat.cpu_ticks != entry.cpu_ticks:
+            self._busy.add(snap.pid)
+        else:
+            self._busy.discard(snap.pid)
+        entry.cpu_ticks, entry.sampled_at = stat.cpu_ticks, now
+
+    def _refresh(
+        self, entry: _Entry, stat: _Stat, now: float
+    ) -> Optional[ProcessChange]:
+        """Re-read a known process; returns its identity changes, if any."""
+        snap = entry.snap
+        spid = str(snap.pid)
+        uid = self._read_uid(spid)
+        cmdline = self._read_cmdline(spid)
+        self._sample(entry, stat, now)
+
+        updates: Dict[str, Any] = {
+            "name": stat.comm,
+            "cmdline": cmdline,
+            "username": self._username(uid),
+            "ppid": stat.ppid,
+        }
+        if stat.comm != snap.name or cmdline != snap.cmdline:
+            # exec(): the binary (and possibly the cgroup) may have changed too
+            updates["exe"] = self._readlink(spid, "exe")
+            updates["cgroup"] = self._read_cgroup(spid)
+        changes = {
+            f: (getattr(snap, f), v)
+            for f, v in updates.items()
+            if getattr(snap, f) != v
+        }
+        if not changes:
+            return None
+        if uid != snap.uid:
+            updates["uid"] = uid
+            updates["is_own_user"] = self._current_uid == 0 or uid == self._current_uid
+        # Identity changes get a new snapshot, so one reported in an earlier
+        # cycle keeps the identity it was reported with (the volatile
+        # fields above are shared and always current)
+        entry.snap = replace(snap, **updates)
+        return ProcessChange(
+            entry.snap, {f: c for f, c in changes.items() if f in TRACKED_FIELDS}
+        )
+
+    def _parent_name(self, ppid: int) -> str:
+        parent = self._entries.get(ppid)
+        return parent.snap.name if parent is not None else ""
+
+    def _enqueue(self, pid: int) -> None:
+        if pid not in self._queued:
+            self._queued.add(pid)
+            self._revalidate.append(pid)
+
+    def _take_revalidation_slice(self, live: Set[int]) -> Iterator[int]:
+        budget = min(self.revalidate_per_cycle, len(self._revalidate))
+        for _ in range(budget):
+            pid = self._revalidate.popleft()
+            if pid in live and pid in self._entries:
+                self._revalidate.append(pid)
+                yield pid
+            else:
+                self._queued.discard(pid)
+
+    def collect(self) -> Dict[str, Any]:
+        """Collect one incremental cycle.
+
+        Returns dict for ProbeContext.shared_data.
+        """
+        start = time.monotonic()
+        self._reads = 0
+        self._host_info()
+        now = time.time()
+
+        live = self._list_pids()
+        spawned: List[LinuxProcessSnapshot] = []
+        exited: List[LinuxProcessSnapshot] = []
+        changed: List[ProcessChange] = []
+
+        for pid in [p for p in self._entries if p not in live]:
+            exited.append(self._drop(pid))
+
+        revalidate = list(self._take_revalidation_slice(live))
+        # Busy processes outside the slice only need a stat read, unless
+        # that shows an exec or a reparent
+        busy = sorted(self._busy.difference(revalidate))
+        for pid, full in [(p, True) for p in revalidate] + [(p, False) for p in busy]:
+            entry = self._entries[pid]
+            stat = self._read_stat(str(pid))
+            if stat is None:
+                exited.append(self._drop(pid))
+                continue
+            if stat.starttime != entry.snap.starttime:
+                # PID recycled between looks: a different process
+                exited.append(self._drop(pid))
+                spawned.append(self._add(pid, stat, now))
+                continue
+            if not full and (stat.comm, stat.ppid) == (
+                entry.snap.name,
+                entry.snap.ppid,
+            ):
+                self._sample(entry, stat, now)
+                continue
+            change = self._refresh(entry, stat, now)
+            if change is not None:
+                self._dirty = True
+                if "ppid" in change.changes:
+                    self.tree.reparent(pid, stat.ppid)
+                if change.changes:
+                    changed.append(change)
+
+        for pid in sorted(live - self._entries.keys()):
+            stat = self._read_stat(str(pid))
+            if stat is not None:
+                spawned.append(self._add(pid, stat, now))
+
+        # Parents may have been read after their children
+        for snap in spawned:
+            snap.parent_name = self._parent_name(snap.ppid)
+        for change in changed:
+            if change.process.parent_name != self._parent_name(change.process.ppid):
+                change.process.parent_name = self._parent_name(change.process.ppid)
+
+        if self._dirty:
+            self._processes = [e.snap for e in self._entries.values()]
+            self._own_user_count = sum(1 for p in self._processes if p.is_own_user)
+            self._dirty = False
+
+        elapsed_ms = (time.monotonic() - start) * 1000
+        return {
+            "processes": self._processes,
+            "spawned": spawned,
+            "exited": exited,
+            "changed": changed,
+            "process_tree": self.tree,
+            "own_user_count": self._own_user_count,
+            "total_count": len(self._processes),
+            "collection_time_ms": round(elapsed_ms, 2),
+            "current_uid": self._current_uid,
+            "files_read": self._reads,
+        }
+
+    def _add(self, pid: int, stat: _Stat, now: float) -> LinuxProcessSnapshot:
+        entry = self._new_entry(pid, stat, now)
+        self._entries[pid] = entry
+        self._enqueue(pid)
+        self.tree.add(pid, stat.ppid)
+        self._dirty = True
+        return entry.snap
+
+    def _drop(self, pid: int) -> LinuxProcessSnapshot:
+        entry = self._entries.pop(pid)
+        self._busy.discard(pid)
+        self.tree.remove(pid)
+        self._dirty = True
+        return entry.snap
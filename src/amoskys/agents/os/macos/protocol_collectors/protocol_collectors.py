@@ -39,6 +39,7 @@ from typing import Any, Callable, Dict, List, Optional, Sequence, cast
 import grpc
 
 from amoskys.agents.common.base import HardenedAgentBase
+from amoskys.agents.common.batch_publisher import BatchPublisherMixin
 from amoskys.agents.common.probes import (
     MicroProbe,
     MicroProbeAgentMixin,
@@ -76,7 +77,7 @@ QUEUE_PATH = os.environ.get(
 # =============================================================================
 
 
-class EventBusPublisher:
+class EventBusPublisher(BatchPublisherMixin):
     """Wrapper for EventBus gRPC client."""
 
     MANDATE_DATA_FIELDS = (
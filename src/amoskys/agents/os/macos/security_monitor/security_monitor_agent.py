@@ -42,6 +42,7 @@ from typing import Any, Dict, List, Optional, Sequence
 import grpc
 
 from amoskys.agents.common.base import HardenedAgentBase, ValidationResult
+from amoskys.agents.common.batch_publisher import BatchPublisherMixin
 from amoskys.agents.common.probes import (
     MicroProbe,
     MicroProbeAgentMixin,
@@ -77,7 +78,7 @@ QUEUE_PATH = getattr(
 # =============================================================================
 
 
-class EventBusPublisher:
+class EventBusPublisher(BatchPublisherMixin):
     """Wrapper for EventBus gRPC client."""
 
     MANDATE_DATA_FIELDS = (
@@ -48,6 +48,8 @@ FUSION_DB = Path(
 # fleet node set AMOSKYS_FLEET_DB=/var/lib/amoskys/fleet.db and keep
 # AMOSKYS_TELEMETRY_DB pointed at a fresh analyzer-owned DB.
 FLEET_DB = Path(os.environ.get("AMOSKYS_FLEET_DB", str(TELEMETRY_DB)))
+# In-flight Sigma count()/timeframe windows, checkpointed across restarts
+SIGMA_STATE = DATA_DIR / "intel" / "sigma_windows.json"
 
 # Columns the scoring/enrichment pipeline writes onto security_events. fleet.db
 # (authored by command_center) is missing composite_score / risk_score_raw /
@@ -64,6 +66,36 @@ _FLEET_SCORE_COLUMNS = (
 )
 
 
+# Sigma rules match on event_type; probes use event_category with different
+# naming. Map probe categories to sigma conventions.
+_SIGMA_ALIASES = {
+    "macos_launchagent_new": "new_launch_agent",
+    "macos_launchagent_modified": "new_launch_agent",
+    "macos_cron_new": "cron_modification",
+    "macos_cron_modified": "cron_modification",
+    "macos_quarantine_bypass": "quarantine_bypass",
+    "macos_hidden_file_new": "hidden_file_created",
+    "log_tampering_detected": "log_timestamp_gap",
+    "suspicious_script": "suspicious_spawn",
+    "binary_from_temp": "suspicious_spawn",
+    "browser_to_terminal": "browser_to_terminal",
+    "browser_credential_theft": "credential_harvest",
+    "session_cookie_theft": "session_cookie_theft",
+    "keychain_cli_abuse": "credential_harvest",
+    "exfil_spike": "data_exfil_http",
+    "cloud_exfil_detected": "cloud_storage_connection",
+    "cloud_sync_active": "cloud_storage_connection",
+    "c2_beacon_suspect": "c2_web_beacon",
+    "connection_burst_detected": "c2_web_beacon",
+    "cleartext_protocol": "data_exfil_http",
+    "lateral_ssh": "outbound_ssh",
+    "high_cpu": "crypto_mining_detected",
+    "fake_password_dialog": "fake_password_dialog",
+    "port_scan_detected": "schema_enumeration",
+    "long_lived_connection": "long_lived_connection",
+}
+
+
 def _ensure_fleet_score_columns(conn) -> None:
     """Idempotently add the scoring columns to security_events.
 
@@ -142,6 +174,8 @@ def _rescore_fleet_db(
     the raw event but no brain-computed scores. This makes the analyzer ("the
     brain") the scorer for fleet events: it enriches each unscored row, runs the
     ScoringEngine, best-effort feeds fusion, and writes the 8 score columns back.
+    Rows are scored ``_COMMIT_EVERY`` at a time through
+    ``ScoringEngine.score_batch`` so the ML models run once per chunk.
 
     Continuous drain + short transactions: instead of scoring a single LIMIT
     ``batch`` slice per invocation (which left ~34% of the fleet unscored, oldest
@@ -227,85 +261,104 @@ def _rescore_fleet_db(
             if not rows:
                 break
 
-            for row in rows:
-                # Bind id up-front (before any risky work) so the error handler
-                # can always name the offending row.
-                try:
-                    row_id = row["id"]
-                except (IndexError, KeyError):
-                    row_id = None
-                try:
-                    event_data = {k: row[k] for k in row.keys()}
-                    device_id = event_data.get("device_id", "") or "unknown"
-
-                    # mitre_techniques is stored as a JSON string in fleet.db —
-                    # decode so scoring/fusion see a list, not a raw string.
-                    mt = event_data.get("mitre_techniques")
-                    if isinstance(mt, str) and mt:
-                        try:
-                            event_data["mitre_techniques"] = json.loads(mt)
-                        except (json.JSONDecodeError, TypeError):
-                            pass
-
-                    # Enrich (GeoIP/ASN/ThreatIntel) then score. Both mutate
-                    # in place.
-                    if enricher is not None:
-                        try:
-                            enricher.enrich(event_data)
-                        except Exception:
-                            logger.debug(
-                                "Fleet enrich failed for id=%s",
-                                row_id,
-                                exc_info=True,
-                            )
+            # Score in micro-batches of ``_COMMIT_EVERY`` rows: one
+            # ScoringEngine.score_batch() call (one ML model call) per chunk,
+            # then the chunk's UPDATEs go out in one short transaction.
+            for start in range(0, len(rows), _COMMIT_EVERY):
+                chunk = []
+                for row in rows[start : start + _COMMIT_EVERY]:
+                    # Bind id up-front (before any risky work) so the error
+                    # handler can always name the offending row.
+                    try:
+                        row_id = row["id"]
+                    except (IndexError, KeyError):
+                        row_id = None
+                    try:
+                        event_data = {k: row[k] for k in row.keys()}
+
+                        # mitre_techniques is stored as a JSON string in
+                        # fleet.db — decode so scoring/fusion see a list.
+                        mt = event_data.get("mitre_techniques")
+                        if isinstance(mt, str) and mt:
+                            try:
+                                event_data["mitre_techniques"] = json.loads(mt)
+                            except (json.JSONDecodeError, TypeError):
+                                pass
+
+                        # Enrich (GeoIP/ASN/ThreatIntel) before scoring.
+                        # Mutates in place.
+                        if enricher is not None:
+                            try:
+                                enricher.enrich(event_data)
+                            except Exception:
+                                logger.debug(
+                                    "Fleet enrich failed for id=%s",
+                                    row_id,
+                                    exc_info=True,
+                                )
+                        chunk.append((row_id, event_data))
+                    except Exception as e:
+                        # One bad row must not abort the batch.
+                        skipped += 1
+                        logger.warning(
+                            "Fleet rescore: skipping row id=%s: %s", row_id, e
+                        )
+
+                errors = scorer.score_batch([event_data for _, event_data in chunk])
 
-                    scorer.score_event(event_data)
-
-                    # Best-effort fusion feed — never let a fusion error abort
-                    # scoring.
-                    if fusion is not None:
-                        try:
-                            view = _build_fusion_view(event_data, device_id)
-                            if view is not None:
-                                fusion.add_event(view)
-                        except Exception:
-                            logger.debug(
-                                "Fleet fusion feed failed for id=%s",
+                for (row_id, event_data), error in zip(chunk, errors):
+                    try:
+                        if error is not None:
+                            raise error
+                        device_id = event_data.get("device_id", "") or "unknown"
+
+                        # Best-effort fusion feed — never let a fusion error
+                        # abort scoring.
+                        if fusion is not None:
+                            try:
+                                view = _build_fusion_view(event_data, device_id)
+                                if view is not None:
+                                    fusion.add_event(view)
+                            except Exception:
+                                logger.debug(
+                                    "Fleet fusion feed failed for id=%s",
+                                    row_id,
+                                    exc_info=True,
+                                )
+
+                        conn.execute(
+                            "UPDATE security_events SET "
+                            "risk_score_raw=?, geometric_score=?, temporal_score=?, "
+                            "behavioral_score=?, composite_score=?, "
+                            "final_classification=?, enrichment_status=?, "
+                            "last_scored=? WHERE id=?",
+                            (
+                                event_data.get("risk_score_raw"),
+                                event_data.get("geometric_score"),
+                                event_data.get("temporal_score"),
+                                event_data.get("behavioral_score"),
+                                event_data.get("composite_score"),
+                                event_data.get("final_classification"),
+                                event_data.get("enrichment_status"),
+                                now_epoch,
                                 row_id,
-                                exc_info=True,
-                            )
+                            ),
+                        )
+                        scored += 1
+                        pending_commit += 1
+                    except Exception as e:
+                        # One bad row must not abort the batch.
+                        skipped += 1
+                        logger.warning(
+                            "Fleet rescore: skipping row id=%s: %s", row_id, e
+                        )
 
-                    conn.execute(
-                        "UPDATE security_events SET "
-                        "risk_score_raw=?, geometric_score=?, temporal_score=?, "
-                        "behavioral_score=?, composite_score=?, "
-                        "final_classification=?, enrichment_status=?, "
-                        "last_scored=? WHERE id=?",
-                        (
-                            event_data.get("risk_score_raw"),
-                            event_data.get("geometric_score"),
-                            event_data.get("temporal_score"),
-                            event_data.get("behavioral_score"),
-                            event_data.get("composite_score"),
-                            event_data.get("final_classification"),
-                            event_data.get("enrichment_status"),
-                            now_epoch,
-                            row_id,
-                        ),
-                    )
-                    scored += 1
-                    pending_commit += 1
-
-                    # Short transaction: commit every ~50 UPDATEs so the write
-                    # lock is held only briefly and command_center inserts do
-                    # not back up behind a long rescore transaction.
-                    if pending_commit >= _COMMIT_EVERY:
-                        conn.commit()
-                        pending_commit = 0
-                except Exception as e:
-                    # One bad row must not abort the batch.
-                    skipped += 1
-                    logger.warning("Fleet rescore: skipping row id=%s: %s", row_id, e)
+                # Short transaction: commit every chunk (~50 UPDATEs) so the
+                # write lock is held only briefly and command_center inserts
+                # do not back up behind a long rescore transaction.
+                if pending_commit > 0:
+                    conn.commit()
+                    pending_commit = 0
 
             # Commit the tail of this sub-batch so scored rows drop out of
             # ``need`` before the next SELECT walks forward.
@@ -389,12 +442,13 @@ def main(run_once: bool = False) -> int:
         logger.warning("ScoringEngine not available: %s", e)
         scorer = None
 
-    # ── Sigma detection-as-code engine (56 stateless rules) ──
+    # ── Sigma detection-as-code engine (56 rules, windowed aggregations) ──
     sigma = None
     try:
         from amoskys.detection.sigma_engine import SigmaEngine
 
         sigma = SigmaEngine()
+        sigma.load_aggregation_state(str(SIGMA_STATE))
         logger.info(
             "SigmaEngine initialized — %d rules loaded, %d techniques covered",
             sigma.rule_count,
@@ -553,6 +607,449 @@ def main(run_once: bool = False) -> int:
     # ── Direct Queue Reader (single-machine mode, bypasses EventBus) ──
     queue_dir = DATA_DIR / "queue"
 
+    # ── Per-record analysis stages ──
+    # Shared by the sequential drain below and the staged AnalyzerPipeline.
+    # _enrich_record touches no analyzer state and may run on pool threads;
+    # _score_record and _store_record run on one thread, in queue order.
+    from amoskys.analyzer_pipeline import (
+        AnalyzerPipeline,
+        build_security_event_data,
+        decode_queue_row,
+    )
+
+    def _enrich_record(rec: dict) -> None:
+        """Enrich a decoded record and build its security_events row."""
+        attrs = rec["attrs"]
+        if rec["kind"] == "security":
+            # Enrich with GeoIP/ASN/ThreatIntel
+            if enrichment is not None:
+                try:
+                    enrichment.enrich(attrs)
+                except Exception:
+                    pass
+            rec["event_data"] = build_security_event_data(rec)
+        # Enrichment for any observation with IP fields
+        elif enrichment is not None and any(
+            attrs.get(k) for k in ("src_ip", "dst_ip", "remote_ip")
+        ):
+            try:
+                enrichment.enrich(attrs)
+            except Exception:
+                pass
+
+    def _score_record(rec: dict) -> None:
+        """Dedup, SOMA, calibration, scoring and Sigma for one record."""
+        attrs = rec["attrs"]
+        if rec["kind"] == "observation":
+            # SOMA: record observation for baseline
+            if soma is not None:
+                try:
+                    soma.observe(
+                        category=rec["domain"],
+                        process=attrs.get("process_name", ""),
+                        path=rec["soma_path"],
+                        domain=rec["domain"],
+                        risk=float(attrs.get("risk_score", 0) or 0),
+                    )
+                except Exception:
+                    pass
+            return
+
+        event_data = rec["event_data"]
+        agent = event_data["collection_agent"]
+
+        # Score the event before storage
+        if dedup.is_duplicate(event_data):
+            rec["duplicate"] = True
+            return
+        dedup.record(event_data)
+
+        # SOMA: record observation + get verdict for probe calibration
+        soma_verdict = None
+        if soma is not None:
+            try:
+                soma.observe(
+                    category=rec["event_category"],
+                    process=attrs.get("process_name", ""),
+                    path=attrs.get("exe", attrs.get("path", "")),
+                    domain=agent,
+                    risk=rec["risk_score"],
+                )
+            except Exception as _obs_err:
+                logger.debug("SOMA observe failed: %s", _obs_err)
+            try:
+                soma_result = soma.assess(
+                    category=rec["event_category"],
+                    process=attrs.get("process_name", ""),
+                    path=attrs.get("exe", attrs.get("path", "")),
+                    risk=rec["risk_score"],
+                )
+                soma_verdict = soma_result.verdict
+            except Exception as _assess_err:
+                logger.debug("SOMA assess failed: %s", _assess_err)
+
+        # Probe calibration: feed SOMA verdict back
+        if probe_cal is not None and soma_verdict:
+            try:
+                probe_name = attrs.get(
+                    "probe_name",
+                    rec["source_component"] or rec["event_category"],
+                )
+                weight = probe_cal.update(probe_name, soma_verdict)
+                # Apply precision weight to risk score
+                if weight < 0.95:
+                    event_data["risk_score"] = round(
+                        event_data["risk_score"] * weight, 4
+                    )
+                    event_data["probe_precision"] = round(weight, 4)
+            except Exception as _cal_err:
+                logger.warning("Probe calibration failed: %s", _cal_err)
+
+        # ASV: update agent activation window and inject into event
+        asv_list = _update_asv(agent)
+        event_data["_asv"] = asv_list
+
+        # Forensic context: fill WHO/HOW/CHAIN from
+        # cross-agent data (process cache, file stat, MITRE)
+        if forensic is not None:
+            try:
+                forensic.enrich_event(event_data)
+            except Exception:
+                logger.debug(
+                    "Forensic enrichment failed",
+                    exc_info=True,
+                )
+
+        if scorer is not None:
+            try:
+                scorer.score_event(event_data)
+            except Exception:
+                pass
+
+        # Sigma detection-as-code: evaluate against 56 rules
+        if sigma is not None:
+            try:
+                # Sigma rules match on event_type; probes
+                # use event_category with different naming.
+                # Map probe categories to sigma conventions.
+                sigma_input = dict(event_data)
+                cat = sigma_input.get("event_category", "")
+                sigma_input["event_type"] = _SIGMA_ALIASES.get(cat, cat)
+                sigma_matches = sigma.evaluate(sigma_input)
+                if sigma_matches:
+                    best = max(
+                        sigma_matches,
+                        key=lambda m: {
+                            "critical": 4,
+                            "high": 3,
+                            "medium": 2,
+                            "low": 1,
+                        }.get(m.level, 0),
+                    )
+                    event_data["detection_source"] = (
+                        event_data.get("detection_source", "") + "|sigma"
+                    )
+                    ind = event_data.get("indicators", {})
+                    if isinstance(ind, str):
+                        ind = json.loads(ind)
+                    ind["sigma_rule_id"] = best.rule_id
+                    ind["sigma_rule_title"] = best.rule_title
+                    ind["sigma_level"] = best.level
+                    event_data["indicators"] = ind
+                    # Promote MITRE from sigma if richer
+                    if best.mitre_techniques:
+                        raw_mt = event_data.get("mitre_techniques", [])
+                        if isinstance(raw_mt, str):
+                            try:
+                                raw_mt = json.loads(raw_mt)
+                            except (
+                                json.JSONDecodeError,
+                                TypeError,
+                            ):
+                                raw_mt = []
+                        existing = set(raw_mt if isinstance(raw_mt, list) else [])
+                        for t in best.mitre_techniques:
+                            existing.add(t)
+                        event_data["mitre_techniques"] = list(existing)
+            except Exception:
+                logger.debug(
+                    "Sigma evaluation failed",
+                    exc_info=True,
+                )
+
+        # ── Tier classification ──
+        # ATTACK: real threat, show to user
+        # OBSERVATION: baseline telemetry, feed SOMA only
+        _risk = event_data.get("risk_score", 0.0) or 0.0
+        _conf = event_data.get("confidence", 0.0) or 0.0
+        _sev = str(attrs.get("severity", rec["event_category"] or "")).upper()
+        _has_sigma = "|sigma" in event_data.get("detection_source", "")
+        if (
+            (_risk >= 0.4 and _conf >= 0.6)
+            or _sev in ("HIGH", "CRITICAL")
+            or _has_sigma
+        ):
+            event_data["tier"] = "attack"
+        else:
+            event_data["tier"] = "observation"
+
+    def _store_record(rec: dict) -> None:
+        """Write one scored record to telemetry.db (and feed fusion)."""
+        attrs = rec["attrs"]
+        if rec["kind"] == "security":
+            if rec.get("duplicate"):
+                return
+            store.insert_security_event(rec["event_data"])
+
+            # Feed fusion engine — use from_protobuf() which
+            # promotes SecurityEvent into typed audit/process/flow
+            # views that fusion rules can match against
+            if fusion:
+                view = rec.get("view")
+                if view is None:
+                    logger.warning("Failed to feed fusion: %s", rec.get("view_error"))
+                    return
+                try:
+                    _probe_nm = attrs.get(
+                        "probe_name",
+                        rec["source_component"] or rec["event_category"],
+                    )
+                    view.probe_name = _probe_nm
+                    view.collection_agent = rec["source_component"] or ""
+                    view.probe_precision = (
+                        probe_cal.get_weight(_probe_nm) if probe_cal else 1.0
+                    )
+                    fusion.add_event(view)
+                except Exception as e:
+                    logger.warning("Failed to feed fusion: %s", e)
+            return
+
+        # Route observations to domain-specific tables
+        domain = rec["domain"]
+        ts_ns = rec["ts_ns"]
+
+        # Build common fields
+        from datetime import datetime as _dt_cls
+        from datetime import timezone as _tz_cls
+
+        _ts_dt = _dt_cls.fromtimestamp(ts_ns / 1e9, tz=_tz_cls.utc).isoformat()
+        _base = {
+            "timestamp_ns": ts_ns,
+            "timestamp_dt": _ts_dt,
+            "device_id": rec["device_id"],
+            "collection_agent": rec["collection_agent"],
+            "agent_version": rec["agent_version"],
+            "event_source": "observation",
+        }
+
+        try:
+            if domain == "process":
+                store.insert_process_event(
+                    {
+                        **_base,
+                        "pid": attrs.get("pid"),
+                        "exe": attrs.get("exe"),
+                        "cmdline": attrs.get("cmdline"),
+                        "ppid": attrs.get("ppid"),
+                        "username": attrs.get("username"),
+                        "name": attrs.get("name", attrs.get("process_name")),
+                        "parent_name": attrs.get("parent_name"),
+                        "status": attrs.get("status"),
+                        "cpu_percent": attrs.get("cpu_percent"),
+                        "memory_percent": attrs.get("memory_percent"),
+                        "create_time": attrs.get("create_time"),
+                        "process_guid": attrs.get("process_guid"),
+                    }
+                )
+
+                # Populate process_genealogy for kill chain tracking
+                _pid = attrs.get("pid")
+                if _pid is not None:
+                    try:
+                        store.db.execute(
+                            """INSERT OR REPLACE INTO process_genealogy
+                            (device_id, pid, ppid, name, exe, cmdline, username,
+                             parent_name, create_time, is_alive, first_seen_ns, last_seen_ns, process_guid)
+                            VALUES (?,?,?,?,?,?,?,?,?,1,?,?,?)""",
+                            (
+                                rec["device_id"],
+                                int(_pid) if _pid else 0,
+                                int(attrs.get("ppid") or 0),
+                                attrs.get(
+                                    "name",
+                                    attrs.get("process_name"),
+                                ),
+                                attrs.get("exe"),
+                                attrs.get("cmdline"),
+                                attrs.get("username"),
+                                attrs.get("parent_name"),
+                                attrs.get("create_time"),
+                                ts_ns,
+                                ts_ns,
+                                attrs.get("process_guid"),
+                            ),
+                        )
+                    except Exception:
+                        pass
+
+            elif domain == "flow":
+                # Unique ns offset per flow event —
+                # prevents UNIQUE constraint collision
+                _flow_counter = getattr(store, "_flow_ns_ctr", 0) + 1
+                store._flow_ns_ctr = _flow_counter
+                _flow_ts = _base["timestamp_ns"] + (_flow_counter % 1_000_000)
+                store.insert_flow_event(
+                    {
+                        **_base,
+                        "timestamp_ns": _flow_ts,
+                        "src_ip": attrs.get("src_ip"),
+                        "dst_ip": attrs.get("dst_ip"),
+                        "src_port": attrs.get("src_port"),
+                        "dst_port": attrs.get("dst_port"),
+                        "protocol": attrs.get("protocol"),
+                        "bytes_tx": int(attrs.get("bytes_tx", 0) or 0),
+                        "bytes_rx": int(attrs.get("bytes_rx", 0) or 0),
+                        "pid": attrs.get("pid"),
+                        "process_name": attrs.get("process_name"),
+                        "conn_user": attrs.get("conn_user"),
+                        "state": attrs.get("state"),
+                        "geo_dst_country": attrs.get("geo_dst_country"),
+                        "geo_dst_city": attrs.get("geo_dst_city"),
+                        "geo_dst_latitude": attrs.get("geo_dst_latitude"),
+                        "geo_dst_longitude": attrs.get("geo_dst_longitude"),
+                        "asn_dst_org": attrs.get("asn_dst_org"),
+                        "asn_dst_number": attrs.get("asn_dst_number"),
+                        "asn_dst_network_type": attrs.get("asn_dst_network_type"),
+                        "threat_intel_match": attrs.get("threat_intel_match", False),
+                    }
+                )
+
+            elif domain == "dns":
+                store.insert_dns_event(
+                    {
+                        **_base,
+                        "domain": attrs.get("domain"),
+                        "record_type": attrs.get("record_type"),
+                        "response_code": attrs.get("response_code"),
+                        "risk_score": float(attrs.get("risk_score", 0) or 0),
+                        "event_type": attrs.get("event_type", "query"),
+                        "process_name": attrs.get("process_name"),
+                        "pid": attrs.get("pid"),
+                    }
+                )
+
+            elif domain in ("fim", "filesystem"):
+                _name = attrs.get("name", "")
+                _ext = ""
+                if _name and "." in _name:
+                    _ext = "." + _name.rsplit(".", 1)[-1]
+                store.insert_fim_event(
+                    {
+                        **_base,
+                        "path": attrs.get("path"),
+                        "file_extension": attrs.get("extension", _ext),
+                        "change_type": attrs.get("change_type", "snapshot"),
+                        "new_hash": attrs.get("sha256", ""),
+                        "owner_uid": int(attrs.get("uid", 0) or 0),
+                        "is_suid": attrs.get("is_suid", False),
+                        "mtime": attrs.get("mtime"),
+                        "size": int(attrs.get("size", 0) or 0),
+                        "risk_score": float(attrs.get("risk_score", 0) or 0),
+                        "event_type": "file_snapshot",
+                        "raw_attributes_json": json.dumps(attrs),
+                    }
+                )
+
+            elif domain == "persistence":
+                store.insert_persistence_event(
+                    {
+                        **_base,
+                        "mechanism": attrs.get(
+                            "mechanism",
+                            attrs.get("category", ""),
+                        ),
+                        "path": attrs.get("path"),
+                        "change_type": attrs.get("change_type"),
+                        "label": attrs.get("label", attrs.get("name", "")),
+                        "sha256": attrs.get("sha256"),
+                        "risk_score": float(attrs.get("risk_score", 0) or 0),
+                    }
+                )
+
+            elif domain == "peripheral":
+                store.insert_peripheral_event(
+                    {
+                        **_base,
+                        "peripheral_device_id": attrs.get("device_id", ""),
+                        "event_type": attrs.get("event_type", "DETECTED"),
+                        "device_name": attrs.get("device_name"),
+                        "device_type": attrs.get("device_type"),
+                        "vendor_id": attrs.get("vendor_id"),
+                        "risk_score": float(attrs.get("risk_score", 0) or 0),
+                    }
+                )
+
+            elif domain == "auth":
+                store.insert_audit_event(
+                    {
+                        **_base,
+                        "event_type": attrs.get("event_type", "auth"),
+                        # Map auth-specific fields from collector
+                        "pid": attrs.get("client_pid") or attrs.get("pid"),
+                        "exe": attrs.get("client_exe") or attrs.get("exe"),
+                        "comm": attrs.get("process", ""),
+                        "username": attrs.get("username", ""),
+                        "source_ip": attrs.get("source_ip", ""),
+                        "reason": attrs.get("message", "")[:500],
+                        "risk_score": float(attrs.get("risk_score", 0) or 0),
+                        "raw_attributes_json": json.dumps(
+                            {k: v for k, v in attrs.items() if k not in ("message",)},
+                            default=str,
+                        ),
+                    }
+                )
+
+            else:
+                # Unknown domain → generic observation table
+                store.insert_observation_event(
+                    {
+                        "event_id": rec["event_id"],
+                        "device_id": rec["device_id"],
+                        "domain": domain,
+                        "event_timestamp_ns": ts_ns,
+                        "raw_attributes_json": json.dumps(attrs),
+                    }
+                )
+
+        except Exception as e:
+            # Fallback: store in generic observations
+            try:
+                store.insert_observation_event(
+                    {
+                        "event_id": rec["event_id"],
+                        "device_id": rec["device_id"],
+                        "domain": domain,
+                        "event_timestamp_ns": ts_ns,
+                        "raw_attributes_json": json.dumps(attrs),
+                    }
+                )
+            except Exception:
+                logger.debug(
+                    "Failed to store %s observation: %s",
+                    domain,
+                    e,
+                )
+
+    def _queue_paths(rotate: int = 0) -> list:
+        """Agent queue DBs, rotated so no single queue always leads."""
+        import glob
+
+        qpaths = sorted(glob.glob(str(queue_dir / "*.db")))
+        if qpaths and rotate:
+            r = rotate % len(qpaths)
+            qpaths = qpaths[r:] + qpaths[:r]
+        return qpaths
+
     def _drain_agent_queues(budget, rotate=0):
         """Read events directly from per-agent queue DBs into telemetry.db.
 
@@ -566,18 +1063,12 @@ def main(run_once: bool = False) -> int:
         replaces the old hardcoded LIMIT 5000-per-queue-per-cycle, which made one
         cycle drain the entire backlog and run for hours.
         """
-        import glob
         import sqlite3 as _sqlite3
 
-        from amoskys.proto import universal_telemetry_pb2 as pb2
-
         total = 0
-        qpaths = sorted(glob.glob(str(queue_dir / "*.db")))
-        if qpaths and rotate:
-            r = rotate % len(qpaths)
-            qpaths = qpaths[r:] + qpaths[:r]
+        with_views = fusion is not None
         per_queue_cap = max(1, budget // 4)  # no single queue takes >1/4 of a cycle
-        for qdb_path in qpaths:
+        for qdb_path in _queue_paths(rotate):
             remaining = budget - total
             if remaining <= 0:
                 break
@@ -595,627 +1086,10 @@ def main(run_once: bool = False) -> int:
                 processed_ids = []
                 for row_id, raw_bytes in rows:
                     try:
-                        dt = pb2.DeviceTelemetry()
-                        dt.ParseFromString(raw_bytes)
-
-                        for ev in dt.events:
-                            if ev.event_type == "SECURITY" and ev.HasField(
-                                "security_event"
-                            ):
-                                se = ev.security_event
-                                attrs = dict(ev.attributes)
-
-                                # Enrich with GeoIP/ASN/ThreatIntel
-                                if enrichment is not None:
-                                    try:
-                                        enrichment.enrich(attrs)
-                                    except Exception:
-                                        pass
-
-                                # Derive detection_source for agent
-                                # attribution when collection_agent
-                                # is empty
-                                agent = dt.collection_agent or attrs.get(
-                                    "detection_source", ""
-                                )
-
-                                event_data = {
-                                    "event_id": ev.event_id,
-                                    "device_id": dt.device_id,
-                                    "event_type": ev.event_type,
-                                    "event_category": se.event_category,
-                                    "event_action": attrs.get(
-                                        "event_action", se.event_category
-                                    ),
-                                    "event_outcome": "alert",
-                                    "risk_score": se.risk_score,
-                                    "confidence": float(attrs.get("confidence", "0.5")),
-                                    "mitre_techniques": list(se.mitre_techniques),
-                                    "collection_agent": agent,
-                                    "description": attrs.get("description", ""),
-                                    "raw_attributes_json": json.dumps(attrs),
-                                    "event_timestamp_ns": ev.event_timestamp_ns
-                                    or dt.timestamp_ns,
-                                    # Enrichment results (enricher writes geo_dst_*/asn_dst_*
-                                    # because IP is promoted from remote_ip → dst_ip)
-                                    "geo_src_country": attrs.get("geo_src_country")
-                                    or attrs.get("geo_dst_country"),
-                                    "geo_src_city": attrs.get("geo_src_city")
-                                    or attrs.get("geo_dst_city"),
-                                    "geo_src_latitude": attrs.get("geo_src_latitude")
-                                    or attrs.get("geo_dst_latitude"),
-                                    "geo_src_longitude": attrs.get("geo_src_longitude")
-                                    or attrs.get("geo_dst_longitude"),
-                                    "asn_src_org": attrs.get("asn_src_org")
-                                    or attrs.get("asn_dst_org"),
-                                    "asn_src_number": attrs.get("asn_src_number")
-                                    or attrs.get("asn_dst_number"),
-                                    "asn_src_network_type": attrs.get(
-                                        "asn_src_network_type"
-                                    )
-                                    or attrs.get("asn_dst_network_type"),
-                                    "threat_intel_match": attrs.get(
-                                        "threat_intel_match", False
-                                    ),
-                                    "enrichment_status": attrs.get(
-                                        "enrichment_status", "raw"
-                                    ),
-                                    # Typed columns from probe attributes
-                                    "remote_ip": attrs.get("remote_ip"),
-                                    "remote_port": attrs.get("remote_port"),
-                                    "process_name": attrs.get("process_name"),
-                                    "pid": attrs.get("pid"),
-                                    "exe": attrs.get("exe"),
-                                    "cmdline": attrs.get("cmdline"),
-                                    "username": attrs.get("username"),
-                                    "protocol": attrs.get("protocol"),
-                                    "domain": attrs.get("domain"),
-                                    "path": attrs.get("path"),
-                                    "sha256": attrs.get("sha256"),
-                                    "probe_name": attrs.get("probe_name"),
-                                    "detection_source": attrs.get("detection_source"),
-                                }
-
-                                # Score the event before storage
-                                if dedup.is_duplicate(event_data):
-                                    continue
-                                dedup.record(event_data)
-
-                                # SOMA: record observation + get verdict for probe calibration
-                                soma_verdict = None
-                                if soma is not None:
-                                    try:
-                                        soma.observe(
-                                            category=se.event_category,
-                                            process=attrs.get("process_name", ""),
-                                            path=attrs.get(
-                                                "exe", attrs.get("path", "")
-                                            ),
-                                            domain=agent,
-                                            risk=se.risk_score,
-                                        )
-                                    except Exception as _obs_err:
-                                        logger.debug(
-                                            "SOMA observe failed: %s", _obs_err
-                                        )
-                                    try:
-                                        soma_result = soma.assess(
-                                            category=se.event_category,
-                                            process=attrs.get("process_name", ""),
-                                            path=attrs.get(
-                                                "exe", attrs.get("path", "")
-                                            ),
-                                            risk=se.risk_score,
-                                        )
-                                        soma_verdict = soma_result.verdict
-                                    except Exception as _assess_err:
-                                        logger.debug(
-                                            "SOMA assess failed: %s", _assess_err
-                                        )
-
-                                # Probe calibration: feed SOMA verdict back
-                                if probe_cal is not None and soma_verdict:
-                                    try:
-                                        probe_name = attrs.get(
-                                            "probe_name",
-                                            ev.source_component or se.event_category,
-                                        )
-                                        weight = probe_cal.update(
-                                            probe_name, soma_verdict
-                                        )
-                                        # Apply precision weight to risk score
-                                        if weight < 0.95:
-                                            event_data["risk_score"] = round(
-                                                event_data["risk_score"] * weight, 4
-                                            )
-                                            event_data["probe_precision"] = round(
-                                                weight, 4
-                                            )
-                                    except Exception as _cal_err:
-                                        logger.warning(
-                                            "Probe calibration failed: %s", _cal_err
-                                        )
-
-                                # ASV: update agent activation window and inject into event
-                                asv_list = _update_asv(agent)
-                                event_data["_asv"] = asv_list
-
-                                # Forensic context: fill WHO/HOW/CHAIN from
-                                # cross-agent data (process cache, file stat, MITRE)
-                                if forensic is not None:
-                                    try:
-                                        forensic.enrich_event(event_data)
-                                    except Exception:
-                                        logger.debug(
-                                            "Forensic enrichment failed",
-                                            exc_info=True,
-                                        )
-
-                                if scorer is not None:
-                                    try:
-                                        scorer.score_event(event_data)
-                                    except Exception:
-                                        pass
-
-                                # Sigma detection-as-code: evaluate against 56 rules
-                                if sigma is not None:
-                                    try:
-                                        # Sigma rules match on event_type; probes
-                                        # use event_category with different naming.
-                                        # Map probe categories to sigma conventions.
-                                        _SIGMA_ALIASES = {
-                                            "macos_launchagent_new": "new_launch_agent",
-                                            "macos_launchagent_modified": "new_launch_agent",
-                                            "macos_cron_new": "cron_modification",
-                                            "macos_cron_modified": "cron_modification",
-                                            "macos_quarantine_bypass": "quarantine_bypass",
-                                            "macos_hidden_file_new": "hidden_file_created",
-                                            "log_tampering_detected": "log_timestamp_gap",
-                                            "suspicious_script": "suspicious_spawn",
-                                            "binary_from_temp": "suspicious_spawn",
-                                            "browser_to_terminal": "browser_to_terminal",
-                                            "browser_credential_theft": "credential_harvest",
-                                            "session_cookie_theft": "session_cookie_theft",
-                                            "keychain_cli_abuse": "credential_harvest",
-                                            "exfil_spike": "data_exfil_http",
-                                            "cloud_exfil_detected": "cloud_storage_connection",
-                                            "cloud_sync_active": "cloud_storage_connection",
-                                            "c2_beacon_suspect": "c2_web_beacon",
-                                            "connection_burst_detected": "c2_web_beacon",
-                                            "cleartext_protocol": "data_exfil_http",
-                                            "lateral_ssh": "outbound_ssh",
-                                            "high_cpu": "crypto_mining_detected",
-                                            "fake_password_dialog": "fake_password_dialog",
-                                            "port_scan_detected": "schema_enumeration",
-                                            "long_lived_connection": "long_lived_connection",
-                                        }
-                                        sigma_input = dict(event_data)
-                                        cat = sigma_input.get("event_category", "")
-                                        sigma_input["event_type"] = _SIGMA_ALIASES.get(
-                                            cat, cat
-                                        )
-                                        sigma_matches = sigma.evaluate(sigma_input)
-                                        if sigma_matches:
-                                            best = max(
-                                                sigma_matches,
-                                                key=lambda m: {
-                                                    "critical": 4,
-                                                    "high": 3,
-                                                    "medium": 2,
-                                                    "low": 1,
-                                                }.get(m.level, 0),
-                                            )
-                                            event_data["detection_source"] = (
-                                                event_data.get("detection_source", "")
-                                                + "|sigma"
-                                            )
-                                            ind = event_data.get("indicators", {})
-                                            if isinstance(ind, str):
-                                                ind = json.loads(ind)
-                                            ind["sigma_rule_id"] = best.rule_id
-                                            ind["sigma_rule_title"] = best.rule_title
-                                            ind["sigma_level"] = best.level
-                                            event_data["indicators"] = ind
-                                            # Promote MITRE from sigma if richer
-                                            if best.mitre_techniques:
-                                                raw_mt = event_data.get(
-                                                    "mitre_techniques", []
-                                                )
-                                                if isinstance(raw_mt, str):
-                                                    try:
-                                                        raw_mt = json.loads(raw_mt)
-                                                    except (
-                                                        json.JSONDecodeError,
-                                                        TypeError,
-                                                    ):
-                                                        raw_mt = []
-                                                existing = set(
-                                                    raw_mt
-                                                    if isinstance(raw_mt, list)
-                                                    else []
-                                                )
-                                                for t in best.mitre_techniques:
-                                                    existing.add(t)
-                                                event_data["mitre_techniques"] = list(
-                                                    existing
-                                                )
-                                    except Exception:
-                                        logger.debug(
-                                            "Sigma evaluation failed",
-                                            exc_info=True,
-                                        )
-
-                                # ── Tier classification ──
-                                # ATTACK: real threat, show to user
-                                # OBSERVATION: baseline telemetry, feed SOMA only
-                                _risk = event_data.get("risk_score", 0.0) or 0.0
-                                _conf = event_data.get("confidence", 0.0) or 0.0
-                                _sev = str(
-                                    attrs.get("severity", se.event_category or "")
-                                ).upper()
-                                _has_sigma = "|sigma" in event_data.get(
-                                    "detection_source", ""
-                                )
-                                if (
-                                    (_risk >= 0.4 and _conf >= 0.6)
-                                    or _sev in ("HIGH", "CRITICAL")
-                                    or _has_sigma
-                                ):
-                                    event_data["tier"] = "attack"
-                                else:
-                                    event_data["tier"] = "observation"
-
-                                store.insert_security_event(event_data)
-
-                                # Feed fusion engine — use from_protobuf() which
-                                # promotes SecurityEvent into typed audit/process/flow
-                                # views that fusion rules can match against
-                                if fusion:
-                                    from amoskys.intel.models import TelemetryEventView
-
-                                    try:
-                                        view = TelemetryEventView.from_protobuf(
-                                            ev, dt.device_id
-                                        )
-                                        _probe_nm = attrs.get(
-                                            "probe_name",
-                                            ev.source_component or se.event_category,
-                                        )
-                                        view.probe_name = _probe_nm
-                                        view.collection_agent = (
-                                            ev.source_component or ""
-                                        )
-                                        view.probe_precision = (
-                                            probe_cal.get_weight(_probe_nm)
-                                            if probe_cal
-                                            else 1.0
-                                        )
-                                        fusion.add_event(view)
-                                    except Exception as e:
-                                        logger.warning("Failed to feed fusion: %s", e)
-
-                            elif ev.event_type == "OBSERVATION":
-                                attrs = dict(ev.attributes)
-                                domain = attrs.get("_domain", dt.collection_agent)
-                                ts_ns = ev.event_timestamp_ns or dt.timestamp_ns
-
-                                # SOMA: record observation for baseline
-                                if soma is not None:
-                                    try:
-                                        soma.observe(
-                                            category=domain,
-                                            process=attrs.get("process_name", ""),
-                                            path=attrs.get(
-                                                "exe",
-                                                attrs.get(
-                                                    "path", attrs.get("dst_ip", "")
-                                                ),
-                                            ),
-                                            domain=domain,
-                                            risk=float(attrs.get("risk_score", 0) or 0),
-                                        )
-                                    except Exception:
-                                        pass
-
-                                # Route observations to domain-specific tables
-                                # Enrichment for any observation with IP fields
-                                if enrichment is not None and any(
-                                    attrs.get(k)
-                                    for k in ("src_ip", "dst_ip", "remote_ip")
-                                ):
-                                    try:
-                                        enrichment.enrich(attrs)
-                                    except Exception:
-                                        pass
-
-                                # Build common fields
-                                from datetime import datetime as _dt_cls
-                                from datetime import timezone as _tz_cls
-
-                                _ts_dt = _dt_cls.fromtimestamp(
-                                    ts_ns / 1e9, tz=_tz_cls.utc
-                                ).isoformat()
-                                _base = {
-                                    "timestamp_ns": ts_ns,
-                                    "timestamp_dt": _ts_dt,
-                                    "device_id": dt.device_id,
-                                    "collection_agent": dt.collection_agent,
-                                    "agent_version": dt.agent_version,
-                                    "event_source": "observation",
-                                }
-
-                                try:
-                                    if domain == "process":
-                                        store.insert_process_event(
-                                            {
-                                                **_base,
-                                                "pid": attrs.get("pid"),
-                                                "exe": attrs.get("exe"),
-                                                "cmdline": attrs.get("cmdline"),
-                                                "ppid": attrs.get("ppid"),
-                                                "username": attrs.get("username"),
-                                                "name": attrs.get(
-                                                    "name", attrs.get("process_name")
-                                                ),
-                                                "parent_name": attrs.get("parent_name"),
-                                                "status": attrs.get("status"),
-                                                "cpu_percent": attrs.get("cpu_percent"),
-                                                "memory_percent": attrs.get(
-                                                    "memory_percent"
-                                                ),
-                                                "create_time": attrs.get("create_time"),
-                                                "process_guid": attrs.get(
-                                                    "process_guid"
-                                                ),
-                                            }
-                                        )
-
-                                        # Populate process_genealogy for kill chain tracking
-                                        _pid = attrs.get("pid")
-                                        if _pid is not None:
-                                            try:
-                                                store.db.execute(
-                                                    """INSERT OR REPLACE INTO process_genealogy
-                                                    (device_id, pid, ppid, name, exe, cmdline, username,
-                                                     parent_name, create_time, is_alive, first_seen_ns, last_seen_ns, process_guid)
-                                                    VALUES (?,?,?,?,?,?,?,?,?,1,?,?,?)""",
-                                                    (
-                                                        dt.device_id,
-                                                        int(_pid) if _pid else 0,
-                                                        int(attrs.get("ppid") or 0),
-                                                        attrs.get(
-                                                            "name",
-                                                            attrs.get("process_name"),
-                                                        ),
-                                                        attrs.get("exe"),
-                                                        attrs.get("cmdline"),
-                                                        attrs.get("username"),
-                                                        attrs.get("parent_name"),
-                                                        attrs.get("create_time"),
-                                                        ts_ns,
-                                                        ts_ns,
-                                                        attrs.get("process_guid"),
-                                                    ),
-                                                )
-                                            except Exception:
-                                                pass
-
-                                    elif domain == "flow":
-                                        # Unique ns offset per flow event —
-                                        # prevents UNIQUE constraint collision
-                                        _flow_counter = (
-                                            getattr(store, "_flow_ns_ctr", 0) + 1
-                                        )
-                                        store._flow_ns_ctr = _flow_counter
-                                        _flow_ts = _base["timestamp_ns"] + (
-                                            _flow_counter % 1_000_000
-                                        )
-                                        store.insert_flow_event(
-                                            {
-                                                **_base,
-                                                "timestamp_ns": _flow_ts,
-                                                "src_ip": attrs.get("src_ip"),
-                                                "dst_ip": attrs.get("dst_ip"),
-                                                "src_port": attrs.get("src_port"),
-                                                "dst_port": attrs.get("dst_port"),
-                                                "protocol": attrs.get("protocol"),
-                                                "bytes_tx": int(
-                                                    attrs.get("bytes_tx", 0) or 0
-                                                ),
-                                                "bytes_rx": int(
-                                                    attrs.get("bytes_rx", 0) or 0
-                                                ),
-                                                "pid": attrs.get("pid"),
-                                                "process_name": attrs.get(
-                                                    "process_name"
-                                                ),
-                                                "conn_user": attrs.get("conn_user"),
-                                                "state": attrs.get("state"),
-                                                "geo_dst_country": attrs.get(
-                                                    "geo_dst_country"
-                                                ),
-                                                "geo_dst_city": attrs.get(
-                                                    "geo_dst_city"
-                                                ),
-                                                "geo_dst_latitude": attrs.get(
-                                                    "geo_dst_latitude"
-                                                ),
-                                                "geo_dst_longitude": attrs.get(
-                                                    "geo_dst_longitude"
-                                                ),
-                                                "asn_dst_org": attrs.get("asn_dst_org"),
-                                                "asn_dst_number": attrs.get(
-                                                    "asn_dst_number"
-                                                ),
-                                                "asn_dst_network_type": attrs.get(
-                                                    "asn_dst_network_type"
-                                                ),
-                                                "threat_intel_match": attrs.get(
-                                                    "threat_intel_match", False
-                                                ),
-                                            }
-                                        )
-
-                                    elif domain == "dns":
-                                        store.insert_dns_event(
-                                            {
-                                                **_base,
-                                                "domain": attrs.get("domain"),
-                                                "record_type": attrs.get("record_type"),
-                                                "response_code": attrs.get(
-                                                    "response_code"
-                                                ),
-                                                "risk_score": float(
-                                                    attrs.get("risk_score", 0) or 0
-                                                ),
-                                                "event_type": attrs.get(
-                                                    "event_type", "query"
-                                                ),
-                                                "process_name": attrs.get(
-                                                    "process_name"
-                                                ),
-                                                "pid": attrs.get("pid"),
-                                            }
-                                        )
-
-                                    elif domain in ("fim", "filesystem"):
-                                        _name = attrs.get("name", "")
-                                        _ext = ""
-                                        if _name and "." in _name:
-                                            _ext = "." + _name.rsplit(".", 1)[-1]
-                                        store.insert_fim_event(
-                                            {
-                                                **_base,
-                                                "path": attrs.get("path"),
-                                                "file_extension": attrs.get(
-                                                    "extension", _ext
-                                                ),
-                                                "change_type": attrs.get(
-                                                    "change_type", "snapshot"
-                                                ),
-                                                "new_hash": attrs.get("sha256", ""),
-                                                "owner_uid": int(
-                                                    attrs.get("uid", 0) or 0
-                                                ),
-                                                "is_suid": attrs.get("is_suid", False),
-                                                "mtime": attrs.get("mtime"),
-                                                "size": int(attrs.get("size", 0) or 0),
-                                                "risk_score": float(
-                                                    attrs.get("risk_score", 0) or 0
-                                                ),
-                                                "event_type": "file_snapshot",
-                                                "raw_attributes_json": json.dumps(
-                                                    attrs
-                                                ),
-                                            }
-                                        )
-
-                                    elif domain == "persistence":
-                                        store.insert_persistence_event(
-                                            {
-                                                **_base,
-                                                "mechanism": attrs.get(
-                                                    "mechanism",
-                                                    attrs.get("category", ""),
-                                                ),
-                                                "path": attrs.get("path"),
-                                                "change_type": attrs.get("change_type"),
-                                                "label": attrs.get(
-                                                    "label", attrs.get("name", "")
-                                                ),
-                                                "sha256": attrs.get("sha256"),
-                                                "risk_score": float(
-                                                    attrs.get("risk_score", 0) or 0
-                                                ),
-                                            }
-                                        )
-
-                                    elif domain == "peripheral":
-                                        store.insert_peripheral_event(
-                                            {
-                                                **_base,
-                                                "peripheral_device_id": attrs.get(
-                                                    "device_id", ""
-                                                ),
-                                                "event_type": attrs.get(
-                                                    "event_type", "DETECTED"
-                                                ),
-                                                "device_name": attrs.get("device_name"),
-                                                "device_type": attrs.get("device_type"),
-                                                "vendor_id": attrs.get("vendor_id"),
-                                                "risk_score": float(
-                                                    attrs.get("risk_score", 0) or 0
-                                                ),
-                                            }
-                                        )
-
-                                    elif domain == "auth":
-                                        store.insert_audit_event(
-                                            {
-                                                **_base,
-                                                "event_type": attrs.get(
-                                                    "event_type", "auth"
-                                                ),
-                                                # Map auth-specific fields from collector
-                                                "pid": attrs.get("client_pid")
-                                                or attrs.get("pid"),
-                                                "exe": attrs.get("client_exe")
-                                                or attrs.get("exe"),
-                                                "comm": attrs.get("process", ""),
-                                                "username": attrs.get("username", ""),
-                                                "source_ip": attrs.get("source_ip", ""),
-                                                "reason": attrs.get("message", "")[
-                                                    :500
-                                                ],
-                                                "risk_score": float(
-                                                    attrs.get("risk_score", 0) or 0
-                                                ),
-                                                "raw_attributes_json": json.dumps(
-                                                    {
-                                                        k: v
-                                                        for k, v in attrs.items()
-                                                        if k not in ("message",)
-                                                    },
-                                                    default=str,
-                                                ),
-                                            }
-                                        )
-
-                                    else:
-                                        # Unknown domain → generic observation table
-                                        store.insert_observation_event(
-                                            {
-                                                "event_id": ev.event_id,
-                                                "device_id": dt.device_id,
-                                                "domain": domain,
-                                                "event_timestamp_ns": ts_ns,
-                                                "raw_attributes_json": json.dumps(
-                                                    attrs
-                                                ),
-                                            }
-                                        )
-
-                                except Exception as e:
-                                    # Fallback: store in generic observations
-                                    try:
-                                        store.insert_observation_event(
-                                            {
-                                                "event_id": ev.event_id,
-                                                "device_id": dt.device_id,
-                                                "domain": domain,
-                                                "event_timestamp_ns": ts_ns,
-                                                "raw_attributes_json": json.dumps(
-                                                    attrs
-                                                ),
-                                            }
-                                        )
-                                    except Exception:
-                                        logger.debug(
-                                            "Failed to store %s observation: %s",
-                                            domain,
-                                            e,
-                                        )
-
+                        for rec in decode_queue_row(raw_bytes, with_views=with_views):
+                            _enrich_record(rec)
+                            _score_record(rec)
+                            _store_record(rec)
                         processed_ids.append(row_id)
                         total += 1
                     except Exception as e:
@@ -1237,6 +1111,25 @@ def main(run_once: bool = False) -> int:
 
     logger.info("Direct queue reader enabled (single-machine mode)")
 
+    # ── Staged pipeline (AMOSKYS_ANALYZER_PIPELINE=1) ──
+    # Runs the same per-record stages as _drain_agent_queues, but decode
+    # (process pool) and enrichment (thread pool) run ahead in the background
+    # while this loop scores and commits finished batches.
+    pipeline = None
+    if AnalyzerPipeline.enabled_from_env():
+        try:
+            pipeline = AnalyzerPipeline.from_env(
+                store,
+                enrich_fn=_enrich_record,
+                score_fn=_score_record,
+                store_fn=_store_record,
+                with_views=fusion is not None,
+            )
+            pipeline.start()
+        except Exception as e:
+            logger.warning("Analyzer pipeline not available, draining inline: %s", e)
+            pipeline = None
+
     # ── Fleet re-scoring mode ──
     # When AMOSKYS_FLEET_RESCORE is truthy (or --once is passed), the brain scores
     # events in a Command-Center fleet DB (TELEMETRY_DB, pointed via
@@ -1289,7 +1182,15 @@ def main(run_once: bool = False) -> int:
             # Direct queue drain (single-machine path — bypasses EventBus).
             # Bounded to DRAIN_MAX_ROWS, rotated by cycle for cross-agent fairness.
             try:
-                drained = _drain_agent_queues(DRAIN_MAX_ROWS, rotate=cycle)
+                if pipeline is not None:
+                    drained = pipeline.process_ready(max_rows=DRAIN_MAX_ROWS)
+                    pipeline.feed(
+                        _queue_paths(cycle),
+                        DRAIN_MAX_ROWS,
+                        per_queue_cap=max(1, DRAIN_MAX_ROWS // 4),
+                    )
+                else:
+                    drained = _drain_agent_queues(DRAIN_MAX_ROWS, rotate=cycle)
                 events_this_cycle += drained
             except Exception:
                 logger.error("Queue drain failed", exc_info=True)
@@ -1397,7 +1298,13 @@ def main(run_once: bool = False) -> int:
                 )
 
             # Write heartbeat
-            _write_heartbeat(cycle, events_this_cycle, total_events_processed, dt)
+            _write_heartbeat(
+                cycle,
+                events_this_cycle,
+                total_events_processed,
+                dt,
+                pipeline=pipeline.stats() if pipeline is not None else None,
+            )
 
         except Exception:
             logger.error("Analysis cycle %d failed", cycle, exc_info=True)
@@ -1405,9 +1312,11 @@ def main(run_once: bool = False) -> int:
         # Adaptive pacing: if we hit the drain budget there is more backlog —
         # loop again almost immediately (high frame rate). If we drained less, we
         # are caught up — relax to 2s to stay cheap.
-        shutdown_event.wait(
-            timeout=0.05 if events_this_cycle >= DRAIN_MAX_ROWS else 2.0
+        # In pipeline mode, batches still in flight count as backlog.
+        busy = events_this_cycle >= DRAIN_MAX_ROWS or (
+            pipeline is not None and not pipeline.idle()
         )
+        shutdown_event.wait(timeout=0.05 if busy else 2.0)
 
     # ── Shutdown: persist state so baselines survive restarts ──
     logger.info(
@@ -1415,6 +1324,8 @@ def main(run_once: bool = False) -> int:
         cycle,
         total_events_processed,
     )
+    if pipeline is not None:
+        pipeline.stop()
     if scorer is not None:
         try:
             scorer.close()
@@ -1423,6 +1334,8 @@ def main(run_once: bool = False) -> int:
             )
         except Exception as e:
             logger.warning("ScoringEngine close failed: %s", e)
+    if sigma is not None and sigma.save_aggregation_state(str(SIGMA_STATE)):
+        logger.info("Sigma aggregation windows persisted")
     if soma is not None:
         try:
             soma.close()
@@ -1437,8 +1350,18 @@ def main(run_once: bool = False) -> int:
     return 0
 
 
-def _write_heartbeat(cycle: int, events_this_cycle: int, total: int, latency_ms: float):
-    """Write heartbeat file for watchdog liveness check."""
+def _write_heartbeat(
+    cycle: int,
+    events_this_cycle: int,
+    total: int,
+    latency_ms: float,
+    pipeline: dict | None = None,
+):
+    """Write heartbeat file for watchdog liveness check.
+
+    In pipeline mode ``pipeline`` carries per-stage queue depth and latency
+    (AnalyzerPipeline.stats()) so a saturated stage is visible.
+    """
     heartbeat_dir = Path("data/heartbeats")
     heartbeat_dir.mkdir(parents=True, exist_ok=True)
     heartbeat = {
@@ -1450,6 +1373,8 @@ def _write_heartbeat(cycle: int, events_this_cycle: int, total: int, latency_ms:
         "timestamp": time.time(),
         "pid": os.getpid(),
     }
+    if pipeline is not None:
+        heartbeat["pipeline"] = pipeline
     try:
         (heartbeat_dir / "analyzer.json").write_text(json.dumps(heartbeat))
     except OSError:
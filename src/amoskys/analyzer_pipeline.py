@@ -0,0 +1,658 @@
+"""AMOSKYS Analyzer Pipeline — staged queue drain for the Analyzer (Tier 2).
+
+The default analyzer loop drains agent queues strictly in sequence: read a
+queue row, ParseFromString, enrich, score, insert — one event at a time in
+one thread.  Decode and enrichment are CPU/lookup bound while the SQLite
+write is I/O bound, so each waits on the other.
+
+This module splits the drain into four stages joined by bounded queues:
+
+    reader (analyzer loop)
+        ↓ QueueBatch (rows from one agent queue DB)
+    decode   — protobuf ParseFromString + fusion view extraction
+               (background thread over a process pool; inline when
+               decode_workers == 0)
+        ↓
+    enrich   — GeoIP / ASN / threat intel + event_data build
+               (background thread over a thread pool)
+        ↓
+    score    — dedup, SOMA, calibration, scoring, Sigma (analyzer loop)
+        ↓
+    store    — one transaction per batch, then delete the acked queue rows
+               (analyzer loop — the single writer)
+
+The loop feeds new rows and commits finished batches each cycle, so batch
+N is scored and written while batches N+1.. are being decoded and enriched.
+
+Every stage consumes batches FIFO and each pool preserves order, so
+events leave the pipeline in the order they were read — per-device order
+is preserved.  Queue rows are deleted only after the batch commits; rows
+of a batch that fails to commit are read again (at-least-once).  Batches
+of the same queue read after a failed one are dropped unwritten and read
+again behind it, so a failure never reorders or duplicates rows.
+
+Enable with AMOSKYS_ANALYZER_PIPELINE=1.  Tunables:
+    AMOSKYS_PIPELINE_DECODE_WORKERS  — decode processes (default: min(4, CPUs))
+    AMOSKYS_PIPELINE_ENRICH_WORKERS  — enrichment threads (default: 4)
+    AMOSKYS_PIPELINE_QUEUE_DEPTH     — batches buffered between stages (default: 8)
+
+Per-stage queue depth, throughput and latency are reported by stats() and
+written into the analyzer heartbeat.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import multiprocessing
+import os
+import queue
+import sqlite3
+import threading
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, field
+from functools import partial
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger("amoskys.analyzer.pipeline")
+
+STAGES = ("decode", "enrich", "score", "store")
+
+# Sentinel passed down the stage queues on shutdown
+_STOP = object()
+
+
+# ── Decode (runs in worker processes — keep it a picklable top-level function) ──
+
+
+def decode_queue_row(raw_bytes: bytes, with_views: bool = False) -> List[dict]:
+    """Decode one queue row (a DeviceTelemetry protobuf) into plain records.
+
+    Only SECURITY events carrying a security_event body and OBSERVATION
+    events are returned; everything else is ignored, as in the sequential
+    drain.  Records are plain dicts so they can cross a process boundary.
+
+    Args:
+        raw_bytes: Serialized DeviceTelemetry.
+        with_views: Also build the TelemetryEventView fusion consumes for
+            each security event (record key ``view``).
+
+    Raises:
+        google.protobuf.message.DecodeError: If the row is corrupted.
+    """
+    from amoskys.proto import universal_telemetry_pb2 as pb2
+
+    dt = pb2.DeviceTelemetry()
+    dt.ParseFromString(raw_bytes)
+
+    records: List[dict] = []
+    for ev in dt.events:
+        ts_ns = ev.event_timestamp_ns or dt.timestamp_ns
+        if ev.event_type == "SECURITY" and ev.HasField("security_event"):
+            se = ev.security_event
+            rec = {
+                "kind": "security",
+                "event_id": ev.event_id,
+                "device_id": dt.device_id,
+                "event_type": ev.event_type,
+                "collection_agent": dt.collection_agent,
+                "source_component": ev.source_component,
+                "event_category": se.event_category,
+                "risk_score": se.risk_score,
+                "mitre_techniques": list(se.mitre_techniques),
+                "attrs": dict(ev.attributes),
+                "ts_ns": ts_ns,
+            }
+            if with_views:
+                from amoskys.intel.models import TelemetryEventView
+
+                try:
+                    rec["view"] = TelemetryEventView.from_protobuf(ev, dt.device_id)
+                except Exception as e:
+                    rec["view"] = None
+                    rec["view_error"] = str(e)
+            records.append(rec)
+        elif ev.event_type == "OBSERVATION":
+            attrs = dict(ev.attributes)
+            records.append(
+                {
+                    "kind": "observation",
+                    "event_id": ev.event_id,
+                    "device_id": dt.device_id,
+                    "collection_agent": dt.collection_agent,
+                    "agent_version": dt.agent_version,
+                    "domain": attrs.get("_domain", dt.collection_agent),
+                    # SOMA keys off the pre-enrichment attributes (enrichment
+                    # promotes remote_ip → dst_ip)
+                    "soma_path": attrs.get(
+                        "exe", attrs.get("path", attrs.get("dst_ip", ""))
+                    ),
+                    "attrs": attrs,
+                    "ts_ns": ts_ns,
+                }
+            )
+    return records
+
+
+def build_security_event_data(rec: dict) -> dict:
+    """Build the security_events row for an enriched security record."""
+    attrs = rec["attrs"]
+    # Derive detection_source for agent attribution when collection_agent
+    # is empty
+    agent = rec["collection_agent"] or attrs.get("detection_source", "")
+    return {
+        "event_id": rec["event_id"],
+        "device_id": rec["device_id"],
+        "event_type": rec["event_type"],
+        "event_category": rec["event_category"],
+        "event_action": attrs.get("event_action", rec["event_category"]),
+        "event_outcome": "alert",
+        "risk_score": rec["risk_score"],
+        "confidence": float(attrs.get("confidence", "0.5")),
+        "mitre_techniques": list(rec["mitre_techniques"]),
+        "collection_agent": agent,
+        "description": attrs.get("description", ""),
+        "raw_attributes_json": json.dumps(attrs),
+        "event_timestamp_ns": rec["ts_ns"],
+        # Enrichment results (enricher writes geo_dst_*/asn_dst_*
+        # because IP is promoted from remote_ip → dst_ip)
+        "geo_src_country": attrs.get("geo_src_country") or attrs.get("geo_dst_country"),
+        "geo_src_city": attrs.get("geo_src_city") or attrs.get("geo_dst_city"),
+        "geo_src_latitude": attrs.get("geo_src_latitude")
+        or attrs.get("geo_dst_latitude"),
+        "geo_src_longitude": attrs.get("geo_src_longitude")
+        or attrs.get("geo_dst_longitude"),
+        "asn_src_org": attrs.get("asn_src_org") or attrs.get("asn_dst_org"),
+        "asn_src_number": attrs.get("asn_src_number") or attrs.get("asn_dst_number"),
+        "asn_src_network_type": attrs.get("asn_src_network_type")
+        or attrs.get("asn_dst_network_type"),
+        "threat_intel_match": attrs.get("threat_intel_match", False),
+        "enrichment_status": attrs.get("enrichment_status", "raw"),
+        # Typed columns from probe attributes
+        "remote_ip": attrs.get("remote_ip"),
+        "remote_port": attrs.get("remote_port"),
+        "process_name": attrs.get("process_name"),
+        "pid": attrs.get("pid"),
+        "exe": attrs.get("exe"),
+        "cmdline": attrs.get("cmdline"),
+        "username": attrs.get("username"),
+        "protocol": attrs.get("protocol"),
+        "domain": attrs.get("domain"),
+        "path": attrs.get("path"),
+        "sha256": attrs.get("sha256"),
+        "probe_name": attrs.get("probe_name"),
+        "detection_source": attrs.get("detection_source"),
+    }
+
+
+# ── Pipeline ──
+
+
+@dataclass
+class QueueBatch:
+    """A run of rows read from one agent queue DB, carried through every stage."""
+
+    qdb_path: str
+    row_ids: List[int]
+    raw: List[bytes]
+    # Filled by decode: one record list per row (None = corrupted row)
+    records: List[Optional[List[dict]]] = field(default_factory=list)
+    started: float = field(default_factory=time.monotonic)
+    # Set when a stage failed as a whole — the batch is re-read, never acked
+    failed: bool = False
+    # Reader epoch of the queue DB when read; a failed batch bumps it
+    epoch: int = 0
+
+
+class StageStats:
+    """Throughput and latency counters for one stage."""
+
+    def __init__(self, name: str, inbox: Optional[queue.Queue]):
+        self.name = name
+        self._inbox = inbox
+        self._lock = threading.Lock()
+        self.batches = 0
+        self.rows = 0
+        self.busy_s = 0.0
+        self.avg_ms = 0.0  # EWMA of per-batch latency
+        self.max_ms = 0.0
+
+    def record(self, rows: int, elapsed_s: float) -> None:
+        ms = elapsed_s * 1000
+        with self._lock:
+            self.batches += 1
+            self.rows += rows
+            self.busy_s += elapsed_s
+            self.avg_ms = ms if self.batches == 1 else 0.8 * self.avg_ms + 0.2 * ms
+            self.max_ms = max(self.max_ms, ms)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return {
+                "queue_depth": self._inbox.qsize() if self._inbox else 0,
+                "batches": self.batches,
+                "rows": self.rows,
+                "busy_s": round(self.busy_s, 3),
+                "avg_ms": round(self.avg_ms, 1),
+                "max_ms": round(self.max_ms, 1),
+            }
+
+
+def _default_decode_workers() -> int:
+    return min(4, os.cpu_count() or 1)
+
+
+class AnalyzerPipeline:
+    """Staged decode → enrich → score → store drain for agent queue DBs.
+
+    Decode and enrich run on background threads (backed by a process pool
+    and a thread pool).  Score and store run on the thread that calls
+    process_ready() — the analyzer loop — because the components they drive
+    (ScoringEngine, SOMA, ProbeCalibrator, FusionEngine, TelemetryStore)
+    hold thread-bound SQLite connections and unsynchronized state.  That
+    thread is the single writer.
+
+    Args:
+        store: TelemetryStore — each batch is written between begin_batch()
+            and end_batch().
+        enrich_fn: Enrich one record in place (called from pool threads).
+        score_fn: Score one record in place (caller thread, in order).
+        store_fn: Write one record (caller thread, inside the transaction).
+        with_views: Forwarded to decode_queue_row.
+        decode_workers: Decode processes; 0 decodes on the decode thread.
+        enrich_workers: Enrichment threads.
+        queue_depth: Max batches buffered in front of each stage.
+    """
+
+    def __init__(
+        self,
+        store: Any,
+        enrich_fn: Callable[[dict], None],
+        score_fn: Callable[[dict], None],
+        store_fn: Callable[[dict], None],
+        with_views: bool = False,
+        decode_workers: Optional[int] = None,
+        enrich_workers: int = 4,
+        queue_depth: int = 8,
+    ):
+        self.store = store
+        self._enrich_fn = enrich_fn
+        self._score_fn = score_fn
+        self._store_fn = store_fn
+        self._decode = partial(decode_queue_row, with_views=with_views)
+        self.decode_workers = (
+            _default_decode_workers() if decode_workers is None else decode_workers
+        )
+        self.enrich_workers = max(1, enrich_workers)
+
+        depth = max(1, queue_depth)
+        self._inboxes: Dict[str, queue.Queue] = {
+            "decode": queue.Queue(maxsize=depth),
+            "enrich": queue.Queue(maxsize=depth),
+            "score": queue.Queue(maxsize=depth),
+        }
+        self._stats = {
+            name: StageStats(name, self._inboxes.get(name)) for name in STAGES
+        }
+
+        # Reader cursors: highest queue row id handed to the pipeline per
+        # queue DB, so rows in flight are not read twice.
+        self._cursor: Dict[str, int] = {}
+        # Bumped per queue DB when a batch fails and the cursor rewinds;
+        # batches read before that are stale and dropped unwritten.
+        self._epoch: Dict[str, int] = {}
+        self._cursor_lock = threading.Lock()
+        self._in_flight = 0  # batches fed but not yet committed or failed
+        self._in_flight_lock = threading.Lock()
+
+        self._decode_pool: Optional[Executor] = None
+        self._enrich_pool: Optional[ThreadPoolExecutor] = None
+        self._threads: List[threading.Thread] = []
+        self.rows_committed = 0
+        self.rows_failed = 0
+        self.commit_latency_ms = 0.0
+
+    @classmethod
+    def enabled_from_env(cls) -> bool:
+        return os.environ.get("AMOSKYS_ANALYZER_PIPELINE", "").lower() in (
+            "1",
+            "true",
+            "yes",
+            "on",
+        )
+
+    @classmethod
+    def from_env(cls, store: Any, **kwargs: Any) -> "AnalyzerPipeline":
+        decode = os.environ.get("AMOSKYS_PIPELINE_DECODE_WORKERS")
+        return cls(
+            store,
+            decode_workers=int(decode) if decode else None,
+            enrich_workers=int(os.environ.get("AMOSKYS_PIPELINE_ENRICH_WORKERS", "4")),
+            queue_depth=int(os.environ.get("AMOSKYS_PIPELINE_QUEUE_DEPTH", "8")),
+            **kwargs,
+        )
+
+    # ── Lifecycle ──
+
+    def start(self) -> None:
+        if self._threads:
+            return
+        if self.decode_workers > 0:
+            self._decode_pool = self._new_decode_pool()
+        self._enrich_pool = ThreadPoolExecutor(
+            max_workers=self.enrich_workers, thread_name_prefix="analyzer-enrich"
+        )
+        for name, target in (
+            ("decode", self._run_decode),
+            ("enrich", self._run_enrich),
+        ):
+            t = threading.Thread(target=target, name=f"analyzer-{name}", daemon=True)
+            t.start()
+            self._threads.append(t)
+        logger.info(
+            "Analyzer pipeline started — decode_workers=%d enrich_workers=%d",
+            self.decode_workers,
+            self.enrich_workers,
+        )
+
+    def _new_decode_pool(self) -> ProcessPoolExecutor:
+        # spawn, not fork: the analyzer already runs threads (shipper,
+        # this pipeline) and fork would copy their locks mid-flight.
+        return ProcessPoolExecutor(
+            max_workers=self.decode_workers,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+
+    def stop(self, timeout: float = 30.0) -> None:
+        """Finish batches already fed, commit them, then stop every stage."""
+        if not self._threads:
+            return
+        deadline = time.monotonic() + timeout
+        while not self.idle() and time.monotonic() < deadline:
+            if not self.process_ready(timeout=0.1):
+                time.sleep(0.01)
+        for name in ("decode", "enrich"):
+            try:
+                self._inboxes[name].put(_STOP, timeout=1.0)
+            except queue.Full:
+                pass  # stage still backed up — daemon thread dies with us
+        for t in self._threads:
+            t.join(timeout=max(0.0, deadline - time.monotonic()))
+        self._threads = []
+        if self._enrich_pool is not None:
+            self._enrich_pool.shutdown(wait=False)
+            self._enrich_pool = None
+        if self._decode_pool is not None:
+            self._decode_pool.shutdown(wait=False, cancel_futures=True)
+            self._decode_pool = None
+
+    # ── Reader side (analyzer loop) ──
+
+    def feed(self, qdb_paths: List[str], budget: int, per_queue_cap: int) -> int:
+        """Read up to ``budget`` new rows across queue DBs into the pipeline.
+
+        Never blocks: when the decode stage is full the remaining queues
+        are left for the next call (backpressure).  Returns the number of
+        rows submitted.
+        """
+        submitted = 0
+        for qdb_path in qdb_paths:
+            remaining = budget - submitted
+            if remaining <= 0 or self._inboxes["decode"].full():
+                break
+            with self._cursor_lock:
+                after = self._cursor.get(qdb_path, 0)
+                epoch = self._epoch.get(qdb_path, 0)
+            try:
+                conn = sqlite3.connect(qdb_path, timeout=2)
+                try:
+                    rows = conn.execute(
+                        "SELECT id, bytes FROM queue WHERE id > ? ORDER BY id LIMIT ?",
+                        (after, min(remaining, per_queue_cap)),
+                    ).fetchall()
+                finally:
+                    conn.close()
+            except sqlite3.Error as e:
+                logger.warning("Queue read failed for %s: %s", qdb_path, e)
+                continue
+            if not rows:
+                continue
+            batch = QueueBatch(
+                qdb_path=qdb_path,
+                row_ids=[r[0] for r in rows],
+                raw=[r[1] for r in rows],
+                epoch=epoch,
+            )
+            try:
+                self._inboxes["decode"].put_nowait(batch)
+            except queue.Full:
+                break
+            with self._cursor_lock:
+                self._cursor[qdb_path] = batch.row_ids[-1]
+            with self._in_flight_lock:
+                self._in_flight += 1
+            submitted += len(rows)
+        return submitted
+
+    # ── Writer side (analyzer loop) ──
+
+    def process_ready(self, max_rows: int = 0, timeout: float = 0.0) -> int:
+        """Score, store and ack batches that finished enrichment.
+
+        Args:
+            max_rows: Stop after this many rows (0 = everything ready).
+            timeout: Wait this long for the first batch when none is ready.
+
+        Returns:
+            Rows committed.
+        """
+        inbox = self._inboxes["score"]
+        committed = 0
+        wait = timeout
+        while not max_rows or committed < max_rows:
+            try:
+                batch = inbox.get(timeout=wait) if wait > 0 else inbox.get_nowait()
+            except queue.Empty:
+                break
+            wait = 0.0
+            try:
+                if self._stale(batch):
+                    continue
+                if not batch.failed:
+                    t0 = time.monotonic()
+                    self._score_batch(batch)
+                    self._stats["score"].record(
+                        len(batch.row_ids), time.monotonic() - t0
+                    )
+                t0 = time.monotonic()
+                if self._store_batch(batch):
+                    committed += len(batch.row_ids)
+                self._stats["store"].record(len(batch.row_ids), time.monotonic() - t0)
+            finally:
+                with self._in_flight_lock:
+                    self._in_flight -= 1
+        return committed
+
+    def _stale(self, batch: QueueBatch) -> bool:
+        """True for a batch read before an earlier batch of its queue failed.
+
+        The cursor was rewound past it, so its rows are read again behind
+        the failed batch; writing it now would store them twice.
+        """
+        with self._cursor_lock:
+            return batch.epoch != self._epoch.get(batch.qdb_path, 0)
+
+    def idle(self) -> bool:
+        """True when every batch fed so far has been committed or failed."""
+        with self._in_flight_lock:
+            return self._in_flight == 0
+
+    def stats(self) -> dict:
+        with self._in_flight_lock:
+            in_flight = self._in_flight
+        return {
+            "stages": {name: s.snapshot() for name, s in self._stats.items()},
+            "batches_in_flight": in_flight,
+            "rows_committed": self.rows_committed,
+            "rows_failed": self.rows_failed,
+            "commit_latency_ms": round(self.commit_latency_ms, 1),
+        }
+
+    # ── Background stages ──
+
+    def _stage(self, name: str, work: Callable[[QueueBatch], None], next_name: str):
+        inbox = self._inboxes[name]
+        outbox = self._inboxes[next_name]
+        stats = self._stats[name]
+        while True:
+            batch = inbox.get()
+            if batch is _STOP:
+                return
+            t0 = time.monotonic()
+            if not batch.failed:
+                try:
+                    work(batch)
+                except Exception:
+                    batch.failed = True
+                    logger.error("Pipeline %s stage failed", name, exc_info=True)
+            stats.record(len(batch.row_ids), time.monotonic() - t0)
+            outbox.put(batch)
+
+    def _run_decode(self):
+        self._stage("decode", self._decode_batch, "enrich")
+
+    def _run_enrich(self):
+        self._stage("enrich", self._enrich_batch, "score")
+
+    def _decode_one(self, raw: bytes) -> Optional[List[dict]]:
+        try:
+            return self._decode(raw)
+        except Exception:
+            return None
+
+    def _decode_batch(self, batch: QueueBatch) -> None:
+        if self._decode_pool is None:
+            batch.records = [self._decode_one(raw) for raw in batch.raw]
+            return
+        pool = self._decode_pool
+        chunk = max(1, len(batch.raw) // (self.decode_workers * 4))
+        try:
+            futures = [
+                pool.submit(_decode_chunk, self._decode, batch.raw[i : i + chunk])
+                for i in range(0, len(batch.raw), chunk)
+            ]
+            batch.records = [recs for f in futures for recs in f.result()]
+        except BrokenProcessPool:
+            # A worker died (e.g. OOM-killed): the pool refuses all work
+            # from now on, so replace it and decode this batch here.
+            logger.error("Decode worker died; restarting the decode pool")
+            pool.shutdown(wait=False, cancel_futures=True)
+            if self._decode_pool is pool:
+                self._decode_pool = self._new_decode_pool()
+            batch.records = [self._decode_one(raw) for raw in batch.raw]
+
+    def _enrich_batch(self, batch: QueueBatch) -> None:
+        flat = [rec for recs in batch.records if recs for rec in recs]
+        if flat:
+            # map() preserves order
+            for _ in self._enrich_pool.map(self._enrich_safe, flat):
+                pass
+
+    def _enrich_safe(self, rec: dict) -> None:
+        try:
+            self._enrich_fn(rec)
+        except Exception:
+            logger.debug("Enrichment failed", exc_info=True)
+
+    # ── Score / store (caller thread) ──
+
+    def _score_batch(self, batch: QueueBatch) -> None:
+        for row_id, recs in zip(batch.row_ids, batch.records):
+            for rec in recs or ():
+                try:
+                    self._score_fn(rec)
+                except Exception as e:
+                    rec["failed"] = True
+                    logger.warning("Scoring failed for queue row %s: %s", row_id, e)
+
+    def _store_batch(self, batch: QueueBatch) -> bool:
+        """Write a batch in one transaction and ack it; False if it failed."""
+        if batch.failed:
+            self._fail(batch, "stage failure")
+            return False
+        try:
+            self.store.begin_batch()
+            try:
+                for row_id, recs in zip(batch.row_ids, batch.records):
+                    if recs is None:
+                        logger.warning("Skipping corrupted queue row %s", row_id)
+                        continue
+                    for rec in recs:
+                        if rec.get("failed"):
+                            continue
+                        try:
+                            self._store_fn(rec)
+                        except Exception as e:
+                            logger.warning(
+                                "Store failed for queue row %s: %s", row_id, e
+                            )
+            except BaseException:
+                self.store.abort_batch()
+                self.store.db.rollback()
+                raise
+            self.store.end_batch()
+        except Exception as e:
+            self._fail(batch, e)
+            return False
+        self.commit_latency_ms = (time.monotonic() - batch.started) * 1000
+        self.rows_committed += len(batch.row_ids)
+        self._ack(batch)
+        return True
+
+    def _fail(self, batch: QueueBatch, reason: Any) -> None:
+        """Count a failed batch and rewind the reader so it is read again.
+
+        Later batches of the same queue still in flight go stale (see
+        :meth:`_stale`) and are read again after this one.
+        """
+        self.rows_failed += len(batch.row_ids)
+        with self._cursor_lock:
+            cur = self._cursor.get(batch.qdb_path, 0)
+            self._cursor[batch.qdb_path] = min(cur, batch.row_ids[0] - 1)
+            self._epoch[batch.qdb_path] = batch.epoch + 1
+        logger.warning(
+            "Pipeline batch from %s failed (%d rows will be re-read): %s",
+            batch.qdb_path,
+            len(batch.row_ids),
+            reason,
+        )
+
+    def _ack(self, batch: QueueBatch) -> None:
+        """Delete committed rows from their queue DB."""
+        placeholders = ",".join("?" * len(batch.row_ids))
+        try:
+            conn = sqlite3.connect(batch.qdb_path, timeout=2)
+            try:
+                conn.execute(
+                    f"DELETE FROM queue WHERE id IN ({placeholders})", batch.row_ids
+                )
+                conn.commit()
+            finally:
+                conn.close()
+        except sqlite3.Error as e:
+            # Rows stay queued and are read again after a restart; the
+            # dedup cache absorbs the replay of security events.
+            logger.warning("Queue ack failed for %s: %s", batch.qdb_path, e)
+
+
+def _decode_chunk(decode: Callable[[bytes], List[dict]], raws: List[bytes]):
+    """Decode a slice of rows in a worker process; None marks a corrupted row."""
+    out: List[Optional[List[dict]]] = []
+    for raw in raws:
+        try:
+            out.append(decode(raw))
+        except Exception:
+            out.append(None)
+    return out
@@ -66,6 +66,9 @@ from amoskys.auth.service import (
     SignupResult,
 )
 
+# Session cache (validated-session cache + activity write-behind)
+from amoskys.auth.session_cache import get_session_cache, reset_session_cache
+
 # Session management (P3-005)
 from amoskys.auth.sessions import (
     SessionConfig,
@@ -138,4 +141,6 @@ __all__ = [
     "revoke_all_user_sessions",
     "get_user_active_sessions",
     "cleanup_expired_sessions",
+    "get_session_cache",
+    "reset_session_cache",
 ]
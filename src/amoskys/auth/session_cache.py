@@ -0,0 +1,485 @@
+"""
+AMOSKYS Validated-Session Cache
+
+Per-process cache in front of ``validate_session`` so that an authenticated
+request does not pay for a session SELECT, a user SELECT and a
+``last_active_at`` UPDATE every time.
+
+What is cached:
+    Only sessions that just passed full validation, keyed by token hash,
+    as detached snapshots of the Session row and its User. Failures are
+    never cached, so random or stale tokens cannot fill the cache.
+
+What is NOT skipped on a cache hit:
+    Every check in ``validate_session`` (revocation, absolute expiry, idle
+    timeout, IP/UA binding, account disabled/locked) is re-run against the
+    snapshot with the current clock and the caller's config. The cache only
+    removes the database round-trips, not the decisions.
+
+Invalidation:
+    - ``revoke_session`` / ``revoke_all_user_sessions`` / session-limit
+      enforcement / ``refresh_session`` drop entries immediately
+    - Any ORM update or delete of a User or Session row (lockout,
+      deactivation, role change, onboarding, admin delete) drops the
+      affected entries at flush and again after commit
+    - Entries expire after ``SessionConfig.validation_cache_ttl_seconds``,
+      which bounds how long a change made by *another process* can go
+      unseen. A TTL of 0 disables the cache.
+
+Activity write-behind:
+    Validations record activity in memory; ``last_active_at`` is written
+    at most once per ``SessionConfig.activity_update_interval_seconds`` per
+    session. With a flusher thread running the writes happen off the
+    request path in one bulk UPDATE; without one the due write rides on
+    the caller's transaction. The idle-timeout check uses the newer of the
+    stored and in-memory activity, so batching never makes a session
+    expire later than the database alone would allow, only (by at most
+    one interval, in other processes) earlier.
+
+Coalescing:
+    Concurrent misses for the same token wait for the first loader
+    instead of issuing duplicate queries.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Callable, ContextManager, Dict, Iterator, Optional, Set
+
+from sqlalchemy import event, inspect, update
+from sqlalchemy.orm import Session as DbSession
+from sqlalchemy.orm import make_transient_to_detached, object_session
+
+from amoskys.auth.models import Session, User
+from amoskys.common.logging import get_logger
+
+__all__ = [
+    "SessionCache",
+    "get_session_cache",
+    "reset_session_cache",
+]
+
+logger = get_logger(__name__)
+
+# Upper bound on cached sessions per process; oldest entries are evicted
+DEFAULT_MAX_ENTRIES = 10_000
+
+# How long a concurrent miss waits for the first loader of the same token
+COALESCE_WAIT_SECONDS = 5.0
+
+
+def _detached_copy(obj):
+    """Copy an ORM instance's column state into a clean detached instance.
+
+    The copy is independent of the loading db session (commits, expiry and
+    later mutations of the original do not leak into the cache) and can be
+    attached to another db session with ``merge(load=False)``, which issues
+    no SQL.
+    """
+    cls = type(obj)
+    mapper = inspect(cls)
+    copy = cls(**{attr.key: getattr(obj, attr.key) for attr in mapper.column_attrs})
+    make_transient_to_detached(copy)
+    return copy
+
+
+def _attach(db: DbSession, snapshot):
+    """Return the instance ``db`` should see for a cached snapshot.
+
+    If the row is already in ``db``'s identity map the live instance wins,
+    so in-transaction changes are never overwritten by the snapshot.
+    """
+    live = db.identity_map.get(inspect(snapshot).key)
+    if live is not None:
+        return live
+    return db.merge(snapshot, load=False)
+
+
+@dataclass
+class _Entry:
+    """A validated session snapshot."""
+
+    session: Session
+    user: User
+    cached_at: float
+
+
+class SessionCache:
+    """
+    Thread-safe validated-session cache with write-behind activity tracking.
+
+    Args:
+        max_entries: Maximum cached sessions before the oldest is evicted
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES) -> None:
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries: Dict[str, _Entry] = {}
+        self._by_session: Dict[str, str] = {}  # session_id -> token_hash
+        self._inflight: Dict[str, threading.Event] = {}
+
+        # Activity tracking (session_id -> naive UTC datetime)
+        self._last_seen: Dict[str, datetime] = {}
+        self._last_written: Dict[str, datetime] = {}
+        self._pending: Dict[str, datetime] = {}
+
+        self._flusher: Optional[threading.Thread] = None
+        self._flusher_stop = threading.Event()
+        self._session_factory: Optional[Callable[[], ContextManager[DbSession]]] = None
+
+        self.hits = 0
+        self.misses = 0
+
+    # -------------------------------------------------------------------------
+    # Lookup
+    # -------------------------------------------------------------------------
+
+    def get(self, db: DbSession, token_hash: str, ttl_seconds: float):
+        """
+        Return ``(session, user)`` attached to ``db`` for a cached token, or None.
+
+        The returned objects have NOT been re-checked; the caller runs the
+        normal validation checks on them.
+        """
+        if ttl_seconds <= 0:
+            return None
+        with self._lock:
+            entry = self._entries.get(token_hash)
+            if entry is not None and time.monotonic() - entry.cached_at > ttl_seconds:
+                self._drop(token_hash)
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        return _attach(db, entry.session), _attach(db, entry.user)
+
+    def put(self, token_hash: str, session: Session, user: User) -> None:
+        """Cache a session that just passed validation."""
+        entry = _Entry(
+            session=_detached_copy(session),
+            user=_detached_copy(user),
+            cached_at=time.monotonic(),
+        )
+        with self._lock:
+            self._drop(token_hash)
+            while len(self._entries) >= self.max_entries:
+                self._drop(next(iter(self._entries)))
+            self._entries[token_hash] = entry
+            self._by_session[session.id] = token_hash
+            if len(self._last_seen) > 2 * self.max_entries:
+                self._prune_activity()
+            if session.last_active_at is not None:
+                prev = self._last_written.get(session.id)
+                if prev is None or session.last_active_at > prev:
+                    self._last_written[session.id] = session.last_active_at
+
+    @contextmanager
+    def coalesce(self, token_hash: str) -> Iterator[bool]:
+        """
+        Serialize concurrent loads of the same token.
+
+        Yields True for the first caller (who should load and ``put``) and
+        False for callers that waited on it; those should ``get`` again and
+        load themselves only if the first load did not produce an entry.
+        """
+        with self._lock:
+            done = self._inflight.get(token_hash)
+            leader = done is None
+            if leader:
+                done = self._inflight[token_hash] = threading.Event()
+
+        if not leader:
+            done.wait(COALESCE_WAIT_SECONDS)
+            yield False
+            return
+
+        try:
+            yield True
+        finally:
+            with self._lock:
+                self._inflight.pop(token_hash, None)
+            done.set()
+
+    # -------------------------------------------------------------------------
+    # Invalidation
+    # -------------------------------------------------------------------------
+
+    def _drop(self, token_hash: str) -> None:
+        """Remove one entry. Caller holds the lock."""
+        entry = self._entries.pop(token_hash, None)
+        if entry is not None:
+            self._by_session.pop(entry.session.id, None)
+
+    def discard(self, session_id: str) -> None:
+        """Drop a session's cached snapshot but keep its activity tracking."""
+        with self._lock:
+            token_hash = self._by_session.get(session_id)
+            if token_hash is not None:
+                self._drop(token_hash)
+
+    def invalidate_session(self, session_id: str) -> None:
+        """Forget a session (revoked, refreshed or deleted)."""
+        with self._lock:
+            token_hash = self._by_session.get(session_id)
+            if token_hash is not None:
+                self._drop(token_hash)
+            self._last_seen.pop(session_id, None)
+            self._last_written.pop(session_id, None)
+            self._pending.pop(session_id, None)
+
+    def _prune_activity(self) -> None:
+        """Forget activity of sessions that are neither cached nor pending.
+
+        Caller holds the lock. Losing an unwritten activity timestamp can
+        only make the idle timeout fire earlier, never later.
+        """
+        keep = set(self._by_session) | set(self._pending)
+        for table in (self._last_seen, self._last_written):
+            for session_id in [sid for sid in table if sid not in keep]:
+                del table[session_id]
+
+    def invalidate_user(
+        self,
+        user_id: str,
+        except_session_id: Optional[str] = None,
+        forget_activity: bool = True,
+    ) -> None:
+        """Forget every cached session of a user (bulk revoke, lockout, disable)."""
+        with self._lock:
+            doomed = [
+                entry.session.id
+                for entry in self._entries.values()
+                if entry.user.id == user_id and entry.session.id != except_session_id
+            ]
+        for session_id in doomed:
+            if forget_activity:
+                self.invalidate_session(session_id)
+            else:
+                self.discard(session_id)
+
+    def clear(self) -> None:
+        """Drop all entries and pending activity."""
+        with self._lock:
+            self._entries.clear()
+            self._by_session.clear()
+            self._last_seen.clear()
+            self._last_written.clear()
+            self._pending.clear()
+
+    # -------------------------------------------------------------------------
+    # Activity write-behind
+    # -------------------------------------------------------------------------
+
+    def last_activity(self, session: Session) -> Optional[datetime]:
+        """Newest known activity for a session: stored or seen in this process."""
+        with self._lock:
+            seen = self._last_seen.get(session.id)
+        stored = session.last_active_at
+        if seen is None:
+            return stored
+        if stored is None:
+            return seen
+        return max(seen, stored)
+
+    def record_activity(
+        self, session: Session, now: datetime, interval_seconds: float
+    ) -> bool:
+        """
+        Note that ``session`` was used at ``now``.
+
+        Returns True when the caller should write ``last_active_at`` itself
+        (no flusher is running and the per-session interval has elapsed).
+        With a flusher running the write is queued and False is returned.
+        """
+        with self._lock:
+            self._last_seen[session.id] = now
+            written = self._last_written.get(session.id) or session.last_active_at
+            if written is not None and (now - written).total_seconds() < (
+                interval_seconds
+            ):
+                return False
+            self._last_written[session.id] = now
+            if self._flusher is not None:
+                self._pending[session.id] = now
+                return False
+            return True
+
+    def flush_activity(self, db: DbSession) -> int:
+        """Write queued ``last_active_at`` values in one bulk UPDATE."""
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        if not pending:
+            return 0
+        db.execute(
+            update(Session),
+            [{"id": sid, "last_active_at": ts} for sid, ts in pending.items()],
+        )
+        return len(pending)
+
+    def start_flusher(
+        self,
+        session_factory: Callable[[], ContextManager[DbSession]],
+        interval_seconds: float,
+    ) -> None:
+        """
+        Start a daemon thread that flushes activity every ``interval_seconds``.
+
+        Args:
+            session_factory: Context manager yielding a committing db session
+                (e.g. ``get_web_session_context``)
+            interval_seconds: Flush period
+        """
+        with self._lock:
+            if self._flusher is not None:
+                return
+            self._session_factory = session_factory
+            self._flusher_stop.clear()
+            self._flusher = threading.Thread(
+                target=self._flush_loop,
+                args=(max(interval_seconds, 1.0),),
+                name="session-activity-flusher",
+                daemon=True,
+            )
+            self._flusher.start()
+
+    def stop_flusher(self) -> None:
+        """Stop the flusher thread after a final flush."""
+        with self._lock:
+            thread, self._flusher = self._flusher, None
+        if thread is None:
+            return
+        self._flusher_stop.set()
+        thread.join(timeout=10)
+        self._flush_once()
+
+    def _flush_loop(self, interval_seconds: float) -> None:
+        while not self._flusher_stop.wait(interval_seconds):
+            self._flush_once()
+
+    def _flush_once(self) -> None:
+        if self._session_factory is None:
+            return
+        try:
+            with self._session_factory() as db:
+                count = self.flush_activity(db)
+            if count:
+                logger.debug("Flushed session activity", sessions=count)
+        except Exception as e:
+            logger.warning("Session activity flush failed", error=str(e))
+
+    def stats(self) -> dict:
+        """Hit/miss counters and current sizes."""
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "pending_activity": len(self._pending),
+                "flusher_running": self._flusher is not None,
+            }
+
+    def cached_session_ids(self) -> Set[str]:
+        """Session IDs currently cached (for diagnostics and tests)."""
+        with self._lock:
+            return set(self._by_session)
+
+
+# =============================================================================
+# ORM change hooks
+# =============================================================================
+
+_DIRTY_KEY = "_amoskys_session_cache_dirty"
+
+
+def _mark_changed(target, kind: str) -> None:
+    """Drop cache entries for a changed row now and again after commit.
+
+    The flush-time drop covers readers in this transaction; the post-commit
+    drop covers a concurrent miss that re-cached the old committed row in
+    between.
+    """
+    if _session_cache is None:
+        return
+    _apply_change(_session_cache, kind, target.id)
+    db = object_session(target)
+    if db is not None:
+        db.info.setdefault(_DIRTY_KEY, set()).add((kind, target.id))
+
+
+def mark_user_sessions_revoked(
+    db: DbSession, user_id: str, except_session_id: Optional[str] = None
+) -> None:
+    """Drop a user's cached sessions now and again after ``db`` commits.
+
+    For bulk revokes issued as Core UPDATEs, which fire no ORM hooks.
+    """
+    if _session_cache is None:
+        return
+    key = (user_id, except_session_id)
+    _apply_change(_session_cache, "revoke", key)
+    db.info.setdefault(_DIRTY_KEY, set()).add(("revoke", key))
+
+
+def _apply_change(cache: SessionCache, kind: str, row_id) -> None:
+    if kind == "user":
+        cache.invalidate_user(row_id, forget_activity=False)
+    elif kind == "revoke":
+        user_id, except_session_id = row_id
+        cache.invalidate_user(user_id, except_session_id=except_session_id)
+    else:
+        cache.discard(row_id)
+
+
+@event.listens_for(User, "after_update")
+@event.listens_for(User, "after_delete")
+def _user_changed(mapper, connection, target) -> None:
+    _mark_changed(target, "user")
+
+
+@event.listens_for(Session, "after_update")
+@event.listens_for(Session, "after_delete")
+def _session_changed(mapper, connection, target) -> None:
+    _mark_changed(target, "session")
+
+
+@event.listens_for(DbSession, "after_commit")
+def _after_commit(db: DbSession) -> None:
+    changed = db.info.pop(_DIRTY_KEY, None)
+    if changed and _session_cache is not None:
+        for kind, row_id in changed:
+            _apply_change(_session_cache, kind, row_id)
+
+
+@event.listens_for(DbSession, "after_rollback")
+def _after_rollback(db: DbSession) -> None:
+    db.info.pop(_DIRTY_KEY, None)
+
+
+# Module-level cache (one per process)
+_session_cache: Optional[SessionCache] = None
+_session_cache_lock = threading.Lock()
+
+
+def get_session_cache() -> SessionCache:
+    """Return the process-wide session cache."""
+    global _session_cache
+    if _session_cache is None:
+        with _session_cache_lock:
+            if _session_cache is None:
+                _session_cache = SessionCache()
+    return _session_cache
+
+
+def reset_session_cache() -> None:
+    """Stop the flusher and discard the cache (useful for testing)."""
+    global _session_cache
+    with _session_cache_lock:
+        cache, _session_cache = _session_cache, None
+    if cache is not None:
+        cache.stop_flusher()
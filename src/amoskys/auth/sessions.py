@@ -25,6 +25,10 @@ Architecture:
     3. Lookup session by hash, verify not expired/revoked
     4. Update last_active_at for activity tracking
 
+    Validated sessions are cached per process for a few seconds and
+    last_active_at is written behind, at most once per interval per
+    session (see amoskys.auth.session_cache).
+
 Design Philosophy (Akash Thanneeru + Claude Supremacy):
     Sessions are bearer tokens - possession equals access. We treat
     them with the same security rigor as passwords, storing only
@@ -40,8 +44,10 @@ from typing import Optional, Tuple
 
 from sqlalchemy import and_, delete, select, update
 from sqlalchemy.orm import Session as DbSession
+from sqlalchemy.orm import joinedload
 
 from amoskys.auth.models import AuditEventType, AuthAuditLog, Session, User
+from amoskys.auth.session_cache import get_session_cache, mark_user_sessions_revoked
 from amoskys.auth.tokens import generate_token, hash_token
 from amoskys.common.logging import get_logger
 
@@ -88,6 +94,10 @@ class SessionConfig:
         enable_ip_binding: Invalidate if IP changes (default: False for UX)
         enable_ua_binding: Invalidate if User-Agent changes (default: False)
         token_bytes: Entropy for session tokens (default: 32 = 256 bits)
+        validation_cache_ttl_seconds: How long a validated session is served
+            from the per-process cache (default: 5s, 0 disables)
+        activity_update_interval_seconds: Minimum gap between last_active_at
+            writes for one session (default: 60s)
     """
 
     session_lifetime_hours: int = 24
@@ -96,6 +106,8 @@ class SessionConfig:
     enable_ip_binding: bool = False
     enable_ua_binding: bool = False
     token_bytes: int = 32
+    validation_cache_ttl_seconds: float = 5.0
+    activity_update_interval_seconds: int = 60
 
 
 # Module-level config cache
@@ -112,6 +124,8 @@ def get_session_config() -> SessionConfig:
         AMOSKYS_SESSION_MAX_PER_USER: Max concurrent sessions
         AMOSKYS_SESSION_BIND_IP: Bind sessions to IP (true/false)
         AMOSKYS_SESSION_BIND_UA: Bind sessions to User-Agent
+        AMOSKYS_SESSION_CACHE_TTL_SECONDS: Validated-session cache TTL (0 = off)
+        AMOSKYS_SESSION_ACTIVITY_INTERVAL_SECONDS: last_active_at write interval
 
     Returns:
         SessionConfig instance
@@ -139,6 +153,12 @@ def get_session_config() -> SessionConfig:
         max_sessions_per_user=int(os.environ.get("AMOSKYS_SESSION_MAX_PER_USER", "10")),
         enable_ip_binding=get_bool("AMOSKYS_SESSION_BIND_IP", False),
         enable_ua_binding=get_bool("AMOSKYS_SESSION_BIND_UA", False),
+        validation_cache_ttl_seconds=float(
+            os.environ.get("AMOSKYS_SESSION_CACHE_TTL_SECONDS", "5")
+        ),
+        activity_update_interval_seconds=int(
+            os.environ.get("AMOSKYS_SESSION_ACTIVITY_INTERVAL_SECONDS", "60")
+        ),
     )
 
     logger.info(
@@ -316,8 +336,10 @@ def _enforce_session_limit(
     sessions_to_remove = sessions[max_allowed:]
     removed = 0
 
+    cache = get_session_cache()
     for session in sessions_to_remove:
         session.revoked_at = _utcnow()
+        cache.invalidate_session(session.id)
         removed += 1
 
     logger.info(
@@ -389,15 +411,79 @@ def validate_session(
 
     # Hash the token for lookup
     token_hash = hash_token(session_token)
+    cache = get_session_cache()
+    ttl = cfg.validation_cache_ttl_seconds
+
+    cached = cache.get(db, token_hash, ttl)
+    if cached is not None:
+        session, user = cached
+        result = _check_session(
+            cfg, session, user, token_hash, now, ip_address, user_agent
+        )
+        if not result.is_valid:
+            cache.invalidate_session(session.id)
+    elif ttl > 0:
+        # Concurrent misses for one token share a single lookup
+        with cache.coalesce(token_hash) as leader:
+            cached = None if leader else cache.get(db, token_hash, ttl)
+            if cached is not None:
+                session, user = cached
+            else:
+                session, user = _load_session(db, token_hash)
+            result = _check_session(
+                cfg, session, user, token_hash, now, ip_address, user_agent
+            )
+            if result.is_valid and cached is None:
+                cache.put(token_hash, session, user)
+    else:
+        session, user = _load_session(db, token_hash)
+        result = _check_session(
+            cfg, session, user, token_hash, now, ip_address, user_agent
+        )
+
+    if not result.is_valid:
+        return result
+
+    # Update activity timestamp (written at most once per interval per session)
+    if update_activity and cache.record_activity(
+        session, now, cfg.activity_update_interval_seconds
+    ):
+        session.last_active_at = now
+        db.add(session)
 
-    # Look up session by hash
+    return result
+
+
+def _load_session(
+    db: DbSession, token_hash: str
+) -> Tuple[Optional[Session], Optional[User]]:
+    """Look up a session by token hash with its user in one query."""
     query = (
         select(Session)
         .where(Session.session_token_hash == token_hash)
-        .options()  # Could add joinedload(Session.user) for eager loading
+        .options(joinedload(Session.user))
     )
-    session = db.execute(query).scalar_one_or_none()
+    session = db.execute(query).unique().scalar_one_or_none()
+    if session is None:
+        return None, None
+    return session, session.user
+
+
+def _check_session(
+    cfg: SessionConfig,
+    session: Optional[Session],
+    user: Optional[User],
+    token_hash: str,
+    now: datetime,
+    ip_address: Optional[str],
+    user_agent: Optional[str],
+) -> SessionValidationResult:
+    """
+    Run every validation check on a loaded or cached session.
 
+    Cached sessions go through exactly the same checks as freshly loaded
+    ones; the idle timeout uses the newest activity seen by this process.
+    """
     if session is None:
         logger.warning(
             "Session not found",
@@ -432,13 +518,14 @@ def validate_session(
         )
 
     # Check idle timeout
-    if session.last_active_at:
-        idle_deadline = session.last_active_at + timedelta(hours=cfg.idle_timeout_hours)
+    last_active = get_session_cache().last_activity(session)
+    if last_active:
+        idle_deadline = last_active + timedelta(hours=cfg.idle_timeout_hours)
         if idle_deadline < now:
             logger.info(
                 "Session idle timeout",
                 session_id=session.id[:8] + "...",
-                last_active=session.last_active_at.isoformat(),
+                last_active=last_active.isoformat(),
             )
             return SessionValidationResult.failure(
                 "Session timed out due to inactivity",
@@ -471,8 +558,7 @@ def validate_session(
                 "SESSION_UA_MISMATCH",
             )
 
-    # Load user
-    user = db.get(User, session.user_id)
+    # Check user (loaded with the session)
     if user is None:
         logger.error(
             "Session user not found",
@@ -507,11 +593,6 @@ def validate_session(
             "ACCOUNT_LOCKED",
         )
 
-    # Update activity timestamp
-    if update_activity:
-        session.last_active_at = now
-        db.add(session)
-
     return SessionValidationResult.success(user, session)
 
 
@@ -549,6 +630,7 @@ def refresh_session(
     session.expires_at = now + timedelta(hours=cfg.session_lifetime_hours)
     session.last_active_at = now
     db.add(session)
+    get_session_cache().invalidate_session(session.id)
 
     logger.debug(
         "Session refreshed",
@@ -584,6 +666,7 @@ def revoke_session(
     now = _utcnow()
     session.revoked_at = now
     db.add(session)
+    get_session_cache().invalidate_session(session.id)
 
     # Log audit event
     audit_log = AuthAuditLog(
@@ -641,6 +724,7 @@ def revoke_all_user_sessions(
     stmt = update(Session).where(and_(*conditions)).values(revoked_at=now)
     result = db.execute(stmt)
     count = result.rowcount
+    mark_user_sessions_revoked(db, user_id, except_session_id=except_session_id)
 
     # Log audit event
     audit_log = AuthAuditLog(
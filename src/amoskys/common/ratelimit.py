@@ -0,0 +1,312 @@
+"""Constant-memory rate limiting (GCRA) with pluggable state backends.
+
+The Generic Cell Rate Algorithm is a token bucket expressed as a single
+number per key, the *theoretical arrival time* (TAT): the instant at which
+the bucket would be full again. For a limit of ``rate`` requests/second
+with a burst of ``burst``:
+
+    interval = 1 / rate          # time one token takes to refill
+    capacity = burst * interval  # how far TAT may run ahead of now
+    tat      = max(stored_tat, now)
+    tokens   = floor((now + capacity - tat) / interval)
+
+Granting ``k`` tokens advances TAT by ``k * interval``. A key whose stored
+TAT is in the past has a full bucket, which is exactly the state of an
+absent key, so idle keys are evicted with ``DELETE ... WHERE tat <= now``
+without losing anything.
+
+Backends only store that one float per key and run a read-modify-write
+atomically:
+
+    MemoryBackend  — dict + lock, per process
+    SQLiteBackend  — one row per key in a shared SQLite file, so every
+                     worker process (e.g. gunicorn workers) enforces the
+                     same counters. Put the file on tmpfs (/dev/shm) to
+                     keep it in shared memory.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# A read-modify-write step: old TAT (None = full bucket) -> (new TAT, result)
+Step = Callable[[Optional[float]], Tuple[Optional[float], object]]
+
+# Smallest refill rate; rate=0 means "burst only, never refills"
+_MIN_RATE = 1e-9
+
+# Rounding slack when converting elapsed time to whole tokens
+_EPSILON = 1e-6
+
+DEFAULT_EVICT_INTERVAL_SECONDS = 60.0
+
+
+# ---------------------------------------------------------------------------
+# Backends
+# ---------------------------------------------------------------------------
+
+
+class RateLimitBackend:
+    """Abstract per-key TAT store."""
+
+    def transact(self, key: str, step: Step, now: float) -> object:
+        """Apply ``step`` to ``key``'s TAT atomically and return its result."""
+        raise NotImplementedError
+
+    def evict_idle(self, now: float) -> int:
+        """Drop keys whose bucket is full again. Returns the number removed."""
+        raise NotImplementedError
+
+    def clear(self) -> None:
+        """Forget all keys."""
+        raise NotImplementedError
+
+    def __len__(self) -> int:
+        raise NotImplementedError
+
+    def close(self) -> None:
+        """Best-effort cleanup hook for long-lived backends."""
+
+
+class MemoryBackend(RateLimitBackend):
+    """In-process backend: one float per key behind a lock."""
+
+    def __init__(self, evict_interval: float = DEFAULT_EVICT_INTERVAL_SECONDS):
+        self._tat: Dict[str, float] = {}
+        self._lock = threading.Lock()
+        self._evict_interval = evict_interval
+        self._next_evict = 0.0
+
+    def transact(self, key: str, step: Step, now: float) -> object:
+        with self._lock:
+            if now >= self._next_evict:
+                self._evict_locked(now)
+            new_tat, result = step(self._tat.get(key))
+            if new_tat is None or new_tat <= now:
+                self._tat.pop(key, None)
+            else:
+                self._tat[key] = new_tat
+            return result
+
+    def _evict_locked(self, now: float) -> int:
+        idle = [k for k, tat in self._tat.items() if tat <= now]
+        for k in idle:
+            del self._tat[k]
+        self._next_evict = now + self._evict_interval
+        return len(idle)
+
+    def evict_idle(self, now: float) -> int:
+        with self._lock:
+            return self._evict_locked(now)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._tat.clear()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._tat)
+
+
+class SQLiteBackend(RateLimitBackend):
+    """Shared backend: one row per key in a SQLite file.
+
+    Each read-modify-write runs in a ``BEGIN IMMEDIATE`` transaction, so
+    concurrent processes serialize on the file lock and never lose an
+    update. Connections are reopened after ``fork()``.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        evict_interval: float = DEFAULT_EVICT_INTERVAL_SECONDS,
+        busy_timeout_ms: int = 5000,
+    ):
+        self.path = path
+        self._evict_interval = evict_interval
+        self._busy_timeout_ms = busy_timeout_ms
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._pid = 0
+        self._next_evict = 0.0
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None or self._pid != os.getpid():
+            parent = os.path.dirname(self.path)
+            if parent:
+                os.makedirs(parent, exist_ok=True)
+            conn = sqlite3.connect(
+                self.path, isolation_level=None, check_same_thread=False
+            )
+            conn.execute(f"PRAGMA busy_timeout={int(self._busy_timeout_ms)}")
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS rate_limits ("
+                "key TEXT PRIMARY KEY, tat REAL NOT NULL) WITHOUT ROWID"
+            )
+            self._conn = conn
+            self._pid = os.getpid()
+        return self._conn
+
+    def transact(self, key: str, step: Step, now: float) -> object:
+        with self._lock:
+            conn = self._connection()
+            if now >= self._next_evict:
+                self._evict_locked(conn, now)
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = conn.execute(
+                    "SELECT tat FROM rate_limits WHERE key = ?", (key,)
+                ).fetchone()
+                old_tat = row[0] if row else None
+                new_tat, result = step(old_tat)
+                if new_tat != old_tat:
+                    if new_tat is None or new_tat <= now:
+                        conn.execute("DELETE FROM rate_limits WHERE key = ?", (key,))
+                    else:
+                        conn.execute(
+                            "INSERT INTO rate_limits (key, tat) VALUES (?, ?) "
+                            "ON CONFLICT(key) DO UPDATE SET tat = excluded.tat",
+                            (key, new_tat),
+                        )
+                conn.execute("COMMIT")
+            except BaseException:
+                conn.execute("ROLLBACK")
+                raise
+            return result
+
+    def _evict_locked(self, conn: sqlite3.Connection, now: float) -> int:
+        self._next_evict = now + self._evict_interval
+        return conn.execute("DELETE FROM rate_limits WHERE tat <= ?", (now,)).rowcount
+
+    def evict_idle(self, now: float) -> int:
+        with self._lock:
+            return self._evict_locked(self._connection(), now)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._connection().execute("DELETE FROM rate_limits")
+
+    def __len__(self) -> int:
+        with self._lock:
+            return (
+                self._connection()
+                .execute("SELECT COUNT(*) FROM rate_limits")
+                .fetchone()[0]
+            )
+
+    def close(self) -> None:
+        with self._lock:
+            if self._conn is not None and self._pid == os.getpid():
+                self._conn.close()
+            self._conn = None
+
+
+def create_rate_limit_backend(path: Optional[str] = None) -> RateLimitBackend:
+    """Factory: a shared SQLite backend when ``path`` is set, else in-memory."""
+    if path:
+        return SQLiteBackend(path)
+    return MemoryBackend()
+
+
+# ---------------------------------------------------------------------------
+# Limiter
+# ---------------------------------------------------------------------------
+
+
+@dataclass
+class RateLimitDecision:
+    """Outcome of a rate-limit check."""
+
+    granted: int
+    remaining: int
+    retry_after: float  # seconds until the next token (0 when available)
+
+    @property
+    def allowed(self) -> bool:
+        return self.granted > 0
+
+
+class GCRALimiter:
+    """Token-bucket limiter with O(1) state per key (GCRA).
+
+    Args:
+        rate: Sustained tokens per second (0 = burst only, never refills)
+        burst: Bucket capacity
+        backend: State store (default: a private MemoryBackend)
+        namespace: Key prefix, so several limiters can share one backend
+        clock: Wall-clock source; shared backends need a clock that agrees
+            across processes
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        burst: float,
+        backend: Optional[RateLimitBackend] = None,
+        namespace: str = "",
+        clock: Callable[[], float] = time.time,
+    ):
+        self.rate = rate
+        self.burst = burst
+        self.backend = backend if backend is not None else MemoryBackend()
+        self.namespace = namespace
+        self._clock = clock
+        self._interval = 1.0 / max(rate, _MIN_RATE)
+        self._capacity = burst * self._interval
+
+    def _key(self, key: str) -> str:
+        return f"{self.namespace}:{key}" if self.namespace else key
+
+    def _decide(self, n: int, now: float) -> Step:
+        interval, capacity = self._interval, self._capacity
+
+        def step(old_tat: Optional[float]):
+            tat = now if old_tat is None else max(old_tat, now)
+            available = max(0, int((now + capacity - tat) / interval + _EPSILON))
+            granted = min(n, available)
+            tat += granted * interval
+            remaining = available - granted
+            retry_after = (
+                0.0 if remaining else max(0.0, tat + interval - capacity - now)
+            )
+            new_tat = tat if granted else old_tat
+            return new_tat, RateLimitDecision(granted, remaining, retry_after)
+
+        return step
+
+    def take(self, key: str, n: int = 1) -> RateLimitDecision:
+        """Take up to ``n`` tokens for ``key``.
+
+        Fails open (grants everything) if the backend errors, so a broken
+        shared store degrades to no limiting rather than an outage.
+        """
+        now = self._clock()
+        try:
+            return self.backend.transact(self._key(key), self._decide(n, now), now)
+        except Exception:
+            logger.warning("Rate limit backend error; allowing", exc_info=True)
+            return RateLimitDecision(n, 0, 0.0)
+
+    def peek(self, key: str) -> RateLimitDecision:
+        """Current state for ``key`` without consuming a token."""
+        return self.take(key, 0)
+
+    def allow(self, key: str) -> bool:
+        """Take one token; True if it was available."""
+        return self.take(key, 1).allowed
+
+    def allow_n(self, key: str, n: int) -> int:
+        """Take up to ``n`` tokens in one step and return how many were granted."""
+        if n <= 0:
+            return 0
+        return self.take(key, n).granted
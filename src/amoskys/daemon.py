@@ -6,7 +6,7 @@ IGRIS-supervised endpoint security daemon with full pipeline visibility.
 
 Four threads run simultaneously:
   1. CollectionRunner — calls collect_and_store.py on interval (10-30s)
-  2. AlertMonitor     — polls ALL DB tables for new detections, streams alerts
+  2. AlertMonitor     — tails ALL DB tables for new detections, streams alerts
   3. AutoResponder    — confidence-gated response actions (quarantine, kill, block)
   4. IGRIS Supervisor — 60s observation cycles, organism coherence, signal governance
 
@@ -40,6 +40,8 @@ from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Set
 
+from amoskys.storage._ts_changefeed import max_rowid, tail_rows
+
 ROOT = Path(__file__).resolve().parent.parent.parent
 DB_PATH = ROOT / "data" / "telemetry.db"
 FUSION_DB_PATH = ROOT / "data" / "intel" / "fusion.db"
@@ -168,6 +170,19 @@ def _table_count(table: str, db_path: Path = DB_PATH) -> int:
     return rows[0]["cnt"] if rows else 0
 
 
+def _connect_ro(db_path: Path) -> Optional[sqlite3.Connection]:
+    """Long-lived read-only connection for change-feed tailing."""
+    if not db_path.exists():
+        return None
+    try:
+        conn = sqlite3.connect(
+            f"file:{db_path}?mode=ro", uri=True, timeout=5, check_same_thread=False
+        )
+    except sqlite3.OperationalError:
+        return None
+    return conn
+
+
 def _parse_techniques(raw: str) -> List[str]:
     """Parse MITRE techniques from JSON or plain string."""
     if not raw:
@@ -261,8 +276,10 @@ class AlertMonitor(threading.Thread):
         self.alert_count = 0
         self.incident_count = 0
 
-        # Watermarks for each table (row counts or max IDs)
+        # Rowid watermarks per feed — rows after them have not been seen yet
         self._wm: Dict[str, int] = {}
+        # One read-only connection per database, opened lazily
+        self._conns: Dict[Path, sqlite3.Connection] = {}
         # Dedup: (table, event_category, first_technique) -> last_alert_ts
         self._dedup: Dict[str, float] = {}
         self._dedup_cooldown = 30.0  # seconds between duplicate alerts
@@ -274,52 +291,89 @@ class AlertMonitor(threading.Thread):
         self._story_interval = 30  # Check for new stories every 30s
         self._seen_story_ids: Set[str] = set()
 
+    # Feed name -> (table, database) for every tailed source
+    FEEDS = {
+        "security_events": ("security_events", DB_PATH),
+        "persistence_events": ("persistence_events", DB_PATH),
+        "process_suspicious": ("process_events", DB_PATH),
+        "flow_events": ("flow_events", DB_PATH),
+        "dns_events": ("dns_events", DB_PATH),
+        "fim_events": ("fim_events", DB_PATH),
+        "audit_events": ("audit_events", DB_PATH),
+        "incidents": ("incidents", DB_PATH),
+        "fusion_incidents": ("incidents", FUSION_DB_PATH),
+    }
+
     def run(self):
-        # Initialize watermarks from existing data
-        for table in [
-            "security_events",
-            "persistence_events",
-            "flow_events",
-            "dns_events",
-            "fim_events",
-            "audit_events",
-        ]:
-            self._wm[table] = _table_count(table)
-        self._wm["process_suspicious"] = self._count_suspicious()
-        self._wm["incidents"] = _table_count("incidents")
-        # Fusion DB incidents
-        self._wm["fusion_incidents"] = _table_count("incidents", db_path=FUSION_DB_PATH)
+        # Start every feed at the current end of its table — only rows
+        # written after the daemon starts are alerted on.
+        for feed, (table, db_path) in self.FEEDS.items():
+            conn = self._conn(db_path)
+            self._wm[feed] = max_rowid(conn, table) if conn else 0
 
-        while not self.stop.is_set():
-            self._check_security_events()
-            self._check_persistence_events()
-            self._check_suspicious_processes()
-            self._check_flow_events()
-            self._check_dns_events()
-            self._check_fim_events()
-            self._check_fusion_incidents()
-            self._check_telemetry_incidents()
-            self._check_stories()
-            self.stop.wait(1.0)
-
-    def _count_suspicious(self) -> int:
-        rows = _query(
-            "SELECT COUNT(*) as cnt FROM process_events WHERE is_suspicious = 1"
-        )
-        return rows[0]["cnt"] if rows else 0
+        try:
+            while not self.stop.is_set():
+                self._check_security_events()
+                self._check_persistence_events()
+                self._check_suspicious_processes()
+                self._check_flow_events()
+                self._check_dns_events()
+                self._check_fim_events()
+                self._check_fusion_incidents()
+                self._check_telemetry_incidents()
+                self._check_stories()
+                self.stop.wait(1.0)
+        finally:
+            for conn in self._conns.values():
+                conn.close()
+            self._conns.clear()
+
+    def _conn(self, db_path: Path) -> Optional[sqlite3.Connection]:
+        conn = self._conns.get(db_path)
+        if conn is None:
+            conn = _connect_ro(db_path)
+            if conn is not None:
+                self._conns[db_path] = conn
+        return conn
+
+    def _tail(self, feed: str, where: str = "") -> List[dict]:
+        """Rows added to ``feed`` since its watermark, oldest first.
+
+        Reads MAX(rowid) — one index seek — instead of COUNT(*), and tails
+        by rowid so rows inserted while retention deletes older ones are
+        never skipped.  The watermark advances to the MAX(rowid) read up
+        front even when ``where`` filters every new row out, but only to
+        the last row returned when the read fails partway.
+        """
+        table, db_path = self.FEEDS[feed]
+        conn = self._conn(db_path)
+        if conn is None:
+            return []
+        prev = self._wm.get(feed, 0)
+        current = max_rowid(conn, table)
+        if current < prev:
+            # Table was rebuilt (DB reset / restore) — restart from its end
+            self._wm[feed] = current
+            return []
+        if current == prev:
+            return []
+        rows: List[dict] = []
+        try:
+            for row in tail_rows(conn, table, prev, until_rowid=current, where=where):
+                rows.append(row)
+        except sqlite3.OperationalError:
+            # Busy or locked mid-scan: the unread rows are retried next poll
+            if rows:
+                self._wm[feed] = rows[-1]["_rowid"]
+            return rows
+        self._wm[feed] = current
+        return rows
 
     # ── Security Events ──
 
     def _check_security_events(self):
-        current = _table_count("security_events")
-        prev = self._wm.get("security_events", 0)
-        if current <= prev:
-            return
-        new_rows = _query(
-            "SELECT * FROM security_events ORDER BY rowid DESC LIMIT ?",
-            (current - prev,),
-        )
-        for ev in reversed(new_rows):
+        new_rows = self._tail("security_events")
+        for ev in new_rows:
             risk = ev.get("risk_score", 0) or 0
             severity = _risk_to_severity(risk)
             if SEV_ORDER.get(severity, 0) < self.min_severity:
@@ -343,19 +397,11 @@ class AlertMonitor(threading.Thread):
             )
             if self.responder:
                 self.responder.handle(ev, severity)
-        self._wm["security_events"] = current
 
     # ── Persistence Events ──
 
     def _check_persistence_events(self):
-        current = _table_count("persistence_events")
-        prev = self._wm.get("persistence_events", 0)
-        if current <= prev:
-            return
-        new_rows = _query(
-            "SELECT * FROM persistence_events ORDER BY rowid DESC LIMIT ?",
-            (current - prev,),
-        )
+        new_rows = self._tail("persistence_events")
         mech_to_mitre = {
             "launchagent_user": "T1543.001",
             "launchagent_system": "T1543.001",
@@ -365,7 +411,7 @@ class AlertMonitor(threading.Thread):
             "ssh": "T1098.004",
             "folder_action": "T1546.015",
         }
-        for ev in reversed(new_rows):
+        for ev in new_rows:
             mechanism = ev.get("mechanism", "?")
             path = ev.get("path", ev.get("entry_path", "?"))
             tech = mech_to_mitre.get(mechanism, "")
@@ -379,21 +425,12 @@ class AlertMonitor(threading.Thread):
             )
             if self.responder:
                 self.responder.handle_persistence(ev, mechanism, path)
-        self._wm["persistence_events"] = current
 
     # ── Suspicious Processes ──
 
     def _check_suspicious_processes(self):
-        current = self._count_suspicious()
-        prev = self._wm.get("process_suspicious", 0)
-        if current <= prev:
-            return
-        new_rows = _query(
-            "SELECT * FROM process_events WHERE is_suspicious = 1 "
-            "ORDER BY rowid DESC LIMIT ?",
-            (current - prev,),
-        )
-        for ev in reversed(new_rows):
+        new_rows = self._tail("process_suspicious", "is_suspicious = 1")
+        for ev in new_rows:
             name = ev.get("name", "?")
             exe = ev.get("exe", "?")
             pid = ev.get("pid", "?")
@@ -405,22 +442,13 @@ class AlertMonitor(threading.Thread):
                 tech_name=f"Suspicious: {name}",
                 detail=f"pid={pid} exe={str(exe)[:50]}",
             )
-        self._wm["process_suspicious"] = current
 
     # ── Flow Events (Network) ──
 
     def _check_flow_events(self):
-        current = _table_count("flow_events")
-        prev = self._wm.get("flow_events", 0)
-        if current <= prev:
-            return
         # Only alert on high-risk flows
-        new_rows = _query(
-            "SELECT * FROM flow_events WHERE risk_score >= 0.6 "
-            "ORDER BY rowid DESC LIMIT ?",
-            (current - prev,),
-        )
-        for ev in reversed(new_rows):
+        new_rows = self._tail("flow_events", "risk_score >= 0.6")
+        for ev in new_rows:
             risk = ev.get("risk_score", 0) or 0
             severity = _risk_to_severity(risk)
             if SEV_ORDER.get(severity, 0) < self.min_severity:
@@ -442,21 +470,12 @@ class AlertMonitor(threading.Thread):
                 tech_name="Network Activity",
                 detail=f"{direction} {remote}:{port}/{proto} risk={risk:.2f} cat={cat}",
             )
-        self._wm["flow_events"] = current
 
     # ── DNS Events ──
 
     def _check_dns_events(self):
-        current = _table_count("dns_events")
-        prev = self._wm.get("dns_events", 0)
-        if current <= prev:
-            return
-        new_rows = _query(
-            "SELECT * FROM dns_events WHERE risk_score >= 0.5 "
-            "ORDER BY rowid DESC LIMIT ?",
-            (current - prev,),
-        )
-        for ev in reversed(new_rows):
+        new_rows = self._tail("dns_events", "risk_score >= 0.5")
+        for ev in new_rows:
             risk = ev.get("risk_score", 0) or 0
             severity = _risk_to_severity(risk)
             if SEV_ORDER.get(severity, 0) < self.min_severity:
@@ -477,21 +496,12 @@ class AlertMonitor(threading.Thread):
                 tech_name=MITRE.get(tech, "DNS"),
                 detail=f"domain={str(domain)[:40]} risk={risk:.2f} cat={cat}",
             )
-        self._wm["dns_events"] = current
 
     # ── FIM Events ──
 
     def _check_fim_events(self):
-        current = _table_count("fim_events")
-        prev = self._wm.get("fim_events", 0)
-        if current <= prev:
-            return
-        new_rows = _query(
-            "SELECT * FROM fim_events WHERE risk_score >= 0.6 "
-            "ORDER BY rowid DESC LIMIT ?",
-            (current - prev,),
-        )
-        for ev in reversed(new_rows):
+        new_rows = self._tail("fim_events", "risk_score >= 0.6")
+        for ev in new_rows:
             risk = ev.get("risk_score", 0) or 0
             severity = _risk_to_severity(risk)
             if SEV_ORDER.get(severity, 0) < self.min_severity:
@@ -510,21 +520,12 @@ class AlertMonitor(threading.Thread):
                 tech_name="File Integrity",
                 detail=f"action={action} path={str(path)[:50]} risk={risk:.2f}",
             )
-        self._wm["fim_events"] = current
 
     # ── Fusion Incidents (CRITICAL — correlated multi-stage attacks) ──
 
     def _check_fusion_incidents(self):
-        current = _table_count("incidents", db_path=FUSION_DB_PATH)
-        prev = self._wm.get("fusion_incidents", 0)
-        if current <= prev:
-            return
-        new_rows = _query(
-            "SELECT * FROM incidents ORDER BY rowid DESC LIMIT ?",
-            (current - prev,),
-            db_path=FUSION_DB_PATH,
-        )
-        for inc in reversed(new_rows):
+        new_rows = self._tail("fusion_incidents")
+        for inc in new_rows:
             self.incident_count += 1
             severity = (inc.get("severity", "high") or "high").lower()
             rule = inc.get("rule_name", "?")
@@ -539,18 +540,16 @@ class AlertMonitor(threading.Thread):
 
             if self.responder and severity in ("critical", "high"):
                 self.responder.handle_incident(inc)
-        self._wm["fusion_incidents"] = current
 
     # ── Telemetry DB Incidents ──
 
     def _check_telemetry_incidents(self):
-        current = _table_count("incidents")
-        prev = self._wm.get("incidents", 0)
-        if current <= prev:
-            return
         # These are bridged from fusion — avoid double-alerting on
-        # incidents we already saw from fusion.db
-        self._wm["incidents"] = current
+        # incidents we already saw from fusion.db; just keep the
+        # watermark current.
+        conn = self._conn(DB_PATH)
+        if conn is not None:
+            self._wm["incidents"] = max_rowid(conn, "incidents")
 
     # ── Story Mode ──
 
@@ -36,6 +36,30 @@ Rule format (YAML):
         - CI/CD pipelines with misconfigured credentials
     confidence: 0.85
 
+Evaluation model:
+    Rules are compiled once at load time. Each detection section becomes a
+    predicate over pre-built value matchers (wildcards and regexes compiled,
+    exact literals folded into sets), and the condition is parsed into a tree
+    of those predicates. Rules whose condition requires an exact field value
+    (typically ``event_type``) are registered in an inverted index keyed by
+    (field, value), so an event is only evaluated against rules whose
+    required literal it actually carries.
+
+Aggregation:
+    Conditions with a ``|`` tail are evaluated over a sliding ``timeframe``
+    window (default 1h) kept per rule and group:
+
+        count()              events (optionally ``by`` a group field)
+        count(field)         events per ``field`` value (AMOSKYS shorthand
+                             for ``count() by field``)
+        count(field) by grp  distinct ``field`` values per ``grp``
+        sum(field) [by grp]  sum of numeric ``field``
+
+    A rule fires once when a group crosses its threshold and re-arms when the
+    windowed value falls back. Window state is memory-bounded (LRU over
+    groups, capped entries per window) and can be checkpointed with
+    save_aggregation_state() / load_aggregation_state().
+
 Usage:
     engine = SigmaEngine()
     loaded = engine.load_rules("src/amoskys/detection/rules/sigma/")
@@ -46,14 +70,16 @@ Usage:
 from __future__ import annotations
 
 import fnmatch
+import json
 import logging
 import operator
 import os
 import re
 import time
+from collections import OrderedDict, deque
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+from typing import Any, Callable, Dict, FrozenSet, List, Optional, Set, Tuple
 
 logger = logging.getLogger(__name__)
 
@@ -105,6 +131,13 @@ class SigmaRule:
 
     # Compiled detection (internal)
     _matchers: List[Callable] = field(default_factory=list, repr=False)
+    _predicate: Optional[Callable[[Dict[str, Any]], bool]] = field(
+        default=None, repr=False
+    )
+    # (field, {lowercased values}) the event must carry for a match, if any
+    _index_key: Optional[Tuple[str, FrozenSet[str]]] = field(default=None, repr=False)
+    # Windowed count()/sum() clause from the condition, if any
+    _aggregation: Optional[_AggregationSpec] = field(default=None, repr=False)
 
 
 @dataclass
@@ -120,6 +153,8 @@ class SigmaMatch:
     matched_fields: Dict[str, Any]
     timestamp_ns: int
     event_type: str
+    # Windowed value that crossed the threshold (aggregation rules only)
+    aggregate_value: Optional[float] = None
 
 
 @dataclass
@@ -154,8 +189,15 @@ class SigmaEngine:
         self._match_count: Dict[str, int] = {}  # rule_id → match count
         self._last_match: Dict[str, int] = {}  # rule_id → last match timestamp_ns
 
-        # Aggregation state for timeframe-based conditions
-        self._agg_buffers: Dict[str, List[Dict[str, Any]]] = {}
+        # Aggregation state for timeframe-based conditions:
+        # rule_id → group key → window, in least-recently-updated order
+        self._agg_windows: Dict[str, OrderedDict[str, _AggWindow]] = {}
+        self._agg_updates = 0
+
+        # Load order (stable match ordering) and per-(category, event_type)
+        # evaluation plans built from the inverted index; cleared on reload
+        self._rule_order: Dict[str, int] = {}
+        self._plans: Dict[Tuple[str, str], _EvalPlan] = {}
 
         if auto_load:
             load_path = rules_dir or self._DEFAULT_RULES_DIR
@@ -194,10 +236,7 @@ class SigmaEngine:
             try:
                 rule = self._parse_rule(yaml_file)
                 if rule:
-                    self._rules[rule.id] = rule
-                    category = rule.logsource_category or "uncategorized"
-                    self._rules_by_category.setdefault(category, []).append(rule)
-                    self._match_count[rule.id] = 0
+                    self._register_rule(rule)
                     loaded += 1
             except Exception as e:
                 logger.warning("Failed to parse %s: %s", yaml_file.name, e)
@@ -226,10 +265,7 @@ class SigmaEngine:
                 return None
             rule = self._build_rule(data, source)
             if rule:
-                self._rules[rule.id] = rule
-                category = rule.logsource_category or "uncategorized"
-                self._rules_by_category.setdefault(category, []).append(rule)
-                self._match_count[rule.id] = 0
+                self._register_rule(rule)
             return rule
         except Exception as e:
             logger.warning("Failed to parse rule from string: %s", e)
@@ -255,29 +291,30 @@ class SigmaEngine:
         event_type = event_dict.get("event_type", "")
         category = event_dict.get("category", "")
 
-        # Pre-filter: only evaluate rules matching event category (O(k) not O(n))
-        candidate_rules = self._rules_by_category.get(category, [])
-        if event_type and event_type != category:
-            candidate_rules = candidate_rules + self._rules_by_category.get(
-                event_type, []
+        plan = self._plans.get((category, event_type))
+        if plan is None:
+            plan = self._build_plan(category, event_type)
+
+        # Inverted index: only rules whose required literal the event carries
+        candidate_rules = plan.unindexed
+        hits: List[SigmaRule] = []
+        for field_name, by_value in plan.indexed:
+            actual = _field_value(event_dict, field_name)
+            if actual is not None:
+                hits.extend(by_value.get(str(actual).lower(), ()))
+        if hits:
+            order = self._rule_order
+            candidate_rules = sorted(
+                candidate_rules + hits, key=lambda r: order.get(r.id, 0)
             )
-        # Also include wildcard/uncategorized rules
-        candidate_rules = candidate_rules + self._rules_by_category.get("", [])
-        # Fallback: if no candidates found by category, evaluate ALL rules so
-        # events without an explicit category field still get matched.
-        if not candidate_rules:
-            candidate_rules = list(self._rules.values())
-        # Deduplicate (rule may appear in multiple categories)
-        seen_ids = set()
-        unique_rules = []
-        for r in candidate_rules:
-            if r.id not in seen_ids:
-                seen_ids.add(r.id)
-                unique_rules.append(r)
-        candidate_rules = unique_rules
 
         for rule in candidate_rules:
             if self._rule_matches(rule, event_dict):
+                aggregate_value = None
+                if rule._aggregation is not None:
+                    aggregate_value = self._aggregate(rule, event_dict)
+                    if aggregate_value is None:
+                        continue
                 match = SigmaMatch(
                     rule_id=rule.id,
                     rule_title=rule.title,
@@ -296,6 +333,7 @@ class SigmaEngine:
                     },
                     timestamp_ns=event_dict.get("timestamp_ns", int(time.time() * 1e9)),
                     event_type=event_type,
+                    aggregate_value=aggregate_value,
                 )
                 matches.append(match)
 
@@ -352,8 +390,130 @@ class SigmaEngine:
             ]
         self._match_count.pop(rule_id, None)
         self._last_match.pop(rule_id, None)
+        self._rule_order.pop(rule_id, None)
+        self._agg_windows.pop(rule_id, None)
+        self._plans.clear()
         return True
 
+    # ── Aggregation State ────────────────────────────────────────────────
+
+    def get_aggregation_state(self) -> Dict[str, Any]:
+        """Snapshot in-flight aggregation windows as a JSON-serializable dict."""
+        rules: Dict[str, Any] = {}
+        for rule_id, windows in self._agg_windows.items():
+            if windows:
+                rules[rule_id] = {
+                    group: {"entries": list(w.entries), "fired": w.fired}
+                    for group, w in windows.items()
+                }
+        return {"version": 1, "saved_ns": time.time_ns(), "rules": rules}
+
+    def restore_aggregation_state(self, state: Dict[str, Any]) -> int:
+        """Restore windows from get_aggregation_state() output.
+
+        Windows for rules that are no longer loaded, or no longer aggregate,
+        are skipped. Entries are re-expired on the next matching event.
+
+        Returns:
+            Number of group windows restored.
+        """
+        restored = 0
+        for rule_id, groups in (state or {}).get("rules", {}).items():
+            rule = self._rules.get(rule_id)
+            if rule is None or rule._aggregation is None:
+                continue
+            spec = rule._aggregation
+            windows = self._agg_windows.setdefault(rule_id, OrderedDict())
+            for group, saved in groups.items():
+                window = _AggWindow()
+                for ts_ns, value in saved.get("entries", []):
+                    window.add(int(ts_ns), value, spec)
+                window.fired = bool(saved.get("fired", False))
+                windows[group] = window
+                restored += 1
+        return restored
+
+    def save_aggregation_state(self, path: str) -> bool:
+        """Checkpoint aggregation windows to a JSON file (atomic replace)."""
+        tmp_path = f"{path}.tmp"
+        try:
+            Path(path).parent.mkdir(parents=True, exist_ok=True)
+            with open(tmp_path, "w") as f:
+                json.dump(self.get_aggregation_state(), f)
+            os.replace(tmp_path, path)
+            return True
+        except OSError as e:
+            logger.warning("Failed to save Sigma aggregation state: %s", e)
+            return False
+
+    def load_aggregation_state(self, path: str) -> int:
+        """Restore aggregation windows from a checkpoint file, if present."""
+        if not Path(path).is_file():
+            return 0
+        try:
+            with open(path) as f:
+                state = json.load(f)
+        except (OSError, ValueError) as e:
+            logger.warning("Failed to load Sigma aggregation state: %s", e)
+            return 0
+        restored = self.restore_aggregation_state(state)
+        logger.info("Sigma engine: restored %d aggregation windows", restored)
+        return restored
+
+    # ── Internal: Rule Registry & Index ──────────────────────────────────
+
+    def _register_rule(self, rule: SigmaRule) -> None:
+        """Add a compiled rule to the registry and invalidate cached plans."""
+        self._rules[rule.id] = rule
+        category = rule.logsource_category or "uncategorized"
+        self._rules_by_category.setdefault(category, []).append(rule)
+        self._match_count[rule.id] = 0
+        self._rule_order.setdefault(rule.id, len(self._rule_order))
+        self._agg_windows.pop(rule.id, None)
+        self._plans.clear()
+
+    def _build_plan(self, category: str, event_type: str) -> _EvalPlan:
+        """Build (and cache) the evaluation plan for a category/event_type.
+
+        Candidate selection is unchanged: rules of the event's category and
+        of its event_type, falling back to every rule when neither matches.
+        Candidates with a required literal go into the inverted index; the
+        rest are always evaluated.
+        """
+        candidates = self._rules_by_category.get(category, [])
+        if event_type and event_type != category:
+            candidates = candidates + self._rules_by_category.get(event_type, [])
+        # Also include wildcard/uncategorized rules
+        candidates = candidates + self._rules_by_category.get("", [])
+        # Fallback: if no candidates found by category, evaluate ALL rules so
+        # events without an explicit category field still get matched.
+        if not candidates:
+            candidates = list(self._rules.values())
+
+        unindexed: List[SigmaRule] = []
+        indexed: Dict[str, Dict[str, List[SigmaRule]]] = {}
+        seen_ids: Set[str] = set()
+        for rule in candidates:
+            # A rule may appear in multiple categories, or stale after reload
+            if rule.id in seen_ids or self._rules.get(rule.id) is not rule:
+                continue
+            seen_ids.add(rule.id)
+            if rule._predicate is None:
+                continue
+            if rule._index_key is None:
+                unindexed.append(rule)
+                continue
+            field_name, values = rule._index_key
+            by_value = indexed.setdefault(field_name, {})
+            for value in values:
+                by_value.setdefault(value, []).append(rule)
+
+        plan = _EvalPlan(unindexed=unindexed, indexed=list(indexed.items()))
+        if len(self._plans) >= _MAX_PLANS:
+            self._plans.clear()
+        self._plans[(category, event_type)] = plan
+        return plan
+
     # ── Internal: Rule Parsing ───────────────────────────────────────────
 
     def _parse_rule(self, path: Path) -> Optional[SigmaRule]:
@@ -423,107 +583,108 @@ class SigmaEngine:
             file_path=source,
         )
 
-        # Compile detection matchers
-        rule._matchers = self._compile_detection(detection, condition)
+        # Compile detection: section predicates, condition tree, index key
+        sections = _compile_sections(detection)
+        rule._matchers = [pred for pred, _ in sections.values()]
+        if sections:
+            try:
+                compiled = _ConditionParser(str(condition), sections).parse()
+            except ValueError as e:
+                logger.warning("Rule %s: bad condition %r: %s", rule_id, condition, e)
+            else:
+                rule._predicate, rule._index_key = compiled
+
+        if rule._predicate is not None and "|" in str(condition):
+            tail = str(condition).split("|", 1)[1]
+            try:
+                rule._aggregation = _parse_aggregation(tail, rule.timeframe)
+            except ValueError as e:
+                # Firing per event would ignore the threshold; disable instead
+                logger.warning("Rule %s: bad aggregation %r: %s", rule_id, tail, e)
+                rule._predicate = None
 
         return rule
 
-    def _compile_detection(
-        self, detection: Dict[str, Any], condition: str
-    ) -> List[Callable]:
-        """Compile detection selection/filter into callable matchers.
-
-        Supports:
-            - Simple field matching (selection: {field: value})
-            - Wildcard matching (field: "*.exe")
-            - List matching (field: [val1, val2])
-            - Negation via "not" in condition
-            - count() aggregation in condition
-        """
-        matchers: List[Callable] = []
-
-        if not detection:
-            return matchers
-
-        for name, criteria in detection.items():
-            if not isinstance(criteria, dict):
-                continue
-            matchers.append(self._build_field_matcher(name, criteria))
-
-        return matchers
-
-    def _build_field_matcher(
-        self, name: str, criteria: Dict[str, Any]
-    ) -> Callable[[Dict[str, Any]], bool]:
-        """Build a field matcher function from detection criteria."""
+    # ── Internal: Rule Evaluation ────────────────────────────────────────
 
-        def matcher(event: Dict[str, Any]) -> bool:
-            for field_name, expected in criteria.items():
-                actual = event.get(field_name)
-                # Also check nested data dict
-                if actual is None and isinstance(event.get("data"), dict):
-                    actual = event["data"].get(field_name)
+    def _rule_matches(self, rule: SigmaRule, event_dict: Dict[str, Any]) -> bool:
+        """Check if an event matches a rule's compiled detection logic."""
+        if rule._predicate is None:
+            return False
+        return rule._predicate(event_dict)
 
-                if actual is None:
-                    return False
+    def _aggregate(
+        self, rule: SigmaRule, event_dict: Dict[str, Any]
+    ) -> Optional[float]:
+        """Fold a selected event into its window; return the value on crossing.
 
-                if not _value_matches(actual, expected):
-                    return False
-            return True
+        Returns None unless this event moves the group's windowed value
+        across the threshold (edge-triggered, re-armed once it falls back).
+        """
+        spec = rule._aggregation
+        group = ""
+        if spec.group_by:
+            group_value = _field_value(event_dict, spec.group_by)
+            if group_value is None:
+                return None
+            group = str(group_value)
 
-        return matcher
+        value: Any = None
+        if spec.field:
+            value = _field_value(event_dict, spec.field)
+            if value is None:
+                return None
+            if spec.function == "sum":
+                try:
+                    value = float(value)
+                except (TypeError, ValueError):
+                    return None
+            else:
+                value = str(value)
+
+        ts_ns = event_dict.get("timestamp_ns")
+        if not isinstance(ts_ns, int) or ts_ns <= 0:
+            ts_ns = time.time_ns()
+
+        windows = self._agg_windows.setdefault(rule.id, OrderedDict())
+        window = windows.get(group)
+        if window is None:
+            window = windows[group] = _AggWindow()
+            if len(windows) > _AGG_MAX_GROUPS:
+                windows.popitem(last=False)
+        else:
+            windows.move_to_end(group)
 
-    # ── Internal: Rule Evaluation ────────────────────────────────────────
+        window.add(ts_ns, value, spec)
+        window.expire(window.newest_ns - spec.window_ns, spec)
 
-    def _rule_matches(self, rule: SigmaRule, event_dict: Dict[str, Any]) -> bool:
-        """Check if an event matches a rule's detection logic."""
-        if not rule._matchers:
-            return False
+        self._agg_updates += 1
+        if self._agg_updates % _AGG_SWEEP_EVERY == 0:
+            self._sweep_windows(ts_ns)
 
-        condition = rule.condition.lower().strip()
-
-        # Handle "not" conditions
-        negate = False
-        if condition.startswith("not "):
-            negate = True
-            condition = condition[4:].strip()
-
-        # Handle "selection and filter" / "selection or filter"
-        if " and " in condition:
-            parts = condition.split(" and ")
-            result = all(
-                self._match_named(rule, name.strip(), event_dict)
-                for name in parts
-                if not name.strip().startswith("count")
-            )
-        elif " or " in condition:
-            parts = condition.split(" or ")
-            result = any(
-                self._match_named(rule, name.strip(), event_dict) for name in parts
-            )
-        elif "|" in condition and "count" in condition:
-            # e.g., "selection | count(source_ip) >= 5"
-            # For single-event evaluation, we check the selection part
-            sel_name = condition.split("|")[0].strip()
-            result = self._match_named(rule, sel_name, event_dict)
-        else:
-            # Simple: "selection"
-            result = any(m(event_dict) for m in rule._matchers)
-
-        return not result if negate else result
-
-    def _match_named(
-        self, rule: SigmaRule, name: str, event_dict: Dict[str, Any]
-    ) -> bool:
-        """Match a named detection section against an event."""
-        criteria = rule.detection.get(name)
-        if criteria is None:
-            # Try matching any compiled matcher
-            return any(m(event_dict) for m in rule._matchers)
-        if isinstance(criteria, dict):
-            matcher = self._build_field_matcher(name, criteria)
-            return matcher(event_dict)
-        return False
+        current = window.value(spec)
+        if spec.compare(current, spec.threshold):
+            if window.fired:
+                return None
+            window.fired = True
+            return current
+        window.fired = False
+        return None
+
+    def _sweep_windows(self, now_ns: int) -> None:
+        """Drop groups with no entry inside their rule's timeframe."""
+        for rule_id, windows in self._agg_windows.items():
+            rule = self._rules.get(rule_id)
+            if rule is None or rule._aggregation is None:
+                windows.clear()
+                continue
+            cutoff = now_ns - rule._aggregation.window_ns
+            # Least recently updated first; stop at the first live group
+            while windows:
+                group, window = next(iter(windows.items()))
+                if window.newest_ns >= cutoff:
+                    break
+                del windows[group]
 
     @staticmethod
     def _event_to_dict(event: Any) -> Optional[Dict[str, Any]]:
@@ -562,32 +723,397 @@ class SigmaEngine:
         return result if result else None
 
 
-# ── Value Matching Helpers ───────────────────────────────────────────────────
+# ── Windowed Aggregation ─────────────────────────────────────────────────────
 
+# Bounds on in-memory window state
+_AGG_MAX_GROUPS = 10000  # groups per rule (least recently updated evicted)
+_AGG_MAX_ENTRIES = 10000  # entries per group window (oldest evicted)
+_AGG_SWEEP_EVERY = 1024  # aggregation updates between idle-group sweeps
+_AGG_DEFAULT_WINDOW_S = 3600  # rules with an aggregation but no timeframe
 
-def _value_matches(actual: Any, expected: Any) -> bool:
-    """Check if actual value matches expected (with wildcards and lists)."""
-    if isinstance(expected, list):
-        return any(_value_matches(actual, e) for e in expected)
+_AGGREGATION = re.compile(
+    r"^\s*(count|sum)\(\s*([\w.]*)\s*\)"
+    r"(?:\s+by\s+([\w.]+))?"
+    r"\s*(>=|<=|==|!=|>|<|=)\s*(\d+(?:\.\d+)?)\s*$",
+    re.IGNORECASE,
+)
 
-    if isinstance(expected, str):
-        actual_str = str(actual).lower()
-        expected_lower = expected.lower()
+_COMPARATORS = {
+    ">": operator.gt,
+    ">=": operator.ge,
+    "<": operator.lt,
+    "<=": operator.le,
+    "=": operator.eq,
+    "==": operator.eq,
+    "!=": operator.ne,
+}
 
-        # Wildcard matching
-        if "*" in expected_lower or "?" in expected_lower:
-            return fnmatch.fnmatch(actual_str, expected_lower)
+_TIMEFRAME = re.compile(r"^\s*(\d+)\s*([smhd])\s*$", re.IGNORECASE)
+_TIMEFRAME_UNITS = {"s": 1, "m": 60, "h": 3600, "d": 86400}
 
-        # Regex matching (Sigma |re modifier not standard, but useful)
-        if expected_lower.startswith("/") and expected_lower.endswith("/"):
-            pattern = expected_lower[1:-1]
-            try:
-                return bool(re.search(pattern, actual_str, re.IGNORECASE))
-            except re.error:
+
+@dataclass
+class _AggregationSpec:
+    """Parsed ``| count()/sum()`` clause of a Sigma condition."""
+
+    function: str  # count | sum
+    field: str  # counted/summed field ("" for count())
+    group_by: str  # window key field ("" = one window per rule)
+    distinct: bool  # count(field) by grp → distinct field values
+    compare: Callable[[float, float], bool]
+    threshold: float
+    window_ns: int
+
+
+def _parse_timeframe(timeframe: str) -> int:
+    """Parse a Sigma timeframe (``30s``, ``5m``, ``1h``, ``1d``) into ns."""
+    if not timeframe:
+        return _AGG_DEFAULT_WINDOW_S * 1_000_000_000
+    m = _TIMEFRAME.match(timeframe)
+    if not m:
+        raise ValueError(f"unsupported timeframe {timeframe!r}")
+    seconds = int(m.group(1)) * _TIMEFRAME_UNITS[m.group(2).lower()]
+    return seconds * 1_000_000_000
+
+
+def _parse_aggregation(expression: str, timeframe: str) -> _AggregationSpec:
+    """Parse the part of a condition after ``|`` into an aggregation spec."""
+    m = _AGGREGATION.match(expression)
+    if not m:
+        raise ValueError("expected count()/sum() <op> <number>")
+    function, agg_field, group_by, op, threshold = m.groups()
+    function = function.lower()
+    if function == "sum" and not agg_field:
+        raise ValueError("sum() requires a field")
+
+    distinct = False
+    if function == "count" and agg_field:
+        if group_by:
+            distinct = True  # count(field) by grp: distinct values per group
+        else:
+            agg_field, group_by = "", agg_field  # count(field) ≡ count() by field
+
+    return _AggregationSpec(
+        function=function,
+        field=agg_field,
+        group_by=group_by or "",
+        distinct=distinct,
+        compare=_COMPARATORS[op],
+        threshold=float(threshold),
+        window_ns=_parse_timeframe(timeframe),
+    )
+
+
+class _AggWindow:
+    """Sliding window for one (rule, group): entries plus running totals."""
+
+    __slots__ = ("entries", "total", "distinct", "newest_ns", "fired")
+
+    def __init__(self) -> None:
+        self.entries: deque = deque()  # [ts_ns, value] in arrival order
+        self.total = 0.0  # running sum for sum()
+        self.distinct: Dict[str, int] = {}  # value → occurrences in window
+        self.newest_ns = 0
+        self.fired = False
+
+    def add(self, ts_ns: int, value: Any, spec: _AggregationSpec) -> None:
+        self.entries.append([ts_ns, value])
+        if spec.function == "sum":
+            self.total += value
+        elif spec.distinct:
+            self.distinct[value] = self.distinct.get(value, 0) + 1
+        if ts_ns > self.newest_ns:
+            self.newest_ns = ts_ns
+        if len(self.entries) > _AGG_MAX_ENTRIES:
+            self._pop(spec)
+
+    def expire(self, cutoff_ns: int, spec: _AggregationSpec) -> None:
+        while self.entries and self.entries[0][0] < cutoff_ns:
+            self._pop(spec)
+
+    def value(self, spec: _AggregationSpec) -> float:
+        if spec.function == "sum":
+            return self.total
+        if spec.distinct:
+            return float(len(self.distinct))
+        return float(len(self.entries))
+
+    def _pop(self, spec: _AggregationSpec) -> None:
+        _, value = self.entries.popleft()
+        if spec.function == "sum":
+            self.total -= value
+        elif spec.distinct:
+            remaining = self.distinct[value] - 1
+            if remaining:
+                self.distinct[value] = remaining
+            else:
+                del self.distinct[value]
+
+
+# ── Compiled Matching ────────────────────────────────────────────────────────
+
+# Cached (category, event_type) plans; cleared wholesale when exceeded
+_MAX_PLANS = 4096
+
+_CONDITION_TOKEN = re.compile(r"\(|\)|[^\s()]+")
+
+_SUPPORTED_MODIFIERS = {"contains", "startswith", "endswith", "re", "all"}
+
+# Compiled (predicate, index_key) pair for a condition or sub-expression
+_Compiled = Tuple[
+    Callable[[Dict[str, Any]], bool], Optional[Tuple[str, FrozenSet[str]]]
+]
+
+
+@dataclass
+class _EvalPlan:
+    """Rules to evaluate for one (category, event_type) pair."""
+
+    unindexed: List[SigmaRule]
+    # [(field, {lowercased value: [rule, ...]}), ...]
+    indexed: List[Tuple[str, Dict[str, List[SigmaRule]]]]
+
+
+def _field_value(event: Dict[str, Any], name: str) -> Any:
+    """Look up a field on the event, falling back to the nested data dict."""
+    actual = event.get(name)
+    if actual is None:
+        data = event.get("data")
+        if isinstance(data, dict):
+            actual = data.get(name)
+    return actual
+
+
+def _never(_actual: Any) -> bool:
+    return False
+
+
+def _compile_string(expected: str, modifier: str) -> Callable[[Any], bool]:
+    """Compile one string value (case-insensitive) into a predicate."""
+    lowered = expected.lower()
+
+    if modifier == "re":
+        try:
+            rx = re.compile(expected, re.IGNORECASE)
+        except re.error:
+            return _never
+        return lambda actual: rx.search(str(actual)) is not None
+
+    wildcard = "*" in lowered or "?" in lowered
+    if modifier == "contains":
+        if not wildcard:
+            return lambda actual: lowered in str(actual).lower()
+        lowered = f"*{lowered}*"
+    elif modifier == "startswith":
+        if not wildcard:
+            return lambda actual: str(actual).lower().startswith(lowered)
+        lowered = f"{lowered}*"
+    elif modifier == "endswith":
+        if not wildcard:
+            return lambda actual: str(actual).lower().endswith(lowered)
+        lowered = f"*{lowered}"
+
+    # Wildcard matching (also under contains/startswith/endswith)
+    if "*" in lowered or "?" in lowered:
+        rx = re.compile(fnmatch.translate(lowered))
+        return lambda actual: rx.match(str(actual).lower()) is not None
+
+    # /regex/ literal (pre-dates the |re modifier; kept for existing rules)
+    if lowered.startswith("/") and lowered.endswith("/"):
+        try:
+            rx = re.compile(lowered[1:-1], re.IGNORECASE)
+        except re.error:
+            return _never
+        return lambda actual: rx.search(str(actual).lower()) is not None
+
+    # Exact match (case-insensitive for strings)
+    return lambda actual: str(actual).lower() == lowered
+
+
+def _is_literal(expected: Any) -> bool:
+    """True if ``expected`` is an exact string (no wildcard or /regex/)."""
+    return (
+        isinstance(expected, str)
+        and "*" not in expected
+        and "?" not in expected
+        and not (expected.startswith("/") and expected.endswith("/"))
+    )
+
+
+def _compile_value(
+    expected: Any, modifiers: List[str]
+) -> Tuple[Callable[[Any], bool], Optional[FrozenSet[str]]]:
+    """Compile an expected value (scalar or list) into a predicate.
+
+    Returns the predicate and, when every value is an exact string without
+    modifiers, the set of lowercased literals it accepts (for indexing).
+    """
+    unknown = [m for m in modifiers if m not in _SUPPORTED_MODIFIERS]
+    if unknown:
+        logger.warning("Unsupported Sigma modifier(s): %s", ", ".join(unknown))
+        return _never, None
+
+    match_all = "all" in modifiers
+    modifier = next((m for m in modifiers if m != "all"), "")
+    values = expected if isinstance(expected, list) else [expected]
+
+    literals: Optional[FrozenSet[str]] = None
+    if not modifier and not match_all and values and all(map(_is_literal, values)):
+        literals = frozenset(v.lower() for v in values)
+        return (lambda actual: str(actual).lower() in literals), literals
+
+    preds: List[Callable[[Any], bool]] = []
+    for value in values:
+        if isinstance(value, str):
+            preds.append(_compile_string(value, modifier))
+        else:
+            # Numeric/boolean comparison
+            preds.append(lambda actual, v=value: actual == v)
+
+    if match_all:
+        return (lambda actual: all(p(actual) for p in preds)), None
+    if len(preds) == 1:
+        return preds[0], None
+    return (lambda actual: any(p(actual) for p in preds)), None
+
+
+def _compile_selection(criteria: Dict[str, Any]) -> _Compiled:
+    """Compile a detection section (AND over its fields)."""
+    fields: List[Tuple[str, Callable[[Any], bool]]] = []
+    index_key: Optional[Tuple[str, FrozenSet[str]]] = None
+
+    for key, expected in criteria.items():
+        name, *modifiers = str(key).split("|")
+        pred, literals = _compile_value(expected, [m.lower() for m in modifiers])
+        fields.append((name, pred))
+        if literals is not None and (index_key is None or name == "event_type"):
+            index_key = (name, literals)
+
+    def selection(event: Dict[str, Any]) -> bool:
+        for name, pred in fields:
+            actual = event.get(name)
+            # Also check nested data dict
+            if actual is None:
+                data = event.get("data")
+                if isinstance(data, dict):
+                    actual = data.get(name)
+            if actual is None or not pred(actual):
                 return False
+        return True
 
-        # Exact match (case-insensitive for strings)
-        return actual_str == expected_lower
+    return selection, index_key
+
+
+def _compile_sections(detection: Dict[str, Any]) -> Dict[str, _Compiled]:
+    """Compile every map-valued detection section, keyed by lowercased name."""
+    if not isinstance(detection, dict):
+        return {}
+    return {
+        str(name).lower(): _compile_selection(criteria)
+        for name, criteria in detection.items()
+        if isinstance(criteria, dict)
+    }
+
+
+def _combine_and(parts: List[_Compiled]) -> _Compiled:
+    preds = [p for p, _ in parts]
+    keys = [k for _, k in parts if k is not None]
+    # Any conjunct's literal is required; prefer event_type, then the narrowest
+    key = min(keys, key=lambda k: (k[0] != "event_type", len(k[1])), default=None)
+    if len(preds) == 2:
+        a, b = preds
+        return (lambda e: a(e) and b(e)), key
+    return (lambda e: all(p(e) for p in preds)), key
+
+
+def _combine_or(parts: List[_Compiled]) -> _Compiled:
+    preds = [p for p, _ in parts]
+    keys = [k for _, k in parts]
+    # Indexable only if every branch requires a literal on the same field
+    key = None
+    if all(k is not None for k in keys) and len({k[0] for k in keys}) == 1:
+        key = (keys[0][0], frozenset().union(*(k[1] for k in keys)))
+    if len(preds) == 2:
+        a, b = preds
+        return (lambda e: a(e) or b(e)), key
+    return (lambda e: any(p(e) for p in preds)), key
+
+
+class _ConditionParser:
+    """Recursive-descent parser for Sigma conditions.
+
+    Grammar (keywords case-insensitive)::
+
+        expr   := term ("or" term)*
+        term   := factor ("and" factor)*
+        factor := "not" factor | "(" expr ")"
+                | ("1" | "any" | "all") "of" (pattern | "them") | name
+
+    An empty condition means ``1 of them``.  Aggregation after ``|`` (e.g.
+    ``count(field) >= 5``) is not evaluated here; the expression before the
+    pipe decides per-event matches.
+    """
 
-    # Numeric/boolean comparison
-    return actual == expected
+    def __init__(self, condition: str, sections: Dict[str, _Compiled]) -> None:
+        expr = condition.split("|", 1)[0].strip().lower() or "1 of them"
+        self._tokens = _CONDITION_TOKEN.findall(expr)
+        self._pos = 0
+        self._sections = sections
+
+    def parse(self) -> _Compiled:
+        result = self._expr()
+        if self._pos != len(self._tokens):
+            raise ValueError(f"unexpected token {self._tokens[self._pos]!r}")
+        return result
+
+    def _peek(self) -> str:
+        return self._tokens[self._pos] if self._pos < len(self._tokens) else ""
+
+    def _take(self) -> str:
+        token = self._peek()
+        if not token:
+            raise ValueError("unexpected end of condition")
+        self._pos += 1
+        return token
+
+    def _expr(self) -> _Compiled:
+        parts = [self._term()]
+        while self._peek() == "or":
+            self._take()
+            parts.append(self._term())
+        return parts[0] if len(parts) == 1 else _combine_or(parts)
+
+    def _term(self) -> _Compiled:
+        parts = [self._factor()]
+        while self._peek() == "and":
+            self._take()
+            parts.append(self._factor())
+        return parts[0] if len(parts) == 1 else _combine_and(parts)
+
+    def _factor(self) -> _Compiled:
+        token = self._take()
+        if token == "not":
+            inner, _ = self._factor()
+            return (lambda e: not inner(e)), None
+        if token == "(":
+            result = self._expr()
+            if self._take() != ")":
+                raise ValueError("unbalanced parentheses")
+            return result
+        if token in ("1", "any", "all") and self._peek() == "of":
+            self._take()
+            target = self._take()
+            names = [
+                n
+                for n in self._sections
+                if target == "them" or fnmatch.fnmatchcase(n, target)
+            ]
+            if not names:
+                raise ValueError(f"no sections match {target!r}")
+            parts = [self._sections[n] for n in names]
+            if len(parts) == 1:
+                return parts[0]
+            return _combine_and(parts) if token == "all" else _combine_or(parts)
+        if token in self._sections:
+            return self._sections[token]
+        raise ValueError(f"unknown section {token!r}")
@@ -33,6 +33,12 @@ Architecture Overview:
        - Payload integrity verification
        - Schema validation for FlowEvent messages
 
+    6. Live Feed:
+       - Subscribe streams committed WAL entries to consumers, filtered by
+         agent, payload kind and minimum severity
+       - Bounded per-subscriber ring buffers (drop-oldest or disconnect)
+       - Resume from a WAL row id
+
 Overload Management:
     The server supports three overload modes configured via CLI or environment:
     - 'on': Force overload mode (reject all requests with RETRY)
@@ -49,6 +55,8 @@ Metrics & Observability:
     - bus_publish_latency_ms: Request latency histogram
     - bus_inflight_requests: Current in-flight request gauge
     - bus_retry_total: Total RETRY responses issued
+    - bus_subscribe_dropped_total: Entries dropped from full subscriber buffers
+    - bus_subscribe_disconnects_total: Subscribers disconnected on overflow
 
 Configuration:
     The server uses the centralized Amoskys configuration system, with support
@@ -58,6 +66,9 @@ Configuration:
     - BUS_MAX_ENV_BYTES: Maximum envelope size (default: 131072)
     - BUS_DEDUPE_TTL_SEC: Deduplication TTL (default: 300)
     - BUS_DEDUPE_MAX: Max dedupe cache size (default: 50000)
+    - BUS_SUBSCRIBE_BUFFER: Default subscriber ring buffer size (default: 1024)
+    - BUS_SUBSCRIBE_BUFFER_MAX: Largest buffer a subscriber may request (default: 65536)
+    - BUS_SUBSCRIBE_HISTORY: Recent WAL entries kept for resume (default: 4096)
 
 Security Considerations:
     - All connections require valid client certificates signed by trusted CA
@@ -73,9 +84,10 @@ import signal
 import sys
 import threading
 import time
-from collections import OrderedDict
+from collections import OrderedDict, deque
 from concurrent import futures
 from http.server import BaseHTTPRequestHandler, HTTPServer
+from typing import Optional
 
 import grpc
 import yaml
@@ -86,6 +98,11 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", "..", ".."))
 
 # Clean imports for new structure
 from amoskys.common.crypto.signing import load_public_key, verify
+from amoskys.common.ratelimit import (
+    GCRALimiter,
+    RateLimitBackend,
+    create_rate_limit_backend,
+)
 from amoskys.config import get_config
 from amoskys.proto import control_pb2, control_pb2_grpc
 from amoskys.proto import messaging_schema_pb2 as pb
@@ -96,6 +113,8 @@ from amoskys.storage.telemetry_contract import (
     QUALITY_DEGRADED,
     QUALITY_INVALID,
     QUALITY_VALID,
+    _agent_id,
+    _payload_kind,
     normalize_legacy_envelope,
     normalize_universal_envelope,
 )
@@ -183,6 +202,256 @@ class _ControlHub:
 _control_hub = _ControlHub()
 
 
+# Subscribe fan-out (EventBus.Subscribe)
+SUBSCRIBE_BUFFER = int(os.getenv("BUS_SUBSCRIBE_BUFFER", "1024"))
+SUBSCRIBE_BUFFER_MAX = int(os.getenv("BUS_SUBSCRIBE_BUFFER_MAX", "65536"))
+SUBSCRIBE_HISTORY = int(os.getenv("BUS_SUBSCRIBE_HISTORY", "4096"))
+
+_SEVERITY_RANK = {
+    "DEBUG": 0,
+    "INFO": 1,
+    "LOW": 2,
+    "WARN": 2,
+    "MEDIUM": 3,
+    "ERROR": 3,
+    "HIGH": 4,
+    "CRITICAL": 5,
+}
+
+
+def _wal_event(wal_id: int, idem: str, ts_ns: int, env_bytes: bytes) -> "pb.WALEvent":
+    """Build the WALEvent streamed to subscribers for one committed WAL row.
+
+    WAL bytes are always a serialized UniversalEnvelope; routing metadata
+    (agent, payload kind, highest event severity) is derived from it once
+    and shared by every subscriber.
+    """
+    event = pb.WALEvent(
+        wal_id=wal_id, idempotency_key=idem, ts_ns=ts_ns, envelope=env_bytes
+    )
+    env = telemetry_pb2.UniversalEnvelope()
+    try:
+        env.ParseFromString(env_bytes)
+    except Exception:
+        event.payload_kind = "unknown"
+        return event
+
+    event.payload_kind = _payload_kind(env)
+    event.agent_id = _agent_id(env)
+    if env.HasField("device_telemetry"):
+        severities = [
+            e.severity.upper()
+            for e in env.device_telemetry.events
+            if e.severity.upper() in _SEVERITY_RANK
+        ]
+        if severities:
+            event.severity = max(severities, key=_SEVERITY_RANK.__getitem__)
+    return event
+
+
+class _WALSubscriber:
+    """Active subscriber to committed WAL entries.
+
+    Each subscriber owns a bounded ring buffer.  When it is full the oldest
+    entry is dropped (and counted), or, with ``disconnect_on_overflow``, the
+    subscriber is marked overflowed and its stream is terminated.
+    """
+
+    def __init__(
+        self,
+        subscriber_id: str,
+        agent_ids: list[str] | None = None,
+        payload_kinds: list[str] | None = None,
+        min_severity: str = "",
+        max_buffer: int = SUBSCRIBE_BUFFER,
+        disconnect_on_overflow: bool = False,
+    ):
+        self.subscriber_id = subscriber_id
+        self.agent_ids = set(agent_ids or [])
+        self.payload_kinds = set(payload_kinds or [])
+        self.min_rank = _SEVERITY_RANK.get(min_severity.upper(), 0)
+        self.max_buffer = max(1, max_buffer)
+        self.disconnect_on_overflow = disconnect_on_overflow
+        self.dropped = 0
+        self.overflowed = False
+        self._buffer: "deque[pb.WALEvent]" = deque()
+        self._cond = threading.Condition()
+
+    def matches(self, event: "pb.WALEvent") -> bool:
+        if self.agent_ids and event.agent_id not in self.agent_ids:
+            return False
+        if self.payload_kinds and event.payload_kind not in self.payload_kinds:
+            return False
+        if self.min_rank and _SEVERITY_RANK.get(event.severity, 0) < self.min_rank:
+            return False
+        return True
+
+    def offer(self, event: "pb.WALEvent") -> bool:
+        with self._cond:
+            if self.overflowed:
+                return False
+            if len(self._buffer) >= self.max_buffer:
+                if self.disconnect_on_overflow:
+                    self.overflowed = True
+                    self._cond.notify_all()
+                    BUS_SUBSCRIBE_DISCONNECTS.inc()
+                    return False
+                self._buffer.popleft()
+                self.dropped += 1
+                BUS_SUBSCRIBE_DROPPED.inc()
+            self._buffer.append(event)
+            self._cond.notify()
+            return True
+
+    def next(self, timeout: float) -> "pb.WALEvent | None":
+        """Pop the oldest buffered event, waiting up to ``timeout`` seconds.
+
+        Returns None on timeout or once the subscriber has overflowed.
+        """
+        with self._cond:
+            if not self._buffer and not self.overflowed:
+                self._cond.wait(timeout)
+            if self.overflowed or not self._buffer:
+                return None
+            return self._buffer.popleft()
+
+
+class _WALHub:
+    """In-memory fanout hub for committed WAL entries.
+
+    Writers hand over ``(wal_id, idem, ts_ns, env_bytes)`` tuples after their
+    transaction commits.  The hub keeps a short raw history so subscribers
+    can resume from a WAL row id even after WALProcessor has drained the row
+    from the table; envelopes are only parsed when someone is listening.
+    """
+
+    def __init__(self, history: int = SUBSCRIBE_HISTORY) -> None:
+        self._lock = threading.Lock()
+        self._subscribers: list[_WALSubscriber] = []
+        self._history: deque = deque(maxlen=max(0, history))
+
+    def register(self, subscriber_id: str, **filters) -> _WALSubscriber:
+        subscriber = _WALSubscriber(subscriber_id=subscriber_id, **filters)
+        with self._lock:
+            self._subscribers.append(subscriber)
+        return subscriber
+
+    def unregister(self, subscriber: _WALSubscriber) -> None:
+        with self._lock:
+            self._subscribers = [s for s in self._subscribers if s is not subscriber]
+
+    def has_subscribers(self) -> bool:
+        with self._lock:
+            return bool(self._subscribers)
+
+    def publish(self, entries: list) -> int:
+        """Fan committed WAL entries out to matching subscribers.
+
+        Returns the number of (entry, subscriber) deliveries.
+        """
+        if not entries:
+            return 0
+        with self._lock:
+            self._history.extend(entries)
+            subscribers = list(self._subscribers)
+        if not subscribers:
+            return 0
+
+        delivered = 0
+        for entry in entries:
+            event = _wal_event(*entry)
+            for subscriber in subscribers:
+                if subscriber.matches(event) and subscriber.offer(event):
+                    delivered += 1
+        return delivered
+
+    def oldest_after(self, after_id: int) -> "int | None":
+        """Lowest WAL id above ``after_id`` still in the history, if any."""
+        with self._lock:
+            return next((e[0] for e in self._history if e[0] > after_id), None)
+
+    def newest(self) -> int:
+        """Highest WAL id in the history (0 when empty)."""
+        with self._lock:
+            return self._history[-1][0] if self._history else 0
+
+    def replay(
+        self,
+        subscriber: _WALSubscriber,
+        after_id: int,
+        stored: list,
+        until_id: "int | None" = None,
+    ) -> list:
+        """Return matching events with id > ``after_id``, oldest first.
+
+        ``stored`` holds rows still present in the WAL table; they are merged
+        with the in-memory history so rows already drained by WALProcessor
+        are covered too.  ``until_id`` is an optional inclusive upper bound.
+        """
+
+        def wanted(wal_id: int) -> bool:
+            return wal_id > after_id and (until_id is None or wal_id <= until_id)
+
+        with self._lock:
+            entries = {e[0]: e for e in self._history if wanted(e[0])}
+        for row in stored:
+            if wanted(row[0]):
+                entries.setdefault(row[0], row)
+
+        events = []
+        for wal_id in sorted(entries):
+            event = _wal_event(*entries[wal_id])
+            if subscriber.matches(event):
+                events.append(event)
+        return events
+
+
+_wal_hub = _WALHub()
+
+
+def _wal_rows_after(after_id: int, limit: int) -> list:
+    """Read committed WAL rows with id > ``after_id`` for Subscribe resume."""
+    if not wal_storage:
+        return []
+    with wal_storage._lock:
+        rows = wal_storage.db.execute(
+            "SELECT id, idem, ts_ns, bytes FROM wal WHERE id > ? ORDER BY id LIMIT ?",
+            (after_id, limit),
+        ).fetchall()
+    return [(row[0], row[1], row[2], bytes(row[3])) for row in rows]
+
+
+def _wal_last_id() -> int:
+    """Highest WAL row id ever handed out (0 without a WAL)."""
+    if not wal_storage:
+        return 0
+    with wal_storage._lock:
+        row = wal_storage.db.execute(
+            "SELECT seq FROM sqlite_sequence WHERE name = 'wal'"
+        ).fetchone()
+    return row[0] if row else 0
+
+
+def _publish_written(written: list) -> None:
+    """Publish rows stored via ``SQLiteWAL.write_raw`` to Subscribe streams.
+
+    ``write_raw`` does not report the row id, so it is looked up by the
+    (unique) idempotency key, and only while someone is listening.  The
+    group-commit writer publishes directly and is what feeds resume history.
+    """
+    if not wal_storage or not written or not _wal_hub.has_subscribers():
+        return
+    entries = []
+    with wal_storage._lock:
+        for idem, ts_ns, env_bytes in written:
+            row = wal_storage.db.execute(
+                "SELECT id FROM wal WHERE idem = ?", (idem,)
+            ).fetchone()
+            if row:
+                entries.append((row[0], idem, ts_ns, env_bytes))
+    _wal_hub.publish(entries)
+
+
 class WALBatchWriter:
     """Group-commit WAL writer. Amortizes fsync across concurrent Publish RPCs.
 
@@ -258,6 +527,49 @@ class WALBatchWriter:
         done.wait()  # block until our batch is flushed
         return result[0]
 
+    def write_many(self, items: list) -> list:
+        """Queue several writes as one group commit and block until it lands.
+
+        Used by PublishBatch: all items are appended to the pending list under
+        a single lock acquisition, so the flusher picks them up together and
+        commits them in the same BEGIN/COMMIT (one fsync for the whole batch).
+
+        Args:
+            items: List of dicts with the same keys as :meth:`write` arguments
+                (``idem``, ``ts_ns``, ``env_bytes`` plus optional keywords).
+
+        Returns:
+            One result per item, in order: True if written, False if
+            duplicate, None if the group commit failed and nothing was
+            persisted.
+        """
+        if not items:
+            return []
+
+        done = threading.Event()
+        results = [[False] for _ in items]
+
+        with self._cond:
+            for item, result in zip(items, results):
+                self._pending.append(
+                    (
+                        item["idem"],
+                        item["ts_ns"],
+                        item["env_bytes"],
+                        item.get("producer_ts_ns"),
+                        item.get("ingest_ts_ns"),
+                        item.get("source", "unknown"),
+                        item.get("schema_version", 0),
+                        item.get("status", "accepted"),
+                        done,
+                        result,
+                    )
+                )
+            self._cond.notify()  # a batch is already worth flushing
+
+        done.wait()
+        return [result[0] for result in results]
+
     # ── background flusher ──
 
     def _loop(self):
@@ -284,6 +596,7 @@ class WALBatchWriter:
         from amoskys.storage.wal_sqlite import _compute_chain_sig
 
         wal = self._wal
+        committed = []
         with wal._lock:
             wal.db.execute("BEGIN IMMEDIATE")
             try:
@@ -303,7 +616,7 @@ class WALBatchWriter:
                     prev_sig = wal._get_last_sig()
                     sig = _compute_chain_sig(env_bytes, prev_sig)
                     try:
-                        wal.db.execute(
+                        cursor = wal.db.execute(
                             "INSERT INTO wal("
                             "idem, ts_ns, producer_ts_ns, ingest_ts_ns, source, "
                             "schema_version, status, bytes, checksum, sig, prev_sig"
@@ -323,6 +636,7 @@ class WALBatchWriter:
                             ),
                         )
                         result[0] = True
+                        committed.append((cursor.lastrowid, idem, ts_ns, env_bytes))
                     except _sql.IntegrityError:
                         result[0] = False  # duplicate
                 wal.db.execute("COMMIT")
@@ -333,12 +647,19 @@ class WALBatchWriter:
                 except Exception:
                     pass
                 for _, _, _, _, _, _, _, _, _done, result in batch:
-                    result[0] = False
+                    result[0] = None  # falsy for write(); write_many() retries
+                committed = []
 
         # Signal all waiters after releasing the WAL lock
         for _, _, _, _, _, _, _, _, done, _ in batch:
             done.set()
 
+        # Fan out to Subscribe streams off the ACK path
+        try:
+            _wal_hub.publish(committed)
+        except Exception as exc:
+            logger.error("WAL subscriber fanout failed: %s", exc)
+
 
 # Prometheus metrics
 try:
@@ -402,6 +723,22 @@ try:
 except ValueError:
     BUS_CONTRACT_INVALID = Counter("_bus_dummy_contract_invalid", "dummy")
 
+try:
+    BUS_SUBSCRIBE_DROPPED = Counter(
+        "bus_subscribe_dropped_total",
+        "WAL entries dropped from full subscriber buffers",
+    )
+except ValueError:
+    BUS_SUBSCRIBE_DROPPED = Counter("_bus_dummy_subscribe_dropped", "dummy")
+
+try:
+    BUS_SUBSCRIBE_DISCONNECTS = Counter(
+        "bus_subscribe_disconnects_total",
+        "Subscribers disconnected on buffer overflow",
+    )
+except ValueError:
+    BUS_SUBSCRIBE_DISCONNECTS = Counter("_bus_dummy_subscribe_disconnects", "dummy")
+
 # Configuration from centralized config
 BUS_MAX_INFLIGHT = config.eventbus.max_inflight
 BUS_HARD_MAX = config.eventbus.hard_max
@@ -476,6 +813,7 @@ DEDUPE_MAX = int(os.getenv("BUS_DEDUPE_MAX", "50000"))
 _dedupe: "OrderedDict[str, float]" = OrderedDict()
 
 MAX_ENV_BYTES = int(os.getenv("BUS_MAX_ENV_BYTES", "131072"))
+MAX_BATCH_ENVELOPES = int(os.getenv("BUS_MAX_BATCH_ENVELOPES", "500"))
 # D4: REQUIRE_SIGNATURES defaults to true. Set EVENTBUS_ALLOW_UNSIGNED=true
 # for CI/test environments to accept unsigned envelopes (with WARNING).
 REQUIRE_SIGNATURES = os.getenv("EVENTBUS_ALLOW_UNSIGNED", "false").lower() not in (
@@ -527,38 +865,25 @@ _dedupe_lock = threading.Lock()
 # =============================================================================
 
 
-class _AgentRateLimiter:
+class _AgentRateLimiter(GCRALimiter):
     """Token bucket rate limiter keyed by agent/device ID.
 
     Prevents any single agent from overwhelming the EventBus by limiting
     the sustained publish rate per agent while allowing short bursts.
+    State is one float per agent (GCRA), and idle agents are evicted.
+    Setting ``BUS_AGENT_RATE_DB`` to a SQLite path shares the buckets
+    between EventBus processes.
     """
 
     def __init__(
         self,
         rate: float = float(os.getenv("BUS_AGENT_RATE", "100")),
         burst: float = float(os.getenv("BUS_AGENT_BURST", "200")),
+        backend: Optional[RateLimitBackend] = None,
     ):
-        self._rate = rate  # tokens per second (sustained rate)
-        self._burst = burst  # max tokens (burst capacity)
-        self._buckets: dict[str, list] = {}  # agent_id → [tokens, last_refill]
-        self._lock = threading.Lock()
-
-    def allow(self, agent_id: str) -> bool:
-        """Return True if the agent is within rate limits, False otherwise."""
-        now = time.time()
-        with self._lock:
-            if agent_id not in self._buckets:
-                self._buckets[agent_id] = [self._burst - 1, now]
-                return True
-            bucket = self._buckets[agent_id]
-            elapsed = now - bucket[1]
-            bucket[0] = min(self._burst, bucket[0] + elapsed * self._rate)
-            bucket[1] = now
-            if bucket[0] >= 1.0:
-                bucket[0] -= 1.0
-                return True
-            return False
+        if backend is None:
+            backend = create_rate_limit_backend(os.getenv("BUS_AGENT_RATE_DB"))
+        super().__init__(rate, burst, backend=backend, namespace="agent")
 
 
 _agent_limiter = _AgentRateLimiter()
@@ -596,6 +921,17 @@ def _seen(idem):
         return False
 
 
+def _forget(idems):
+    """Drop idempotency keys from the dedup cache.
+
+    Called when a batch's WAL commit fails after its keys were marked as seen,
+    so the agent's retry is not acknowledged as a duplicate and lost.
+    """
+    with _dedupe_lock:
+        for idem in idems:
+            _dedupe.pop(idem, None)
+
+
 def _on_hup(signum, frame):
     """Signal handler for SIGHUP to trigger graceful shutdown.
 
@@ -988,6 +1324,54 @@ def _record_contract_quality(state: str) -> None:
         BUS_CONTRACT_INVALID.inc()
 
 
+def _write_batch_to_wal(contracts: list) -> list:
+    """Persist normalized contracts to the WAL as one group commit.
+
+    Returns one result per contract, in order: True if written, False if the
+    WAL already held the idempotency key, None if nothing was persisted (the
+    caller must answer RETRY).  Without a WAL every contract counts as written.
+    """
+    if not wal_storage:
+        return [True] * len(contracts)
+    if not contracts:
+        return []
+
+    items = [
+        {
+            "idem": contract.idempotency_key,
+            "ts_ns": contract.event_time_ns,
+            "env_bytes": contract.envelope.SerializeToString(),
+            "producer_ts_ns": contract.event_time_ns,
+            "ingest_ts_ns": contract.ingest_time_ns,
+            "source": contract.source,
+            "schema_version": contract.schema_version,
+            "status": contract.quality_state,
+        }
+        for contract in contracts
+    ]
+    try:
+        if _wal_batch_writer:
+            results = _wal_batch_writer.write_many(items)
+        else:
+            with _wal_lock:
+                results = [wal_storage.write_raw(**item) for item in items]
+            _publish_written(
+                [
+                    (item["idem"], item["ts_ns"], item["env_bytes"])
+                    for item, written in zip(items, results)
+                    if written
+                ]
+            )
+    except Exception as wal_err:
+        logger.error("AOC1_WAL_WRITE_FAILURE: [PublishBatch] %s", wal_err)
+        BUS_WAL_FAILURES.inc()
+        return [None] * len(contracts)
+
+    if any(result is None for result in results):
+        BUS_WAL_FAILURES.inc()
+    return results
+
+
 def _flow_from_envelope(env: "pb.Envelope") -> "pb.FlowEvent":
     """Extract a FlowEvent message from an Envelope.
 
@@ -1532,6 +1916,8 @@ class EventBusServicer(pbrpc.EventBusServicer):
                                     schema_version=contract.schema_version,
                                     status=contract.quality_state,
                                 )
+                                if written:
+                                    _publish_written([(idem, ts_ns, env_bytes)])
 
                         if written:
                             wal_written = True
@@ -1565,45 +1951,131 @@ class EventBusServicer(pbrpc.EventBusServicer):
             return _ack_err(str(e))
 
     def Subscribe(self, request, context):
-        """Handle a Subscribe RPC for streaming flow events.
+        """Stream committed WAL entries to a live subscriber.
 
-        This RPC is defined in the EventBus service but not yet implemented. It is
-        intended for consumers (analytics engines, dashboards) to subscribe to a
-        stream of flow events matching certain criteria.
+        Subscribe turns EventBus into a pub/sub feed for consumers such as
+        analytics engines and dashboards.  Every envelope that reaches the WAL
+        (Publish, PublishTelemetry, PublishBatch) is fanned out by the
+        in-process _WALHub after its transaction commits, so subscribers never
+        see an entry that was not durably stored.
 
         Args:
-            request: A SubscribeRequest protobuf (schema not yet defined) that
-                     would specify subscription filters (e.g., source IP ranges,
-                     destination ports, time windows).
+            request: A SubscribeRequest protobuf with:
+                - subscriber_id: Label for logs (anonymous if empty)
+                - agent_ids: Only stream entries from these agents (empty = all)
+                - payload_kinds: device_telemetry, process, flow, telemetry_batch
+                - min_severity: Drop entries whose highest event severity is
+                  below this level (DEBUG..CRITICAL, empty = no floor)
+                - resume_after_id: Replay entries with WAL row id greater than
+                  this before switching to the live feed
+                - buffer_size: Ring buffer capacity (0 = BUS_SUBSCRIBE_BUFFER)
+                - disconnect_on_overflow: Terminate the stream instead of
+                  dropping the oldest buffered entry when the buffer is full
             context: The gRPC ServicerContext for the streaming RPC.
 
+        Yields:
+            pb.WALEvent: One per matching committed WAL entry, in WAL id order.
+            ``dropped`` carries the number of entries this subscriber has lost
+            to buffer overflow so far.
+
         Raises:
-            grpc.RpcError: Always aborts with UNIMPLEMENTED status code and
-                          message "Subscribe not supported".
-
-        Future Implementation:
-            When implemented, Subscribe would:
-            1. Validate subscription filters in request
-            2. Register the subscriber in a pub/sub broker
-            3. Stream matching FlowEvent messages via yield
-            4. Handle subscriber disconnection gracefully
-            5. Implement backpressure if subscriber is slow
-
-        Architecture:
-            The Subscribe pattern would transform EventBus from a simple request/
-            response service into a full pub/sub message broker. This requires:
-            - In-memory or persistent message queue
-            - Topic-based or content-based routing
-            - Subscriber registry with connection management
-            - Message buffering and overflow handling
-
-        Note:
-            The _ = request statement suppresses linter warnings about unused
-            parameters. This is temporary until Subscribe is implemented.
+            grpc.RpcError: Aborts with INVALID_ARGUMENT for an unknown
+                min_severity, with OUT_OF_RANGE when resume_after_id is older
+                than the retained history (entries after it are gone), and
+                with RESOURCE_EXHAUSTED when a subscriber using
+                disconnect_on_overflow falls behind.
+
+        Resume:
+            The subscriber is registered before the replay is read, so entries
+            committed during the replay are buffered rather than lost; ids
+            already yielded by the replay are skipped on the live feed.  Replay
+            covers rows still in the WAL table plus the hub's recent history
+            (BUS_SUBSCRIBE_HISTORY entries), since WALProcessor deletes rows
+            once they are processed.  WAL ids are handed out consecutively, so
+            when the oldest retained entry is not resume_after_id + 1 the
+            entries in between are gone and the stream fails with
+            OUT_OF_RANGE instead of silently skipping them; the client
+            resubscribes without resume_after_id (or from its own archive).
         """
-        _ = request  # Mark request as used to avoid linter warning
-        logger.warning("Subscribe() called but not implemented.")
-        context.abort(grpc.StatusCode.UNIMPLEMENTED, "Subscribe not supported")
+        min_severity = request.min_severity.upper()
+        if min_severity and min_severity not in _SEVERITY_RANK:
+            context.abort(
+                grpc.StatusCode.INVALID_ARGUMENT,
+                f"unknown min_severity: {request.min_severity}",
+            )
+
+        subscriber_id = request.subscriber_id or f"anonymous-{time.time_ns()}"
+        subscriber = _wal_hub.register(
+            subscriber_id,
+            agent_ids=list(request.agent_ids),
+            payload_kinds=list(request.payload_kinds),
+            min_severity=min_severity,
+            max_buffer=min(
+                request.buffer_size or SUBSCRIBE_BUFFER, SUBSCRIBE_BUFFER_MAX
+            ),
+            disconnect_on_overflow=request.disconnect_on_overflow,
+        )
+        logger.info("[Subscribe] %s connected", subscriber_id)
+
+        sent_through = 0
+        try:
+            after_id = request.resume_after_id
+            if after_id:
+                stored = _wal_rows_after(after_id, SUBSCRIBE_HISTORY)
+                first_stored = stored[0][0] if stored else None
+                retained = [_wal_hub.oldest_after(after_id), first_stored]
+                oldest = min((i for i in retained if i is not None), default=None)
+                newest = max(_wal_hub.newest(), _wal_last_id())
+                if newest > after_id and (oldest is None or oldest > after_id + 1):
+                    logger.warning(
+                        "[Subscribe] %s resume_after_id %d is older than the "
+                        "retained history",
+                        subscriber_id,
+                        after_id,
+                    )
+                    context.abort(
+                        grpc.StatusCode.OUT_OF_RANGE,
+                        f"resume_after_id {after_id} is older than the retained "
+                        f"history (oldest retained id: {oldest or 'none'})",
+                    )
+                # Page through a backlog larger than one read
+                while True:
+                    full = len(stored) == SUBSCRIBE_HISTORY
+                    until_id = stored[-1][0] if full else None
+                    for event in _wal_hub.replay(
+                        subscriber, after_id, stored, until_id
+                    ):
+                        yield event
+                        sent_through = event.wal_id
+                    if not full:
+                        break
+                    after_id = until_id
+                    stored = _wal_rows_after(after_id, SUBSCRIBE_HISTORY)
+
+            while context.is_active():
+                event = subscriber.next(timeout=1.0)
+                if event is None:
+                    if subscriber.overflowed:
+                        logger.warning(
+                            "[Subscribe] %s disconnected: buffer overflow",
+                            subscriber_id,
+                        )
+                        context.abort(
+                            grpc.StatusCode.RESOURCE_EXHAUSTED,
+                            "subscriber buffer overflow",
+                        )
+                    continue
+                if event.wal_id <= sent_through:
+                    continue
+                if subscriber.dropped:
+                    stamped = pb.WALEvent()
+                    stamped.CopyFrom(event)
+                    stamped.dropped = subscriber.dropped
+                    event = stamped
+                yield event
+        finally:
+            _wal_hub.unregister(subscriber)
+            logger.info("[Subscribe] %s disconnected", subscriber_id)
 
 
 class UniversalEventBusServicer(telemetry_grpc.UniversalEventBusServicer):
@@ -1773,6 +2245,8 @@ class UniversalEventBusServicer(telemetry_grpc.UniversalEventBusServicer):
                                     schema_version=contract.schema_version,
                                     status=contract.quality_state,
                                 )
+                                if written:
+                                    _publish_written([(idem, ts_ns, env_bytes)])
 
                         if written:
                             wal_written = True
@@ -1822,10 +2296,229 @@ class UniversalEventBusServicer(telemetry_grpc.UniversalEventBusServicer):
             )
 
     def PublishBatch(self, request, context):
-        """Handle PublishBatch RPC (not yet implemented)"""
-        _ = request
-        logger.warning("PublishBatch() called but not implemented")
-        context.abort(grpc.StatusCode.UNIMPLEMENTED, "PublishBatch not supported")
+        """Handle PublishBatch RPC: many signed envelopes, one WAL group commit.
+
+        Applies the PublishTelemetry checks to every entry of
+        ``request.envelopes`` in one pass (size, Ed25519 signature, contract
+        normalization), charges the per-agent rate limiter once per agent for
+        the whole batch, deduplicates, and hands the accepted set to the WAL
+        batch writer as a single group commit.  P0-EB-2 still holds: no
+        envelope is ACKed OK before its WAL row is durable.
+
+        Args:
+            request: TelemetryBatch whose ``envelopes`` carry UniversalEnvelopes.
+                Bare ``telemetry_records`` are rejected — they carry neither a
+                signature nor an idempotency key.
+            context: gRPC ServicerContext
+
+        Returns:
+            UniversalAck: ``envelope_acks`` holds one ack per envelope, in
+            request order.  The top-level status is OK only when every
+            envelope was accepted; otherwise RETRY if any envelope can be
+            retried, else INVALID.
+        """
+        _ = context
+        t0 = time.time()
+        BUS_REQS.inc()
+        Status = telemetry_pb2.UniversalAck.Status
+        envelopes = request.envelopes
+        total = len(envelopes)
+
+        if is_overloaded():
+            logger.info(OVERLOAD_LOG)
+            BUS_RETRY_TOTAL.inc()
+            BUS_LAT.observe((time.time() - t0) * 1000.0)
+            return telemetry_pb2.UniversalAck(
+                status=Status.RETRY,
+                reason=OVERLOAD_REASON,
+                backoff_hint_ms=2000,
+                events_rejected=total,
+            )
+
+        if total == 0:
+            BUS_INVALID.inc()
+            return telemetry_pb2.UniversalAck(
+                status=Status.INVALID,
+                reason=(
+                    "PublishBatch requires signed envelopes"
+                    if request.telemetry_records
+                    else "Empty batch"
+                ),
+                events_rejected=len(request.telemetry_records),
+            )
+
+        if total > MAX_BATCH_ENVELOPES:
+            BUS_INVALID.inc()
+            return telemetry_pb2.UniversalAck(
+                status=Status.INVALID,
+                reason=f"Batch too large ({total} > {MAX_BATCH_ENVELOPES} envelopes)",
+                events_rejected=total,
+            )
+
+        acks: list = [None] * total
+        marked: list = []  # idempotency keys recorded in the dedup cache
+
+        try:
+            # ── Pass 1: per-envelope validation ──
+            ingest_ns = int(time.time() * 1e9)
+            valid = []  # (index, envelope, contract)
+            for i, env in enumerate(envelopes):
+                envelope_size = env.ByteSize()
+                if envelope_size > MAX_ENV_BYTES:
+                    BUS_INVALID.inc()
+                    acks[i] = telemetry_pb2.UniversalAck(
+                        status=Status.INVALID,
+                        reason=f"Envelope too large ({envelope_size} > {MAX_ENV_BYTES} bytes)",
+                    )
+                    continue
+
+                sig_valid, sig_error = _verify_envelope_signature(env)
+                if not sig_valid:
+                    BUS_INVALID.inc()
+                    acks[i] = telemetry_pb2.UniversalAck(
+                        status=Status.SECURITY_VIOLATION,
+                        reason=f"Signature verification failed: {sig_error}",
+                    )
+                    continue
+
+                # Same source as PublishTelemetry: WAL keys must not depend
+                # on which RPC delivered the envelope.
+                contract = normalize_universal_envelope(
+                    env, ingest_time_ns=ingest_ns, source="universal_publish"
+                )
+                _record_contract_quality(contract.quality_state)
+                if contract.quality_state == QUALITY_INVALID:
+                    BUS_INVALID.inc()
+                    details = ", ".join(contract.missing_fields) or "unknown"
+                    acks[i] = telemetry_pb2.UniversalAck(
+                        status=Status.INVALID,
+                        reason=(
+                            "Contract violation: "
+                            f"{contract.contract_violation_code} ({details})"
+                        ),
+                    )
+                    continue
+                valid.append((i, env, contract))
+
+            # ── Pass 2: per-agent rate limiting, one bucket draw per agent ──
+            by_agent: dict = {}
+            for item in valid:
+                contract = item[2]
+                agent_id = contract.agent_id or contract.host_id or "unknown"
+                by_agent.setdefault(agent_id, []).append(item)
+
+            admitted = []
+            for agent_id, items in by_agent.items():
+                granted = _agent_limiter.allow_n(agent_id, len(items))
+                admitted.extend(items[:granted])
+                if granted < len(items):
+                    BUS_RATE_LIMITED.inc(len(items) - granted)
+                    logger.warning(
+                        "[PublishBatch] Rate limited agent=%s (%d/%d envelopes)",
+                        agent_id,
+                        len(items) - granted,
+                        len(items),
+                    )
+                for i, _env, _contract in items[granted:]:
+                    acks[i] = telemetry_pb2.UniversalAck(
+                        status=Status.RETRY,
+                        reason=f"Rate limit exceeded for agent {agent_id}",
+                        backoff_hint_ms=3000,
+                    )
+            admitted.sort(key=lambda item: item[0])  # WAL chain follows request order
+
+            # ── Pass 3: application-level dedup (P1-EB-1) ──
+            fresh = []
+            for i, env, contract in admitted:
+                tel_idem = env.idempotency_key or f"unknown_{env.ts_ns}"
+                if _seen(tel_idem):
+                    BUS_DEDUP_HITS.inc()
+                    acks[i] = telemetry_pb2.UniversalAck(
+                        status=Status.OK,
+                        reason="duplicate",
+                        processed_timestamp_ns=int(time.time() * 1e9),
+                    )
+                    continue
+                marked.append(tel_idem)
+                fresh.append((i, tel_idem, contract))
+
+            # ── Group commit ──
+            inflight = _inc_inflight()
+            try:
+                if inflight > BUS_MAX_INFLIGHT:
+                    logger.info(
+                        f"[PublishBatch] Server at capacity: {inflight} inflight"
+                    )
+                    BUS_RETRY_TOTAL.inc()
+                    results = [None] * len(fresh)
+                    failure_reason = f"Server at capacity ({inflight} inflight)"
+                    failure_backoff = 1000
+                else:
+                    results = _write_batch_to_wal([c for _, _, c in fresh])
+                    failure_reason = "WAL write failed, retry"
+                    failure_backoff = 2000
+            finally:
+                _dec_inflight()
+
+            processed_ns = int(time.time() * 1e9)
+            for (i, tel_idem, contract), result in zip(fresh, results):
+                if result is None:
+                    _forget([tel_idem])
+                    acks[i] = telemetry_pb2.UniversalAck(
+                        status=Status.RETRY,
+                        reason=failure_reason,
+                        backoff_hint_ms=failure_backoff,
+                    )
+                    continue
+                acks[i] = telemetry_pb2.UniversalAck(
+                    status=Status.OK,
+                    reason=(
+                        "accepted_degraded"
+                        if contract.quality_state == QUALITY_DEGRADED
+                        else "accepted"
+                    ),
+                    processed_timestamp_ns=processed_ns,
+                    events_accepted=1,
+                )
+
+        except Exception as e:
+            logger.exception("[PublishBatch] Error")
+            _forget(marked)
+            return telemetry_pb2.UniversalAck(
+                status=Status.PROCESSING_ERROR, reason=str(e), events_rejected=total
+            )
+
+        accepted = sum(1 for ack in acks if ack.status == Status.OK)
+        rejected = total - accepted
+        retryable = [ack for ack in acks if ack.status == Status.RETRY]
+        if rejected == 0:
+            status, reason, backoff = Status.OK, "accepted", 0
+        elif retryable:
+            BUS_RETRY_TOTAL.inc()
+            status = Status.RETRY
+            reason = f"{rejected}/{total} envelopes not accepted"
+            backoff = max(ack.backoff_hint_ms for ack in retryable)
+        else:
+            status = Status.INVALID
+            reason = f"{rejected}/{total} envelopes rejected"
+            backoff = 0
+
+        logger.info(
+            "[PublishBatch] envelopes=%d accepted=%d rejected=%d",
+            total,
+            accepted,
+            rejected,
+        )
+        BUS_LAT.observe((time.time() - t0) * 1000.0)
+        return telemetry_pb2.UniversalAck(
+            status=status,
+            reason=reason,
+            backoff_hint_ms=backoff,
+            processed_timestamp_ns=int(time.time() * 1e9),
+            events_accepted=accepted,
+            events_rejected=rejected,
+            envelope_acks=acks,
+        )
 
     def RegisterDevice(self, request, context):
         """Handle RegisterDevice RPC (not yet implemented)"""
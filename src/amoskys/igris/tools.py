@@ -1058,12 +1058,16 @@ class IgrisToolkit:
 
     def _tool_explain_mitre_technique(self, technique_id: str) -> Dict:
         # Find detections using this technique
+        # Point lookup on the event_techniques index; sub-techniques of a
+        # parent ID (T1059 -> T1059.004) match as before.
         rows = self._query(
             self._telemetry_db,
-            "SELECT collection_agent, event_category, risk_score, description "
-            "FROM security_events WHERE mitre_techniques LIKE ? "
-            "ORDER BY risk_score DESC LIMIT 10",
-            (f"%{technique_id}%",),
+            "SELECT s.collection_agent, s.event_category, s.risk_score, "
+            "s.description FROM security_events s WHERE s.id IN ("
+            "SELECT event_rowid FROM event_techniques "
+            "WHERE technique = ? OR technique GLOB ?) "
+            "ORDER BY s.risk_score DESC LIMIT 10",
+            (technique_id, f"{technique_id}.*"),
         )
         return {
             "technique_id": technique_id,
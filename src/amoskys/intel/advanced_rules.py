@@ -25,9 +25,19 @@ import os
 import re
 from collections import defaultdict
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Set
+from typing import Callable, Dict, List, Optional, Set
 
 from amoskys.intel.models import Incident, MitreTactic, Severity, TelemetryEventView
+from amoskys.intel.rules import (
+    EventFilter,
+    RulePartitions,
+    _any_of,
+    _has_audit,
+    _has_flow,
+    _has_process,
+    _security_action,
+    run_partitioned,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -1644,11 +1654,44 @@ ADVANCED_RULES = [
     rule_unknown_service_persistence,
 ]
 
+# Event filters for incremental evaluation (see RulePartitions in rules.py).
+# Each accepts a superset of what its rule extracts from the window.
+_fim_events = _security_action("FILE_INTEGRITY")
+_dns_threats = _security_action("DNS_THREAT")
+_kernel_threats = _security_action("KERNEL_THREAT")
+
+ADVANCED_RULE_EVENT_FILTERS: Dict[Callable, EventFilter] = {
+    rule_apt_initial_access_chain: _any_of(
+        lambda e: e.event_type == "SECURITY" and bool(e.security_event),
+        _has_process,
+    ),
+    rule_fileless_attack: _any_of(_has_process, _has_flow),
+    rule_log_tampering: _any_of(_has_process, _has_audit),
+    rule_security_tool_disable: _has_process,
+    rule_credential_dumping_chain: _any_of(_has_process, _has_audit),
+    rule_ssh_key_theft_and_pivot: _any_of(_has_audit, _has_flow),
+    rule_internal_reconnaissance: _any_of(_has_flow, _has_process),
+    rule_staged_exfiltration: _any_of(_has_process, _has_flow),
+    rule_dns_exfiltration: _has_flow,
+    rule_binary_replacement_attack: _fim_events,
+    rule_suid_privilege_escalation: _fim_events,
+    rule_webshell_deployment: _fim_events,
+    rule_dns_c2_beaconing: _dns_threats,
+    rule_dga_malware_activity: _dns_threats,
+    rule_kernel_privilege_escalation: _kernel_threats,
+    rule_container_escape: _kernel_threats,
+    rule_process_injection: _kernel_threats,
+    rule_unknown_service_persistence: lambda e: e.event_type == "SECURITY"
+    and bool(e.security_event)
+    and e.security_event.get("event_category") == "service_created",
+}
+
 
 def evaluate_advanced_rules(
     events: List[TelemetryEventView],
     device_id: str,
     weights: Optional[Dict[str, float]] = None,
+    partitions: Optional[RulePartitions] = None,
 ) -> List[Incident]:
     """Evaluate all advanced correlation rules
 
@@ -1657,10 +1700,22 @@ def evaluate_advanced_rules(
         device_id: Device being evaluated
         weights: Optional AMRDR fusion weights {agent_id: weight}.
             When provided, incidents are annotated with reliability metadata.
+        partitions: Optional RulePartitions over ADVANCED_RULES mirroring
+            ``events``; only rules whose slice changed are re-run.
 
     Returns:
         List of detected Incidents
     """
+    if partitions is not None:
+        return run_partitioned(
+            partitions,
+            events,
+            device_id,
+            weights,
+            _annotate_advanced_incident,
+            "Advanced rule",
+        )
+
     incidents = []
 
     for rule_fn in ADVANCED_RULES:
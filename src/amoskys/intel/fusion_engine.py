@@ -35,7 +35,11 @@ from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 
-from amoskys.intel.advanced_rules import evaluate_advanced_rules
+from amoskys.intel.advanced_rules import (
+    ADVANCED_RULE_EVENT_FILTERS,
+    ADVANCED_RULES,
+    evaluate_advanced_rules,
+)
 from amoskys.intel.models import (
     DeviceRiskSnapshot,
     Incident,
@@ -49,7 +53,12 @@ from amoskys.intel.reliability import (
     RecalibrationTier,
     ReliabilityTracker,
 )
-from amoskys.intel.rules import evaluate_rules
+from amoskys.intel.rules import (
+    ALL_RULES,
+    RULE_EVENT_FILTERS,
+    RulePartitions,
+    evaluate_rules,
+)
 from amoskys.intel.scoring import SequenceScorer
 
 logger = logging.getLogger(__name__)
@@ -61,6 +70,12 @@ class FusionEngine:
     Maintains sliding windows of events per device, runs correlation rules,
     and emits incidents + device risk scores.
 
+    In incremental mode (the default) each event is routed once, on
+    arrival, to the rules whose filter accepts it, and a rule is only
+    re-run when its slice of the window changed. Incidents are identical
+    to the batch path (every rule over the whole window), which remains
+    available with ``incremental=False``.
+
     Attributes:
         db_path: Path to fusion intelligence database
         window_minutes: Size of correlation window in minutes
@@ -76,6 +91,7 @@ class FusionEngine:
         reliability_tracker: Optional[ReliabilityTracker] = None,
         inads_engine: Optional[Any] = None,
         probe_calibrator: Optional[Any] = None,
+        incremental: bool = True,
     ):
         """Initialize fusion engine
 
@@ -86,10 +102,13 @@ class FusionEngine:
             reliability_tracker: AMRDR reliability tracker (defaults to NoOp)
             inads_engine: Optional INADS multi-perspective scoring engine
             probe_calibrator: Optional ProbeCalibrator for per-probe precision weights
+            incremental: Route events to per-rule slices and skip rules whose
+                slice is unchanged (False = rescan the full window every cycle)
         """
         self.db_path = db_path
         self.window_minutes = window_minutes
         self.eval_interval = eval_interval
+        self.incremental = incremental
 
         # AMRDR: reliability tracker (NoOp if not provided — backward compatible)
         self.reliability_tracker: ReliabilityTracker = (
@@ -113,6 +132,7 @@ class FusionEngine:
                 "last_eval": None,
                 "known_ips": {},  # {ip: last_seen_timestamp}
                 "incident_count": 0,
+                "rule_partitions": self._new_rule_partitions(),
             }
         )
 
@@ -126,6 +146,7 @@ class FusionEngine:
             "devices_tracked": 0,
             "last_eval_duration_ms": 0,
             "drift_alerts_emitted": 0,
+            "rule_evaluations_skipped": 0,
         }
 
         # Incident cooldown: suppress duplicate incidents per (rule_name, device_id)
@@ -142,6 +163,24 @@ class FusionEngine:
             f"tracker={tracker_type}"
         )
 
+    def _new_rule_partitions(self) -> tuple:
+        """Fresh per-device routing state for the standard and advanced rules."""
+        if not self.incremental:
+            return ()
+        return (
+            RulePartitions(ALL_RULES, RULE_EVENT_FILTERS),
+            RulePartitions(ADVANCED_RULES, ADVANCED_RULE_EVENT_FILTERS),
+        )
+
+    def _sync_rule_partitions(self, state: Dict[str, Any]) -> tuple:
+        """Return the device's partitions, re-routing if the window was replaced."""
+        partitions = state["rule_partitions"]
+        events = state["events"]
+        for part in partitions:
+            if not part.tracks(events):
+                part.rebuild(events)
+        return partitions
+
     def _init_db(self):
         """Initialize SQLite database for incidents and device risk"""
         Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
@@ -273,17 +312,26 @@ class FusionEngine:
         """
         device_id = event.device_id
         state = self.device_state[device_id]
+        events = state["events"]
+        partitions = self._sync_rule_partitions(state)
 
         # Add to event buffer (deque auto-evicts oldest when maxlen reached)
-        state["events"].append(event)
+        if len(events) == getattr(events, "maxlen", None):
+            for part in partitions:
+                part.evict_oldest()
+        events.append(event)
+        for part in partitions:
+            part.add(event)
 
         # Update metrics
         self.metrics["total_events_processed"] += 1
 
         # Trim events outside correlation window
         cutoff = datetime.now() - timedelta(minutes=self.window_minutes)
-        while state["events"] and state["events"][0].timestamp < cutoff:
-            state["events"].popleft()
+        while events and events[0].timestamp < cutoff:
+            events.popleft()
+            for part in partitions:
+                part.evict_oldest()
 
         # Track known IPs for anomaly detection (with timestamp for eviction)
         if event.security_event:
@@ -327,13 +375,27 @@ class FusionEngine:
         # (batch delivery from sleeping endpoints can invert arrival order)
         sorted_events = sorted(events, key=lambda e: e.timestamp)
 
-        # Run correlation rules with AMRDR weights (using sorted events)
-        incidents = evaluate_rules(sorted_events, device_id, weights=weights)
+        # Run correlation rules with AMRDR weights (using sorted events).
+        # Incrementally, only rules whose slice of the window changed re-run.
+        if self.incremental:
+            standard, advanced = self._sync_rule_partitions(state)
+            skipped_before = standard.skipped + advanced.skipped
+            incidents = evaluate_rules(
+                sorted_events, device_id, weights=weights, partitions=standard
+            )
+            advanced_incidents = evaluate_advanced_rules(
+                sorted_events, device_id, weights=weights, partitions=advanced
+            )
+            self.metrics["rule_evaluations_skipped"] += (
+                standard.skipped + advanced.skipped - skipped_before
+            )
+        else:
+            incidents = evaluate_rules(sorted_events, device_id, weights=weights)
 
-        # Run advanced correlation rules with AMRDR weights
-        advanced_incidents = evaluate_advanced_rules(
-            sorted_events, device_id, weights=weights
-        )
+            # Run advanced correlation rules with AMRDR weights
+            advanced_incidents = evaluate_advanced_rules(
+                sorted_events, device_id, weights=weights
+            )
         incidents.extend(advanced_incidents)
 
         # Detect kill chain sequences and promote to incidents (Step 4)
@@ -735,39 +735,66 @@ class ClusterModel:
                 anomaly_score: 0.0-1.0 (higher = more anomalous)
                 confidence: fraction of non-null features for this cluster
         """
+        return self.score_many([features])[0]
+
+    def score_many(
+        self, feature_rows: List[Dict[str, Optional[float]]]
+    ) -> List[Tuple[float, float]]:
+        """Score N events with one score_samples call.
+
+        Rows below MIN_FEATURE_FILL are not sent to the model and keep an
+        anomaly score of 0.0, exactly as in score().
+
+        Args:
+            feature_rows: One feature dict per event (values may be None).
+
+        Returns:
+            One (anomaly_score, confidence) tuple per input row, in order.
+        """
         with self._lock:
             if not self.is_trained or self.model is None:
-                return 0.0, 0.0
-
-        # Calculate confidence from feature fill
-        filled = sum(1 for f in self.feature_names if features.get(f) is not None)
-        confidence = filled / len(self.feature_names) if self.feature_names else 0.0
+                return [(0.0, 0.0)] * len(feature_rows)
+
+        results: List[Tuple[float, float]] = []
+        matrix: List[List[float]] = []
+        positions: List[int] = []
+        for features in feature_rows:
+            # Calculate confidence from feature fill
+            filled = sum(1 for f in self.feature_names if features.get(f) is not None)
+            confidence = filled / len(self.feature_names) if self.feature_names else 0.0
+            results.append((0.0, confidence))
+            if confidence < MIN_FEATURE_FILL:
+                continue
 
-        if confidence < MIN_FEATURE_FILL:
-            return 0.0, confidence
+            # Build feature vector with imputation
+            vec = []
+            for fname in self.feature_names:
+                val = features.get(fname)
+                if val is not None:
+                    vec.append(float(val))
+                else:
+                    vec.append(self.feature_medians.get(fname, 0.0))
+            matrix.append(vec)
+            positions.append(len(results) - 1)
 
-        # Build feature vector with imputation
-        vec = []
-        for fname in self.feature_names:
-            val = features.get(fname)
-            if val is not None:
-                vec.append(float(val))
-            else:
-                vec.append(self.feature_medians.get(fname, 0.0))
+        if not matrix:
+            return results
 
-        arr = np.array(vec).reshape(1, -1)
+        arr = np.array(matrix)
 
         with self._lock:
             # score_samples returns negative for anomalies, positive for normal.
             # Typical range: [-0.5, 0.5].
-            raw_score = self.model.score_samples(arr)[0]
+            raw_scores = self.model.score_samples(arr)
 
-        # Sigmoid transform: maps raw_score to 0-1 anomaly score.
-        # More negative raw -> higher anomaly.  5x scaling for separation.
-        anomaly_score = 1.0 / (1.0 + math.exp(5.0 * raw_score))
-        anomaly_score = max(0.0, min(1.0, anomaly_score))
+        for pos, raw_score in zip(positions, raw_scores):
+            # Sigmoid transform: maps raw_score to 0-1 anomaly score.
+            # More negative raw -> higher anomaly.  5x scaling for separation.
+            anomaly_score = 1.0 / (1.0 + math.exp(5.0 * float(raw_score)))
+            anomaly_score = max(0.0, min(1.0, anomaly_score))
+            results[pos] = (anomaly_score, results[pos][1])
 
-        return anomaly_score, confidence
+        return results
 
     def save(self, directory: Path) -> None:
         """Persist model and metadata to disk."""
@@ -1131,21 +1158,52 @@ class INADSEngine:
         Returns:
             INADSResult with composite score and per-cluster breakdown.
         """
-        evt = (
-            self._row_to_event_dict(event)
-            if "raw_attributes_json" in event or "attributes" in event
-            else dict(event)
-        )
+        return self.score_batch([event])[0]
+
+    def score_batch(self, events: List[dict]) -> List[INADSResult]:
+        """Score N events with one model call per cluster.
+
+        Features for each cluster are extracted for the whole batch and
+        scored in a single score_samples call, then each event is fused
+        exactly as score_event() would.
 
-        cluster_scores: Dict[str, float] = {}
-        cluster_confidences: Dict[str, float] = {}
+        Args:
+            events: Event dicts (raw DB rows or pre-merged dicts).
+
+        Returns:
+            One INADSResult per input event, in order.
+        """
+        evts = [
+            (
+                self._row_to_event_dict(event)
+                if "raw_attributes_json" in event or "attributes" in event
+                else dict(event)
+            )
+            for event in events
+        ]
 
+        per_cluster: Dict[str, List[Tuple[float, float]]] = {}
         for cluster_name, (extractor, _) in CLUSTER_REGISTRY.items():
-            features = extractor(evt)
-            score, confidence = self.clusters[cluster_name].score(features)
-            cluster_scores[cluster_name] = score
-            cluster_confidences[cluster_name] = confidence
+            per_cluster[cluster_name] = self.clusters[cluster_name].score_many(
+                [extractor(evt) for evt in evts]
+            )
 
+        results: List[INADSResult] = []
+        for i, evt in enumerate(evts):
+            cluster_scores = {name: rows[i][0] for name, rows in per_cluster.items()}
+            cluster_confidences = {
+                name: rows[i][1] for name, rows in per_cluster.items()
+            }
+            results.append(self._fuse_event(evt, cluster_scores, cluster_confidences))
+        return results
+
+    def _fuse_event(
+        self,
+        evt: dict,
+        cluster_scores: Dict[str, float],
+        cluster_confidences: Dict[str, float],
+    ) -> INADSResult:
+        """Fuse one event's per-cluster scores into an INADSResult."""
         # Determine kill chain depth for amplification
         kc_features = _extract_kill_chain(evt)
         kc_depth = _safe_int(kc_features.get("kill_chain_depth"), 0)
@@ -1187,7 +1245,7 @@ class INADSEngine:
         """Score all recent events for a device, returning aggregate assessment.
 
         Queries security_events and process_events within the time window,
-        scores each event individually, then aggregates into device-level
+        scores them as one batch, then aggregates into device-level
         statistics.
 
         Args:
@@ -1240,14 +1298,19 @@ class INADSEngine:
                 "top_events": [],
             }
 
-        # Score each event
+        # Score all events in one pass; fall back to per-event scoring so a
+        # single malformed row cannot drop the whole device assessment.
         results: List[INADSResult] = []
-        for evt in events:
-            try:
-                result = self.score_event(evt)
-                results.append(result)
-            except Exception as exc:
-                logger.debug("Failed to score event: %s", exc)
+        try:
+            results = self.score_batch(events)
+        except Exception as exc:
+            logger.debug("Batch scoring failed, scoring per event: %s", exc)
+            for evt in events:
+                try:
+                    result = self.score_event(evt)
+                    results.append(result)
+                except Exception as exc:
+                    logger.debug("Failed to score event: %s", exc)
 
         if not results:
             return {
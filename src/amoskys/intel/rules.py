@@ -17,8 +17,8 @@ Rules:
 
 import json
 import logging
-from collections import defaultdict
-from typing import Dict, List, Optional
+from collections import defaultdict, deque
+from typing import Callable, Deque, Dict, List, Optional, Sequence, Tuple
 
 from amoskys.intel.models import Incident, MitreTactic, Severity, TelemetryEventView
 
@@ -1336,10 +1336,200 @@ ALL_RULES = [
 ]
 
 
+# ── Incremental evaluation ────────────────────────────────────────────
+#
+# Each filter below accepts every event its rule reads from the window (a
+# superset of the rule's own extraction step). Rules see only the events
+# their filter accepts, so a rule whose filtered slice has not changed
+# since it last returned None cannot fire and is skipped. Rules without a
+# filter see the whole window.
+
+EventFilter = Callable[[TelemetryEventView], bool]
+
+
+def _any_event(event: TelemetryEventView) -> bool:
+    return True
+
+
+def _security_action(*actions: str) -> EventFilter:
+    """Filter for SECURITY events whose event_action is one of ``actions``."""
+    wanted = frozenset(actions)
+
+    def _match(event: TelemetryEventView) -> bool:
+        return (
+            event.event_type == "SECURITY"
+            and bool(event.security_event)
+            and event.security_event.get("event_action") in wanted
+        )
+
+    return _match
+
+
+def _category_in(categories: Sequence[str]) -> EventFilter:
+    """Filter for events whose _get_event_category() is in ``categories``."""
+    wanted = frozenset(categories)
+
+    def _match(event: TelemetryEventView) -> bool:
+        return _get_event_category(event) in wanted
+
+    return _match
+
+
+def _any_of(*filters: EventFilter) -> EventFilter:
+    def _match(event: TelemetryEventView) -> bool:
+        return any(f(event) for f in filters)
+
+    return _match
+
+
+def _has_process(event: TelemetryEventView) -> bool:
+    return bool(event.process_event)
+
+
+def _has_flow(event: TelemetryEventView) -> bool:
+    return bool(event.flow_event)
+
+
+def _has_audit(event: TelemetryEventView) -> bool:
+    return bool(event.audit_event)
+
+
+_ssh_events = _security_action("SSH")
+
+RULE_EVENT_FILTERS: Dict[Callable, EventFilter] = {
+    rule_ssh_brute_force: _ssh_events,
+    rule_persistence_after_auth: _any_of(_security_action("SSH", "SUDO"), _has_audit),
+    rule_suspicious_sudo: _security_action("SUDO"),
+    rule_multi_tactic_attack: _any_of(_has_flow, _has_process, _has_audit),
+    rule_ssh_lateral_movement: _any_of(
+        _ssh_events, lambda e: e.event_type == "FLOW" and bool(e.flow_event)
+    ),
+    rule_data_exfiltration_spike: lambda e: e.event_type == "FLOW"
+    and bool(e.flow_event),
+    rule_suspicious_process_tree: _any_of(_has_process, _has_flow),
+    rule_coordinated_reconnaissance: _category_in(_NETWORK_SENTINEL_CATEGORIES),
+    rule_web_attack_chain: _category_in(_NETWORK_SENTINEL_CATEGORIES),
+    rule_infostealer_kill_chain: _category_in(
+        [c for cats in _STEALER_STAGES.values() for c in cats]
+    ),
+    rule_clickfix_attack: _category_in(_CLICKFIX_CATEGORIES),
+    rule_download_execute_persist: _category_in(
+        _DOWNLOAD_EXECUTE_CATEGORIES | _PERSISTENCE_CATEGORIES
+    ),
+    rule_credential_harvest_exfil: _category_in(
+        _STEALER_STAGES["credential_access"]
+        | {
+            "sensitive_file_exfil",
+            "exfil_detected",
+            "execute_to_exfil",
+            "pid_network_anomaly",
+        }
+    ),
+}
+
+
+class RulePartitions:
+    """Per-device routing of window events to the rules that read them.
+
+    Mirrors one device's event window: every event is tested against each
+    rule's filter once, on arrival, and appended to that rule's slice. The
+    window is FIFO, so an evicted event is always the head of every slice
+    it was routed to. A rule is dirty when its slice gained or lost an
+    event, or when it fired (or raised) on its last run — fired rules are
+    re-run every cycle so their incidents come out exactly as the batch
+    path would produce them.
+
+    Attributes:
+        rules: Rule functions, in evaluation order
+        dirty: Per-rule flag; clean rules are skipped by evaluate_rules()
+        skipped: Rule evaluations avoided because the rule was clean
+    """
+
+    def __init__(self, rules: Sequence[Callable], filters: Dict[Callable, EventFilter]):
+        self.rules = list(rules)
+        self._filters = [filters.get(fn, _any_event) for fn in self.rules]
+        self._slices: List[Deque[TelemetryEventView]] = [deque() for _ in self.rules]
+        self._routes: Deque[Tuple[int, ...]] = deque()
+        self._source: Optional[Sequence[TelemetryEventView]] = None
+        self.dirty = [True] * len(self.rules)
+        self.skipped = 0
+
+    def tracks(self, window: Sequence[TelemetryEventView]) -> bool:
+        """True if the slices mirror ``window`` exactly."""
+        return self._source is window and len(self._routes) == len(window)
+
+    def rebuild(self, window: Sequence[TelemetryEventView]) -> None:
+        """Re-route every event in ``window`` and mark all rules dirty."""
+        self._slices = [deque() for _ in self.rules]
+        self._routes.clear()
+        self._source = window
+        for event in window:
+            self.add(event)
+        self.dirty = [True] * len(self.rules)
+
+    def add(self, event: TelemetryEventView) -> None:
+        """Route an event appended to the tail of the window."""
+        route = tuple(i for i, match in enumerate(self._filters) if match(event))
+        for i in route:
+            self._slices[i].append(event)
+            self.dirty[i] = True
+        self._routes.append(route)
+
+    def evict_oldest(self) -> None:
+        """Drop the event removed from the head of the window."""
+        for i in self._routes.popleft():
+            self._slices[i].popleft()
+            self.dirty[i] = True
+
+    def events_for(self, index: int) -> List[TelemetryEventView]:
+        """Rule ``index``'s slice in timestamp order.
+
+        The sort is stable, so this is exactly the subsequence of the
+        sorted window that the rule would have extracted itself.
+        """
+        return sorted(self._slices[index], key=lambda e: e.timestamp)
+
+
+def run_partitioned(
+    partitions: RulePartitions,
+    events: List[TelemetryEventView],
+    device_id: str,
+    weights: Optional[dict],
+    annotate: Callable[[Incident, List[TelemetryEventView], dict], None],
+    label: str,
+) -> List[Incident]:
+    """Evaluate the dirty rules of ``partitions`` on their own slices.
+
+    Incidents are annotated against the full sorted window, as in the
+    batch path, so contributing agents are resolved identically.
+    """
+    incidents = []
+
+    for index, rule_fn in enumerate(partitions.rules):
+        if not partitions.dirty[index]:
+            partitions.skipped += 1
+            continue
+        try:
+            incident = rule_fn(partitions.events_for(index), device_id)
+        except Exception as e:
+            logger.error(f"{label} {rule_fn.__name__} failed: {e}", exc_info=True)
+            continue
+        if not incident:
+            partitions.dirty[index] = False
+            continue
+        if weights:
+            annotate(incident, events, weights)
+        incidents.append(incident)
+        logger.info(f"{label} fired: {incident.rule_name} → {incident.incident_id}")
+
+    return incidents
+
+
 def evaluate_rules(
     events: List[TelemetryEventView],
     device_id: str,
     weights: Optional[dict] = None,
+    partitions: Optional[RulePartitions] = None,
 ) -> List[Incident]:
     """Evaluate all correlation rules against event window
 
@@ -1349,10 +1539,18 @@ def evaluate_rules(
         weights: Optional AMRDR fusion weights {agent_id: weight}.
             When provided, incidents are annotated with agent_weights,
             weighted_confidence, and contributing_agents.
+        partitions: Optional RulePartitions mirroring ``events``. When
+            provided, only rules whose slice changed are re-run; the
+            result is identical to a full evaluation.
 
     Returns:
         List of Incident objects (may be empty if no rules fire)
     """
+    if partitions is not None:
+        return run_partitioned(
+            partitions, events, device_id, weights, _annotate_incident_weights, "Rule"
+        )
+
     incidents = []
 
     for rule_fn in ALL_RULES:
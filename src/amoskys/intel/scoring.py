@@ -20,9 +20,10 @@ import json
 import logging
 import os
 import time
-from collections import defaultdict, deque
+from array import array
+from collections import OrderedDict, defaultdict, deque
 from enum import Enum
-from typing import Any, Dict, List, Optional, Set, Tuple
+from typing import Any, Dict, List, Optional, Set, Tuple, Union
 
 logger = logging.getLogger(__name__)
 
@@ -247,6 +248,11 @@ class EventBaseline:
         self._trim_deque(dq, cutoff)
         return len(dq)
 
+    @property
+    def key_count(self) -> int:
+        """Number of (device, category, action) keys currently tracked."""
+        return len(self._events)
+
     def cleanup(self, ts: Optional[float] = None) -> int:
         """Remove entries older than the window. Returns number of keys removed."""
         now = ts or time.time()
@@ -286,6 +292,287 @@ class EventBaseline:
             logger.debug("Baseline save failed: %s", e)
 
 
+# ── Compact (bucketed) EventBaseline ──────────────────────────────────
+
+# A ring switches from a sparse dict to a dense array('I') once it holds
+# this many distinct buckets (dense 24h @ 1 min = 5.6 KB per key).
+_RING_DENSE_AFTER = 48
+
+
+class _CountRing:
+    """Event counts per fixed-width time bucket over the last ``size`` buckets.
+
+    Buckets are absolute indexes (``int(ts // resolution)``); the ring
+    keeps a running total so the full-window count is O(1). Rare keys stay
+    a small {bucket: count} dict; busy keys switch to a dense array('I')
+    indexed by ``bucket % size``, so memory per key is bounded either way.
+    """
+
+    __slots__ = ("counts", "head", "total", "touched")
+
+    def __init__(self) -> None:
+        self.counts: Union[Dict[int, int], array] = {}
+        self.head = -1  # newest bucket the ring has been advanced to
+        self.total = 0
+        self.touched = -1  # newest bucket written
+
+    def advance(self, bucket: int, size: int) -> None:
+        """Expire buckets that fall out of the window ending at *bucket*."""
+        if bucket <= self.head:
+            return
+        oldest = bucket - size  # buckets <= oldest are out of the window
+        counts = self.counts
+        if counts.__class__ is dict:
+            for b in [b for b in counts if b <= oldest]:
+                self.total -= counts.pop(b)
+        elif bucket - self.head >= size:
+            self.total = 0
+            self.counts = array("I", bytes(4 * size))
+        else:
+            for b in range(self.head + 1, bucket + 1):
+                slot = b % size
+                self.total -= counts[slot]
+                counts[slot] = 0
+        self.head = bucket
+
+    def add(self, bucket: int, size: int) -> None:
+        if bucket != self.head:
+            self.advance(bucket, size)
+            if bucket <= self.head - size:
+                return  # older than the window
+        counts = self.counts
+        if counts.__class__ is dict:
+            counts[bucket] = counts.get(bucket, 0) + 1
+            if len(counts) > _RING_DENSE_AFTER:
+                dense = array("I", bytes(4 * size))
+                for b, n in counts.items():
+                    dense[b % size] += n
+                self.counts = dense
+        else:
+            counts[bucket % size] += 1
+        self.total += 1
+        if bucket > self.touched:
+            self.touched = bucket
+
+    def recent(self, bucket: int, span: int, size: int) -> int:
+        """Count in the *span* newest buckets ending at *bucket*. O(span)."""
+        self.advance(bucket, size)
+        span = min(span, size)
+        counts = self.counts
+        if isinstance(counts, dict):
+            return sum(n for b, n in counts.items() if bucket - span < b <= bucket)
+        return sum(counts[b % size] for b in range(bucket - span + 1, bucket + 1))
+
+    def nbytes(self) -> int:
+        if isinstance(self.counts, dict):
+            return 64 + 72 * len(self.counts)  # rough dict + int overhead
+        return 64 + self.counts.itemsize * len(self.counts)
+
+
+class CompactEventBaseline:
+    """Drop-in EventBaseline backed by fixed-resolution count rings.
+
+    Same API as EventBaseline (record / get_rarity / get_burst_count /
+    is_first_seen / cleanup / save), but each (device, category, action)
+    key holds a ring of per-minute counts instead of one float per event:
+    record is O(1), rarity is O(1) from the ring total, burst counts are
+    O(window) over a per-second ring, and memory per key is bounded no
+    matter how chatty the host is. Counts are exact at bucket resolution
+    (rarity: ``resolution_seconds``; bursts: 1s).
+
+    Keys are kept in last-written order, so cleanup() only visits keys
+    that have actually gone idle for a whole window.
+    """
+
+    BURST_RESOLUTION = 1  # seconds per burst bucket
+    BURST_HORIZON = 120  # burst buckets kept (same horizon as EventBaseline)
+
+    def __init__(
+        self, window_seconds: int = 86400, resolution_seconds: int = 60
+    ) -> None:
+        self._window = window_seconds
+        self._resolution = resolution_seconds
+        self._size = max(1, window_seconds // resolution_seconds)
+        # (device_id, category, action) → ring, oldest-written first
+        self._events: "OrderedDict[Tuple[str, str, str], _CountRing]" = OrderedDict()
+        # device_id → ring (rarity denominator)
+        self._device_counts: "OrderedDict[str, _CountRing]" = OrderedDict()
+        # (device_id, source_ip, action) → first-seen timestamp
+        self._first_seen: Dict[Tuple[str, str, str], float] = {}
+        # (device_id, category) → per-second ring for burst detection
+        self._burst_tracker: "OrderedDict[Tuple[str, str], _CountRing]" = OrderedDict()
+        self._total_events = 0
+        self._last_cleanup = 0.0
+
+    @staticmethod
+    def _touch(rings: OrderedDict, key: Any, bucket: int, size: int) -> None:
+        """Count one event for *key*, keeping *rings* in last-written order."""
+        ring = rings.get(key)
+        if ring is None:
+            ring = rings[key] = _CountRing()
+        elif bucket == ring.touched == ring.head:
+            # Same bucket as the last write: nothing to expire or reorder
+            counts = ring.counts
+            if counts.__class__ is dict:
+                counts[bucket] += 1
+            else:
+                counts[bucket % size] += 1
+            ring.total += 1
+            return
+        elif ring.touched < bucket:
+            rings.move_to_end(key)
+        ring.add(bucket, size)
+
+    def record(
+        self,
+        device_id: str,
+        category: str,
+        action: str,
+        source_ip: str = "",
+        ts: Optional[float] = None,
+    ) -> None:
+        """Record an event occurrence. O(1) amortized."""
+        now = ts or time.time()
+        bucket = int(now // self._resolution)
+        key = (device_id, category or "", action or "")
+        self._touch(self._events, key, bucket, self._size)
+        self._touch(self._device_counts, device_id, bucket, self._size)
+        self._total_events += 1
+
+        if source_ip:
+            fs_key = (device_id, source_ip, action or "")
+            if fs_key not in self._first_seen:
+                self._first_seen[fs_key] = now
+
+        burst_bucket = int(now // self.BURST_RESOLUTION)
+        self._touch(
+            self._burst_tracker,
+            (device_id, category or ""),
+            burst_bucket,
+            self.BURST_HORIZON,
+        )
+
+        if now - self._last_cleanup > 60:
+            self.cleanup(now)
+
+    def get_rarity(
+        self, device_id: str, category: str, action: str, ts: Optional[float] = None
+    ) -> float:
+        """Return rarity score 0.0 (common) to 1.0 (never seen before). O(1) amortized."""
+        now = ts or time.time()
+        bucket = int(now // self._resolution)
+        ring = self._events.get((device_id, category or "", action or ""))
+        if ring is None:
+            return 1.0
+        ring.advance(bucket, self._size)
+        if ring.total == 0:
+            return 1.0
+        device = self._device_counts.get(device_id)
+        if device is not None:
+            device.advance(bucket, self._size)
+        total = max(device.total if device is not None else 0, 1)
+        return max(0.0, min(1.0, 1.0 - ring.total / total))
+
+    def is_first_seen(
+        self, device_id: str, source_ip: str, action: str, ts: Optional[float] = None
+    ) -> bool:
+        """Check if this (device, source_ip, action) was seen for the first time recently."""
+        now = ts or time.time()
+        first = self._first_seen.get((device_id, source_ip, action or ""))
+        if first is None:
+            return True
+        return (now - first) < 60
+
+    def get_burst_count(
+        self,
+        device_id: str,
+        category: str,
+        window_seconds: int = 60,
+        ts: Optional[float] = None,
+    ) -> int:
+        """Count events of same category within a short window. O(window)."""
+        now = ts or time.time()
+        ring = self._burst_tracker.get((device_id, category or ""))
+        if ring is None:
+            return 0
+        span = max(1, -(-window_seconds // self.BURST_RESOLUTION))
+        return ring.recent(int(now // self.BURST_RESOLUTION), span, self.BURST_HORIZON)
+
+    @property
+    def key_count(self) -> int:
+        """Number of (device, category, action) keys currently tracked."""
+        return len(self._events)
+
+    def memory_bytes(self) -> int:
+        """Approximate bytes held by the count rings."""
+        return sum(
+            ring.nbytes()
+            for rings in (self._events, self._device_counts, self._burst_tracker)
+            for ring in rings.values()
+        )
+
+    def cleanup(self, ts: Optional[float] = None) -> int:
+        """Drop keys idle for a whole window. Returns number of event keys removed.
+
+        Only visits expired keys (plus one live key per map): rings are kept
+        in last-written order.
+        """
+        now = ts or time.time()
+        self._last_cleanup = now
+        removed = 0
+        bucket = int(now // self._resolution)
+        for rings, size in (
+            (self._events, self._size),
+            (self._device_counts, self._size),
+        ):
+            while rings:
+                key, ring = next(iter(rings.items()))
+                if ring.touched > bucket - size:
+                    break
+                del rings[key]
+                if rings is self._events:
+                    removed += 1
+        burst_bucket = int(now // self.BURST_RESOLUTION)
+        while self._burst_tracker:
+            key, ring = next(iter(self._burst_tracker.items()))
+            if ring.touched > burst_bucket - self.BURST_HORIZON:
+                break
+            del self._burst_tracker[key]
+        return removed
+
+    def save(self, path: str = "data/intel/baseline.json") -> None:
+        """Snapshot current state to disk."""
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            data = {
+                "backend": "compact",
+                "total_events": self._total_events,
+                "event_keys": len(self._events),
+                "first_seen_keys": len(self._first_seen),
+                "ring_bytes": self.memory_bytes(),
+                "saved_at": time.time(),
+            }
+            with open(path, "w") as f:
+                json.dump(data, f, indent=2)
+        except Exception as e:
+            logger.debug("Baseline save failed: %s", e)
+
+
+def make_event_baseline(
+    backend: Optional[str] = None,
+) -> Union[EventBaseline, CompactEventBaseline]:
+    """Build the EventBaseline selected by AMOSKYS_BASELINE_BACKEND.
+
+    "deque" (default) keeps every timestamp; "compact" uses bucketed rings.
+    """
+    backend = (backend or os.getenv("AMOSKYS_BASELINE_BACKEND", "deque")).lower()
+    if backend == "compact":
+        return CompactEventBaseline()
+    if backend != "deque":
+        logger.warning("Unknown baseline backend %r — using deque", backend)
+    return EventBaseline()
+
+
 # ── Geometric Scorer ──────────────────────────────────────────────────
 
 
@@ -868,7 +1155,7 @@ class ScoringEngine:
         baseline: Optional[EventBaseline] = None,
         learning_hours: int = 0,
     ) -> None:
-        self._baseline = baseline or EventBaseline()
+        self._baseline = baseline or make_event_baseline()
         self._geo = GeometricScorer()
         self._temp = TemporalScorer(self._baseline)
         self._behav = BehavioralScorer(self._baseline)
@@ -1076,6 +1363,64 @@ class ScoringEngine:
         Returns:
             The same event dict with scores populated.
         """
+        return self._score_event(event, agent_weight, None)
+
+    def score_batch(
+        self,
+        events: List[Dict[str, Any]],
+        agent_weights: Optional[List[float]] = None,
+    ) -> List[Optional[Exception]]:
+        """Score a micro-batch of events in order.
+
+        Equivalent to calling score_event() on each event in turn, except
+        the ML models run once for the whole batch (one feature matrix,
+        one call per model) instead of once per event.  Baselines, sequence
+        windows and calibration are still updated event by event, so the
+        order-dependent state ends up exactly as with score_event().
+
+        Args:
+            events: Mutable event dicts, scored in place.
+            agent_weights: Optional AMRDR fusion weight per event (default 1.0).
+
+        Returns:
+            One entry per event: None when it was scored, otherwise the
+            exception that aborted scoring for that event.
+        """
+        ml_results: List[Optional[Tuple[float, List[Dict]]]] = [None] * len(events)
+        if events and self._model_adapter and self._model_adapter.available():
+            # Only events headed for DETECTION scoring consult the models.
+            detecting = [
+                i
+                for i, event in enumerate(events)
+                if self._get_or_create_baseline(event.get("device_id", "unknown")).mode
+                == BaselineMode.DETECTION
+            ]
+            try:
+                batch = self._model_adapter.score_batch([events[i] for i in detecting])
+                for i, result in zip(detecting, batch):
+                    ml_results[i] = result
+            except Exception:
+                logger.debug("Batch ML scoring failed, using per-event", exc_info=True)
+        elif events:
+            ml_results = [(0.0, [])] * len(events)
+
+        errors: List[Optional[Exception]] = []
+        for i, event in enumerate(events):
+            weight = agent_weights[i] if agent_weights is not None else 1.0
+            try:
+                self._score_event(event, weight, ml_results[i])
+                errors.append(None)
+            except Exception as e:
+                errors.append(e)
+        return errors
+
+    def _score_event(
+        self,
+        event: Dict[str, Any],
+        agent_weight: float,
+        ml_result: Optional[Tuple[float, List[Dict]]],
+    ) -> Dict[str, Any]:
+        """score_event() body; ml_result is a precomputed ML (score, factors)."""
         device_id = event.get("device_id", "unknown")
 
         # Record in EventBaseline before scoring
@@ -1205,11 +1550,14 @@ class ScoringEngine:
 
         # ML model scoring — blends in when available (G1: call method with parens)
         ml_score, ml_factors = 0.0, []
-        if self._model_adapter and self._model_adapter.available():
+        if ml_result is not None:
+            ml_score, ml_factors = ml_result
+        elif self._model_adapter and self._model_adapter.available():
             ml_score, ml_factors = self._model_adapter.score(event)
 
-        # Fuse into composite score (with ML blend when active)
-        if ml_score > 0.0 and self._model_adapter and self._model_adapter.available():
+        # Fuse into composite score (with ML blend when active). A positive
+        # ML score only ever comes from a loaded, non-stale model.
+        if ml_score > 0.0:
             w_ml = 0.30
             scale = 0.70  # Redistribute 30% from heuristics to ML
             raw_composite = (
@@ -1252,7 +1600,9 @@ class ScoringEngine:
             foreign = bool(country) and country not in _HOME_REGIONS
             corroborated = bool(event.get("threat_intel_match")) or foreign
             capped_uncorroborated = not corroborated
-            effective_floor = floor if corroborated else min(floor, _SUSPICIOUS_THRESHOLD)
+            effective_floor = (
+                floor if corroborated else min(floor, _SUSPICIOUS_THRESHOLD)
+            )
             if not corroborated:
                 # never let an uncorroborated floored category exceed suspicious
                 composite = min(composite, _SUSPICIOUS_THRESHOLD)
@@ -1373,7 +1723,7 @@ class ScoringEngine:
             "total_scored": self._total_scored,
             "classifications": dict(self._classification_counts),
             "calibration_entries": len(self._calibration),
-            "baseline_keys": len(self._baseline._events),
+            "baseline_keys": self._baseline.key_count,
             "device_baselines": len(self._device_baselines),
             "baselines_in_detection": sum(
                 1
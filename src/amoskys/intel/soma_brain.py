@@ -1414,6 +1414,7 @@ class ModelScorerAdapter:
         self._if_model = None
         self._gbc_model = None
         self._label_encoders: Dict = {}
+        self._encoder_lookup: Dict[str, Dict[Any, float]] = {}
         self._feature_columns: List[str] = []
         self._if_calibration: Dict[str, float] = {}
 
@@ -1442,42 +1443,75 @@ class ModelScorerAdapter:
         Returns (score, factors) where score is 0.0-1.0 and factors is
         a list of explanatory dicts.
         """
-        # Check for hot-reload before scoring
+        return self.score_batch([event])[0]
+
+    def score_batch(
+        self, events: List[Dict[str, Any]]
+    ) -> List[Tuple[float, List[Dict]]]:
+        """Score N events with a single call per model.
+
+        Features for every event are stacked into one matrix, so the
+        IsolationForest and GBC each run once per batch instead of once
+        (or twice) per event.  The IF anomaly/normal verdict is derived
+        from the same score_samples array via the model's offset_, which
+        is exactly what predict() computes internally.
+
+        Returns one (score, factors) tuple per input event, in order.
+        Events whose features cannot be extracted score (0.0, []).
+        """
+        # Check for hot-reload once per batch
         self._check_hot_reload()
 
-        if self._if_model is None:
-            return 0.0, []
+        results: List[Tuple[float, List[Dict]]] = [(0.0, []) for _ in events]
+        if self._if_model is None or not events:
+            return results
 
-        # Extract features from event dict
-        features = self._extract_event_features(event)
-        if features is None:
-            return 0.0, []
+        # Extract features from event dicts
+        rows: List[np.ndarray] = []
+        positions: List[int] = []
+        for i, event in enumerate(events):
+            features = self._extract_event_features(event)
+            if features is not None:
+                rows.append(features)
+                positions.append(i)
+        if not rows:
+            return results
 
-        factors: List[Dict] = []
-        X = features.reshape(1, -1)
+        X = np.vstack(rows)
 
         # IsolationForest score (G4: stable normalization via calibration)
         try:
-            raw_score = float(-self._if_model.score_samples(X)[0])
-            if_score = self._normalize_if_score(raw_score)
-
-            prediction = self._if_model.predict(X)[0]
-            factors.append(
-                {
-                    "name": "ML Anomaly Detection",
-                    "contribution": round(if_score, 3),
-                    "detail": f"IsolationForest: {'anomaly' if prediction == -1 else 'normal'} (score={if_score:.3f})",
-                }
-            )
+            samples = self._if_model.score_samples(X)
+            offset = getattr(self._if_model, "offset_", None)
+            if offset is not None:
+                anomalous = samples < offset
+            else:
+                anomalous = self._if_model.predict(X) == -1
         except Exception:
             logger.debug("IF scoring failed", exc_info=True)
-            return 0.0, []
+            return results
 
         # GBC score (when available)
-        gbc_score = 0.0
+        probas_all = None
         if self._gbc_model is not None:
             try:
-                probas = self._gbc_model.predict_proba(X)[0]
+                probas_all = self._gbc_model.predict_proba(X)
+            except Exception:
+                logger.debug("GBC scoring failed", exc_info=True)
+
+        for row, pos in enumerate(positions):
+            if_score = self._normalize_if_score(float(-samples[row]))
+            factors: List[Dict] = [
+                {
+                    "name": "ML Anomaly Detection",
+                    "contribution": round(if_score, 3),
+                    "detail": f"IsolationForest: {'anomaly' if anomalous[row] else 'normal'} (score={if_score:.3f})",
+                }
+            ]
+
+            gbc_score = 0.0
+            if probas_all is not None:
+                probas = probas_all[row]
                 # Score = weighted probability of suspicious + malicious
                 # Classes: 0=legitimate, 1=suspicious, 2=malicious
                 if len(probas) >= 3:
@@ -1492,16 +1526,16 @@ class ModelScorerAdapter:
                         "detail": f"GBC supervised: legit={probas[0]:.2f}, suspicious={probas[1] if len(probas) > 1 else 0:.2f}, malicious={probas[2] if len(probas) > 2 else 0:.2f}",
                     }
                 )
-            except Exception:
-                logger.debug("GBC scoring failed", exc_info=True)
 
-        # Combine: IF primary, GBC secondary
-        if gbc_score > 0.0:
-            ml_score = 0.6 * if_score + 0.4 * gbc_score
-        else:
-            ml_score = if_score
+            # Combine: IF primary, GBC secondary
+            if gbc_score > 0.0:
+                ml_score = 0.6 * if_score + 0.4 * gbc_score
+            else:
+                ml_score = if_score
 
-        return round(ml_score, 4), factors
+            results[pos] = (round(ml_score, 4), factors)
+
+        return results
 
     def _normalize_if_score(self, raw: float) -> float:
         """Normalize IF score using persisted p5/p95 quantiles (G4)."""
@@ -1512,6 +1546,21 @@ class ModelScorerAdapter:
         normalized = (raw - p5) / (p95 - p5)
         return float(np.clip(normalized, 0.0, 1.0))
 
+    def _encoder_index(self, enc_name: str) -> Optional[Dict[Any, float]]:
+        """Class -> encoded value map for a label encoder, built once per load.
+
+        Equivalent to ``enc.transform([val])[0]`` for known classes, without
+        the per-call sklearn validation overhead on every event.
+        """
+        index = self._encoder_lookup.get(enc_name)
+        if index is None:
+            enc = self._label_encoders.get(enc_name)
+            if enc is None or not hasattr(enc, "classes_"):
+                return None
+            index = {c: float(i) for i, c in enumerate(enc.classes_)}
+            self._encoder_lookup[enc_name] = index
+        return index
+
     def _extract_event_features(self, event: Dict) -> Optional[np.ndarray]:
         """Extract features from a single event dict matching training schema."""
         if not self._feature_columns:
@@ -1537,14 +1586,10 @@ class ModelScorerAdapter:
 
             # Categorical (use encoders)
             for col in ["event_category", "event_action", "collection_agent"]:
-                enc_name = f"{col}_encoder"
-                enc = self._label_encoders.get(enc_name)
+                index = self._encoder_index(f"{col}_encoder")
                 val = event.get(col, "unknown")
-                if enc is not None and hasattr(enc, "classes_"):
-                    if val in enc.classes_:
-                        features[col + "_encoded"] = float(enc.transform([val])[0])
-                    else:
-                        features[col + "_encoded"] = -1.0
+                if index is not None:
+                    features[col + "_encoded"] = index.get(val, -1.0)
                 else:
                     features[col + "_encoded"] = 0.0
 
@@ -1669,6 +1714,7 @@ class ModelScorerAdapter:
         if os.path.exists(enc_path):
             try:
                 self._label_encoders = joblib.load(enc_path)
+                self._encoder_lookup = {}
                 self._encoders_mtime = os.path.getmtime(enc_path)
             except Exception:
                 logger.warning("Failed to load label encoders", exc_info=True)
@@ -1724,6 +1770,7 @@ class ModelScorerAdapter:
                     import joblib
 
                     self._label_encoders = joblib.load(enc_path)
+                    self._encoder_lookup = {}
                     self._encoders_mtime = mtime
 
                     fc_path = os.path.join(self._model_dir, "feature_columns.joblib")
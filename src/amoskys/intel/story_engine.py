@@ -17,6 +17,7 @@ from __future__ import annotations
 import hashlib
 import json
 import sqlite3
+import threading
 import time
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
@@ -301,6 +302,20 @@ KNOWN_PATTERNS = {
 }
 
 
+# Telemetry tables hydrated into stories: (table, extra filter, row cap).
+# security_events rows are additionally matched on the incidents' event IDs.
+HYDRATION_SOURCES = [
+    ("security_events", "", 500),
+    ("persistence_events", "", 200),
+    ("flow_events", "risk_score >= 0.5", 200),
+    ("dns_events", "risk_score >= 0.5", 200),
+    ("fim_events", "risk_score >= 0.5", 200),
+]
+
+# SQLite's default host-parameter limit is 999; stay well below it
+_IN_CHUNK = 500
+
+
 # ── Data Classes ────────────────────────────────────────────────
 
 
@@ -402,10 +417,15 @@ class StoryEngine:
         telemetry_db: str = "data/telemetry.db",
         fusion_db: str = "data/intel/fusion.db",
         collapse_window_seconds: float = 3600,  # 1 hour
+        hydration_pad_seconds: float = 900,  # evidence before/after incidents
     ):
         self.telemetry_db = telemetry_db
         self.fusion_db = fusion_db
         self.collapse_window = collapse_window_seconds
+        self.hydration_pad = hydration_pad_seconds
+        self._conns: Dict[str, sqlite3.Connection] = {}
+        self._columns: Dict[Tuple[str, str], Set[str]] = {}
+        self._db_lock = threading.Lock()
 
     def build_stories(
         self,
@@ -493,58 +513,92 @@ class StoryEngine:
     # ── Incident Grouping ──────────────────────────────────────
 
     def _group_related_incidents(self, incidents: List[Dict]) -> List[List[Dict]]:
-        """Group incidents by rule_name + temporal proximity, then by shared techniques.
-
-        Live data shows most incidents (201/239) are 'high_risk_detections' with
-        empty techniques — grouping by rule_name within the collapse window
-        prevents 201 identical stories.
+        """Group incidents by shared keys within the collapse window.
+
+        Incidents are related when they share a rule_name (live data shows
+        most incidents are 'high_risk_detections' with empty techniques), a
+        MITRE technique, or an entity (process, IP, domain, file) on the same
+        device. A time-sorted sweep unions each incident with the groups that
+        last saw one of its keys, as long as the merged group still spans
+        less than the collapse window: O(n log n) instead of all pairs.
         """
         if not incidents:
             return []
 
-        groups: List[List[Dict]] = []
-        used: Set[int] = set()
+        keyed = [
+            (self._incident_time(inc), self._grouping_keys(inc)) for inc in incidents
+        ]
+        order = sorted(range(len(incidents)), key=lambda i: keyed[i][0])
+
+        parent = list(range(len(incidents)))
+        first_ts = [ts for ts, _ in keyed]
+
+        def find(i: int) -> int:
+            while parent[i] != i:
+                parent[i] = parent[parent[i]]
+                i = parent[i]
+            return i
+
+        last_seen: Dict[str, int] = {}
+        for i in order:
+            ts, keys = keyed[i]
+            for key in keys:
+                j = last_seen.get(key)
+                last_seen[key] = i
+                if j is None:
+                    continue
+                root, other = find(i), find(j)
+                if root == other:
+                    continue
+                start = min(first_ts[root], first_ts[other])
+                if ts - start >= self.collapse_window:
+                    continue
+                parent[other] = root
+                first_ts[root] = start
 
+        groups: Dict[int, List[Dict]] = {}
         for i, inc in enumerate(incidents):
-            if i in used:
-                continue
-
-            group = [inc]
-            used.add(i)
-            inc_rule = inc.get("rule_name", "")
-            inc_techs = set(self._parse_json(inc.get("techniques", "[]")))
-            inc_time = self._parse_timestamp(inc.get("created_at", ""))
-
-            for j, other in enumerate(incidents):
-                if j not in used and self._should_group(
-                    inc_rule,
-                    inc_techs,
-                    inc_time,
-                    other,
-                ):
-                    group.append(other)
-                    used.add(j)
-
-            groups.append(group)
-
-        return groups
-
-    def _should_group(
-        self,
-        rule: str,
-        techs: Set[str],
-        ts: float,
-        other: Dict,
-    ) -> bool:
-        """Check if another incident belongs in the same group."""
-        other_time = self._parse_timestamp(other.get("created_at", ""))
-        if abs(ts - other_time) >= self.collapse_window:
-            return False
-        other_rule = other.get("rule_name", "")
-        if rule and rule == other_rule:
-            return True
-        other_techs = set(self._parse_json(other.get("techniques", "[]")))
-        return bool(techs and other_techs and techs & other_techs)
+            groups.setdefault(find(i), []).append(inc)
+        return list(groups.values())
+
+    def _incident_time(self, inc: Dict) -> float:
+        start_ns = inc.get("start_ts_ns")
+        if start_ns:
+            return start_ns / 1e9
+        return self._parse_timestamp(inc.get("created_at", ""))
+
+    def _grouping_keys(self, inc: Dict) -> Set[str]:
+        """Rule, technique and device-scoped entity keys of an incident."""
+        keys: Set[str] = set()
+        rule = inc.get("rule_name", "")
+        if rule:
+            keys.add(f"rule:{rule}")
+        keys.update(f"tech:{t}" for t in self._parse_json(inc.get("techniques", "[]")))
+
+        raw = inc.get("incident_context_json")
+        if not raw:
+            return keys
+        try:
+            context = json.loads(raw) if isinstance(raw, str) else raw
+        except (json.JSONDecodeError, TypeError):
+            return keys
+        if not isinstance(context, dict):
+            return keys
+        device = inc.get("device_id") or context.get("device_id") or ""
+        for section, fields in (
+            ("processes", ("exe",)),
+            ("network_flows", ("dst_ip",)),
+            ("dns_queries", ("domain", "query_name")),
+            ("files", ("path",)),
+        ):
+            for item in context.get(section) or ():
+                if not isinstance(item, dict):
+                    continue
+                for fld in fields:
+                    val = item.get(fld)
+                    if val and isinstance(val, str):
+                        keys.add(f"entity:{device}:{val}")
+        return keys
 
     # ── Story Building ─────────────────────────────────────────
 
@@ -598,7 +652,9 @@ class StoryEngine:
                 max_confidence = conf
 
         # Hydrate events from telemetry DB
-        events = self._hydrate_events(all_event_ids, all_techniques)
+        events = self._hydrate_events(
+            all_event_ids, all_techniques, self._evidence_scope(incidents)
+        )
 
         # Map events to kill chain stages
         stage_map = self._map_to_stages(events, all_techniques)
@@ -689,56 +745,97 @@ class StoryEngine:
 
     # ── Event Hydration ────────────────────────────────────────
 
+    def _evidence_scope(
+        self, incidents: List[Dict]
+    ) -> Tuple[Set[str], Optional[int], Optional[int]]:
+        """Devices and padded [start, end] nanosecond window of a group."""
+        devices = {inc["device_id"] for inc in incidents if inc.get("device_id")}
+        starts, ends = [], []
+        for inc in incidents:
+            created = self._incident_time(inc)
+            starts.append(inc.get("start_ts_ns") or int(created * 1e9))
+            ends.append(inc.get("end_ts_ns") or int(created * 1e9))
+        pad = int(self.hydration_pad * 1e9)
+        return devices, min(starts) - pad, max(ends) + pad
+
     def _hydrate_events(
-        self, event_ids: Set[str], techniques: Set[str]
+        self,
+        event_ids: Set[str],
+        techniques: Set[str],
+        scope: Optional[Tuple[Set[str], Optional[int], Optional[int]]] = None,
     ) -> List[Dict[str, Any]]:
-        """Pull events from all telemetry tables."""
-        events = []
-
-        # Security events (primary source — has MITRE tags)
-        for ev in self._query_telemetry(
-            "SELECT * FROM security_events ORDER BY timestamp_ns DESC LIMIT 500"
-        ):
-            ev_techs = set(self._parse_json(ev.get("mitre_techniques", "")))
-            if ev_techs & techniques:
-                ev["_source"] = "security_events"
-                ev["_ts"] = (ev.get("timestamp_ns") or 0) / 1e9
-                events.append(ev)
-
-        # Persistence events
-        for ev in self._query_telemetry(
-            "SELECT * FROM persistence_events ORDER BY timestamp_ns DESC LIMIT 200"
-        ):
-            ev["_source"] = "persistence_events"
-            ev["_ts"] = (ev.get("timestamp_ns") or 0) / 1e9
-            events.append(ev)
+        """Pull a story's evidence from all telemetry tables.
 
-        # Flow events (high risk only)
-        for ev in self._query_telemetry(
-            "SELECT * FROM flow_events WHERE risk_score >= 0.5 "
-            "ORDER BY timestamp_ns DESC LIMIT 200"
-        ):
-            ev["_source"] = "flow_events"
+        Security events referenced by the incidents are fetched by event_id,
+        and those matching the story's techniques through event_techniques.
+        Everything else is a range scan on the timestamp index limited to
+        the incidents' devices and time window (``scope``); without a scope
+        the most recent rows are used.
+        """
+        devices, start_ns, end_ns = scope or (set(), None, None)
+        events: List[Dict[str, Any]] = []
+        seen: Set[Tuple[str, Any]] = set()
+
+        def add(ev: Dict[str, Any], source: str) -> None:
+            key = (source, ev.get("id"))
+            if key[1] is not None and key in seen:
+                return
+            seen.add(key)
+            ev["_source"] = source
             ev["_ts"] = (ev.get("timestamp_ns") or 0) / 1e9
             events.append(ev)
 
-        # DNS events (high risk only)
-        for ev in self._query_telemetry(
-            "SELECT * FROM dns_events WHERE risk_score >= 0.5 "
-            "ORDER BY timestamp_ns DESC LIMIT 200"
-        ):
-            ev["_source"] = "dns_events"
-            ev["_ts"] = (ev.get("timestamp_ns") or 0) / 1e9
-            events.append(ev)
+        # Security events named by the incidents
+        if event_ids and "event_id" in self._table_columns("security_events"):
+            ids = sorted(event_ids)
+            for i in range(0, len(ids), _IN_CHUNK):
+                chunk = ids[i : i + _IN_CHUNK]
+                for ev in self._query_telemetry(
+                    "SELECT * FROM security_events WHERE event_id IN "
+                    f"({','.join('?' * len(chunk))})",
+                    tuple(chunk),
+                ):
+                    add(ev, "security_events")
 
-        # FIM events (high risk only)
-        for ev in self._query_telemetry(
-            "SELECT * FROM fim_events WHERE risk_score >= 0.5 "
-            "ORDER BY timestamp_ns DESC LIMIT 200"
-        ):
-            ev["_source"] = "fim_events"
-            ev["_ts"] = (ev.get("timestamp_ns") or 0) / 1e9
-            events.append(ev)
+        indexed = bool(self._table_columns("event_techniques"))
+        for table, condition, limit in HYDRATION_SOURCES:
+            columns = self._table_columns(table)
+            if not columns:
+                continue
+            where: List[str] = [condition] if condition else []
+            params: List[Any] = []
+            if table == "security_events" and indexed:
+                # MITRE matches straight off the event_techniques index
+                if not techniques:
+                    continue
+                techs = sorted(techniques)[:_IN_CHUNK]
+                sub = (
+                    "SELECT event_rowid FROM event_techniques WHERE technique IN "
+                    f"({','.join('?' * len(techs))})"
+                )
+                params += techs
+                if start_ns is not None and end_ns is not None:
+                    sub += " AND timestamp_ns BETWEEN ? AND ?"
+                    params += [start_ns, end_ns]
+                where.append(f"id IN ({sub})")
+            if start_ns is not None and end_ns is not None:
+                where.append("timestamp_ns BETWEEN ? AND ?")
+                params += [start_ns, end_ns]
+            if devices and "device_id" in columns:
+                where.append(f"device_id IN ({','.join('?' * len(devices))})")
+                params += sorted(devices)
+            sql = f"SELECT * FROM {table}"
+            if where:
+                sql += " WHERE " + " AND ".join(where)
+            sql += f" ORDER BY timestamp_ns DESC LIMIT {limit}"
+
+            for ev in self._query_telemetry(sql, tuple(params)):
+                # Security events are the primary source: keep MITRE matches
+                if table == "security_events" and not indexed:
+                    ev_techs = set(self._parse_json(ev.get("mitre_techniques", "")))
+                    if not ev_techs & techniques:
+                        continue
+                add(ev, table)
 
         # Sort by timestamp
         events.sort(key=lambda e: e.get("_ts", 0))
@@ -981,22 +1078,48 @@ class StoryEngine:
 
     # ── Helpers ─────────────────────────────────────────────────
 
+    def _connection(self, db: str) -> Optional[sqlite3.Connection]:
+        """Connection to ``db``, opened once and reused (caller holds the lock)."""
+        conn = self._conns.get(db)
+        if conn is None:
+            if not Path(db).exists():
+                return None
+            conn = sqlite3.connect(db, timeout=5, check_same_thread=False)
+            conn.row_factory = sqlite3.Row
+            self._conns[db] = conn
+        return conn
+
     def _query(self, sql: str, params: tuple = (), db_path: str = "") -> List[Dict]:
         db = db_path or self.telemetry_db
-        if not Path(db).exists():
-            return []
-        conn = sqlite3.connect(db, timeout=5)
-        conn.row_factory = sqlite3.Row
-        try:
-            return [dict(r) for r in conn.execute(sql, params).fetchall()]
-        except sqlite3.OperationalError:
-            return []
-        finally:
-            conn.close()
+        with self._db_lock:
+            conn = self._connection(db)
+            if conn is None:
+                return []
+            try:
+                return [dict(r) for r in conn.execute(sql, params).fetchall()]
+            except sqlite3.OperationalError:
+                return []
 
     def _query_telemetry(self, sql: str, params: tuple = ()) -> List[Dict]:
         return self._query(sql, params, db_path=self.telemetry_db)
 
+    def _table_columns(self, table: str) -> Set[str]:
+        """Column names of a telemetry table (empty if it does not exist)."""
+        key = (self.telemetry_db, table)
+        if key not in self._columns:
+            rows = self._query_telemetry(f"PRAGMA table_info({table})")
+            if not rows:
+                return set()  # not cached: the table may be created later
+            self._columns[key] = {r["name"] for r in rows}
+        return self._columns[key]
+
+    def close(self) -> None:
+        """Close the reused database connections."""
+        with self._db_lock:
+            for conn in self._conns.values():
+                conn.close()
+            self._conns.clear()
+
     def _parse_json(self, raw: Any) -> List[str]:
         if not raw:
             return []
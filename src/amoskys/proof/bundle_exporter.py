@@ -84,7 +84,6 @@ class BundleExporter:
         output_dir: str,
     ) -> str:
         """Export a proof bundle for multiple segments."""
-        segments = self._seg_mgr.scan_segments()
         signer = CheckpointSigner(manifest_path=self.manifest_path)
         checkpoints = signer.load_manifest()
 
@@ -97,13 +96,12 @@ class BundleExporter:
         exported_segments = []
 
         for sid in segment_ids:
-            if sid < 0 or sid >= len(segments):
+            try:
+                events = self._seg_mgr.get_segment_events(sid)
+            except IndexError:
                 logger.warning("Segment %d not found, skipping", sid)
                 continue
 
-            seg = segments[sid]
-            events = self._seg_mgr.get_segment_events(sid)
-
             # Write checkpoint
             cp = checkpoints[sid] if sid < len(checkpoints) else None
             if cp:
@@ -164,7 +162,7 @@ class BundleExporter:
 
     def export_latest(self, output_dir: str) -> str:
         """Export the most recent sealed segment."""
-        segments = self._seg_mgr.scan_segments()
+        segments = self._seg_mgr.scan_segments(include_leaves=False)
         if not segments:
             raise ValueError("No segments found in WAL")
         latest_id = segments[-1].segment_id
@@ -177,7 +175,7 @@ class BundleExporter:
         output_dir: str,
     ) -> str:
         """Export all segments overlapping a time window."""
-        segments = self._seg_mgr.scan_segments()
+        segments = self._seg_mgr.scan_segments(include_leaves=False)
         matching = [
             s.segment_id
             for s in segments
@@ -342,7 +340,7 @@ def chain_status(
         total_segments, chain_health.
     """
     mgr = SegmentManager(wal_path, segment_size=segment_size)
-    segments = mgr.scan_segments()
+    segments = mgr.scan_segments(include_leaves=False)
 
     signer = CheckpointSigner(manifest_path=manifest_path)
     checkpoints = signer.load_manifest()
@@ -20,7 +20,7 @@ from dataclasses import asdict, dataclass
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 
-from amoskys.proof.wal_segments import SegmentInfo
+from amoskys.proof.wal_segments import SegmentInfo, SegmentManager
 
 logger = logging.getLogger(__name__)
 
@@ -153,6 +153,26 @@ class CheckpointSigner:
 
         return checkpoints
 
+    def seal_pending(self, segment_manager: SegmentManager) -> List[Checkpoint]:
+        """Seal the segments sealed in the index since the last checkpoint.
+
+        Continues the checkpoint chain from the manifest tail, so repeated
+        calls only ever sign new segments.
+        """
+        records = self.load_manifest()
+        last_segment_id = records[-1]["segment_id"] if records else -1
+        prev_hash: Optional[bytes] = _hash_checkpoint(records[-1]) if records else None
+
+        checkpoints: List[Checkpoint] = []
+        for seg in segment_manager.sealed_segments(after_segment_id=last_segment_id):
+            cp = self.seal_segment(seg, prev_checkpoint_hash=prev_hash)
+            prev_hash = _hash_checkpoint(
+                {k: v for k, v in vars(cp).items() if not k.startswith("_")}
+            )
+            checkpoints.append(cp)
+
+        return checkpoints
+
     def load_manifest(self) -> List[Dict[str, Any]]:
         """Load all checkpoint records from the manifest file."""
         if not os.path.exists(self.manifest_path):
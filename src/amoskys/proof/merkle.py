@@ -68,7 +68,18 @@ def inclusion_proof(leaves: List[bytes], index: int) -> List[Tuple[bytes, str]]:
     if index < 0 or index >= len(leaves):
         raise IndexError(f"Leaf index {index} out of range [0, {len(leaves)})")
 
-    tree = build_tree(leaves)
+    return proof_from_levels(build_tree(leaves), index)
+
+
+def proof_from_levels(tree: List[List[bytes]], index: int) -> List[Tuple[bytes, str]]:
+    """Generate an inclusion proof from precomputed tree levels.
+
+    *tree* is the output of :func:`build_tree` (level 0 = leaves), e.g. as
+    persisted by the segment index, so no hashing is needed.
+    """
+    if index < 0 or index >= len(tree[0]):
+        raise IndexError(f"Leaf index {index} out of range [0, {len(tree[0])})")
+
     proof: List[Tuple[bytes, str]] = []
 
     idx = index
@@ -56,8 +56,8 @@ def prove_from_wal(
 ) -> Dict[str, Any]:
     """High-level: prove a specific WAL row_id is included in its segment.
 
-    Scans the WAL, finds the segment containing the target row, and
-    generates an inclusion proof.
+    Looks the row up in the segment index and reads its proof path from
+    the stored Merkle levels; only the target row is read from the WAL.
 
     Args:
         wal_path: Path to the WAL SQLite database.
@@ -71,21 +71,18 @@ def prove_from_wal(
         ValueError: If the row_id is not found in any segment.
     """
     mgr = SegmentManager(wal_path, segment_size=segment_size)
-    segments = mgr.scan_segments()
-
-    for seg in segments:
-        events = mgr.get_segment_events(seg.segment_id)
-        for local_idx, evt in enumerate(events):
-            if evt["row_id"] == target_row_id:
-                result = prove_event_inclusion(
-                    env_bytes=evt["env_bytes"],
-                    row_index=local_idx,
-                    prev_sig=evt["prev_sig"] or GENESIS_SIG,
-                    segment_leaves=seg.leaf_hashes,
-                    expected_root=seg.root_hash,
-                )
-                result["segment_id"] = seg.segment_id
-                result["event_count"] = seg.event_count
-                return result
-
-    raise ValueError(f"Row {target_row_id} not found in any segment")
+    seg, local_idx, proof = mgr.inclusion_proof(target_row_id)
+
+    evt = mgr.get_event(target_row_id)
+    if evt is None:
+        raise ValueError(f"Row {target_row_id} not found in any segment")
+
+    lh = leaf_hash(evt["env_bytes"], local_idx, evt["prev_sig"] or GENESIS_SIG)
+    return {
+        "valid": verify_inclusion(lh, proof, seg.root_hash),
+        "leaf_hex": lh.hex(),
+        "proof": [(sib.hex(), side) for sib, side in proof],
+        "root_hex": seg.root_hash.hex(),
+        "segment_id": seg.segment_id,
+        "event_count": seg.event_count,
+    }
@@ -3,6 +3,14 @@
 Each segment contains a bounded number of events (default: 1000) or spans
 a bounded time window (default: 5 minutes).  When a segment is sealed it
 becomes immutable and a Merkle root is computed over its canonical events.
+
+Sealed segments are recorded in a persistent segment index (a small SQLite
+database next to the WAL): boundaries, root, chain signatures, every level
+of the Merkle tree, and a row_id → (segment, leaf) map.  The index is
+extended incrementally from the last sealed row id, so a sealed segment is
+hashed exactly once; lookups are row-id range queries against the WAL and
+inclusion proofs are read from the stored levels.  Only the open (tail)
+segment is computed on the fly.
 """
 
 from __future__ import annotations
@@ -18,7 +26,7 @@ from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 
-from amoskys.proof.merkle import build_tree, leaf_hash, root_hash
+from amoskys.proof.merkle import build_tree, leaf_hash, proof_from_levels, root_hash
 
 logger = logging.getLogger(__name__)
 
@@ -28,6 +36,44 @@ GENESIS_SIG = b"\x00" * 32
 DEFAULT_SEGMENT_SIZE = 1000  # events per segment
 DEFAULT_SEGMENT_WINDOW_NS = 5 * 60 * 10**9  # 5 minutes in nanoseconds
 
+# Segment index lives beside the WAL: <wal_path><INDEX_SUFFIX>
+INDEX_SUFFIX = ".segments"
+
+_HASH_LEN = 32
+
+INDEX_SCHEMA = """
+PRAGMA journal_mode=WAL;
+CREATE TABLE IF NOT EXISTS index_meta (
+  key TEXT PRIMARY KEY,
+  value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS segments (
+  segment_id INTEGER PRIMARY KEY,
+  start_seq INTEGER NOT NULL,
+  end_seq INTEGER NOT NULL,
+  event_count INTEGER NOT NULL,
+  first_ts_ns INTEGER NOT NULL,
+  last_ts_ns INTEGER NOT NULL,
+  root_hash BLOB NOT NULL,
+  first_chain_sig BLOB NOT NULL,
+  last_chain_sig BLOB NOT NULL
+);
+CREATE INDEX IF NOT EXISTS segments_ts ON segments(first_ts_ns, last_ts_ns);
+CREATE TABLE IF NOT EXISTS segment_levels (
+  segment_id INTEGER NOT NULL,
+  level INTEGER NOT NULL,
+  hashes BLOB NOT NULL,
+  PRIMARY KEY (segment_id, level)
+);
+CREATE TABLE IF NOT EXISTS segment_leaves (
+  row_id INTEGER PRIMARY KEY,
+  segment_id INTEGER NOT NULL,
+  leaf_index INTEGER NOT NULL
+);
+"""
+
+WalRow = Tuple[int, str, int, bytes, bytes, bytes]
+
 
 @dataclass
 class SegmentInfo:
@@ -43,6 +89,11 @@ class SegmentInfo:
     first_chain_sig: bytes
     last_chain_sig: bytes
     leaf_hashes: List[bytes] = field(default_factory=list)
+    sealed: bool = True
+
+
+def _split_hashes(blob: bytes) -> List[bytes]:
+    return [blob[i : i + _HASH_LEN] for i in range(0, len(blob), _HASH_LEN)]
 
 
 class SegmentManager:
@@ -51,84 +102,149 @@ class SegmentManager:
     Reads the WAL SQLite database, partitions rows into segments of
     *segment_size* events, and computes per-segment Merkle trees.
 
-    The manager is **read-only** — it never modifies the WAL database.
+    The manager is **read-only** with respect to the WAL — it never
+    modifies the WAL database.  Sealed segments are persisted in the
+    segment index at *index_path* (default: ``<wal_path>.segments``).
+    Because sealed segments are never recomputed, rows deleted from the
+    WAL after sealing surface as absences rather than silently shifting
+    later segment boundaries.
+
+    Args:
+        wal_path: Path to the WAL SQLite database.
+        segment_size: Maximum events per segment.
+        segment_window_ns: Maximum time span of a segment.
+        index_path: Segment index database path.
     """
 
+    # WAL rows fetched per query while extending the index
+    READ_CHUNK = 4096
+
     def __init__(
         self,
         wal_path: str,
         segment_size: int = DEFAULT_SEGMENT_SIZE,
         segment_window_ns: int = DEFAULT_SEGMENT_WINDOW_NS,
+        index_path: Optional[str] = None,
     ):
         self.wal_path = wal_path
         self.segment_size = segment_size
         self.segment_window_ns = segment_window_ns
+        self.index_path = index_path or f"{wal_path}{INDEX_SUFFIX}"
+        self._lock = threading.Lock()
+        self._idx: Optional[sqlite3.Connection] = None
 
     # ------------------------------------------------------------------
     # Public API
     # ------------------------------------------------------------------
 
-    def scan_segments(self) -> List[SegmentInfo]:
-        """Scan the WAL and partition rows into segments.
+    def refresh(self) -> int:
+        """Seal every segment that new WAL rows have completed.
 
-        Returns a list of SegmentInfo objects, one per segment.
-        Segments are computed from WAL rows ordered by ``id``.
+        Returns the number of segments sealed by this call.
         """
-        rows = self._read_wal_rows()
-        if not rows:
-            return []
+        sealed, _ = self._extend_index()
+        return sealed
 
-        segments: List[SegmentInfo] = []
-        seg_start = 0
+    def scan_segments(self, include_leaves: bool = True) -> List[SegmentInfo]:
+        """Return all segments: sealed ones from the index plus the open tail.
 
-        while seg_start < len(rows):
-            seg_end = min(seg_start + self.segment_size, len(rows))
+        Returns a list of SegmentInfo objects, one per segment, ordered by
+        ``segment_id``.  The final segment has ``sealed=False`` while it can
+        still grow.  With ``include_leaves=False`` the (potentially large)
+        leaf hash lists of sealed segments are not loaded.
+        """
+        _, tail = self._extend_index()
+        idx = self._index()
+        segments = [
+            self._segment_from_row(r)
+            for r in idx.execute("SELECT * FROM segments ORDER BY segment_id")
+        ]
+        if include_leaves:
+            for seg in segments:
+                seg.leaf_hashes = self._load_levels(seg.segment_id)[0]
+        if tail:
+            segments.append(self._build_segment(len(segments), tail, 0, sealed=False))
+        return segments
 
-            # Also respect time window: if the segment spans > window, cut earlier
-            first_ts = rows[seg_start][2]  # ts_ns
-            for i in range(seg_start, seg_end):
-                if rows[i][2] - first_ts > self.segment_window_ns:
-                    seg_end = i
-                    break
+    def sealed_segments(self, after_segment_id: int = -1) -> List[SegmentInfo]:
+        """Return sealed segments with ``segment_id > after_segment_id``.
 
-            if seg_end <= seg_start:
-                seg_end = seg_start + 1  # at least one event per segment
+        Leaf hashes are not loaded; this is what checkpointing needs.
+        """
+        self._extend_index()
+        return [
+            self._segment_from_row(r)
+            for r in self._index().execute(
+                "SELECT * FROM segments WHERE segment_id > ? ORDER BY segment_id",
+                (after_segment_id,),
+            )
+        ]
 
-            segment_rows = rows[seg_start:seg_end]
-            seg_info = self._build_segment(len(segments), segment_rows, seg_start)
-            segments.append(seg_info)
-            seg_start = seg_end
+    def get_segment(self, segment_id: int) -> SegmentInfo:
+        """Return one segment (with leaf hashes) by id.
 
-        return segments
+        Raises:
+            IndexError: If no such segment exists.
+        """
+        _, tail = self._extend_index()
+        seg = self._load_sealed(segment_id)
+        if seg is not None:
+            return seg
+        if tail and segment_id == self._sealed_count():
+            return self._build_segment(segment_id, tail, 0, sealed=False)
+        raise IndexError(f"Segment {segment_id} not found")
 
     def get_segment_events(self, segment_id: int) -> List[Dict]:
         """Return raw event data for a specific segment.
 
         Each dict contains: row_id, idem, ts_ns, env_bytes, sig, prev_sig.
         """
-        rows = self._read_wal_rows()
-        segments = self.scan_segments()
-
-        if segment_id < 0 or segment_id >= len(segments):
-            raise IndexError(f"Segment {segment_id} not found")
-
-        seg = segments[segment_id]
-        events = []
-        for row in rows:
-            row_id = row[0]
-            if row_id < seg.start_seq or row_id > seg.end_seq:
-                continue
-            events.append(
-                {
-                    "row_id": row[0],
-                    "idem": row[1],
-                    "ts_ns": row[2],
-                    "env_bytes": row[3],
-                    "sig": row[4],
-                    "prev_sig": row[5],
-                }
+        seg = self.get_segment(segment_id)
+        rows = self._read_wal_rows(after_id=seg.start_seq - 1, through_id=seg.end_seq)
+        return [self._event_dict(row) for row in rows]
+
+    def get_event(self, row_id: int) -> Optional[Dict]:
+        """Return raw event data for one WAL row, or None if absent."""
+        rows = self._read_wal_rows(after_id=row_id - 1, through_id=row_id)
+        return self._event_dict(rows[0]) if rows else None
+
+    def locate_row(self, row_id: int) -> Tuple[SegmentInfo, int]:
+        """Return (segment, leaf_index) for a WAL row id.
+
+        Raises:
+            ValueError: If the row is not in any segment.
+        """
+        _, tail = self._extend_index()
+        hit = (
+            self._index()
+            .execute(
+                "SELECT segment_id, leaf_index FROM segment_leaves WHERE row_id = ?",
+                (row_id,),
             )
-        return events
+            .fetchone()
+        )
+        if hit is not None:
+            return self._load_sealed(hit[0]), hit[1]
+        for local_idx, row in enumerate(tail):
+            if row[0] == row_id:
+                return (
+                    self._build_segment(self._sealed_count(), tail, 0, sealed=False),
+                    local_idx,
+                )
+        raise ValueError(f"Row {row_id} not found in any segment")
+
+    def inclusion_proof(self, row_id: int) -> Tuple[SegmentInfo, int, List]:
+        """Return (segment, leaf_index, proof) for a WAL row id.
+
+        For sealed segments the proof path is read from the stored tree
+        levels; nothing is rehashed.
+        """
+        seg, leaf_idx = self.locate_row(row_id)
+        if seg.sealed:
+            levels = self._load_levels(seg.segment_id)
+        else:
+            levels = build_tree(seg.leaf_hashes)
+        return seg, leaf_idx, proof_from_levels(levels, leaf_idx)
 
     # ------------------------------------------------------------------
     # Internals
@@ -136,23 +252,31 @@ class SegmentManager:
 
     def _read_wal_rows(
         self,
-    ) -> List[Tuple[int, str, int, bytes, bytes, bytes]]:
-        """Read all WAL rows as (id, idem, ts_ns, bytes, sig, prev_sig)."""
+        after_id: int = 0,
+        through_id: Optional[int] = None,
+        limit: Optional[int] = None,
+    ) -> List[WalRow]:
+        """Read WAL rows as (id, idem, ts_ns, bytes, sig, prev_sig).
+
+        Rows with ``after_id < id <= through_id`` are returned in id order,
+        at most *limit* of them.  The defaults read the whole WAL.
+        """
         conn = sqlite3.connect(self.wal_path, timeout=5.0)
         try:
             cols = {row[1] for row in conn.execute("PRAGMA table_info(wal)").fetchall()}
             has_chain = "sig" in cols and "prev_sig" in cols
-
-            if has_chain:
-                cursor = conn.execute(
-                    "SELECT id, idem, ts_ns, bytes, sig, prev_sig "
-                    "FROM wal ORDER BY id"
-                )
-            else:
-                cursor = conn.execute(
-                    "SELECT id, idem, ts_ns, bytes, NULL, NULL " "FROM wal ORDER BY id"
-                )
-            rows = cursor.fetchall()
+            chain_cols = "sig, prev_sig" if has_chain else "NULL, NULL"
+
+            sql = f"SELECT id, idem, ts_ns, bytes, {chain_cols} FROM wal WHERE id > ?"
+            params: List[int] = [after_id]
+            if through_id is not None:
+                sql += " AND id <= ?"
+                params.append(through_id)
+            sql += " ORDER BY id"
+            if limit is not None:
+                sql += " LIMIT ?"
+                params.append(limit)
+            rows = conn.execute(sql, params).fetchall()
             # Normalise memoryview / buffer → bytes
             normalised = []
             for r in rows:
@@ -170,11 +294,214 @@ class SegmentManager:
         finally:
             conn.close()
 
+    def _wal_high_water(self) -> int:
+        """Highest row id ever assigned in the WAL (survives deletes)."""
+        conn = sqlite3.connect(self.wal_path, timeout=5.0)
+        try:
+            try:
+                row = conn.execute(
+                    "SELECT seq FROM sqlite_sequence WHERE name = 'wal'"
+                ).fetchone()
+                if row is not None:
+                    return row[0]
+            except sqlite3.OperationalError:
+                pass  # no AUTOINCREMENT table
+            row = conn.execute("SELECT MAX(id) FROM wal").fetchone()
+            return row[0] or 0
+        finally:
+            conn.close()
+
+    def _index(self) -> sqlite3.Connection:
+        """Open (and if needed create or reset) the segment index."""
+        if self._idx is not None:
+            return self._idx
+
+        Path(self.index_path).parent.mkdir(parents=True, exist_ok=True)
+        idx = sqlite3.connect(self.index_path, timeout=5.0, check_same_thread=False)
+        idx.executescript(INDEX_SCHEMA)
+
+        config = json.dumps(
+            {
+                "segment_size": self.segment_size,
+                "segment_window_ns": self.segment_window_ns,
+            },
+            sort_keys=True,
+        )
+        stored = idx.execute(
+            "SELECT value FROM index_meta WHERE key = 'config'"
+        ).fetchone()
+        if stored is not None and stored[0] != config:
+            logger.warning(
+                "Segment index %s built with %s, rebuilding for %s",
+                self.index_path,
+                stored[0],
+                config,
+            )
+            self._reset_index(idx)
+        with idx:
+            idx.execute(
+                "INSERT OR REPLACE INTO index_meta (key, value) VALUES ('config', ?)",
+                (config,),
+            )
+        self._idx = idx
+        return idx
+
+    @staticmethod
+    def _reset_index(idx: sqlite3.Connection) -> None:
+        with idx:
+            for table in ("segments", "segment_levels", "segment_leaves"):
+                idx.execute(f"DELETE FROM {table}")
+
+    def _sealed_count(self) -> int:
+        return self._index().execute("SELECT COUNT(*) FROM segments").fetchone()[0]
+
+    def _segment_cut(self, rows: List[WalRow]) -> int:
+        """Length of the segment starting at rows[0] (size and window bound)."""
+        seg_end = min(self.segment_size, len(rows))
+
+        # Also respect time window: if the segment spans > window, cut earlier
+        first_ts = rows[0][2]  # ts_ns
+        for i in range(seg_end):
+            if rows[i][2] - first_ts > self.segment_window_ns:
+                seg_end = i
+                break
+
+        return max(seg_end, 1)  # at least one event per segment
+
+    def _extend_index(self) -> Tuple[int, List[WalRow]]:
+        """Seal completed segments after the last indexed row.
+
+        Returns (segments sealed, rows of the still-open tail segment).
+        """
+        with self._lock:
+            idx = self._index()
+            last = idx.execute(
+                "SELECT segment_id, end_seq FROM segments "
+                "ORDER BY segment_id DESC LIMIT 1"
+            ).fetchone()
+            next_id, cursor = (last[0] + 1, last[1]) if last else (0, 0)
+
+            if cursor and self._wal_high_water() < cursor:
+                logger.warning(
+                    "WAL %s is behind segment index %s, rebuilding",
+                    self.wal_path,
+                    self.index_path,
+                )
+                self._reset_index(idx)
+                next_id, cursor = 0, 0
+
+            sealed = 0
+            pending: List[WalRow] = []
+            exhausted = False
+            while True:
+                if len(pending) < self.segment_size and not exhausted:
+                    more = self._read_wal_rows(after_id=cursor, limit=self.READ_CHUNK)
+                    exhausted = len(more) < self.READ_CHUNK
+                    if more:
+                        pending.extend(more)
+                        cursor = more[-1][0]
+                if not pending:
+                    break
+                seg_end = self._segment_cut(pending)
+                if seg_end == len(pending) and len(pending) < self.segment_size:
+                    break  # open tail: may still grow
+                self._store_segment(idx, next_id, pending[:seg_end])
+                pending = pending[seg_end:]
+                next_id += 1
+                sealed += 1
+
+            if sealed:
+                logger.debug(
+                    "Segment index %s: sealed %d segment(s)", self.index_path, sealed
+                )
+            return sealed, pending
+
+    def _store_segment(
+        self, idx: sqlite3.Connection, segment_id: int, rows: List[WalRow]
+    ) -> None:
+        """Hash a completed segment once and persist it with its tree levels."""
+        seg = self._build_segment(segment_id, rows, 0)
+        levels = build_tree(seg.leaf_hashes)
+        with idx:
+            idx.execute(
+                "INSERT INTO segments (segment_id, start_seq, end_seq, event_count, "
+                "first_ts_ns, last_ts_ns, root_hash, first_chain_sig, last_chain_sig) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    seg.segment_id,
+                    seg.start_seq,
+                    seg.end_seq,
+                    seg.event_count,
+                    seg.first_ts_ns,
+                    seg.last_ts_ns,
+                    seg.root_hash,
+                    seg.first_chain_sig,
+                    seg.last_chain_sig,
+                ),
+            )
+            idx.executemany(
+                "INSERT INTO segment_levels (segment_id, level, hashes) "
+                "VALUES (?, ?, ?)",
+                [(segment_id, n, b"".join(level)) for n, level in enumerate(levels)],
+            )
+            idx.executemany(
+                "INSERT OR REPLACE INTO segment_leaves (row_id, segment_id, leaf_index) "
+                "VALUES (?, ?, ?)",
+                [(row[0], segment_id, i) for i, row in enumerate(rows)],
+            )
+
+    def _load_sealed(self, segment_id: int) -> Optional[SegmentInfo]:
+        row = (
+            self._index()
+            .execute("SELECT * FROM segments WHERE segment_id = ?", (segment_id,))
+            .fetchone()
+        )
+        if row is None:
+            return None
+        seg = self._segment_from_row(row)
+        seg.leaf_hashes = self._load_levels(segment_id)[0]
+        return seg
+
+    def _load_levels(self, segment_id: int) -> List[List[bytes]]:
+        return [
+            _split_hashes(bytes(blob))
+            for (blob,) in self._index().execute(
+                "SELECT hashes FROM segment_levels WHERE segment_id = ? ORDER BY level",
+                (segment_id,),
+            )
+        ]
+
+    @staticmethod
+    def _event_dict(row: WalRow) -> Dict:
+        return {
+            "row_id": row[0],
+            "idem": row[1],
+            "ts_ns": row[2],
+            "env_bytes": row[3],
+            "sig": row[4],
+            "prev_sig": row[5],
+        }
+
+    @staticmethod
+    def _segment_from_row(row: Tuple) -> SegmentInfo:
+        return SegmentInfo(
+            segment_id=row[0],
+            start_seq=row[1],
+            end_seq=row[2],
+            event_count=row[3],
+            first_ts_ns=row[4],
+            last_ts_ns=row[5],
+            root_hash=bytes(row[6]),
+            first_chain_sig=bytes(row[7]),
+            last_chain_sig=bytes(row[8]),
+        )
+
     def _build_segment(
         self,
         segment_id: int,
         rows: List[Tuple],
         global_offset: int,
+        sealed: bool = True,
     ) -> SegmentInfo:
         """Build Merkle tree for a segment of rows."""
         leaves: List[bytes] = []
@@ -199,4 +526,5 @@ class SegmentManager:
             first_chain_sig=first_row[4],
             last_chain_sig=last_row[4],
             leaf_hashes=leaves,
+            sealed=sealed,
         )
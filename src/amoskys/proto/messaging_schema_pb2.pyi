@@ -100,3 +100,41 @@ class PublishAck(_message.Message):
     reason: str
     backoff_hint_ms: int
     def __init__(self, status: _Optional[_Union[PublishAck.Status, str]] = ..., reason: _Optional[str] = ..., backoff_hint_ms: _Optional[int] = ...) -> None: ...
+
+class SubscribeRequest(_message.Message):
+    __slots__ = ("subscriber_id", "agent_ids", "payload_kinds", "min_severity", "resume_after_id", "buffer_size", "disconnect_on_overflow")
+    SUBSCRIBER_ID_FIELD_NUMBER: _ClassVar[int]
+    AGENT_IDS_FIELD_NUMBER: _ClassVar[int]
+    PAYLOAD_KINDS_FIELD_NUMBER: _ClassVar[int]
+    MIN_SEVERITY_FIELD_NUMBER: _ClassVar[int]
+    RESUME_AFTER_ID_FIELD_NUMBER: _ClassVar[int]
+    BUFFER_SIZE_FIELD_NUMBER: _ClassVar[int]
+    DISCONNECT_ON_OVERFLOW_FIELD_NUMBER: _ClassVar[int]
+    subscriber_id: str
+    agent_ids: _containers.RepeatedScalarFieldContainer[str]
+    payload_kinds: _containers.RepeatedScalarFieldContainer[str]
+    min_severity: str
+    resume_after_id: int
+    buffer_size: int
+    disconnect_on_overflow: bool
+    def __init__(self, subscriber_id: _Optional[str] = ..., agent_ids: _Optional[_Iterable[str]] = ..., payload_kinds: _Optional[_Iterable[str]] = ..., min_severity: _Optional[str] = ..., resume_after_id: _Optional[int] = ..., buffer_size: _Optional[int] = ..., disconnect_on_overflow: _Optional[bool] = ...) -> None: ...
+
+class WALEvent(_message.Message):
+    __slots__ = ("wal_id", "idempotency_key", "ts_ns", "agent_id", "payload_kind", "severity", "envelope", "dropped")
+    WAL_ID_FIELD_NUMBER: _ClassVar[int]
+    IDEMPOTENCY_KEY_FIELD_NUMBER: _ClassVar[int]
+    TS_NS_FIELD_NUMBER: _ClassVar[int]
+    AGENT_ID_FIELD_NUMBER: _ClassVar[int]
+    PAYLOAD_KIND_FIELD_NUMBER: _ClassVar[int]
+    SEVERITY_FIELD_NUMBER: _ClassVar[int]
+    ENVELOPE_FIELD_NUMBER: _ClassVar[int]
+    DROPPED_FIELD_NUMBER: _ClassVar[int]
+    wal_id: int
+    idempotency_key: str
+    ts_ns: int
+    agent_id: str
+    payload_kind: str
+    severity: str
+    envelope: bytes
+    dropped: int
+    def __init__(self, wal_id: _Optional[int] = ..., idempotency_key: _Optional[str] = ..., ts_ns: _Optional[int] = ..., agent_id: _Optional[str] = ..., payload_kind: _Optional[str] = ..., severity: _Optional[str] = ..., envelope: _Optional[bytes] = ..., dropped: _Optional[int] = ...) -> None: ...
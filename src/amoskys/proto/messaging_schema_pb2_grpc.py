@@ -39,6 +39,11 @@ class EventBusStub(object):
                 request_serializer=messaging__schema__pb2.Envelope.SerializeToString,
                 response_deserializer=messaging__schema__pb2.PublishAck.FromString,
                 _registered_method=True)
+        self.Subscribe = channel.unary_stream(
+                '/messaging.EventBus/Subscribe',
+                request_serializer=messaging__schema__pb2.SubscribeRequest.SerializeToString,
+                response_deserializer=messaging__schema__pb2.WALEvent.FromString,
+                _registered_method=True)
 
 
 class EventBusServicer(object):
@@ -50,6 +55,12 @@ class EventBusServicer(object):
         context.set_details('Method not implemented!')
         raise NotImplementedError('Method not implemented!')
 
+    def Subscribe(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
 
 def add_EventBusServicer_to_server(servicer, server):
     rpc_method_handlers = {
@@ -58,6 +69,11 @@ def add_EventBusServicer_to_server(servicer, server):
                     request_deserializer=messaging__schema__pb2.Envelope.FromString,
                     response_serializer=messaging__schema__pb2.PublishAck.SerializeToString,
             ),
+            'Subscribe': grpc.unary_stream_rpc_method_handler(
+                    servicer.Subscribe,
+                    request_deserializer=messaging__schema__pb2.SubscribeRequest.FromString,
+                    response_serializer=messaging__schema__pb2.WALEvent.SerializeToString,
+            ),
     }
     generic_handler = grpc.method_handlers_generic_handler(
             'messaging.EventBus', rpc_method_handlers)
@@ -95,3 +111,30 @@ class EventBus(object):
             timeout,
             metadata,
             _registered_method=True)
+
+    @staticmethod
+    def Subscribe(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_stream(
+            request,
+            target,
+            '/messaging.EventBus/Subscribe',
+            messaging__schema__pb2.SubscribeRequest.SerializeToString,
+            messaging__schema__pb2.WALEvent.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
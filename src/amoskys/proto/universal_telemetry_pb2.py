@@ -25,7 +25,7 @@ _sym_db = _symbol_database.Default()
 from amoskys.proto import messaging_schema_pb2 as messaging__schema__pb2
 
 
-DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x19universal_telemetry.proto\x12\tmessaging\x1a\x16messaging_schema.proto\"\xe7\x03\n\x0f\x44\x65viceTelemetry\x12\x11\n\tdevice_id\x18\x01 \x01(\t\x12\x13\n\x0b\x64\x65vice_type\x18\x02 \x01(\t\x12\x10\n\x08protocol\x18\x03 \x01(\t\x12+\n\x08metadata\x18\x04 \x01(\x0b\x32\x19.messaging.DeviceMetadata\x12)\n\x06\x65vents\x18\x05 \x03(\x0b\x32\x19.messaging.TelemetryEvent\x12,\n\x08security\x18\x06 \x01(\x0b\x32\x1a.messaging.SecurityContext\x12\x14\n\x0ctimestamp_ns\x18\x07 \x01(\x04\x12\x18\n\x10\x63ollection_agent\x18\x08 \x01(\t\x12\x15\n\ragent_version\x18\t \x01(\t\x12\x15\n\ris_compressed\x18\n \x01(\x08\x12\x1d\n\x15\x63ompression_algorithm\x18\x0b \x01(\t\x12\x12\n\nbatch_size\x18\x0c \x01(\r\x12\x1e\n\x16\x63ollection_interval_ms\x18\r \x01(\x04\x12\x16\n\x0eschema_version\x18\x0e \x01(\r\x12\x30\n\x0c\x63\x61pabilities\x18\x0f \x03(\x0b\x32\x1a.messaging.AgentCapability\x12\x19\n\x11\x61gent_bus_version\x18\x10 \x01(\t\"\x87\x05\n\x0e\x44\x65viceMetadata\x12\x14\n\x0cmanufacturer\x18\x01 \x01(\t\x12\r\n\x05model\x18\x02 \x01(\t\x12\x18\n\x10\x66irmware_version\x18\x03 \x01(\t\x12\x18\n\x10hardware_version\x18\x04 \x01(\t\x12\x15\n\rserial_number\x18\x05 \x01(\t\x12\x12\n\nip_address\x18\x06 \x01(\t\x12\x13\n\x0bmac_address\x18\x07 \x01(\t\x12\x0e\n\x06subnet\x18\x08 \x01(\t\x12\x0f\n\x07vlan_id\x18\t \x01(\t\x12\x11\n\tprotocols\x18\n \x03(\t\x12\x12\n\nopen_ports\x18\x0b \x03(\r\x12\x41\n\x0c\x63\x61pabilities\x18\x0c \x03(\x0b\x32+.messaging.DeviceMetadata.CapabilitiesEntry\x12\x19\n\x11physical_location\x18\r \x01(\t\x12\x12\n\ndepartment\x18\x0e \x01(\t\x12\x11\n\tasset_tag\x18\x0f \x01(\t\x12\x1d\n\x15\x63ompliance_frameworks\x18\x10 \x03(\t\x12\x1b\n\x13vulnerability_score\x18\x11 \x01(\x02\x12\x19\n\x11\x63riticality_level\x18\x12 \x01(\t\x12J\n\x11\x63ustom_properties\x18\x13 \x03(\x0b\x32/.messaging.DeviceMetadata.CustomPropertiesEntry\x1a\x33\n\x11\x43\x61pabilitiesEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12\r\n\x05value\x18\x02 \x01(\t:\x02\x38\x01\x1a\x37\n\x15\x43ustomPropertiesEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12\r\n\x05value\x18\x02 \x01(\t:\x02\x38\x01\"=\n\x0f\x41gentCapability\x12\x0c\n\x04name\x18\x01 \x01(\t\x12\r\n\x05\x62\x61\x64ge\x18\x02 \x01(\t\x12\r\n\x05notes\x18\x03 \x01(\t\"\xac\x06\n\x0eTelemetryEvent\x12\x10\n\x08\x65vent_id\x18\x01 \x01(\t\x12\x12\n\nevent_type\x18\x02 \x01(\t\x12\x10\n\x08severity\x18\x03 \x01(\t\x12\x1a\n\x12\x65vent_timestamp_ns\x18\x04 \x01(\x04\x12*\n\x0bmetric_data\x18\x05 \x01(\x0b\x32\x15.messaging.MetricData\x12$\n\x08log_data\x18\x06 \x01(\x0b\x32\x12.messaging.LogData\x12(\n\nalarm_data\x18\x07 \x01(\x0b\x32\x14.messaging.AlarmData\x12*\n\x0bstatus_data\x18\x08 \x01(\x0b\x32\x15.messaging.StatusData\x12\x30\n\x0esecurity_event\x18\t \x01(\x0b\x32\x18.messaging.SecurityEvent\x12*\n\x0b\x61udit_event\x18\n \x01(\x0b\x32\x15.messaging.AuditEvent\x12\x0c\n\x04tags\x18\x0b \x03(\t\x12=\n\nattributes\x18\x0c \x03(\x0b\x32).messaging.TelemetryEvent.AttributesEntry\x12\x18\n\x10source_component\x18\r \x01(\t\x12\x18\n\x10\x63onfidence_score\x18\x0e \x01(\x02\x12\x14\n\x0cis_synthetic\x18\x0f \x01(\x08\x12\x13\n\x0bretry_count\x18\x10 \x01(\r\x12\x19\n\x11reliability_score\x18\x11 \x01(\x02\x12\x17\n\x0f\x64rift_indicator\x18\x12 \x01(\t\x12\x10\n\x08\x61gent_id\x18\x13 \x01(\t\x12\x19\n\x11\x63orrelation_group\x18\x14 \x01(\t\x12\x19\n\x11related_event_ids\x18\x15 \x03(\t\x12\x19\n\x11\x64\x65tection_rule_id\x18\x16 \x01(\t\x12\x1d\n\x15\x64\x65tection_rule_source\x18\x17 \x01(\t\x12\x13\n\x0bprobe_class\x18\x18 \x01(\t\x12\x16\n\x0eprobe_maturity\x18\x19 \x01(\t\x1a\x31\n\x0f\x41ttributesEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12\r\n\x05value\x18\x02 \x01(\t:\x02\x38\x01\"\xcf\x02\n\nMetricData\x12\x13\n\x0bmetric_name\x18\x01 \x01(\t\x12\x13\n\x0bmetric_type\x18\x02 \x01(\t\x12\x15\n\rnumeric_value\x18\x03 \x01(\x01\x12\x14\n\x0cstring_value\x18\x04 \x01(\t\x12\x15\n\rboolean_value\x18\x05 \x01(\x08\x12\x14\n\x0c\x62inary_value\x18\x06 \x01(\x0c\x12\x0c\n\x04unit\x18\x07 \x01(\t\x12\x31\n\x06labels\x18\x08 \x03(\x0b\x32!.messaging.MetricData.LabelsEntry\x12\x11\n\tmin_value\x18\t \x01(\x01\x12\x11\n\tmax_value\x18\n \x01(\x01\x12\x11\n\tavg_value\x18\x0b \x01(\x01\x12\x14\n\x0csample_count\x18\x0c \x01(\x04\x1a-\n\x0bLabelsEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12\r\n\x05value\x18\x02 \x01(\t:\x02\x38\x01\"\xef\x02\n\x07LogData\x12\x11\n\tlog_level\x18\x01 \x01(\t\x12\x0f\n\x07message\x18\x02 \x01(\t\x12\x13\n\x0bsource_file\x18\x03 \x01(\t\x12\x13\n\x0bline_number\x18\x04 \x01(\r\x12\x15\n\rfunction_name\x18\x05 \x01(\t\x12\x11\n\tthread_id\x18\x06 \x01(\t\x12\x14\n\x0cprocess_name\x18\x07 \x01(\t\x12.\n\x06\x66ields\x18\x08 \x03(\x0b\x32\x1e.messaging.LogData.FieldsEntry\x12\x16\n\x0e\x63orrelation_id\x18\t \x01(\t\x12\x10\n\x08trace_id\x18\n \x01(\t\x12\x14\n\x0c\x63ontains_pii\x18\x0b \x01(\x08\x12\x19\n\x11security_relevant\x18\x0c \x01(\x08\x12\x1c\n\x14\x65xtracted_indicators\x18\r \x03(\t\x1a-\n\x0b\x46ieldsEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12\r\n\x05value\x18\x02 \x01(\t:\x02\x38\x01\"\xf7\x02\n\tAlarmData\x12\x10\n\x08\x61larm_id\x18\x01 \x01(\t\x12\x12\n\nalarm_name\x18\x02 \x01(\t\x12\x12\n\nalarm_type\x18\x03 \x01(\t\x12\r\n\x05state\x18\x04 \x01(\t\x12\x13\n\x0b\x64\x65scription\x18\x05 \x01(\t\x12\r\n\x05\x63\x61use\x18\x06 \x01(\t\x12\x1a\n\x12recommended_action\x18\x07 \x01(\t\x12\x17\n\x0fthreshold_value\x18\x08 \x01(\x01\x12\x15\n\rcurrent_value\x18\t \x01(\x01\x12\x1a\n\x12threshold_operator\x18\n \x01(\t\x12\x15\n\ralarm_time_ns\x18\x0b \x01(\x04\x12\x13\n\x0b\x61\x63k_time_ns\x18\x0c \x01(\x04\x12\x15\n\rclear_time_ns\x18\r \x01(\x04\x12\x10\n\x08priority\x18\x0e \x01(\t\x12\x1c\n\x14\x61uto_acknowledgeable\x18\x0f \x01(\x08\x12\"\n\x1a\x65scalation_timeout_seconds\x18\x10 \x01(\r\"\xaa\x03\n\nStatusData\x12\x16\n\x0e\x63omponent_name\x18\x01 \x01(\t\x12\x0e\n\x06status\x18\x02 \x01(\t\x12\x17\n\x0fprevious_status\x18\x03 \x01(\t\x12\x1d\n\x15status_change_time_ns\x18\x04 \x01(\x04\x12\x14\n\x0chealth_score\x18\x05 \x01(\x02\x12\x15\n\rhealth_status\x18\x06 \x01(\t\x12\x19\n\x11\x63pu_usage_percent\x18\x07 \x01(\x02\x12\x1c\n\x14memory_usage_percent\x18\x08 \x01(\x02\x12\x1a\n\x12\x64isk_usage_percent\x18\t \x01(\x02\x12\x1a\n\x12network_usage_mbps\x18\n \x01(\x02\x12\x16\n\x0euptime_seconds\x18\x0b \x01(\x02\x12\x15\n\rrestart_count\x18\x0c \x01(\r\x12\x1c\n\x14last_restart_time_ns\x18\r \x01(\x04\x12\x18\n\x10response_time_ms\x18\x0e \x01(\x01\x12\x1b\n\x13requests_per_second\x18\x0f \x01(\x04\x12\x1a\n\x12\x65rror_rate_percent\x18\x10 \x01(\x02\"\xb2\x03\n\rSecurityEvent\x12\x16\n\x0e\x65vent_category\x18\x01 \x01(\t\x12\x14\n\x0c\x65vent_action\x18\x02 \x01(\t\x12\x15\n\revent_outcome\x18\x03 \x01(\t\x12\x0f\n\x07user_id\x18\x04 \x01(\t\x12\x11\n\tuser_name\x18\x05 \x01(\t\x12\x11\n\tsource_ip\x18\x06 \x01(\t\x12\x12\n\nuser_agent\x18\x07 \x01(\t\x12\x17\n\x0ftarget_resource\x18\x08 \x01(\t\x12\x13\n\x0btarget_type\x18\t \x01(\t\x12\x16\n\x0e\x61\x66\x66\x65\x63ted_asset\x18\n \x01(\t\x12\x35\n\x11threat_indicators\x18\x0b \x03(\x0b\x32\x1a.messaging.ThreatIndicator\x12\x12\n\nrisk_score\x18\x0c \x01(\x02\x12\x15\n\rattack_vector\x18\r \x01(\t\x12\x18\n\x10mitre_techniques\x18\x0e \x03(\t\x12\x18\n\x10response_actions\x18\x0f \x03(\t\x12\x1e\n\x16requires_investigation\x18\x10 \x01(\x08\x12\x15\n\ranalyst_notes\x18\x11 \x01(\t\"\x96\x03\n\nAuditEvent\x12\x16\n\x0e\x61udit_category\x18\x01 \x01(\t\x12\x18\n\x10\x61\x63tion_performed\x18\x02 \x01(\t\x12\x13\n\x0bobject_type\x18\x03 \x01(\t\x12\x11\n\tobject_id\x18\x04 \x01(\t\x12\x10\n\x08\x61\x63tor_id\x18\x05 \x01(\t\x12\x12\n\nactor_type\x18\x06 \x01(\t\x12\x12\n\nsession_id\x18\x07 \x01(\t\x12\x14\n\x0c\x62\x65\x66ore_value\x18\x08 \x01(\t\x12\x13\n\x0b\x61\x66ter_value\x18\t \x01(\t\x12\x16\n\x0e\x63hanged_fields\x18\n \x03(\t\x12\x1d\n\x15\x63ompliance_frameworks\x18\x0b \x03(\t\x12\x1a\n\x12retention_required\x18\x0c \x01(\x08\x12\x16\n\x0eretention_days\x18\r \x01(\r\x12\x15\n\rlegal_hold_id\x18\x0e \x01(\t\x12\x19\n\x11\x64igital_signature\x18\x0f \x01(\t\x12\x16\n\x0ehash_algorithm\x18\x10 \x01(\t\x12\x14\n\x0c\x63ontent_hash\x18\x11 \x01(\t\"\xc6\x01\n\x0fThreatIndicator\x12\x16\n\x0eindicator_type\x18\x01 \x01(\t\x12\x17\n\x0findicator_value\x18\x02 \x01(\t\x12\x13\n\x0bthreat_type\x18\x03 \x01(\t\x12\x12\n\nconfidence\x18\x04 \x01(\x02\x12\x0e\n\x06source\x18\x05 \x01(\t\x12\x15\n\rfirst_seen_ns\x18\x06 \x01(\x04\x12\x14\n\x0clast_seen_ns\x18\x07 \x01(\x04\x12\x1c\n\x14\x61ssociated_campaigns\x18\x08 \x03(\t\"\xbd\x04\n\x0fSecurityContext\x12\x1a\n\x12\x64\x65vice_trust_score\x18\x01 \x01(\x02\x12\x1d\n\x15\x61uthentication_method\x18\x02 \x01(\t\x12\x1f\n\x17\x63\x65rtificate_fingerprint\x18\x03 \x01(\t\x12\x19\n\x11\x63\x65rtificate_valid\x18\x04 \x01(\x08\x12\x14\n\x0cnetwork_zone\x18\x05 \x01(\t\x12\x17\n\x0fsecurity_groups\x18\x06 \x03(\t\x12\x19\n\x11\x65ncrypted_channel\x18\x07 \x01(\x08\x12\x1b\n\x13\x65ncryption_protocol\x18\x08 \x01(\t\x12\x13\n\x0bpermissions\x18\t \x03(\t\x12\x14\n\x0c\x61\x63\x63\x65ss_level\x18\n \x01(\t\x12\x19\n\x11privileged_access\x18\x0b \x01(\x08\x12\x17\n\x0f\x62\x65havior_normal\x18\x0c \x01(\x08\x12\x15\n\ranomaly_score\x18\r \x01(\x02\x12\x18\n\x10\x62\x65havioral_flags\x18\x0e \x03(\t\x12K\n\x11\x63ompliance_status\x18\x0f \x03(\x0b\x32\x30.messaging.SecurityContext.ComplianceStatusEntry\x12\x19\n\x11policy_violations\x18\x10 \x03(\t\x12\x1b\n\x13\x64\x61ta_classification\x18\x11 \x01(\t\x1a\x37\n\x15\x43omplianceStatusEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12\r\n\x05value\x18\x02 \x01(\x08:\x02\x38\x01\"\x81\x04\n\x0eTelemetryBatch\x12\x35\n\x11telemetry_records\x18\x01 \x03(\x0b\x32\x1a.messaging.DeviceTelemetry\x12\x1d\n\x15\x62\x61tch_sequence_number\x18\x02 \x01(\r\x12\x1b\n\x13\x62\x61tch_start_time_ns\x18\x03 \x01(\x04\x12\x19\n\x11\x62\x61tch_end_time_ns\x18\x04 \x01(\x04\x12\x15\n\ris_compressed\x18\x05 \x01(\x08\x12\x1d\n\x15\x63ompression_algorithm\x18\x06 \x01(\t\x12\x1b\n\x13original_size_bytes\x18\x07 \x01(\r\x12\x1d\n\x15\x63ompressed_size_bytes\x18\x08 \x01(\r\x12\x14\n\x0ctotal_events\x18\t \x01(\r\x12\x16\n\x0e\x64ropped_events\x18\n \x01(\r\x12\x1a\n\x12\x64\x61ta_quality_score\x18\x0b \x01(\x02\x12\x15\n\redge_agent_id\x18\x0c \x01(\t\x12\x15\n\redge_location\x18\r \x01(\t\x12\x42\n\redge_metadata\x18\x0e \x03(\x0b\x32+.messaging.TelemetryBatch.EdgeMetadataEntry\x1a\x33\n\x11\x45\x64geMetadataEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12\r\n\x05value\x18\x02 \x01(\t:\x02\x38\x01\"\x8e\x04\n\x11UniversalEnvelope\x12\x0f\n\x07version\x18\x01 \x01(\t\x12\r\n\x05ts_ns\x18\x02 \x01(\x04\x12\x17\n\x0fidempotency_key\x18\x03 \x01(\t\x12\"\n\x04\x66low\x18\x04 \x01(\x0b\x32\x14.messaging.FlowEvent\x12(\n\x07process\x18\x05 \x01(\x0b\x32\x17.messaging.ProcessEvent\x12\x34\n\x10\x64\x65vice_telemetry\x18\x06 \x01(\x0b\x32\x1a.messaging.DeviceTelemetry\x12\x32\n\x0ftelemetry_batch\x18\x07 \x01(\x0b\x32\x19.messaging.TelemetryBatch\x12\x0b\n\x03sig\x18\x08 \x01(\x0c\x12\x10\n\x08prev_sig\x18\t \x01(\x0c\x12\x19\n\x11signing_algorithm\x18\n \x01(\t\x12\x19\n\x11\x63\x65rtificate_chain\x18\x0b \x01(\t\x12\x10\n\x08priority\x18\x0c \x01(\t\x12\x18\n\x10processing_hints\x18\r \x03(\t\x12\x19\n\x11target_processors\x18\x0e \x01(\t\x12\x13\n\x0bretry_count\x18\x0f \x01(\r\x12\x1e\n\x16max_processing_time_ns\x18\x10 \x01(\x04\x12\x1f\n\x17requires_acknowledgment\x18\x11 \x01(\x08\x12\x16\n\x0eschema_version\x18\x12 \x01(\r\"\x9d\x03\n\x0cUniversalAck\x12.\n\x06status\x18\x01 \x01(\x0e\x32\x1e.messaging.UniversalAck.Status\x12\x0e\n\x06reason\x18\x02 \x01(\t\x12\x17\n\x0f\x62\x61\x63koff_hint_ms\x18\x03 \x01(\r\x12\x1e\n\x16processed_timestamp_ns\x18\x04 \x01(\x04\x12\x17\n\x0f\x65vents_accepted\x18\x05 \x01(\r\x12\x17\n\x0f\x65vents_rejected\x18\x06 \x01(\r\x12\x19\n\x11validation_errors\x18\x07 \x03(\t\x12\x14\n\x0c\x63urrent_load\x18\x08 \x01(\x02\x12\x13\n\x0bqueue_depth\x18\t \x01(\r\x12\"\n\x1aprocessing_rate_per_second\x18\n \x01(\r\"x\n\x06Status\x12\x06\n\x02OK\x10\x00\x12\t\n\x05RETRY\x10\x01\x12\x0b\n\x07INVALID\x10\x02\x12\x0c\n\x08OVERLOAD\x10\x03\x12\x12\n\x0eQUOTA_EXCEEDED\x10\x04\x12\x14\n\x10PROCESSING_ERROR\x10\x05\x12\x16\n\x12SECURITY_VIOLATION\x10\x06\"\x8b\x03\n\x12\x44\x65viceRegistration\x12\x11\n\tdevice_id\x18\x01 \x01(\t\x12+\n\x08metadata\x18\x02 \x01(\x0b\x32\x19.messaging.DeviceMetadata\x12\x1b\n\x13supported_protocols\x18\x03 \x03(\t\x12\x34\n\x0c\x63\x61pabilities\x18\x04 \x03(\x0b\x32\x1e.messaging.TelemetryCapability\x12\x1b\n\x13\x63\x65rtificate_request\x18\x05 \x01(\t\x12\x1a\n\x12\x64\x65vice_fingerprint\x18\x06 \x01(\t\x12\x1b\n\x13\x64iscovered_by_agent\x18\x07 \x01(\t\x12\x1e\n\x16\x64iscovery_timestamp_ns\x18\x08 \x01(\x04\x12\x18\n\x10\x64iscovery_method\x18\t \x01(\t\x12\x1e\n\x16\x64\x65ployment_environment\x18\n \x01(\t\x12\x1b\n\x13organizational_unit\x18\x0b \x01(\t\x12\x15\n\rdevice_groups\x18\x0c \x03(\t\"\x8b\x03\n\x13TelemetryCapability\x12\x10\n\x08protocol\x18\x01 \x01(\t\x12\x10\n\x08\x65ndpoint\x18\x02 \x01(\t\x12\x0c\n\x04port\x18\x03 \x01(\r\x12\x1d\n\x15supported_event_types\x18\x04 \x03(\t\x12\x1d\n\x15max_events_per_second\x18\x05 \x01(\r\x12\x12\n\nbatch_size\x18\x06 \x01(\r\x12K\n\x0fprotocol_config\x18\x07 \x03(\x0b\x32\x32.messaging.TelemetryCapability.ProtocolConfigEntry\x12\x19\n\x11reliability_level\x18\x08 \x01(\t\x12\x16\n\x0emax_latency_ms\x18\t \x01(\r\x12\x1c\n\x14supports_compression\x18\n \x01(\x08\x12\x1b\n\x13supports_encryption\x18\x0b \x01(\x08\x1a\x35\n\x13ProtocolConfigEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12\r\n\x05value\x18\x02 \x01(\t:\x02\x38\x01\"\xd8\x02\n\x1a\x44\x65viceRegistrationResponse\x12\x10\n\x08\x61\x63\x63\x65pted\x18\x01 \x01(\x08\x12\x11\n\tdevice_id\x18\x02 \x01(\t\x12\x13\n\x0b\x63\x65rtificate\x18\x03 \x01(\t\x12\x16\n\x0e\x63\x61_certificate\x18\x04 \x01(\t\x12\x38\n\x13\x63ollection_policies\x18\x05 \x03(\x0b\x32\x1b.messaging.CollectionPolicy\x12\"\n\x1aheartbeat_interval_seconds\x18\x06 \x01(\r\x12\x19\n\x11\x61ssigned_agent_id\x18\x07 \x01(\t\x12\x19\n\x11\x61llowed_protocols\x18\x08 \x03(\t\x12\x1f\n\x17\x65ncryption_requirements\x18\t \x01(\t\x12\x19\n\x11security_policies\x18\n \x03(\t\x12\x18\n\x10rejection_reason\x18\x0b \x01(\t\"\xc4\x03\n\x10\x43ollectionPolicy\x12\x11\n\tpolicy_id\x18\x01 \x01(\t\x12\x1b\n\x13\x64\x65vice_type_pattern\x18\x02 \x01(\t\x12\x10\n\x08protocol\x18\x03 \x01(\t\x12#\n\x1b\x63ollection_interval_seconds\x18\x04 \x01(\r\x12\x1b\n\x13\x61llowed_event_types\x18\x05 \x03(\t\x12\x1b\n\x13\x62locked_event_types\x18\x06 \x03(\t\x12\x17\n\x0fseverity_filter\x18\x07 \x01(\t\x12\x1a\n\x12\x65nable_compression\x18\x08 \x01(\x08\x12\x12\n\nbatch_size\x18\t \x01(\r\x12\x1d\n\x15max_batch_age_seconds\x18\n \x01(\r\x12\x16\n\x0emax_error_rate\x18\x0b \x01(\x02\x12\x1a\n\x12max_retry_attempts\x18\x0c \x01(\r\x12\x1e\n\x16\x65nable_local_buffering\x18\r \x01(\x08\x12\x1b\n\x13pii_scrubbing_rules\x18\x0e \x03(\t\x12\x17\n\x0f\x63ompliance_tags\x18\x0f \x03(\t\x12\x1d\n\x15\x64\x61ta_retention_policy\x18\x10 \x01(\t\"w\n\x14\x44\x65viceDeregistration\x12\x11\n\tdevice_id\x18\x01 \x01(\t\x12\x0e\n\x06reason\x18\x02 \x01(\t\x12#\n\x1b\x64\x65registration_timestamp_ns\x18\x03 \x01(\x04\x12\x17\n\x0f\x64\x65registered_by\x18\x04 \x01(\t\"g\n\x1c\x44\x65viceDeregistrationResponse\x12\x10\n\x08\x61\x63\x63\x65pted\x18\x01 \x01(\x08\x12\x0e\n\x06reason\x18\x02 \x01(\t\x12%\n\x1d\x66inal_data_retention_until_ns\x18\x03 \x01(\x04\"#\n\rHealthRequest\x12\x12\n\ncomponents\x18\x01 \x03(\t\"\xdc\x01\n\x0eHealthResponse\x12\x16\n\x0eoverall_status\x18\x01 \x01(\t\x12H\n\x10\x63omponent_health\x18\x02 \x03(\x0b\x32..messaging.HealthResponse.ComponentHealthEntry\x12\x14\n\x0ctimestamp_ns\x18\x03 \x01(\x04\x1aR\n\x14\x43omponentHealthEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12)\n\x05value\x18\x02 \x01(\x0b\x32\x1a.messaging.ComponentHealth:\x02\x38\x01\"\xb3\x01\n\x0f\x43omponentHealth\x12\x0e\n\x06status\x18\x01 \x01(\t\x12\x0f\n\x07message\x18\x02 \x01(\t\x12\x38\n\x07metrics\x18\x03 \x03(\x0b\x32\'.messaging.ComponentHealth.MetricsEntry\x12\x15\n\rlast_check_ns\x18\x04 \x01(\x04\x1a.\n\x0cMetricsEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12\r\n\x05value\x18\x02 \x01(\t:\x02\x38\x01\"F\n\rStatusRequest\x12\x17\n\x0finclude_metrics\x18\x01 \x01(\x08\x12\x1c\n\x14include_device_count\x18\x02 \x01(\x08\"\xac\x02\n\x0eStatusResponse\x12\x17\n\x0fservice_version\x18\x01 \x01(\t\x12\x16\n\x0euptime_seconds\x18\x02 \x01(\x04\x12\x19\n\x11\x63onnected_devices\x18\x03 \x01(\r\x12\x1e\n\x16total_events_processed\x18\x04 \x01(\x04\x12\x19\n\x11\x65vents_per_second\x18\x05 \x01(\x04\x12\x14\n\x0c\x63urrent_load\x18\x06 \x01(\x02\x12\x46\n\x0fservice_metrics\x18\x07 \x03(\x0b\x32-.messaging.StatusResponse.ServiceMetricsEntry\x1a\x35\n\x13ServiceMetricsEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12\r\n\x05value\x18\x02 \x01(\t:\x02\x38\x01\"R\n\x0eMetricsRequest\x12\x14\n\x0cmetric_names\x18\x01 \x03(\t\x12\x15\n\rstart_time_ns\x18\x02 \x01(\x04\x12\x13\n\x0b\x65nd_time_ns\x18\x03 \x01(\x04\"`\n\x0fMetricsResponse\x12,\n\x07metrics\x18\x04 \x03(\x0b\x32\x1b.messaging.MetricTimeSeries\x12\x1f\n\x17\x63ollection_timestamp_ns\x18\x05 \x01(\x04\"\xc0\x01\n\x10MetricTimeSeries\x12\x13\n\x0bmetric_name\x18\x01 \x01(\t\x12/\n\x0b\x64\x61ta_points\x18\x02 \x03(\x0b\x32\x1a.messaging.MetricDataPoint\x12\x37\n\x06labels\x18\x03 \x03(\x0b\x32\'.messaging.MetricTimeSeries.LabelsEntry\x1a-\n\x0bLabelsEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12\r\n\x05value\x18\x02 \x01(\t:\x02\x38\x01\"6\n\x0fMetricDataPoint\x12\x14\n\x0ctimestamp_ns\x18\x01 \x01(\x04\x12\r\n\x05value\x18\x02 \x01(\x01\x32\xae\x05\n\x11UniversalEventBus\x12\x35\n\x07Publish\x12\x13.messaging.Envelope\x1a\x15.messaging.PublishAck\x12I\n\x10PublishTelemetry\x12\x1c.messaging.UniversalEnvelope\x1a\x17.messaging.UniversalAck\x12\x42\n\x0cPublishBatch\x12\x19.messaging.TelemetryBatch\x1a\x17.messaging.UniversalAck\x12V\n\x0eRegisterDevice\x12\x1d.messaging.DeviceRegistration\x1a%.messaging.DeviceRegistrationResponse\x12T\n\x0cUpdateDevice\x12\x1d.messaging.DeviceRegistration\x1a%.messaging.DeviceRegistrationResponse\x12\\\n\x10\x44\x65registerDevice\x12\x1f.messaging.DeviceDeregistration\x1a\'.messaging.DeviceDeregistrationResponse\x12@\n\tGetHealth\x12\x18.messaging.HealthRequest\x1a\x19.messaging.HealthResponse\x12@\n\tGetStatus\x12\x18.messaging.StatusRequest\x1a\x19.messaging.StatusResponse\x12\x43\n\nGetMetrics\x12\x19.messaging.MetricsRequest\x1a\x1a.messaging.MetricsResponseb\x06proto3')
+DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x19universal_telemetry.proto\x12\tmessaging\x1a\x16messaging_schema.proto\"\xe7\x03\n\x0f\x44\x65viceTelemetry\x12\x11\n\tdevice_id\x18\x01 \x01(\t\x12\x13\n\x0b\x64\x65vice_type\x18\x02 \x01(\t\x12\x10\n\x08protocol\x18\x03 \x01(\t\x12+\n\x08metadata\x18\x04 \x01(\x0b\x32\x19.messaging.DeviceMetadata\x12)\n\x06\x65vents\x18\x05 \x03(\x0b\x32\x19.messaging.TelemetryEvent\x12,\n\x08security\x18\x06 \x01(\x0b\x32\x1a.messaging.SecurityContext\x12\x14\n\x0ctimestamp_ns\x18\x07 \x01(\x04\x12\x18\n\x10\x63ollection_agent\x18\x08 \x01(\t\x12\x15\n\ragent_version\x18\t \x01(\t\x12\x15\n\ris_compressed\x18\n \x01(\x08\x12\x1d\n\x15\x63ompression_algorithm\x18\x0b \x01(\t\x12\x12\n\nbatch_size\x18\x0c \x01(\r\x12\x1e\n\x16\x63ollection_interval_ms\x18\r \x01(\x04\x12\x16\n\x0eschema_version\x18\x0e \x01(\r\x12\x30\n\x0c\x63\x61pabilities\x18\x0f \x03(\x0b\x32\x1a.messaging.AgentCapability\x12\x19\n\x11\x61gent_bus_version\x18\x10 \x01(\t\"\x87\x05\n\x0e\x44\x65viceMetadata\x12\x14\n\x0cmanufacturer\x18\x01 \x01(\t\x12\r\n\x05model\x18\x02 \x01(\t\x12\x18\n\x10\x66irmware_version\x18\x03 \x01(\t\x12\x18\n\x10hardware_version\x18\x04 \x01(\t\x12\x15\n\rserial_number\x18\x05 \x01(\t\x12\x12\n\nip_address\x18\x06 \x01(\t\x12\x13\n\x0bmac_address\x18\x07 \x01(\t\x12\x0e\n\x06subnet\x18\x08 \x01(\t\x12\x0f\n\x07vlan_id\x18\t \x01(\t\x12\x11\n\tprotocols\x18\n \x03(\t\x12\x12\n\nopen_ports\x18\x0b \x03(\r\x12\x41\n\x0c\x63\x61pabilities\x18\x0c \x03(\x0b\x32+.messaging.DeviceMetadata.CapabilitiesEntry\x12\x19\n\x11physical_location\x18\r \x01(\t\x12\x12\n\ndepartment\x18\x0e \x01(\t\x12\x11\n\tasset_tag\x18\x0f \x01(\t\x12\x1d\n\x15\x63ompliance_frameworks\x18\x10 \x03(\t\x12\x1b\n\x13vulnerability_score\x18\x11 \x01(\x02\x12\x19\n\x11\x63riticality_level\x18\x12 \x01(\t\x12J\n\x11\x63ustom_properties\x18\x13 \x03(\x0b\x32/.messaging.DeviceMetadata.CustomPropertiesEntry\x1a\x33\n\x11\x43\x61pabilitiesEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12\r\n\x05value\x18\x02 \x01(\t:\x02\x38\x01\x1a\x37\n\x15\x43ustomPropertiesEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12\r\n\x05value\x18\x02 \x01(\t:\x02\x38\x01\"=\n\x0f\x41gentCapability\x12\x0c\n\x04name\x18\x01 \x01(\t\x12\r\n\x05\x62\x61\x64ge\x18\x02 \x01(\t\x12\r\n\x05notes\x18\x03 \x01(\t\"\xac\x06\n\x0eTelemetryEvent\x12\x10\n\x08\x65vent_id\x18\x01 \x01(\t\x12\x12\n\nevent_type\x18\x02 \x01(\t\x12\x10\n\x08severity\x18\x03 \x01(\t\x12\x1a\n\x12\x65vent_timestamp_ns\x18\x04 \x01(\x04\x12*\n\x0bmetric_data\x18\x05 \x01(\x0b\x32\x15.messaging.MetricData\x12$\n\x08log_data\x18\x06 \x01(\x0b\x32\x12.messaging.LogData\x12(\n\nalarm_data\x18\x07 \x01(\x0b\x32\x14.messaging.AlarmData\x12*\n\x0bstatus_data\x18\x08 \x01(\x0b\x32\x15.messaging.StatusData\x12\x30\n\x0esecurity_event\x18\t \x01(\x0b\x32\x18.messaging.SecurityEvent\x12*\n\x0b\x61udit_event\x18\n \x01(\x0b\x32\x15.messaging.AuditEvent\x12\x0c\n\x04tags\x18\x0b \x03(\t\x12=\n\nattributes\x18\x0c \x03(\x0b\x32).messaging.TelemetryEvent.AttributesEntry\x12\x18\n\x10source_component\x18\r \x01(\t\x12\x18\n\x10\x63onfidence_score\x18\x0e \x01(\x02\x12\x14\n\x0cis_synthetic\x18\x0f \x01(\x08\x12\x13\n\x0bretry_count\x18\x10 \x01(\r\x12\x19\n\x11reliability_score\x18\x11 \x01(\x02\x12\x17\n\x0f\x64rift_indicator\x18\x12 \x01(\t\x12\x10\n\x08\x61gent_id\x18\x13 \x01(\t\x12\x19\n\x11\x63orrelation_group\x18\x14 \x01(\t\x12\x19\n\x11related_event_ids\x18\x15 \x03(\t\x12\x19\n\x11\x64\x65tection_rule_id\x18\x16 \x01(\t\x12\x1d\n\x15\x64\x65tection_rule_source\x18\x17 \x01(\t\x12\x13\n\x0bprobe_class\x18\x18 \x01(\t\x12\x16\n\x0eprobe_maturity\x18\x19 \x01(\t\x1a\x31\n\x0f\x41ttributesEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12\r\n\x05value\x18\x02 \x01(\t:\x02\x38\x01\"\xcf\x02\n\nMetricData\x12\x13\n\x0bmetric_name\x18\x01 \x01(\t\x12\x13\n\x0bmetric_type\x18\x02 \x01(\t\x12\x15\n\rnumeric_value\x18\x03 \x01(\x01\x12\x14\n\x0cstring_value\x18\x04 \x01(\t\x12\x15\n\rboolean_value\x18\x05 \x01(\x08\x12\x14\n\x0c\x62inary_value\x18\x06 \x01(\x0c\x12\x0c\n\x04unit\x18\x07 \x01(\t\x12\x31\n\x06labels\x18\x08 \x03(\x0b\x32!.messaging.MetricData.LabelsEntry\x12\x11\n\tmin_value\x18\t \x01(\x01\x12\x11\n\tmax_value\x18\n \x01(\x01\x12\x11\n\tavg_value\x18\x0b \x01(\x01\x12\x14\n\x0csample_count\x18\x0c \x01(\x04\x1a-\n\x0bLabelsEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12\r\n\x05value\x18\x02 \x01(\t:\x02\x38\x01\"\xef\x02\n\x07LogData\x12\x11\n\tlog_level\x18\x01 \x01(\t\x12\x0f\n\x07message\x18\x02 \x01(\t\x12\x13\n\x0bsource_file\x18\x03 \x01(\t\x12\x13\n\x0bline_number\x18\x04 \x01(\r\x12\x15\n\rfunction_name\x18\x05 \x01(\t\x12\x11\n\tthread_id\x18\x06 \x01(\t\x12\x14\n\x0cprocess_name\x18\x07 \x01(\t\x12.\n\x06\x66ields\x18\x08 \x03(\x0b\x32\x1e.messaging.LogData.FieldsEntry\x12\x16\n\x0e\x63orrelation_id\x18\t \x01(\t\x12\x10\n\x08trace_id\x18\n \x01(\t\x12\x14\n\x0c\x63ontains_pii\x18\x0b \x01(\x08\x12\x19\n\x11security_relevant\x18\x0c \x01(\x08\x12\x1c\n\x14\x65xtracted_indicators\x18\r \x03(\t\x1a-\n\x0b\x46ieldsEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12\r\n\x05value\x18\x02 \x01(\t:\x02\x38\x01\"\xf7\x02\n\tAlarmData\x12\x10\n\x08\x61larm_id\x18\x01 \x01(\t\x12\x12\n\nalarm_name\x18\x02 \x01(\t\x12\x12\n\nalarm_type\x18\x03 \x01(\t\x12\r\n\x05state\x18\x04 \x01(\t\x12\x13\n\x0b\x64\x65scription\x18\x05 \x01(\t\x12\r\n\x05\x63\x61use\x18\x06 \x01(\t\x12\x1a\n\x12recommended_action\x18\x07 \x01(\t\x12\x17\n\x0fthreshold_value\x18\x08 \x01(\x01\x12\x15\n\rcurrent_value\x18\t \x01(\x01\x12\x1a\n\x12threshold_operator\x18\n \x01(\t\x12\x15\n\ralarm_time_ns\x18\x0b \x01(\x04\x12\x13\n\x0b\x61\x63k_time_ns\x18\x0c \x01(\x04\x12\x15\n\rclear_time_ns\x18\r \x01(\x04\x12\x10\n\x08priority\x18\x0e \x01(\t\x12\x1c\n\x14\x61uto_acknowledgeable\x18\x0f \x01(\x08\x12\"\n\x1a\x65scalation_timeout_seconds\x18\x10 \x01(\r\"\xaa\x03\n\nStatusData\x12\x16\n\x0e\x63omponent_name\x18\x01 \x01(\t\x12\x0e\n\x06status\x18\x02 \x01(\t\x12\x17\n\x0fprevious_status\x18\x03 \x01(\t\x12\x1d\n\x15status_change_time_ns\x18\x04 \x01(\x04\x12\x14\n\x0chealth_score\x18\x05 \x01(\x02\x12\x15\n\rhealth_status\x18\x06 \x01(\t\x12\x19\n\x11\x63pu_usage_percent\x18\x07 \x01(\x02\x12\x1c\n\x14memory_usage_percent\x18\x08 \x01(\x02\x12\x1a\n\x12\x64isk_usage_percent\x18\t \x01(\x02\x12\x1a\n\x12network_usage_mbps\x18\n \x01(\x02\x12\x16\n\x0euptime_seconds\x18\x0b \x01(\x02\x12\x15\n\rrestart_count\x18\x0c \x01(\r\x12\x1c\n\x14last_restart_time_ns\x18\r \x01(\x04\x12\x18\n\x10response_time_ms\x18\x0e \x01(\x01\x12\x1b\n\x13requests_per_second\x18\x0f \x01(\x04\x12\x1a\n\x12\x65rror_rate_percent\x18\x10 \x01(\x02\"\xb2\x03\n\rSecurityEvent\x12\x16\n\x0e\x65vent_category\x18\x01 \x01(\t\x12\x14\n\x0c\x65vent_action\x18\x02 \x01(\t\x12\x15\n\revent_outcome\x18\x03 \x01(\t\x12\x0f\n\x07user_id\x18\x04 \x01(\t\x12\x11\n\tuser_name\x18\x05 \x01(\t\x12\x11\n\tsource_ip\x18\x06 \x01(\t\x12\x12\n\nuser_agent\x18\x07 \x01(\t\x12\x17\n\x0ftarget_resource\x18\x08 \x01(\t\x12\x13\n\x0btarget_type\x18\t \x01(\t\x12\x16\n\x0e\x61\x66\x66\x65\x63ted_asset\x18\n \x01(\t\x12\x35\n\x11threat_indicators\x18\x0b \x03(\x0b\x32\x1a.messaging.ThreatIndicator\x12\x12\n\nrisk_score\x18\x0c \x01(\x02\x12\x15\n\rattack_vector\x18\r \x01(\t\x12\x18\n\x10mitre_techniques\x18\x0e \x03(\t\x12\x18\n\x10response_actions\x18\x0f \x03(\t\x12\x1e\n\x16requires_investigation\x18\x10 \x01(\x08\x12\x15\n\ranalyst_notes\x18\x11 \x01(\t\"\x96\x03\n\nAuditEvent\x12\x16\n\x0e\x61udit_category\x18\x01 \x01(\t\x12\x18\n\x10\x61\x63tion_performed\x18\x02 \x01(\t\x12\x13\n\x0bobject_type\x18\x03 \x01(\t\x12\x11\n\tobject_id\x18\x04 \x01(\t\x12\x10\n\x08\x61\x63tor_id\x18\x05 \x01(\t\x12\x12\n\nactor_type\x18\x06 \x01(\t\x12\x12\n\nsession_id\x18\x07 \x01(\t\x12\x14\n\x0c\x62\x65\x66ore_value\x18\x08 \x01(\t\x12\x13\n\x0b\x61\x66ter_value\x18\t \x01(\t\x12\x16\n\x0e\x63hanged_fields\x18\n \x03(\t\x12\x1d\n\x15\x63ompliance_frameworks\x18\x0b \x03(\t\x12\x1a\n\x12retention_required\x18\x0c \x01(\x08\x12\x16\n\x0eretention_days\x18\r \x01(\r\x12\x15\n\rlegal_hold_id\x18\x0e \x01(\t\x12\x19\n\x11\x64igital_signature\x18\x0f \x01(\t\x12\x16\n\x0ehash_algorithm\x18\x10 \x01(\t\x12\x14\n\x0c\x63ontent_hash\x18\x11 \x01(\t\"\xc6\x01\n\x0fThreatIndicator\x12\x16\n\x0eindicator_type\x18\x01 \x01(\t\x12\x17\n\x0findicator_value\x18\x02 \x01(\t\x12\x13\n\x0bthreat_type\x18\x03 \x01(\t\x12\x12\n\nconfidence\x18\x04 \x01(\x02\x12\x0e\n\x06source\x18\x05 \x01(\t\x12\x15\n\rfirst_seen_ns\x18\x06 \x01(\x04\x12\x14\n\x0clast_seen_ns\x18\x07 \x01(\x04\x12\x1c\n\x14\x61ssociated_campaigns\x18\x08 \x03(\t\"\xbd\x04\n\x0fSecurityContext\x12\x1a\n\x12\x64\x65vice_trust_score\x18\x01 \x01(\x02\x12\x1d\n\x15\x61uthentication_method\x18\x02 \x01(\t\x12\x1f\n\x17\x63\x65rtificate_fingerprint\x18\x03 \x01(\t\x12\x19\n\x11\x63\x65rtificate_valid\x18\x04 \x01(\x08\x12\x14\n\x0cnetwork_zone\x18\x05 \x01(\t\x12\x17\n\x0fsecurity_groups\x18\x06 \x03(\t\x12\x19\n\x11\x65ncrypted_channel\x18\x07 \x01(\x08\x12\x1b\n\x13\x65ncryption_protocol\x18\x08 \x01(\t\x12\x13\n\x0bpermissions\x18\t \x03(\t\x12\x14\n\x0c\x61\x63\x63\x65ss_level\x18\n \x01(\t\x12\x19\n\x11privileged_access\x18\x0b \x01(\x08\x12\x17\n\x0f\x62\x65havior_normal\x18\x0c \x01(\x08\x12\x15\n\ranomaly_score\x18\r \x01(\x02\x12\x18\n\x10\x62\x65havioral_flags\x18\x0e \x03(\t\x12K\n\x11\x63ompliance_status\x18\x0f \x03(\x0b\x32\x30.messaging.SecurityContext.ComplianceStatusEntry\x12\x19\n\x11policy_violations\x18\x10 \x03(\t\x12\x1b\n\x13\x64\x61ta_classification\x18\x11 \x01(\t\x1a\x37\n\x15\x43omplianceStatusEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12\r\n\x05value\x18\x02 \x01(\x08:\x02\x38\x01\"\xb2\x04\n\x0eTelemetryBatch\x12\x35\n\x11telemetry_records\x18\x01 \x03(\x0b\x32\x1a.messaging.DeviceTelemetry\x12\x1d\n\x15\x62\x61tch_sequence_number\x18\x02 \x01(\r\x12\x1b\n\x13\x62\x61tch_start_time_ns\x18\x03 \x01(\x04\x12\x19\n\x11\x62\x61tch_end_time_ns\x18\x04 \x01(\x04\x12\x15\n\ris_compressed\x18\x05 \x01(\x08\x12\x1d\n\x15\x63ompression_algorithm\x18\x06 \x01(\t\x12\x1b\n\x13original_size_bytes\x18\x07 \x01(\r\x12\x1d\n\x15\x63ompressed_size_bytes\x18\x08 \x01(\r\x12\x14\n\x0ctotal_events\x18\t \x01(\r\x12\x16\n\x0e\x64ropped_events\x18\n \x01(\r\x12\x1a\n\x12\x64\x61ta_quality_score\x18\x0b \x01(\x02\x12\x15\n\redge_agent_id\x18\x0c \x01(\t\x12\x15\n\redge_location\x18\r \x01(\t\x12\x42\n\redge_metadata\x18\x0e \x03(\x0b\x32+.messaging.TelemetryBatch.EdgeMetadataEntry\x12/\n\tenvelopes\x18\x0f \x03(\x0b\x32\x1c.messaging.UniversalEnvelope\x1a\x33\n\x11\x45\x64geMetadataEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12\r\n\x05value\x18\x02 \x01(\t:\x02\x38\x01\"\x8e\x04\n\x11UniversalEnvelope\x12\x0f\n\x07version\x18\x01 \x01(\t\x12\r\n\x05ts_ns\x18\x02 \x01(\x04\x12\x17\n\x0fidempotency_key\x18\x03 \x01(\t\x12\"\n\x04\x66low\x18\x04 \x01(\x0b\x32\x14.messaging.FlowEvent\x12(\n\x07process\x18\x05 \x01(\x0b\x32\x17.messaging.ProcessEvent\x12\x34\n\x10\x64\x65vice_telemetry\x18\x06 \x01(\x0b\x32\x1a.messaging.DeviceTelemetry\x12\x32\n\x0ftelemetry_batch\x18\x07 \x01(\x0b\x32\x19.messaging.TelemetryBatch\x12\x0b\n\x03sig\x18\x08 \x01(\x0c\x12\x10\n\x08prev_sig\x18\t \x01(\x0c\x12\x19\n\x11signing_algorithm\x18\n \x01(\t\x12\x19\n\x11\x63\x65rtificate_chain\x18\x0b \x01(\t\x12\x10\n\x08priority\x18\x0c \x01(\t\x12\x18\n\x10processing_hints\x18\r \x03(\t\x12\x19\n\x11target_processors\x18\x0e \x01(\t\x12\x13\n\x0bretry_count\x18\x0f \x01(\r\x12\x1e\n\x16max_processing_time_ns\x18\x10 \x01(\x04\x12\x1f\n\x17requires_acknowledgment\x18\x11 \x01(\x08\x12\x16\n\x0eschema_version\x18\x12 \x01(\r\"\xcd\x03\n\x0cUniversalAck\x12.\n\x06status\x18\x01 \x01(\x0e\x32\x1e.messaging.UniversalAck.Status\x12\x0e\n\x06reason\x18\x02 \x01(\t\x12\x17\n\x0f\x62\x61\x63koff_hint_ms\x18\x03 \x01(\r\x12\x1e\n\x16processed_timestamp_ns\x18\x04 \x01(\x04\x12\x17\n\x0f\x65vents_accepted\x18\x05 \x01(\r\x12\x17\n\x0f\x65vents_rejected\x18\x06 \x01(\r\x12\x19\n\x11validation_errors\x18\x07 \x03(\t\x12\x14\n\x0c\x63urrent_load\x18\x08 \x01(\x02\x12\x13\n\x0bqueue_depth\x18\t \x01(\r\x12\"\n\x1aprocessing_rate_per_second\x18\n \x01(\r\x12.\n\renvelope_acks\x18\x0b \x03(\x0b\x32\x17.messaging.UniversalAck\"x\n\x06Status\x12\x06\n\x02OK\x10\x00\x12\t\n\x05RETRY\x10\x01\x12\x0b\n\x07INVALID\x10\x02\x12\x0c\n\x08OVERLOAD\x10\x03\x12\x12\n\x0eQUOTA_EXCEEDED\x10\x04\x12\x14\n\x10PROCESSING_ERROR\x10\x05\x12\x16\n\x12SECURITY_VIOLATION\x10\x06\"\x8b\x03\n\x12\x44\x65viceRegistration\x12\x11\n\tdevice_id\x18\x01 \x01(\t\x12+\n\x08metadata\x18\x02 \x01(\x0b\x32\x19.messaging.DeviceMetadata\x12\x1b\n\x13supported_protocols\x18\x03 \x03(\t\x12\x34\n\x0c\x63\x61pabilities\x18\x04 \x03(\x0b\x32\x1e.messaging.TelemetryCapability\x12\x1b\n\x13\x63\x65rtificate_request\x18\x05 \x01(\t\x12\x1a\n\x12\x64\x65vice_fingerprint\x18\x06 \x01(\t\x12\x1b\n\x13\x64iscovered_by_agent\x18\x07 \x01(\t\x12\x1e\n\x16\x64iscovery_timestamp_ns\x18\x08 \x01(\x04\x12\x18\n\x10\x64iscovery_method\x18\t \x01(\t\x12\x1e\n\x16\x64\x65ployment_environment\x18\n \x01(\t\x12\x1b\n\x13organizational_unit\x18\x0b \x01(\t\x12\x15\n\rdevice_groups\x18\x0c \x03(\t\"\x8b\x03\n\x13TelemetryCapability\x12\x10\n\x08protocol\x18\x01 \x01(\t\x12\x10\n\x08\x65ndpoint\x18\x02 \x01(\t\x12\x0c\n\x04port\x18\x03 \x01(\r\x12\x1d\n\x15supported_event_types\x18\x04 \x03(\t\x12\x1d\n\x15max_events_per_second\x18\x05 \x01(\r\x12\x12\n\nbatch_size\x18\x06 \x01(\r\x12K\n\x0fprotocol_config\x18\x07 \x03(\x0b\x32\x32.messaging.TelemetryCapability.ProtocolConfigEntry\x12\x19\n\x11reliability_level\x18\x08 \x01(\t\x12\x16\n\x0emax_latency_ms\x18\t \x01(\r\x12\x1c\n\x14supports_compression\x18\n \x01(\x08\x12\x1b\n\x13supports_encryption\x18\x0b \x01(\x08\x1a\x35\n\x13ProtocolConfigEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12\r\n\x05value\x18\x02 \x01(\t:\x02\x38\x01\"\xd8\x02\n\x1a\x44\x65viceRegistrationResponse\x12\x10\n\x08\x61\x63\x63\x65pted\x18\x01 \x01(\x08\x12\x11\n\tdevice_id\x18\x02 \x01(\t\x12\x13\n\x0b\x63\x65rtificate\x18\x03 \x01(\t\x12\x16\n\x0e\x63\x61_certificate\x18\x04 \x01(\t\x12\x38\n\x13\x63ollection_policies\x18\x05 \x03(\x0b\x32\x1b.messaging.CollectionPolicy\x12\"\n\x1aheartbeat_interval_seconds\x18\x06 \x01(\r\x12\x19\n\x11\x61ssigned_agent_id\x18\x07 \x01(\t\x12\x19\n\x11\x61llowed_protocols\x18\x08 \x03(\t\x12\x1f\n\x17\x65ncryption_requirements\x18\t \x01(\t\x12\x19\n\x11security_policies\x18\n \x03(\t\x12\x18\n\x10rejection_reason\x18\x0b \x01(\t\"\xc4\x03\n\x10\x43ollectionPolicy\x12\x11\n\tpolicy_id\x18\x01 \x01(\t\x12\x1b\n\x13\x64\x65vice_type_pattern\x18\x02 \x01(\t\x12\x10\n\x08protocol\x18\x03 \x01(\t\x12#\n\x1b\x63ollection_interval_seconds\x18\x04 \x01(\r\x12\x1b\n\x13\x61llowed_event_types\x18\x05 \x03(\t\x12\x1b\n\x13\x62locked_event_types\x18\x06 \x03(\t\x12\x17\n\x0fseverity_filter\x18\x07 \x01(\t\x12\x1a\n\x12\x65nable_compression\x18\x08 \x01(\x08\x12\x12\n\nbatch_size\x18\t \x01(\r\x12\x1d\n\x15max_batch_age_seconds\x18\n \x01(\r\x12\x16\n\x0emax_error_rate\x18\x0b \x01(\x02\x12\x1a\n\x12max_retry_attempts\x18\x0c \x01(\r\x12\x1e\n\x16\x65nable_local_buffering\x18\r \x01(\x08\x12\x1b\n\x13pii_scrubbing_rules\x18\x0e \x03(\t\x12\x17\n\x0f\x63ompliance_tags\x18\x0f \x03(\t\x12\x1d\n\x15\x64\x61ta_retention_policy\x18\x10 \x01(\t\"w\n\x14\x44\x65viceDeregistration\x12\x11\n\tdevice_id\x18\x01 \x01(\t\x12\x0e\n\x06reason\x18\x02 \x01(\t\x12#\n\x1b\x64\x65registration_timestamp_ns\x18\x03 \x01(\x04\x12\x17\n\x0f\x64\x65registered_by\x18\x04 \x01(\t\"g\n\x1c\x44\x65viceDeregistrationResponse\x12\x10\n\x08\x61\x63\x63\x65pted\x18\x01 \x01(\x08\x12\x0e\n\x06reason\x18\x02 \x01(\t\x12%\n\x1d\x66inal_data_retention_until_ns\x18\x03 \x01(\x04\"#\n\rHealthRequest\x12\x12\n\ncomponents\x18\x01 \x03(\t\"\xdc\x01\n\x0eHealthResponse\x12\x16\n\x0eoverall_status\x18\x01 \x01(\t\x12H\n\x10\x63omponent_health\x18\x02 \x03(\x0b\x32..messaging.HealthResponse.ComponentHealthEntry\x12\x14\n\x0ctimestamp_ns\x18\x03 \x01(\x04\x1aR\n\x14\x43omponentHealthEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12)\n\x05value\x18\x02 \x01(\x0b\x32\x1a.messaging.ComponentHealth:\x02\x38\x01\"\xb3\x01\n\x0f\x43omponentHealth\x12\x0e\n\x06status\x18\x01 \x01(\t\x12\x0f\n\x07message\x18\x02 \x01(\t\x12\x38\n\x07metrics\x18\x03 \x03(\x0b\x32\'.messaging.ComponentHealth.MetricsEntry\x12\x15\n\rlast_check_ns\x18\x04 \x01(\x04\x1a.\n\x0cMetricsEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12\r\n\x05value\x18\x02 \x01(\t:\x02\x38\x01\"F\n\rStatusRequest\x12\x17\n\x0finclude_metrics\x18\x01 \x01(\x08\x12\x1c\n\x14include_device_count\x18\x02 \x01(\x08\"\xac\x02\n\x0eStatusResponse\x12\x17\n\x0fservice_version\x18\x01 \x01(\t\x12\x16\n\x0euptime_seconds\x18\x02 \x01(\x04\x12\x19\n\x11\x63onnected_devices\x18\x03 \x01(\r\x12\x1e\n\x16total_events_processed\x18\x04 \x01(\x04\x12\x19\n\x11\x65vents_per_second\x18\x05 \x01(\x04\x12\x14\n\x0c\x63urrent_load\x18\x06 \x01(\x02\x12\x46\n\x0fservice_metrics\x18\x07 \x03(\x0b\x32-.messaging.StatusResponse.ServiceMetricsEntry\x1a\x35\n\x13ServiceMetricsEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12\r\n\x05value\x18\x02 \x01(\t:\x02\x38\x01\"R\n\x0eMetricsRequest\x12\x14\n\x0cmetric_names\x18\x01 \x03(\t\x12\x15\n\rstart_time_ns\x18\x02 \x01(\x04\x12\x13\n\x0b\x65nd_time_ns\x18\x03 \x01(\x04\"`\n\x0fMetricsResponse\x12,\n\x07metrics\x18\x04 \x03(\x0b\x32\x1b.messaging.MetricTimeSeries\x12\x1f\n\x17\x63ollection_timestamp_ns\x18\x05 \x01(\x04\"\xc0\x01\n\x10MetricTimeSeries\x12\x13\n\x0bmetric_name\x18\x01 \x01(\t\x12/\n\x0b\x64\x61ta_points\x18\x02 \x03(\x0b\x32\x1a.messaging.MetricDataPoint\x12\x37\n\x06labels\x18\x03 \x03(\x0b\x32\'.messaging.MetricTimeSeries.LabelsEntry\x1a-\n\x0bLabelsEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12\r\n\x05value\x18\x02 \x01(\t:\x02\x38\x01\"6\n\x0fMetricDataPoint\x12\x14\n\x0ctimestamp_ns\x18\x01 \x01(\x04\x12\r\n\x05value\x18\x02 \x01(\x01\x32\xae\x05\n\x11UniversalEventBus\x12\x35\n\x07Publish\x12\x13.messaging.Envelope\x1a\x15.messaging.PublishAck\x12I\n\x10PublishTelemetry\x12\x1c.messaging.UniversalEnvelope\x1a\x17.messaging.UniversalAck\x12\x42\n\x0cPublishBatch\x12\x19.messaging.TelemetryBatch\x1a\x17.messaging.UniversalAck\x12V\n\x0eRegisterDevice\x12\x1d.messaging.DeviceRegistration\x1a%.messaging.DeviceRegistrationResponse\x12T\n\x0cUpdateDevice\x12\x1d.messaging.DeviceRegistration\x1a%.messaging.DeviceRegistrationResponse\x12\\\n\x10\x44\x65registerDevice\x12\x1f.messaging.DeviceDeregistration\x1a\'.messaging.DeviceDeregistrationResponse\x12@\n\tGetHealth\x12\x18.messaging.HealthRequest\x1a\x19.messaging.HealthResponse\x12@\n\tGetStatus\x12\x18.messaging.StatusRequest\x1a\x19.messaging.StatusResponse\x12\x43\n\nGetMetrics\x12\x19.messaging.MetricsRequest\x1a\x1a.messaging.MetricsResponseb\x06proto3')
 
 _globals = globals()
 _builder.BuildMessageAndEnumDescriptors(DESCRIPTOR, _globals)
@@ -93,55 +93,55 @@ if not _descriptor._USE_C_DESCRIPTORS:
   _globals['_SECURITYCONTEXT_COMPLIANCESTATUSENTRY']._serialized_start=5163
   _globals['_SECURITYCONTEXT_COMPLIANCESTATUSENTRY']._serialized_end=5218
   _globals['_TELEMETRYBATCH']._serialized_start=5221
-  _globals['_TELEMETRYBATCH']._serialized_end=5734
-  _globals['_TELEMETRYBATCH_EDGEMETADATAENTRY']._serialized_start=5683
-  _globals['_TELEMETRYBATCH_EDGEMETADATAENTRY']._serialized_end=5734
-  _globals['_UNIVERSALENVELOPE']._serialized_start=5737
-  _globals['_UNIVERSALENVELOPE']._serialized_end=6263
-  _globals['_UNIVERSALACK']._serialized_start=6266
-  _globals['_UNIVERSALACK']._serialized_end=6679
-  _globals['_UNIVERSALACK_STATUS']._serialized_start=6559
-  _globals['_UNIVERSALACK_STATUS']._serialized_end=6679
-  _globals['_DEVICEREGISTRATION']._serialized_start=6682
-  _globals['_DEVICEREGISTRATION']._serialized_end=7077
-  _globals['_TELEMETRYCAPABILITY']._serialized_start=7080
-  _globals['_TELEMETRYCAPABILITY']._serialized_end=7475
-  _globals['_TELEMETRYCAPABILITY_PROTOCOLCONFIGENTRY']._serialized_start=7422
-  _globals['_TELEMETRYCAPABILITY_PROTOCOLCONFIGENTRY']._serialized_end=7475
-  _globals['_DEVICEREGISTRATIONRESPONSE']._serialized_start=7478
-  _globals['_DEVICEREGISTRATIONRESPONSE']._serialized_end=7822
-  _globals['_COLLECTIONPOLICY']._serialized_start=7825
-  _globals['_COLLECTIONPOLICY']._serialized_end=8277
-  _globals['_DEVICEDEREGISTRATION']._serialized_start=8279
-  _globals['_DEVICEDEREGISTRATION']._serialized_end=8398
-  _globals['_DEVICEDEREGISTRATIONRESPONSE']._serialized_start=8400
-  _globals['_DEVICEDEREGISTRATIONRESPONSE']._serialized_end=8503
-  _globals['_HEALTHREQUEST']._serialized_start=8505
-  _globals['_HEALTHREQUEST']._serialized_end=8540
-  _globals['_HEALTHRESPONSE']._serialized_start=8543
-  _globals['_HEALTHRESPONSE']._serialized_end=8763
-  _globals['_HEALTHRESPONSE_COMPONENTHEALTHENTRY']._serialized_start=8681
-  _globals['_HEALTHRESPONSE_COMPONENTHEALTHENTRY']._serialized_end=8763
-  _globals['_COMPONENTHEALTH']._serialized_start=8766
-  _globals['_COMPONENTHEALTH']._serialized_end=8945
-  _globals['_COMPONENTHEALTH_METRICSENTRY']._serialized_start=8899
-  _globals['_COMPONENTHEALTH_METRICSENTRY']._serialized_end=8945
-  _globals['_STATUSREQUEST']._serialized_start=8947
-  _globals['_STATUSREQUEST']._serialized_end=9017
-  _globals['_STATUSRESPONSE']._serialized_start=9020
-  _globals['_STATUSRESPONSE']._serialized_end=9320
-  _globals['_STATUSRESPONSE_SERVICEMETRICSENTRY']._serialized_start=9267
-  _globals['_STATUSRESPONSE_SERVICEMETRICSENTRY']._serialized_end=9320
-  _globals['_METRICSREQUEST']._serialized_start=9322
-  _globals['_METRICSREQUEST']._serialized_end=9404
-  _globals['_METRICSRESPONSE']._serialized_start=9406
-  _globals['_METRICSRESPONSE']._serialized_end=9502
-  _globals['_METRICTIMESERIES']._serialized_start=9505
-  _globals['_METRICTIMESERIES']._serialized_end=9697
+  _globals['_TELEMETRYBATCH']._serialized_end=5783
+  _globals['_TELEMETRYBATCH_EDGEMETADATAENTRY']._serialized_start=5732
+  _globals['_TELEMETRYBATCH_EDGEMETADATAENTRY']._serialized_end=5783
+  _globals['_UNIVERSALENVELOPE']._serialized_start=5786
+  _globals['_UNIVERSALENVELOPE']._serialized_end=6312
+  _globals['_UNIVERSALACK']._serialized_start=6315
+  _globals['_UNIVERSALACK']._serialized_end=6776
+  _globals['_UNIVERSALACK_STATUS']._serialized_start=6656
+  _globals['_UNIVERSALACK_STATUS']._serialized_end=6776
+  _globals['_DEVICEREGISTRATION']._serialized_start=6779
+  _globals['_DEVICEREGISTRATION']._serialized_end=7174
+  _globals['_TELEMETRYCAPABILITY']._serialized_start=7177
+  _globals['_TELEMETRYCAPABILITY']._serialized_end=7572
+  _globals['_TELEMETRYCAPABILITY_PROTOCOLCONFIGENTRY']._serialized_start=7519
+  _globals['_TELEMETRYCAPABILITY_PROTOCOLCONFIGENTRY']._serialized_end=7572
+  _globals['_DEVICEREGISTRATIONRESPONSE']._serialized_start=7575
+  _globals['_DEVICEREGISTRATIONRESPONSE']._serialized_end=7919
+  _globals['_COLLECTIONPOLICY']._serialized_start=7922
+  _globals['_COLLECTIONPOLICY']._serialized_end=8374
+  _globals['_DEVICEDEREGISTRATION']._serialized_start=8376
+  _globals['_DEVICEDEREGISTRATION']._serialized_end=8495
+  _globals['_DEVICEDEREGISTRATIONRESPONSE']._serialized_start=8497
+  _globals['_DEVICEDEREGISTRATIONRESPONSE']._serialized_end=8600
+  _globals['_HEALTHREQUEST']._serialized_start=8602
+  _globals['_HEALTHREQUEST']._serialized_end=8637
+  _globals['_HEALTHRESPONSE']._serialized_start=8640
+  _globals['_HEALTHRESPONSE']._serialized_end=8860
+  _globals['_HEALTHRESPONSE_COMPONENTHEALTHENTRY']._serialized_start=8778
+  _globals['_HEALTHRESPONSE_COMPONENTHEALTHENTRY']._serialized_end=8860
+  _globals['_COMPONENTHEALTH']._serialized_start=8863
+  _globals['_COMPONENTHEALTH']._serialized_end=9042
+  _globals['_COMPONENTHEALTH_METRICSENTRY']._serialized_start=8996
+  _globals['_COMPONENTHEALTH_METRICSENTRY']._serialized_end=9042
+  _globals['_STATUSREQUEST']._serialized_start=9044
+  _globals['_STATUSREQUEST']._serialized_end=9114
+  _globals['_STATUSRESPONSE']._serialized_start=9117
+  _globals['_STATUSRESPONSE']._serialized_end=9417
+  _globals['_STATUSRESPONSE_SERVICEMETRICSENTRY']._serialized_start=9364
+  _globals['_STATUSRESPONSE_SERVICEMETRICSENTRY']._serialized_end=9417
+  _globals['_METRICSREQUEST']._serialized_start=9419
+  _globals['_METRICSREQUEST']._serialized_end=9501
+  _globals['_METRICSRESPONSE']._serialized_start=9503
+  _globals['_METRICSRESPONSE']._serialized_end=9599
+  _globals['_METRICTIMESERIES']._serialized_start=9602
+  _globals['_METRICTIMESERIES']._serialized_end=9794
   _globals['_METRICTIMESERIES_LABELSENTRY']._serialized_start=2373
   _globals['_METRICTIMESERIES_LABELSENTRY']._serialized_end=2418
-  _globals['_METRICDATAPOINT']._serialized_start=9699
-  _globals['_METRICDATAPOINT']._serialized_end=9753
-  _globals['_UNIVERSALEVENTBUS']._serialized_start=9756
-  _globals['_UNIVERSALEVENTBUS']._serialized_end=10442
+  _globals['_METRICDATAPOINT']._serialized_start=9796
+  _globals['_METRICDATAPOINT']._serialized_end=9850
+  _globals['_UNIVERSALEVENTBUS']._serialized_start=9853
+  _globals['_UNIVERSALEVENTBUS']._serialized_end=10539
 # @@protoc_insertion_point(module_scope)
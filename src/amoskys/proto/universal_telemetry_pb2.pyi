@@ -431,7 +431,7 @@ class SecurityContext(_message.Message):
     def __init__(self, device_trust_score: _Optional[float] = ..., authentication_method: _Optional[str] = ..., certificate_fingerprint: _Optional[str] = ..., certificate_valid: bool = ..., network_zone: _Optional[str] = ..., security_groups: _Optional[_Iterable[str]] = ..., encrypted_channel: bool = ..., encryption_protocol: _Optional[str] = ..., permissions: _Optional[_Iterable[str]] = ..., access_level: _Optional[str] = ..., privileged_access: bool = ..., behavior_normal: bool = ..., anomaly_score: _Optional[float] = ..., behavioral_flags: _Optional[_Iterable[str]] = ..., compliance_status: _Optional[_Mapping[str, bool]] = ..., policy_violations: _Optional[_Iterable[str]] = ..., data_classification: _Optional[str] = ...) -> None: ...
 
 class TelemetryBatch(_message.Message):
-    __slots__ = ("telemetry_records", "batch_sequence_number", "batch_start_time_ns", "batch_end_time_ns", "is_compressed", "compression_algorithm", "original_size_bytes", "compressed_size_bytes", "total_events", "dropped_events", "data_quality_score", "edge_agent_id", "edge_location", "edge_metadata")
+    __slots__ = ("telemetry_records", "batch_sequence_number", "batch_start_time_ns", "batch_end_time_ns", "is_compressed", "compression_algorithm", "original_size_bytes", "compressed_size_bytes", "total_events", "dropped_events", "data_quality_score", "edge_agent_id", "edge_location", "edge_metadata", "envelopes")
     class EdgeMetadataEntry(_message.Message):
         __slots__ = ("key", "value")
         KEY_FIELD_NUMBER: _ClassVar[int]
@@ -453,6 +453,7 @@ class TelemetryBatch(_message.Message):
     EDGE_AGENT_ID_FIELD_NUMBER: _ClassVar[int]
     EDGE_LOCATION_FIELD_NUMBER: _ClassVar[int]
     EDGE_METADATA_FIELD_NUMBER: _ClassVar[int]
+    ENVELOPES_FIELD_NUMBER: _ClassVar[int]
     telemetry_records: _containers.RepeatedCompositeFieldContainer[DeviceTelemetry]
     batch_sequence_number: int
     batch_start_time_ns: int
@@ -467,7 +468,8 @@ class TelemetryBatch(_message.Message):
     edge_agent_id: str
     edge_location: str
     edge_metadata: _containers.ScalarMap[str, str]
-    def __init__(self, telemetry_records: _Optional[_Iterable[_Union[DeviceTelemetry, _Mapping]]] = ..., batch_sequence_number: _Optional[int] = ..., batch_start_time_ns: _Optional[int] = ..., batch_end_time_ns: _Optional[int] = ..., is_compressed: bool = ..., compression_algorithm: _Optional[str] = ..., original_size_bytes: _Optional[int] = ..., compressed_size_bytes: _Optional[int] = ..., total_events: _Optional[int] = ..., dropped_events: _Optional[int] = ..., data_quality_score: _Optional[float] = ..., edge_agent_id: _Optional[str] = ..., edge_location: _Optional[str] = ..., edge_metadata: _Optional[_Mapping[str, str]] = ...) -> None: ...
+    envelopes: _containers.RepeatedCompositeFieldContainer[UniversalEnvelope]
+    def __init__(self, telemetry_records: _Optional[_Iterable[_Union[DeviceTelemetry, _Mapping]]] = ..., batch_sequence_number: _Optional[int] = ..., batch_start_time_ns: _Optional[int] = ..., batch_end_time_ns: _Optional[int] = ..., is_compressed: bool = ..., compression_algorithm: _Optional[str] = ..., original_size_bytes: _Optional[int] = ..., compressed_size_bytes: _Optional[int] = ..., total_events: _Optional[int] = ..., dropped_events: _Optional[int] = ..., data_quality_score: _Optional[float] = ..., edge_agent_id: _Optional[str] = ..., edge_location: _Optional[str] = ..., edge_metadata: _Optional[_Mapping[str, str]] = ..., envelopes: _Optional[_Iterable[_Union[UniversalEnvelope, _Mapping]]] = ...) -> None: ...
 
 class UniversalEnvelope(_message.Message):
     __slots__ = ("version", "ts_ns", "idempotency_key", "flow", "process", "device_telemetry", "telemetry_batch", "sig", "prev_sig", "signing_algorithm", "certificate_chain", "priority", "processing_hints", "target_processors", "retry_count", "max_processing_time_ns", "requires_acknowledgment", "schema_version")
@@ -510,7 +512,7 @@ class UniversalEnvelope(_message.Message):
     def __init__(self, version: _Optional[str] = ..., ts_ns: _Optional[int] = ..., idempotency_key: _Optional[str] = ..., flow: _Optional[_Union[_messaging_schema_pb2.FlowEvent, _Mapping]] = ..., process: _Optional[_Union[_messaging_schema_pb2.ProcessEvent, _Mapping]] = ..., device_telemetry: _Optional[_Union[DeviceTelemetry, _Mapping]] = ..., telemetry_batch: _Optional[_Union[TelemetryBatch, _Mapping]] = ..., sig: _Optional[bytes] = ..., prev_sig: _Optional[bytes] = ..., signing_algorithm: _Optional[str] = ..., certificate_chain: _Optional[str] = ..., priority: _Optional[str] = ..., processing_hints: _Optional[_Iterable[str]] = ..., target_processors: _Optional[str] = ..., retry_count: _Optional[int] = ..., max_processing_time_ns: _Optional[int] = ..., requires_acknowledgment: bool = ..., schema_version: _Optional[int] = ...) -> None: ...
 
 class UniversalAck(_message.Message):
-    __slots__ = ("status", "reason", "backoff_hint_ms", "processed_timestamp_ns", "events_accepted", "events_rejected", "validation_errors", "current_load", "queue_depth", "processing_rate_per_second")
+    __slots__ = ("status", "reason", "backoff_hint_ms", "processed_timestamp_ns", "events_accepted", "events_rejected", "validation_errors", "current_load", "queue_depth", "processing_rate_per_second", "envelope_acks")
     class Status(int, metaclass=_enum_type_wrapper.EnumTypeWrapper):
         __slots__ = ()
         OK: _ClassVar[UniversalAck.Status]
@@ -537,6 +539,7 @@ class UniversalAck(_message.Message):
     CURRENT_LOAD_FIELD_NUMBER: _ClassVar[int]
     QUEUE_DEPTH_FIELD_NUMBER: _ClassVar[int]
     PROCESSING_RATE_PER_SECOND_FIELD_NUMBER: _ClassVar[int]
+    ENVELOPE_ACKS_FIELD_NUMBER: _ClassVar[int]
     status: UniversalAck.Status
     reason: str
     backoff_hint_ms: int
@@ -547,7 +550,8 @@ class UniversalAck(_message.Message):
     current_load: float
     queue_depth: int
     processing_rate_per_second: int
-    def __init__(self, status: _Optional[_Union[UniversalAck.Status, str]] = ..., reason: _Optional[str] = ..., backoff_hint_ms: _Optional[int] = ..., processed_timestamp_ns: _Optional[int] = ..., events_accepted: _Optional[int] = ..., events_rejected: _Optional[int] = ..., validation_errors: _Optional[_Iterable[str]] = ..., current_load: _Optional[float] = ..., queue_depth: _Optional[int] = ..., processing_rate_per_second: _Optional[int] = ...) -> None: ...
+    envelope_acks: _containers.RepeatedCompositeFieldContainer[UniversalAck]
+    def __init__(self, status: _Optional[_Union[UniversalAck.Status, str]] = ..., reason: _Optional[str] = ..., backoff_hint_ms: _Optional[int] = ..., processed_timestamp_ns: _Optional[int] = ..., events_accepted: _Optional[int] = ..., events_rejected: _Optional[int] = ..., validation_errors: _Optional[_Iterable[str]] = ..., current_load: _Optional[float] = ..., queue_depth: _Optional[int] = ..., processing_rate_per_second: _Optional[int] = ..., envelope_acks: _Optional[_Iterable[_Union[UniversalAck, _Mapping]]] = ...) -> None: ...
 
 class DeviceRegistration(_message.Message):
     __slots__ = ("device_id", "metadata", "supported_protocols", "capabilities", "certificate_request", "device_fingerprint", "discovered_by_agent", "discovery_timestamp_ns", "discovery_method", "deployment_environment", "organizational_unit", "device_groups")
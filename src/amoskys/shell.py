@@ -20,6 +20,7 @@ from __future__ import annotations
 
 import json
 import os
+import re
 import readline
 import socket
 import sqlite3
@@ -245,8 +246,27 @@ def get_signals(limit: int = 10) -> List[dict]:
     return signals
 
 
+_TECHNIQUE_RE = re.compile(r"^[Tt]\d{4}(\.\d{3})?$")
+
+
 def search_events(query: str, limit: int = 15) -> List[dict]:
-    """Search security events by keyword."""
+    """Search security events by keyword.
+
+    MITRE technique IDs (``T1059``, ``t1059.004``) are looked up through the
+    event_techniques index; anything else is a keyword match.
+    """
+    if _TECHNIQUE_RE.match(query):
+        technique = query.upper()
+        return _query(
+            TELEMETRY_DB,
+            """SELECT event_category, event_action, risk_score, mitre_techniques,
+                      raw_attributes_json, event_timestamp_ns
+               FROM security_events
+               WHERE id IN (SELECT event_rowid FROM event_techniques
+                            WHERE technique = ? OR technique GLOB ?)
+               ORDER BY event_timestamp_ns DESC LIMIT ?""",
+            (technique, f"{technique}.*", limit),
+        )
     return _query(
         TELEMETRY_DB,
         """SELECT event_category, event_action, risk_score, mitre_techniques,
@@ -17,6 +17,15 @@ only ships new events. Events are batched for efficiency. If the
 server is unreachable, events accumulate locally and ship when
 connectivity is restored.
 
+Shipping modes (AMOSKYS_SHIP_MODE):
+    columnar (default) — rows from all tables are coalesced into gzip'd
+        columnar batches, up to AMOSKYS_SHIP_INFLIGHT requests are kept in
+        flight, batch size adapts to backlog and ack latency, and each
+        table's cursor only advances over a contiguous run of acked
+        batches. A backlog drains in one cycle. Falls back to json if the
+        server rejects the format.
+    json — one uncompressed POST per table per cycle (BATCH_SIZE rows).
+
 Usage:
     # As part of analyzer (automatic):
     AMOSKYS_SERVER=https://your-server:8443 python -m amoskys.analyzer_main
@@ -27,6 +36,7 @@ Usage:
 
 from __future__ import annotations
 
+import gzip
 import hashlib
 import json
 import logging
@@ -39,6 +49,8 @@ import sys
 import threading
 import time
 import uuid
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
 from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Any, Optional
@@ -118,6 +130,13 @@ REGISTER_INTERVAL_S = 300  # Re-register every 5 minutes (heartbeat)
 CONNECT_TIMEOUT_S = 10
 READ_TIMEOUT_S = 30
 
+# Columnar (pipelined) mode
+COLUMNAR_CONTENT_TYPE = "application/vnd.amoskys.columnar+json"
+COLUMNAR_VERSION = 1
+MIN_BATCH_SIZE = 50  # Adaptive batch size floor (rows per request, all tables)
+MAX_BATCH_SIZE = 5000  # Adaptive batch size ceiling
+TARGET_LATENCY_S = 2.0  # Halve batch size above this ack latency
+
 
 @dataclass
 class ShipperConfig:
@@ -132,6 +151,8 @@ class ShipperConfig:
     cursor_db: str = "data/shipper_cursor.db"
     config_file: str = ""  # Path to amoskys.env (for persisting API key)
     enabled: bool = False
+    ship_mode: str = "columnar"  # "columnar" (pipelined) or "json" (legacy)
+    max_in_flight: int = 4  # Concurrent columnar requests
 
     @classmethod
     def from_env(cls) -> ShipperConfig:
@@ -171,6 +192,8 @@ class ShipperConfig:
             cursor_db=cursor_db,
             config_file=config_file,
             enabled=bool(server),
+            ship_mode=os.getenv("AMOSKYS_SHIP_MODE", "columnar").lower(),
+            max_in_flight=max(1, int(os.getenv("AMOSKYS_SHIP_INFLIGHT", "4"))),
         )
 
 
@@ -295,6 +318,60 @@ class CursorStore:
         self.db.close()
 
 
+# ── Columnar Batches ───────────────────────────────────────────────
+
+
+def encode_columnar_batch(
+    device_id: str, tables: dict[str, tuple[list[str], list[tuple]]]
+) -> bytes:
+    """Encode {table: (columns, rows)} as a gzip'd columnar JSON batch.
+
+    Each table becomes ``{"count": N, "columns": {name: [N values]}}``;
+    the server decodes it in command_center._decode_columnar.
+    """
+    body = {
+        "v": COLUMNAR_VERSION,
+        "device_id": device_id,
+        "tables": {
+            table: {
+                "count": len(rows),
+                "columns": {
+                    name: [row[i] for row in rows] for i, name in enumerate(columns)
+                },
+            }
+            for table, (columns, rows) in tables.items()
+        },
+    }
+    raw = json.dumps(body, separators=(",", ":"), default=str).encode("utf-8")
+    return gzip.compress(raw, compresslevel=6)
+
+
+class _AckWindow:
+    """In-flight batches of one table, oldest first.
+
+    Each entry is ``[max_id, acked]``. The cursor may only advance to the
+    max_id of the longest fully-acked prefix, so a failed batch holds back
+    every later batch of that table (they are re-sent; the server dedups
+    on source_id).
+    """
+
+    def __init__(self) -> None:
+        self._pending: deque[list] = deque()
+
+    def push(self, max_id: int) -> list:
+        entry = [max_id, False]
+        self._pending.append(entry)
+        return entry
+
+    def ack(self, entry: list) -> Optional[int]:
+        """Mark *entry* acked; return the new cursor if it moved."""
+        entry[1] = True
+        cursor = None
+        while self._pending and self._pending[0][1]:
+            cursor = self._pending.popleft()[0]
+        return cursor
+
+
 # ── Shipper ────────────────────────────────────────────────────────
 
 # Tables to ship and their key columns for the fleet server
@@ -547,11 +624,17 @@ class TelemetryShipper:
         self._thread: Optional[threading.Thread] = None
         self._registered = False
         self._last_register = 0.0
+        self._mode = config.ship_mode
+        self._batch_size = BATCH_SIZE
+        self._batch_seq = 0
+        self._pool: Optional[ThreadPoolExecutor] = None
         self._stats = {
             "shipped": 0,
             "failed": 0,
             "last_ship_time": 0.0,
             "last_error": "",
+            "batch_size": BATCH_SIZE,
+            "bytes_sent": 0,
         }
 
     @property
@@ -581,6 +664,8 @@ class TelemetryShipper:
         self._shutdown.set()
         if self._thread and self._thread.is_alive():
             self._thread.join(timeout=15)
+        if self._pool is not None:
+            self._pool.shutdown(wait=True)
         self.cursors.close()
         self._session.close()
         logger.info("Shipper stopped (shipped=%d)", self._stats["shipped"])
@@ -712,16 +797,209 @@ class TelemetryShipper:
             )
             db.row_factory = sqlite3.Row
 
-            for table, meta in SHIP_TABLES.items():
+            if self._mode == "columnar":
                 try:
-                    self._ship_table(db, table, meta["columns"], meta.get("aliases"))
+                    self._ship_pipelined(db)
                 except Exception as e:
-                    logger.debug("Ship %s failed: %s", table, e)
+                    logger.warning("Pipelined ship failed: %s", e)
+            else:
+                for table, meta in SHIP_TABLES.items():
+                    try:
+                        self._ship_table(
+                            db, table, meta["columns"], meta.get("aliases")
+                        )
+                    except Exception as e:
+                        logger.debug("Ship %s failed: %s", table, e)
 
             db.close()
         except Exception as e:
             logger.warning("Cannot open telemetry DB: %s", e)
 
+    # ── Columnar / pipelined mode ───────────────────────────────
+
+    def _ship_pipelined(self, db: sqlite3.Connection):
+        """Drain every table's backlog with up to max_in_flight batches.
+
+        Batches coalesce rows from several tables. Reads run ahead of acks;
+        cursors are persisted only as contiguous acks come back. After the
+        first failed batch no new batches are sent this cycle, but those
+        already in flight are still collected.
+        """
+        layouts = {}
+        for table, meta in SHIP_TABLES.items():
+            layout = self._table_layout(db, table, meta["columns"], meta.get("aliases"))
+            if layout is not None:
+                layouts[table] = layout
+        if not layouts:
+            return
+
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(
+                max_workers=self.config.max_in_flight,
+                thread_name_prefix="amoskys-shipper-post",
+            )
+
+        read_pos = {table: self.cursors.get(table) for table in layouts}
+        windows = {table: _AckWindow() for table in layouts}
+        in_flight: dict[Future, tuple[dict[str, list], int, int]] = {}
+        sending = True
+
+        while not self._shutdown.is_set():
+            while sending and len(in_flight) < self.config.max_in_flight:
+                size = self._batch_size
+                tables = self._read_batch(db, layouts, read_pos, size)
+                if not tables:
+                    sending = False
+                    break
+                body = encode_columnar_batch(self.config.device_id, tables)
+                entries = {
+                    table: windows[table].push(read_pos[table]) for table in tables
+                }
+                rows = sum(len(r) for _, r in tables.values())
+                future = self._pool.submit(self._post_columnar, body)
+                in_flight[future] = (entries, rows, size)
+                self._stats["bytes_sent"] += len(body)
+
+            if not in_flight:
+                break
+
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                entries, rows, size = in_flight.pop(future)
+                status, latency, error = future.result()
+                if status == 200:
+                    for table, entry in entries.items():
+                        cursor = windows[table].ack(entry)
+                        if cursor is not None:
+                            self.cursors.set(table, cursor)
+                    self._stats["shipped"] += rows
+                    self._stats["last_ship_time"] = time.time()
+                    self._adapt_batch_size(latency, backlog=rows >= size)
+                    logger.debug(
+                        "Shipped %d events in %d table(s) (%.2fs)",
+                        rows,
+                        len(entries),
+                        latency,
+                    )
+                    continue
+
+                sending = False
+                self._batch_size = max(MIN_BATCH_SIZE, self._batch_size // 2)
+                if status == 0:
+                    logger.debug("Server unreachable — %d events queued", rows)
+                    continue
+                if status in (202, 503):
+                    # Server backpressure (ingest queue busy/full): re-send
+                    # later; rows that did land are dropped by its dedup.
+                    logger.debug("Server busy (%d) — %d events queued", status, rows)
+                    continue
+                self._stats["failed"] += rows
+                self._stats["last_error"] = error
+                if status in (400, 415) and self._mode == "columnar":
+                    logger.warning(
+                        "Server rejected columnar batch (%d %s) — "
+                        "falling back to per-table JSON",
+                        status,
+                        error,
+                    )
+                    self._mode = "json"
+                else:
+                    logger.warning("Ship batch failed: %d %s", status, error)
+
+        self._stats["batch_size"] = self._batch_size
+
+    def _table_layout(
+        self,
+        db: sqlite3.Connection,
+        table: str,
+        columns: list[str],
+        aliases: Optional[dict[str, str]] = None,
+    ) -> Optional[tuple[str, list[str], int]]:
+        """Return (select list, shipped column names, id index) for a table.
+
+        device_id is not shipped: the server attributes every row to the
+        authenticated device anyway.
+        """
+        aliases = aliases or {}
+        try:
+            existing_cols = {
+                row[1] for row in db.execute(f"PRAGMA table_info({table})").fetchall()
+            }
+        except Exception:
+            return None
+
+        valid_cols = []
+        for c in columns:
+            if c in existing_cols and c != "device_id" and c not in valid_cols:
+                valid_cols.append(c)
+        if "id" not in valid_cols:
+            return None
+        return (
+            ", ".join(valid_cols),
+            [aliases.get(c, c) for c in valid_cols],
+            valid_cols.index("id"),
+        )
+
+    def _read_batch(
+        self,
+        db: sqlite3.Connection,
+        layouts: dict[str, tuple[str, list[str], int]],
+        read_pos: dict[str, int],
+        size: int,
+    ) -> dict[str, tuple[list[str], list[tuple]]]:
+        """Read up to *size* rows across tables, advancing *read_pos*.
+
+        The starting table rotates per batch so one busy table cannot
+        starve the others.
+        """
+        order = list(layouts)
+        start = self._batch_seq % len(order)
+        self._batch_seq += 1
+
+        tables: dict[str, tuple[list[str], list[tuple]]] = {}
+        remaining = size
+        for table in order[start:] + order[:start]:
+            if remaining <= 0:
+                break
+            select, names, id_idx = layouts[table]
+            rows = db.execute(
+                f"SELECT {select} FROM {table} WHERE id > ? ORDER BY id LIMIT ?",
+                (read_pos[table], remaining),
+            ).fetchall()
+            if not rows:
+                continue
+            tables[table] = (names, [tuple(r) for r in rows])
+            read_pos[table] = rows[-1][id_idx]
+            remaining -= len(rows)
+        return tables
+
+    def _post_columnar(self, body: bytes) -> tuple[int, float, str]:
+        """POST one batch; returns (status, latency_s, error). Status 0 = unreachable."""
+        started = time.monotonic()
+        try:
+            resp = self._session.post(
+                f"{self.config.server_url}/api/v1/telemetry",
+                data=body,
+                headers={
+                    "Content-Type": COLUMNAR_CONTENT_TYPE,
+                    "Content-Encoding": "gzip",
+                },
+                timeout=(CONNECT_TIMEOUT_S, READ_TIMEOUT_S),
+            )
+            error = "" if resp.status_code == 200 else resp.text[:200]
+            return resp.status_code, time.monotonic() - started, error
+        except requests.ConnectionError:
+            return 0, time.monotonic() - started, "unreachable"
+        except Exception as e:
+            return -1, time.monotonic() - started, str(e)
+
+    def _adapt_batch_size(self, latency: float, backlog: bool):
+        """AIMD-style sizing: grow while draining a backlog quickly, halve when slow."""
+        if latency > TARGET_LATENCY_S:
+            self._batch_size = max(MIN_BATCH_SIZE, self._batch_size // 2)
+        elif backlog and latency < TARGET_LATENCY_S / 2:
+            self._batch_size = min(MAX_BATCH_SIZE, self._batch_size * 2)
+
     def _ship_table(
         self,
         db: sqlite3.Connection,
@@ -0,0 +1,165 @@
+"""Change-feed (rowid tailing) mixin for TelemetryStore.
+
+Consumers that need "rows added since I last looked" keep a per-table
+rowid watermark and tail forward from it instead of polling COUNT(*).
+MAX(rowid) is a single b-tree seek, and tailing by rowid cannot miss rows
+when retention deletes old rows in the same interval as new inserts.
+
+The module-level helpers work on any sqlite3 connection, so processes
+that do not own a TelemetryStore (the daemon, IGRIS) can tail the same
+way.  Inside the writer process, wait_for_changes() wakes consumers on
+commit instead of leaving them to sleep out a fixed poll interval.
+"""
+
+from __future__ import annotations
+
+import re
+import sqlite3
+import threading
+from typing import Any, Dict, Iterable, Iterator, Optional
+
+from amoskys.storage._ts_partitions import partition_names
+
+_IDENT = re.compile(r"^[A-Za-z_][A-Za-z0-9_]*$")
+
+TAIL_PAGE_SIZE = 500
+
+
+def _check_table(table: str) -> str:
+    """Reject anything that is not a plain identifier before it hits SQL."""
+    if not _IDENT.match(table):
+        raise ValueError(f"invalid table name: {table!r}")
+    return table
+
+
+def max_rowid(conn: sqlite3.Connection, table: str) -> int:
+    """Highest rowid in ``table`` (0 when empty or missing).
+
+    For a partitioned table (a view, where MAX(rowid) is NULL) this is the
+    highest id of the newest non-empty partition.
+    """
+    try:
+        row = conn.execute(f"SELECT MAX(rowid) FROM {_check_table(table)}").fetchone()
+    except sqlite3.OperationalError:
+        return 0
+    if row and row[0] is not None:
+        return row[0]
+    for part in reversed(partition_names(conn, table)):
+        top = conn.execute(f"SELECT MAX(rowid) FROM {part}").fetchone()[0]
+        if top is not None:
+            return top
+    return 0
+
+
+def tail_rows(
+    conn: sqlite3.Connection,
+    table: str,
+    after_rowid: int,
+    limit: int = TAIL_PAGE_SIZE,
+    until_rowid: Optional[int] = None,
+    where: str = "",
+    params: Iterable[Any] = (),
+) -> Iterator[Dict[str, Any]]:
+    """Yield rows of ``table`` with rowid > ``after_rowid``, oldest first.
+
+    Rows are read ``limit`` at a time so a large backlog never lands in
+    memory at once.  Each yielded dict carries its rowid under ``_rowid``.
+
+    Args:
+        conn: Any sqlite3 connection to the database.
+        table: Table to tail.
+        after_rowid: Watermark; only rows after it are returned.
+        limit: Page size per query.
+        until_rowid: Optional inclusive upper bound.  Pass the MAX(rowid)
+            read beforehand to tail a fixed range; the caller can then
+            advance its watermark to it even when ``where`` filtered every
+            row out.
+        where: Optional extra SQL predicate (trusted, caller-supplied).
+        params: Parameters for ``where``.
+
+    Raises:
+        sqlite3.OperationalError: A page could not be read (database busy,
+            locked or interrupted).  Rows already yielded are valid; resume
+            after the last ``_rowid`` seen.  A missing table yields nothing.
+    """
+    # Views (partitioned tables) have no rowid; their id is the partitions'
+    key = "id" if partition_names(conn, table) else "rowid"
+    sql = f"SELECT {key} AS _rowid, * FROM {_check_table(table)} WHERE {key} > ?"
+    bound: tuple = ()
+    if until_rowid is not None:
+        sql += f" AND {key} <= ?"
+        bound = (until_rowid,)
+    if where:
+        sql += f" AND ({where})"
+    sql += f" ORDER BY {key} LIMIT ?"
+    extra = tuple(params)
+
+    cursor_rowid = after_rowid
+    while True:
+        try:
+            cur = conn.execute(sql, (cursor_rowid, *bound, *extra, limit))
+        except sqlite3.OperationalError as e:
+            if "no such table" in str(e):
+                return
+            raise
+        columns = [d[0] for d in cur.description]
+        rows = cur.fetchall()
+        for row in rows:
+            yield dict(zip(columns, row))
+        if len(rows) < limit:
+            return
+        cursor_rowid = rows[-1][0]
+
+
+class ChangeFeedMixin:
+    """Rowid watermarks, tail() and in-process commit notifications."""
+
+    def _init_changefeed(self) -> None:
+        self._change_cond = threading.Condition()
+        self._change_seq = 0
+
+    def watermarks(self, tables: Iterable[str]) -> Dict[str, int]:
+        """Current MAX(rowid) for each table — the starting point for tail()."""
+        with self._read_pool.connection() as rdb:
+            return {table: max_rowid(rdb, table) for table in tables}
+
+    def tail(
+        self,
+        table: str,
+        after_rowid: int,
+        limit: int = TAIL_PAGE_SIZE,
+        until_rowid: Optional[int] = None,
+        where: str = "",
+        params: Iterable[Any] = (),
+    ) -> Iterator[Dict[str, Any]]:
+        """Yield rows added to ``table`` after ``after_rowid`` (see tail_rows)."""
+        with self._read_pool.connection() as rdb:
+            yield from tail_rows(
+                rdb, table, after_rowid, limit, until_rowid, where, params
+            )
+
+    def _notify_changes(self) -> None:
+        """Wake wait_for_changes() callers after a commit."""
+        with self._change_cond:
+            self._change_seq += 1
+            self._change_cond.notify_all()
+
+    @property
+    def change_seq(self) -> int:
+        """Commit counter; pass it to wait_for_changes() to avoid lost wakeups."""
+        return self._change_seq
+
+    def wait_for_changes(self, since_seq: int, timeout: float) -> int:
+        """Block until a commit after ``since_seq`` or ``timeout`` seconds.
+
+        Only commits made through this TelemetryStore instance are seen;
+        other writer processes are picked up when the timeout expires.
+
+        Returns:
+            The current change_seq (equal to since_seq on timeout).
+        """
+        with self._change_cond:
+            self._change_cond.wait_for(
+                lambda: self._change_seq != since_seq, timeout=timeout
+            )
+            return self._change_seq
@@ -860,28 +860,36 @@ class DomainQueryMixin:
         limit: int = 100,
         device_id: Optional[str] = None,
     ) -> Dict[str, Any]:
-        """Search across observation_events attributes."""
+        """Search across observation_events attributes (FTS5 index when possible)."""
         cutoff_ns = int((time.time() - hours * 3600) * 1e9)
         where = ["timestamp_ns > ?"]
         params: list = [cutoff_ns]
+        from_sql, from_params = "observation_events", ()
         if domain:
             where.append("domain = ?")
             params.append(domain)
         if query:
-            where.append("attributes LIKE ?")
-            params.append(f"%{query}%")
+            indexed = self._search_from(
+                "observation_events", query, columns=("attributes",)
+            )
+            if indexed is not None:
+                from_sql, from_params = indexed
+            else:
+                where.append("attributes LIKE ?")
+                params.append(f"%{query}%")
         if device_id:
             where.append("device_id = ?")
             params.append(device_id)
         where_sql = " AND ".join(where)
+        params = [*from_params, *params]
         with self._lock:
             try:
                 total = self.db.execute(
-                    f"SELECT COUNT(*) FROM observation_events WHERE {where_sql}", params
+                    f"SELECT COUNT(*) FROM {from_sql} WHERE {where_sql}", params
                 ).fetchone()[0]
                 rows = self.db.execute(
                     f"SELECT timestamp_dt, domain, event_type, attributes, risk_score, collection_agent "
-                    f"FROM observation_events WHERE {where_sql} ORDER BY timestamp_ns DESC LIMIT ?",
+                    f"FROM {from_sql} WHERE {where_sql} ORDER BY timestamp_ns DESC LIMIT ?",
                     params + [limit],
                 ).fetchall()
                 results = []
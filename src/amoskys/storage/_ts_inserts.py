@@ -30,13 +30,42 @@ def _serialize_mitre(value) -> str:
     return "[]"
 
 
+# Explodes security_events.mitre_techniques into event_techniques for the
+# rows with ``after_id < id <= last_id``.  Tactics pair with techniques by
+# position when the arrays line up, otherwise a single tactic applies to
+# every technique.  Mirrors the backfill in migration 015.
+_INDEX_TECHNIQUES_SQL = """
+    INSERT OR IGNORE INTO event_techniques
+        (event_rowid, technique, tactic, timestamp_ns, device_id)
+    SELECT s.id, t.value,
+           CASE
+               WHEN json_valid(s.mitre_tactics) = 0 THEN NULL
+               WHEN json_array_length(s.mitre_tactics)
+                    = json_array_length(s.mitre_techniques)
+                   THEN json_extract(s.mitre_tactics, '$[' || t.key || ']')
+               WHEN json_array_length(s.mitre_tactics) = 1
+                   THEN json_extract(s.mitre_tactics, '$[0]')
+           END,
+           s.timestamp_ns, s.device_id
+    FROM security_events s,
+         json_each(CASE WHEN json_valid(s.mitre_techniques)
+                        THEN CASE json_type(s.mitre_techniques)
+                             WHEN 'array' THEN s.mitre_techniques END
+                   END) t
+    WHERE s.id > ? AND s.id <= ?
+      AND s.mitre_techniques IS NOT NULL
+      AND t.type = 'text'
+"""
+
+
 class InsertMixin:
     """All insert/upsert methods for domain event tables."""
 
     def insert_telemetry_event(self, event_data: Dict[str, Any]) -> Optional[int]:
         """Insert canonical ingress envelope event into telemetry_events."""
         try:
-            cursor = self.db.execute(
+            rowid = self._write(
+                "telemetry_events",
                 """
                 INSERT OR REPLACE INTO telemetry_events (
                     event_id, idempotency_key, timestamp_ns, ingest_timestamp_ns,
@@ -71,7 +100,7 @@ class InsertMixin:
                 ),
             )
             self._commit()
-            return cursor.lastrowid
+            return rowid
         except sqlite3.Error as e:
             logger.error("Failed to insert telemetry event: %s", e)
             return None
@@ -104,7 +133,8 @@ class InsertMixin:
                     self._commit()
                     return None  # suppressed duplicate
 
-            cursor = self.db.execute(
+            rowid = self._write(
+                "process_events",
                 """
                 INSERT OR REPLACE INTO process_events (
                     timestamp_ns, timestamp_dt, device_id, pid, ppid, exe, cmdline,
@@ -154,7 +184,7 @@ class InsertMixin:
                 ),
             )
             self._commit()
-            return cursor.lastrowid
+            return rowid
         except sqlite3.Error as e:
             logger.error("Failed to insert process event: %s", e)
             return None
@@ -258,7 +288,8 @@ class InsertMixin:
         self._extract_typed_features(event_data)
 
         try:
-            cursor = self.db.execute(
+            rowid = self._write(
+                "security_events",
                 """
                 INSERT INTO security_events (
                     timestamp_ns, timestamp_dt, device_id,
@@ -378,12 +409,19 @@ class InsertMixin:
                     event_data.get("tier", "observation"),
                 ),
             )
+            # Staged rows are indexed by _flush_staged() once ids are known
+            if rowid is not None:
+                self._index_event_techniques(rowid - 1, rowid)
             self._commit()
-            return cursor.lastrowid
+            return rowid
         except sqlite3.Error as e:
             logger.error("Failed to insert security event: %s", e)
             return None
 
+    def _index_event_techniques(self, after_id: int, last_id: int) -> int:
+        """Fill event_techniques for security_events ids in (after_id, last_id]."""
+        return self.db.execute(_INDEX_TECHNIQUES_SQL, (after_id, last_id)).rowcount
+
     def insert_flow_event(self, event_data: Dict[str, Any]) -> Optional[int]:
         """Insert a network flow event.
 
@@ -395,7 +433,8 @@ class InsertMixin:
             return None  # Not a real connection — socket inventory
 
         try:
-            cursor = self.db.execute(
+            rowid = self._write(
+                "flow_events",
                 """
                 INSERT OR IGNORE INTO flow_events (
                     timestamp_ns, timestamp_dt, device_id,
@@ -465,7 +504,7 @@ class InsertMixin:
                 ),
             )
             self._commit()
-            return cursor.lastrowid
+            return rowid
         except sqlite3.Error as e:
             logger.error("Failed to insert flow event: %s", e)
             return None
@@ -496,7 +535,8 @@ class InsertMixin:
                     self._commit()
                     return None  # suppressed duplicate
 
-            cursor = self.db.execute(
+            rowid = self._write(
+                "peripheral_events",
                 """
                 INSERT INTO peripheral_events (
                     timestamp_ns, timestamp_dt, device_id, peripheral_device_id,
@@ -545,7 +585,7 @@ class InsertMixin:
                 ),
             )
             self._commit()
-            return cursor.lastrowid
+            return rowid
         except sqlite3.Error as e:
             logger.error("Failed to insert peripheral event: %s", e)
             return None
@@ -553,7 +593,8 @@ class InsertMixin:
     def insert_dns_event(self, event_data: Dict[str, Any]) -> Optional[int]:
         """Insert a DNS event (query, DGA detection, beaconing, etc.)."""
         try:
-            cursor = self.db.execute(
+            rowid = self._write(
+                "dns_events",
                 """
                 INSERT OR IGNORE INTO dns_events (
                     timestamp_ns, timestamp_dt, device_id, domain, query_type,
@@ -606,7 +647,7 @@ class InsertMixin:
                 ),
             )
             self._commit()
-            return cursor.lastrowid
+            return rowid
         except sqlite3.Error as e:
             logger.error("Failed to insert DNS event: %s", e)
             return None
@@ -643,7 +684,8 @@ class InsertMixin:
                         k: v for k, v in self._audit_dedup_cache.items() if v > cutoff
                     }
 
-            cursor = self.db.execute(
+            rowid = self._write(
+                "audit_events",
                 """
                 INSERT INTO audit_events (
                     timestamp_ns, timestamp_dt, device_id, host, syscall,
@@ -696,7 +738,7 @@ class InsertMixin:
                 ),
             )
             self._commit()
-            return cursor.lastrowid
+            return rowid
         except sqlite3.Error as e:
             logger.error("Failed to insert audit event: %s", e)
             return None
@@ -731,7 +773,8 @@ class InsertMixin:
                 ):
                     # Duplicate content — just refresh the timestamp so it stays visible
                     try:
-                        self.db.execute(
+                        self._write(
+                            "persistence_events",
                             "UPDATE persistence_events SET timestamp_ns = ?, "
                             "timestamp_dt = ? WHERE device_id = ? AND mechanism = ? "
                             "AND (entry_id = ? OR path = ?) "
@@ -754,7 +797,8 @@ class InsertMixin:
                     self._commit()
                     return None  # still deduped, but timestamp refreshed
 
-            cursor = self.db.execute(
+            rowid = self._write(
+                "persistence_events",
                 """
                 INSERT INTO persistence_events (
                     timestamp_ns, timestamp_dt, device_id, event_type,
@@ -804,7 +848,7 @@ class InsertMixin:
                 ),
             )
             self._commit()
-            return cursor.lastrowid
+            return rowid
         except sqlite3.Error as e:
             logger.error("Failed to insert persistence event: %s", e)
             return None
@@ -828,7 +872,8 @@ class InsertMixin:
                     "fim_events", key, new_hash, timestamp_ns
                 ):
                     try:
-                        self.db.execute(
+                        self._write(
+                            "fim_events",
                             "UPDATE fim_events SET timestamp_ns = ?, timestamp_dt = ? "
                             "WHERE device_id = ? AND path = ? AND new_hash = ? "
                             "ORDER BY timestamp_ns DESC LIMIT 1",
@@ -848,7 +893,8 @@ class InsertMixin:
                     self._commit()
                     return None  # deduped but timestamp refreshed
 
-            cursor = self.db.execute(
+            rowid = self._write(
+                "fim_events",
                 """
                 INSERT INTO fim_events (
                     timestamp_ns, timestamp_dt, device_id, event_type, path,
@@ -895,7 +941,7 @@ class InsertMixin:
                 ),
             )
             self._commit()
-            return cursor.lastrowid
+            return rowid
         except sqlite3.Error as e:
             logger.error("Failed to insert FIM event: %s", e)
             return None
@@ -933,7 +979,8 @@ class InsertMixin:
                     self._commit()
                     return None  # suppressed duplicate
 
-            cursor = self.db.execute(
+            rowid = self._write(
+                "observation_events",
                 """
                 INSERT INTO observation_events (
                     timestamp_ns, timestamp_dt, device_id, domain,
@@ -964,7 +1011,7 @@ class InsertMixin:
                 ),
             )
             self._commit()
-            return cursor.lastrowid
+            return rowid
         except sqlite3.Error as e:
             logger.error("Failed to insert observation event: %s", e)
             return None
@@ -972,7 +1019,8 @@ class InsertMixin:
     def upsert_observation_rollup(self, rollup_data: Dict[str, Any]) -> Optional[int]:
         """Upsert observation rollup bucket for adaptive shaping."""
         try:
-            self.db.execute(
+            self._write(
+                "observation_rollups",
                 """
                 INSERT INTO observation_rollups (
                     window_start_ns, window_end_ns, domain, fingerprint,
@@ -1009,7 +1057,8 @@ class InsertMixin:
     def insert_device_telemetry(self, event_data: Dict[str, Any]) -> Optional[int]:
         """Insert a device telemetry snapshot."""
         try:
-            cursor = self.db.execute(
+            rowid = self._write(
+                "device_telemetry",
                 """
                 INSERT OR REPLACE INTO device_telemetry (
                     timestamp_ns, timestamp_dt, device_id, device_type,
@@ -1043,7 +1092,7 @@ class InsertMixin:
                 ),
             )
             self._commit()
-            return cursor.lastrowid
+            return rowid
         except sqlite3.Error as e:
             logger.error("Failed to insert device telemetry: %s", e)
             return None
@@ -1051,7 +1100,8 @@ class InsertMixin:
     def insert_metrics_timeseries(self, event_data: Dict[str, Any]) -> Optional[int]:
         """Insert a metrics timeseries data point."""
         try:
-            cursor = self.db.execute(
+            rowid = self._write(
+                "metrics_timeseries",
                 """
                 INSERT OR REPLACE INTO metrics_timeseries (
                     timestamp_ns, timestamp_dt, metric_name, metric_type,
@@ -1077,7 +1127,7 @@ class InsertMixin:
                 ),
             )
             self._commit()
-            return cursor.lastrowid
+            return rowid
         except sqlite3.Error as e:
             logger.error("Failed to insert metrics timeseries: %s", e)
             return None
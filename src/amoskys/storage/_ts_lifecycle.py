@@ -6,20 +6,46 @@ import logging
 import sqlite3
 import time
 from datetime import datetime, timezone
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
+
+from amoskys.storage._ts_changefeed import max_rowid
 
 logger = logging.getLogger("TelemetryStore")
 
+_BASELINE_UPSERT = (
+    "INSERT INTO _snapshot_baseline "
+    "(table_name, dedup_key, content_hash, updated_ns) "
+    "VALUES (?,?,?,?) "
+    "ON CONFLICT(table_name, dedup_key) DO UPDATE SET "
+    "content_hash=excluded.content_hash, "
+    "updated_ns=excluded.updated_ns"
+)
+
+
+def _is_update(sql: str) -> bool:
+    """True for UPDATE statements (flushed after the batch's inserts)."""
+    return sql.lstrip()[:6].upper() == "UPDATE"
+
 
 class LifecycleMixin:
     """Batch mode, snapshot dedup, baselines, cleanup, receipts, genealogy, close."""
 
     # ── Batch API (used by WALProcessor for single-commit batches) ──
 
-    def begin_batch(self) -> None:
-        """Enter batch mode — per-insert commits are suppressed."""
+    def begin_batch(self, staged: bool = False) -> None:
+        """Enter batch mode — per-insert commits are suppressed.
+
+        Args:
+            staged: Also stage insert rows in memory instead of executing
+                them one at a time.  Staged rows are flushed by end_batch()
+                with one executemany() per statement, and snapshot dedup is
+                resolved against a batch-local baseline map.
+        """
         self._batch_mode = True
         self._batch_count = 0
+        if staged:
+            self._staged_writes = {}
+            self._staged_baseline = {}
 
     def end_batch(self) -> None:
         """Commit all buffered inserts and leave batch mode.
@@ -28,6 +54,17 @@ class LifecycleMixin:
         explicitly rolls back to leave the connection in a clean state
         so subsequent batches aren't poisoned.
         """
+        try:
+            self._flush_staged()
+            self._fold_rollups()
+        except sqlite3.Error as e:
+            try:
+                self.db.rollback()
+            except Exception:
+                pass
+            self.abort_batch()
+            self._cache.invalidate()
+            raise sqlite3.OperationalError(f"Staged batch flush failed: {e}") from e
         last_err = None
         for attempt in range(3):
             try:
@@ -35,6 +72,7 @@ class LifecycleMixin:
                 self._batch_mode = False
                 self._batch_count = 0
                 self._cache.invalidate()
+                self._notify_changes()
                 return
             except sqlite3.OperationalError as e:
                 last_err = e
@@ -60,8 +98,102 @@ class LifecycleMixin:
         if self._batch_mode:
             self._batch_count += 1
             return
+        self._fold_rollups()
         self.db.commit()
         self._cache.invalidate()
+        self._notify_changes()
+
+    def abort_batch(self) -> None:
+        """Leave batch mode without flushing — staged rows are discarded."""
+        self._batch_mode = False
+        self._batch_count = 0
+        self._staged_writes = None
+        self._staged_baseline = {}
+
+    # ── Staged bulk writes (begin_batch(staged=True)) ──
+
+    def _write(self, table: str, sql: str, params: tuple) -> Optional[int]:
+        """Execute an insert/update, or stage it when a staged batch is open.
+
+        Returns the cursor lastrowid for immediate writes and None for
+        staged ones (row ids are only known after the flush).
+        """
+        self._rollup_dirty.add(table)
+        staged = self._staged_writes
+        if staged is None:
+            return self._execute_write(table, sql, params).lastrowid
+        rows = staged.get((table, sql))
+        if rows is None:
+            rows = staged[(table, sql)] = []
+        rows.append(params)
+        return None
+
+    def _flush_staged(self) -> int:
+        """Flush staged rows with one executemany() per (table, statement).
+
+        Inserts are flushed in first-seen order, then the snapshot baseline
+        upserts, then timestamp-refresh UPDATEs so they see rows inserted
+        earlier in the same batch.  A failing group is rolled back to a
+        savepoint and replayed row by row, so one bad row only loses itself
+        (the same outcome as the per-row path).  Security events written by
+        the flush are then indexed into event_techniques by id range.
+        """
+        staged = self._staged_writes
+        baseline = self._staged_baseline
+        self._staged_writes = None
+        self._staged_baseline = {}
+        if not staged and not baseline:
+            return 0
+
+        groups = [g for g in staged.items() if not _is_update(g[0][1])]
+        if baseline:
+            groups.append(
+                (
+                    ("_snapshot_baseline", _BASELINE_UPSERT),
+                    [
+                        (table, key, content_hash, ts)
+                        for (table, key), (content_hash, ts) in baseline.items()
+                    ],
+                )
+            )
+        groups.extend(g for g in staged.items() if _is_update(g[0][1]))
+
+        flushed = 0
+        indexes_techniques = any(table == "security_events" for table, _ in staged)
+        # Held for the whole flush so the prewarm thread cannot commit the
+        # shared connection between a SAVEPOINT and its RELEASE.
+        with self._lock:
+            if not self.db.in_transaction:
+                self.db.execute("BEGIN")
+            if indexes_techniques:
+                last_security_id = max_rowid(self.db, "security_events")
+            for (table, sql), rows in groups:
+                self.db.execute("SAVEPOINT staged_flush")
+                try:
+                    self._execute_write(table, sql, rows, many=True)
+                    self.db.execute("RELEASE staged_flush")
+                    flushed += len(rows)
+                    continue
+                except sqlite3.Error as e:
+                    self.db.execute("ROLLBACK TO staged_flush")
+                    self.db.execute("RELEASE staged_flush")
+                    logger.warning(
+                        "Bulk write to %s failed (%s) — replaying %d rows singly",
+                        table,
+                        e,
+                        len(rows),
+                    )
+                for params in rows:
+                    try:
+                        self._execute_write(table, sql, params)
+                        flushed += 1
+                    except sqlite3.Error as e:
+                        logger.error("Failed to write %s row: %s", table, e)
+            if indexes_techniques:
+                self._index_event_techniques(
+                    last_security_id, max_rowid(self.db, "security_events")
+                )
+        return flushed
 
     # ------------------------------------------------------------------
     # Layer 1: Unified snapshot dedup
@@ -71,6 +203,10 @@ class LifecycleMixin:
         self, table_name: str, dedup_key: str, content_hash: str, timestamp_ns: int
     ) -> bool:
         """Check if a snapshot event is a duplicate and should be suppressed."""
+        if self._staged_writes is not None:
+            return self._check_staged_snapshot_dedup(
+                table_name, dedup_key, content_hash, timestamp_ns
+            )
         try:
             row = self.db.execute(
                 "SELECT content_hash FROM _snapshot_baseline "
@@ -99,6 +235,33 @@ class LifecycleMixin:
         except sqlite3.Error:
             return False
 
+    def _check_staged_snapshot_dedup(
+        self, table_name: str, dedup_key: str, content_hash: str, timestamp_ns: int
+    ) -> bool:
+        """Snapshot dedup against the batch-local baseline map.
+
+        The first lookup of a key in a batch falls through to
+        _snapshot_baseline; afterwards the map is authoritative.  Either
+        outcome leaves the baseline at (content_hash, timestamp_ns), which
+        _flush_staged() writes back with a single upsert per key.
+        """
+        bkey = (table_name, dedup_key)
+        entry = self._staged_baseline.get(bkey)
+        if entry is not None:
+            previous = entry[0]
+        else:
+            try:
+                row = self.db.execute(
+                    "SELECT content_hash FROM _snapshot_baseline "
+                    "WHERE table_name=? AND dedup_key=?",
+                    bkey,
+                ).fetchone()
+            except sqlite3.Error:
+                return False
+            previous = row[0] if row else None
+        self._staged_baseline[bkey] = (content_hash, timestamp_ns)
+        return previous is not None and previous == content_hash
+
     @staticmethod
     def _dedup_key(*parts: object) -> str:
         """Build a pipe-delimited dedup key from component parts."""
@@ -248,6 +411,7 @@ class LifecycleMixin:
 
         Aggressive retention by design — disk space is precious on endpoints.
         The ops server keeps the long-term archive via the shipper.
+        Partitioned tables drop whole expired partitions instead of rows.
         """
         cutoff_ns = int((time.time() - max_age_days * 86400) * 1e9)
         cutoff_dt = datetime.fromtimestamp(
@@ -258,6 +422,7 @@ class LifecycleMixin:
             "process_events",
             "flow_events",
             "security_events",
+            "event_techniques",
             "peripheral_events",
             "dns_events",
             "audit_events",
@@ -267,7 +432,19 @@ class LifecycleMixin:
         tables_dt = ["device_telemetry", "metrics_timeseries"]
         deleted: Dict[str, int] = {}
 
+        # Partition drops first: each commits on its own while no
+        # transaction is open, so writers never wait for the whole sweep
         for table in tables_ns:
+            if table in self._live_partitions:
+                try:
+                    deleted[table] = self._drop_expired_partitions(table, cutoff_ns)
+                except sqlite3.Error:
+                    logger.warning("Partition drop failed for %s", table, exc_info=True)
+                    deleted[table] = 0
+
+        for table in tables_ns:
+            if table in deleted:
+                continue
             try:
                 cursor = self.db.execute(
                     f"DELETE FROM {table} WHERE timestamp_ns < ?", (cutoff_ns,)
@@ -334,6 +511,13 @@ class LifecycleMixin:
         except sqlite3.Error:
             deleted["process_genealogy"] = 0
 
+        # The delete triggers (or the partition drops) already took these
+        # rows out of the rollup cube; drop the buckets they emptied.
+        try:
+            self._prune_rollups()
+        except sqlite3.Error:
+            logger.debug("Rollup prune failed", exc_info=True)
+
         self.db.commit()
 
         total = sum(deleted.values())
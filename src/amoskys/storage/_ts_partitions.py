@@ -0,0 +1,482 @@
+"""Time-partitioned domain tables for TelemetryStore.
+
+With AMOSKYS_PARTITION_HOURS set (24 = one partition per UTC day), each
+high-volume domain table becomes a UNION ALL view over per-window tables
+named <table>_p<YYYYMMDD[HH]>, listed in the telemetry_partitions catalog.
+Partitions are ingest windows: every insert goes to the newest (live)
+partition, so ids stay globally increasing and the id watermarks used by
+the rollup cube, the change feed and event_techniques keep working.
+
+Readers keep using the table name.  SQLite pushes WHERE clauses into each
+arm of the view and merges the per-arm index scans for ORDER BY ... LIMIT,
+so a time-range query costs one index probe per partition outside the
+range.  UPDATE and DELETE through the view reach the partition holding the
+row via INSTEAD OF triggers.
+
+Retention drops whole partitions (DROP TABLE) instead of deleting rows:
+the pages go to the freelist, so the WAL grows by a few pages however many
+rows expire.  The rollup cube is kept exact from per-partition bucket
+counts (rollup_partitions), so a drop never reads the rows it removes.
+Expired rows outside their partition's window (history from before
+partitioning, late arrivals) are still deleted row by row.
+
+Partitions live in the main database file rather than in ATTACHed ones
+because the daemon, IGRIS and the shell open telemetry.db directly, and a
+persistent view cannot reference an attached database.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import re
+import sqlite3
+import time
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger("TelemetryStore")
+
+# Append-only tables.  persistence_events and fim_events are left out
+# because snapshot dedup refreshes timestamps of existing rows in place,
+# observation_events because it is pruned by domain every two hours.
+PARTITIONED_SOURCES = (
+    "security_events",
+    "process_events",
+    "flow_events",
+    "dns_events",
+    "audit_events",
+    "peripheral_events",
+)
+
+_NS_PER_HOUR = 3600 * 10**9
+_SEALED = "partition sealed"
+
+_VIEW_DDL_ERRORS = ("views may not be indexed", "Cannot add a column to a view")
+_ADD_COLUMN = re.compile(r"^\s*ALTER\s+TABLE\s+(\w+)\s+(ADD\s.*)$", re.I | re.S)
+_CREATE_INDEX = re.compile(
+    r'^\s*CREATE\s+(UNIQUE\s+)?INDEX\s+(?:IF\s+NOT\s+EXISTS\s+)?"?(\w+)"?'
+    r'\s+ON\s+"?(\w+)"?\s*(\(.*)$',
+    re.I | re.S,
+)
+_CREATE_TABLE = re.compile(r'^CREATE\s+TABLE\s+"?\w+"?', re.I)
+_INDEX_SUFFIX = re.compile(r"__p\d+$")
+_LEADING_COMMENTS = re.compile(r"^(?:\s*--[^\n]*\n)*")
+
+
+def partition_hours() -> int:
+    """Partition width from AMOSKYS_PARTITION_HOURS (0 = partitioning off)."""
+    try:
+        return max(0, int(os.environ.get("AMOSKYS_PARTITION_HOURS", "0")))
+    except ValueError:
+        return 0
+
+
+def partition_name(source: str, start_ns: int, width_ns: int) -> str:
+    """Table name of the partition of ``source`` starting at ``start_ns``."""
+    fmt = "%Y%m%d" if width_ns % (24 * _NS_PER_HOUR) == 0 else "%Y%m%d%H"
+    start = datetime.fromtimestamp(start_ns // 10**9, tz=timezone.utc)
+    return f"{source}_p{start.strftime(fmt)}"
+
+
+def partition_names(conn: sqlite3.Connection, source: str) -> List[str]:
+    """Partitions of ``source``, oldest first (empty when unpartitioned)."""
+    try:
+        rows = conn.execute(
+            "SELECT name FROM telemetry_partitions WHERE source = ? "
+            "ORDER BY start_ns",
+            (source,),
+        ).fetchall()
+    except sqlite3.OperationalError:
+        return []
+    return [row[0] for row in rows]
+
+
+def _index_name(index: str, partition: str) -> str:
+    """Name of ``index`` cloned onto ``partition`` (idx_x -> idx_x__p2026...)."""
+    return f"{_INDEX_SUFFIX.sub('', index)}__{partition.rsplit('_', 1)[1]}"
+
+
+def _columns(conn: sqlite3.Connection, table: str) -> List[str]:
+    return [row[1] for row in conn.execute(f"PRAGMA table_info({table})")]
+
+
+def rebuild_view(conn: sqlite3.Connection, source: str) -> None:
+    """(Re)create the view over ``source``'s partitions and its write triggers.
+
+    Inserts go to the newest partition.  UPDATE and DELETE run against
+    every partition by id, which is one rowid seek each.
+    """
+    parts = partition_names(conn, source)
+    live = parts[-1]
+    cols = _columns(conn, live)
+    names = ", ".join(cols)
+    new = ", ".join(f"NEW.{c}" for c in cols)
+    settable = [c for c in cols if c != "id"]
+    assign = f"({', '.join(settable)}) = ({', '.join(f'NEW.{c}' for c in settable)})"
+
+    conn.execute(f"DROP VIEW IF EXISTS {source}")
+    conn.execute(
+        f"CREATE VIEW {source} AS "
+        + " UNION ALL ".join(f"SELECT {names} FROM {p}" for p in parts)
+    )
+    conn.execute(
+        f"CREATE TRIGGER {source}_route_insert INSTEAD OF INSERT ON {source} "
+        f"BEGIN INSERT INTO {live} ({names}) VALUES ({new}); END"
+    )
+    conn.execute(
+        f"CREATE TRIGGER {source}_route_update INSTEAD OF UPDATE ON {source} BEGIN "
+        + " ".join(f"UPDATE {p} SET {assign} WHERE id = OLD.id;" for p in parts)
+        + " END"
+    )
+    conn.execute(
+        f"CREATE TRIGGER {source}_route_delete INSTEAD OF DELETE ON {source} BEGIN "
+        + " ".join(f"DELETE FROM {p} WHERE id = OLD.id;" for p in parts)
+        + " END"
+    )
+
+
+def _fan_out(conn: sqlite3.Connection, sql: str) -> bool:
+    """Apply ADD COLUMN / CREATE INDEX aimed at a partitioned view to its partitions."""
+    sql = _LEADING_COMMENTS.sub("", sql)
+    match = _ADD_COLUMN.match(sql)
+    if match:
+        source, clause = match.groups()
+        parts = partition_names(conn, source)
+        if not parts:
+            return False
+        for part in parts:
+            try:
+                conn.execute(f"ALTER TABLE {part} {clause}")
+            except sqlite3.OperationalError as e:
+                if "duplicate column name" not in str(e):
+                    raise
+        rebuild_view(conn, source)
+        return True
+
+    match = _CREATE_INDEX.match(sql)
+    if match:
+        unique, index, source, rest = match.groups()
+        parts = partition_names(conn, source)
+        if not parts:
+            return False
+        for part in parts:
+            existing = {
+                _INDEX_SUFFIX.sub("", row[0])
+                for row in conn.execute(
+                    "SELECT name FROM sqlite_master WHERE type = 'index' "
+                    "AND tbl_name = ?",
+                    (part,),
+                )
+            }
+            if index not in existing:
+                conn.execute(
+                    f"CREATE {unique or ''}INDEX {_index_name(index, part)} "
+                    f"ON {part}{rest}"
+                )
+        return True
+    return False
+
+
+def execute_ddl(conn: sqlite3.Connection, sql: str) -> None:
+    """Execute ``sql``, fanning ADD COLUMN / CREATE INDEX on a partitioned
+    table out to each of its partitions."""
+    try:
+        conn.execute(sql)
+    except sqlite3.OperationalError as e:
+        if not any(m in str(e) for m in _VIEW_DDL_ERRORS) or not _fan_out(conn, sql):
+            raise
+
+
+def executescript(conn: sqlite3.Connection, script: str) -> None:
+    """conn.executescript() that also works once tables are partitioned."""
+    try:
+        partitioned = conn.execute("SELECT 1 FROM telemetry_partitions LIMIT 1")
+        partitioned = partitioned.fetchone() is not None
+    except sqlite3.OperationalError:
+        partitioned = False
+    if not partitioned:
+        conn.executescript(script)
+        return
+
+    conn.commit()
+    statement = ""
+    for line in script.splitlines(keepends=True):
+        statement += line
+        if sqlite3.complete_statement(statement):
+            execute_ddl(conn, statement)
+            statement = ""
+    conn.commit()
+
+
+class PartitionMixin:
+    """Partition catalog, insert routing, rollover and partition-drop retention."""
+
+    # Overridable for tests
+    _partition_clock = staticmethod(time.time_ns)
+
+    def _init_partitions(self) -> None:
+        """Partition the domain tables if enabled, then load the catalog.
+
+        Routing follows the catalog, not the environment: a store that was
+        partitioned stays partitioned when AMOSKYS_PARTITION_HOURS is unset.
+        """
+        self._partition_width_ns = partition_hours() * _NS_PER_HOUR
+        if self._partition_width_ns:
+            for source in PARTITIONED_SOURCES:
+                if partition_names(self.db, source):
+                    continue
+                self.db.execute("SAVEPOINT partition_convert")
+                try:
+                    self._convert_to_partitions(source)
+                    self.db.execute("RELEASE partition_convert")
+                except sqlite3.Error:
+                    self.db.execute("ROLLBACK TO partition_convert")
+                    self.db.execute("RELEASE partition_convert")
+                    logger.warning("Could not partition %s", source, exc_info=True)
+            self.db.commit()
+        self._load_partitions()
+        if self._live_partitions:
+            self._roll_partitions()
+            self.db.commit()
+
+    def _load_partitions(self) -> None:
+        """Read the live partition and window of each partitioned source."""
+        self._live_partitions: Dict[str, str] = {}
+        self._partition_windows: Dict[str, Tuple[int, int]] = {}
+        self._partition_sql: Dict[Tuple[str, str], str] = {}
+        try:
+            rows = self.db.execute(
+                "SELECT source, name, start_ns, end_ns FROM telemetry_partitions "
+                "ORDER BY start_ns"
+            ).fetchall()
+        except sqlite3.OperationalError:
+            rows = []
+        for source, name, start_ns, end_ns in rows:
+            self._live_partitions[source] = name
+            self._partition_windows[source] = (start_ns, end_ns)
+        self._partition_roll_ns: Optional[int] = min(
+            (end for _, end in self._partition_windows.values()), default=None
+        )
+
+    def _window(self, now_ns: int, width_ns: int) -> Tuple[int, int]:
+        start = now_ns - now_ns % width_ns
+        return start, start + width_ns
+
+    def _convert_to_partitions(self, source: str) -> None:
+        """Turn ``source`` into a view whose first partition is the old table.
+
+        The old table becomes the live partition, history included; the
+        next retention sweep deletes its expired rows.
+        """
+        exists = self.db.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?",
+            (source,),
+        ).fetchone()
+        if not exists:
+            return
+        start, end = self._window(self._partition_clock(), self._partition_width_ns)
+        name = partition_name(source, start, self._partition_width_ns)
+        self.db.execute(f"ALTER TABLE {source} RENAME TO {name}")
+        if self.db.execute(
+            "SELECT 1 FROM sqlite_master WHERE name = ?", (f"{source}_fts",)
+        ).fetchone():
+            # Keeps content='<source>': the view serves the same ids
+            self.db.execute(f"ALTER TABLE {source}_fts RENAME TO {name}_fts")
+        # Rollup/search triggers are re-created under partition names
+        for (trigger,) in self.db.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'trigger' AND tbl_name = ?",
+            (name,),
+        ).fetchall():
+            self.db.execute(f"DROP TRIGGER {trigger}")
+        self.db.execute(
+            "INSERT INTO telemetry_partitions (name, source, start_ns, end_ns) "
+            "VALUES (?, ?, ?, ?)",
+            (name, source, start, end),
+        )
+        rebuild_view(self.db, source)
+        logger.info("Partitioned %s (live partition %s)", source, name)
+
+    def _roll_partitions(self) -> None:
+        """Open a new live partition for sources whose window has ended."""
+        now = self._partition_clock()
+        # Held so the prewarm thread cannot commit mid-savepoint
+        with self._lock:
+            for source, live in list(self._live_partitions.items()):
+                start, end = self._partition_windows[source]
+                if now < end:
+                    continue
+                width = self._partition_width_ns or end - start
+                self._create_partition(source, live, *self._window(now, width))
+            self._load_partitions()
+
+    def _create_partition(
+        self, source: str, live: str, start_ns: int, end_ns: int
+    ) -> None:
+        """Clone ``live`` (columns and indexes) into a new live partition.
+
+        The new table's AUTOINCREMENT sequence starts after the highest id
+        handed out so far, and ``live`` is sealed against inserts so a
+        writer still routing to it retries against the new partition.
+        """
+        name = partition_name(source, start_ns, end_ns - start_ns)
+        self.db.execute("SAVEPOINT partition_roll")
+        try:
+            claimed = self.db.execute(
+                "INSERT OR IGNORE INTO telemetry_partitions "
+                "(name, source, start_ns, end_ns) VALUES (?, ?, ?, ?)",
+                (name, source, start_ns, end_ns),
+            ).rowcount
+            if claimed:  # else another writer rolled over first
+                ddl = self.db.execute(
+                    "SELECT sql FROM sqlite_master WHERE type = 'table' AND name = ?",
+                    (live,),
+                ).fetchone()[0]
+                top = self.db.execute(
+                    "SELECT MAX(seq) FROM sqlite_sequence WHERE name = ?", (live,)
+                ).fetchone()[0]
+                top = max(
+                    top or 0,
+                    self.db.execute(f"SELECT MAX(rowid) FROM {live}").fetchone()[0]
+                    or 0,
+                )
+                self.db.execute(
+                    "INSERT INTO sqlite_sequence (name, seq) VALUES (?, ?)",
+                    (name, top),
+                )
+                self.db.execute(_CREATE_TABLE.sub(f"CREATE TABLE {name}", ddl, count=1))
+                for index, sql in self.db.execute(
+                    "SELECT name, sql FROM sqlite_master WHERE type = 'index' "
+                    "AND tbl_name = ? AND sql IS NOT NULL",
+                    (live,),
+                ).fetchall():
+                    unique, _, _, rest = _CREATE_INDEX.match(sql).groups()
+                    self.db.execute(
+                        f"CREATE {unique or ''}INDEX {_index_name(index, name)} "
+                        f"ON {name}{rest}"
+                    )
+                self.db.execute(
+                    f"CREATE TRIGGER IF NOT EXISTS {live}_sealed BEFORE INSERT "
+                    f"ON {live} BEGIN SELECT RAISE(ABORT, '{_SEALED}'); END"
+                )
+                self._install_rollup_triggers(source, name)
+                if source in getattr(self, "_search_indexed", ()):
+                    self._install_search_index(source, name)
+                rebuild_view(self.db, source)
+                logger.info("Opened partition %s", name)
+            self.db.execute("RELEASE partition_roll")
+        except sqlite3.Error:
+            self.db.execute("ROLLBACK TO partition_roll")
+            self.db.execute("RELEASE partition_roll")
+            raise
+
+    def _routed_sql(self, table: str, sql: str) -> str:
+        """``sql`` with INSERT INTO <table> pointed at the live partition."""
+        live = self._live_partitions[table]
+        routed = self._partition_sql.get((table, sql))
+        if routed is None:
+            routed = re.sub(rf"\bINTO\s+{table}\b", f"INTO {live}", sql, count=1)
+            self._partition_sql[(table, sql)] = routed
+        return routed
+
+    def _execute_write(
+        self, table: str, sql: str, params, many: bool = False
+    ) -> sqlite3.Cursor:
+        """Execute a write to ``table``, routing inserts to its live partition.
+
+        Row ids are only known once a statement targets the partition
+        itself (lastrowid is not set through an INSTEAD OF trigger).
+        """
+        execute = self.db.executemany if many else self.db.execute
+        if table not in self._live_partitions:
+            return execute(sql, params)
+        if self._partition_clock() >= self._partition_roll_ns:
+            self._roll_partitions()
+        try:
+            return execute(self._routed_sql(table, sql), params)
+        except sqlite3.IntegrityError as e:
+            if _SEALED not in str(e):
+                raise
+            # Another writer opened a new partition; follow it
+            self._load_partitions()
+            if many:
+                raise
+            return execute(self._routed_sql(table, sql), params)
+
+    def _drop_expired_partitions(self, source: str, cutoff_ns: int) -> int:
+        """Expire rows of ``source`` older than ``cutoff_ns``.
+
+        Sealed partitions holding nothing newer than the cutoff are dropped
+        whole; their rows leave the rollup cube through the partition's
+        rollup_partitions counts, without being read.  Partitions whose
+        ingest window lies wholly on one side of the cutoff can still hold
+        rows on the other (history carried over by _convert_to_partitions,
+        late or clock-skewed rows); those expired rows are deleted one by
+        one.  The partition whose window spans the cutoff is left for the
+        next sweep, so rows can outlive the cutoff by up to one window.
+
+        Returns:
+            Number of rows dropped or deleted.
+        """
+        catalog = self.db.execute(
+            "SELECT name, start_ns, end_ns FROM telemetry_partitions "
+            "WHERE source = ? ORDER BY start_ns",
+            (source,),
+        ).fetchall()
+        expired, stragglers = [], []
+        for i, (part, start_ns, end_ns) in enumerate(catalog):
+            newest = self.db.execute(
+                f"SELECT MAX(timestamp_ns) FROM {part}"
+            ).fetchone()[0]
+            if i < len(catalog) - 1 and (newest is None or newest < cutoff_ns):
+                expired.append((part, newest is not None))
+            elif newest is not None and not start_ns < cutoff_ns < end_ns:
+                oldest = self.db.execute(
+                    f"SELECT MIN(timestamp_ns) FROM {part}"
+                ).fetchone()[0]
+                if oldest < cutoff_ns:
+                    stragglers.append(part)
+        if not expired and not stragglers:
+            return 0
+
+        dropped = 0
+        with self._lock:
+            # Builds with SQLITE_SECURE_DELETE (the Debian default) zero
+            # every freed page, which would copy the partition into the WAL
+            secure_delete = self.db.execute("PRAGMA secure_delete").fetchone()[0]
+            self.db.execute("PRAGMA secure_delete = FAST")
+            self.db.execute("SAVEPOINT partition_drop")
+            try:
+                if expired:
+                    self.db.executemany(
+                        "DELETE FROM telemetry_partitions WHERE name = ?",
+                        [(part,) for part, _ in expired],
+                    )
+                    rebuild_view(self.db, source)
+                for part, has_rows in expired:
+                    if has_rows:
+                        dropped += self._subtract_rollups(source, part)
+                    else:
+                        self.db.execute(
+                            "DELETE FROM rollup_partitions WHERE part = ?", (part,)
+                        )
+                    self.db.execute(f"DROP TABLE IF EXISTS {part}_fts")
+                    self.db.execute(f"DROP TABLE {part}")
+                    self.db.execute(
+                        "DELETE FROM sqlite_sequence WHERE name = ?", (part,)
+                    )
+                for part in stragglers:
+                    dropped += self.db.execute(
+                        f"DELETE FROM {part} WHERE timestamp_ns < ?", (cutoff_ns,)
+                    ).rowcount
+                self.db.execute("RELEASE partition_drop")
+            except sqlite3.Error:
+                self.db.execute("ROLLBACK TO partition_drop")
+                self.db.execute("RELEASE partition_drop")
+                raise
+            finally:
+                self.db.execute(f"PRAGMA secure_delete = {secure_delete}")
+                self._load_partitions()
+        if expired:
+            logger.info("Dropped %d partition(s) of %s", len(expired), source)
+        return dropped
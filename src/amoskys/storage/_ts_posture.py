@@ -6,7 +6,9 @@ import logging
 import math
 import sqlite3
 import time
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Optional, Sequence
+
+from amoskys.storage._ts_queries import device_cache_key, device_filter
 
 logger = logging.getLogger("TelemetryStore")
 
@@ -68,19 +70,32 @@ class PostureMixin:
             }
 
     def get_device_posture(
-        self, hours: int = 24, device_id: Optional[str] = None
+        self,
+        hours: int = 24,
+        device_id: Optional[str] = None,
+        device_ids: Optional[Sequence[str]] = None,
     ) -> Dict[str, Any]:
-        """Cross-domain device health summary."""
-        cache_key = f"device_posture:{hours}" + (
-            f":dev:{device_id}" if device_id else ""
+        """Cross-domain device health summary.
+
+        ``device_id`` narrows to one device; ``device_ids`` to an org's
+        allowlist (None = all devices).
+        """
+        cache_key = (
+            f"device_posture:{hours}"
+            + (f":dev:{device_id}" if device_id else "")
+            + device_cache_key(device_ids)
         )
         cached = self._cache.get(cache_key)
         if cached is not None:
             return cached
 
         cutoff_ns = int((time.time() - hours * 3600) * 1e9)
-        dev_sql = " AND device_id = ?2" if device_id else ""
-        q_params: tuple = (cutoff_ns, device_id) if device_id else (cutoff_ns,)
+        if device_id:
+            dev_sql = " AND device_id = ?2"
+            q_params: tuple = (cutoff_ns, device_id)
+        else:
+            dev_sql, dev_ids = device_filter(device_ids, first_param=2)
+            q_params = (cutoff_ns, *dev_ids)
 
         # Domain table volumes (observation counts from raw collector data)
         volume_query = f"""
@@ -227,11 +242,16 @@ class PostureMixin:
         return ("SAFE", -0.3)
 
     def compute_nerve_posture(
-        self, hours: int = 24, device_id: Optional[str] = None
+        self,
+        hours: int = 24,
+        device_id: Optional[str] = None,
+        device_ids: Optional[Sequence[str]] = None,
     ) -> Dict[str, Any]:
         """Compute posture score using the Nerve Signal Model."""
-        cache_key = f"nerve_posture:{hours}" + (
-            f":dev:{device_id}" if device_id else ""
+        cache_key = (
+            f"nerve_posture:{hours}"
+            + (f":dev:{device_id}" if device_id else "")
+            + device_cache_key(device_ids)
         )
         cached = self._cache.get(cache_key)
         if cached is not None:
@@ -239,8 +259,11 @@ class PostureMixin:
 
         now_s = time.time()
         cutoff_ns = int((now_s - hours * 3600) * 1e9)
-        dev_sql = " AND device_id = ?" if device_id else ""
-        dev_params: tuple = (device_id,) if device_id else ()
+        if device_id:
+            dev_sql = " AND device_id = ?"
+            dev_params: tuple = (device_id,)
+        else:
+            dev_sql, dev_params = device_filter(device_ids)
 
         # Fast SQL-aggregate posture: compute danger/safe sums in SQL
         # instead of fetching all rows and looping in Python.
@@ -315,7 +338,9 @@ class PostureMixin:
                 threat_level = level
                 break
 
-        domain_posture = self.get_device_posture(hours, device_id=device_id)
+        domain_posture = self.get_device_posture(
+            hours, device_id=device_id, device_ids=device_ids
+        )
 
         result = {
             "posture_score": posture_score,
@@ -2,18 +2,101 @@
 
 from __future__ import annotations
 
-import json
 import logging
 import sqlite3
 import time
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from amoskys.storage._ts_partitions import partition_names
+from amoskys.storage._ts_rollups import (
+    _CLUSTER_SEVERITY,
+    _SCORED_SOURCES,
+    ROLLUP_SOURCES,
+)
+from amoskys.storage._ts_schema import SEARCH_COLUMNS
 
 logger = logging.getLogger("TelemetryStore")
 
+# Tables whose collection_agent feeds the by_agent breakdown
+_AGENT_SOURCES = (
+    "security_events",
+    "persistence_events",
+    "process_events",
+    "fim_events",
+    "dns_events",
+    "audit_events",
+)
+
+
+def device_filter(
+    device_ids: Optional[Sequence[str]], first_param: Optional[int] = None
+) -> Tuple[str, tuple]:
+    """SQL fragment restricting ``device_id`` to an allowlist.
+
+    Args:
+        device_ids: Allowed device_ids; None means unrestricted and an
+            empty sequence matches nothing (fail closed).
+        first_param: Number the placeholders ?N, ?N+1, ... for queries
+            that use numbered parameters.
+
+    Returns:
+        (" AND device_id IN (...)", params) — both empty when unrestricted
+    """
+    if device_ids is None:
+        return "", ()
+    ids = tuple(device_ids)
+    if not ids:
+        return " AND 0", ()
+    if first_param is None:
+        marks = ", ".join("?" * len(ids))
+    else:
+        marks = ", ".join(f"?{first_param + i}" for i in range(len(ids)))
+    return f" AND device_id IN ({marks})", ids
+
+
+def device_cache_key(device_ids: Optional[Sequence[str]]) -> str:
+    """Cache-key suffix for a device allowlist ("" when unrestricted)."""
+    if device_ids is None:
+        return ""
+    return ":devs:" + ",".join(sorted(device_ids))
+
 
 class QueryMixin:
     """Query methods for cross-domain and security event tables."""
 
+    def _search_from(
+        self, table: str, query: str, columns: Optional[Sequence[str]] = None
+    ) -> Optional[Tuple[str, tuple]]:
+        """FROM clause restricting ``table`` to rows whose text contains ``query``.
+
+        Drives the join from the <table>_fts trigram index and exposes
+        ``match_rank`` (BM25, lower is more relevant).  Returns None when
+        the table has no index or the query is shorter than one trigram;
+        callers then fall back to LIKE.
+
+        Args:
+            table: Domain table (a SEARCH_COLUMNS key).
+            query: Substring to find (case-insensitive).
+            columns: Restrict the match to these indexed columns.
+        """
+        if len(query) < 3 or table not in self._search_indexed:
+            return None
+        match = '"' + query.replace('"', '""') + '"'
+        if columns:
+            match = "{" + " ".join(columns) + "} : " + match
+        # A partitioned table has one index per partition
+        indexes = [f"{t}_fts" for t in partition_names(self.db, table) or [table]]
+        return (
+            "("
+            + " UNION ALL ".join(
+                f"SELECT rowid AS match_rowid, rank AS match_rank FROM {fts} "
+                f"WHERE {fts} MATCH ?"
+                for fts in indexes
+            )
+            + f") AS m CROSS JOIN {table} ON {table}.id = m.match_rowid",
+            (match,) * len(indexes),
+        )
+
     def get_recent_processes(
         self, limit: int = 100, device_id: Optional[str] = None
     ) -> list[dict[str, Any]]:
@@ -126,15 +209,20 @@ class QueryMixin:
         offset: int = 0,
         min_risk: float = 0.0,
         tier: str = "",
+        device_ids: Optional[Sequence[str]] = None,
     ) -> List[Dict[str, Any]]:
         """Query all domain tables via UNION ALL for a unified threat view.
 
         Args:
             tier: If set (e.g. "attack"), only return security_events with
                   that tier value. Empty string = no filter.
+            device_ids: Restrict to these devices (None = all devices)
         """
         # 10s cache for identical params (dashboard polls every 5-15s)
-        cache_key = f"unified_threats:{hours}:{limit}:{offset}:{min_risk}:{tier}"
+        cache_key = (
+            f"unified_threats:{hours}:{limit}:{offset}:{min_risk}:{tier}"
+            + device_cache_key(device_ids)
+        )
         cached = self._cache.get(cache_key)
         if cached is not None:
             return cached
@@ -143,6 +231,7 @@ class QueryMixin:
         risk_clause_anom = f"AND anomaly_score > {min_risk}" if min_risk > 0 else ""
         risk_clause_threat = f"AND threat_score > {min_risk}" if min_risk > 0 else ""
         tier_clause = f"AND tier = '{tier}'" if tier else ""
+        dev_sql, dev_params = device_filter(device_ids)
         sub_limit = limit + offset
         query = f"""
             SELECT * FROM (
@@ -151,26 +240,26 @@ class QueryMixin:
                    timestamp_ns, timestamp_dt, mitre_techniques, indicators,
                    collection_agent, device_id, final_classification,
                    requires_investigation, event_action
-            FROM security_events WHERE timestamp_ns > ? {risk_clause} {tier_clause}
+            FROM security_events WHERE timestamp_ns > ?{dev_sql} {risk_clause} {tier_clause}
             ORDER BY timestamp_ns DESC LIMIT {sub_limit}
             ) UNION ALL SELECT * FROM (
             SELECT id, 'persistence', event_type, reason, risk_score,
                    confidence, timestamp_ns, timestamp_dt, mitre_techniques,
                    NULL, collection_agent, device_id, NULL, 1, change_type
-            FROM persistence_events WHERE timestamp_ns > ? {risk_clause}
+            FROM persistence_events WHERE timestamp_ns > ?{dev_sql} {risk_clause}
             ORDER BY timestamp_ns DESC LIMIT {sub_limit}
             ) UNION ALL SELECT * FROM (
             SELECT id, 'process', process_category, exe, anomaly_score,
                    confidence_score, timestamp_ns, timestamp_dt, NULL,
                    NULL, collection_agent, device_id, NULL,
                    CAST(is_suspicious AS INT), NULL
-            FROM process_events WHERE timestamp_ns > ? {risk_clause_anom}
+            FROM process_events WHERE timestamp_ns > ?{dev_sql} {risk_clause_anom}
             ORDER BY timestamp_ns DESC LIMIT {sub_limit}
             ) UNION ALL SELECT * FROM (
             SELECT id, 'fim', event_type, reason, risk_score,
                    confidence, timestamp_ns, timestamp_dt, mitre_techniques,
                    NULL, collection_agent, device_id, NULL, 0, change_type
-            FROM fim_events WHERE timestamp_ns > ? {risk_clause}
+            FROM fim_events WHERE timestamp_ns > ?{dev_sql} {risk_clause}
             ORDER BY timestamp_ns DESC LIMIT {sub_limit}
             ) UNION ALL SELECT * FROM (
             SELECT id, 'flow', protocol,
@@ -179,24 +268,24 @@ class QueryMixin:
                    threat_score, 0.5, timestamp_ns, timestamp_dt, NULL,
                    NULL, NULL, device_id, NULL,
                    CAST(is_suspicious AS INT), NULL
-            FROM flow_events WHERE timestamp_ns > ? {risk_clause_threat}
+            FROM flow_events WHERE timestamp_ns > ?{dev_sql} {risk_clause_threat}
             ORDER BY timestamp_ns DESC LIMIT {sub_limit}
             ) UNION ALL SELECT * FROM (
             SELECT id, 'dns', event_type, 'DNS: ' || domain, risk_score,
                    confidence, timestamp_ns, timestamp_dt, mitre_techniques,
                    NULL, collection_agent, device_id, NULL, 0, NULL
-            FROM dns_events WHERE timestamp_ns > ? {risk_clause}
+            FROM dns_events WHERE timestamp_ns > ?{dev_sql} {risk_clause}
             ORDER BY timestamp_ns DESC LIMIT {sub_limit}
             ) UNION ALL SELECT * FROM (
             SELECT id, 'audit', event_type, reason, risk_score,
                    confidence, timestamp_ns, timestamp_dt, mitre_techniques,
                    NULL, collection_agent, device_id, NULL, 0, NULL
-            FROM audit_events WHERE timestamp_ns > ? {risk_clause}
+            FROM audit_events WHERE timestamp_ns > ?{dev_sql} {risk_clause}
             ORDER BY timestamp_ns DESC LIMIT {sub_limit}
             )
             ORDER BY timestamp_ns DESC LIMIT ? OFFSET ?
         """
-        params = [cutoff_ns] * 7 + [limit, offset]
+        params = [cutoff_ns, *dev_params] * 7 + [limit, offset]
         with self._read_pool.connection() as rdb:
             try:
                 cursor = rdb.execute(query, params)
@@ -252,58 +341,31 @@ class QueryMixin:
                 return 0
 
     def get_unified_event_counts(self, hours: int = 24) -> Dict[str, Any]:
-        """Aggregate event counts across all domain tables."""
+        """Aggregate event counts across all domain tables (from the rollup cube)."""
         cache_key = f"unified_counts:{hours}"
         cached = self._cache.get(cache_key)
         if cached is not None:
             return cached
         cutoff_ns = int((time.time() - hours * 3600) * 1e9)
-        tables = {
-            "security_events": "event_category",
-            "persistence_events": "event_type",
-            "process_events": "process_category",
-            "fim_events": "event_type",
-            "flow_events": "protocol",
-            "dns_events": "event_type",
-            "audit_events": "event_type",
-            "peripheral_events": "event_type",
+        result: Dict[str, Any] = {
+            "total": 0,
+            "by_source": {s.replace("_events", ""): 0 for s in ROLLUP_SOURCES},
+            "by_category": {},
         }
-        count_only_tables = ["observation_events"]
-        result: Dict[str, Any] = {"total": 0, "by_source": {}, "by_category": {}}
         with self._read_pool.connection() as rdb:
-            for table, cat_col in tables.items():
-                try:
-                    row = rdb.execute(
-                        f"SELECT COUNT(*) FROM {table} WHERE timestamp_ns > ?",
-                        (cutoff_ns,),
-                    ).fetchone()
-                    count = row[0] if row else 0
-                    result["by_source"][table.replace("_events", "")] = count
-                    result["total"] += count
-
-                    cats = rdb.execute(
-                        f"SELECT {cat_col}, COUNT(*) FROM {table} "
-                        f"WHERE timestamp_ns > ? GROUP BY {cat_col}",
-                        (cutoff_ns,),
-                    ).fetchall()
-                    for cat_row in cats:
-                        if cat_row[0]:
-                            result["by_category"][cat_row[0]] = (
-                                result["by_category"].get(cat_row[0], 0) + cat_row[1]
-                            )
-                except sqlite3.Error:
-                    continue
-            for table in count_only_tables:
-                try:
-                    row = rdb.execute(
-                        f"SELECT COUNT(*) FROM {table} WHERE timestamp_ns > ?",
-                        (cutoff_ns,),
-                    ).fetchone()
-                    count = row[0] if row else 0
-                    result["by_source"][table.replace("_events", "")] = count
-                    result["total"] += count
-                except sqlite3.Error:
-                    continue
+            try:
+                rows = self._rollup_counts(rdb, cutoff_ns, ("source", "category"))
+            except sqlite3.Error as e:
+                logger.error("Failed unified event counts: %s", e)
+                rows = []
+        for source, category, count in rows:
+            result["by_source"][source.replace("_events", "")] += count
+            result["total"] += count
+            # Observations are counted but have no category breakdown
+            if category and source != "observation_events":
+                result["by_category"][category] = (
+                    result["by_category"].get(category, 0) + count
+                )
         self._cache.put(cache_key, result, ttl=30)
         return result
 
@@ -349,32 +411,35 @@ class QueryMixin:
 
         return result
 
-    def get_threat_score_data(self, hours: int = 1) -> Dict[str, Any]:
+    def get_threat_score_data(
+        self, hours: int = 1, device_ids: Optional[Sequence[str]] = None
+    ) -> Dict[str, Any]:
         """Calculate threat score across ALL domain tables."""
         cutoff_ns = int((time.time() - hours * 3600) * 1e9)
+        dev_sql, dev_params = device_filter(device_ids)
 
         try:
-            query = """
+            query = f"""
                 SELECT COUNT(*) as cnt,
                        COALESCE(AVG(rs), 0) as avg_risk,
                        COALESCE(MAX(rs), 0) as max_risk,
                        COALESCE(SUM(CASE WHEN rs > 0.7 THEN 1 ELSE 0 END), 0) as critical_count
                 FROM (
-                    SELECT risk_score as rs FROM security_events WHERE timestamp_ns > ?
+                    SELECT risk_score as rs FROM security_events WHERE timestamp_ns > ?{dev_sql}
                     UNION ALL
-                    SELECT risk_score FROM persistence_events WHERE timestamp_ns > ?
+                    SELECT risk_score FROM persistence_events WHERE timestamp_ns > ?{dev_sql}
                     UNION ALL
-                    SELECT anomaly_score FROM process_events WHERE timestamp_ns > ?
+                    SELECT anomaly_score FROM process_events WHERE timestamp_ns > ?{dev_sql}
                     UNION ALL
-                    SELECT risk_score FROM fim_events WHERE timestamp_ns > ?
+                    SELECT risk_score FROM fim_events WHERE timestamp_ns > ?{dev_sql}
                     UNION ALL
-                    SELECT threat_score FROM flow_events WHERE timestamp_ns > ?
+                    SELECT threat_score FROM flow_events WHERE timestamp_ns > ?{dev_sql}
                     UNION ALL
-                    SELECT risk_score FROM dns_events WHERE timestamp_ns > ?
+                    SELECT risk_score FROM dns_events WHERE timestamp_ns > ?{dev_sql}
                 )
             """
             with self._lock:
-                cursor = self.db.execute(query, (cutoff_ns,) * 6)
+                cursor = self.db.execute(query, (cutoff_ns, *dev_params) * 6)
                 row = cursor.fetchone()
             cnt = row[0]
             avg_risk = row[1]
@@ -471,9 +536,11 @@ class QueryMixin:
 
         return result
 
-    def get_unified_event_clustering(self, hours: int = 24) -> Dict[str, Any]:
+    def get_unified_event_clustering(
+        self, hours: int = 24, device_ids: Optional[Sequence[str]] = None
+    ) -> Dict[str, Any]:
         """Cluster events across ALL domain tables by severity, agent, and hour."""
-        cache_key = f"unified_clustering:{hours}"
+        cache_key = f"unified_clustering:{hours}" + device_cache_key(device_ids)
         cached = self._cache.get(cache_key)
         if cached is not None:
             return cached
@@ -482,106 +549,46 @@ class QueryMixin:
             "by_severity": {"low": 0, "medium": 0, "high": 0, "critical": 0},
             "by_agent": {},
             "by_hour": {},
-            "by_source": {},
+            "by_source": {
+                label: 0
+                for label in (
+                    "security",
+                    "persistence",
+                    "process",
+                    "fim",
+                    "flow",
+                    "dns",
+                    "observation",
+                    "audit",
+                    "peripheral",
+                )
+            },
         }
 
-        sev_query = """
-            SELECT
-                SUM(CASE WHEN rs < 0.25 THEN 1 ELSE 0 END),
-                SUM(CASE WHEN rs >= 0.25 AND rs < 0.5 THEN 1 ELSE 0 END),
-                SUM(CASE WHEN rs >= 0.5 AND rs < 0.75 THEN 1 ELSE 0 END),
-                SUM(CASE WHEN rs >= 0.75 THEN 1 ELSE 0 END)
-            FROM (
-                SELECT risk_score as rs FROM security_events WHERE timestamp_ns > ?
-                UNION ALL
-                SELECT risk_score FROM persistence_events WHERE timestamp_ns > ?
-                UNION ALL
-                SELECT anomaly_score FROM process_events WHERE timestamp_ns > ?
-                UNION ALL
-                SELECT risk_score FROM fim_events WHERE timestamp_ns > ?
-                UNION ALL
-                SELECT threat_score FROM flow_events WHERE timestamp_ns > ?
-                UNION ALL
-                SELECT risk_score FROM dns_events WHERE timestamp_ns > ?
-            )
-        """
-        hour_query = """
-            SELECT hr, SUM(cnt) FROM (
-                SELECT SUBSTR(timestamp_dt, 12, 2) as hr, COUNT(*) as cnt
-                FROM security_events WHERE timestamp_ns > ? GROUP BY hr
-                UNION ALL
-                SELECT SUBSTR(timestamp_dt, 12, 2), COUNT(*)
-                FROM persistence_events WHERE timestamp_ns > ? GROUP BY 1
-                UNION ALL
-                SELECT SUBSTR(timestamp_dt, 12, 2), COUNT(*)
-                FROM process_events WHERE timestamp_ns > ? GROUP BY 1
-                UNION ALL
-                SELECT SUBSTR(timestamp_dt, 12, 2), COUNT(*)
-                FROM fim_events WHERE timestamp_ns > ? GROUP BY 1
-                UNION ALL
-                SELECT SUBSTR(timestamp_dt, 12, 2), COUNT(*)
-                FROM flow_events WHERE timestamp_ns > ? GROUP BY 1
-                UNION ALL
-                SELECT SUBSTR(timestamp_dt, 12, 2), COUNT(*)
-                FROM dns_events WHERE timestamp_ns > ? GROUP BY 1
-            ) GROUP BY hr ORDER BY hr
-        """
-
         with self._read_pool.connection() as rdb:
             try:
-                row = rdb.execute(sev_query, (cutoff_ns,) * 6).fetchone()
-                if row:
-                    result["by_severity"] = {
-                        "low": row[0] or 0,
-                        "medium": row[1] or 0,
-                        "high": row[2] or 0,
-                        "critical": row[3] or 0,
-                    }
-
-                for hr_row in rdb.execute(hour_query, (cutoff_ns,) * 6).fetchall():
-                    if hr_row[0]:
-                        result["by_hour"][hr_row[0]] = hr_row[1]
-
-                tables = {
-                    "security": "security_events",
-                    "persistence": "persistence_events",
-                    "process": "process_events",
-                    "fim": "fim_events",
-                    "flow": "flow_events",
-                    "dns": "dns_events",
-                    "observation": "observation_events",
-                    "audit": "audit_events",
-                    "peripheral": "peripheral_events",
-                }
-                for label, table in tables.items():
-                    cnt = rdb.execute(
-                        f"SELECT COUNT(*) FROM {table} WHERE timestamp_ns > ?",
-                        (cutoff_ns,),
-                    ).fetchone()[0]
-                    result["by_source"][label] = cnt
-
-                for table in [
-                    "security_events",
-                    "persistence_events",
-                    "process_events",
-                    "fim_events",
-                    "dns_events",
-                    "audit_events",
-                ]:
-                    rows = rdb.execute(
-                        f"SELECT collection_agent, COUNT(*) FROM {table} "
-                        f"WHERE timestamp_ns > ? AND collection_agent IS NOT NULL "
-                        f"GROUP BY collection_agent",
-                        (cutoff_ns,),
-                    ).fetchall()
-                    for r in rows:
-                        if r[0]:
-                            result["by_agent"][r[0]] = (
-                                result["by_agent"].get(r[0], 0) + r[1]
-                            )
-
+                rows = self._rollup_counts(
+                    rdb,
+                    cutoff_ns,
+                    ("source", "agent", "severity", "hour_of_day"),
+                    device_ids,
+                    hourly=True,
+                )
             except sqlite3.Error as e:
                 logger.error("Failed unified event clustering: %s", e)
+                rows = []
+
+        by_hour: Dict[str, int] = {}
+        for source, agent, band, hour, count in rows:
+            result["by_source"][source.replace("_events", "")] += count
+            if source in _SCORED_SOURCES:
+                by_hour[hour] = by_hour.get(hour, 0) + count
+                level = _CLUSTER_SEVERITY.get(band)
+                if level:
+                    result["by_severity"][level] += count
+            if agent and source in _AGENT_SOURCES:
+                result["by_agent"][agent] = result["by_agent"].get(agent, 0) + count
+        result["by_hour"] = dict(sorted(by_hour.items()))
 
         self._cache.put(cache_key, result, ttl=30)
         return result
@@ -596,79 +603,35 @@ class QueryMixin:
         min_risk: Optional[float] = None,
         category: Optional[str] = None,
         device_id: Optional[str] = None,
+        ranked: bool = False,
     ) -> Dict[str, Any]:
-        """Full-text search across event tables for threat hunting."""
-        allowed_tables = {
-            "security_events",
-            "process_events",
-            "flow_events",
-            "peripheral_events",
-            "dns_events",
-            "audit_events",
-            "persistence_events",
-            "fim_events",
-            "observation_events",
-        }
-        if table not in allowed_tables:
+        """Full-text search across event tables for threat hunting.
+
+        Queries of three or more characters use the table's FTS5 trigram
+        index (substring match, like LIKE '%query%' over SEARCH_COLUMNS).
+        Results are newest first, or by BM25 relevance when ``ranked``.
+        """
+        if table not in SEARCH_COLUMNS:
             table = "security_events"
 
         cutoff_ns = int((time.time() - hours * 3600) * 1e9)
         params: list = [cutoff_ns]
         where_clauses = ["timestamp_ns > ?"]
+        from_sql, from_params = table, ()
+        order_sql = "timestamp_ns DESC"
 
         if query:
-            if table == "security_events":
-                where_clauses.append(
-                    "(description LIKE ? OR indicators LIKE ? OR event_category LIKE ?)"
-                )
-                q = f"%{query}%"
-                params.extend([q, q, q])
-            elif table == "process_events":
-                where_clauses.append(
-                    "(exe LIKE ? OR cmdline LIKE ? OR username LIKE ?)"
-                )
-                q = f"%{query}%"
-                params.extend([q, q, q])
-            elif table == "flow_events":
-                where_clauses.append(
-                    "(src_ip LIKE ? OR dst_ip LIKE ? OR protocol LIKE ?)"
-                )
-                q = f"%{query}%"
-                params.extend([q, q, q])
-            elif table == "peripheral_events":
-                where_clauses.append(
-                    "(device_name LIKE ? OR device_type LIKE ? OR manufacturer LIKE ?)"
-                )
-                q = f"%{query}%"
-                params.extend([q, q, q])
-            elif table == "dns_events":
-                where_clauses.append(
-                    "(domain LIKE ? OR event_type LIKE ? OR process_name LIKE ?)"
-                )
-                q = f"%{query}%"
-                params.extend([q, q, q])
-            elif table == "audit_events":
-                where_clauses.append(
-                    "(syscall LIKE ? OR exe LIKE ? OR comm LIKE ? OR reason LIKE ?)"
-                )
-                q = f"%{query}%"
-                params.extend([q, q, q, q])
-            elif table == "persistence_events":
-                where_clauses.append(
-                    "(mechanism LIKE ? OR path LIKE ? OR command LIKE ? OR reason LIKE ?)"
-                )
-                q = f"%{query}%"
-                params.extend([q, q, q, q])
-            elif table == "fim_events":
+            indexed = self._search_from(table, query)
+            if indexed is not None:
+                from_sql, from_params = indexed
+                if ranked:
+                    order_sql = "m.match_rank, timestamp_ns DESC"
+            else:
+                columns = SEARCH_COLUMNS[table]
                 where_clauses.append(
-                    "(path LIKE ? OR event_type LIKE ? OR reason LIKE ?)"
+                    "(" + " OR ".join(f"{c} LIKE ?" for c in columns) + ")"
                 )
-                q = f"%{query}%"
-                params.extend([q, q, q])
-            elif table == "observation_events":
-                where_clauses.append("(attributes LIKE ? OR domain LIKE ?)")
-                q = f"%{query}%"
-                params.extend([q, q])
+                params.extend([f"%{query}%"] * len(columns))
 
         if min_risk is not None and table in (
             "security_events",
@@ -690,16 +653,18 @@ class QueryMixin:
             params.append(device_id)
 
         where_sql = " AND ".join(where_clauses)
+        params = [*from_params, *params]
 
         try:
             count_cursor = self.db.execute(
-                f"SELECT COUNT(*) FROM {table} WHERE {where_sql}", params
+                f"SELECT COUNT(*) FROM {from_sql} WHERE {where_sql}", params
             )
             total = count_cursor.fetchone()[0]
 
             fetch_params = params + [limit, offset]
             cursor = self.db.execute(
-                f"SELECT * FROM {table} WHERE {where_sql} ORDER BY timestamp_ns DESC LIMIT ? OFFSET ?",
+                f"SELECT {table}.* FROM {from_sql} WHERE {where_sql} "
+                f"ORDER BY {order_sql} LIMIT ? OFFSET ?",
                 fetch_params,
             )
             rows = [dict(r) for r in cursor.fetchall()]
@@ -725,25 +690,18 @@ class QueryMixin:
         """Get MITRE ATT&CK technique coverage from security events."""
         try:
             cursor = self.db.execute(
-                "SELECT mitre_techniques, event_category "
-                "FROM security_events WHERE mitre_techniques IS NOT NULL"
+                "SELECT et.technique, COALESCE(s.event_category, 'unknown'), "
+                "COUNT(*) FROM event_techniques et "
+                "JOIN security_events s ON s.id = et.event_rowid "
+                "GROUP BY et.technique, s.event_category"
             )
             coverage: Dict[str, Dict] = {}
-            for row in cursor.fetchall():
-                try:
-                    techniques = json.loads(row[0]) if row[0] else []
-                except (json.JSONDecodeError, TypeError):
-                    continue
-                if not isinstance(techniques, list):
-                    continue
-                cat = row[1] or "unknown"
-                for tech in techniques:
-                    if tech not in coverage:
-                        coverage[tech] = {"count": 0, "categories": {}}
-                    coverage[tech]["count"] += 1
-                    coverage[tech]["categories"][cat] = (
-                        coverage[tech]["categories"].get(cat, 0) + 1
-                    )
+            for tech, cat, count in cursor.fetchall():
+                entry = coverage.get(tech)
+                if entry is None:
+                    entry = coverage[tech] = {"count": 0, "categories": {}}
+                entry["count"] += count
+                entry["categories"][cat] = entry["categories"].get(cat, 0) + count
             return coverage
         except sqlite3.Error as e:
             logger.error("Failed to get MITRE coverage: %s", e)
@@ -788,7 +746,9 @@ class QueryMixin:
         """
         with self._lock:
             try:
-                params = (cutoff_ns, limit, device_id) if device_id else (cutoff_ns, limit)
+                params = (
+                    (cutoff_ns, limit, device_id) if device_id else (cutoff_ns, limit)
+                )
                 rows = self.db.execute(query, params).fetchall()
                 return [
                     {
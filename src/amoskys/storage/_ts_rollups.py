@@ -6,13 +6,181 @@ import json
 import logging
 import sqlite3
 import time
-from datetime import datetime, timedelta, timezone
-from typing import Dict
+from datetime import datetime, timezone
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
 
+from amoskys.storage._ts_changefeed import max_rowid
+from amoskys.storage._ts_partitions import partition_names
 from amoskys.storage._ts_schema import _HOUR_FMT
 
 logger = logging.getLogger("TelemetryStore")
 
+# Domain tables in the rollup cube: source -> (category column, risk column)
+ROLLUP_SOURCES: Dict[str, Tuple[str, str]] = {
+    "security_events": ("event_category", "risk_score"),
+    "persistence_events": ("event_type", "risk_score"),
+    "process_events": ("process_category", "anomaly_score"),
+    "fim_events": ("event_type", "risk_score"),
+    "flow_events": ("protocol", "threat_score"),
+    "dns_events": ("event_type", "risk_score"),
+    "audit_events": ("event_type", "risk_score"),
+    "peripheral_events": ("event_type", "risk_score"),
+    "observation_events": ("domain", "risk_score"),
+}
+
+# (table, bucket column, bucket width in minutes)
+_ROLLUP_LEVELS = (
+    ("rollup_minute", "minute", 1),
+    ("rollup_hour", "hour", 60),
+    ("rollup_day", "day", 1440),
+)
+_ROLLUP_KEY = "source, device_id, category, agent, severity"
+_NS_PER_MINUTE = 60 * 10**9
+
+# Tables scored by the severity and hour-of-day dashboards
+_SCORED_SOURCES = (
+    "security_events",
+    "persistence_events",
+    "process_events",
+    "fim_events",
+    "flow_events",
+    "dns_events",
+)
+
+# Risk bands are stored by floor (in %).  The edges are every threshold the
+# dashboards use, so each severity label is an exact union of bands.
+_CLUSTER_SEVERITY = {
+    0: "low",
+    1: "low",
+    25: "medium",
+    30: "medium",
+    50: "high",
+    75: "critical",
+    80: "critical",
+}
+_THREAT_SEVERITY = {
+    1: "low",
+    25: "low",
+    30: "medium",
+    50: "high",
+    75: "high",
+    80: "critical",
+}
+
+
+def _severity_sql(col: str) -> str:
+    return (
+        f"CASE WHEN {col} IS NULL THEN -1 WHEN {col} <= 0 THEN 0 "
+        f"WHEN {col} < 0.25 THEN 1 WHEN {col} < 0.3 THEN 25 "
+        f"WHEN {col} < 0.5 THEN 30 WHEN {col} < 0.75 THEN 50 "
+        f"WHEN {col} < 0.8 THEN 75 ELSE 80 END"
+    )
+
+
+def _bucket_sql(ref: str, minutes: int) -> str:
+    return (
+        f"CAST(COALESCE({ref}timestamp_ns, 0) / {_NS_PER_MINUTE * minutes} AS INTEGER)"
+    )
+
+
+def _dims_sql(source: str, ref: str = "") -> str:
+    """device, category, agent and severity of a row of ``source``."""
+    category, risk = ROLLUP_SOURCES[source]
+    return (
+        f"'{source}', COALESCE({ref}device_id, ''), COALESCE({ref}{category}, ''), "
+        f"COALESCE({ref}collection_agent, ''), {_severity_sql(ref + risk)}"
+    )
+
+
+def _upsert_sql(table: str, column: str) -> str:
+    return (
+        f"INSERT INTO {table} ({column}, {_ROLLUP_KEY}, count) "
+        f"{{rows}} ON CONFLICT({column}, {_ROLLUP_KEY}) "
+        "DO UPDATE SET count = count + excluded.count"
+    )
+
+
+def _advance_statements(source: str) -> List[str]:
+    """Fold rows of ``source`` with after < id <= last into each level."""
+    return [
+        _upsert_sql(table, column).format(
+            rows=f"SELECT {_bucket_sql('', width)}, {_dims_sql(source)}, COUNT(*) "
+            f"FROM {source} WHERE id > ? AND id <= ? GROUP BY 1, 3, 4, 5, 6"
+        )
+        for table, column, width in _ROLLUP_LEVELS
+    ]
+
+
+def _trigger_statements(source: str, table: Optional[str] = None) -> List[str]:
+    """UPDATE/DELETE triggers moving already-counted rows between buckets.
+
+    ``table`` is the physical table when ``source`` is partitioned.
+    """
+    table = table or source
+
+    def apply(ref: str, delta: int) -> str:
+        return "".join(
+            _upsert_sql(table, column).format(
+                rows=f"VALUES ({_bucket_sql(ref, width)}, {_dims_sql(source, ref)}, "
+                f"{delta})"
+            )
+            + ";\n"
+            for table, column, width in _ROLLUP_LEVELS
+        )
+
+    category, risk = ROLLUP_SOURCES[source]
+    counted = (
+        "WHEN OLD.id <= (SELECT last_rowid FROM rollup_watermarks "
+        f"WHERE source = '{source}')"
+    )
+    return [
+        f"CREATE TRIGGER IF NOT EXISTS rollup_{table}_delete "
+        f"AFTER DELETE ON {table} {counted}\nBEGIN\n{apply('OLD.', -1)}END",
+        f"CREATE TRIGGER IF NOT EXISTS rollup_{table}_update "
+        f"AFTER UPDATE OF timestamp_ns, device_id, {category}, collection_agent, "
+        f"{risk} ON {table} {counted}\n"
+        f"BEGIN\n{apply('OLD.', -1)}{apply('NEW.', 1)}END",
+    ]
+
+
+def _ledger_upsert_sql() -> str:
+    return (
+        f"INSERT INTO rollup_partitions (part, minute, {_ROLLUP_KEY}, count) "
+        f"{{rows}} ON CONFLICT(part, minute, {_ROLLUP_KEY}) "
+        "DO UPDATE SET count = count + excluded.count"
+    )
+
+
+def _ledger_trigger_statements(source: str, table: str) -> List[str]:
+    """Triggers keeping ``table``'s rollup_partitions counts in step with
+    UPDATE/DELETE of its already-counted rows (``table`` is a partition)."""
+
+    def apply(ref: str, delta: int) -> str:
+        return (
+            _ledger_upsert_sql().format(
+                rows=f"VALUES ('{table}', {_bucket_sql(ref, 1)}, "
+                f"{_dims_sql(source, ref)}, {delta})"
+            )
+            + ";\n"
+        )
+
+    category, risk = ROLLUP_SOURCES[source]
+    counted = (
+        "WHEN OLD.id <= (SELECT last_rowid FROM rollup_watermarks "
+        f"WHERE source = '{source}')"
+    )
+    return [
+        f"CREATE TRIGGER IF NOT EXISTS rollup_{table}_ledger_delete "
+        f"AFTER DELETE ON {table} {counted}\nBEGIN\n{apply('OLD.', -1)}END",
+        f"CREATE TRIGGER IF NOT EXISTS rollup_{table}_ledger_update "
+        f"AFTER UPDATE OF timestamp_ns, device_id, {category}, collection_agent, "
+        f"{risk} ON {table} {counted}\n"
+        f"BEGIN\n{apply('OLD.', -1)}{apply('NEW.', 1)}END",
+    ]
+
+
+_ADVANCE_SQL = {source: _advance_statements(source) for source in ROLLUP_SOURCES}
+
 
 class RollupMixin:
     """Prewarm loop, hourly rollup writes, observation rollups, backfill."""
@@ -46,6 +214,12 @@ class RollupMixin:
         _amrdr_counter = 0
         while True:
             try:
+                # Rows committed by other writer processes (this one folds
+                # its own on commit)
+                if not self._batch_mode:
+                    with self._lock:
+                        self._advance_rollups()
+                        self.db.commit()
                 for cache_key, fn in _keys:
                     self._cache.invalidate(cache_key)
                     fn()
@@ -72,8 +246,230 @@ class RollupMixin:
                 logger.debug("Prewarm cycle failed, will retry", exc_info=True)
             time.sleep(20)
 
+    # ── Rollup Cube ──
+
+    def _init_rollups(self) -> None:
+        """Install the triggers that keep counted rows in step with the cube."""
+        for source in ROLLUP_SOURCES:
+            for table in partition_names(self.db, source) or [source]:
+                self._install_rollup_triggers(source, table)
+                if table != source:
+                    self._ledger_partition(source, table)
+        self.db.commit()
+
+    def _install_rollup_triggers(self, source: str, table: str) -> None:
+        """Rollup triggers on ``table`` (``source`` or one of its partitions)."""
+        statements = _trigger_statements(source, table)
+        if table != source:
+            statements += _ledger_trigger_statements(source, table)
+        for sql in statements:
+            self.db.execute(sql)
+
+    def _ledger_partition(self, source: str, table: str) -> None:
+        """Count the already-rolled-up rows of a partition with no
+        rollup_partitions entries (the table a store was converted from).
+
+        One scan, once: afterwards the counts are kept by folding and by
+        the ledger triggers.
+        """
+        if self.db.execute(
+            "SELECT 1 FROM rollup_partitions WHERE part = ? LIMIT 1", (table,)
+        ).fetchone():
+            return
+        row = self.db.execute(
+            "SELECT last_rowid FROM rollup_watermarks WHERE source = ?", (source,)
+        ).fetchone()
+        self.db.execute(
+            _ledger_upsert_sql().format(
+                rows=f"SELECT ?, {_bucket_sql('', 1)}, {_dims_sql(source)}, "
+                f"COUNT(*) FROM {table} WHERE id <= ? GROUP BY 2, 4, 5, 6, 7"
+            ),
+            (table, row[0] if row else 0),
+        )
+
+    def _advance_rollups(self, sources: Optional[Iterable[str]] = None) -> int:
+        """Fold rows added since each source's watermark into the rollups.
+
+        Runs in the caller's transaction, so the counts and the watermark
+        commit together with the rows they cover.  Cost is proportional to
+        the new rows only.
+
+        Returns:
+            Number of rows folded in.
+        """
+        folded = 0
+        for source in ROLLUP_SOURCES if sources is None else sources:
+            statements = _ADVANCE_SQL.get(source)
+            if statements is None:
+                continue
+            row = self.db.execute(
+                "SELECT last_rowid FROM rollup_watermarks WHERE source = ?",
+                (source,),
+            ).fetchone()
+            last = row[0] if row else 0
+            top = max_rowid(self.db, source)
+            if top <= last:
+                continue
+            if source in getattr(self, "_live_partitions", ()):
+                self._fold_partitions(source, last, top)
+            else:
+                for sql in statements:
+                    self.db.execute(sql, (last, top))
+            self.db.execute(
+                "INSERT INTO rollup_watermarks (source, last_rowid) VALUES (?, ?) "
+                "ON CONFLICT(source) DO UPDATE SET last_rowid = excluded.last_rowid",
+                (source, top),
+            )
+            folded += top - last
+        return folded
+
+    def _fold_partitions(self, source: str, last: int, top: int) -> None:
+        """Fold rows last < id <= top of a partitioned ``source`` into the
+        rollups and into the rollup_partitions counts of their partitions.
+
+        Ids grow across partitions, so only the newest partitions are read.
+        """
+        self.db.execute(
+            "CREATE TEMP TABLE IF NOT EXISTS rollup_fold (part TEXT, "
+            f"minute INTEGER, {_ROLLUP_KEY}, count INTEGER)"
+        )
+        self.db.execute("DELETE FROM temp.rollup_fold")
+        for part in reversed(partition_names(self.db, source)):
+            newest = self.db.execute(f"SELECT MAX(rowid) FROM {part}").fetchone()[0]
+            if newest is None:
+                continue
+            if newest <= last:
+                break
+            self.db.execute(
+                f"INSERT INTO temp.rollup_fold SELECT ?, {_bucket_sql('', 1)}, "
+                f"{_dims_sql(source)}, COUNT(*) FROM {part} "
+                "WHERE id > ? AND id <= ? GROUP BY 2, 4, 5, 6, 7",
+                (part, last, top),
+            )
+        for rollup, column, width in _ROLLUP_LEVELS:
+            self.db.execute(
+                _upsert_sql(rollup, column).format(
+                    rows=f"SELECT minute / {width}, {_ROLLUP_KEY}, SUM(count) "
+                    "FROM temp.rollup_fold WHERE 1 GROUP BY 1, 2, 3, 4, 5, 6"
+                )
+            )
+        self.db.execute(
+            _ledger_upsert_sql().format(
+                rows=f"SELECT part, minute, {_ROLLUP_KEY}, count "
+                "FROM temp.rollup_fold WHERE 1"
+            )
+        )
+
+    def _fold_rollups(self) -> None:
+        """Advance the rollups for tables written since the last commit."""
+        dirty, self._rollup_dirty = self._rollup_dirty, set()
+        if not dirty:
+            return
+        try:
+            self._advance_rollups(sorted(dirty))
+        except sqlite3.Error:
+            logger.debug("Rollup advance failed", exc_info=True)
+
+    def _rollup_counts(
+        self,
+        conn: sqlite3.Connection,
+        since_ns: int,
+        fields: Sequence[str],
+        device_ids: Optional[Sequence[str]] = None,
+        hourly: bool = False,
+    ) -> List[tuple]:
+        """Event counts since ``since_ns`` grouped by ``fields``.
+
+        Reads the minute rollup up to the first hour boundary, the hour
+        rollup up to the first day boundary and the day rollup after that,
+        plus any rows not yet folded in (id above the watermark), so
+        the result matches a COUNT(*) over the raw tables at minute
+        resolution.
+
+        Args:
+            conn: Connection to read with.
+            since_ns: Window start; rounded down to the minute.
+            fields: Any of source, device_id, category, agent, severity and
+                hour_of_day ("00".."23", UTC).
+            device_ids: Optional device allowlist (see device_filter).
+            hourly: Stop at hour grain so hour_of_day can be derived.
+        """
+        from amoskys.storage._ts_queries import device_filter
+
+        dev_sql, dev_params = device_filter(device_ids)
+        start = since_ns // _NS_PER_MINUTE
+        hour0 = -(-start // 60)
+        day0 = -(-hour0 // 24)
+        ranges = [(start, hour0 * 60), (hour0, None if hourly else day0 * 24)]
+        if not hourly:
+            ranges.append((day0, None))
+
+        cols = "source, device_id, category, agent, severity, count"
+        parts: List[str] = []
+        params: List = []
+        for (table, column, width), (lo, hi) in zip(_ROLLUP_LEVELS, ranges):
+            sql = f"SELECT {column} * {width} AS t, {cols} FROM {table} WHERE {column} >= ?"
+            params.append(lo)
+            if hi is not None:
+                sql += f" AND {column} < ?"
+                params.append(hi)
+            parts.append(sql + dev_sql)
+            params += dev_params
+        for source in ROLLUP_SOURCES:
+            parts.append(
+                f"SELECT {_bucket_sql('', 1)}, {_dims_sql(source)}, 1 FROM {source} "
+                "WHERE id > COALESCE((SELECT last_rowid FROM rollup_watermarks "
+                f"WHERE source = '{source}'), 0) AND timestamp_ns >= ?{dev_sql}"
+            )
+            params += [start * _NS_PER_MINUTE, *dev_params]
+
+        group = ", ".join(
+            "printf('%02d', t / 60 % 24)" if f == "hour_of_day" else f for f in fields
+        )
+        sql = (
+            f"SELECT {group}, SUM(count) FROM ("
+            + " UNION ALL ".join(parts)
+            + f") GROUP BY {group}"
+        )
+        return conn.execute(sql, params).fetchall()
+
+    def _subtract_rollups(self, source: str, table: str) -> int:
+        """Take the rows of ``table``, a partition of ``source`` about to be
+        dropped, out of the rollups.
+
+        Reads the partition's rollup_partitions counts, not its rows, so the
+        cost follows the number of buckets it spans.
+
+        Returns:
+            Number of rows in the partition.
+        """
+        for rollup, column, width in _ROLLUP_LEVELS:
+            self.db.execute(
+                _upsert_sql(rollup, column).format(
+                    rows=f"SELECT minute / {width}, {_ROLLUP_KEY}, -SUM(count) "
+                    "FROM rollup_partitions WHERE part = ? GROUP BY 1, 2, 3, 4, 5, 6"
+                ),
+                (table,),
+            )
+        counted = self.db.execute(
+            "SELECT SUM(count) FROM rollup_partitions WHERE part = ?", (table,)
+        ).fetchone()[0]
+        self.db.execute("DELETE FROM rollup_partitions WHERE part = ?", (table,))
+        row = self.db.execute(
+            "SELECT last_rowid FROM rollup_watermarks WHERE source = ?", (source,)
+        ).fetchone()
+        pending = self.db.execute(
+            f"SELECT COUNT(*) FROM {table} WHERE id > ?", (row[0] if row else 0,)
+        )
+        return (counted or 0) + pending.fetchone()[0]
+
+    def _prune_rollups(self) -> None:
+        """Drop buckets emptied by deletes."""
+        for table in [level[0] for level in _ROLLUP_LEVELS] + ["rollup_partitions"]:
+            self.db.execute(f"DELETE FROM {table} WHERE count <= 0")
+
     def _write_hourly_rollups(self) -> None:
-        """Compute and upsert hourly rollups into dashboard_rollups."""
+        """Upsert this hour's dashboard_rollups from the rollup cube."""
         now_ns = int(time.time() * 1e9)
         now_dt = datetime.now(timezone.utc)
         bucket_hour = now_dt.strftime(_HOUR_FMT)
@@ -81,75 +477,34 @@ class RollupMixin:
             now_dt.replace(minute=0, second=0, microsecond=0).timestamp() * 1e9
         )
 
-        _domain_tables = [
-            ("security", "security_events"),
-            ("process", "process_events"),
-            ("flow", "flow_events"),
-            ("dns", "dns_events"),
-            ("audit", "audit_events"),
-            ("fim", "fim_events"),
-            ("persistence", "persistence_events"),
-            ("peripheral", "peripheral_events"),
-            ("observation", "observation_events"),
-        ]
+        by_domain = {source.replace("_events", ""): 0 for source in ROLLUP_SOURCES}
+        severity_counts: dict = {"critical": 0, "high": 0, "medium": 0, "low": 0}
         with self._read_pool.connection() as conn:
-            for domain, table in _domain_tables:
-                try:
-                    row = conn.execute(
-                        f"SELECT COUNT(*) FROM {table} WHERE timestamp_ns >= ?",
-                        (hour_start_ns,),
-                    ).fetchone()
-                    count = row[0] if row else 0
-                    self.db.execute(
-                        "INSERT INTO dashboard_rollups "
-                        "(rollup_type, bucket_key, bucket_hour, value, updated_ns) "
-                        "VALUES ('events_by_domain', ?, ?, ?, ?) "
-                        "ON CONFLICT(rollup_type, bucket_key, bucket_hour) DO UPDATE SET "
-                        "value=excluded.value, updated_ns=excluded.updated_ns",
-                        (domain, bucket_hour, count, now_ns),
-                    )
-                except Exception:
-                    logger.debug("Rollup query failed for %s", domain, exc_info=True)
-
-            risk_col_map = {
-                "security_events": "risk_score",
-                "flow_events": "threat_score",
-                "dns_events": "risk_score",
-                "fim_events": "risk_score",
-                "persistence_events": "risk_score",
-                "process_events": "anomaly_score",
-            }
-            severity_counts: dict = {"critical": 0, "high": 0, "medium": 0, "low": 0}
-            for table, col in risk_col_map.items():
-                try:
-                    row = conn.execute(
-                        f"""SELECT
-                            SUM(CASE WHEN {col} >= 0.8 THEN 1 ELSE 0 END),
-                            SUM(CASE WHEN {col} >= 0.5 AND {col} < 0.8 THEN 1 ELSE 0 END),
-                            SUM(CASE WHEN {col} >= 0.3 AND {col} < 0.5 THEN 1 ELSE 0 END),
-                            SUM(CASE WHEN {col} > 0 AND {col} < 0.3 THEN 1 ELSE 0 END)
-                        FROM {table} WHERE timestamp_ns >= ?""",
-                        (hour_start_ns,),
-                    ).fetchone()
-                    if row:
-                        severity_counts["critical"] += row[0] or 0
-                        severity_counts["high"] += row[1] or 0
-                        severity_counts["medium"] += row[2] or 0
-                        severity_counts["low"] += row[3] or 0
-                except Exception:
-                    logger.debug(
-                        "Severity rollup query failed for %s", table, exc_info=True
-                    )
-
-            for sev, cnt in severity_counts.items():
-                self.db.execute(
-                    "INSERT INTO dashboard_rollups "
-                    "(rollup_type, bucket_key, bucket_hour, value, updated_ns) "
-                    "VALUES ('threats_by_severity', ?, ?, ?, ?) "
-                    "ON CONFLICT(rollup_type, bucket_key, bucket_hour) DO UPDATE SET "
-                    "value=excluded.value, updated_ns=excluded.updated_ns",
-                    (sev, bucket_hour, cnt, now_ns),
-                )
+            rows = self._rollup_counts(conn, hour_start_ns, ("source", "severity"))
+        for source, band, count in rows:
+            by_domain[source.replace("_events", "")] += count
+            level = _THREAT_SEVERITY.get(band)
+            if level and source in _SCORED_SOURCES:
+                severity_counts[level] += count
+
+        for domain, count in by_domain.items():
+            self.db.execute(
+                "INSERT INTO dashboard_rollups "
+                "(rollup_type, bucket_key, bucket_hour, value, updated_ns) "
+                "VALUES ('events_by_domain', ?, ?, ?, ?) "
+                "ON CONFLICT(rollup_type, bucket_key, bucket_hour) DO UPDATE SET "
+                "value=excluded.value, updated_ns=excluded.updated_ns",
+                (domain, bucket_hour, count, now_ns),
+            )
+        for sev, cnt in severity_counts.items():
+            self.db.execute(
+                "INSERT INTO dashboard_rollups "
+                "(rollup_type, bucket_key, bucket_hour, value, updated_ns) "
+                "VALUES ('threats_by_severity', ?, ?, ?, ?) "
+                "ON CONFLICT(rollup_type, bucket_key, bucket_hour) DO UPDATE SET "
+                "value=excluded.value, updated_ns=excluded.updated_ns",
+                (sev, bucket_hour, cnt, now_ns),
+            )
 
         try:
             posture = self.compute_nerve_posture(hours=24)
@@ -169,7 +524,8 @@ class RollupMixin:
         except Exception:
             logger.debug("Observation rollup write failed", exc_info=True)
 
-        self.db.commit()
+        with self._lock:
+            self.db.commit()
 
     # ── Observation Rollup Configuration ──────────────────────────────────
     _OBSERVATION_RAW_RETENTION_HOURS = 2
@@ -330,50 +686,29 @@ class RollupMixin:
             pass
 
     def backfill_rollups(self, hours: int = 72) -> int:
-        """Backfill dashboard_rollups for the last N hours of historical data."""
-        now = datetime.now(timezone.utc)
+        """Backfill dashboard_rollups for the last N hours from rollup_hour."""
         now_ns = int(time.time() * 1e9)
+        first_hour = now_ns // (_NS_PER_MINUTE * 60) - hours + 1
         total = 0
 
-        _domain_tables = [
-            ("security", "security_events"),
-            ("process", "process_events"),
-            ("flow", "flow_events"),
-            ("dns", "dns_events"),
-            ("audit", "audit_events"),
-            ("fim", "fim_events"),
-            ("persistence", "persistence_events"),
-            ("peripheral", "peripheral_events"),
-            ("observation", "observation_events"),
-        ]
-
-        for h in range(hours):
-            hour_dt = now - timedelta(hours=h)
-            bucket_hour = hour_dt.strftime(_HOUR_FMT)
-            hour_start = hour_dt.replace(minute=0, second=0, microsecond=0)
-            hour_end = hour_start + timedelta(hours=1)
-            start_ns = int(hour_start.timestamp() * 1e9)
-            end_ns = int(hour_end.timestamp() * 1e9)
-
-            for domain, table in _domain_tables:
-                try:
-                    row = self.db.execute(
-                        f"SELECT COUNT(*) FROM {table} "
-                        f"WHERE timestamp_ns >= ? AND timestamp_ns < ?",
-                        (start_ns, end_ns),
-                    ).fetchone()
-                    count = row[0] if row else 0
-                    if count > 0:
-                        self.db.execute(
-                            "INSERT OR REPLACE INTO dashboard_rollups "
-                            "(rollup_type, bucket_key, bucket_hour, value, updated_ns) "
-                            "VALUES ('events_by_domain', ?, ?, ?, ?)",
-                            (domain, bucket_hour, count, now_ns),
-                        )
-                        total += 1
-                except Exception:
-                    logger.debug("Backfill query failed for %s", domain, exc_info=True)
-
-        self.db.commit()
+        with self._lock:
+            self._advance_rollups()
+            rows = self.db.execute(
+                "SELECT hour, source, SUM(count) FROM rollup_hour "
+                "WHERE hour >= ? GROUP BY hour, source HAVING SUM(count) > 0",
+                (first_hour,),
+            ).fetchall()
+            for hour, source, count in rows:
+                bucket_hour = datetime.fromtimestamp(
+                    hour * 3600, tz=timezone.utc
+                ).strftime(_HOUR_FMT)
+                self.db.execute(
+                    "INSERT OR REPLACE INTO dashboard_rollups "
+                    "(rollup_type, bucket_key, bucket_hour, value, updated_ns) "
+                    "VALUES ('events_by_domain', ?, ?, ?, ?)",
+                    (source.replace("_events", ""), bucket_hour, count, now_ns),
+                )
+                total += 1
+            self.db.commit()
         logger.info("Backfilled %d rollup entries for %d hours", total, hours)
         return total
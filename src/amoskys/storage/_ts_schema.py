@@ -4,6 +4,9 @@ from __future__ import annotations
 
 import logging
 import sqlite3
+from typing import Dict, FrozenSet, List, Optional, Tuple
+
+from amoskys.storage._ts_partitions import execute_ddl, partition_names
 
 logger = logging.getLogger("TelemetryStore")
 
@@ -276,6 +279,22 @@ CREATE INDEX IF NOT EXISTS idx_security_classification ON security_events(final_
 CREATE INDEX IF NOT EXISTS idx_security_event_timestamp ON security_events(event_timestamp_ns DESC);
 CREATE INDEX IF NOT EXISTS idx_security_event_id ON security_events(event_id);
 
+-- One row per (security event, MITRE technique), exploded from the
+-- mitre_techniques JSON at insert time so coverage and technique lookups
+-- are index reads instead of JSON parsing over the whole table.
+CREATE TABLE IF NOT EXISTS event_techniques (
+    event_rowid INTEGER NOT NULL,
+    technique TEXT NOT NULL,
+    tactic TEXT,
+    timestamp_ns INTEGER NOT NULL,
+    device_id TEXT,
+    PRIMARY KEY (event_rowid, technique)
+) WITHOUT ROWID;
+
+CREATE INDEX IF NOT EXISTS idx_event_techniques_tech ON event_techniques(technique, timestamp_ns DESC);
+CREATE INDEX IF NOT EXISTS idx_event_techniques_ts ON event_techniques(timestamp_ns);
+CREATE INDEX IF NOT EXISTS idx_event_techniques_device ON event_techniques(device_id, technique);
+
 -- Peripheral Events Table (USB/Bluetooth/external devices)
 CREATE TABLE IF NOT EXISTS peripheral_events (
     id INTEGER PRIMARY KEY AUTOINCREMENT,
@@ -797,15 +816,161 @@ CREATE TABLE IF NOT EXISTS dashboard_rollups (
     updated_ns  INTEGER NOT NULL,
     PRIMARY KEY (rollup_type, bucket_key, bucket_hour)
 ) WITHOUT ROWID;
+
+-- Continuous aggregates (event counts per source/device/category/agent/
+-- risk band) at minute, hour and day grain.  New rows are folded in by
+-- rowid watermark when a write commits; UPDATE/DELETE triggers installed
+-- by RollupMixin._init_rollups() keep rolled-up rows in step.
+CREATE TABLE IF NOT EXISTS rollup_minute (
+    minute    INTEGER NOT NULL,  -- timestamp_ns // 60s
+    source    TEXT NOT NULL,     -- domain table name
+    device_id TEXT NOT NULL,
+    category  TEXT NOT NULL,
+    agent     TEXT NOT NULL,
+    severity  INTEGER NOT NULL,  -- risk band floor in % (-1 = unscored)
+    count     INTEGER NOT NULL,
+    PRIMARY KEY (minute, source, device_id, category, agent, severity)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS rollup_hour (
+    hour      INTEGER NOT NULL,
+    source    TEXT NOT NULL,
+    device_id TEXT NOT NULL,
+    category  TEXT NOT NULL,
+    agent     TEXT NOT NULL,
+    severity  INTEGER NOT NULL,
+    count     INTEGER NOT NULL,
+    PRIMARY KEY (hour, source, device_id, category, agent, severity)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS rollup_day (
+    day       INTEGER NOT NULL,
+    source    TEXT NOT NULL,
+    device_id TEXT NOT NULL,
+    category  TEXT NOT NULL,
+    agent     TEXT NOT NULL,
+    severity  INTEGER NOT NULL,
+    count     INTEGER NOT NULL,
+    PRIMARY KEY (day, source, device_id, category, agent, severity)
+) WITHOUT ROWID;
+
+-- Highest rowid of each source already counted in the rollup tables
+CREATE TABLE IF NOT EXISTS rollup_watermarks (
+    source     TEXT PRIMARY KEY,
+    last_rowid INTEGER NOT NULL
+) WITHOUT ROWID;
+
+-- Minute counts of the rows of each partition already in the rollup
+-- tables, so a dropped partition leaves the cube without reading its rows
+CREATE TABLE IF NOT EXISTS rollup_partitions (
+    part      TEXT NOT NULL,     -- partition table (telemetry_partitions.name)
+    minute    INTEGER NOT NULL,
+    source    TEXT NOT NULL,
+    device_id TEXT NOT NULL,
+    category  TEXT NOT NULL,
+    agent     TEXT NOT NULL,
+    severity  INTEGER NOT NULL,
+    count     INTEGER NOT NULL,
+    PRIMARY KEY (part, minute, source, device_id, category, agent, severity)
+) WITHOUT ROWID;
+
+-- Time partitions of domain tables turned into views by PartitionMixin
+-- (AMOSKYS_PARTITION_HOURS).  The newest partition of a source is live.
+CREATE TABLE IF NOT EXISTS telemetry_partitions (
+    name     TEXT PRIMARY KEY,  -- physical table, <source>_p<window>
+    source   TEXT NOT NULL,     -- view name
+    start_ns INTEGER NOT NULL,  -- ingest window
+    end_ns   INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_telemetry_partitions_source
+    ON telemetry_partitions(source, start_ns);
 """
 
 
 _HOUR_FMT = "%Y-%m-%dT%H"
 
+# Columns searched by search_events / search_observations.  Each table gets
+# an external-content FTS5 index <table>_fts over them, using the trigram
+# tokenizer so a phrase query matches any substring (the old LIKE '%q%').
+SEARCH_COLUMNS: Dict[str, Tuple[str, ...]] = {
+    "security_events": ("description", "indicators", "event_category"),
+    "process_events": ("exe", "cmdline", "username"),
+    "flow_events": ("src_ip", "dst_ip", "protocol"),
+    "peripheral_events": ("device_name", "device_type", "manufacturer"),
+    "dns_events": ("domain", "event_type", "process_name"),
+    "audit_events": ("syscall", "exe", "comm", "reason"),
+    "persistence_events": ("mechanism", "path", "command", "reason"),
+    "fim_events": ("path", "event_type", "reason"),
+    "observation_events": ("attributes", "domain"),
+}
+
+
+def _search_index_statements(source: str, table: Optional[str] = None) -> List[str]:
+    """FTS5 table plus the triggers that keep it in step with ``table``.
+
+    ``table`` is the physical table when ``source`` is partitioned.
+    """
+    table = table or source
+    cols = SEARCH_COLUMNS[source]
+    fts = f"{table}_fts"
+    names = ", ".join(cols)
+    new = ", ".join(f"NEW.{c}" for c in cols)
+    old = ", ".join(f"OLD.{c}" for c in cols)
+    delete = (
+        f"INSERT INTO {fts} ({fts}, rowid, {names}) VALUES ('delete', OLD.id, {old});"
+    )
+    insert = f"INSERT INTO {fts} (rowid, {names}) VALUES (NEW.id, {new});"
+    return [
+        f"""CREATE VIRTUAL TABLE IF NOT EXISTS {fts} USING fts5(
+    {names},
+    content='{table}', content_rowid='id', tokenize='trigram'
+)""",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_insert AFTER INSERT ON {table}\n"
+        f"BEGIN {insert} END",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_delete AFTER DELETE ON {table}\n"
+        f"BEGIN {delete} END",
+        f"CREATE TRIGGER IF NOT EXISTS {fts}_update AFTER UPDATE OF {names} "
+        f"ON {table}\nBEGIN {delete} {insert} END",
+    ]
+
 
 class SchemaMixin:
     """Schema migration methods for TelemetryStore."""
 
+    def _init_search_indexes(self) -> FrozenSet[str]:
+        """Create the FTS5 search indexes (if possible) and list the live ones.
+
+        Existing rows are indexed by migration 016.  SQLite builds without
+        FTS5 keep working; search falls back to LIKE for those tables.
+
+        Returns:
+            Tables whose <table>_fts index exists (for a partitioned
+            table, every partition's).
+        """
+        tables = {
+            source: partition_names(self.db, source) or [source]
+            for source in SEARCH_COLUMNS
+        }
+        if not self.db.execute("PRAGMA query_only").fetchone()[0]:
+            try:
+                for source, physical in tables.items():
+                    for table in physical:
+                        self._install_search_index(source, table)
+                self.db.commit()
+            except sqlite3.Error:
+                logger.warning("FTS5 search indexes unavailable", exc_info=True)
+        names = {row[0] for row in self.db.execute("SELECT name FROM sqlite_master")}
+        return frozenset(
+            source
+            for source, physical in tables.items()
+            if all(f"{table}_fts" in names for table in physical)
+        )
+
+    def _install_search_index(self, source: str, table: str) -> None:
+        """FTS5 index and sync triggers on ``table`` (``source`` or a partition)."""
+        for sql in _search_index_statements(source, table):
+            self.db.execute(sql)
+
     def _migrate_wal_dead_letter_schema(self) -> None:
         """Ensure wal_dead_letter has reason/replay metadata columns."""
         try:
@@ -826,16 +991,17 @@ class SchemaMixin:
             logger.exception("Failed to migrate wal_dead_letter schema")
 
     def _ensure_column(self, table: str, column: str, ddl: str) -> None:
-        """Add a column if it does not already exist."""
+        """Add a column if it does not already exist (to every partition
+        when ``table`` is partitioned)."""
         exists = self.db.execute(
-            "SELECT 1 FROM sqlite_master WHERE type='table' AND name=?",
+            "SELECT 1 FROM sqlite_master WHERE type IN ('table', 'view') AND name=?",
             (table,),
         ).fetchone()
         if not exists:
             return
         cols = {row["name"] for row in self.db.execute(f"PRAGMA table_info({table})")}
         if column not in cols:
-            self.db.execute(f"ALTER TABLE {table} ADD COLUMN {column} {ddl}")
+            execute_ddl(self.db, f"ALTER TABLE {table} ADD COLUMN {column} {ddl}")
 
     def _migrate_convergence_schema(self) -> None:
         """Backfill convergence columns used by contract/quality lineage."""
@@ -916,9 +1082,10 @@ class SchemaMixin:
             self._ensure_column("security_events", "tier", "TEXT DEFAULT 'observation'")
             # Index for tier filtering
             try:
-                self.db.execute(
+                execute_ddl(
+                    self.db,
                     "CREATE INDEX IF NOT EXISTS idx_security_tier "
-                    "ON security_events(tier, timestamp_ns DESC)"
+                    "ON security_events(tier, timestamp_ns DESC)",
                 )
             except sqlite3.Error:
                 pass
@@ -4,12 +4,19 @@ from __future__ import annotations
 
 import json
 import logging
+import os
 import socket
+import time
 from datetime import datetime, timezone
 from typing import Any, List
 
 logger = logging.getLogger("WALProcessor")
 
+# Security events are scored in micro-batches so the ML models run once per
+# batch: flush when this many are queued or the oldest has waited this long.
+_SCORE_BATCH_SIZE = int(os.environ.get("AMOSKYS_SCORE_BATCH", "64"))
+_SCORE_BATCH_MAX_WAIT_S = int(os.environ.get("AMOSKYS_SCORE_BATCH_MS", "250")) / 1000.0
+
 
 class SecurityMixin:
     """Security event processing, extraction, and domain-specific extractors."""
@@ -274,231 +281,298 @@ class SecurityMixin:
             except Exception:
                 logger.debug("Forensic enrichment failed", exc_info=True)
 
-            # Score event for signal/noise classification
-            if self._scorer is not None and not training_exclude:
-                try:
-                    self._scorer.score_event(event_data)
-                except Exception:
-                    logger.warning(
-                        "Scoring failed for event — continuing", exc_info=True
-                    )
+            # Score event for signal/noise classification. Inside a WAL batch
+            # the event waits in the scoring micro-batch; otherwise it is
+            # scored and stored right away.
+            pending = (event, se, event_data, collection_agent, training_exclude)
+            self._queue_security_event(pending)
+        except Exception as e:
+            logger.error("Failed to insert security event: %s", e)
 
-            # Re-classify after scoring — the scorer may have adjusted risk_score
-            event_data["final_classification"] = SecurityMixin._classify_risk(
-                event_data.get("risk_score", 0.0)
-            )
+    # ── Scoring micro-batches ───────────────────────────────────────
 
-            # Sigma detection-as-code: evaluate against stateless rules
-            try:
-                from amoskys.detection.sigma_engine import SigmaEngine
-
-                if not hasattr(self, "_sigma"):
-                    self._sigma = SigmaEngine()
-                    self._sigma_aliases = {
-                        "macos_launchagent_new": "new_launch_agent",
-                        "macos_launchagent_modified": "new_launch_agent",
-                        "macos_cron_new": "cron_modification",
-                        "macos_cron_modified": "cron_modification",
-                        "macos_quarantine_bypass": "quarantine_bypass",
-                        "macos_hidden_file_new": "hidden_file_created",
-                        "log_tampering_detected": "log_timestamp_gap",
-                        "suspicious_script": "suspicious_spawn",
-                        "binary_from_temp": "suspicious_spawn",
-                        "browser_to_terminal": "browser_to_terminal",
-                        "browser_credential_theft": "credential_harvest",
-                        "session_cookie_theft": "session_cookie_theft",
-                        "keychain_cli_abuse": "credential_harvest",
-                        "exfil_spike": "data_exfil_http",
-                        "cloud_exfil_detected": "cloud_storage_connection",
-                        "c2_beacon_suspect": "c2_web_beacon",
-                        "connection_burst_detected": "c2_web_beacon",
-                        "cleartext_protocol": "data_exfil_http",
-                        "lateral_ssh": "outbound_ssh",
-                        "fake_password_dialog": "fake_password_dialog",
-                        "port_scan_detected": "schema_enumeration",
-                        "long_lived_connection": "long_lived_connection",
-                    }
-                sigma_input = dict(event_data)
-                cat = sigma_input.get("event_category", "")
-                sigma_input["event_type"] = self._sigma_aliases.get(cat, cat)
-                sigma_matches = self._sigma.evaluate(sigma_input)
-                if sigma_matches:
-                    best = max(
-                        sigma_matches,
-                        key=lambda m: {
-                            "critical": 4,
-                            "high": 3,
-                            "medium": 2,
-                            "low": 1,
-                        }.get(m.level, 0),
-                    )
-                    event_data["detection_source"] = (
-                        event_data.get("detection_source", "") + "|sigma"
-                    )
-                    ind = event_data.get("indicators", {})
-                    if isinstance(ind, str):
-                        ind = json.loads(ind)
-                    ind["sigma_rule_id"] = best.rule_id
-                    ind["sigma_rule_title"] = best.rule_title
-                    ind["sigma_level"] = best.level
-                    event_data["indicators"] = ind
-                    # Merge sigma MITRE techniques into event
-                    if best.mitre_techniques:
-                        existing = set(event_data.get("mitre_techniques") or [])
-                        merged = list(existing)
-                        for t in best.mitre_techniques:
-                            if t not in existing:
-                                merged.append(t)
-                        event_data["mitre_techniques"] = merged
-            except Exception:
-                logger.debug("Sigma evaluation failed", exc_info=True)
-
-            # Extract sequence match score from scoring factors into indicators
-            # so SOMA Brain can use it as a training feature (Step 4)
-            score_factors = event_data.get("score_factors", [])
-            for factor in score_factors:
-                if factor.get("name") == "Attack Sequence Detected":
-                    ind = event_data.get("indicators", {})
-                    if isinstance(ind, str):
-                        try:
-                            ind = json.loads(ind)
-                        except (json.JSONDecodeError, TypeError):
-                            ind = {}
-                    ind["sequence_match_score"] = factor.get("contribution", 0.0)
-                    ind["sequence_detail"] = factor.get("detail", "")
-                    event_data["indicators"] = ind
-                    break
-
-            # Feed AutoCalibrator for autonomous FP detection
-            if self._brain and self._brain._auto_calibrator and not training_exclude:
-                try:
-                    self._brain._auto_calibrator.observe(event_data)
-                except Exception:
-                    logger.debug("AutoCalibrator observation failed", exc_info=True)
-
-            # ── WAL Processor Gate (Mandate Level 2) ──
-            # Reject events that violate mandatory field contracts.
-            # Rejected events go to rejected_events table, not discarded.
-            rejection = self._validate_mandate(event_data, collection_agent)
-            if rejection:
-                self._store_rejected_event(event_data, rejection)
-                return
+    def _begin_score_batch(self) -> None:
+        """Start accumulating security events for batched scoring."""
+        self._score_pending = []
+        self._score_pending_since = 0.0
 
-            # ── Beacon FP suppression (WAL-level, post-enrichment) ──
-            # Legitimate apps that poll DNS periodically are not C2.
-            # Checked HERE (not in the probe) because process_name is
-            # only available after PID resolution and WAL enrichment.
-            _KNOWN_POLLING = {
-                "ChatGPT",
-                "ChatGPTHelper",
-                "Microsoft Update Assistant",
-                "Dropbox",
-                "DropboxUpdater",
-                "Slack",
-                "Slack Helper",
-                "zoom.us",
-                "Spotify",
-                "SpotifyHelper",
-                "Google Chrome",
-                "Google Chrome Helper",
-                "com.docker.backend",
-                "Docker",
-                "WhatsApp",
-                "WhatsAppHelper",
-                "Teams",
-                "MSTeams",
-                "Microsoft Teams WebView Helper",
-                "OneDrive",
-                "Firefox",
-                "Safari",
-                "Mail",
-                "Notes",
-                "Reminders",
-                "Messages",
-                "replicatord",
-                "NewsToday2",
-                "com.apple.WebKit.Networking",
-                "AddressBookSourceSync",
-                "ControlCenter",
-                "com.apple.appkit.xpc.openAndSavePanelService",
-                "GitHub Desktop Helper",
-                "Cluely Helper",
-                "Electron",
-                "Microsoft Excel",
-                "idleassetsd",
-                "multipassd",
-                "desktop_sdk_macos_exe",
-                "syspolicyd",
-            }
-            evt_cat = event_data.get("event_category", "")
-            proc_name = event_data.get("process_name", "")
-            if "beacon" in evt_cat and proc_name in _KNOWN_POLLING:
-                logger.debug("Beacon FP suppressed: %s (%s)", proc_name, evt_cat)
-                event_data["tier"] = "observation"
-                event_data["risk_score"] = min(event_data.get("risk_score", 0), 0.1)
-
-            # ── Noise gate: sub-0.05 risk events are observation-grade ──
-            # These fire on normal system activity (process spawns, new TCP
-            # connections, TCC checks).  They have forensic value but are not
-            # security detections.  Route to observation_events to keep
-            # security_events focused on real signal.
-            final_risk = event_data.get("risk_score", 0.0)
-            if final_risk < 0.05:
-                logger.debug(
-                    "Noise gate: routing %s (risk=%.3f) to observation",
-                    event_data.get("event_category", ""),
-                    final_risk,
-                )
-                # Still store — just in observation tier, not security tier
-                event_data["tier"] = "observation"
-
-            # ── FINAL classification — last step, cannot be overridden ──
-            # Unified thresholds: amoskys.intel.scoring is the single source of
-            # truth (_MALICIOUS_THRESHOLD=0.70 / _SUSPICIOUS_THRESHOLD=0.40),
-            # applied here via _classify_risk() so the local WAL path and the
-            # fleet scoring path can never disagree. Previously this block used
-            # a divergent 0.75/0.5, so a full_kill_chain floored at 0.70 read
-            # "malicious" on the fleet path but "suspicious" here.
-            final_risk = event_data.get("risk_score", 0.0)
-            if final_risk is None:
-                final_risk = 0.0
-            if isinstance(final_risk, str):
-                try:
-                    final_risk = float(final_risk)
-                except (ValueError, TypeError):
-                    final_risk = 0.0
-            final_risk = float(final_risk)
-            event_data["final_classification"] = SecurityMixin._classify_risk(
-                final_risk
-            )
+    def _queue_security_event(self, pending: tuple) -> None:
+        """Add an event to the scoring micro-batch, flushing when it is full.
 
-            # DEBUG: log classification decision for high-risk events
-            if final_risk >= 0.5:
-                logger.info(
-                    "CLASSIFY: risk=%.4f → %s (cat=%s)",
-                    final_risk,
-                    event_data["final_classification"],
-                    event_data.get("event_category", "?"),
+        The batch is bounded both by size (AMOSKYS_SCORE_BATCH) and by how
+        long its oldest event has waited (AMOSKYS_SCORE_BATCH_MS), so a
+        slow trickle never holds an event back for long.
+        """
+        queue = getattr(self, "_score_pending", None)
+        if queue is None:
+            self._score_and_finish([pending])
+            return
+        if not queue:
+            self._score_pending_since = time.monotonic()
+        queue.append(pending)
+        if (
+            len(queue) >= _SCORE_BATCH_SIZE
+            or time.monotonic() - self._score_pending_since >= _SCORE_BATCH_MAX_WAIT_S
+        ):
+            self._flush_score_batch()
+
+    def _flush_score_batch(self) -> None:
+        """Score and store every queued security event, in arrival order."""
+        queue = getattr(self, "_score_pending", None)
+        if not queue:
+            return
+        self._score_pending = []
+        self._score_and_finish(queue)
+
+    def _end_score_batch(self) -> None:
+        """Flush what is queued and return to per-event scoring."""
+        self._flush_score_batch()
+        self._score_pending = None
+
+    def _score_and_finish(self, pending: list) -> None:
+        """Run one ScoringEngine.score_batch() call, then store each event."""
+        if self._scorer is not None:
+            to_score = [p[2] for p in pending if not p[4]]
+            if to_score:
+                try:
+                    errors = self._scorer.score_batch(to_score)
+                except Exception:
+                    logger.warning("Batch scoring failed — continuing", exc_info=True)
+                    errors = []
+                for error in errors:
+                    if error is not None:
+                        logger.warning(
+                            "Scoring failed for event — continuing", exc_info=error
+                        )
+        for event, se, event_data, collection_agent, training_exclude in pending:
+            try:
+                self._finish_security_event(
+                    event, se, event_data, collection_agent, training_exclude
                 )
+            except Exception as e:
+                logger.error("Failed to insert security event: %s", e)
 
-            self.store.insert_security_event(event_data)
+    def _finish_security_event(
+        self,
+        event: Any,
+        se: Any,
+        event_data: dict,
+        collection_agent: str,
+        training_exclude: bool,
+    ) -> None:
+        """Post-scoring half of _process_security_event: detect, gate, store."""
+        # Re-classify after scoring — the scorer may have adjusted risk_score
+        event_data["final_classification"] = SecurityMixin._classify_risk(
+            event_data.get("risk_score", 0.0)
+        )
 
-            # Receipt ledger checkpoint 4: persisted to security_events
-            self.store.receipt_persisted(
-                event.event_id or event_data.get("event_id", ""),
-                collection_agent,
-                "security_events",
-                event_data.get("quality_state", "valid"),
+        # Sigma detection-as-code: evaluate against stateless rules
+        try:
+            from amoskys.detection.sigma_engine import SigmaEngine
+
+            if not hasattr(self, "_sigma"):
+                self._sigma = SigmaEngine()
+                self._sigma_aliases = {
+                    "macos_launchagent_new": "new_launch_agent",
+                    "macos_launchagent_modified": "new_launch_agent",
+                    "macos_cron_new": "cron_modification",
+                    "macos_cron_modified": "cron_modification",
+                    "macos_quarantine_bypass": "quarantine_bypass",
+                    "macos_hidden_file_new": "hidden_file_created",
+                    "log_tampering_detected": "log_timestamp_gap",
+                    "suspicious_script": "suspicious_spawn",
+                    "binary_from_temp": "suspicious_spawn",
+                    "browser_to_terminal": "browser_to_terminal",
+                    "browser_credential_theft": "credential_harvest",
+                    "session_cookie_theft": "session_cookie_theft",
+                    "keychain_cli_abuse": "credential_harvest",
+                    "exfil_spike": "data_exfil_http",
+                    "cloud_exfil_detected": "cloud_storage_connection",
+                    "c2_beacon_suspect": "c2_web_beacon",
+                    "connection_burst_detected": "c2_web_beacon",
+                    "cleartext_protocol": "data_exfil_http",
+                    "lateral_ssh": "outbound_ssh",
+                    "fake_password_dialog": "fake_password_dialog",
+                    "port_scan_detected": "schema_enumeration",
+                    "long_lived_connection": "long_lived_connection",
+                }
+            sigma_input = dict(event_data)
+            cat = sigma_input.get("event_category", "")
+            sigma_input["event_type"] = self._sigma_aliases.get(cat, cat)
+            sigma_matches = self._sigma.evaluate(sigma_input)
+            if sigma_matches:
+                best = max(
+                    sigma_matches,
+                    key=lambda m: {
+                        "critical": 4,
+                        "high": 3,
+                        "medium": 2,
+                        "low": 1,
+                    }.get(m.level, 0),
+                )
+                event_data["detection_source"] = (
+                    event_data.get("detection_source", "") + "|sigma"
+                )
+                ind = event_data.get("indicators", {})
+                if isinstance(ind, str):
+                    ind = json.loads(ind)
+                ind["sigma_rule_id"] = best.rule_id
+                ind["sigma_rule_title"] = best.rule_title
+                ind["sigma_level"] = best.level
+                event_data["indicators"] = ind
+                # Merge sigma MITRE techniques into event
+                if best.mitre_techniques:
+                    existing = set(event_data.get("mitre_techniques") or [])
+                    merged = list(existing)
+                    for t in best.mitre_techniques:
+                        if t not in existing:
+                            merged.append(t)
+                    event_data["mitre_techniques"] = merged
+        except Exception:
+            logger.debug("Sigma evaluation failed", exc_info=True)
+
+        # Extract sequence match score from scoring factors into indicators
+        # so SOMA Brain can use it as a training feature (Step 4)
+        score_factors = event_data.get("score_factors", [])
+        for factor in score_factors:
+            if factor.get("name") == "Attack Sequence Detected":
+                ind = event_data.get("indicators", {})
+                if isinstance(ind, str):
+                    try:
+                        ind = json.loads(ind)
+                    except (json.JSONDecodeError, TypeError):
+                        ind = {}
+                ind["sequence_match_score"] = factor.get("contribution", 0.0)
+                ind["sequence_detail"] = factor.get("detail", "")
+                event_data["indicators"] = ind
+                break
+
+        # Feed AutoCalibrator for autonomous FP detection
+        if self._brain and self._brain._auto_calibrator and not training_exclude:
+            try:
+                self._brain._auto_calibrator.observe(event_data)
+            except Exception:
+                logger.debug("AutoCalibrator observation failed", exc_info=True)
+
+        # ── WAL Processor Gate (Mandate Level 2) ──
+        # Reject events that violate mandatory field contracts.
+        # Rejected events go to rejected_events table, not discarded.
+        rejection = self._validate_mandate(event_data, collection_agent)
+        if rejection:
+            self._store_rejected_event(event_data, rejection)
+            return
+
+        # ── Beacon FP suppression (WAL-level, post-enrichment) ──
+        # Legitimate apps that poll DNS periodically are not C2.
+        # Checked HERE (not in the probe) because process_name is
+        # only available after PID resolution and WAL enrichment.
+        _KNOWN_POLLING = {
+            "ChatGPT",
+            "ChatGPTHelper",
+            "Microsoft Update Assistant",
+            "Dropbox",
+            "DropboxUpdater",
+            "Slack",
+            "Slack Helper",
+            "zoom.us",
+            "Spotify",
+            "SpotifyHelper",
+            "Google Chrome",
+            "Google Chrome Helper",
+            "com.docker.backend",
+            "Docker",
+            "WhatsApp",
+            "WhatsAppHelper",
+            "Teams",
+            "MSTeams",
+            "Microsoft Teams WebView Helper",
+            "OneDrive",
+            "Firefox",
+            "Safari",
+            "Mail",
+            "Notes",
+            "Reminders",
+            "Messages",
+            "replicatord",
+            "NewsToday2",
+            "com.apple.WebKit.Networking",
+            "AddressBookSourceSync",
+            "ControlCenter",
+            "com.apple.appkit.xpc.openAndSavePanelService",
+            "GitHub Desktop Helper",
+            "Cluely Helper",
+            "Electron",
+            "Microsoft Excel",
+            "idleassetsd",
+            "multipassd",
+            "desktop_sdk_macos_exe",
+            "syspolicyd",
+        }
+        evt_cat = event_data.get("event_category", "")
+        proc_name = event_data.get("process_name", "")
+        if "beacon" in evt_cat and proc_name in _KNOWN_POLLING:
+            logger.debug("Beacon FP suppressed: %s (%s)", proc_name, evt_cat)
+            event_data["tier"] = "observation"
+            event_data["risk_score"] = min(event_data.get("risk_score", 0), 0.1)
+
+        # ── Noise gate: sub-0.05 risk events are observation-grade ──
+        # These fire on normal system activity (process spawns, new TCP
+        # connections, TCC checks).  They have forensic value but are not
+        # security detections.  Route to observation_events to keep
+        # security_events focused on real signal.
+        final_risk = event_data.get("risk_score", 0.0)
+        if final_risk < 0.05:
+            logger.debug(
+                "Noise gate: routing %s (risk=%.3f) to observation",
+                event_data.get("event_category", ""),
+                final_risk,
             )
+            # Still store — just in observation tier, not security tier
+            event_data["tier"] = "observation"
+
+        # ── FINAL classification — last step, cannot be overridden ──
+        # Unified thresholds: amoskys.intel.scoring is the single source of
+        # truth (_MALICIOUS_THRESHOLD=0.70 / _SUSPICIOUS_THRESHOLD=0.40),
+        # applied here via _classify_risk() so the local WAL path and the
+        # fleet scoring path can never disagree. Previously this block used
+        # a divergent 0.75/0.5, so a full_kill_chain floored at 0.70 read
+        # "malicious" on the fleet path but "suspicious" here.
+        final_risk = event_data.get("risk_score", 0.0)
+        if final_risk is None:
+            final_risk = 0.0
+        if isinstance(final_risk, str):
+            try:
+                final_risk = float(final_risk)
+            except (ValueError, TypeError):
+                final_risk = 0.0
+        final_risk = float(final_risk)
+        event_data["final_classification"] = SecurityMixin._classify_risk(final_risk)
 
-            logger.debug(
-                "Stored security event: %s (risk=%.2f, agent=%s)",
-                se.event_category,
-                se.risk_score,
-                collection_agent,
+        # DEBUG: log classification decision for high-risk events
+        if final_risk >= 0.5:
+            logger.info(
+                "CLASSIFY: risk=%.4f → %s (cat=%s)",
+                final_risk,
+                event_data["final_classification"],
+                event_data.get("event_category", "?"),
             )
-        except Exception as e:
-            logger.error("Failed to insert security event: %s", e)
+
+        self.store.insert_security_event(event_data)
+
+        # Receipt ledger checkpoint 4: persisted to security_events
+        self.store.receipt_persisted(
+            event.event_id or event_data.get("event_id", ""),
+            collection_agent,
+            "security_events",
+            event_data.get("quality_state", "valid"),
+        )
+
+        logger.debug(
+            "Stored security event: %s (risk=%.2f, agent=%s)",
+            se.event_category,
+            se.risk_score,
+            collection_agent,
+        )
 
     # ── Mandate Level 2: WAL Processor Gate ─────────────────────────
 
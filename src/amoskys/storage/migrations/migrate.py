@@ -36,6 +36,8 @@ from datetime import datetime, timezone
 from pathlib import Path
 from typing import List, Optional, Tuple
 
+from amoskys.storage._ts_partitions import execute_ddl
+
 logger = logging.getLogger(__name__)
 
 SQL_DIR = Path(__file__).parent / "sql"
@@ -112,7 +114,9 @@ def apply_migration(
         # Execute each statement separately (executescript commits implicitly)
         for stmt in _split_statements(sql):
             try:
-                conn.execute(stmt)
+                # ADD COLUMN / CREATE INDEX on a partitioned table are
+                # applied to each of its partitions
+                execute_ddl(conn, stmt)
             except sqlite3.OperationalError as col_err:
                 # Tolerate "duplicate column" from idempotent re-runs
                 if "duplicate column name" in str(col_err):
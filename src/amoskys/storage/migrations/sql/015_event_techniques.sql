@@ -0,0 +1,53 @@
+-- Migration 015: event_techniques junction table
+--
+-- Problem: MITRE coverage and technique search parse the mitre_techniques
+-- JSON of every security event (json.loads in Python, or LIKE '%T1059%').
+--
+-- Solution: one row per (event, technique) with technique/time/device
+-- indexes. New rows are indexed by TelemetryStore on insert, and this
+-- migration backfills the events already on disk.
+
+-- mitre_tactics is normally added by _migrate_convergence_schema, which
+-- runs after migrations. Make sure it exists for the backfill below.
+ALTER TABLE security_events ADD COLUMN mitre_tactics TEXT;
+
+CREATE TABLE IF NOT EXISTS event_techniques (
+    event_rowid INTEGER NOT NULL,
+    technique TEXT NOT NULL,
+    tactic TEXT,
+    timestamp_ns INTEGER NOT NULL,
+    device_id TEXT,
+    PRIMARY KEY (event_rowid, technique)
+) WITHOUT ROWID;
+
+CREATE INDEX IF NOT EXISTS idx_event_techniques_tech
+    ON event_techniques(technique, timestamp_ns DESC);
+CREATE INDEX IF NOT EXISTS idx_event_techniques_ts
+    ON event_techniques(timestamp_ns);
+CREATE INDEX IF NOT EXISTS idx_event_techniques_device
+    ON event_techniques(device_id, technique);
+
+-- Tactics pair with techniques by position when the arrays line up,
+-- otherwise a single tactic applies to every technique.
+INSERT OR IGNORE INTO event_techniques
+    (event_rowid, technique, tactic, timestamp_ns, device_id)
+SELECT s.id, t.value,
+       CASE
+           WHEN json_valid(s.mitre_tactics) = 0 THEN NULL
+           WHEN json_array_length(s.mitre_tactics)
+                = json_array_length(s.mitre_techniques)
+               THEN json_extract(s.mitre_tactics, '$[' || t.key || ']')
+           WHEN json_array_length(s.mitre_tactics) = 1
+               THEN json_extract(s.mitre_tactics, '$[0]')
+       END,
+       s.timestamp_ns, s.device_id
+FROM security_events s,
+     json_each(CASE WHEN json_valid(s.mitre_techniques)
+                    THEN CASE json_type(s.mitre_techniques)
+                         WHEN 'array' THEN s.mitre_techniques END
+               END) t
+WHERE s.mitre_techniques IS NOT NULL
+  AND t.type = 'text';
+
+-- DOWN
+DROP TABLE IF EXISTS event_techniques;
@@ -0,0 +1,102 @@
+-- Migration 016: FTS5 search indexes
+--
+-- Problem: search_events and search_observations filter with
+-- LIKE '%query%', a full scan of the table for every search.
+--
+-- Solution: an external-content FTS5 table <table>_fts per domain table,
+-- trigram tokenized so phrase queries keep substring semantics.
+-- TelemetryStore installs the sync triggers on startup (see
+-- _search_index_statements in _ts_schema.py) and this migration indexes
+-- the rows already on disk. Definitions must match SEARCH_COLUMNS.
+
+CREATE VIRTUAL TABLE IF NOT EXISTS security_events_fts USING fts5(
+    description, indicators, event_category,
+    content='security_events', content_rowid='id', tokenize='trigram'
+);
+INSERT INTO security_events_fts (security_events_fts) VALUES ('rebuild');
+
+CREATE VIRTUAL TABLE IF NOT EXISTS process_events_fts USING fts5(
+    exe, cmdline, username,
+    content='process_events', content_rowid='id', tokenize='trigram'
+);
+INSERT INTO process_events_fts (process_events_fts) VALUES ('rebuild');
+
+CREATE VIRTUAL TABLE IF NOT EXISTS flow_events_fts USING fts5(
+    src_ip, dst_ip, protocol,
+    content='flow_events', content_rowid='id', tokenize='trigram'
+);
+INSERT INTO flow_events_fts (flow_events_fts) VALUES ('rebuild');
+
+CREATE VIRTUAL TABLE IF NOT EXISTS peripheral_events_fts USING fts5(
+    device_name, device_type, manufacturer,
+    content='peripheral_events', content_rowid='id', tokenize='trigram'
+);
+INSERT INTO peripheral_events_fts (peripheral_events_fts) VALUES ('rebuild');
+
+CREATE VIRTUAL TABLE IF NOT EXISTS dns_events_fts USING fts5(
+    domain, event_type, process_name,
+    content='dns_events', content_rowid='id', tokenize='trigram'
+);
+INSERT INTO dns_events_fts (dns_events_fts) VALUES ('rebuild');
+
+CREATE VIRTUAL TABLE IF NOT EXISTS audit_events_fts USING fts5(
+    syscall, exe, comm, reason,
+    content='audit_events', content_rowid='id', tokenize='trigram'
+);
+INSERT INTO audit_events_fts (audit_events_fts) VALUES ('rebuild');
+
+CREATE VIRTUAL TABLE IF NOT EXISTS persistence_events_fts USING fts5(
+    mechanism, path, command, reason,
+    content='persistence_events', content_rowid='id', tokenize='trigram'
+);
+INSERT INTO persistence_events_fts (persistence_events_fts) VALUES ('rebuild');
+
+CREATE VIRTUAL TABLE IF NOT EXISTS fim_events_fts USING fts5(
+    path, event_type, reason,
+    content='fim_events', content_rowid='id', tokenize='trigram'
+);
+INSERT INTO fim_events_fts (fim_events_fts) VALUES ('rebuild');
+
+CREATE VIRTUAL TABLE IF NOT EXISTS observation_events_fts USING fts5(
+    attributes, domain,
+    content='observation_events', content_rowid='id', tokenize='trigram'
+);
+INSERT INTO observation_events_fts (observation_events_fts) VALUES ('rebuild');
+
+-- DOWN
+DROP TRIGGER IF EXISTS security_events_fts_insert;
+DROP TRIGGER IF EXISTS security_events_fts_delete;
+DROP TRIGGER IF EXISTS security_events_fts_update;
+DROP TABLE IF EXISTS security_events_fts;
+DROP TRIGGER IF EXISTS process_events_fts_insert;
+DROP TRIGGER IF EXISTS process_events_fts_delete;
+DROP TRIGGER IF EXISTS process_events_fts_update;
+DROP TABLE IF EXISTS process_events_fts;
+DROP TRIGGER IF EXISTS flow_events_fts_insert;
+DROP TRIGGER IF EXISTS flow_events_fts_delete;
+DROP TRIGGER IF EXISTS flow_events_fts_update;
+DROP TABLE IF EXISTS flow_events_fts;
+DROP TRIGGER IF EXISTS peripheral_events_fts_insert;
+DROP TRIGGER IF EXISTS peripheral_events_fts_delete;
+DROP TRIGGER IF EXISTS peripheral_events_fts_update;
+DROP TABLE IF EXISTS peripheral_events_fts;
+DROP TRIGGER IF EXISTS dns_events_fts_insert;
+DROP TRIGGER IF EXISTS dns_events_fts_delete;
+DROP TRIGGER IF EXISTS dns_events_fts_update;
+DROP TABLE IF EXISTS dns_events_fts;
+DROP TRIGGER IF EXISTS audit_events_fts_insert;
+DROP TRIGGER IF EXISTS audit_events_fts_delete;
+DROP TRIGGER IF EXISTS audit_events_fts_update;
+DROP TABLE IF EXISTS audit_events_fts;
+DROP TRIGGER IF EXISTS persistence_events_fts_insert;
+DROP TRIGGER IF EXISTS persistence_events_fts_delete;
+DROP TRIGGER IF EXISTS persistence_events_fts_update;
+DROP TABLE IF EXISTS persistence_events_fts;
+DROP TRIGGER IF EXISTS fim_events_fts_insert;
+DROP TRIGGER IF EXISTS fim_events_fts_delete;
+DROP TRIGGER IF EXISTS fim_events_fts_update;
+DROP TABLE IF EXISTS fim_events_fts;
+DROP TRIGGER IF EXISTS observation_events_fts_insert;
+DROP TRIGGER IF EXISTS observation_events_fts_delete;
+DROP TRIGGER IF EXISTS observation_events_fts_update;
+DROP TABLE IF EXISTS observation_events_fts;
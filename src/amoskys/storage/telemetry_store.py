@@ -25,9 +25,11 @@ import time
 from pathlib import Path
 
 from amoskys.storage._ts_caching import _ReadPool, _TTLCache
+from amoskys.storage._ts_changefeed import ChangeFeedMixin
 from amoskys.storage._ts_domain_queries import DomainQueryMixin
 from amoskys.storage._ts_inserts import InsertMixin
 from amoskys.storage._ts_lifecycle import LifecycleMixin
+from amoskys.storage._ts_partitions import PartitionMixin, executescript
 from amoskys.storage._ts_posture import PostureMixin
 from amoskys.storage._ts_queries import QueryMixin
 from amoskys.storage._ts_rollups import RollupMixin
@@ -45,7 +47,9 @@ class TelemetryStore(
     PostureMixin,
     SignalMixin,
     RollupMixin,
+    PartitionMixin,
     LifecycleMixin,
+    ChangeFeedMixin,
 ):
     """Permanent storage for processed telemetry data"""
 
@@ -70,12 +74,18 @@ class TelemetryStore(
             self.db.execute("PRAGMA temp_store=MEMORY")
             self.db.execute("PRAGMA mmap_size=268435456")
             self.db.execute("PRAGMA busy_timeout=5000")
-            self._lock = threading.Lock()
+            self._lock = threading.RLock()
             self._read_pool = _ReadPool(db_path, size=4)
             self._batch_mode = False
             self._batch_count = 0
+            self._staged_writes = None
+            self._staged_baseline = {}
+            self._rollup_dirty = set()
+            self._live_partitions = {}
+            self._search_indexed = self._init_search_indexes()
             self._reliability = None
             self._cache = _TTLCache(ttl_seconds=5.0)
+            self._init_changefeed()
             logger.info("TelemetryStore READONLY at %s", db_path)
             return
 
@@ -170,9 +180,12 @@ class TelemetryStore(
             "PRAGMA busy_timeout=15000"
         )  # 15s retry on locked DB instead of immediate SQLITE_BUSY error
         self.db.execute("PRAGMA optimize")  # update query planner statistics
+        # INSERT OR REPLACE must fire the delete triggers of the row it
+        # replaces, or the rollup cube and search indexes keep stale entries
+        self.db.execute("PRAGMA recursive_triggers=ON")
 
         # Create schema
-        self.db.executescript(SCHEMA)
+        executescript(self.db, SCHEMA)
         self.db.commit()
         self._migrate_wal_dead_letter_schema()
 
@@ -190,6 +203,15 @@ class TelemetryStore(
             )
         self._migrate_convergence_schema()
 
+        # Thread-safety: serialize all SQLite operations through a lock.
+        # The dashboard WebSocket updater thread and Flask request threads
+        # share this singleton — concurrent access causes SQLITE_MISUSE.
+        # Re-entrant: a staged flush holding it may open a new partition.
+        self._lock = threading.RLock()
+        self._init_partitions()
+        self._init_rollups()
+        self._search_indexed = self._init_search_indexes()
+
         # Self-heal snapshot dedup baselines — ensures dedup works even
         # after DB rebuild or if migration 013 seeding missed new entries.
         try:
@@ -202,11 +224,6 @@ class TelemetryStore(
 
         logger.info(f"Initialized TelemetryStore at {db_path}")
 
-        # Thread-safety: serialize all SQLite operations through a lock.
-        # The dashboard WebSocket updater thread and Flask request threads
-        # share this singleton — concurrent access causes SQLITE_MISUSE.
-        self._lock = threading.Lock()
-
         # Pool of read-only connections for dashboard queries.
         # WAL mode allows unlimited concurrent readers — the pool
         # eliminates the serialisation bottleneck that a single
@@ -217,6 +234,17 @@ class TelemetryStore(
         # WALProcessor calls begin_batch() before a batch and end_batch() after.
         self._batch_mode: bool = False
         self._batch_count: int = 0
+        # Staged mode (begin_batch(staged=True)): rows accumulate per
+        # (table, statement) and flush with one executemany() each.
+        self._staged_writes: dict | None = None
+        self._staged_baseline: dict = {}
+        # Tables written since the last commit; their rows are folded into
+        # the rollup cube just before it (see RollupMixin._advance_rollups).
+        self._rollup_dirty: set = set()
+
+        # Change feed: rowid tailing + commit notifications for consumers
+        # (AlertMonitor, IGRIS, WebSocket updater) instead of COUNT(*) polls.
+        self._init_changefeed()
 
         # AMRDR: reliability tracker for agent trust cross-validation
         try:
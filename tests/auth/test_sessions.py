@@ -4,6 +4,7 @@ Tests for AMOSKYS Session Management
 Comprehensive test coverage for:
 - Session creation and token handling
 - Session validation with all security checks
+- Validated-session cache and write-behind activity updates
 - Session refresh and sliding expiry
 - Session revocation (single and bulk)
 - Session limit enforcement
@@ -17,18 +18,21 @@ Test Philosophy:
 from __future__ import annotations
 
 import os
+import threading
+from contextlib import contextmanager
 from datetime import datetime, timedelta
 from typing import Generator
 from unittest.mock import patch
 
 import pytest
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import Session as DbSession
 from sqlalchemy.orm import sessionmaker
 
 from amoskys.auth.models import AuditEventType, AuthAuditLog, Session, User, UserRole
 from amoskys.auth.organization import Organization  # noqa: F401 — registers FK target
 from amoskys.auth.password import hash_password
+from amoskys.auth.session_cache import get_session_cache, reset_session_cache
 from amoskys.auth.sessions import (
     SessionConfig,
     SessionValidationResult,
@@ -105,10 +109,12 @@ def test_config() -> SessionConfig:
 
 @pytest.fixture(autouse=True)
 def reset_config():
-    """Reset session config before each test."""
+    """Reset session config and cache before each test."""
     reset_session_config()
+    reset_session_cache()
     yield
     reset_session_config()
+    reset_session_cache()
 
 
 # =============================================================================
@@ -524,6 +530,336 @@ class TestValidateSession:
         assert session.last_active_at >= original_activity
 
 
+# =============================================================================
+# Validated-Session Cache Tests
+# =============================================================================
+
+
+@pytest.fixture
+def other_db(engine) -> Generator[DbSession, None, None]:
+    """A second database session, as used by a later request."""
+    session = sessionmaker(bind=engine, expire_on_commit=False)()
+    try:
+        yield session
+    finally:
+        session.rollback()
+        session.close()
+
+
+@pytest.fixture
+def statements(engine) -> list:
+    """Record every SQL statement executed on the engine."""
+    executed: list = []
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _record(conn, cursor, statement, parameters, context, executemany):
+        executed.append(statement)
+
+    return executed
+
+
+class TestValidationCache:
+    """Tests for the per-process validated-session cache."""
+
+    def test_cache_hit_issues_no_queries(
+        self,
+        db: DbSession,
+        other_db: DbSession,
+        test_user: User,
+        test_config: SessionConfig,
+        statements: list,
+    ) -> None:
+        """A repeated validation is served without touching the database."""
+        token, session = create_session(db, test_user, config=test_config)
+        db.commit()
+        assert validate_session(db, token, config=test_config).is_valid
+
+        statements.clear()
+        result = validate_session(other_db, token, config=test_config)
+        other_db.commit()
+
+        assert result.is_valid is True
+        assert result.session.id == session.id
+        assert result.user.email == test_user.email
+        assert statements == []
+        assert get_session_cache().stats()["hits"] == 1
+
+    def test_miss_loads_user_with_session(
+        self,
+        db: DbSession,
+        other_db: DbSession,
+        test_user: User,
+        test_config: SessionConfig,
+        statements: list,
+    ) -> None:
+        """A cold validation uses one joined SELECT for session and user."""
+        token, _ = create_session(db, test_user, config=test_config)
+        db.commit()
+
+        statements.clear()
+        assert validate_session(other_db, token, config=test_config).is_valid
+        selects = [s for s in statements if s.lstrip().upper().startswith("SELECT")]
+        assert len(selects) == 1
+        assert "JOIN users" in selects[0]
+
+    def test_revoke_session_invalidates(
+        self,
+        db: DbSession,
+        other_db: DbSession,
+        test_user: User,
+        test_config: SessionConfig,
+    ) -> None:
+        """Logout is effective immediately even with a warm cache."""
+        token, _ = create_session(db, test_user, config=test_config)
+        db.commit()
+        assert validate_session(db, token, config=test_config).is_valid
+
+        cached = validate_session(other_db, token, config=test_config)
+        revoke_session(other_db, cached.session)
+        other_db.commit()
+
+        db.expire_all()
+        result = validate_session(db, token, config=test_config)
+        assert result.is_valid is False
+        assert result.error_code == "SESSION_REVOKED"
+
+    def test_revoke_all_invalidates(
+        self,
+        db: DbSession,
+        test_user: User,
+        test_config: SessionConfig,
+    ) -> None:
+        """Bulk revocation drops every cached session of the user."""
+        token1, _ = create_session(db, test_user, config=test_config)
+        token2, session2 = create_session(db, test_user, config=test_config)
+        db.commit()
+        for token in (token1, token2):
+            assert validate_session(db, token, config=test_config).is_valid
+
+        revoke_all_user_sessions(db, test_user.id, except_session_id=session2.id)
+        db.commit()
+        db.expire_all()
+
+        assert get_session_cache().cached_session_ids() == {session2.id}
+        assert validate_session(db, token1, config=test_config).is_valid is False
+        assert validate_session(db, token2, config=test_config).is_valid is True
+
+    def test_revoke_all_invalidates_after_commit(
+        self,
+        db: DbSession,
+        other_db: DbSession,
+        test_user: User,
+        test_config: SessionConfig,
+    ) -> None:
+        """A validation racing an uncommitted bulk revoke is dropped on commit."""
+        token, session = create_session(db, test_user, config=test_config)
+        db.commit()
+        assert validate_session(db, token, config=test_config).is_valid
+        cache = get_session_cache()
+        entries, by_session = dict(cache._entries), dict(cache._by_session)
+
+        revoke_all_user_sessions(other_db, test_user.id)
+        assert session.id not in cache.cached_session_ids()
+        # A concurrent reader re-caches the still-committed row before commit
+        cache._entries.update(entries)
+        cache._by_session.update(by_session)
+        other_db.commit()
+
+        db.expunge_all()
+        result = validate_session(db, token, config=test_config)
+        assert result.is_valid is False
+        assert result.error_code == "SESSION_REVOKED"
+
+    def test_user_change_invalidates(
+        self,
+        db: DbSession,
+        other_db: DbSession,
+        test_user: User,
+        test_config: SessionConfig,
+    ) -> None:
+        """Locking the account through the ORM drops cached sessions."""
+        token, _ = create_session(db, test_user, config=test_config)
+        db.commit()
+        assert validate_session(db, token, config=test_config).is_valid
+
+        user = other_db.get(User, test_user.id)
+        user.locked_until = datetime.utcnow() + timedelta(hours=1)
+        other_db.commit()
+
+        db.expire_all()
+        result = validate_session(db, token, config=test_config)
+        assert result.is_valid is False
+        assert result.error_code == "ACCOUNT_LOCKED"
+
+    def test_checks_rerun_on_cache_hit(
+        self,
+        db: DbSession,
+        other_db: DbSession,
+        test_user: User,
+        test_config: SessionConfig,
+    ) -> None:
+        """Idle timeout and binding are enforced on cached sessions too."""
+        token, _ = create_session(
+            db, test_user, ip_address="1.2.3.4", config=test_config
+        )
+        db.commit()
+        assert validate_session(db, token, config=test_config).is_valid
+
+        bound = SessionConfig(enable_ip_binding=True)
+        result = validate_session(other_db, token, ip_address="5.6.7.8", config=bound)
+        assert result.error_code == "SESSION_IP_MISMATCH"
+
+        assert validate_session(db, token, config=test_config).is_valid
+        later = datetime.utcnow() + timedelta(hours=3)
+        with patch("amoskys.auth.sessions._utcnow", return_value=later):
+            result = validate_session(db, token, config=test_config)
+        assert result.error_code == "SESSION_IDLE_TIMEOUT"
+
+    def test_ttl_zero_disables_cache(
+        self,
+        db: DbSession,
+        test_user: User,
+    ) -> None:
+        """A zero TTL always goes to the database."""
+        config = SessionConfig(validation_cache_ttl_seconds=0)
+        token, _ = create_session(db, test_user, config=config)
+        db.commit()
+        for _ in range(3):
+            assert validate_session(db, token, config=config).is_valid
+        assert get_session_cache().stats()["entries"] == 0
+        assert get_session_cache().stats()["hits"] == 0
+
+
+class TestActivityWriteBehind:
+    """Tests for throttled last_active_at updates."""
+
+    def _updates(self, statements: list) -> list:
+        return [s for s in statements if s.lstrip().upper().startswith("UPDATE")]
+
+    def test_writes_at_most_once_per_interval(
+        self,
+        db: DbSession,
+        test_user: User,
+        test_config: SessionConfig,
+        statements: list,
+    ) -> None:
+        """Validations inside the interval do not write last_active_at."""
+        token, _ = create_session(db, test_user, config=test_config)
+        db.commit()
+
+        statements.clear()
+        for _ in range(5):
+            assert validate_session(db, token, config=test_config).is_valid
+            db.commit()
+        assert self._updates(statements) == []
+
+        later = datetime.utcnow() + timedelta(minutes=5)
+        with patch("amoskys.auth.sessions._utcnow", return_value=later):
+            assert validate_session(db, token, config=test_config).is_valid
+            assert validate_session(db, token, config=test_config).is_valid
+        db.commit()
+        assert len(self._updates(statements)) == 1
+
+    def test_unwritten_activity_keeps_session_alive(
+        self,
+        db: DbSession,
+        test_user: User,
+    ) -> None:
+        """Idle timeout counts activity this process saw but has not written."""
+        config = SessionConfig(
+            idle_timeout_hours=1, activity_update_interval_seconds=7200
+        )
+        token, session = create_session(db, test_user, config=config)
+        db.commit()
+
+        t1 = datetime.utcnow() + timedelta(minutes=50)
+        with patch("amoskys.auth.sessions._utcnow", return_value=t1):
+            assert validate_session(db, token, config=config).is_valid
+        db.commit()
+        db.refresh(session)
+        assert session.last_active_at < t1  # not written yet
+
+        t2 = t1 + timedelta(minutes=50)
+        with patch("amoskys.auth.sessions._utcnow", return_value=t2):
+            assert validate_session(db, token, config=config).is_valid
+
+    def test_flusher_batches_pending_activity(
+        self,
+        engine,
+        db: DbSession,
+        test_user: User,
+        test_config: SessionConfig,
+    ) -> None:
+        """With a flusher running, due writes are queued and flushed in bulk."""
+        tokens = []
+        for _ in range(3):
+            token, _ = create_session(db, test_user, config=test_config)
+            tokens.append(token)
+        db.commit()
+
+        cache = get_session_cache()
+        SessionLocal = sessionmaker(bind=engine)
+        cache.start_flusher(lambda: _committing(SessionLocal), interval_seconds=3600)
+
+        later = datetime.utcnow() + timedelta(minutes=5)
+        with patch("amoskys.auth.sessions._utcnow", return_value=later):
+            for token in tokens:
+                assert validate_session(db, token, config=test_config).is_valid
+        assert not db.dirty
+        assert cache.stats()["pending_activity"] == 3
+
+        cache.stop_flusher()
+        assert cache.stats()["pending_activity"] == 0
+        db.expire_all()
+        for s in db.query(Session).all():
+            assert s.last_active_at == later
+
+
+class TestCoalesce:
+    """Tests for concurrent-miss coalescing."""
+
+    def test_followers_wait_for_leader(self) -> None:
+        """Only the first caller for a token loads; others wait for it."""
+        cache = get_session_cache()
+        roles = []
+        leader_entered = threading.Event()
+        release = threading.Event()
+
+        def leader():
+            with cache.coalesce("hash") as is_leader:
+                roles.append(("leader", is_leader))
+                leader_entered.set()
+                release.wait(5)
+
+        def follower():
+            with cache.coalesce("hash") as is_leader:
+                roles.append(("follower", is_leader))
+
+        t1 = threading.Thread(target=leader)
+        t1.start()
+        leader_entered.wait(5)
+        t2 = threading.Thread(target=follower)
+        t2.start()
+        t2.join(0.1)
+        assert t2.is_alive()
+
+        release.set()
+        t1.join(5)
+        t2.join(5)
+        assert roles == [("leader", True), ("follower", False)]
+
+
+@contextmanager
+def _committing(session_factory):
+    """Yield a db session that commits on exit, like get_web_session_context."""
+    session = session_factory()
+    try:
+        yield session
+        session.commit()
+    finally:
+        session.close()
+
+
 # =============================================================================
 # Session Validation Result Tests
 # =============================================================================
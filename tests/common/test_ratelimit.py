@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+import multiprocessing
+
+import pytest
+
+from amoskys.common.ratelimit import (
+    GCRALimiter,
+    MemoryBackend,
+    SQLiteBackend,
+    create_rate_limit_backend,
+)
+
+
+class FakeClock:
+    def __init__(self, now: float = 1_000_000.0) -> None:
+        self.now = now
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def backend(request, tmp_path):
+    if request.param == "memory":
+        b = MemoryBackend()
+    else:
+        b = SQLiteBackend(str(tmp_path / "rl.db"))
+    yield b
+    b.close()
+
+
+def test_burst_then_refill(backend):
+    clock = FakeClock()
+    limiter = GCRALimiter(rate=1.0, burst=3, backend=backend, clock=clock)
+
+    assert [limiter.allow("ip") for _ in range(4)] == [True, True, True, False]
+    denied = limiter.peek("ip")
+    assert denied.remaining == 0
+    assert denied.retry_after == pytest.approx(1.0)
+
+    clock.now += 1.0
+    assert limiter.allow("ip") is True
+    assert limiter.allow("ip") is False
+
+    clock.now += 10.0
+    assert limiter.peek("ip").remaining == 3
+
+
+def test_keys_are_independent(backend):
+    limiter = GCRALimiter(rate=0.0, burst=1, backend=backend, clock=FakeClock())
+    assert limiter.allow("a") is True
+    assert limiter.allow("a") is False
+    assert limiter.allow("b") is True
+
+
+def test_allow_n_grants_partially(backend):
+    limiter = GCRALimiter(rate=0.0, burst=3, backend=backend, clock=FakeClock())
+    assert limiter.allow_n("a", 5) == 3
+    assert limiter.allow_n("a", 1) == 0
+    assert limiter.allow_n("a", 0) == 0
+
+
+def test_namespaces_share_a_backend(backend):
+    clock = FakeClock()
+    strict = GCRALimiter(rate=0.0, burst=1, backend=backend, namespace="s", clock=clock)
+    loose = GCRALimiter(rate=0.0, burst=5, backend=backend, namespace="l", clock=clock)
+    assert strict.allow("ip") is True
+    assert strict.allow("ip") is False
+    assert loose.allow_n("ip", 5) == 5
+
+
+def test_idle_keys_are_evicted(backend):
+    clock = FakeClock()
+    limiter = GCRALimiter(rate=10.0, burst=2, backend=backend, clock=clock)
+    for i in range(100):
+        limiter.allow(f"client-{i}")
+    assert len(backend) == 100
+
+    clock.now += 1.0  # every bucket is full again
+    assert backend.evict_idle(clock.now) == 100
+    assert len(backend) == 0
+    assert limiter.peek("client-0").remaining == 2
+
+
+def test_state_is_constant_per_key(backend):
+    clock = FakeClock()
+    limiter = GCRALimiter(rate=1000.0, burst=1000, backend=backend, clock=clock)
+    for _ in range(500):
+        limiter.allow("hot")
+    assert len(backend) == 1
+
+
+def test_backend_error_fails_open():
+    class Broken(MemoryBackend):
+        def transact(self, key, step, now):
+            raise RuntimeError("store down")
+
+    limiter = GCRALimiter(rate=0.0, burst=1, backend=Broken())
+    assert limiter.allow("ip") is True
+    assert limiter.allow_n("ip", 4) == 4
+
+
+def test_factory_selects_backend(tmp_path):
+    assert isinstance(create_rate_limit_backend(None), MemoryBackend)
+    assert isinstance(create_rate_limit_backend(str(tmp_path / "x.db")), SQLiteBackend)
+
+
+def _take_many(path: str, n: int, out) -> None:
+    limiter = GCRALimiter(rate=0.0, burst=50, backend=SQLiteBackend(path))
+    out.put(sum(limiter.allow("shared") for _ in range(n)))
+
+
+def test_sqlite_backend_is_shared_across_processes(tmp_path):
+    path = str(tmp_path / "shared.db")
+    ctx = multiprocessing.get_context("spawn")
+    out = ctx.Queue()
+    procs = [ctx.Process(target=_take_many, args=(path, 40, out)) for _ in range(3)]
+    for p in procs:
+        p.start()
+    granted = sum(out.get(timeout=60) for _ in procs)
+    for p in procs:
+        p.join(timeout=60)
+    assert granted == 50
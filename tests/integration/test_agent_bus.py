@@ -382,6 +382,8 @@ class TestSigmaEventMatching:
 
     def test_ssh_brute_force_matches(self, sigma_engine: SigmaEngine):
         event = {"event_type": "ssh_login_failure", "source_ip": "10.0.0.1"}
+        for _ in range(4):
+            assert sigma_engine.evaluate(event) == []  # below count() threshold
         matches = sigma_engine.evaluate(event)
         rule_ids = [m.rule_id for m in matches]
         assert "amoskys-cred-001" in rule_ids
@@ -404,7 +406,7 @@ class TestSigmaEventMatching:
         assert len(matches) == 0
 
     def test_match_includes_mitre_data(self, sigma_engine: SigmaEngine):
-        event = {"event_type": "ssh_login_failure", "source_ip": "10.0.0.1"}
+        event = {"event_type": "dga_domain_detected", "domain": "xkj3h2.evil.com"}
         matches = sigma_engine.evaluate(event)
         assert len(matches) >= 1
         match = matches[0]
@@ -454,8 +456,10 @@ class TestEndToEndDetection:
             confidence=0.85,
         )
         event = {"event_type": "ssh_login_failure", "source_ip": "10.0.0.99"}
-        sigma_matches = sigma_engine.evaluate(event)
-        assert len(sigma_matches) >= 1  # SSH brute force rule fires
+        sigma_matches = []
+        for _ in range(5):
+            sigma_matches = sigma_engine.evaluate(event)
+        assert len(sigma_matches) >= 1  # SSH brute force rule fires on the 5th
 
         # Step 3: Persistence agent detects LaunchAgent
         tracker.record_stage(
@@ -0,0 +1,315 @@
+"""Staged analyzer pipeline (src/amoskys/analyzer_pipeline.py).
+
+Validates:
+    1. decode_queue_row keeps SECURITY + OBSERVATION events, drops the rest
+    2. Events are stored in queue order across decode/enrich/score/store
+    3. Queue rows are deleted only after their batch commits; rows in
+       flight are not read twice
+    4. A failed commit leaves the rows queued and they are read again;
+       batches read after it are dropped and read again behind it
+    5. A decode pool broken by a dead worker is replaced
+    6. Corrupted rows are skipped and acked
+    7. Per-stage stats are reported
+"""
+
+import sqlite3
+import time
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import pytest
+
+from amoskys.analyzer_pipeline import (
+    STAGES,
+    AnalyzerPipeline,
+    build_security_event_data,
+    decode_queue_row,
+)
+from amoskys.proto import universal_telemetry_pb2 as pb
+from amoskys.storage.telemetry_store import TelemetryStore
+
+# ---------------------------------------------------------------------------
+# Fixtures
+# ---------------------------------------------------------------------------
+
+
+def _telemetry(device_id: str, seq: int, observation: bool = False) -> bytes:
+    dt = pb.DeviceTelemetry()
+    dt.device_id = device_id
+    dt.collection_agent = "test_agent"
+    dt.timestamp_ns = time.time_ns()
+    ev = dt.events.add()
+    ev.event_id = f"{device_id}-{seq}"
+    ev.event_timestamp_ns = dt.timestamp_ns + seq
+    if observation:
+        ev.event_type = "OBSERVATION"
+        ev.attributes["_domain"] = "dns"
+        ev.attributes["domain"] = f"host{seq}.example.com"
+    else:
+        ev.event_type = "SECURITY"
+        ev.security_event.event_category = f"cat_{seq}"
+        ev.security_event.risk_score = 0.5
+        ev.attributes["probe_name"] = "test_probe"
+    metric = dt.events.add()
+    metric.event_type = "METRIC"
+    metric.metric_data.metric_name = "cpu"
+    return dt.SerializeToString()
+
+
+def _make_queue(path: str, payloads) -> None:
+    conn = sqlite3.connect(path)
+    conn.execute("CREATE TABLE queue (id INTEGER PRIMARY KEY, bytes BLOB)")
+    conn.executemany("INSERT INTO queue (bytes) VALUES (?)", [(p,) for p in payloads])
+    conn.commit()
+    conn.close()
+
+
+def _queue_ids(path: str) -> list:
+    conn = sqlite3.connect(path)
+    try:
+        return [r[0] for r in conn.execute("SELECT id FROM queue ORDER BY id")]
+    finally:
+        conn.close()
+
+
+@pytest.fixture
+def store(tmp_path):
+    s = TelemetryStore(str(tmp_path / "telemetry.db"))
+    yield s
+    s.close()
+
+
+def _pipeline(store, decode_workers=0, scored=None, **kwargs):
+    scored = scored if scored is not None else []
+
+    def enrich(rec):
+        if rec["kind"] == "security":
+            rec["event_data"] = build_security_event_data(rec)
+
+    def score(rec):
+        scored.append(rec["event_id"])
+
+    def store_fn(rec):
+        if rec["kind"] == "security":
+            store.insert_security_event(rec["event_data"])
+        else:
+            store.insert_dns_event(
+                {
+                    "timestamp_ns": rec["ts_ns"],
+                    "device_id": rec["device_id"],
+                    "domain": rec["attrs"]["domain"],
+                }
+            )
+
+    return AnalyzerPipeline(
+        store,
+        enrich_fn=enrich,
+        score_fn=score,
+        store_fn=store_fn,
+        decode_workers=decode_workers,
+        enrich_workers=4,
+        **kwargs,
+    )
+
+
+def _drain(pipe, timeout=30.0):
+    """Score and commit until every fed batch is done (the analyzer loop's job)."""
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        pipe.process_ready(timeout=0.05)
+        if pipe.idle():
+            return
+    raise AssertionError(f"pipeline did not drain: {pipe.stats()}")
+
+
+# ---------------------------------------------------------------------------
+# Decode
+# ---------------------------------------------------------------------------
+
+
+class TestDecode:
+    def test_keeps_security_and_observation(self):
+        recs = decode_queue_row(_telemetry("d1", 1))
+        assert [r["kind"] for r in recs] == ["security"]
+        assert recs[0]["event_category"] == "cat_1"
+
+        recs = decode_queue_row(_telemetry("d1", 2, observation=True))
+        assert [r["kind"] for r in recs] == ["observation"]
+        assert recs[0]["domain"] == "dns"
+
+    def test_with_views_builds_fusion_view(self):
+        recs = decode_queue_row(_telemetry("d1", 1), with_views=True)
+        assert recs[0]["view"].device_id == "d1"
+
+    def test_corrupted_row_raises(self):
+        with pytest.raises(Exception):
+            decode_queue_row(b"\xff\xff not a protobuf")
+
+
+# ---------------------------------------------------------------------------
+# Pipeline
+# ---------------------------------------------------------------------------
+
+
+class TestPipeline:
+    @pytest.mark.parametrize("decode_workers", [0, 2])
+    def test_preserves_order_and_acks_after_commit(
+        self, tmp_path, store, decode_workers
+    ):
+        qa, qb = str(tmp_path / "a.db"), str(tmp_path / "b.db")
+        _make_queue(qa, [_telemetry("dev-a", i) for i in range(40)])
+        _make_queue(qb, [_telemetry("dev-b", i, observation=i % 2) for i in range(40)])
+
+        scored = []
+        pipe = _pipeline(store, decode_workers=decode_workers, scored=scored)
+        pipe.start()
+        try:
+            submitted = 0
+            while submitted < 80:
+                submitted += pipe.feed([qa, qb], budget=25, per_queue_cap=10)
+                pipe.process_ready()
+            _drain(pipe)
+        finally:
+            pipe.stop()
+
+        assert _queue_ids(qa) == [] and _queue_ids(qb) == []
+        for dev in ("dev-a", "dev-b"):
+            seqs = [int(e.rsplit("-", 1)[1]) for e in scored if e.startswith(dev)]
+            assert seqs == list(range(40))
+        rows = store.db.execute(
+            "SELECT event_category FROM security_events WHERE device_id = 'dev-a' "
+            "ORDER BY rowid"
+        ).fetchall()
+        assert [r[0] for r in rows] == [f"cat_{i}" for i in range(40)]
+
+    def test_rows_in_flight_are_not_read_twice(self, tmp_path, store):
+        qa = str(tmp_path / "a.db")
+        _make_queue(qa, [_telemetry("dev-a", i) for i in range(10)])
+        pipe = _pipeline(store)
+        assert pipe.feed([qa], budget=100, per_queue_cap=100) == 10
+        assert pipe.feed([qa], budget=100, per_queue_cap=100) == 0
+
+    def test_failed_commit_keeps_rows_queued(self, tmp_path, store, monkeypatch):
+        qa = str(tmp_path / "a.db")
+        _make_queue(qa, [_telemetry("dev-a", i) for i in range(5)])
+        pipe = _pipeline(store)
+
+        def broken_end_batch():
+            store.abort_batch()
+            raise sqlite3.OperationalError("database is locked")
+
+        monkeypatch.setattr(store, "end_batch", broken_end_batch)
+        pipe.start()
+        try:
+            pipe.feed([qa], budget=100, per_queue_cap=100)
+            _drain(pipe)
+            assert pipe.rows_failed == 5
+            assert _queue_ids(qa) == [1, 2, 3, 4, 5]
+
+            # The rewound cursor hands the same rows out again
+            monkeypatch.undo()
+            assert pipe.feed([qa], budget=100, per_queue_cap=100) == 5
+            _drain(pipe)
+        finally:
+            pipe.stop()
+        assert _queue_ids(qa) == []
+
+    def test_failed_batch_fences_later_batches(self, tmp_path, store, monkeypatch):
+        qa = str(tmp_path / "a.db")
+        _make_queue(qa, [_telemetry("dev-a", i) for i in range(6)])
+        scored = []
+        pipe = _pipeline(store, scored=scored)
+        end_batch = store.end_batch
+        calls = []
+
+        def end_batch_failing_once():
+            calls.append(1)
+            if len(calls) == 1:
+                store.db.rollback()  # as end_batch does when the commit fails
+                store.abort_batch()
+                raise sqlite3.OperationalError("database is locked")
+            end_batch()
+
+        monkeypatch.setattr(store, "end_batch", end_batch_failing_once)
+        pipe.start()
+        try:
+            # Three batches in flight when the first one fails
+            for _ in range(3):
+                assert pipe.feed([qa], budget=100, per_queue_cap=2) == 2
+            _drain(pipe)
+            assert pipe.rows_failed == 2
+            assert _queue_ids(qa) == [1, 2, 3, 4, 5, 6]
+
+            assert pipe.feed([qa], budget=100, per_queue_cap=100) == 6
+            _drain(pipe)
+        finally:
+            pipe.stop()
+        assert _queue_ids(qa) == []
+        rows = store.db.execute(
+            "SELECT event_category FROM security_events ORDER BY id"
+        ).fetchall()
+        assert [r[0] for r in rows] == [f"cat_{i}" for i in range(6)]
+        assert scored[-6:] == [f"dev-a-{i}" for i in range(6)]
+
+    def test_broken_decode_pool_is_replaced(self, tmp_path, store, monkeypatch):
+        qa = str(tmp_path / "a.db")
+        _make_queue(qa, [_telemetry("dev-a", i) for i in range(4)])
+        pipe = _pipeline(store)
+        pipe.start()
+
+        class BrokenPool:
+            shut_down = False
+
+            def submit(self, *args, **kwargs):
+                raise BrokenProcessPool("worker killed")
+
+            def shutdown(self, **kwargs):
+                self.shut_down = True
+
+        broken, replacement = BrokenPool(), ThreadPoolExecutor(max_workers=2)
+        pipe.decode_workers = 2
+        pipe._decode_pool = broken
+        monkeypatch.setattr(pipe, "_new_decode_pool", lambda: replacement)
+        try:
+            for _ in range(2):
+                pipe.feed([qa], budget=100, per_queue_cap=2)
+                _drain(pipe)
+        finally:
+            pipe.stop()
+        assert broken.shut_down and pipe.rows_failed == 0
+        assert pipe.rows_committed == 4 and _queue_ids(qa) == []
+
+    def test_corrupted_rows_are_skipped_and_acked(self, tmp_path, store):
+        qa = str(tmp_path / "a.db")
+        _make_queue(
+            qa, [_telemetry("dev-a", 0), b"\xff\xfe junk", _telemetry("dev-a", 2)]
+        )
+        scored = []
+        pipe = _pipeline(store, scored=scored)
+        pipe.start()
+        try:
+            pipe.feed([qa], budget=100, per_queue_cap=100)
+            _drain(pipe)
+        finally:
+            pipe.stop()
+        assert scored == ["dev-a-0", "dev-a-2"]
+        assert _queue_ids(qa) == []
+
+    def test_stats_report_every_stage(self, tmp_path, store):
+        qa = str(tmp_path / "a.db")
+        _make_queue(qa, [_telemetry("dev-a", i) for i in range(6)])
+        pipe = _pipeline(store)
+        pipe.start()
+        try:
+            pipe.feed([qa], budget=100, per_queue_cap=3)
+            pipe.feed([qa], budget=100, per_queue_cap=3)
+            _drain(pipe)
+        finally:
+            pipe.stop()
+        stats = pipe.stats()
+        assert set(stats["stages"]) == set(STAGES)
+        for stage in stats["stages"].values():
+            assert stage["batches"] == 2
+            assert stage["rows"] == 6
+            assert stage["queue_depth"] == 0
+        assert stats["rows_committed"] == 6
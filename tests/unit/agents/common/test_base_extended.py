@@ -308,6 +308,46 @@ class TestDrainLocalQueue:
         result = agent._drain_local_queue()
         assert result == 0
 
+    def test_batch_publisher_uses_drain_batch(self):
+        mock_queue = MagicMock()
+        mock_queue.drain_batch.return_value = 7
+        publisher = MagicMock(spec=["publish", "publish_batch"])
+        agent = StubAgent(local_queue=mock_queue, eventbus_publisher=publisher)
+        result = agent._drain_local_queue(limit=50)
+        assert result == 7
+        mock_queue.drain_batch.assert_called_once()
+        kwargs = mock_queue.drain_batch.call_args.kwargs
+        assert kwargs["limit"] == 50
+        kwargs["publish_batch_fn"](["env"])
+        publisher.publish_batch.assert_called_once_with(["env"])
+        mock_queue.drain.assert_not_called()
+
+    def test_batch_drain_goes_through_circuit_breaker(self):
+        publisher = MagicMock(spec=["publish", "publish_batch"])
+        publisher.publish_batch.side_effect = RuntimeError("unavailable")
+        mock_queue = MagicMock()
+        mock_queue.drain_batch.side_effect = lambda publish_batch_fn, limit: (
+            publish_batch_fn(["env"])
+        )
+        agent = StubAgent(local_queue=mock_queue, eventbus_publisher=publisher)
+        agent.circuit_breaker.failure_threshold = 2
+        for _ in range(2):
+            assert agent._drain_local_queue() == 0
+        assert agent.circuit_breaker.state == "OPEN"
+
+        # Open breaker: the queue is not touched
+        mock_queue.drain_batch.reset_mock()
+        assert agent._drain_local_queue() == 0
+        mock_queue.drain_batch.assert_not_called()
+
+    def test_publisher_without_batch_uses_drain(self):
+        mock_queue = MagicMock()
+        mock_queue.drain.return_value = 2
+        publisher = MagicMock(spec=["publish"])
+        agent = StubAgent(local_queue=mock_queue, eventbus_publisher=publisher)
+        assert agent._drain_local_queue() == 2
+        mock_queue.drain_batch.assert_not_called()
+
 
 # ---------------------------------------------------------------------------
 # health_summary
@@ -0,0 +1,76 @@
+"""Tests for BatchPublisherMixin (PublishBatch with fallbacks)."""
+
+from unittest.mock import MagicMock
+
+import grpc
+import pytest
+
+from amoskys.agents.common.batch_publisher import BatchPublisherMixin
+from amoskys.proto import universal_telemetry_pb2 as telemetry_pb2
+
+Ack = telemetry_pb2.UniversalAck
+
+
+class _RpcError(grpc.RpcError):
+    def __init__(self, code):
+        self._code = code
+
+    def code(self):
+        return self._code
+
+
+class _Publisher(BatchPublisherMixin):
+    def __init__(self, stub):
+        self._stub = stub
+
+    def _ensure_channel(self):
+        pass
+
+
+def _envelopes(n):
+    return [telemetry_pb2.UniversalEnvelope(idempotency_key=f"k{i}") for i in range(n)]
+
+
+def _batch_ok(request, timeout):
+    return Ack(envelope_acks=[Ack(status=Ack.OK) for _ in request.envelopes])
+
+
+def test_per_envelope_acks_returned_in_order():
+    stub = MagicMock()
+    stub.PublishBatch.side_effect = _batch_ok
+    acks = _Publisher(stub).publish_batch(_envelopes(3))
+    assert [a.status for a in acks] == [Ack.OK] * 3
+
+
+def test_oversized_batch_split_in_halves():
+    stub = MagicMock()
+    sizes = []
+
+    def publish(request, timeout):
+        sizes.append(len(request.envelopes))
+        if len(request.envelopes) > 2:
+            raise _RpcError(grpc.StatusCode.RESOURCE_EXHAUSTED)
+        return _batch_ok(request, timeout)
+
+    stub.PublishBatch.side_effect = publish
+    acks = _Publisher(stub).publish_batch(_envelopes(5))
+    assert len(acks) == 5
+    assert sizes == [5, 2, 3, 1, 2]
+
+
+def test_single_envelope_too_large_raises():
+    stub = MagicMock()
+    stub.PublishBatch.side_effect = _RpcError(grpc.StatusCode.RESOURCE_EXHAUSTED)
+    with pytest.raises(grpc.RpcError):
+        _Publisher(stub).publish_batch(_envelopes(1))
+
+
+def test_unimplemented_falls_back_to_publish_telemetry():
+    stub = MagicMock()
+    stub.PublishBatch.side_effect = _RpcError(grpc.StatusCode.UNIMPLEMENTED)
+    stub.PublishTelemetry.return_value = Ack(status=Ack.OK)
+    publisher = _Publisher(stub)
+    assert len(publisher.publish_batch(_envelopes(2))) == 2
+    assert len(publisher.publish_batch(_envelopes(2))) == 2
+    assert stub.PublishBatch.call_count == 1  # remembered
+    assert stub.PublishTelemetry.call_count == 4
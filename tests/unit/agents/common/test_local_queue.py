@@ -221,6 +221,97 @@ class TestDrain:
         assert drained == 0
 
 
+class TestDrainSignedBatch:
+    """Test batch drain with per-event acks (PublishBatch path)"""
+
+    @staticmethod
+    def _fill(queue, n):
+        for i in range(n):
+            telemetry = telemetry_pb2.DeviceTelemetry(
+                device_id=f"device-{i}", device_type="HOST", protocol="TEST"
+            )
+            queue.enqueue(telemetry, f"key-{i}")
+
+    def test_batch_applies_per_event_acks(self, tmp_path):
+        """OK rows are deleted, RETRY rows stay, other statuses are dropped"""
+        queue = LocalQueue(path=str(tmp_path / "test.db"))
+        self._fill(queue, 4)
+        Ack = telemetry_pb2.UniversalAck
+
+        calls = []
+
+        def publish_batch(rows):
+            calls.append([idem for _t, idem, *_rest in rows])
+            return [
+                Ack(status=Ack.OK),
+                Ack(status=Ack.RETRY),
+                Ack(status=Ack.INVALID),
+                Ack(status=Ack.OK),
+            ]
+
+        drained = queue.drain_signed_batch(publish_batch, limit=10)
+        assert drained == 2
+        assert calls == [["key-0", "key-1", "key-2", "key-3"]]
+        remaining = [r[0] for r in queue.db.execute("SELECT idem FROM queue")]
+        assert remaining == ["key-1"]
+
+    def test_batch_exception_charges_head_row(self, tmp_path):
+        """A failed batch call keeps every row; only the head row's retries grow"""
+        queue = LocalQueue(path=str(tmp_path / "test.db"), max_retries=1)
+        self._fill(queue, 3)
+
+        def failing_batch(rows):
+            raise Exception("Network error")
+
+        assert queue.drain_signed_batch(failing_batch, limit=10) == 0
+        assert queue.size() == 3
+        retries = [r[0] for r in queue.db.execute("SELECT retries FROM queue")]
+        assert retries == [1, 0, 0]
+
+        # Second failure exceeds max_retries=1 — only the head row is dropped
+        assert queue.drain_signed_batch(failing_batch, limit=10) == 0
+        remaining = [r[0] for r in queue.db.execute("SELECT idem FROM queue")]
+        assert remaining == ["key-1", "key-2"]
+
+    def test_batch_capped_by_bytes(self, tmp_path):
+        """A batch stops before max_batch_bytes, but always sends one row"""
+        queue = LocalQueue(path=str(tmp_path / "test.db"))
+        for i in range(5):
+            telemetry = telemetry_pb2.DeviceTelemetry(
+                device_id="d" * 1000, device_type="HOST", protocol="TEST"
+            )
+            queue.enqueue(telemetry, f"key-{i}")
+        Ack = telemetry_pb2.UniversalAck
+        sizes = []
+
+        def publish_batch(rows):
+            sizes.append(len(rows))
+            return [Ack(status=Ack.OK)] * len(rows)
+
+        assert queue.drain_signed_batch(publish_batch, max_batch_bytes=2600) == 2
+        assert queue.drain_signed_batch(publish_batch, max_batch_bytes=100) == 1
+        assert queue.drain_signed_batch(publish_batch) == 2
+        assert sizes == [2, 1, 2]
+
+    def test_batch_ack_count_mismatch_is_failure(self, tmp_path):
+        """Fewer acks than rows must not delete anything"""
+        queue = LocalQueue(path=str(tmp_path / "test.db"))
+        self._fill(queue, 2)
+        Ack = telemetry_pb2.UniversalAck
+
+        drained = queue.drain_signed_batch(lambda rows: [Ack(status=Ack.OK)])
+        assert drained == 0
+        assert queue.size() == 2
+
+    def test_batch_empty_queue(self, tmp_path):
+        queue = LocalQueue(path=str(tmp_path / "test.db"))
+
+        def publish_batch(rows):
+            pytest.fail("Should not be called for empty queue")
+
+        assert queue.drain_signed_batch(publish_batch) == 0
+
+
 class TestRetryLogic:
     """Test retry counter and max retries"""
 
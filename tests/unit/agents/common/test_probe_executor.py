@@ -0,0 +1,270 @@
+"""Tests for concurrent probe execution (probe_executor.py).
+
+Validates:
+    - Serial execution stays the default and keeps the previous_state handoff
+    - Concurrent scans merge in registration order regardless of finish order
+    - Deadline misses: reported, not resubmitted while running, late events delivered
+    - Repeated overruns shed the probe with backoff; scans cancelled before
+      they start (saturated pools) do not count
+    - Failing probes don't affect the others
+    - process_safe cpu probes round-trip previous_state through a child process
+    - Per-probe p50/p99 scan latency in AgentMetrics
+"""
+
+import threading
+import time
+from concurrent.futures import Future
+from typing import List
+
+import pytest
+
+from amoskys.agents.common.metrics import AgentMetrics
+from amoskys.agents.common.probe_executor import (
+    ProbeScheduler,
+    _Inflight,
+    shutdown_probe_pools,
+)
+from amoskys.agents.common.probes import (
+    MicroProbe,
+    MicroProbeAgentMixin,
+    ProbeContext,
+    Severity,
+    TelemetryEvent,
+)
+
+
+class StubAgent(MicroProbeAgentMixin):
+    def __init__(self, execution="concurrent", **kwargs):
+        self.device_id = "test-device"
+        self.agent_name = "test_agent"
+        self.metrics = AgentMetrics()
+        self.probe_execution = execution
+        super().__init__(**kwargs)
+
+
+class SleepProbe(MicroProbe):
+    """Sleeps, then emits one event carrying its name."""
+
+    scan_deadline = 5.0
+
+    def __init__(self, name: str, delay: float = 0.0):
+        super().__init__()
+        self.name = name
+        self.delay = delay
+
+    def scan(self, context: ProbeContext) -> List[TelemetryEvent]:
+        time.sleep(self.delay)
+        return [self._create_event("tick", Severity.INFO, {"probe": self.name})]
+
+
+class BlockingProbe(MicroProbe):
+    """Blocks until released; overruns any deadline while held."""
+
+    name = "blocking"
+    scan_deadline = 0.05
+
+    def __init__(self):
+        super().__init__()
+        self.release = threading.Event()
+        self.started = 0
+
+    def scan(self, context: ProbeContext) -> List[TelemetryEvent]:
+        self.started += 1
+        self.release.wait(5)
+        return [self._create_event("late", Severity.INFO, {})]
+
+
+class CounterProbe(MicroProbe):
+    """Keeps its cycle count in previous_state; safe for a child process."""
+
+    name = "counter"
+    scan_kind = "cpu"
+    process_safe = True
+
+    def scan(self, context: ProbeContext) -> List[TelemetryEvent]:
+        count = context.previous_state.get("count", 0) + 1
+        context.previous_state["count"] = count
+        return [self._create_event("count", Severity.INFO, {"count": count})]
+
+
+class ExplodingProbe(MicroProbe):
+    name = "exploding"
+
+    def scan(self, context: ProbeContext) -> List[TelemetryEvent]:
+        raise RuntimeError("scan boom")
+
+
+@pytest.fixture(autouse=True)
+def _pools():
+    yield
+    shutdown_probe_pools()
+
+
+def _agent(*probes, execution="concurrent"):
+    agent = StubAgent(execution)
+    for probe in probes:
+        agent.register_probe(probe)
+    agent.setup_probes()
+    return agent
+
+
+def _names(events):
+    return [e.data["probe"] for e in events if e.event_type == "tick"]
+
+
+def test_serial_is_default(monkeypatch):
+    monkeypatch.delenv("AMOSKYS_PROBE_EXECUTION", raising=False)
+    agent = _agent(CounterProbe(), execution=None)
+    counts = [agent.scan_all_probes()[0].data["count"] for _ in range(3)]
+    assert counts == [1, 2, 3]
+    assert agent._probe_execution_mode() == "serial"
+    assert getattr(agent, "_probe_scheduler", None) is None
+
+
+def test_concurrent_merge_is_in_registration_order():
+    probes = [SleepProbe(f"p{i}", delay=0.05 * (4 - i)) for i in range(4)]
+    agent = _agent(*probes)
+    start = time.perf_counter()
+    events = agent.scan_all_probes()
+    assert _names(events) == ["p0", "p1", "p2", "p3"]
+    assert time.perf_counter() - start < 0.45  # ran side by side, not 0.5s
+    assert all(e.device_id == "test-device" for e in events)
+
+
+def test_run_probes_concurrent_keeps_order():
+    agent = _agent(SleepProbe("slow", 0.1), SleepProbe("fast"))
+    ctx = agent._create_probe_context()
+    assert _names(agent.run_probes(ctx)) == ["slow", "fast"]
+
+
+def test_previous_state_handoff_across_cycles():
+    agent = _agent(CounterProbe(), SleepProbe("other"))
+    agent._probe_state["counter"] = {}
+    counts = []
+    for _ in range(3):
+        events = agent.scan_all_probes()
+        counts.append([e.data["count"] for e in events if e.event_type == "count"])
+    assert counts == [[1], [2], [3]]
+    assert agent._probe_state["counter"] == {"count": 3}
+
+
+def test_deadline_miss_then_late_delivery():
+    blocking = BlockingProbe()
+    agent = _agent(blocking, SleepProbe("ok"))
+
+    events = agent.scan_all_probes()
+    assert _names(events) == ["ok"]
+    assert "deadline" in blocking.last_error
+    assert agent.metrics.probe_deadline_misses == 1
+
+    # Still running: not resubmitted, the other probe is unaffected
+    assert _names(agent.scan_all_probes()) == ["ok"]
+    assert blocking.started == 1
+    assert agent._probe_scheduler.busy_probes() == ["blocking"]
+
+    blocking.release.set()
+    deadline = time.time() + 5
+    while agent._probe_scheduler._inflight["blocking"].future.running():
+        assert time.time() < deadline
+        time.sleep(0.01)
+    events = agent.scan_all_probes()
+    assert [e.event_type for e in events] == ["late", "tick"]
+    assert agent._probe_scheduler.busy_probes() == []
+
+
+def test_repeated_overruns_are_shed():
+    clock_now = [0.0]
+    scheduler = ProbeScheduler(shed_after=2, clock=lambda: clock_now[0])
+
+    class Slow(MicroProbe):
+        name = "slow"
+        scan_deadline = 0.2  # starts well within it, overruns it
+
+        def scan(self, context):
+            time.sleep(0.4)
+            return []
+
+    probe = Slow()
+    ctx = ProbeContext(device_id="d", agent_name="a")
+    state = {}
+
+    def cycle():
+        [outcome] = scheduler.run([(probe, probe.scan, True)], ctx, state)
+        inflight = scheduler._inflight.get("slow")
+        if inflight is not None:
+            inflight.future.result(timeout=5)
+        return outcome.status
+
+    # Each miss is followed by a cycle that collects the late result
+    assert [cycle() for _ in range(3)] == ["timeout", "ok", "timeout"]
+    # Second miss in a row reaches shed_after: after its late result is
+    # collected, the probe is skipped until the backoff runs out
+    assert scheduler.shed_probes() == ["slow"]
+    assert [cycle(), cycle()] == ["ok", "shed"]
+    assert scheduler.shed_probes() == []
+
+
+def test_scan_cancelled_before_start_is_not_an_overrun(monkeypatch):
+    """A saturated pool says nothing about the probe: no shedding."""
+    scheduler = ProbeScheduler(shed_after=1, clock=lambda: 0.0)
+    probe = SleepProbe("queued")
+    probe.scan_deadline = 0.0
+    never_started = []
+
+    def submit(probe, fn, ctx, process_ok):
+        never_started.append(Future())
+        return _Inflight(never_started[-1], False, 0.0)
+
+    monkeypatch.setattr(scheduler, "_submit", submit)
+    ctx = ProbeContext(device_id="d", agent_name="a")
+    statuses = [
+        scheduler.run([(probe, probe.scan, True)], ctx, {})[0].status for _ in range(3)
+    ]
+    assert statuses == ["queued"] * 3
+    assert all(f.cancelled() for f in never_started)
+    assert scheduler.shed_probes() == []
+    assert scheduler.busy_probes() == []
+
+
+def test_failing_probe_isolated():
+    agent = _agent(ExplodingProbe(), SleepProbe("ok"))
+    events = agent.scan_all_probes()
+    assert _names(events) == ["ok"]
+    probe = agent._probes[0]
+    assert probe.error_count == 1
+    assert probe.last_error == "scan boom"
+    assert agent.metrics.probe_errors == 1
+
+
+def test_process_safe_probe_runs_in_child_process():
+    scheduler = ProbeScheduler()
+    probe = CounterProbe()
+    probe.scan_deadline = 60.0
+    ctx = ProbeContext(device_id="d", agent_name="a")
+    state = {}
+    handed_out = state.setdefault("counter", {})
+    for expected in (1, 2):
+        [outcome] = scheduler.run([(probe, probe.scan, True)], ctx, state)
+        assert outcome.status == "ok", outcome.error
+        assert outcome.events[0].data["count"] == expected
+    assert state["counter"] is handed_out
+    assert handed_out == {"count": 2}
+
+
+def test_unpicklable_probe_falls_back_to_threads():
+    probe = CounterProbe()
+    probe.lock = threading.Lock()
+    scheduler = ProbeScheduler()
+    ctx = ProbeContext(device_id="d", agent_name="a")
+    [outcome] = scheduler.run([(probe, probe.scan, True)], ctx, {})
+    assert outcome.status == "ok"
+    assert "counter" in scheduler._no_process
+
+
+def test_scan_latency_percentiles_exported():
+    agent = _agent(SleepProbe("a"), execution="serial")
+    for _ in range(5):
+        agent.scan_all_probes()
+    latency = agent.metrics.to_dict()["probe_scan_latency_ms"]
+    assert latency["a"]["samples"] == 5
+    assert 0 <= latency["a"]["p50"] <= latency["a"]["p99"]
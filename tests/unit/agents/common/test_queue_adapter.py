@@ -857,3 +857,30 @@ class TestEnvelopeSigning:
         assert envelope.HasField("device_telemetry")
         assert envelope.sig == b""  # No signature
         assert envelope.signing_algorithm == ""  # Not set
+
+    def test_drain_batch_sends_signed_envelopes(self, signed_adapter):
+        """drain(publish_batch_fn=...) publishes all rows in one call."""
+        for _ in range(3):
+            signed_adapter.enqueue({"event_type": "METRIC", "severity": "INFO"})
+
+        calls = []
+
+        def publish_batch(envelopes):
+            calls.append(list(envelopes))
+            return [pb.UniversalAck(status=pb.UniversalAck.OK) for _ in envelopes]
+
+        def publish_fn(events):
+            pytest.fail("single-event publish must not be used")
+
+        drained = signed_adapter.drain(
+            publish_fn, limit=10, publish_batch_fn=publish_batch
+        )
+
+        assert drained == 3
+        assert len(calls) == 1
+        envelopes = calls[0]
+        assert all(len(env.sig) == 64 for env in envelopes)
+        # Hash chain survives batching: each prev_sig is the previous sig
+        assert envelopes[1].prev_sig == envelopes[0].sig
+        assert envelopes[2].prev_sig == envelopes[1].sig
+        assert signed_adapter.size() == 0
@@ -0,0 +1,305 @@
+"""Tests for streaming auditd collection and multi-record event assembly.
+
+Covers grouping records by audit(ts:serial) into one enriched event
+(EXECVE argv, PATH, CWD, PROCTITLE), hex-encoded fields, chunked reads
+with partial lines, the reassembly timeout and buffer bound, the audisp
+socket collector, and a throughput benchmark over a synthetic audit.log.
+
+Environment variables:
+    BENCH_ENABLED: Run the throughput benchmark (skipped by default)
+    AUDIT_BENCH_MB: Size of the generated benchmark log (default: 32;
+        set to 300+ for the multi-hundred-MB run)
+    AUDIT_BENCH_MIN_LINES_PER_SEC: Required throughput (default: 50000,
+        a floor for slow shared runners; the target on a dedicated
+        modern core is 200000)
+"""
+
+import json
+import os
+import socket
+import threading
+import time
+
+import pytest
+
+from amoskys.agents.os.linux.kernel_audit.collector import (
+    AuditdLogCollector,
+    AuditdSocketCollector,
+    AuditEventAssembler,
+    create_kernel_audit_collector,
+)
+
+BENCH_MB = float(os.environ.get("AUDIT_BENCH_MB", "32"))
+MIN_LINES_PER_SEC = float(os.environ.get("AUDIT_BENCH_MIN_LINES_PER_SEC", "50000"))
+
+
+def _hex(s):
+    return s.encode().hex().upper()
+
+
+def execve_event(serial, ts="1700000000.123", argv=("curl", "-s", "http://x")):
+    """The records auditd writes for one execve, EOE included."""
+    stamp = f"msg=audit({ts}:{serial}):"
+    args = " ".join(f'a{i}="{a}"' for i, a in enumerate(argv))
+    return [
+        f"type=SYSCALL {stamp} arch=c000003e syscall=59 success=yes exit=0 "
+        f"a0=55d1 a1=55d2 a2=55d3 a3=0 items=2 ppid=100 pid={serial} auid=1000 "
+        f'uid=1000 gid=1000 euid=1000 egid=1000 tty=pts0 ses=3 comm="curl" '
+        f'exe="/usr/bin/curl" key="exec"',
+        f"type=EXECVE {stamp} argc={len(argv)} {args}",
+        f'type=CWD {stamp} cwd="/home/user"',
+        f'type=PATH {stamp} item=0 name="/usr/bin/curl" inode=1 nametype=NORMAL',
+        f'type=PATH {stamp} item=1 name="/lib64/ld-linux-x86-64.so.2" '
+        f"inode=2 nametype=NORMAL",
+        f"type=PROCTITLE {stamp} proctitle={_hex(chr(0).join(argv))}",
+        f"type=EOE {stamp} ",
+    ]
+
+
+def _write(path, lines, mode="w"):
+    with open(path, mode) as f:
+        f.write("".join(line + "\n" for line in lines))
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_records_merged_into_one_event(tmp_path):
+    log = tmp_path / "audit.log"
+    _write(log, execve_event(7) + execve_event(8, argv=("id",)))
+    events = AuditdLogCollector(str(log), start_at_end=False).collect_batch()
+
+    assert [e.pid for e in events] == [7, 8]
+    e = events[0]
+    assert e.syscall == "execve" and e.action == "EXEC"
+    assert e.cmdline == "curl -s http://x"
+    assert e.cwd == "/home/user"
+    assert e.path == "/usr/bin/curl"
+    assert json.loads(e.raw["argv"]) == ["curl", "-s", "http://x"]
+    assert json.loads(e.raw["paths"]) == [
+        "/usr/bin/curl",
+        "/lib64/ld-linux-x86-64.so.2",
+    ]
+    assert e.raw["proctitle"] == "curl -s http://x"
+    assert e.raw["record_types"] == "SYSCALL,EXECVE,CWD,PATH,PATH,PROCTITLE"
+    assert events[1].cmdline == "id"
+
+
+def test_hex_encoded_fields_decoded(tmp_path):
+    log = tmp_path / "audit.log"
+    stamp = "msg=audit(1700000000.000:5):"
+    _write(
+        log,
+        [
+            f"type=SYSCALL {stamp} syscall=59 success=yes pid=5 "
+            f"comm={_hex('evil proc')} exe={_hex('/tmp/a b')}",
+            f"type=EXECVE {stamp} argc=3 a0=sh a1={_hex('-c')} "
+            f"a2_len=20 a2[0]={_hex('echo hel')} a2[1]={_hex('lo world')}",
+            f"type=CWD {stamp} cwd={_hex('/home/with space')}",
+            f"type=PATH {stamp} item=0 name=(null) nametype=UNKNOWN",
+            f"type=EOE {stamp}",
+        ],
+    )
+    [e] = AuditdLogCollector(str(log), start_at_end=False).collect_batch()
+    assert e.comm == "evil proc"
+    assert e.exe == "/tmp/a b"
+    assert e.cwd == "/home/with space"
+    assert e.cmdline == "sh -c echo hello world"
+    assert e.path is None  # (null) names are not paths
+
+
+def test_enriched_format_and_node_prefix(tmp_path):
+    log = tmp_path / "audit.log"
+    stamp = "msg=audit(1700000000.000:6):"
+    _write(
+        log,
+        [
+            f"node=web01 type=SYSCALL {stamp} syscall=101 success=yes pid=6 "
+            f'uid=0 comm="gdb"\x1dARCH=x86_64 SYSCALL=ptrace UID="root"',
+            f"node=web01 type=EOE {stamp} ",
+        ],
+    )
+    [e] = AuditdLogCollector(str(log), start_at_end=False).collect_batch()
+    assert e.action == "PTRACE"
+    assert "UID" not in e.raw and e.uid == 0
+
+
+def test_partial_lines_across_chunks_and_batches(tmp_path):
+    log = tmp_path / "audit.log"
+    lines = execve_event(1) + execve_event(2)
+    text = "".join(line + "\n" for line in lines)
+    cut = text.index("type=PATH") + 10
+    log.write_text(text[:cut])
+
+    c = AuditdLogCollector(str(log), start_at_end=False, chunk_size=7)
+    assert c.collect_batch() == []
+    assert c._offset == text.rindex("\n", 0, cut) + 1  # partial line left unread
+
+    with open(log, "a") as f:
+        f.write(text[cut:])
+    assert [e.pid for e in c.collect_batch()] == [1, 2]
+    assert c._offset == len(text)
+    assert len(c._assembler) == 0
+
+
+def test_max_batch_bytes_spreads_work(tmp_path):
+    log = tmp_path / "audit.log"
+    _write(log, [line for s in range(1, 51) for line in execve_event(s)])
+    c = AuditdLogCollector(
+        str(log), start_at_end=False, chunk_size=4096, max_batch_bytes=4096
+    )
+    pids = []
+    for _ in range(100):
+        pids += [e.pid for e in c.collect_batch()]
+    assert pids == list(range(1, 51))
+
+
+def test_events_without_eoe_not_delayed(tmp_path):
+    # auditd usually leaves EOE out of audit.log
+    log = tmp_path / "audit.log"
+    _write(log, execve_event(3)[:-1] + execve_event(4, argv=("id",))[:-1])
+    c = AuditdLogCollector(str(log), start_at_end=False, clock=FakeClock())
+    events = c.collect_batch()
+    assert [(e.pid, e.cmdline) for e in events] == [(3, "curl -s http://x"), (4, "id")]
+    assert len(c._assembler) == 0
+
+
+def test_new_serial_completes_previous_event():
+    c = AuditdLogCollector("/nonexistent/audit.log", clock=FakeClock())
+    assert c._ingest_lines(execve_event(5)[:-1]) == []
+    [e] = c._ingest_lines(execve_event(6)[:1])
+    assert e.pid == 5 and e.cmdline == "curl -s http://x"
+    assert len(c._assembler) == 1
+
+
+def test_last_event_of_stream_flushed_after_timeout():
+    clock = FakeClock()
+    c = AuditdLogCollector(
+        "/nonexistent/audit.log", reassembly_timeout=2.0, clock=clock
+    )
+    assert c._ingest_lines(execve_event(3)[:-1]) == []  # no EOE, nothing after
+    clock.now += 1.0
+    assert c._ingest_lines([]) == []
+    clock.now += 1.5
+    [e] = c._ingest_lines([])
+    assert e.cmdline == "curl -s http://x"
+
+
+def test_group_without_syscall_dropped():
+    clock = FakeClock()
+    c = AuditdLogCollector("/nonexistent/audit.log", clock=clock)
+    events = c._ingest_lines(execve_event(4)[1:])
+    assert events == []
+    assert len(c._assembler) == 0
+
+
+def test_other_record_types_not_buffered():
+    c = AuditdLogCollector("/nonexistent/audit.log")
+    c._ingest_lines(
+        [
+            "type=USER_LOGIN msg=audit(1700000000.000:9): pid=1 msg='op=login "
+            'acct="root" res=success\'',
+            "type=SERVICE_START msg=audit(1700000000.000:10): unit=cron",
+        ]
+    )
+    assert len(c._assembler) == 0
+
+
+def test_assembler_bounded():
+    clock = FakeClock()
+    asm = AuditEventAssembler(timeout=60, max_pending=3, clock=clock, ordered=False)
+    released = []
+    for serial in range(5):
+        released += asm.add(
+            {"type": "SYSCALL", "timestamp": "1.0", "serial": str(serial)}
+        )
+    assert len(asm) == 3
+    assert [g[0]["serial"] for g in released] == ["0", "1"]  # oldest evicted
+    assert asm.evicted == 2
+    assert len(asm.drain()) == 3 and len(asm) == 0
+
+
+def test_flush_emits_partial_events():
+    c = AuditdLogCollector("/nonexistent/audit.log")
+    assert c._ingest_lines(execve_event(11)[:2]) == []
+    [e] = c.flush()
+    assert e.cmdline == "curl -s http://x"
+
+
+def test_socket_collector_streams(tmp_path):
+    path = str(tmp_path / "audispd_events")
+    server = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    server.bind(path)
+    server.listen(1)
+    accepted = []
+    t = threading.Thread(target=lambda: accepted.append(server.accept()[0]))
+    t.start()
+
+    c = create_kernel_audit_collector(source=f"unix:{path}")
+    assert isinstance(c, AuditdSocketCollector)
+    assert c.collect_batch() == []
+    t.join(5)
+    conn = accepted[0]
+    text = "".join(line + "\n" for line in execve_event(21))
+    conn.sendall(text[:100].encode())
+    assert c.collect_batch() == []
+    conn.sendall(text[100:].encode())
+    deadline = time.time() + 5
+    events = []
+    while not events and time.time() < deadline:
+        events = c.collect_batch()
+    assert [e.pid for e in events] == [21]
+    conn.close()
+    c.close()
+    server.close()
+
+
+@pytest.mark.skipif(
+    not os.environ.get("BENCH_ENABLED"),
+    reason="Throughput benchmarks require BENCH_ENABLED=1 (timing-dependent)",
+)
+class TestThroughput:
+    """Lines per second through the file tail, parse and assembly."""
+
+    def test_lines_per_second(self, tmp_path):
+        log = tmp_path / "audit.log"
+        block = []
+        for serial in range(1, 1001):
+            block += execve_event(serial)
+            block.append(
+                f"type=USER_CMD msg=audit(1700000000.200:{serial}): pid=1 "
+                "uid=0 msg='cwd=\"/\" cmd=6C73 res=success'"
+            )
+        blob = ("\n".join(block) + "\n").encode()
+        lines_per_block = len(block)
+        repeats = max(1, int(BENCH_MB * (1 << 20) / len(blob)))
+        with open(log, "wb") as f:
+            for _ in range(repeats):
+                f.write(blob)
+
+        c = AuditdLogCollector(str(log), start_at_end=False)
+        start = time.perf_counter()
+        events = 0
+        while True:
+            batch = c.collect_batch()
+            events += len(batch)
+            if not batch:
+                break
+        elapsed = time.perf_counter() - start
+
+        total = lines_per_block * repeats
+        rate = total / elapsed
+        print(
+            f"\naudit.log {log.stat().st_size / (1 << 20):.0f}MB, {total} lines: "
+            f"{elapsed:.2f}s, {rate:,.0f} lines/s, {events} events"
+        )
+        assert c.lines_read == total
+        assert events == 1000 * repeats - len(c._assembler)
+        assert (
+            rate >= MIN_LINES_PER_SEC
+        ), f"{rate:,.0f} lines/s < {MIN_LINES_PER_SEC:,.0f}"
@@ -0,0 +1,267 @@
+"""Tests for the incremental /proc collector behind LinuxProcessAgent.
+
+Runs against a synthetic procfs tree so the results don't depend on the
+host. Covers stat parsing, spawn/exit/change deltas, PID recycling,
+the parent-chain index, and a benchmark showing per-cycle procfs reads
+scale with churn rather than with the number of processes.
+
+Environment variables:
+    PROC_BENCH_MAX_READS_PER_CHURN: Allowed reads per spawned
+        process on top of the revalidation budget (default: 6)
+"""
+
+import os
+import time
+
+import pytest
+
+from amoskys.agents.os.linux.process.agent import (
+    LINUX_PORTABLE_PROBES,
+    _linux_process_probes,
+)
+from amoskys.agents.os.linux.process.collector import LinuxProcessCollector, ProcessTree
+
+MAX_READS_PER_CHURN = float(os.environ.get("PROC_BENCH_MAX_READS_PER_CHURN", "6"))
+CLK_TCK = os.sysconf("SC_CLK_TCK")
+
+
+class FakeProc:
+    """Writes a minimal procfs layout under a temp directory."""
+
+    def __init__(self, root):
+        self.root = root
+        root.mkdir(exist_ok=True)
+        (root / "stat").write_text("cpu  1 2 3\nbtime 1700000000\n")
+        (root / "meminfo").write_text("MemTotal:       8000000 kB\n")
+
+    def spawn(
+        self,
+        pid,
+        ppid=1,
+        comm="bash",
+        cmdline=("bash",),
+        uid=0,
+        starttime=100,
+        exe="/usr/bin/bash",
+        utime=0,
+    ):
+        d = self.root / str(pid)
+        d.mkdir(exist_ok=True)
+        self.write_stat(pid, ppid, comm, starttime, utime)
+        (d / "status").write_text(f"Name:\t{comm}\nUid:\t{uid}\t{uid}\t{uid}\t{uid}\n")
+        (d / "cmdline").write_bytes(b"\0".join(a.encode() for a in cmdline) + b"\0")
+        (d / "cgroup").write_text("0::/user.slice/session-1.scope\n")
+        link = d / "exe"
+        if link.is_symlink():
+            link.unlink()
+        link.symlink_to(exe)
+
+    def write_stat(self, pid, ppid, comm, starttime, utime=0):
+        fields = ["S", str(ppid)] + ["0"] * 9 + [str(utime), "0"] + ["0"] * 4
+        fields += ["3", "0", str(starttime), "1000", "256"]
+        (self.root / str(pid) / "stat").write_text(
+            f"{pid} ({comm}) " + " ".join(fields) + "\n"
+        )
+
+    def kill(self, pid):
+        d = self.root / str(pid)
+        for f in d.iterdir():
+            f.unlink()
+        d.rmdir()
+
+
+@pytest.fixture
+def proc(tmp_path):
+    fake = FakeProc(tmp_path / "proc")
+    fake.spawn(1, ppid=0, comm="init", cmdline=("/sbin/init",), exe="/sbin/init")
+    return fake
+
+
+def _collector(proc, **kwargs):
+    return LinuxProcessCollector(device_id="host", proc_root=str(proc.root), **kwargs)
+
+
+def test_first_cycle_reads_everything(proc):
+    proc.spawn(10, ppid=1, comm="sshd", cmdline=("/usr/sbin/sshd", "-D"), uid=0)
+    proc.spawn(11, ppid=10, comm="my worker (x)", cmdline=("w",), uid=1000)
+    data = _collector(proc).collect()
+
+    assert data["total_count"] == 3
+    assert [p.pid for p in data["spawned"]] == [1, 10, 11]
+    worker = next(p for p in data["processes"] if p.pid == 11)
+    assert worker.name == "my worker (x)"
+    assert worker.ppid == 10 and worker.parent_name == "sshd"
+    assert worker.uid == 1000
+    assert worker.cgroup == "/user.slice/session-1.scope"
+    assert worker.create_time == pytest.approx(1700000000 + 100 / CLK_TCK)
+    assert worker.num_threads == 3
+    assert worker.memory_percent is not None
+    assert data["process_tree"].ancestors(11) == [10, 1, 0]
+
+
+def test_deltas_between_cycles(proc):
+    proc.spawn(10, comm="sleep", cmdline=("sleep", "100"))
+    c = _collector(proc)
+    c.collect()
+
+    idle = c.collect()
+    assert (idle["spawned"], idle["exited"], idle["changed"]) == ([], [], [])
+
+    proc.spawn(20, ppid=10, comm="curl", cmdline=("curl", "x"))
+    proc.kill(10)
+    data = c.collect()
+    assert [p.pid for p in data["spawned"]] == [20]
+    assert [p.pid for p in data["exited"]] == [10]
+    assert {p.pid for p in data["processes"]} == {1, 20}
+    assert 10 not in data["process_tree"]
+
+
+def test_exec_and_setuid_reported_as_changes(proc):
+    proc.spawn(10, comm="bash", cmdline=("bash",), uid=1000)
+    c = _collector(proc)
+    before = next(p for p in c.collect()["processes"] if p.pid == 10)
+
+    proc.spawn(10, comm="nc", cmdline=("nc", "-l", "4444"), exe="/usr/bin/nc", uid=0)
+    [change] = c.collect()["changed"]
+    assert change.process.pid == 10
+    assert change.changes["cmdline"] == (["bash"], ["nc", "-l", "4444"])
+    assert change.changes["exe"] == ("/usr/bin/bash", "/usr/bin/nc")
+    assert set(change.changes) >= {"name", "username"}
+    # Held snapshots are not mutated behind the probes' backs
+    assert before.cmdline == ["bash"]
+
+
+def test_recycled_pid_is_a_new_process(proc):
+    proc.spawn(10, comm="old", starttime=100)
+    c = _collector(proc)
+    first = c.collect()
+    old_guid = next(p for p in first["processes"] if p.pid == 10).process_guid
+
+    proc.kill(10)
+    proc.spawn(10, comm="new", starttime=900)
+    data = c.collect()
+    assert [p.name for p in data["exited"]] == ["old"]
+    assert [p.name for p in data["spawned"]] == ["new"]
+    assert data["spawned"][0].process_guid != old_guid
+
+
+def test_reparent_updates_tree(proc):
+    proc.spawn(10, ppid=1)
+    proc.spawn(11, ppid=10)
+    c = _collector(proc)
+    c.collect()
+    proc.kill(10)
+    proc.write_stat(11, ppid=1, comm="bash", starttime=100)
+    data = c.collect()
+    assert [ch.changes["ppid"] for ch in data["changed"]] == [(10, 1)]
+    assert data["process_tree"].children(1) == [11]
+
+
+def test_cpu_percent_from_tick_delta(proc, monkeypatch):
+    proc.spawn(10)
+    c = _collector(proc)
+    clock = [1000.0]
+    monkeypatch.setattr(
+        "amoskys.agents.os.linux.process.collector.time.time", lambda: clock[0]
+    )
+    c.collect()
+    proc.write_stat(10, ppid=1, comm="bash", starttime=100, utime=CLK_TCK)
+    clock[0] += 2.0
+    snap = next(p for p in c.collect()["processes"] if p.pid == 10)
+    assert snap.cpu_percent == pytest.approx(50.0)
+
+
+def test_busy_process_cpu_refreshed_every_cycle(proc, monkeypatch):
+    for pid in range(10, 20):
+        proc.spawn(pid)
+    c = _collector(proc, revalidate_per_cycle=2)
+    clock = [1000.0]
+    monkeypatch.setattr(
+        "amoskys.agents.os.linux.process.collector.time.time", lambda: clock[0]
+    )
+    c.collect()
+
+    utime = 0
+    used, seen = [], []
+    for cycle in range(12):
+        used.append(100.0 if cycle % 2 else 50.0)
+        utime += CLK_TCK * (2 if cycle % 2 else 1) // 2
+        proc.write_stat(15, ppid=1, comm="bash", starttime=100, utime=utime)
+        clock[0] += 1.0
+        data = c.collect()
+        seen.append(next(p for p in data["processes"] if p.pid == 15).cpu_percent)
+    # Once revalidation has seen it busy, every cycle samples it
+    first = next(i for i, cpu in enumerate(seen) if cpu is not None)
+    assert first <= 5
+    assert seen[first + 1 :] == used[first + 1 :]
+
+    proc.write_stat(15, ppid=1, comm="bash", starttime=100, utime=utime)
+    clock[0] += 1.0
+    c.collect()
+    clock[0] += 1.0
+    reads = c.collect()["files_read"]
+    assert reads == 2 * 3  # idle again: back to the revalidation slice only
+
+
+def test_process_tree_queries():
+    tree = ProcessTree()
+    for pid, ppid in [(1, 0), (2, 1), (3, 2), (4, 2), (5, 1)]:
+        tree.add(pid, ppid)
+    assert tree.ancestors(3) == [2, 1, 0]
+    assert tree.children(2) == [3, 4]
+    assert tree.descendants(1) == [2, 5, 3, 4]
+    tree.add(1, 3)  # cycle: ancestors must still terminate
+    assert tree.ancestors(3) == [2, 1]
+
+
+def test_portable_probes_enabled_for_linux():
+    probes = _linux_process_probes()
+    assert {p.name for p in probes} == set(LINUX_PORTABLE_PROBES)
+    assert all("linux" in p.platforms for p in probes)
+
+
+class TestChurnScaling:
+    """Per-cycle procfs reads track churn, not the process count."""
+
+    BUDGET = 32
+
+    def _steady(self, tmp_path, n):
+        proc = FakeProc(tmp_path / f"proc{n}")
+        for pid in range(1, n + 1):
+            proc.spawn(pid, ppid=1 if pid > 1 else 0)
+        c = _collector(proc, revalidate_per_cycle=self.BUDGET)
+        c.collect()
+        return proc, c
+
+    def test_reads_independent_of_process_count(self, tmp_path):
+        reads = {}
+        for n in (200, 2000):
+            _, c = self._steady(tmp_path, n)
+            start = time.perf_counter()
+            data = c.collect()
+            elapsed = (time.perf_counter() - start) * 1000
+            reads[n] = data["files_read"]
+            print(
+                f"\n/proc idle cycle, {n} processes: {reads[n]} reads, {elapsed:.2f}ms"
+            )
+        assert reads[200] == reads[2000] <= 3 * self.BUDGET
+
+    def test_reads_scale_with_churn(self, tmp_path):
+        proc, c = self._steady(tmp_path, 1000)
+        idle = c.collect()["files_read"]
+        next_pid = 5000
+        for churn in (10, 100):
+            pids = range(next_pid, next_pid + churn)
+            next_pid += churn
+            for pid in pids:
+                proc.spawn(pid)
+            data = c.collect()
+            print(f"\n/proc cycle, {churn} spawned: {data['files_read']} reads")
+            assert len(data["spawned"]) == churn
+            assert data["files_read"] - idle <= MAX_READS_PER_CHURN * churn
+
+            for pid in pids:
+                proc.kill(pid)
+            data = c.collect()
+            assert len(data["exited"]) == churn
+            assert data["files_read"] <= idle  # exits cost no reads
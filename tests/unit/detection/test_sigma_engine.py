@@ -7,6 +7,8 @@ Covers:
   - Required field validation across all loaded rules
   - Category distribution across logsource types
   - Presence of specific new rule IDs (Shield / infostealer wave)
+  - Compiled evaluation: values, modifiers, condition grammar, inverted index
+  - Windowed count()/sum() aggregation and checkpointing
 """
 
 import pytest
@@ -134,3 +136,232 @@ class TestSpecificRulesExist:
             f"Rule {rule_id} title mismatch: "
             f"expected fragment '{expected_title_fragment}' in '{rule.title}'"
         )
+
+
+# ============================================================================
+# Compiled evaluation
+# ============================================================================
+
+
+def _rule(condition: str, detection: str, rule_id: str = "t-001") -> str:
+    return (
+        f"title: Test {rule_id}\n"
+        f"id: {rule_id}\n"
+        f"detection:\n{detection}"
+        f"    condition: {condition}\n"
+        "fields:\n    - cmdline\n"
+    )
+
+
+@pytest.fixture()
+def blank() -> SigmaEngine:
+    return SigmaEngine(auto_load=False)
+
+
+class TestCompiledEvaluation:
+
+    def test_exact_wildcard_regex_and_list_values(self, blank: SigmaEngine) -> None:
+        blank.load_rule_from_string(
+            _rule(
+                "selection",
+                "    selection:\n"
+                "        event_type: Spawn\n"
+                "        exe: '*/bin/*sh'\n"
+                "        user: [root, admin]\n"
+                "        cmdline: '/curl .+\\|\\s+sh/'\n",
+            )
+        )
+        event = {
+            "event_type": "spawn",
+            "exe": "/usr/BIN/bash",
+            "data": {"user": "ADMIN", "cmdline": "curl http://x | sh"},
+        }
+        assert [m.rule_id for m in blank.evaluate(event)] == ["t-001"]
+        assert blank.evaluate({**event, "event_type": "other"}) == []
+        assert blank.evaluate({**event, "exe": "/usr/bin/python"}) == []
+
+    def test_modifiers(self, blank: SigmaEngine) -> None:
+        blank.load_rule_from_string(
+            _rule(
+                "selection",
+                "    selection:\n"
+                "        cmdline|contains|all: [klist, '-c']\n"
+                "        path|startswith: /tmp/\n"
+                "        name|endswith: [.sh, .py]\n"
+                "        host|re: '^web-\\d+$'\n",
+            )
+        )
+        event = {
+            "cmdline": "KLIST -c /tmp/x",
+            "path": "/tmp/a",
+            "name": "run.py",
+            "host": "WEB-12",
+        }
+        assert len(blank.evaluate(event)) == 1
+        assert blank.evaluate({**event, "cmdline": "klist"}) == []
+        assert blank.evaluate({**event, "name": "run.rb"}) == []
+
+    def test_shipped_contains_rule_fires(self, engine: SigmaEngine) -> None:
+        matches = engine.evaluate(
+            {"event_type": "suspicious_command", "cmdline": "klist -e"}
+        )
+        # cmdline|contains was never resolved before rules were compiled
+        assert "amoskys-cred-004" in {m.rule_id for m in matches}
+
+    @pytest.mark.parametrize(
+        "condition, event, expected",
+        [
+            ("sel and not filter", {"a": "1", "b": "2"}, True),
+            ("sel and not filter", {"a": "1", "b": "9"}, False),
+            ("not sel", {"a": "0"}, True),
+            ("(sel or filter) and other", {"b": "9", "c": "3"}, True),
+            ("1 of sel* or other", {"a": "1"}, True),
+            ("all of them", {"a": "1", "b": "9", "c": "3"}, True),
+            ("all of them", {"a": "1", "c": "3"}, False),
+        ],
+    )
+    def test_condition_grammar(
+        self, blank: SigmaEngine, condition: str, event: dict, expected: bool
+    ) -> None:
+        blank.load_rule_from_string(
+            _rule(
+                condition,
+                "    sel:\n        a: '1'\n"
+                "    filter:\n        b: '9'\n"
+                "    other:\n        c: '3'\n",
+            )
+        )
+        assert bool(blank.evaluate(event)) is expected
+
+    def test_bad_condition_never_matches(self, blank: SigmaEngine) -> None:
+        rule = blank.load_rule_from_string(
+            _rule("sel and missing", "    sel:\n        a: '1'\n")
+        )
+        assert rule is not None and rule._predicate is None
+        assert blank.evaluate({"a": "1"}) == []
+
+    def test_index_skips_rules_without_required_literal(
+        self, engine: SigmaEngine
+    ) -> None:
+        evaluated = []
+        original = engine._rule_matches
+
+        def spy(rule, event_dict):
+            evaluated.append(rule.id)
+            return original(rule, event_dict)
+
+        engine._rule_matches = spy
+        engine.evaluate({"event_type": "suspicious_command", "cmdline": "ls"})
+        assert 0 < len(evaluated) < engine.rule_count
+        rules = [engine.get_rule(rule_id) for rule_id in evaluated]
+        assert all(
+            r._index_key is None or "suspicious_command" in r._index_key[1]
+            for r in rules
+        )
+
+    def test_remove_rule_invalidates_plans(self, blank: SigmaEngine) -> None:
+        blank.load_rule_from_string(
+            _rule("selection", "    selection:\n        event_type: x\n")
+        )
+        assert len(blank.evaluate({"event_type": "x"})) == 1
+        assert blank.remove_rule("t-001")
+        assert blank.evaluate({"event_type": "x"}) == []
+
+
+# ============================================================================
+# Windowed aggregation
+# ============================================================================
+
+_SEC = 1_000_000_000
+
+
+def _agg_rule(condition: str, timeframe: str = "5m", rule_id: str = "agg-001") -> str:
+    return _rule(
+        condition,
+        "    selection:\n        event_type: login_failure\n"
+        f"    timeframe: {timeframe}\n",
+        rule_id,
+    )
+
+
+def _failure(ts_s: int, **fields) -> dict:
+    ts_ns = (1_700_000_000 + ts_s) * _SEC
+    return {"event_type": "login_failure", "timestamp_ns": ts_ns, **fields}
+
+
+class TestWindowedAggregation:
+
+    def test_count_by_field_fires_once_on_crossing(self, blank: SigmaEngine) -> None:
+        blank.load_rule_from_string(_agg_rule("selection | count(source_ip) >= 3"))
+        fired = [
+            bool(blank.evaluate(_failure(t, source_ip="10.0.0.1"))) for t in range(5)
+        ]
+        assert fired == [False, False, True, False, False]
+        # Another source has its own window
+        assert blank.evaluate(_failure(5, source_ip="10.0.0.2")) == []
+
+    def test_window_expiry_rearms(self, blank: SigmaEngine) -> None:
+        blank.load_rule_from_string(_agg_rule("selection | count() > 1", "10s"))
+        assert blank.evaluate(_failure(0)) == []
+        match = blank.evaluate(_failure(5))
+        assert match and match[0].aggregate_value == 2
+        assert blank.evaluate(_failure(30)) == []  # earlier entries expired
+        assert blank.evaluate(_failure(31))  # crossed again
+
+    def test_distinct_count_by_group(self, blank: SigmaEngine) -> None:
+        blank.load_rule_from_string(
+            _agg_rule("selection | count(username) by source_ip >= 3")
+        )
+        for t, user in enumerate(["root", "root", "admin", "admin"]):
+            assert blank.evaluate(_failure(t, source_ip="a", username=user)) == []
+        match = blank.evaluate(_failure(5, source_ip="a", username="oracle"))
+        assert match and match[0].aggregate_value == 3
+
+    def test_sum_by_group(self, blank: SigmaEngine) -> None:
+        blank.load_rule_from_string(
+            _agg_rule("selection | sum(bytes) by host > 1000", "1m")
+        )
+        assert blank.evaluate(_failure(0, host="h", bytes=600)) == []
+        assert blank.evaluate(_failure(1, host="h", bytes="nan-ish")) == []
+        assert blank.evaluate(_failure(2, host="h", bytes=500))
+        assert blank.evaluate(_failure(90, host="h", bytes=500)) == []
+
+    def test_missing_group_field_is_not_counted(self, blank: SigmaEngine) -> None:
+        blank.load_rule_from_string(_agg_rule("selection | count(source_ip) >= 1"))
+        assert blank.evaluate(_failure(0)) == []
+
+    def test_bad_aggregation_disables_rule(self, blank: SigmaEngine) -> None:
+        rule = blank.load_rule_from_string(_agg_rule("selection | near(x) > 1"))
+        assert rule is not None and rule._predicate is None
+        assert blank.evaluate(_failure(0)) == []
+
+    def test_group_count_is_bounded(
+        self, blank: SigmaEngine, monkeypatch: pytest.MonkeyPatch
+    ) -> None:
+        from amoskys.detection import sigma_engine as module
+
+        monkeypatch.setattr(module, "_AGG_MAX_GROUPS", 3)
+        blank.load_rule_from_string(_agg_rule("selection | count(source_ip) >= 5"))
+        for i in range(10):
+            blank.evaluate(_failure(i, source_ip=f"10.0.0.{i}"))
+        assert list(blank._agg_windows["agg-001"]) == [
+            "10.0.0.7",
+            "10.0.0.8",
+            "10.0.0.9",
+        ]
+
+    def test_checkpoint_round_trip(self, blank: SigmaEngine, tmp_path) -> None:
+        rule = _agg_rule("selection | count(source_ip) >= 3")
+        blank.load_rule_from_string(rule)
+        for t in range(2):
+            blank.evaluate(_failure(t, source_ip="10.0.0.1"))
+        path = str(tmp_path / "sigma_windows.json")
+        assert blank.save_aggregation_state(path)
+
+        restarted = SigmaEngine(auto_load=False)
+        restarted.load_rule_from_string(rule)
+        assert restarted.load_aggregation_state(path) == 1
+        assert restarted.evaluate(_failure(2, source_ip="10.0.0.1"))
+
+    def test_load_missing_checkpoint(self, blank: SigmaEngine, tmp_path) -> None:
+        assert blank.load_aggregation_state(str(tmp_path / "absent.json")) == 0
@@ -17,7 +17,7 @@ Covers:
     - _on_hup signal handler
     - EventBusServicer.Publish: overload, size limit, dedup, inflight cap,
       flow extraction, WAL paths, ValueError, general exception
-    - EventBusServicer.Subscribe: UNIMPLEMENTED abort
+    - EventBusServicer.Subscribe: filters, ring-buffer overflow, resume
     - UniversalEventBusServicer.PublishTelemetry: overload, size, sig, dedup,
       inflight, device_telemetry/process/flow/empty, WAL, exceptions
     - UniversalEventBusServicer unimplemented RPCs
@@ -728,15 +728,244 @@ class TestEventBusServicerPublish:
 # ===================================================================
 
 
+def _wal_entry(wal_id, agent="agent-a", severity="INFO", kind="device_telemetry"):
+    """Build a (wal_id, idem, ts_ns, env_bytes) tuple as the WAL hub sees it."""
+    env = tpb.UniversalEnvelope(idempotency_key=f"k-{wal_id}", ts_ns=wal_id)
+    if kind == "device_telemetry":
+        env.device_telemetry.collection_agent = agent
+        env.device_telemetry.events.add(event_id=f"e-{wal_id}", severity=severity)
+    elif kind == "process":
+        env.process.pid = wal_id
+    return (wal_id, f"k-{wal_id}", wal_id, env.SerializeToString())
+
+
+class TestWALHub:
+    """Fan-out of committed WAL entries to filtered, bounded subscribers."""
+
+    def test_filters_by_agent_kind_and_severity(self):
+        hub = srv._WALHub()
+        by_agent = hub.register("a", agent_ids=["agent-b"])
+        by_kind = hub.register("k", payload_kinds=["process"])
+        by_sev = hub.register("s", min_severity="HIGH")
+        hub.publish(
+            [
+                _wal_entry(1, agent="agent-a", severity="LOW"),
+                _wal_entry(2, agent="agent-b", severity="CRITICAL"),
+                _wal_entry(3, kind="process"),
+            ]
+        )
+        assert by_agent.next(0).wal_id == 2
+        assert by_agent.next(0) is None
+        assert by_kind.next(0).wal_id == 3
+        event = by_sev.next(0)
+        assert (event.wal_id, event.severity, event.agent_id) == (
+            2,
+            "CRITICAL",
+            "agent-b",
+        )
+        assert by_sev.next(0) is None
+
+    def test_drop_oldest_on_overflow(self):
+        hub = srv._WALHub()
+        sub = hub.register("slow", max_buffer=2)
+        hub.publish([_wal_entry(i) for i in range(1, 5)])
+        assert sub.dropped == 2
+        assert [sub.next(0).wal_id, sub.next(0).wal_id] == [3, 4]
+
+    def test_disconnect_on_overflow(self):
+        hub = srv._WALHub()
+        sub = hub.register("strict", max_buffer=1, disconnect_on_overflow=True)
+        hub.publish([_wal_entry(1), _wal_entry(2)])
+        assert sub.overflowed is True
+        assert sub.next(0) is None
+
+    def test_unregistered_subscriber_gets_nothing(self):
+        hub = srv._WALHub()
+        sub = hub.register("gone")
+        hub.unregister(sub)
+        assert hub.publish([_wal_entry(1)]) == 0
+        assert not hub.has_subscribers()
+
+    def test_replay_merges_history_and_stored_rows(self):
+        hub = srv._WALHub(history=2)
+        hub.publish([_wal_entry(i) for i in range(1, 5)])  # history keeps 3, 4
+        sub = hub.register("r", agent_ids=["agent-a"])
+        stored = [_wal_entry(2), _wal_entry(3), _wal_entry(6, agent="agent-z")]
+        events = hub.replay(sub, after_id=2, stored=stored)
+        assert [e.wal_id for e in events] == [3, 4]
+
+    def test_batch_writer_publishes_committed_rows(self, tmp_path):
+        from amoskys.storage.wal_sqlite import SQLiteWAL
+
+        wal = SQLiteWAL(path=str(tmp_path / "wal.db"))
+        hub = srv._WALHub()
+        sub = hub.register("w")
+        writer = srv.WALBatchWriter(wal, max_wait_s=0.01)
+        with patch.object(srv, "_wal_hub", hub):
+            writer.start()
+            try:
+                _, idem, ts_ns, env_bytes = _wal_entry(0)
+                assert writer.write(idem, ts_ns, env_bytes) is True
+                assert writer.write(idem, ts_ns, env_bytes) is False
+            finally:
+                writer.stop()
+        row_id = wal.db.execute("SELECT id FROM wal").fetchone()[0]
+        event = sub.next(0)
+        assert (event.wal_id, event.idempotency_key) == (row_id, idem)
+        assert sub.next(0) is None
+
+
 class TestEventBusServicerSubscribe:
-    def test_subscribe_aborts_unimplemented(self):
-        servicer = srv.EventBusServicer()
+    """Server-streaming Subscribe over the WAL hub."""
+
+    def setup_method(self):
+        self.hub = srv._WALHub()
+        self._patch = patch.object(srv, "_wal_hub", self.hub)
+        self._patch.start()
+
+    def teardown_method(self):
+        self._patch.stop()
+
+    def _consume(self, request, ctx, count):
+        """Run Subscribe in a thread and collect ``count`` events."""
+        events = []
+        errors = []
+
+        def run():
+            try:
+                for event in srv.EventBusServicer().Subscribe(request, ctx):
+                    events.append(event)
+                    if len(events) == count:
+                        break
+            except grpc.RpcError as exc:
+                errors.append(exc)
+
+        thread = threading.Thread(target=run, daemon=True)
+        thread.start()
+        return thread, events, errors
+
+    def _wait_for_subscriber(self):
+        deadline = time.time() + 2
+        while not self.hub.has_subscribers() and time.time() < deadline:
+            time.sleep(0.01)
+        assert self.hub.has_subscribers()
+
+    def test_invalid_min_severity_aborts(self):
         ctx = _mock_context()
+        request = pb.SubscribeRequest(min_severity="LOUD")
         with pytest.raises(grpc.RpcError):
-            servicer.Subscribe(MagicMock(), ctx)
+            next(srv.EventBusServicer().Subscribe(request, ctx))
+        assert ctx.abort.call_args[0][0] == grpc.StatusCode.INVALID_ARGUMENT
+        assert not self.hub.has_subscribers()
+
+    def test_streams_live_entries(self):
+        ctx = _mock_context()
+        ctx.is_active = MagicMock(return_value=True)
+        request = pb.SubscribeRequest(subscriber_id="dash", agent_ids=["agent-a"])
+        thread, events, _ = self._consume(request, ctx, 2)
+        self._wait_for_subscriber()
+        self.hub.publish([_wal_entry(1), _wal_entry(2, agent="agent-x"), _wal_entry(3)])
+        thread.join(timeout=5)
+        assert [e.wal_id for e in events] == [1, 3]
+        assert not self.hub.has_subscribers()
+
+    def test_resume_replays_then_skips_already_sent(self, tmp_path):
+        from amoskys.storage.wal_sqlite import SQLiteWAL
+
+        srv.wal_storage = SQLiteWAL(path=str(tmp_path / "wal.db"))
+        for wal_id in (1, 2, 3):
+            _, idem, ts_ns, env_bytes = _wal_entry(wal_id)
+            srv.wal_storage.write_raw(idem, ts_ns, env_bytes)
+
+        ctx = _mock_context()
+        ctx.is_active = MagicMock(return_value=True)
+        request = pb.SubscribeRequest(resume_after_id=1)
+        thread, events, _ = self._consume(request, ctx, 3)
+        self._wait_for_subscriber()
+        # Row 3 arrives on the live feed too; it must not be yielded twice.
+        self.hub.publish([_wal_entry(3), _wal_entry(4)])
+        thread.join(timeout=5)
+        assert [e.wal_id for e in events] == [2, 3, 4]
+
+    def test_resume_older_than_history_aborts_out_of_range(self, tmp_path):
+        from amoskys.storage.wal_sqlite import SQLiteWAL
+
+        srv.wal_storage = SQLiteWAL(path=str(tmp_path / "wal.db"))
+        for wal_id in range(1, 6):
+            _, idem, ts_ns, env_bytes = _wal_entry(wal_id)
+            srv.wal_storage.write_raw(idem, ts_ns, env_bytes)
+        # Rows 1-3 were drained and never made it into the hub's history
+        srv.wal_storage.db.execute("DELETE FROM wal WHERE id <= 3")
+
+        ctx = _mock_context()
+        request = pb.SubscribeRequest(resume_after_id=1)
+        with pytest.raises(grpc.RpcError):
+            next(srv.EventBusServicer().Subscribe(request, ctx))
+        assert ctx.abort.call_args[0][0] == grpc.StatusCode.OUT_OF_RANGE
+        assert "oldest retained id: 4" in ctx.abort.call_args[0][1]
+        assert not self.hub.has_subscribers()
+
+    def test_resume_pages_through_backlog_larger_than_history(self, tmp_path):
+        from amoskys.storage.wal_sqlite import SQLiteWAL
+
+        srv.wal_storage = SQLiteWAL(path=str(tmp_path / "wal.db"))
+        for wal_id in range(1, 8):
+            _, idem, ts_ns, env_bytes = _wal_entry(wal_id)
+            srv.wal_storage.write_raw(idem, ts_ns, env_bytes)
+
+        ctx = _mock_context()
+        ctx.is_active = MagicMock(return_value=True)
+        request = pb.SubscribeRequest(resume_after_id=1)
+        with patch.object(srv, "SUBSCRIBE_HISTORY", 2):
+            thread, events, errors = self._consume(request, ctx, 6)
+            thread.join(timeout=5)
+        assert [e.wal_id for e in events] == [2, 3, 4, 5, 6, 7]
+        assert not errors
+
+    def test_overflow_disconnects_with_resource_exhausted(self):
+        ctx = _mock_context()
+        ctx.is_active = MagicMock(return_value=True)
+        request = pb.SubscribeRequest(buffer_size=1, disconnect_on_overflow=True)
+        gen = srv.EventBusServicer().Subscribe(request, ctx)
+        # The generator registers on first next(); feed it one event from a thread
+        thread = threading.Thread(
+            target=lambda: (
+                self._wait_for_subscriber(),
+                self.hub.publish([_wal_entry(1)]),
+            ),
+            daemon=True,
+        )
+        thread.start()
+        assert next(gen).wal_id == 1
+        thread.join(timeout=5)
+        self.hub.publish([_wal_entry(2), _wal_entry(3)])
+        with pytest.raises(grpc.RpcError):
+            next(gen)
         ctx.abort.assert_called_once_with(
-            grpc.StatusCode.UNIMPLEMENTED, "Subscribe not supported"
+            grpc.StatusCode.RESOURCE_EXHAUSTED, "subscriber buffer overflow"
+        )
+        assert not self.hub.has_subscribers()
+
+    def test_dropped_count_is_reported(self):
+        ctx = _mock_context()
+        ctx.is_active = MagicMock(return_value=True)
+        request = pb.SubscribeRequest(buffer_size=1)
+        gen = srv.EventBusServicer().Subscribe(request, ctx)
+        thread = threading.Thread(
+            target=lambda: (
+                self._wait_for_subscriber(),
+                self.hub.publish([_wal_entry(1)]),
+            ),
+            daemon=True,
         )
+        thread.start()
+        assert next(gen).wal_id == 1
+        thread.join(timeout=5)
+        self.hub.publish([_wal_entry(2), _wal_entry(3)])
+        event = next(gen)
+        assert (event.wal_id, event.dropped) == (3, 1)
+        gen.close()
+        assert not self.hub.has_subscribers()
 
 
 # ===================================================================
@@ -866,6 +1095,166 @@ class TestUniversalPublishTelemetry:
         assert ack.events_accepted == 1
 
 
+class TestUniversalPublishBatch:
+    """Test the PublishBatch RPC: per-envelope acks over one group commit."""
+
+    def setup_method(self):
+        self.servicer = srv.UniversalEventBusServicer()
+        self.ctx = _mock_context()
+        srv._OVERLOAD = False
+        srv.REQUIRE_SIGNATURES = False
+        srv.AGENT_PUBKEY = None
+        srv.wal_storage = None
+        self._saved_limiter = srv._agent_limiter
+        srv._agent_limiter = srv._AgentRateLimiter(rate=0.0, burst=1000)
+
+    def teardown_method(self):
+        srv._agent_limiter = self._saved_limiter
+
+    @staticmethod
+    def _batch(*idems, agent="agent-a"):
+        batch = tpb.TelemetryBatch()
+        for idem in idems:
+            env = batch.envelopes.add(idempotency_key=idem, ts_ns=1000)
+            env.device_telemetry.device_id = "dev-1"
+            env.device_telemetry.collection_agent = agent
+        return batch
+
+    def test_all_accepted(self):
+        ack = self.servicer.PublishBatch(self._batch("b-1", "b-2", "b-3"), self.ctx)
+        assert ack.status == tpb.UniversalAck.Status.OK
+        assert ack.events_accepted == 3
+        assert [a.reason for a in ack.envelope_acks] == ["accepted"] * 3
+
+    def test_per_envelope_acks_keep_request_order(self):
+        batch = self._batch("ok-1", "ok-2")
+        batch.envelopes.add(idempotency_key="empty")  # no payload: contract fails
+        batch.envelopes.add().CopyFrom(self._batch("ok-3").envelopes[0])
+        ack = self.servicer.PublishBatch(batch, self.ctx)
+        statuses = [a.status for a in ack.envelope_acks]
+        assert statuses == [
+            tpb.UniversalAck.Status.OK,
+            tpb.UniversalAck.Status.OK,
+            tpb.UniversalAck.Status.INVALID,
+            tpb.UniversalAck.Status.OK,
+        ]
+        assert ack.status == tpb.UniversalAck.Status.INVALID
+        assert ack.events_accepted == 3
+        assert ack.events_rejected == 1
+
+    def test_duplicates_within_and_across_batches(self):
+        ack = self.servicer.PublishBatch(self._batch("d-1", "d-1"), self.ctx)
+        assert [a.reason for a in ack.envelope_acks] == ["accepted", "duplicate"]
+        ack = self.servicer.PublishBatch(self._batch("d-1"), self.ctx)
+        assert ack.envelope_acks[0].reason == "duplicate"
+        assert ack.status == tpb.UniversalAck.Status.OK
+
+    def test_signature_failure_is_per_envelope(self):
+        srv.REQUIRE_SIGNATURES = True
+        ack = self.servicer.PublishBatch(self._batch("s-1", "s-2"), self.ctx)
+        assert all(
+            a.status == tpb.UniversalAck.Status.SECURITY_VIOLATION
+            for a in ack.envelope_acks
+        )
+        assert ack.status == tpb.UniversalAck.Status.INVALID
+
+    def test_rate_limit_applies_across_batch(self):
+        srv._agent_limiter = srv._AgentRateLimiter(rate=0.0, burst=2)
+        ack = self.servicer.PublishBatch(
+            self._batch("r-1", "r-2", "r-3", "r-4"), self.ctx
+        )
+        statuses = [a.status for a in ack.envelope_acks]
+        assert statuses[:2] == [tpb.UniversalAck.Status.OK] * 2
+        assert statuses[2:] == [tpb.UniversalAck.Status.RETRY] * 2
+        assert ack.status == tpb.UniversalAck.Status.RETRY
+        assert ack.backoff_hint_ms == 3000
+        # Rate-limited envelopes were not marked as seen
+        assert "r-3" not in srv._dedupe
+
+    def test_overloaded_returns_retry_without_acks(self):
+        srv._OVERLOAD = True
+        ack = self.servicer.PublishBatch(self._batch("o-1", "o-2"), self.ctx)
+        assert ack.status == tpb.UniversalAck.Status.RETRY
+        assert ack.events_rejected == 2
+        assert len(ack.envelope_acks) == 0
+
+    def test_bare_records_rejected(self):
+        batch = tpb.TelemetryBatch()
+        batch.telemetry_records.add(device_id="dev-1")
+        ack = self.servicer.PublishBatch(batch, self.ctx)
+        assert ack.status == tpb.UniversalAck.Status.INVALID
+        assert "signed envelopes" in ack.reason
+
+    def test_batch_size_limit(self):
+        with patch.object(srv, "MAX_BATCH_ENVELOPES", 2):
+            ack = self.servicer.PublishBatch(self._batch("m-1", "m-2", "m-3"), self.ctx)
+        assert ack.status == tpb.UniversalAck.Status.INVALID
+        assert "too large" in ack.reason.lower()
+
+    def test_single_group_commit(self):
+        writer = MagicMock()
+        writer.write_many.side_effect = lambda items: [True] * len(items)
+        srv.wal_storage = MagicMock()
+        with patch.object(srv, "_wal_batch_writer", writer):
+            ack = self.servicer.PublishBatch(self._batch("g-1", "g-2"), self.ctx)
+        assert ack.status == tpb.UniversalAck.Status.OK
+        writer.write_many.assert_called_once()
+        items = writer.write_many.call_args[0][0]
+        assert [item["idem"].split(":")[0] for item in items] == ["g-1", "g-2"]
+        srv.wal_storage.write_raw.assert_not_called()
+
+    def test_failed_commit_returns_retry_and_forgets_keys(self):
+        writer = MagicMock()
+        writer.write_many.side_effect = lambda items: [None] * len(items)
+        srv.wal_storage = MagicMock()
+        with patch.object(srv, "_wal_batch_writer", writer):
+            ack = self.servicer.PublishBatch(self._batch("f-1"), self.ctx)
+        assert ack.envelope_acks[0].status == tpb.UniversalAck.Status.RETRY
+        assert "WAL write failed" in ack.envelope_acks[0].reason
+        assert "f-1" not in srv._dedupe
+
+
+class TestWALBatchWriterWriteMany:
+    """write_many() lands a whole PublishBatch in one commit."""
+
+    def test_write_many_results_in_order(self, tmp_path):
+        from amoskys.storage.wal_sqlite import SQLiteWAL
+
+        wal = SQLiteWAL(path=str(tmp_path / "wal.db"))
+        writer = srv.WALBatchWriter(wal, max_wait_s=0.01)
+        writer.start()
+        try:
+            assert writer.write("w-0", 1, b"zero") is True
+            results = writer.write_many(
+                [
+                    {"idem": "w-1", "ts_ns": 2, "env_bytes": b"one"},
+                    {"idem": "w-0", "ts_ns": 3, "env_bytes": b"dup"},
+                    {"idem": "w-2", "ts_ns": 4, "env_bytes": b"two"},
+                ]
+            )
+        finally:
+            writer.stop()
+        assert results == [True, False, True]
+        assert wal.db.execute("SELECT COUNT(*) FROM wal").fetchone()[0] == 3
+
+    def test_write_many_empty(self):
+        writer = srv.WALBatchWriter(MagicMock())
+        assert writer.write_many([]) == []
+
+
+class TestAgentRateLimiterAllowN:
+    def test_grants_up_to_burst(self):
+        limiter = srv._AgentRateLimiter(rate=0.0, burst=3)
+        assert limiter.allow_n("a", 5) == 3
+        assert limiter.allow_n("a", 1) == 0
+        assert limiter.allow_n("b", 2) == 2
+
+    def test_shares_bucket_with_allow(self):
+        limiter = srv._AgentRateLimiter(rate=0.0, burst=2)
+        assert limiter.allow("a") is True
+        assert limiter.allow_n("a", 2) == 1
+
+
 # ===================================================================
 # 14. UniversalEventBusServicer unimplemented RPCs
 # ===================================================================
@@ -884,9 +1273,6 @@ class TestUniversalUnimplementedRPCs:
             method(MagicMock(), ctx)
         ctx.abort.assert_called_once_with(grpc.StatusCode.UNIMPLEMENTED, expected_msg)
 
-    def test_publish_batch(self):
-        self._check_unimplemented("PublishBatch", "PublishBatch not supported")
-
     def test_register_device(self):
         self._check_unimplemented("RegisterDevice", "RegisterDevice not supported")
 
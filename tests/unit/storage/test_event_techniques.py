@@ -0,0 +1,187 @@
+"""Tests for the event_techniques MITRE index.
+
+Covers:
+  - Rows written on insert (immediate and staged batches), tactics paired
+  - Backfill of pre-existing security events by migration 015
+  - Retention pruning alongside security_events
+  - Coverage, IGRIS technique explain, shell technique search and StoryEngine
+    hydration answered from the index (query plans never scan security_events)
+"""
+
+import time
+from datetime import datetime, timezone
+
+import pytest
+
+from amoskys.igris.tools import IgrisToolkit
+from amoskys.intel.story_engine import StoryEngine
+from amoskys.storage.migrations.migrate import auto_migrate
+from amoskys.storage.telemetry_store import TelemetryStore
+
+
+@pytest.fixture
+def store(tmp_path):
+    s = TelemetryStore(str(tmp_path / "telemetry.db"))
+    yield s
+    s.close()
+
+
+def _event(techniques, tactics=(), category="execution", device="d1", **kw):
+    event = {
+        "timestamp_ns": int(time.time() * 1e9),
+        "device_id": device,
+        "event_category": category,
+        "mitre_techniques": list(techniques),
+        "mitre_tactics": list(tactics),
+        "risk_score": 0.7,
+    }
+    event.update(kw)
+    return event
+
+
+def _index(store):
+    rows = store.db.execute(
+        "SELECT event_rowid, technique, tactic, device_id FROM event_techniques "
+        "ORDER BY event_rowid, technique"
+    )
+    return [tuple(r) for r in rows]
+
+
+def _plan(db, sql, params=()):
+    rows = db.execute(f"EXPLAIN QUERY PLAN {sql}", params).fetchall()
+    return " | ".join(r[-1] for r in rows)
+
+
+class TestIndexing:
+    def test_insert_indexes_techniques_with_tactics(self, store):
+        a = store.insert_security_event(
+            _event(["T1059", "T1071.001"], ["execution", "command-and-control"])
+        )
+        b = store.insert_security_event(_event(["T1110", "T1078"], ["credential"]))
+        c = store.insert_security_event(_event(["T1082"], ["a", "b"], device="d2"))
+        store.insert_security_event(_event([]))
+        assert _index(store) == [
+            (a, "T1059", "execution", "d1"),
+            (a, "T1071.001", "command-and-control", "d1"),
+            (b, "T1078", "credential", "d1"),
+            (b, "T1110", "credential", "d1"),
+            (c, "T1082", None, "d2"),  # ambiguous pairing
+        ]
+
+    def test_staged_batch_indexed_on_flush(self, store):
+        store.insert_security_event(_event(["T1000"]))
+        store.begin_batch(staged=True)
+        for i in range(5):
+            assert store.insert_security_event(_event([f"T10{i:02d}"])) is None
+        assert len(_index(store)) == 1
+        store.end_batch()
+        assert [r[1] for r in _index(store)] == [
+            "T1000",
+            "T1000",
+            "T1001",
+            "T1002",
+            "T1003",
+            "T1004",
+        ]
+        ids = {r[0] for r in _index(store)}
+        assert len(ids) == 6
+
+    def test_migration_backfills_existing_rows(self, store):
+        rows = [
+            ('["T1059", "T1059"]', '["execution"]'),
+            ("NOT_JSON", None),
+            ('{"bad": "format"}', None),
+            ('["T1548.003", {"x": 1}]', '["privesc", "other"]'),
+        ]
+        for techniques, tactics in rows:
+            store.db.execute(
+                "INSERT INTO security_events (timestamp_ns, timestamp_dt, "
+                "device_id, mitre_techniques, mitre_tactics) VALUES (?, ?, ?, ?, ?)",
+                (1, datetime.now(timezone.utc).isoformat(), "d1", techniques, tactics),
+            )
+        store.db.execute("DELETE FROM schema_migrations WHERE version = 15")
+        store.db.commit()
+        assert _index(store) == []
+
+        assert auto_migrate(store.db_path) == 1
+        assert _index(store) == [
+            (1, "T1059", "execution", "d1"),
+            (4, "T1548.003", "privesc", "d1"),
+        ]
+
+    def test_retention_prunes_index(self, store):
+        old_ns = int((time.time() - 10 * 86400) * 1e9)
+        store.insert_security_event(_event(["T1059"], timestamp_ns=old_ns))
+        keep = store.insert_security_event(_event(["T1082"]))
+        deleted = store.cleanup_old_data(max_age_days=3)
+        assert deleted["event_techniques"] == 1
+        assert [r[0] for r in _index(store)] == [keep]
+
+
+class TestIndexedQueries:
+    @pytest.fixture
+    def populated(self, store):
+        store.insert_security_event(_event(["T1059", "T1059.004"], category="exec"))
+        store.insert_security_event(_event(["T1059.004"], category="exec"))
+        store.insert_security_event(_event(["T1059.004"], category=None))
+        store.insert_security_event(
+            _event(["T1110"], category="auth", description="brute")
+        )
+        return store
+
+    def test_coverage(self, populated):
+        assert populated.get_mitre_coverage() == {
+            "T1059": {"count": 1, "categories": {"exec": 1}},
+            "T1059.004": {"count": 3, "categories": {"exec": 2, "unknown": 1}},
+            "T1110": {"count": 1, "categories": {"auth": 1}},
+        }
+        plan = _plan(
+            populated.db,
+            "SELECT et.technique, s.event_category, COUNT(*) FROM event_techniques "
+            "et JOIN security_events s ON s.id = et.event_rowid "
+            "GROUP BY et.technique, s.event_category",
+        )
+        assert "SCAN security_events" not in plan
+
+    def test_igris_explain_technique(self, populated):
+        toolkit = IgrisToolkit(telemetry_db=populated.db_path)
+        result = toolkit._tool_explain_mitre_technique("T1059")
+        assert result["detection_count"] == 3  # parent matches sub-techniques
+        assert (
+            toolkit._tool_explain_mitre_technique("T1110")[
+                "detections_using_technique"
+            ][0]["description"]
+            == "brute"
+        )
+        assert toolkit._tool_explain_mitre_technique("T105")["detection_count"] == 0
+        plan = _plan(
+            populated.db,
+            "SELECT event_rowid FROM event_techniques "
+            "WHERE technique = ? OR technique GLOB ?",
+            ("T1059", "T1059.*"),
+        )
+        assert "idx_event_techniques_tech" in plan and "SCAN" not in plan
+
+    def test_shell_technique_search(self, populated, monkeypatch):
+        from amoskys import shell
+
+        monkeypatch.setattr(shell, "TELEMETRY_DB", shell.Path(populated.db_path))
+        assert len(shell.search_events("t1059.004")) == 3
+        assert len(shell.search_events("T1110")) == 1
+        assert [r["event_category"] for r in shell.search_events("auth")] == ["auth"]
+
+    def test_story_hydration_uses_index(self, store, tmp_path):
+        now = int(time.time() * 1e9)
+        store.insert_security_event(_event(["T1555"], event_id="a", timestamp_ns=now))
+        store.insert_security_event(_event(["T9999"], event_id="b", timestamp_ns=now))
+        store.insert_security_event(
+            _event(["T1555"], event_id="c", timestamp_ns=now - 86400 * 10**9)
+        )
+        engine = StoryEngine(
+            telemetry_db=store.db_path, fusion_db=str(tmp_path / "fusion.db")
+        )
+        scope = ({"d1"}, now - 60 * 10**9, now + 60 * 10**9)
+        events = engine._hydrate_events(set(), {"T1555"}, scope)
+        assert [e["event_id"] for e in events] == ["a"]
+        assert engine._hydrate_events(set(), set(), scope) == []
+        engine.close()
@@ -0,0 +1,505 @@
+"""Tests for time-partitioned domain tables (AMOSKYS_PARTITION_HOURS).
+
+Covers:
+  - Converting an existing store: rows, ids, search and rollups carry over
+  - Rollover: immediate, staged and raw-SQL inserts land in the live
+    partition with globally increasing ids; a writer still routing to a
+    sealed partition follows the new one
+  - Reads, updates and deletes through the view; time-range query plans
+    probe each partition's index
+  - Retention drops expired partitions and keeps the rollup cube exact
+  - Schema changes (migrations, _ensure_column) reach every partition
+  - Benchmark: 30 days of rows, partition drop vs the DELETE path
+    (cleanup time, WAL growth and the stall seen by a concurrent writer)
+
+Environment variables:
+    PARTITION_BENCH_ROWS: security_events rows per day for the benchmark
+        (default: 3000; set 15000 or more to see the gap widen)
+"""
+
+import os
+import random
+import sqlite3
+import threading
+import time
+from pathlib import Path
+
+import pytest
+from test_rollup_cube import _assert_cube_exact, _insert_random
+
+from amoskys.storage._ts_changefeed import max_rowid, tail_rows
+from amoskys.storage._ts_partitions import (
+    PARTITIONED_SOURCES,
+    execute_ddl,
+    partition_names,
+)
+from amoskys.storage.migrations.migrate import apply_migration
+from amoskys.storage.telemetry_store import TelemetryStore
+
+BENCH_ROWS = int(os.environ.get("PARTITION_BENCH_ROWS", "3000"))
+
+NS = 10**9
+DAY_NS = 86400 * NS
+NOW_NS = int(time.time() * 1e9)
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Partition clock, starting six days ago."""
+    monkeypatch.setenv("AMOSKYS_PARTITION_HOURS", "24")
+    now = [NOW_NS - 6 * DAY_NS]
+    monkeypatch.setattr(
+        TelemetryStore, "_partition_clock", staticmethod(lambda: now[0])
+    )
+    return now
+
+
+@pytest.fixture
+def store(tmp_path, clock):
+    s = TelemetryStore(str(tmp_path / "telemetry.db"))
+    yield s
+    s.close()
+
+
+def _event(ts, **kw):
+    event = {
+        "timestamp_ns": ts,
+        "device_id": "d1",
+        "event_category": "exec",
+        "description": "curl to evil.example",
+        "risk_score": 0.6,
+    }
+    event.update(kw)
+    return event
+
+
+def _counts(store, source="security_events"):
+    return {
+        part: store.db.execute(f"SELECT COUNT(*) FROM {part}").fetchone()[0]
+        for part in partition_names(store.db, source)
+    }
+
+
+def _ids(store, table="security_events"):
+    return [r[0] for r in store.db.execute(f"SELECT id FROM {table} ORDER BY id")]
+
+
+def _search_ids(store, query, table="security_events"):
+    result = store.search_events(query, table=table, hours=24 * 30, limit=10_000)
+    return sorted(r["id"] for r in result["results"])
+
+
+def _plan(db, sql, params=()):
+    rows = db.execute(f"EXPLAIN QUERY PLAN {sql}", params).fetchall()
+    return " | ".join(r[-1] for r in rows)
+
+
+class TestConversion:
+    def test_existing_store_carries_over(self, tmp_path, monkeypatch):
+        path = str(tmp_path / "telemetry.db")
+        monkeypatch.delenv("AMOSKYS_PARTITION_HOURS", raising=False)
+        plain = TelemetryStore(path)
+        _insert_random(plain, random.Random(25), 300)
+        plain.insert_security_event(_event(NOW_NS, mitre_techniques=["T1059"]))
+        before = {
+            t: [tuple(r) for r in plain.db.execute(f"SELECT * FROM {t} ORDER BY id")]
+            for t in PARTITIONED_SOURCES
+        }
+        found = _search_ids(plain, "evil")
+        plain.close()
+
+        monkeypatch.setenv("AMOSKYS_PARTITION_HOURS", "24")
+        store = TelemetryStore(path)
+        try:
+            for table in PARTITIONED_SOURCES:
+                kind = store.db.execute(
+                    "SELECT type FROM sqlite_master WHERE name = ?", (table,)
+                ).fetchone()[0]
+                assert kind == "view"
+                assert len(partition_names(store.db, table)) == 1
+                rows = store.db.execute(f"SELECT * FROM {table} ORDER BY id")
+                assert [tuple(r) for r in rows] == before[table]
+            assert store._search_indexed >= set(PARTITIONED_SOURCES)
+            assert _search_ids(store, "evil") == found
+            _assert_cube_exact(store)
+
+            top = max(r[0] for r in before["security_events"])
+            assert store.insert_security_event(_event(NOW_NS)) == top + 1
+        finally:
+            store.close()
+
+        # The catalog, not the environment, keeps routing on
+        monkeypatch.delenv("AMOSKYS_PARTITION_HOURS")
+        store = TelemetryStore(path)
+        try:
+            assert set(store._live_partitions) == set(PARTITIONED_SOURCES)
+            assert store.insert_security_event(_event(NOW_NS)) == top + 2
+        finally:
+            store.close()
+
+
+class TestRouting:
+    def test_rollover_keeps_ids_global(self, store, clock):
+        first = store.insert_security_event(_event(clock[0], mitre_techniques=["T1"]))
+        clock[0] += DAY_NS
+        second = store.insert_security_event(_event(clock[0]))
+        assert len(partition_names(store.db, "security_events")) == 2
+
+        store.begin_batch(staged=True)
+        for _ in range(3):
+            store.insert_security_event(_event(clock[0], mitre_techniques=["T2"]))
+        clock[0] += DAY_NS  # rolls over at flush time
+        store.end_batch()
+
+        other = sqlite3.connect(store.db_path)
+        other.execute(
+            "INSERT INTO security_events (timestamp_ns, timestamp_dt, device_id) "
+            "VALUES (?, '', 'd2')",
+            (clock[0],),
+        )
+        other.commit()
+        other.close()
+
+        assert (first, second) == (1, 2)
+        assert _ids(store) == [1, 2, 3, 4, 5, 6]
+        assert list(_counts(store).values()) == [1, 1, 4]
+        assert max_rowid(store.db, "security_events") == 6
+        assert [r["_rowid"] for r in tail_rows(store.db, "security_events", 2)] == [
+            3,
+            4,
+            5,
+            6,
+        ]
+        techniques = store.db.execute(
+            "SELECT event_rowid, technique FROM event_techniques ORDER BY 1"
+        )
+        assert [tuple(r) for r in techniques] == [
+            (1, "T1"),
+            (3, "T2"),
+            (4, "T2"),
+            (5, "T2"),
+        ]
+        _assert_cube_exact(store)
+
+    def test_writer_routing_to_sealed_partition_follows(self, store, clock):
+        store.insert_security_event(_event(clock[0]))
+        other = TelemetryStore(store.db_path)
+        try:
+            clock[0] += DAY_NS
+            assert other.insert_security_event(_event(clock[0])) == 2
+            # ``store`` has not noticed the rollover yet
+            store._partition_roll_ns = clock[0] + DAY_NS
+            assert store.insert_security_event(_event(clock[0])) == 3
+            assert list(_counts(store).values()) == [1, 2]
+        finally:
+            other.close()
+
+    def test_update_and_delete_through_view(self, store, clock):
+        for _ in range(3):
+            store.insert_security_event(_event(clock[0]))
+            clock[0] += DAY_NS
+        store.db.execute(
+            "UPDATE security_events SET description = 'beacon', risk_score = 0.9, "
+            "device_id = 'd2' WHERE id IN (1, 3)"
+        )
+        store.db.execute("DELETE FROM security_events WHERE id = 2")
+        store.db.commit()
+
+        rows = store.db.execute(
+            "SELECT id, device_id, description FROM security_events ORDER BY id"
+        )
+        assert [tuple(r) for r in rows] == [(1, "d2", "beacon"), (3, "d2", "beacon")]
+        assert list(_counts(store).values()) == [1, 0, 1]
+        assert _search_ids(store, "beacon") == [1, 3]
+        assert _search_ids(store, "evil") == []
+        _assert_cube_exact(store)
+
+    def test_time_range_reads_probe_each_partition(self, store, clock):
+        for _ in range(3):
+            store.insert_security_event(_event(clock[0]))
+            clock[0] += DAY_NS
+        plan = _plan(
+            store.db,
+            "SELECT * FROM security_events WHERE timestamp_ns > ? "
+            "ORDER BY timestamp_ns DESC LIMIT 10",
+            (clock[0] - DAY_NS,),
+        )
+        assert plan.count("SEARCH security_events_p") == 3
+        assert "SCAN security_events_p" not in plan
+        by_id = _plan(store.db, "SELECT * FROM security_events WHERE id = 2")
+        assert "SCAN" not in by_id
+        recent = store.db.execute(
+            "SELECT id FROM security_events WHERE timestamp_ns > ?",
+            (clock[0] - DAY_NS - 1,),
+        )
+        assert [r[0] for r in recent] == [3]
+
+
+class TestRetention:
+    def test_expired_partitions_dropped(self, store, clock):
+        for day in range(6):
+            midday = clock[0] + DAY_NS // 2
+            for i in range(4):
+                store.insert_security_event(
+                    _event(midday + i, mitre_techniques=["T1059"])
+                )
+                store.insert_flow_event(
+                    {
+                        "timestamp_ns": midday + i,
+                        "device_id": "d1",
+                        "src_ip": "10.0.0.1",
+                        "dst_ip": "198.51.100.7",
+                        "src_port": i,
+                        "dst_port": 443,
+                        "protocol": "tcp",
+                    }
+                )
+            if day == 4:  # a late row lands in a recent partition
+                store.insert_security_event(_event(NOW_NS - 10 * DAY_NS))
+            clock[0] += DAY_NS
+        clock[0] = NOW_NS
+        parts = partition_names(store.db, "security_events")
+        assert len(parts) == 6
+
+        deleted = store.cleanup_old_data(max_age_days=3)
+        assert deleted["security_events"] == 13
+        assert deleted["flow_events"] == 12
+        assert deleted["event_techniques"] == 12
+        remaining = partition_names(store.db, "security_events")
+        assert remaining == parts[3:]
+        assert store.db.execute("SELECT COUNT(*) FROM security_events").fetchone()[
+            0
+        ] == (4 * 3)
+        names = {r[0] for r in store.db.execute("SELECT name FROM sqlite_master")}
+        assert not any(p in n for p in parts[:3] for n in names)
+        assert not store.db.execute(
+            "SELECT 1 FROM sqlite_sequence WHERE name IN (?, ?, ?)", parts[:3]
+        ).fetchone()
+        assert len(_search_ids(store, "evil")) == 12
+        _assert_cube_exact(store)
+
+        # The live partition is never dropped
+        deleted = store.cleanup_old_data(max_age_days=0)
+        assert partition_names(store.db, "security_events") == parts[-1:]
+        assert store.insert_security_event(_event(NOW_NS)) == 26
+        _assert_cube_exact(store)
+
+    def test_future_row_does_not_pin_partition(self, store, clock):
+        store.insert_security_event(_event(clock[0]))
+        store.insert_security_event(_event(clock[0] + 1))
+        store.insert_security_event(_event(NOW_NS + 30 * DAY_NS))  # skewed clock
+        clock[0] += DAY_NS
+        store.insert_security_event(_event(clock[0]))
+        clock[0] = NOW_NS
+        parts = partition_names(store.db, "security_events")
+
+        deleted = store.cleanup_old_data(max_age_days=3)
+        assert deleted["security_events"] == 3
+        assert _counts(store) == {parts[0]: 1, parts[1]: 0}
+        _assert_cube_exact(store)
+
+        # Once the outlier expires too, the next sweep drops the partition
+        store.db.execute(
+            f"UPDATE {parts[0]} SET timestamp_ns = ?", (NOW_NS - 5 * DAY_NS,)
+        )
+        store.db.commit()
+        deleted = store.cleanup_old_data(max_age_days=3)
+        assert deleted["security_events"] == 1
+        assert partition_names(store.db, "security_events") == parts[-1:]
+        _assert_cube_exact(store)
+
+    def test_converted_history_expires(self, tmp_path, monkeypatch):
+        path = str(tmp_path / "telemetry.db")
+        monkeypatch.delenv("AMOSKYS_PARTITION_HOURS", raising=False)
+        plain = TelemetryStore(path)
+        for day in range(10):
+            plain.insert_security_event(_event(NOW_NS - day * DAY_NS))
+        plain.close()
+
+        monkeypatch.setenv("AMOSKYS_PARTITION_HOURS", "24")
+        store = TelemetryStore(path)
+        try:
+            assert len(partition_names(store.db, "security_events")) == 1
+            deleted = store.cleanup_old_data(max_age_days=3)
+            assert deleted["security_events"] == 7
+            assert (
+                store.db.execute("SELECT COUNT(*) FROM security_events").fetchone()[0]
+                == 3
+            )
+            _assert_cube_exact(store)
+        finally:
+            store.close()
+
+    def test_drop_does_not_read_rows(self, store, clock):
+        for day in range(6):
+            midday = clock[0] + DAY_NS // 2
+            for i in range(20):
+                store.insert_security_event(_event(midday + i, device_id=f"d{i}"))
+            clock[0] += DAY_NS
+        clock[0] = NOW_NS
+        store.db.execute(
+            "UPDATE security_events SET risk_score = 0.9 WHERE device_id = 'd3'"
+        )
+        store.db.commit()
+        doomed = set(partition_names(store.db, "security_events")[:3])
+
+        read = set()
+
+        def authorizer(action, table, column, db, trigger):
+            if action == sqlite3.SQLITE_READ and table in doomed:
+                read.add(column)
+            return sqlite3.SQLITE_OK
+
+        store.db.set_authorizer(authorizer)
+        try:
+            deleted = store.cleanup_old_data(max_age_days=3)
+        finally:
+            store.db.set_authorizer(None)
+        assert deleted["security_events"] == 60
+        assert read <= {"", "id", "timestamp_ns"}  # no row contents
+        assert not store.db.execute(
+            "SELECT 1 FROM rollup_partitions WHERE part IN (?, ?, ?)", sorted(doomed)
+        ).fetchone()
+        _assert_cube_exact(store)
+
+
+class TestSchemaChanges:
+    def test_ddl_reaches_every_partition(self, store, clock):
+        for _ in range(2):
+            store.insert_security_event(_event(clock[0]))
+            clock[0] += DAY_NS
+        store._ensure_column("security_events", "sandbox_verdict", "TEXT")
+        execute_ddl(
+            store.db,
+            "CREATE INDEX IF NOT EXISTS idx_security_verdict "
+            "ON security_events(sandbox_verdict)",
+        )
+        conn = sqlite3.connect(store.db_path)
+        assert apply_migration(
+            conn,
+            900,
+            "test fan-out",
+            "ALTER TABLE flow_events ADD COLUMN ja3 TEXT;\n"
+            "CREATE INDEX IF NOT EXISTS idx_flow_ja3 ON flow_events (ja3)",
+        )
+        conn.close()
+
+        store.insert_security_event(_event(clock[0]))  # opens a third partition
+        for source, column, index in (
+            ("security_events", "sandbox_verdict", "idx_security_verdict"),
+            ("flow_events", "ja3", "idx_flow_ja3"),
+        ):
+            parts = partition_names(store.db, source)
+            assert len(parts) == 3
+            for part in parts:
+                cols = {r[1] for r in store.db.execute(f"PRAGMA table_info({part})")}
+                assert column in cols
+                indexes = store.db.execute(
+                    "SELECT COUNT(*) FROM sqlite_master WHERE type = 'index' "
+                    "AND tbl_name = ? AND name LIKE ?",
+                    (part, f"{index}%"),
+                ).fetchone()[0]
+                assert indexes == 1
+            assert column in {
+                r[1] for r in store.db.execute(f"PRAGMA table_info({source})")
+            }
+        store.db.execute("UPDATE security_events SET sandbox_verdict = 'clean'")
+        verdicts = store.db.execute("SELECT sandbox_verdict FROM security_events")
+        assert [r[0] for r in verdicts] == ["clean"] * 3
+
+        # Startup replays SCHEMA (CREATE INDEX on the views) without error
+        store.close()
+        TelemetryStore(store.db_path).close()
+
+
+class TestDropCost:
+    """Retention cost: dropping a day of rows vs deleting them one by one."""
+
+    def _build(self, path, partitioned, clock):
+        clock[0] = NOW_NS - 29 * DAY_NS
+        store = TelemetryStore(str(path))
+        rng = random.Random(30)
+        for day in range(30):
+            start = NOW_NS - (29 - day) * DAY_NS
+            table = "security_events"
+            if partitioned:
+                clock[0] = start
+                store._roll_partitions()
+                table = store._live_partitions["security_events"]
+            store.db.executemany(
+                f"INSERT INTO {table} (timestamp_ns, timestamp_dt, device_id, "
+                "event_category, description, risk_score) VALUES (?, '', ?, ?, ?, ?)",
+                # Collectors flush a device's events in bursts
+                (
+                    (
+                        start - (i // 50) * (DAY_NS // BENCH_ROWS * 50),
+                        f"d{i // 50 % 5}",
+                        rng.choice(("exec", "auth", "net")),
+                        f"process {rng.getrandbits(32):08x} spawned",
+                        rng.random(),
+                    )
+                    for i in range(BENCH_ROWS)
+                ),
+            )
+            with store._lock:
+                store._advance_rollups()
+                store.db.commit()
+        store.db.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        return store
+
+    def _cleanup(self, store):
+        """(seconds, WAL bytes written, worst insert stall of another writer)."""
+        stalls = []
+        stop = threading.Event()
+
+        def ingest():
+            conn = sqlite3.connect(store.db_path, timeout=60)
+            while not stop.is_set():
+                start = time.perf_counter()
+                conn.execute(
+                    "INSERT INTO security_events (timestamp_ns, timestamp_dt, "
+                    "device_id) VALUES (?, '', 'd9')",
+                    (time.time_ns(),),
+                )
+                conn.commit()
+                stalls.append(time.perf_counter() - start)
+                time.sleep(0.005)
+            conn.close()
+
+        writer = threading.Thread(target=ingest)
+        writer.start()
+        time.sleep(0.2)
+        start = time.perf_counter()
+        with store._lock:
+            deleted = store.cleanup_old_data(max_age_days=3)
+            store.db.commit()
+        elapsed = time.perf_counter() - start
+        time.sleep(0.2)
+        stop.set()
+        writer.join()
+        assert deleted["security_events"] >= 26 * BENCH_ROWS
+        wal = Path(f"{store.db_path}-wal")
+        return elapsed, wal.stat().st_size if wal.exists() else 0, max(stalls)
+
+    def test_partition_drop_beats_delete(self, tmp_path, clock, monkeypatch):
+        partitioned = self._build(tmp_path / "partitioned.db", True, clock)
+        monkeypatch.delenv("AMOSKYS_PARTITION_HOURS")
+        plain = self._build(tmp_path / "plain.db", False, clock)
+        try:
+            drop = self._cleanup(partitioned)
+            delete = self._cleanup(plain)
+            _assert_cube_exact(partitioned)
+        finally:
+            partitioned.close()
+            plain.close()
+        print(
+            f"\nRetention of 27 of 30 days x {BENCH_ROWS} rows: "
+            f"DELETE {delete[0] * 1000:.0f}ms, WAL {delete[1] / 1e6:.1f}MB, "
+            f"ingest stall {delete[2] * 1000:.0f}ms | "
+            f"partition drop {drop[0] * 1000:.0f}ms, WAL {drop[1] / 1e6:.1f}MB, "
+            f"ingest stall {drop[2] * 1000:.0f}ms"
+        )
+        # DELETE grows with the rows removed, the drop with the partitions
+        assert drop[0] < delete[0]
+        assert drop[1] * 3 < delete[1]
+        assert drop[2] < delete[2]
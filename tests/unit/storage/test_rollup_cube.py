@@ -0,0 +1,347 @@
+"""Tests for the rollup cube (rollup_minute / rollup_hour / rollup_day).
+
+Covers:
+  - Cube counts equal GROUP BY COUNT(*) over the raw tables at every level
+    after random inserts (immediate and staged), snapshot timestamp
+    refreshes, rows written by another connection and retention deletes
+  - Dashboard counts and clustering equal the same numbers computed raw
+  - Advancing the cube costs the same however large the tables already are
+
+Environment variables:
+    ROLLUP_BENCH_ROWS: Rows already on disk for the large advance benchmark
+        (default: 100000)
+"""
+
+import os
+import random
+import sqlite3
+import time
+from datetime import datetime, timezone
+
+import pytest
+
+from amoskys.storage._ts_rollups import _ROLLUP_LEVELS, ROLLUP_SOURCES
+from amoskys.storage.telemetry_store import TelemetryStore
+
+BENCH_ROWS = int(os.environ.get("ROLLUP_BENCH_ROWS", "100000"))
+
+NS = 10**9
+NOW_NS = int(time.time() * 1e9)
+DAY_NS = 86400 * NS
+
+DEVICES = ("d1", "d2", "d3")
+AGENTS = ("agent_a", "agent_b", None)
+RISKS = (None, 0.0, 0.1, 0.25, 0.3, 0.49, 0.5, 0.75, 0.79, 0.8, 1.0)
+
+
+@pytest.fixture
+def store(tmp_path):
+    s = TelemetryStore(str(tmp_path / "telemetry.db"))
+    yield s
+    s.close()
+
+
+def _ts(rng):
+    """A timestamp in the last 5 days, clear of the 24h dashboard edge."""
+    while True:
+        ts = NOW_NS - rng.randrange(5 * DAY_NS)
+        if abs(ts - (NOW_NS - DAY_NS)) > 300 * NS:
+            return ts
+
+
+def _common(rng):
+    ts = _ts(rng)
+    return {
+        "timestamp_ns": ts,
+        "timestamp_dt": datetime.fromtimestamp(ts / 1e9, tz=timezone.utc).isoformat(),
+        "device_id": rng.choice(DEVICES),
+        "collection_agent": rng.choice(AGENTS),
+        "event_type": rng.choice(("created", "modified", "seen")),
+        "risk_score": rng.choice(RISKS),
+    }
+
+
+def _insert_random(store, rng, n):
+    for i in range(n):
+        kind = rng.randrange(9)
+        e = _common(rng)
+        if kind == 0:
+            e.update(event_category=rng.choice(("exec", "auth", None)))
+            store.insert_security_event(e)
+        elif kind == 1:
+            e.update(mechanism="launchd", entry_id=f"e{i}", content_hash=f"h{i}")
+            e.update(change_type="created")
+            store.insert_persistence_event(e)
+        elif kind == 2:
+            e.update(pid=i, process_category=rng.choice(("system", "user")))
+            e.update(anomaly_score=rng.choice(RISKS))
+            store.insert_process_event(e)
+        elif kind == 3:
+            e.update(path=f"/etc/f{i}", change_type="modified")
+            store.insert_fim_event(e)
+        elif kind == 4:
+            e.update(dst_ip="198.51.100.7", protocol=rng.choice(("tcp", "udp")))
+            e.update(threat_score=rng.choice(RISKS))
+            store.insert_flow_event(e)
+        elif kind == 5:
+            store.insert_dns_event(dict(e, domain="example.com"))
+        elif kind == 6:
+            store.insert_audit_event(dict(e, syscall="execve"))
+        elif kind == 7:
+            store.insert_peripheral_event(dict(e, peripheral_device_id="usb"))
+        else:
+            e.update(domain=rng.choice(("http", "dns")), attributes={})
+            store.insert_observation_event(e)
+
+
+def _raw_buckets(db, width):
+    """{(bucket, source, device, category, agent, risk): count} from raw rows."""
+    out = {}
+    for source, (category, risk) in ROLLUP_SOURCES.items():
+        rows = db.execute(
+            f"SELECT timestamp_ns / {60 * NS * width}, COALESCE(device_id, ''), "
+            f"COALESCE({category}, ''), COALESCE(collection_agent, ''), {risk} "
+            f"FROM {source}"
+        )
+        for bucket, device, cat, agent, score in rows:
+            key = (bucket, source, device, cat, agent, _band(score))
+            out[key] = out.get(key, 0) + 1
+    return out
+
+
+def _band(score):
+    """The stored risk band (floor, in %) of a score."""
+    if score is None:
+        return -1
+    if score <= 0:
+        return 0
+    for edge, band in ((0.25, 1), (0.3, 25), (0.5, 30), (0.75, 50), (0.8, 75)):
+        if score < edge:
+            return band
+    return 80
+
+
+def _cube(db, table, column):
+    rows = db.execute(
+        f"SELECT {column}, source, device_id, category, agent, severity, count "
+        f"FROM {table} WHERE count != 0"
+    )
+    return {tuple(r[:-1]): r[-1] for r in rows}
+
+
+def _assert_cube_exact(store):
+    store.db.commit()
+    with store._lock:
+        store._advance_rollups()
+    for table, column, width in _ROLLUP_LEVELS:
+        assert _cube(store.db, table, column) == _raw_buckets(store.db, width), table
+
+
+def _raw_window(db, since_ns):
+    """(source, device, category, agent, risk, hour_of_day) rows since a time."""
+    since_ns -= since_ns % (60 * NS)
+    rows = []
+    for source, (category, risk) in ROLLUP_SOURCES.items():
+        rows += [
+            (source, *r)
+            for r in db.execute(
+                f"SELECT device_id, {category}, collection_agent, {risk}, "
+                f"timestamp_ns FROM {source} WHERE timestamp_ns >= ?",
+                (since_ns,),
+            )
+        ]
+    return rows
+
+
+class TestCubeMatchesRawCounts:
+    def test_random_inserts_updates_and_retention(self, store):
+        rng = random.Random(23)
+        _insert_random(store, rng, 400)
+
+        store.begin_batch(staged=True)
+        _insert_random(store, rng, 200)
+        store.end_batch()
+        _assert_cube_exact(store)
+
+        # Snapshot re-scans refresh timestamps of already counted rows
+        for i in range(20):
+            e = dict(
+                _common(rng),
+                mechanism="cron",
+                entry_id=f"s{i}",
+                content_hash="same",
+                change_type="snapshot",
+            )
+            store.insert_persistence_event(e)
+            e["timestamp_ns"] = _ts(rng)
+            store.insert_persistence_event(e)
+        store.db.execute(
+            "UPDATE security_events SET risk_score = 0.95, device_id = 'd9' "
+            "WHERE id % 3 = 0"
+        )
+        _assert_cube_exact(store)
+
+        deleted = store.cleanup_old_data(max_age_days=3)
+        assert deleted["security_events"] > 0
+        _assert_cube_exact(store)
+        assert (
+            store.db.execute(
+                "SELECT COUNT(*) FROM rollup_minute WHERE count <= 0"
+            ).fetchone()[0]
+            == 0
+        )
+
+    def test_rows_from_another_connection(self, store):
+        """Rows committed elsewhere are counted before and after folding."""
+        store.insert_security_event(dict(_common(random.Random(1)), risk_score=0.9))
+        other = sqlite3.connect(store.db_path)
+        for _ in range(5):
+            other.execute(
+                "INSERT INTO security_events (timestamp_ns, timestamp_dt, "
+                "device_id, event_category, risk_score) VALUES (?, '', 'd1', "
+                "'exec', 0.9)",
+                (NOW_NS,),
+            )
+        other.commit()
+        other.close()
+
+        store._cache.invalidate()
+        assert store.get_unified_event_counts(hours=24)["by_source"]["security"] >= 5
+        before = [
+            tuple(r)
+            for r in store._rollup_counts(store.db, NOW_NS - DAY_NS, ("source",))
+        ]
+        with store._lock:
+            assert store._advance_rollups() == 5
+            store.db.commit()
+        after = [
+            tuple(r)
+            for r in store._rollup_counts(store.db, NOW_NS - DAY_NS, ("source",))
+        ]
+        assert before == after
+        # Once counted, deleting them takes them back out
+        store.db.execute("DELETE FROM security_events WHERE id > 1")
+        _assert_cube_exact(store)
+
+
+class TestDashboards:
+    @pytest.fixture
+    def populated(self, store):
+        rng = random.Random(7)
+        _insert_random(store, rng, 500)
+        store.db.commit()
+        store._cache.invalidate()
+        return store
+
+    def test_unified_event_counts(self, populated):
+        result = populated.get_unified_event_counts(hours=24)
+        rows = _raw_window(populated.db, NOW_NS - DAY_NS)
+        by_source = {s.replace("_events", ""): 0 for s in ROLLUP_SOURCES}
+        by_category = {}
+        for source, _, category, *_ in rows:
+            by_source[source.replace("_events", "")] += 1
+            if category and source != "observation_events":
+                by_category[category] = by_category.get(category, 0) + 1
+        assert result == {
+            "total": len(rows),
+            "by_source": by_source,
+            "by_category": by_category,
+        }
+
+    @pytest.mark.parametrize("devices", [None, ("d1", "d3"), ()])
+    def test_unified_event_clustering(self, populated, devices):
+        result = populated.get_unified_event_clustering(hours=24, device_ids=devices)
+        scored = list(ROLLUP_SOURCES)[:6]
+        with_agent = scored[:4] + ["dns_events", "audit_events"]
+        severity = {"low": 0, "medium": 0, "high": 0, "critical": 0}
+        by_agent, by_hour, by_source = {}, {}, {}
+        for source, device, _, agent, risk, ts in _raw_window(
+            populated.db, NOW_NS - DAY_NS
+        ):
+            if devices is not None and device not in devices:
+                continue
+            label = source.replace("_events", "")
+            by_source[label] = by_source.get(label, 0) + 1
+            if agent and source in with_agent:
+                by_agent[agent] = by_agent.get(agent, 0) + 1
+            if source not in scored:
+                continue
+            hour = datetime.fromtimestamp(ts / 1e9, tz=timezone.utc).strftime("%H")
+            by_hour[hour] = by_hour.get(hour, 0) + 1
+            if risk is not None:
+                level = (
+                    "critical"
+                    if risk >= 0.75
+                    else "high" if risk >= 0.5 else "medium" if risk >= 0.25 else "low"
+                )
+                severity[level] += 1
+
+        assert result["by_severity"] == severity
+        assert result["by_agent"] == by_agent
+        assert result["by_hour"] == dict(sorted(by_hour.items()))
+        assert {k: v for k, v in result["by_source"].items() if v} == by_source
+
+    def test_hourly_dashboard_rollups(self, populated):
+        populated._write_hourly_rollups()
+        backfilled = populated.backfill_rollups(hours=24)
+        assert backfilled > 0
+        hour_ns = 3600 * NS
+        bucket = datetime.fromtimestamp(
+            (NOW_NS - NOW_NS % hour_ns - hour_ns) / 1e9, tz=timezone.utc
+        ).strftime("%Y-%m-%dT%H")
+        stored = dict(
+            populated.db.execute(
+                "SELECT bucket_key, value FROM dashboard_rollups "
+                "WHERE rollup_type = 'events_by_domain' AND bucket_hour LIKE ?",
+                (bucket + "%",),
+            ).fetchall()
+        )
+        for source in ROLLUP_SOURCES:
+            expected = populated.db.execute(
+                f"SELECT COUNT(*) FROM {source} WHERE timestamp_ns >= ? "
+                "AND timestamp_ns < ?",
+                (NOW_NS - NOW_NS % hour_ns - hour_ns, NOW_NS - NOW_NS % hour_ns),
+            ).fetchone()[0]
+            assert stored.get(source.replace("_events", ""), 0) == expected
+
+
+class TestAdvanceCost:
+    """Folding new rows costs O(new rows), not O(table)."""
+
+    def _time_advance(self, tmp_path, preload):
+        s = TelemetryStore(str(tmp_path / f"bench_{preload}.db"))
+        try:
+            s.db.executemany(
+                "INSERT INTO security_events (timestamp_ns, timestamp_dt, "
+                "device_id, event_category, risk_score) VALUES (?, '', ?, 'x', 0.5)",
+                ((NOW_NS - i * NS, f"d{i % 50}") for i in range(preload)),
+            )
+            with s._lock:
+                s._advance_rollups()
+                s.db.commit()
+            timings = []
+            for _ in range(5):
+                s.db.executemany(
+                    "INSERT INTO security_events (timestamp_ns, timestamp_dt, "
+                    "device_id, event_category, risk_score) VALUES (?, '', 'd1', "
+                    "'x', 0.5)",
+                    ((NOW_NS,) for _ in range(200)),
+                )
+                start = time.perf_counter()
+                with s._lock:
+                    assert s._advance_rollups() == 200
+                timings.append(time.perf_counter() - start)
+                s.db.commit()
+            return min(timings)
+        finally:
+            s.close()
+
+    def test_advance_independent_of_table_size(self, tmp_path):
+        small = self._time_advance(tmp_path, BENCH_ROWS // 20)
+        large = self._time_advance(tmp_path, BENCH_ROWS)
+        print(
+            f"\nRollup advance of 200 rows: {BENCH_ROWS // 20} on disk "
+            f"{small * 1000:.2f}ms, {BENCH_ROWS} on disk {large * 1000:.2f}ms"
+        )
+        # 20x the table: a full rescan would be ~20x slower
+        assert large / small < 4
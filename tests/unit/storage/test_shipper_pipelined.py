@@ -0,0 +1,137 @@
+"""Tests for the pipelined columnar mode of amoskys.shipper.
+
+Covers:
+    - encode_columnar_batch: gzip'd columnar layout, device_id column dropped
+    - _AckWindow: cursor only advances over a contiguous acked prefix
+    - _ship_pipelined: drains a multi-table backlog in one cycle, keeps the
+      cursor behind a failed batch, falls back to json on 415
+"""
+
+import gzip
+import json
+import sqlite3
+
+import pytest
+
+from amoskys.shipper import (
+    COLUMNAR_CONTENT_TYPE,
+    ShipperConfig,
+    TelemetryShipper,
+    _AckWindow,
+    encode_columnar_batch,
+)
+
+
+def _make_db(path, security=0, dns=0):
+    db = sqlite3.connect(path)
+    db.execute(
+        "CREATE TABLE security_events (id INTEGER PRIMARY KEY, timestamp_ns INTEGER,"
+        " device_id TEXT, event_category TEXT, risk_score REAL)"
+    )
+    db.execute(
+        "CREATE TABLE dns_events (id INTEGER PRIMARY KEY, timestamp_ns INTEGER,"
+        " device_id TEXT, domain TEXT)"
+    )
+    db.executemany(
+        "INSERT INTO security_events (timestamp_ns, device_id, event_category,"
+        " risk_score) VALUES (?, 'local', 'test', 0.5)",
+        [(i,) for i in range(security)],
+    )
+    db.executemany(
+        "INSERT INTO dns_events (timestamp_ns, device_id, domain) VALUES (?, 'local', ?)",
+        [(i, f"host{i}.example") for i in range(dns)],
+    )
+    db.commit()
+    db.close()
+
+
+@pytest.fixture
+def shipper(tmp_path):
+    config = ShipperConfig(
+        server_url="http://cc.invalid",
+        device_id="dev-1",
+        telemetry_db=str(tmp_path / "telemetry.db"),
+        cursor_db=str(tmp_path / "cursor.db"),
+        enabled=True,
+        max_in_flight=3,
+    )
+    s = TelemetryShipper(config)
+    yield s
+    s.stop()
+
+
+def _decode(body):
+    return json.loads(gzip.decompress(body))
+
+
+class TestColumnarCodec:
+
+    def test_round_trip(self):
+        body = encode_columnar_batch(
+            "dev-1", {"dns_events": (["id", "domain"], [(1, "a"), (2, "b")])}
+        )
+        payload = _decode(body)
+        assert payload["v"] == 1
+        assert payload["device_id"] == "dev-1"
+        assert payload["tables"]["dns_events"] == {
+            "count": 2,
+            "columns": {"id": [1, 2], "domain": ["a", "b"]},
+        }
+
+    def test_ack_window_waits_for_prefix(self):
+        window = _AckWindow()
+        first, second, third = window.push(10), window.push(20), window.push(30)
+        assert window.ack(second) is None
+        assert window.ack(first) == 20
+        assert window.ack(third) == 30
+
+
+class TestPipelinedShipping:
+
+    def test_drains_backlog_in_one_cycle(self, shipper, tmp_path):
+        _make_db(shipper.config.telemetry_db, security=1200, dns=700)
+        received = {"security_events": [], "dns_events": []}
+
+        def post(body):
+            for table, cols in _decode(body)["tables"].items():
+                assert "device_id" not in cols["columns"]
+                received[table].extend(cols["columns"]["id"])
+            return 200, 0.01, ""
+
+        shipper._post_columnar = post
+        db = sqlite3.connect(shipper.config.telemetry_db)
+        shipper._ship_pipelined(db)
+        db.close()
+
+        assert sorted(received["security_events"]) == list(range(1, 1201))
+        assert sorted(received["dns_events"]) == list(range(1, 701))
+        assert shipper.cursors.get("security_events") == 1200
+        assert shipper.cursors.get("dns_events") == 700
+        assert shipper.stats["shipped"] == 1900
+
+    def test_failed_batch_holds_cursor(self, shipper):
+        _make_db(shipper.config.telemetry_db, security=1000)
+        calls = []
+
+        def post(body):
+            calls.append(body)
+            return (500, 0.01, "boom") if len(calls) == 2 else (200, 0.01, "")
+
+        shipper._post_columnar = post
+        db = sqlite3.connect(shipper.config.telemetry_db)
+        shipper._ship_pipelined(db)
+        db.close()
+
+        first_ids = _decode(calls[0])["tables"]["security_events"]["columns"]["id"]
+        assert shipper.cursors.get("security_events") == max(first_ids)
+        assert shipper.stats["failed"] > 0
+
+    def test_rejected_format_falls_back_to_json(self, shipper):
+        _make_db(shipper.config.telemetry_db, dns=5)
+        shipper._post_columnar = lambda body: (415, 0.01, COLUMNAR_CONTENT_TYPE)
+        db = sqlite3.connect(shipper.config.telemetry_db)
+        shipper._ship_pipelined(db)
+        db.close()
+
+        assert shipper._mode == "json"
+        assert shipper.cursors.get("dns_events") == 0
@@ -0,0 +1,162 @@
+"""
+Tests for the TelemetryStore change feed (src/amoskys/storage/_ts_changefeed.py).
+
+Covers:
+- watermarks() / max_rowid on empty, populated and missing tables
+- tail() ordering, paging, until_rowid bound and where-filter
+- A read error partway through a tail is raised, a missing table is empty
+- Tailing stays correct when retention deletes old rows between polls
+- wait_for_changes() wakes on commit and times out without one
+- Table-name validation
+"""
+
+import sqlite3
+import threading
+import time
+
+import pytest
+
+from amoskys.storage._ts_changefeed import max_rowid, tail_rows
+from amoskys.storage.telemetry_store import TelemetryStore
+
+
+@pytest.fixture
+def store(tmp_path):
+    s = TelemetryStore(str(tmp_path / "test.db"))
+    yield s
+    try:
+        s.close()
+    except Exception:
+        pass
+
+
+def _insert(store, n, risk=0.5, start=0):
+    base = int(time.time() * 1e9)
+    for i in range(n):
+        store.insert_security_event(
+            {
+                "timestamp_ns": base + start + i,
+                "device_id": "d1",
+                "event_category": f"cat{start + i}",
+                "risk_score": risk,
+            }
+        )
+
+
+class TestWatermarks:
+    def test_empty_table_is_zero(self, store):
+        assert store.watermarks(["security_events"]) == {"security_events": 0}
+
+    def test_missing_table_is_zero(self, store):
+        assert store.watermarks(["no_such_table"]) == {"no_such_table": 0}
+
+    def test_tracks_max_rowid(self, store):
+        _insert(store, 3)
+        assert store.watermarks(["security_events"])["security_events"] == 3
+
+
+class TestTail:
+    def test_yields_new_rows_oldest_first(self, store):
+        _insert(store, 2)
+        wm = store.watermarks(["security_events"])["security_events"]
+        _insert(store, 3, start=2)
+        rows = list(store.tail("security_events", wm))
+        assert [r["event_category"] for r in rows] == ["cat2", "cat3", "cat4"]
+        assert [r["_rowid"] for r in rows] == [3, 4, 5]
+
+    def test_pages_through_large_backlog(self, store):
+        _insert(store, 25)
+        rows = list(store.tail("security_events", 0, limit=7))
+        assert len(rows) == 25
+        assert rows[-1]["_rowid"] == 25
+
+    def test_until_rowid_and_where(self, store):
+        _insert(store, 4, risk=0.2)
+        _insert(store, 2, risk=0.9, start=4)
+        _insert(store, 2, risk=0.9, start=6)
+        rows = list(
+            store.tail(
+                "security_events",
+                0,
+                until_rowid=6,
+                where="risk_score >= ?",
+                params=(0.6,),
+            )
+        )
+        assert [r["_rowid"] for r in rows] == [5, 6]
+
+    def test_retention_delete_does_not_hide_new_rows(self, store):
+        """COUNT(*) deltas miss rows when deletes and inserts coincide."""
+        _insert(store, 5)
+        wm = store.watermarks(["security_events"])["security_events"]
+        store.db.execute("DELETE FROM security_events WHERE rowid <= 3")
+        store.db.commit()
+        _insert(store, 3, start=5)
+        rows = list(store.tail("security_events", wm))
+        assert len(rows) == 3
+
+    def test_read_error_midway_raises(self, store, tmp_path):
+        """A failed page is reported, not passed off as the end of the table."""
+        _insert(store, 10)
+        conn = sqlite3.connect(str(tmp_path / "test.db"))
+
+        def check(rowid):
+            if rowid > 6:
+                raise RuntimeError("interrupted")
+            return 1
+
+        conn.create_function("check_row", 1, check)
+        seen = []
+        try:
+            with pytest.raises(sqlite3.OperationalError):
+                for row in tail_rows(
+                    conn, "security_events", 0, limit=3, where="check_row(rowid)"
+                ):
+                    seen.append(row["_rowid"])
+        finally:
+            conn.close()
+        assert seen == [1, 2, 3, 4, 5, 6]
+
+    def test_missing_table_yields_nothing(self, store):
+        assert list(store.tail("no_such_table", 0)) == []
+
+    def test_rejects_non_identifier_table(self, store):
+        with pytest.raises(ValueError):
+            list(store.tail("security_events; DROP TABLE x", 0))
+
+
+class TestModuleHelpers:
+    def test_helpers_work_on_plain_connection(self, store, tmp_path):
+        _insert(store, 3)
+        conn = sqlite3.connect(str(tmp_path / "test.db"))
+        try:
+            assert max_rowid(conn, "security_events") == 3
+            assert len(list(tail_rows(conn, "security_events", 1))) == 2
+        finally:
+            conn.close()
+
+
+class TestWaitForChanges:
+    def test_times_out_without_commit(self, store):
+        seq = store.change_seq
+        t0 = time.monotonic()
+        assert store.wait_for_changes(seq, timeout=0.05) == seq
+        assert time.monotonic() - t0 >= 0.04
+
+    def test_wakes_on_commit(self, store):
+        seq = store.change_seq
+        timer = threading.Timer(0.05, _insert, args=(store, 1))
+        timer.start()
+        try:
+            new_seq = store.wait_for_changes(seq, timeout=5.0)
+        finally:
+            timer.join()
+        assert new_seq > seq
+
+    def test_batch_commit_notifies_once(self, store):
+        seq = store.change_seq
+        store.begin_batch()
+        _insert(store, 3)
+        assert store.change_seq == seq
+        store.end_batch()
+        assert store.change_seq == seq + 1
@@ -1016,3 +1016,192 @@ class TestFullInsertRetrieve:
             }
         )
         assert row_id is not None
+
+
+# ===========================================================================
+# Staged bulk-write batches (begin_batch(staged=True))
+# ===========================================================================
+
+
+def _staged_workload(store, ts):
+    """Mixed inserts, including snapshot duplicates within one batch."""
+    for i in range(5):
+        store.insert_security_event(
+            {
+                "timestamp_ns": ts + i,
+                "device_id": "d1",
+                "event_category": "auth",
+                "risk_score": 0.5,
+                "mitre_techniques": ["T1110"],
+            }
+        )
+        store.insert_flow_event(
+            {
+                "timestamp_ns": ts + i,
+                "device_id": "d1",
+                "src_ip": "10.0.0.1",
+                "dst_ip": f"1.2.3.{i}",
+                "dst_port": 443,
+                "protocol": "TCP",
+                "state": "ESTABLISHED",
+            }
+        )
+        # Same process every cycle — only the first survives dedup
+        store.insert_process_event(
+            {
+                "timestamp_ns": ts + i,
+                "timestamp_dt": _now_dt(),
+                "device_id": "d1",
+                "pid": 42,
+                "exe": "/usr/bin/sshd",
+                "cmdline": "sshd -D",
+                "username": "root",
+            }
+        )
+        store.insert_fim_event(
+            {
+                "timestamp_ns": ts + i,
+                "device_id": "d1",
+                "path": "/etc/hosts",
+                "change_type": "snapshot",
+                "new_hash": "h1" if i < 3 else "h2",
+            }
+        )
+
+
+def _table_rows(store, table, cols):
+    return store.db.execute(
+        f"SELECT {cols} FROM {table} ORDER BY id"  # noqa: S608
+    ).fetchall()
+
+
+class TestStagedBatch:
+    """Staged batches must leave the store exactly as per-row batches do."""
+
+    @pytest.mark.parametrize(
+        "table,cols",
+        [
+            ("security_events", "timestamp_ns, device_id, mitre_techniques"),
+            ("flow_events", "timestamp_ns, dst_ip, dst_port"),
+            ("process_events", "timestamp_ns, pid, exe"),
+            ("fim_events", "timestamp_ns, path, new_hash"),
+        ],
+    )
+    def test_staged_matches_per_row(self, tmp_path, table, cols):
+        ts = _now_ns()
+        results = []
+        for staged in (False, True):
+            s = TelemetryStore(str(tmp_path / f"staged_{staged}.db"))
+            s.begin_batch(staged=staged)
+            _staged_workload(s, ts)
+            s.end_batch()
+            results.append([tuple(r) for r in _table_rows(s, table, cols)])
+            s.close()
+        assert results[0] == results[1]
+        assert results[0]
+
+    def test_rows_not_written_until_end_batch(self, store):
+        store.begin_batch(staged=True)
+        _staged_workload(store, _now_ns())
+        assert _table_rows(store, "security_events", "id") == []
+        store.end_batch()
+        assert len(_table_rows(store, "security_events", "id")) == 5
+        assert store._staged_writes is None
+
+    def test_dedup_baseline_persisted_after_flush(self, store):
+        ts = _now_ns()
+        store.begin_batch(staged=True)
+        _staged_workload(store, ts)
+        store.end_batch()
+        row = store.db.execute(
+            "SELECT content_hash, updated_ns FROM _snapshot_baseline "
+            "WHERE table_name='fim_events' AND dedup_key='d1|/etc/hosts'"
+        ).fetchone()
+        assert tuple(row) == ("h2", ts + 4)
+
+        # A later batch sees the persisted baseline and suppresses repeats
+        store.begin_batch(staged=True)
+        store.insert_fim_event(
+            {
+                "timestamp_ns": ts + 10,
+                "device_id": "d1",
+                "path": "/etc/hosts",
+                "change_type": "snapshot",
+                "new_hash": "h2",
+            }
+        )
+        store.end_batch()
+        assert len(_table_rows(store, "fim_events", "id")) == 2
+
+    def test_bad_row_replayed_singly(self, store):
+        store.begin_batch(staged=True)
+        store.insert_security_event({"device_id": "d1", "event_category": "ok"})
+        store._write(
+            "security_events",
+            "INSERT INTO security_events (timestamp_ns, no_such_col) VALUES (?, ?)",
+            (1, 2),
+        )
+        store.insert_security_event({"device_id": "d1", "event_category": "ok2"})
+        store.end_batch()
+        cats = [r[0] for r in _table_rows(store, "security_events", "event_category")]
+        assert cats == ["ok", "ok2"]
+
+    def test_abort_batch_discards_staged_rows(self, store):
+        store.begin_batch(staged=True)
+        _staged_workload(store, _now_ns())
+        store.abort_batch()
+        store.db.commit()
+        assert _table_rows(store, "security_events", "id") == []
+        assert store._batch_mode is False
+
+
+# ===========================================================================
+# Org device allowlists (device_ids=)
+# ===========================================================================
+
+
+class TestDeviceAllowlist:
+    """Dashboard aggregates restricted to an org's device_ids."""
+
+    @pytest.fixture
+    def two_devices(self, store):
+        ts = _now_ns()
+        for i, (dev, risk) in enumerate([("d1", 0.9), ("d2", 0.2), ("d2", 0.3)]):
+            store.insert_security_event(
+                {
+                    "timestamp_ns": ts + i,
+                    "device_id": dev,
+                    "event_category": f"cat_{dev}",
+                    "risk_score": risk,
+                    "collection_agent": f"agent_{dev}",
+                }
+            )
+        return store
+
+    def test_threat_events_filtered(self, two_devices):
+        rows = two_devices.get_unified_threat_events(limit=10, device_ids=["d2"])
+        assert {r["device_id"] for r in rows} == {"d2"}
+        assert len(two_devices.get_unified_threat_events(limit=10)) == 3
+
+    def test_empty_allowlist_matches_nothing(self, two_devices):
+        assert two_devices.get_unified_threat_events(limit=10, device_ids=[]) == []
+        assert two_devices.get_threat_score_data(device_ids=[])["event_count"] == 0
+
+    def test_threat_score_filtered(self, two_devices):
+        data = two_devices.get_threat_score_data(hours=1, device_ids=["d2"])
+        assert data["event_count"] == 2
+        assert data["max_risk"] == pytest.approx(0.3)
+
+    def test_clustering_filtered_and_cached_per_allowlist(self, two_devices):
+        scoped = two_devices.get_unified_event_clustering(device_ids=["d1"])
+        full = two_devices.get_unified_event_clustering()
+        assert scoped["by_source"]["security"] == 1
+        assert scoped["by_agent"] == {"agent_d1": 1}
+        assert full["by_source"]["security"] == 3
+
+    def test_posture_filtered(self, two_devices):
+        scoped = two_devices.compute_nerve_posture(hours=1, device_ids=["d2"])
+        full = two_devices.compute_nerve_posture(hours=1)
+        assert scoped["security_detections"] == 2
+        assert full["security_detections"] == 3
+        assert scoped["posture_score"] > full["posture_score"]
@@ -0,0 +1,182 @@
+"""
+Tests for pushed dashboard deltas (web/app/dashboard/live_updates.py).
+
+Covers:
+  - json_diff / apply_patch round trip, pointer escaping, list handling
+  - Datasets recompute only when their source watermarks move or max_age passes
+  - Nothing is computed or emitted without subscribers
+  - Sequence numbers advance per (scope, dataset); timestamp-only changes are not pushed
+  - Scoped datasets are computed per device allowlist, shared ones once
+  - Snapshots for joining clients
+"""
+
+import pytest
+
+from web.app.dashboard.live_updates import (
+    SHARED_SCOPE,
+    Dataset,
+    LiveUpdateEngine,
+    apply_patch,
+    json_diff,
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.mark.parametrize(
+    "old,new",
+    [
+        ({"a": 1, "b": [1, 2]}, {"a": 2, "b": [1, 3], "c": {"d": None}}),
+        ({"a": [1, 2, 3]}, {"a": [1]}),
+        ({"x/y": 1, "t~": 2}, {"x/y": 3}),
+        ({"a": 1}, {"a": "1"}),
+        ([{"k": 1}], [{"k": 1, "j": 2}]),
+        ({"a": 1}, [1]),
+    ],
+)
+def test_diff_round_trip(old, new):
+    assert apply_patch(old, json_diff(old, new)) == new
+
+
+def test_diff_is_minimal():
+    old = {"recent": [{"id": 1}, {"id": 2}], "total": 2, "last_updated": "t0"}
+    new = {"recent": [{"id": 1}, {"id": 3}], "total": 2, "last_updated": "t1"}
+    assert json_diff(old, new) == [
+        {"op": "replace", "path": "/recent/1/id", "value": 3},
+        {"op": "replace", "path": "/last_updated", "value": "t1"},
+    ]
+    assert json_diff(new, new) == []
+
+
+def test_diff_escapes_pointer_tokens():
+    assert json_diff({}, {"a/b~": 1}) == [{"op": "add", "path": "/a~1b~0", "value": 1}]
+
+
+class Harness:
+    """Engine over in-memory values and watermarks."""
+
+    def __init__(self):
+        self.marks = {"events": 1}
+        self.values = {"total": 1}
+        self.calls = []
+        self.clock = FakeClock()
+        datasets = [
+            Dataset("threats", self._compute, tables=("events",), max_age=60),
+            Dataset("metrics", self._metrics, scoped=False, max_age=5),
+        ]
+        self.engine = LiveUpdateEngine(
+            datasets, lambda tables: {t: self.marks[t] for t in tables}, self.clock
+        )
+
+    def _compute(self, device_ids):
+        self.calls.append(("threats", device_ids))
+        value = dict(self.values)
+        value["devices"] = device_ids
+        value["last_updated"] = self.clock.now
+        return value
+
+    def _metrics(self, device_ids):
+        self.calls.append(("metrics", device_ids))
+        return {"cpu": 5}
+
+
+@pytest.fixture
+def h():
+    return Harness()
+
+
+def test_no_subscribers_computes_nothing(h):
+    assert h.engine.tick() == []
+    assert h.calls == []
+
+
+def test_recomputes_only_when_watermark_moves(h):
+    h.engine.set_scope("org-a", ["d1"])
+    h.engine.subscribe("org-a", ["threats"])
+    snap = h.engine.snapshot("org-a", ["threats"])
+    assert snap["threats"]["seq"] == 1
+    assert snap["threats"]["data"]["devices"] == ["d1"]
+
+    h.calls.clear()
+    h.clock.now += 1
+    assert h.engine.tick() == []
+    assert h.calls == []
+
+    # New rows but the same result: recomputed, nothing pushed
+    h.marks["events"] = 2
+    h.clock.now += 1
+    assert h.engine.tick() == []
+    assert len(h.calls) == 1
+
+    h.marks["events"] = 3
+    h.values["total"] = 5
+    h.clock.now += 1
+    [(room, delta)] = h.engine.tick()
+    assert room == "live-org-a-threats"
+    assert (delta["seq"], delta["base_seq"]) == (2, 1)
+    assert {"op": "replace", "path": "/total", "value": 5} in delta["ops"]
+    assert apply_patch(snap["threats"]["data"], delta["ops"]) == h.engine.current(
+        "org-a", "threats"
+    )
+
+
+def test_max_age_refreshes_unchanged_sources(h):
+    h.engine.subscribe(SHARED_SCOPE, ["threats"])
+    h.engine.snapshot(SHARED_SCOPE, ["threats"])
+    h.values["total"] = 9  # e.g. rows aged out of the window
+    h.clock.now += 61
+    [(_, delta)] = h.engine.tick()
+    assert delta["seq"] == 2
+
+
+def test_scoped_per_allowlist_shared_once(h):
+    h.engine.set_scope("org-a", ["d1"])
+    h.engine.set_scope("org-b", ["d2", "d3"])
+    rooms_a = h.engine.subscribe("org-a", ["threats", "metrics"])
+    rooms_b = h.engine.subscribe("org-b", ["threats", "metrics"])
+    assert rooms_a == ["live-org-a-threats", "live-all-metrics"]
+    assert rooms_b == ["live-org-b-threats", "live-all-metrics"]
+
+    h.engine.tick()
+    assert sorted(h.calls, key=str) == sorted(
+        [("threats", ["d1"]), ("threats", ["d2", "d3"]), ("metrics", None)], key=str
+    )
+
+
+def test_unsubscribe_stops_updates(h):
+    h.engine.subscribe("all", ["threats"])
+    h.engine.snapshot("all", ["threats"])
+    h.engine.unsubscribe("all", ["threats"])
+    h.calls.clear()
+    h.marks["events"] = 9
+    assert h.engine.tick() == []
+    assert h.calls == []
+    assert h.engine.current("all", "threats") is None
+
+
+def test_allowlist_change_pushes_whole_value(h):
+    h.engine.set_scope("org-a", ["d1"])
+    h.engine.subscribe("org-a", ["threats"])
+    h.engine.snapshot("org-a", ["threats"])
+    h.engine.set_scope("org-a", ["d1", "d2"])
+    [(_, delta)] = h.engine.tick()
+    assert delta["base_seq"] == 1
+    assert delta["ops"][0]["path"] == ""
+    assert delta["ops"][0]["value"]["devices"] == ["d1", "d2"]
+
+
+def test_failing_dataset_does_not_block_others(h):
+    def broken(_ids):
+        raise RuntimeError("boom")
+
+    h.engine.datasets["threats"].compute = broken
+    h.engine.subscribe("all", ["threats", "metrics"])
+    snap = h.engine.snapshot("all", ["threats", "metrics"])
+    assert set(snap) == {"metrics"}
+    assert h.engine.tick() == []
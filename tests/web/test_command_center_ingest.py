@@ -0,0 +1,123 @@
+"""Command center batch ingest — writer thread, executemany groups, dedup.
+
+Loads server/command_center.py against a temp fleet DB and drives
+/api/v1/telemetry through the Flask test client.
+"""
+
+import importlib.util
+import os
+import sqlite3
+
+import pytest
+
+ROOT = os.path.join(os.path.dirname(__file__), "..", "..")
+
+
+@pytest.fixture
+def cc(tmp_path, monkeypatch):
+    spec = importlib.util.spec_from_file_location(
+        "command_center_ingest_under_test",
+        os.path.join(ROOT, "server", "command_center.py"),
+    )
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    monkeypatch.setattr(module, "DB_PATH", str(tmp_path / "fleet.db"))
+    module.init_db()
+    return module
+
+
+@pytest.fixture
+def client(cc):
+    return cc.app.test_client()
+
+
+@pytest.fixture
+def auth(client):
+    resp = client.post("/api/v1/register", json={"device_id": "dev-1"})
+    return {"Authorization": f"Bearer {resp.get_json()['api_key']}"}
+
+
+def _events(ids, **extra):
+    return [
+        {
+            "id": i,
+            "timestamp_ns": i,
+            "timestamp_dt": "2026-01-01T00:00:00",
+            "event_category": "test",
+            "risk_score": 0.1,
+            **extra,
+        }
+        for i in ids
+    ]
+
+
+def _post(client, auth, events, table="security_events"):
+    return client.post(
+        "/api/v1/telemetry", json={"table": table, "events": events}, headers=auth
+    )
+
+
+def _count(cc, table="security_events"):
+    db = sqlite3.connect(cc.DB_PATH)
+    try:
+        return db.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0]
+    finally:
+        db.close()
+
+
+class TestBatchIngest:
+
+    def test_stores_mixed_signatures(self, cc, client, auth):
+        events = _events(range(50)) + _events(range(50, 80), description="x")
+        resp = _post(client, auth, events)
+        assert resp.status_code == 200
+        assert resp.get_json()["stored"] == 80
+        assert _count(cc) == 80
+
+    def test_resent_rows_are_deduplicated(self, cc, client, auth):
+        _post(client, auth, _events(range(20)))
+        resp = _post(client, auth, _events(range(10, 30)))
+        assert resp.get_json() == {"status": "ok", "stored": 10, "failed": 0}
+        assert _count(cc) == 30
+
+    def test_bad_row_only_drops_itself(self, cc, client, auth):
+        events = _events(range(10))
+        events[3]["description"] = {"not": "bindable"}
+        resp = _post(client, auth, events)
+        assert resp.get_json()["stored"] == 9
+        assert resp.get_json()["failed"] == 1
+
+    def test_queue_full_returns_503(self, cc, client, auth, monkeypatch):
+        writer = cc.IngestWriter(maxsize=1)
+        monkeypatch.setattr(writer, "_ensure_started", lambda: None)
+        monkeypatch.setattr(cc, "_ingest_writer", writer)
+        monkeypatch.setattr(cc, "INGEST_WAIT_S", 0.01)
+
+        assert _post(client, auth, _events([1])).status_code == 202
+        resp = _post(client, auth, _events([2]))
+        assert resp.status_code == 503
+        assert resp.headers["Retry-After"]
+
+
+class TestDedupIndexMigration:
+
+    def test_collapses_existing_duplicates(self, cc):
+        db = sqlite3.connect(cc.DB_PATH)
+        db.execute("DROP INDEX uq_dns_events_source")
+        for _ in range(3):
+            db.execute(
+                "INSERT INTO dns_events (source_id, device_id, received_at)"
+                " VALUES (7, 'dev-1', 0)"
+            )
+        db.commit()
+
+        cc._ensure_dedup_indexes(db)
+        assert db.execute("SELECT COUNT(*) FROM dns_events").fetchone()[0] == 1
+        indexes = {
+            r[0]
+            for r in db.execute(
+                "SELECT name FROM sqlite_master WHERE tbl_name = 'dns_events'"
+            )
+        }
+        assert "uq_dns_events_source" in indexes
+        db.close()
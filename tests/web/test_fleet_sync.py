@@ -0,0 +1,166 @@
+"""Fleet delta sync — telemetry_bridge against the command center sync API.
+
+The bridge's requests session is replaced by the command center's Flask
+test client, so both halves of the protocol run for real against temp
+SQLite files.
+"""
+
+import gzip
+import importlib.util
+import itertools
+import json
+import os
+import sqlite3
+import sys
+import time
+
+import pytest
+
+ROOT = os.path.join(os.path.dirname(__file__), "..", "..")
+sys.path.insert(0, os.path.join(ROOT, "web"))
+
+from app.dashboard import telemetry_bridge  # noqa: E402
+
+
+@pytest.fixture
+def cc(tmp_path, monkeypatch):
+    spec = importlib.util.spec_from_file_location(
+        "command_center_under_test", os.path.join(ROOT, "server", "command_center.py")
+    )
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    monkeypatch.setattr(module, "DB_PATH", str(tmp_path / "fleet.db"))
+    module.init_db()
+    return module
+
+
+class _Response:
+    def __init__(self, resp):
+        self.status_code = resp.status_code
+        self.content_encoding = resp.headers.get("Content-Encoding")
+        self._body = resp.data
+
+    def json(self):
+        body = self._body
+        if self.content_encoding == "gzip":
+            body = gzip.decompress(body)
+        return json.loads(body)
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise RuntimeError(self.status_code)
+
+
+class _Session:
+    """Routes bridge GETs to the command center test client."""
+
+    def __init__(self, client):
+        self.client = client
+        self.requests = []
+
+    def get(self, url, params=None, timeout=None):
+        path = url.split("://", 1)[-1].split("/", 1)[1]
+        self.requests.append(("/" + path, dict(params or {})))
+        return _Response(
+            self.client.get(
+                "/" + path,
+                query_string=params or {},
+                headers={"Accept-Encoding": "gzip"},
+            )
+        )
+
+
+@pytest.fixture
+def bridge(cc, tmp_path, monkeypatch):
+    session = _Session(cc.app.test_client())
+    monkeypatch.setattr(telemetry_bridge, "_OPS_SERVER", "https://ops.test")
+    monkeypatch.setattr(telemetry_bridge, "_DATA_DIR", tmp_path)
+    monkeypatch.setattr(telemetry_bridge, "_CACHE_DB_PATH", tmp_path / "cache.db")
+    monkeypatch.setattr(telemetry_bridge, "_ops_session", lambda: session)
+    return session
+
+
+_source_ids = itertools.count()
+
+
+def _insert_security(cc, n, age_s=0.0, scored=None):
+    db = sqlite3.connect(cc.DB_PATH)
+    now = time.time()
+    for i in range(n):
+        db.execute(
+            "INSERT INTO security_events (source_id, device_id, timestamp_ns,"
+            " timestamp_dt, event_category, risk_score, last_scored, received_at)"
+            " VALUES (?, 'dev-1', ?, 'ts', 'test', 0.1, ?, ?)",
+            (next(_source_ids), int((now - age_s) * 1e9) + i, scored, now),
+        )
+    db.commit()
+    db.close()
+
+
+def _cache_rows(tmp_path, sql):
+    db = sqlite3.connect(tmp_path / "cache.db")
+    try:
+        return db.execute(sql).fetchall()
+    finally:
+        db.close()
+
+
+class TestDeltaSync:
+
+    def test_pulls_only_new_rows(self, cc, bridge, tmp_path):
+        _insert_security(cc, 30)
+        telemetry_bridge._sync_from_ops()
+        assert _cache_rows(tmp_path, "SELECT COUNT(*) FROM security_events") == [(30,)]
+
+        bridge.requests.clear()
+        telemetry_bridge._sync_from_ops()
+        assert [p for p, _ in bridge.requests] == ["/api/v1/sync/high-water"]
+
+        _insert_security(cc, 5)
+        telemetry_bridge._sync_from_ops()
+        pages = [q for p, q in bridge.requests if p == "/api/v1/sync/security_events"]
+        assert pages == [{"hours": 6, "limit": 5000, "after": 30}]
+        ids = _cache_rows(tmp_path, "SELECT id FROM security_events ORDER BY id")
+        assert [r[0] for r in ids] == list(range(1, 36))
+
+    def test_rows_outside_window_are_skipped_and_expired(
+        self, cc, bridge, tmp_path, monkeypatch
+    ):
+        _insert_security(cc, 3, age_s=10 * 3600)
+        _insert_security(cc, 4)
+        telemetry_bridge._sync_from_ops()
+        assert _cache_rows(tmp_path, "SELECT COUNT(*) FROM security_events") == [(4,)]
+
+        monkeypatch.setattr(telemetry_bridge, "_SYNC_WINDOW_HOURS", 0)
+        telemetry_bridge._expire_cache(sqlite3.connect(tmp_path / "cache.db"))
+        assert _cache_rows(tmp_path, "SELECT COUNT(*) FROM security_events") == [(0,)]
+
+    def test_rescored_rows_are_refreshed(self, cc, bridge, tmp_path):
+        _insert_security(cc, 10)
+        telemetry_bridge._sync_from_ops()
+
+        db = sqlite3.connect(cc.DB_PATH)
+        db.execute(
+            "UPDATE security_events SET composite_score = 0.9, last_scored = ?"
+            " WHERE id IN (2, 7)",
+            (int(time.time()),),
+        )
+        db.commit()
+        db.close()
+
+        telemetry_bridge._sync_from_ops()
+        scored = _cache_rows(
+            tmp_path,
+            "SELECT id, composite_score FROM security_events"
+            " WHERE composite_score IS NOT NULL ORDER BY id",
+        )
+        assert scored == [(2, 0.9), (7, 0.9)]
+        assert _cache_rows(tmp_path, "SELECT COUNT(*) FROM security_events") == [(10,)]
+
+    def test_pages_large_backlog(self, cc, bridge, tmp_path, monkeypatch):
+        monkeypatch.setattr(telemetry_bridge, "_SYNC_PAGE_SIZE", 7)
+        _insert_security(cc, 30)
+        telemetry_bridge._sync_from_ops()
+        pages = [p for p, _ in bridge.requests if p == "/api/v1/sync/security_events"]
+        assert len(pages) == 5
+        assert _cache_rows(tmp_path, "SELECT COUNT(*) FROM security_events") == [(30,)]
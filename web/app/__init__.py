@@ -145,6 +145,16 @@ def create_app():
     init_web_db()
     _migrate_user_onboarding_columns(get_web_engine())
 
+    # Write session last_active_at updates behind the request path
+    from amoskys.auth.session_cache import get_session_cache
+    from amoskys.auth.sessions import get_session_config
+    from amoskys.db.web_db import get_web_session_context
+
+    get_session_cache().start_flusher(
+        get_web_session_context,
+        get_session_config().activity_update_interval_seconds,
+    )
+
     # Register blueprints
     from .routes import main_bp
 
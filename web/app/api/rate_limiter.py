@@ -12,90 +12,101 @@ Usage:
 """
 
 import logging
-from collections import defaultdict
-from datetime import datetime, timedelta
+import math
+import os
+import threading
 from functools import wraps
 
 from flask import jsonify, request
 
+from amoskys.common.ratelimit import (
+    GCRALimiter,
+    RateLimitBackend,
+    create_rate_limit_backend,
+)
+
 logger = logging.getLogger(__name__)
 
+# Set to a SQLite path (ideally on /dev/shm) to share counters between
+# worker processes; unset keeps counters in-process.
+RATE_LIMIT_DB_ENV = "AMOSKYS_RATE_LIMIT_DB"
+
 
 class RateLimiter:
     """
-    Per-IP rate limiter with sliding window
+    Per-IP rate limiter (token bucket via GCRA)
+
+    Allows bursts of up to ``max_requests`` and refills at
+    ``max_requests / window_seconds`` per second. State is one float per
+    IP and idle IPs are evicted, so memory is bounded by active clients.
 
     Args:
-        max_requests: Maximum requests per window
+        max_requests: Maximum requests per window (bucket size)
         window_seconds: Time window in seconds
+        backend: Shared state store (default: in-process)
     """
 
-    def __init__(self, max_requests=100, window_seconds=60):
+    def __init__(self, max_requests=100, window_seconds=60, backend=None):
         self.max_requests = max_requests
         self.window_seconds = window_seconds
-        self.requests = defaultdict(list)  # IP -> [timestamps]
-        self.blocked_ips = {}  # IP -> unblock_time
+        self._limiter = GCRALimiter(
+            rate=max_requests / window_seconds,
+            burst=max_requests,
+            backend=backend,
+            namespace=f"web:{max_requests}/{window_seconds}",
+        )
+
+    @property
+    def backend(self) -> RateLimitBackend:
+        return self._limiter.backend
 
     def is_allowed(self, ip_address):
-        """Check if IP is within rate limit"""
+        """Check if IP is within rate limit (consumes one request)"""
         if not ip_address:
             return True  # Allow if no IP (development)
 
-        # Check if IP is temporarily blocked
-        if ip_address in self.blocked_ips:
-            unblock_time = self.blocked_ips[ip_address]
-            if datetime.now() < unblock_time:
-                logger.warning(f"Rate limited IP attempted access: {ip_address}")
-                return False
-            else:
-                del self.blocked_ips[ip_address]
-
-        now = datetime.now()
-        cutoff = now - timedelta(seconds=self.window_seconds)
-
-        # Clean old requests (sliding window)
-        self.requests[ip_address] = [
-            ts for ts in self.requests[ip_address] if ts > cutoff
-        ]
-
-        # Check if limit exceeded
-        if len(self.requests[ip_address]) >= self.max_requests:
-            # Block this IP for 1 minute
-            self.blocked_ips[ip_address] = now + timedelta(minutes=1)
+        if not self._limiter.allow(ip_address):
             logger.warning(f"Rate limit exceeded for IP: {ip_address}")
             return False
-
-        # Record this request
-        self.requests[ip_address].append(now)
         return True
 
     def get_requests_remaining(self, ip_address):
-        """Get remaining requests for IP in current window"""
+        """Get remaining requests for IP right now"""
         if not ip_address:
             return self.max_requests
-
-        now = datetime.now()
-        cutoff = now - timedelta(seconds=self.window_seconds)
-        count = len([ts for ts in self.requests[ip_address] if ts > cutoff])
-        return max(0, self.max_requests - count)
+        return self._limiter.peek(ip_address).remaining
 
     def get_retry_after(self, ip_address):
-        """Get seconds until IP is unblocked"""
-        if ip_address not in self.blocked_ips:
+        """Get seconds until IP may send another request"""
+        if not ip_address:
             return 0
-
-        unblock_time = self.blocked_ips[ip_address]
-        retry_after = (unblock_time - datetime.now()).total_seconds()
-        return max(0, int(retry_after))
+        return math.ceil(self._limiter.peek(ip_address).retry_after)
 
     def clear(self):
         """Clear all rate limit data (for testing)"""
-        self.requests.clear()
-        self.blocked_ips.clear()
+        self._limiter.backend.clear()
+
 
+# Shared state store for every limiter in this process
+_backend = create_rate_limit_backend(os.environ.get(RATE_LIMIT_DB_ENV))
 
 # Global rate limiter instance
-_rate_limiter = RateLimiter(max_requests=100, window_seconds=60)
+_rate_limiter = RateLimiter(max_requests=100, window_seconds=60, backend=_backend)
+
+# One limiter per (max_requests, window_seconds) used by the decorator
+_limiters = {(100, 60): _rate_limiter}
+_limiters_lock = threading.Lock()
+
+
+def _limiter_for(max_requests, window_seconds):
+    key = (max_requests, window_seconds)
+    limiter = _limiters.get(key)
+    if limiter is None:
+        with _limiters_lock:
+            limiter = _limiters.setdefault(
+                key, RateLimiter(max_requests, window_seconds, backend=_backend)
+            )
+    return limiter
 
 
 def require_rate_limit(max_requests=100, window_seconds=60):
@@ -127,9 +138,10 @@ def require_rate_limit(max_requests=100, window_seconds=60):
                 return f(*args, **kwargs)
 
             # Check rate limit
-            if not _rate_limiter.is_allowed(ip):
-                remaining = _rate_limiter.get_requests_remaining(ip)
-                retry_after = _rate_limiter.get_retry_after(ip)
+            limiter = _limiter_for(max_requests, window_seconds)
+            if not limiter.is_allowed(ip):
+                remaining = limiter.get_requests_remaining(ip)
+                retry_after = limiter.get_retry_after(ip)
 
                 return (
                     jsonify(
@@ -0,0 +1,349 @@
+"""Pushed, diff-based dashboard datasets for the /dashboard websocket.
+
+Instead of recomputing every dataset on a fixed timer and broadcasting the
+full payload, the engine keeps the last value of each dataset per *scope*
+(an org's device allowlist, or "all" for admins) and:
+
+  * recomputes a dataset only when one of its source tables moved (the
+    store's rowid watermarks) or it is older than ``max_age`` — windowed
+    aggregates age out even when nothing is inserted;
+  * only recomputes (scope, dataset) pairs that have subscribers;
+  * sends a JSON-patch style delta (RFC 6902 add/remove/replace) tagged
+    with a per-(scope, dataset) sequence number;
+  * serves a full snapshot when a client joins, reconnects or sees a gap
+    in the sequence (``base_seq`` != the seq it holds).
+
+Datasets that do not depend on the device allowlist (host metrics, agent
+registry, neural readiness) are computed once in a shared scope.
+"""
+
+from __future__ import annotations
+
+import copy
+import json
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Hashable, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+SHARED_SCOPE = "all"
+
+
+# ---------------------------------------------------------------------------
+# JSON patch
+# ---------------------------------------------------------------------------
+
+
+def _escape(token: str) -> str:
+    return str(token).replace("~", "~0").replace("/", "~1")
+
+
+def _unescape(token: str) -> str:
+    return token.replace("~1", "/").replace("~0", "~")
+
+
+def json_diff(old: Any, new: Any, path: str = "") -> List[Dict[str, Any]]:
+    """Patch operations turning ``old`` into ``new``.
+
+    Objects are diffed key by key and lists of equal length element by
+    element; anything else that differs (including lists that grew or
+    shrank) is replaced whole, which keeps list ops index-stable.
+    """
+    if isinstance(old, dict) and isinstance(new, dict):
+        ops: List[Dict[str, Any]] = []
+        for key in old:
+            if key not in new:
+                ops.append({"op": "remove", "path": f"{path}/{_escape(key)}"})
+        for key, value in new.items():
+            child = f"{path}/{_escape(key)}"
+            if key not in old:
+                ops.append({"op": "add", "path": child, "value": value})
+            else:
+                ops.extend(json_diff(old[key], value, child))
+        return ops
+    if isinstance(old, list) and isinstance(new, list) and len(old) == len(new):
+        ops = []
+        for i, (a, b) in enumerate(zip(old, new)):
+            ops.extend(json_diff(a, b, f"{path}/{i}"))
+        return ops
+    if type(old) is not type(new) or old != new:
+        return [{"op": "replace", "path": path, "value": new}]
+    return []
+
+
+def apply_patch(doc: Any, ops: Sequence[Dict[str, Any]]) -> Any:
+    """Apply ``json_diff`` output to a copy of ``doc`` and return it."""
+    doc = copy.deepcopy(doc)
+    for op in ops:
+        tokens = [_unescape(t) for t in op["path"].split("/")[1:]]
+        if not tokens:
+            doc = copy.deepcopy(op["value"])
+            continue
+        parent = doc
+        for token in tokens[:-1]:
+            parent = parent[int(token) if isinstance(parent, list) else token]
+        last = tokens[-1]
+        if isinstance(parent, list):
+            idx = int(last)
+            if op["op"] == "remove":
+                del parent[idx]
+            elif op["op"] == "add":
+                parent.insert(idx, copy.deepcopy(op["value"]))
+            else:
+                parent[idx] = copy.deepcopy(op["value"])
+        elif op["op"] == "remove":
+            parent.pop(last, None)
+        else:
+            parent[last] = copy.deepcopy(op["value"])
+    return doc
+
+
+def _top_key(path: str) -> str:
+    """First token of a JSON pointer ("" for the document root)."""
+    return _unescape(path.split("/")[1]) if path else ""
+
+
+def _to_json(value: Any) -> Any:
+    """Normalize to what the client will hold (tuples -> lists, etc.)."""
+    return json.loads(json.dumps(value, default=str))
+
+
+# ---------------------------------------------------------------------------
+# Engine
+# ---------------------------------------------------------------------------
+
+
+@dataclass
+class Dataset:
+    """One pushable dashboard dataset.
+
+    Attributes:
+        name: Key the client stores it under (``ws:<name>`` event)
+        compute: ``compute(device_ids)`` -> JSON-able value; device_ids is
+            None for unrestricted/shared scopes
+        tables: Source tables whose watermarks gate recomputation; empty
+            means the dataset is refreshed on ``max_age`` alone
+        scoped: False for data that is the same for every org
+        max_age: Recompute at least this often (seconds)
+        volatile: Top-level keys (timestamps) that alone do not count as
+            a change worth pushing
+    """
+
+    name: str
+    compute: Callable[[Optional[List[str]]], Any]
+    tables: Tuple[str, ...] = ()
+    scoped: bool = True
+    max_age: float = 60.0
+    volatile: Tuple[str, ...] = ("last_updated", "timestamp")
+
+
+@dataclass
+class _State:
+    value: Any
+    seq: int
+    version: Tuple[Hashable, ...]
+    computed_at: float
+
+
+class LiveUpdateEngine:
+    """Per-scope dataset cache that turns recomputes into deltas.
+
+    Args:
+        datasets: The datasets clients may subscribe to
+        versions: ``versions(tables)`` -> {table: watermark}
+        clock: Monotonic clock (injectable for tests)
+    """
+
+    def __init__(
+        self,
+        datasets: Sequence[Dataset],
+        versions: Callable[[Sequence[str]], Dict[str, Hashable]],
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.datasets: Dict[str, Dataset] = {d.name: d for d in datasets}
+        self._versions = versions
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._scopes: Dict[str, Optional[List[str]]] = {SHARED_SCOPE: None}
+        self._subscribers: Dict[Tuple[str, str], int] = {}
+        self._state: Dict[Tuple[str, str], _State] = {}
+        self._seq: Dict[Tuple[str, str], int] = {}
+
+    # -- scopes and subscriptions --------------------------------------
+
+    def set_scope(self, scope: str, device_ids: Optional[Sequence[str]]) -> None:
+        """Register (or refresh) the device allowlist behind a scope key."""
+        ids = None if device_ids is None else sorted(device_ids)
+        with self._lock:
+            if scope in self._scopes and self._scopes[scope] != ids:
+                # Allowlist changed: cached values no longer match it
+                for key in [k for k in self._state if k[0] == scope]:
+                    del self._state[key]
+            self._scopes[scope] = ids
+
+    def data_scope(self, scope: str, name: str) -> str:
+        """Scope a dataset is actually computed in."""
+        return scope if self.datasets[name].scoped else SHARED_SCOPE
+
+    def room(self, scope: str, name: str) -> str:
+        """Socket.IO room that receives deltas for (scope, dataset)."""
+        return f"live-{self.data_scope(scope, name)}-{name}"
+
+    def subscribe(self, scope: str, names: Sequence[str]) -> List[str]:
+        """Count a subscriber for each known dataset; returns their rooms."""
+        rooms = []
+        with self._lock:
+            for name in names:
+                if name not in self.datasets:
+                    continue
+                key = (self.data_scope(scope, name), name)
+                self._subscribers[key] = self._subscribers.get(key, 0) + 1
+                rooms.append(self.room(scope, name))
+        return rooms
+
+    def unsubscribe(self, scope: str, names: Sequence[str]) -> None:
+        """Drop a subscriber; state with no subscribers left is discarded."""
+        with self._lock:
+            for name in names:
+                if name not in self.datasets:
+                    continue
+                key = (self.data_scope(scope, name), name)
+                left = self._subscribers.get(key, 0) - 1
+                if left > 0:
+                    self._subscribers[key] = left
+                else:
+                    self._subscribers.pop(key, None)
+                    self._state.pop(key, None)
+
+    def has_subscribers(self, scope: str, name: str) -> bool:
+        with self._lock:
+            return self._subscribers.get((self.data_scope(scope, name), name), 0) > 0
+
+    # -- computing ------------------------------------------------------
+
+    def _version(self, ds: Dataset, marks: Dict[str, Hashable]) -> Tuple:
+        return tuple(marks.get(t) for t in ds.tables)
+
+    def _refresh(
+        self, key: Tuple[str, str], marks: Dict[str, Hashable]
+    ) -> Optional[Tuple[_State, List[Dict[str, Any]]]]:
+        """Recompute ``key`` if stale; return (new state, ops) on a change."""
+        scope, name = key
+        ds = self.datasets[name]
+        version = self._version(ds, marks)
+        now = self._clock()
+        with self._lock:
+            prev = self._state.get(key)
+            device_ids = self._scopes.get(scope)
+        if (
+            prev is not None
+            and prev.version == version
+            and now - prev.computed_at < ds.max_age
+        ):
+            return None
+
+        value = _to_json(ds.compute(device_ids))
+
+        with self._lock:
+            current = self._state.get(key)
+            if current is not prev or not self._subscribers.get(key):
+                return None  # refreshed or unsubscribed meanwhile
+            if prev is None:
+                seq = self._seq.get(key, 0) + 1
+                self._seq[key] = seq
+                state = _State(value, seq, version, now)
+                self._state[key] = state
+                return state, [{"op": "replace", "path": "", "value": value}]
+            ops = json_diff(prev.value, value)
+            if all(_top_key(op["path"]) in ds.volatile for op in ops):
+                prev.version, prev.computed_at = version, now
+                return None
+            seq = self._seq[key] + 1
+            self._seq[key] = seq
+            state = _State(value, seq, version, now)
+            self._state[key] = state
+            return state, ops
+
+    def tick(self) -> List[Tuple[str, Dict[str, Any]]]:
+        """Refresh every subscribed (scope, dataset) and collect deltas.
+
+        Returns:
+            [(room, payload)] for the ``dashboard_delta`` event, where
+            payload is {dataset, seq, base_seq, ops}
+        """
+        with self._lock:
+            keys = [k for k, n in self._subscribers.items() if n > 0]
+        if not keys:
+            return []
+        tables = sorted({t for _, name in keys for t in self.datasets[name].tables})
+        marks = self._versions(tables) if tables else {}
+
+        out = []
+        for key in keys:
+            try:
+                changed = self._refresh(key, marks)
+            except Exception as exc:
+                logger.debug("Live dataset %s/%s failed: %s", key[0], key[1], exc)
+                continue
+            if changed is None:
+                continue
+            state, ops = changed
+            scope, name = key
+            out.append(
+                (
+                    f"live-{scope}-{name}",
+                    {
+                        "dataset": name,
+                        "seq": state.seq,
+                        "base_seq": state.seq - 1,
+                        "ops": ops,
+                    },
+                )
+            )
+        return out
+
+    def snapshot(self, scope: str, names: Sequence[str]) -> Dict[str, Any]:
+        """Full values (with seqs) for a joining or resyncing client.
+
+        Values already held are served as-is — tick() keeps every
+        subscribed dataset current, so only missing ones are computed.
+        """
+        names = [n for n in names if n in self.datasets]
+        with self._lock:
+            missing = [
+                n for n in names if (self.data_scope(scope, n), n) not in self._state
+            ]
+        tables = sorted({t for n in missing for t in self.datasets[n].tables})
+        marks = self._versions(tables) if tables else {}
+        result: Dict[str, Any] = {}
+        for name in names:
+            key = (self.data_scope(scope, name), name)
+            if name in missing:
+                try:
+                    self._refresh(key, marks)
+                except Exception as exc:
+                    logger.debug("Live dataset %s/%s failed: %s", key[0], name, exc)
+            with self._lock:
+                state = self._state.get(key)
+            if state is not None:
+                result[name] = {"seq": state.seq, "data": state.value}
+        return result
+
+    def current(self, scope: str, name: str) -> Any:
+        """Last pushed value of a dataset (None if not held)."""
+        with self._lock:
+            state = self._state.get((self.data_scope(scope, name), name))
+            return None if state is None else state.value
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "scopes": len(self._scopes),
+                "subscriptions": dict(
+                    (f"{s}/{n}", c) for (s, n), c in self._subscribers.items()
+                ),
+                "cached": len(self._state),
+            }
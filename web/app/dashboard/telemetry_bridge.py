@@ -8,6 +8,13 @@ Two modes:
 The bridge auto-detects which mode to use:
   - If data/telemetry.db exists → local mode (agent is running here)
   - If AMOSKYS_OPS_SERVER is set → fleet mode (sync from ops server)
+
+Fleet sync is incremental: the cache keeps a cursor per table (in
+fleet_sync_cursors, committed with the rows it covers) and pulls only rows
+past it from the ops /api/v1/sync endpoints. Rows keep their ops id, so a
+re-sent row (e.g. re-scored on ops) replaces its cached copy, and rows
+older than the window are expired by timestamp instead of truncating.
+Ops servers without the sync endpoints fall back to bulk-export.
 """
 
 from __future__ import annotations
@@ -41,6 +48,22 @@ _DB_PATH = _DATA_DIR / "telemetry.db"
 _CACHE_DB_PATH = _DATA_DIR / "fleet_cache.db"
 _OPS_SERVER = os.getenv("AMOSKYS_OPS_SERVER", "").rstrip("/")
 
+# Fleet delta sync
+_SYNC_WINDOW_HOURS = int(os.getenv("AMOSKYS_FLEET_WINDOW_HOURS", "6"))
+_SYNC_PAGE_SIZE = 5000  # Rows per page request
+_SYNC_MAX_PAGES = 20  # Pages per table per cycle; the rest waits a cycle
+_SYNC_TABLES = (
+    "security_events",
+    "process_events",
+    "flow_events",
+    "dns_events",
+    "persistence_events",
+    "audit_events",
+    "fim_events",
+    "peripheral_events",
+    "observation_events",
+)
+
 
 def _resolve_ca_bundle() -> Optional[str]:
     """Resolve the pinned ops CA bundle path.
@@ -172,43 +195,29 @@ def _start_fleet_sync():
     t.start()
 
 
-def _sync_from_ops():
-    """Fetch event tables from ops server and REPLACE local cache.
-
-    Uses truncate-and-replace strategy to prevent unbounded growth.
-    Each sync replaces the cache with the latest events within the time window.
-    """
+def _ops_session():
+    """requests session for the ops server, TLS pinned to the ops CA."""
     import requests
 
-    _DATA_DIR.mkdir(parents=True, exist_ok=True)
-
-    # Fetch bulk export from ops server (6h window — keeps cache small
-    # for the t2.micro presentation server with 914MB RAM)
     # Pin TLS verification to the ops self-signed CA (CN=ops.amoskys.com).
     # Missing CA → WARNING + unverified fallback so sync never hard-breaks.
     _ca_bundle = _resolve_ca_bundle()
-    _session = requests.Session()
+    session = requests.Session()
     if _ca_bundle:
-        _session.mount("https://", _PinnedCAAdapter(_ca_bundle))
+        session.mount("https://", _PinnedCAAdapter(_ca_bundle))
     else:
         logger.warning(
             "Ops CA bundle not found (set AMOSKYS_CA_BUNDLE or ship "
             "deploy/certs/ops-ca.pem); fleet sync using UNVERIFIED TLS"
         )
-        _session.verify = False
-    try:
-        resp = _session.get(
-            f"{_OPS_SERVER}/api/v1/bulk-export",
-            params={"hours": 6},
-            timeout=60,
-        )
-        if resp.status_code != 200:
-            logger.debug("Fleet sync: ops returned %d", resp.status_code)
-            return
-        bulk = resp.json()
-    except Exception as e:
-        logger.debug("Fleet sync fetch failed: %s", e)
-        return
+        session.verify = False
+    session.headers["Accept-Encoding"] = "gzip"
+    return session
+
+
+def _open_cache_db() -> sqlite3.Connection:
+    """Open the fleet cache DB, creating/migrating its schema."""
+    _DATA_DIR.mkdir(parents=True, exist_ok=True)
 
     # Initialize cache DB with TelemetryStore schema
     db = sqlite3.connect(str(_CACHE_DB_PATH), timeout=10)
@@ -230,7 +239,7 @@ def _sync_from_ops():
 
     # Carry the BRAIN'S verdict through the sync. The dynamic INSERT only writes
     # columns that already exist in the table, so composite_score / risk_score_raw
-    # / last_scored (present in the ops bulk export after re-scoring) are silently
+    # / last_scored (present in the ops export after re-scoring) are silently
     # dropped unless the columns exist here. Add them idempotently so the web can
     # read the calibrated score instead of the agent's raw risk_score.
     for _col, _typ in (
@@ -264,6 +273,221 @@ def _sync_from_ops():
             exc_info=True,
         )
 
+    db.execute(
+        """
+        CREATE TABLE IF NOT EXISTS fleet_sync_cursors (
+            table_name TEXT PRIMARY KEY,
+            last_id INTEGER NOT NULL DEFAULT 0,
+            scored_at TEXT,
+            scored_id INTEGER NOT NULL DEFAULT 0,
+            updated_at REAL NOT NULL
+        )
+        """
+    )
+    db.commit()
+    return db
+
+
+def _invalidate_store():
+    """Drop the cached TelemetryStore so the next request reopens the cache."""
+    global _telemetry_store
+    with _store_lock:
+        old = _telemetry_store
+        _telemetry_store = None
+        # Close old store's connections gracefully
+        if old is not None:
+            try:
+                old._read_pool.close()
+                old.db.close()
+            except Exception:
+                pass
+
+
+def _sync_from_ops():
+    """Pull rows newer than the cache's cursors from the ops server.
+
+    Cost is proportional to new data: the ops high-water marks let
+    unchanged tables be skipped, each changed table is paged past its
+    cursor, rows are upserted by ops id, and rows that aged out of the
+    window are deleted. Falls back to bulk-export on older ops servers.
+    """
+    session = _ops_session()
+    try:
+        resp = session.get(f"{_OPS_SERVER}/api/v1/sync/high-water", timeout=30)
+        if resp.status_code == 404:
+            _sync_bulk_export(session)
+            return
+        if resp.status_code != 200:
+            logger.debug("Fleet sync: ops returned %d", resp.status_code)
+            return
+        marks = resp.json().get("tables", {})
+    except Exception as e:
+        logger.debug("Fleet sync fetch failed: %s", e)
+        return
+
+    db = _open_cache_db()
+    total = 0
+    try:
+        for table in _SYNC_TABLES:
+            mark = marks.get(table)
+            if mark is None:
+                continue
+            try:
+                total += _sync_table(db, session, table, mark)
+            except Exception as e:
+                db.rollback()
+                logger.debug("Fleet sync %s failed: %s", table, e)
+        if "devices" in marks:
+            total += _sync_devices(db, session, marks["devices"])
+        _expire_cache(db)
+    finally:
+        db.close()
+
+    if total > 0:
+        # Invalidate cached store so next request picks up fresh data
+        _invalidate_store()
+        logger.info("Fleet sync: %d rows upserted (delta)", total)
+
+
+def _load_cursor(db: sqlite3.Connection, table: str) -> Optional[tuple]:
+    """(last_id, scored_at, scored_id) for *table*, or None if never synced."""
+    row = db.execute(
+        "SELECT last_id, scored_at, scored_id FROM fleet_sync_cursors "
+        "WHERE table_name = ?",
+        (table,),
+    ).fetchone()
+    return tuple(row) if row else None
+
+
+def _save_cursor(
+    db: sqlite3.Connection,
+    table: str,
+    last_id: int,
+    scored_at: Optional[str] = None,
+    scored_id: int = 0,
+):
+    db.execute(
+        "INSERT OR REPLACE INTO fleet_sync_cursors "
+        "(table_name, last_id, scored_at, scored_id, updated_at) "
+        "VALUES (?, ?, ?, ?, ?)",
+        (table, last_id, scored_at, scored_id, time.time()),
+    )
+
+
+def _fetch_page(session, table: str, params: dict) -> dict:
+    resp = session.get(
+        f"{_OPS_SERVER}/api/v1/sync/{table}",
+        params={"hours": _SYNC_WINDOW_HOURS, "limit": _SYNC_PAGE_SIZE, **params},
+        timeout=60,
+    )
+    resp.raise_for_status()
+    return resp.json()
+
+
+def _sync_table(db: sqlite3.Connection, session, table: str, mark: dict) -> int:
+    """Page one table past its cursor. Each page commits with its cursor."""
+    max_id = mark.get("max_id") or 0
+    cursor = _load_cursor(db, table)
+    if cursor is None or cursor[0] > max_id:
+        # No cursor (cache filled by bulk-export, ids are local) or the ops
+        # DB was reset: start over from the window once.
+        db.execute(f"DELETE FROM {table}")
+        # Rows scored so far arrive with their scores via the id stream.
+        cursor = (0, mark.get("max_scored"), 0)
+        _save_cursor(db, table, *cursor)
+        db.commit()
+    last_id, scored_at, scored_id = cursor
+
+    upserted = 0
+    pages = 0
+    while last_id < max_id and pages < _SYNC_MAX_PAGES:
+        page = _fetch_page(session, table, {"after": last_id})
+        pages += 1
+        upserted += _upsert_rows(db, table, page["rows"], keep_ids=True)
+        last_id = max(last_id, page["cursor"]["after"])
+        _save_cursor(db, table, last_id, scored_at, scored_id)
+        db.commit()
+        if not page["more"]:
+            break
+
+    # Rows re-scored on ops after we first pulled them
+    max_scored = mark.get("max_scored")
+    if max_scored is not None and (scored_at is None or str(max_scored) > scored_at):
+        while pages < _SYNC_MAX_PAGES:
+            params = {"stream": "scored", "after": scored_id}
+            if scored_at is not None:
+                params["after_scored"] = scored_at
+            page = _fetch_page(session, table, params)
+            pages += 1
+            # Only refresh rows already cached; newer ids come via the id stream
+            rows = [r for r in page["rows"] if r.get("id", 0) <= last_id]
+            upserted += _upsert_rows(db, table, rows, keep_ids=True)
+            scored_at = str(page["cursor"]["after_scored"])
+            scored_id = page["cursor"]["after"]
+            _save_cursor(db, table, last_id, scored_at, scored_id)
+            db.commit()
+            if not page["more"]:
+                break
+    return upserted
+
+
+def _sync_devices(db: sqlite3.Connection, session, mark: dict) -> int:
+    """Upsert devices seen since the last device cursor.
+
+    The devices cursor is a last_seen value, kept in the scored_at column.
+    """
+    cursor = _load_cursor(db, "devices")
+    after_seen = float(cursor[1]) if cursor and cursor[1] else 0.0
+    if (mark.get("max_seen") or 0) <= after_seen:
+        return 0
+    try:
+        page = _fetch_page(session, "devices", {"after_seen": after_seen})
+    except Exception as e:
+        logger.debug("Fleet sync devices failed: %s", e)
+        return 0
+    upserted = _upsert_devices(db, page["rows"])
+    _save_cursor(db, "devices", 0, str(page["cursor"]["after_seen"]))
+    db.commit()
+    return upserted
+
+
+def _expire_cache(db: sqlite3.Connection):
+    """Delete cached rows that fell out of the sync window."""
+    cutoff_ns = int((time.time() - _SYNC_WINDOW_HOURS * 3600) * 1e9)
+    for table in _SYNC_TABLES:
+        try:
+            db.execute(f"DELETE FROM {table} WHERE timestamp_ns < ?", (cutoff_ns,))
+        except Exception:
+            pass
+    db.commit()
+
+
+def _sync_bulk_export(session):
+    """Fetch event tables via bulk-export and REPLACE the local cache.
+
+    Legacy path for ops servers without /api/v1/sync. Uses
+    truncate-and-replace; also clears the delta cursors, since the
+    replaced rows carry local ids.
+    """
+    # Fetch bulk export from ops server (6h window — keeps cache small
+    # for the t2.micro presentation server with 914MB RAM)
+    try:
+        resp = session.get(
+            f"{_OPS_SERVER}/api/v1/bulk-export",
+            params={"hours": _SYNC_WINDOW_HOURS},
+            timeout=60,
+        )
+        if resp.status_code != 200:
+            logger.debug("Fleet sync: ops returned %d", resp.status_code)
+            return
+        bulk = resp.json()
+    except Exception as e:
+        logger.debug("Fleet sync fetch failed: %s", e)
+        return
+
+    db = _open_cache_db()
+    db.execute("DELETE FROM fleet_sync_cursors")
+
     # Truncate and replace each table (prevents unbounded growth)
     total = 0
     for table_name, rows in bulk.items():
@@ -294,29 +518,24 @@ def _sync_from_ops():
     db.close()
 
     if total > 0:
-        # Invalidate cached store so next request picks up fresh data
-        global _telemetry_store
-        with _store_lock:
-            old = _telemetry_store
-            _telemetry_store = None
-            # Close old store's connections gracefully
-            if old is not None:
-                try:
-                    old._read_pool.close()
-                    old.db.close()
-                except Exception:
-                    pass
+        _invalidate_store()
         logger.info(
             "Fleet sync: %d total rows synced across %d tables", total, len(bulk)
         )
 
 
-def _upsert_rows(db: sqlite3.Connection, table: str, rows: list) -> int:
+def _upsert_rows(
+    db: sqlite3.Connection, table: str, rows: list, keep_ids: bool = False
+) -> int:
     """Insert rows into a table, skipping duplicates.
 
     Handles schema mismatches between ops server (simple columns) and
     TelemetryStore (full schema with NOT NULL constraints) by providing
     defaults for required columns that the ops server doesn't send.
+
+    With keep_ids the ops row id becomes the cache row id and an existing
+    row with that id (or clashing on another unique key) is replaced, so
+    re-sent rows update in place.
     """
     if not rows:
         return 0
@@ -366,11 +585,13 @@ def _upsert_rows(db: sqlite3.Connection, table: str, rows: list) -> int:
         "host": "",
     }
 
+    verb = "INSERT OR REPLACE" if keep_ids else "INSERT OR IGNORE"
     inserted = 0
     dropped_keys: set = set()
     for row in rows:
-        # Filter to columns that exist, skip 'id' (auto-increment)
-        cols = [k for k in row.keys() if k in existing_cols and k != "id"]
+        # Filter to columns that exist, skip 'id' (auto-increment) unless
+        # the cache mirrors ops ids
+        cols = [k for k in row.keys() if k in existing_cols and (keep_ids or k != "id")]
         # Track ops keys the cache schema can't hold so drift is visible
         dropped_keys |= set(row) - existing_cols
         if not cols:
@@ -389,7 +610,7 @@ def _upsert_rows(db: sqlite3.Connection, table: str, rows: list) -> int:
         col_names = ",".join(cols)
         try:
             cur = db.execute(
-                f"INSERT OR IGNORE INTO {table} ({col_names}) VALUES ({placeholders})",
+                f"{verb} INTO {table} ({col_names}) VALUES ({placeholders})",
                 vals,
             )
             # Honest accounting: OR IGNORE reports 0 rows for skipped
@@ -463,12 +684,8 @@ def _upsert_devices(db: sqlite3.Connection, rows: list) -> int:
             continue
         cols = [c for c in _DEVICE_COLUMNS if c in row]
         placeholders = ",".join(["?"] * len(cols))
-        assignments = ",".join(
-            f"{c}=excluded.{c}" for c in cols if c != "device_id"
-        )
-        conflict = (
-            f"DO UPDATE SET {assignments}" if assignments else "DO NOTHING"
-        )
+        assignments = ",".join(f"{c}=excluded.{c}" for c in cols if c != "device_id")
+        conflict = f"DO UPDATE SET {assignments}" if assignments else "DO NOTHING"
         try:
             cur = db.execute(
                 f"INSERT INTO devices ({','.join(cols)}) "
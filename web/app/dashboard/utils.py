@@ -8,18 +8,21 @@ including data aggregation, visualization helpers, and real-time processing.
 
 import statistics
 from datetime import datetime, timedelta, timezone
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional, Sequence
 
 # Constants
 UTC_TIMEZONE_SUFFIX = "+00:00"
 
 
-def get_threat_timeline_data(hours: int = 24) -> Dict[str, Any]:
+def get_threat_timeline_data(
+    hours: int = 24, device_ids: Optional[Sequence[str]] = None
+) -> Dict[str, Any]:
     """
     Generate threat timeline data from TelemetryStore.
 
     Args:
         hours: Number of hours to look back
+        device_ids: Restrict to these devices (None = all devices)
 
     Returns:
         Dict containing timeline data and statistics
@@ -38,10 +41,14 @@ def get_threat_timeline_data(hours: int = 24) -> Dict[str, Any]:
             "time_range": f"Last {hours} hours",
         }
 
-    rows = store.get_unified_threat_events(limit=500, hours=hours)
+    rows = store.get_unified_threat_events(
+        limit=500, hours=hours, device_ids=device_ids
+    )
     if not rows:
         # Fallback: show most recent events regardless of age
-        rows = store.get_unified_threat_events(limit=500, hours=8760)
+        rows = store.get_unified_threat_events(
+            limit=500, hours=8760, device_ids=device_ids
+        )
     timeline_data = []
     hourly_counts: Dict[str, int] = {}
 
@@ -254,12 +261,15 @@ def get_system_metrics_snapshot() -> Dict[str, Any]:
         }
 
 
-def calculate_threat_score(time_window_hours: int = 1) -> Dict[str, Any]:
+def calculate_threat_score(
+    time_window_hours: int = 1, device_ids: Optional[Sequence[str]] = None
+) -> Dict[str, Any]:
     """
     Calculate current threat score from TelemetryStore.
 
     Args:
         time_window_hours: Time window for threat calculation
+        device_ids: Restrict to these devices (None = all devices)
 
     Returns:
         Dict containing threat score and analysis
@@ -280,7 +290,7 @@ def calculate_threat_score(time_window_hours: int = 1) -> Dict[str, Any]:
             "calculation_details": {"raw_score": 0, "normalized_score": 0},
         }
 
-    data = store.get_threat_score_data(hours=time_window_hours)
+    data = store.get_threat_score_data(hours=time_window_hours, device_ids=device_ids)
     threat_score = int(data.get("threat_score", 0))
     event_count = data.get("event_count", 0)
 
@@ -317,10 +327,15 @@ def calculate_threat_score(time_window_hours: int = 1) -> Dict[str, Any]:
     }
 
 
-def get_event_clustering_data() -> Dict[str, Any]:
+def get_event_clustering_data(
+    device_ids: Optional[Sequence[str]] = None,
+) -> Dict[str, Any]:
     """
     Generate event clustering data from TelemetryStore.
 
+    Args:
+        device_ids: Restrict to these devices (None = all devices)
+
     Returns:
         Dict containing various event clustering analyses
     """
@@ -350,21 +365,24 @@ def get_event_clustering_data() -> Dict[str, Any]:
             "time_range": "Last 24 hours",
         }
 
-    data = store.get_unified_event_clustering(hours=24)
+    data = store.get_unified_event_clustering(hours=24, device_ids=device_ids)
 
     # Extract source IP counts from indicators across all tables that store them
     import json
     import time as _time
 
+    from amoskys.storage._ts_queries import device_filter
+
     by_source_ip: Dict[str, int] = {}
     try:
         cutoff_ns = int((_time.time() - 24 * 3600) * 1e9)
+        dev_sql, dev_params = device_filter(device_ids)
         with store._lock:
             # Security events have rich indicators JSON
             cursor = store.db.execute(
-                """SELECT indicators FROM security_events
-                   WHERE timestamp_ns > ? AND indicators LIKE '%_ip%'""",
-                (cutoff_ns,),
+                f"""SELECT indicators FROM security_events
+                   WHERE timestamp_ns > ?{dev_sql} AND indicators LIKE '%_ip%'""",
+                (cutoff_ns, *dev_params),
             )
             for row in cursor.fetchall():
                 try:
@@ -380,9 +398,9 @@ def get_event_clustering_data() -> Dict[str, Any]:
                     by_source_ip[ip] = by_source_ip.get(ip, 0) + 1
             # Flow events have explicit src_ip/dst_ip columns
             cursor = store.db.execute(
-                """SELECT src_ip, dst_ip FROM flow_events
-                   WHERE timestamp_ns > ?""",
-                (cutoff_ns,),
+                f"""SELECT src_ip, dst_ip FROM flow_events
+                   WHERE timestamp_ns > ?{dev_sql}""",
+                (cutoff_ns, *dev_params),
             )
             for row in cursor.fetchall():
                 for ip in (row[0], row[1]):
@@ -624,9 +642,11 @@ def _get_neural_recommendations(criteria: Dict[str, Any]) -> List[str]:
 # These functions provide real-time data for dashboard endpoints
 
 
-def get_live_threats_data() -> Dict[str, Any]:
+def get_live_threats_data(
+    device_ids: Optional[Sequence[str]] = None,
+) -> Dict[str, Any]:
     """Get live threats data for real-time dashboard updates"""
-    timeline_data = get_threat_timeline_data(hours=24)
+    timeline_data = get_threat_timeline_data(hours=24, device_ids=device_ids)
 
     return {
         "recent_events": timeline_data["timeline"][-10:],  # Last 10 events
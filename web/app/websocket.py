@@ -6,11 +6,13 @@ Phase 2.4 Implementation - Fixed Version
 
 import logging
 import os
+import sqlite3
 import time
 from threading import Thread
 
 from flask_socketio import SocketIO, emit, join_room, leave_room
 
+from .dashboard.live_updates import SHARED_SCOPE, Dataset, LiveUpdateEngine
 from .dashboard.telemetry_bridge import get_telemetry_store
 from .dashboard.utils import (
     calculate_threat_score,
@@ -29,6 +31,21 @@ logger = logging.getLogger(__name__)
 # short-circuit so the feed is simply empty instead of error-spamming.
 _signals_table_missing = False
 
+# How often the updater checks store watermarks for changes
+_POLL_INTERVAL_SECONDS = float(os.environ.get("AMOSKYS_WS_POLL_SECONDS", "2"))
+
+# Source tables behind the store-backed datasets
+_THREAT_TABLES = (
+    "security_events",
+    "persistence_events",
+    "process_events",
+    "fim_events",
+    "flow_events",
+    "dns_events",
+    "audit_events",
+)
+_CLUSTER_TABLES = _THREAT_TABLES + ("observation_events", "peripheral_events")
+
 
 def _get_cors_origins():
     """Get CORS allowed origins from environment. Empty list means same-origin only."""
@@ -80,13 +97,13 @@ def _get_live_incidents() -> dict:
         return {"incidents": [], "incident_count": 0}
 
 
-def _get_live_posture() -> dict:
+def _get_live_posture(device_ids=None) -> dict:
     """Fetch nerve posture score for real-time push."""
     try:
         store = get_telemetry_store()
         if store is None:
             return {}
-        posture = store.compute_nerve_posture(hours=24)
+        posture = store.compute_nerve_posture(hours=24, device_ids=device_ids)
         return {
             "posture_score": posture.get("posture_score", 100.0),
             "threat_level": posture.get("threat_level", "clear"),
@@ -143,14 +160,85 @@ def _get_live_signals() -> dict:
         return empty
 
 
+def _source_versions(tables) -> dict:
+    """Watermarks for the live datasets' source tables.
+
+    MAX(rowid) catches inserts; incidents are also updated in place, so
+    their version includes MAX(updated_at).
+    """
+    store = get_telemetry_store()
+    if store is None:
+        return {}
+    marks = store.watermarks(tables)
+    if "incidents" in marks:
+        try:
+            with store._lock:
+                row = store.db.execute(
+                    "SELECT MAX(updated_at) FROM incidents"
+                ).fetchone()
+            marks["incidents"] = (marks["incidents"], row[0] if row else None)
+        except sqlite3.Error:
+            pass
+    return marks
+
+
+LIVE_DATASETS = (
+    Dataset(
+        "threats", lambda ids: get_live_threats_data(device_ids=ids), _THREAT_TABLES
+    ),
+    Dataset(
+        "threat_score",
+        lambda ids: calculate_threat_score(device_ids=ids),
+        _THREAT_TABLES,
+        max_age=30,
+    ),
+    Dataset(
+        "events", lambda ids: get_event_clustering_data(device_ids=ids), _CLUSTER_TABLES
+    ),
+    Dataset("posture", _get_live_posture, _CLUSTER_TABLES),
+    # Incidents carry no device_id, so they are shared as before
+    Dataset(
+        "incidents", lambda _ids: _get_live_incidents(), ("incidents",), scoped=False
+    ),
+    Dataset("signals", lambda _ids: _get_live_signals(), scoped=False, max_age=30),
+    # Host/registry data, identical for every org
+    Dataset("agents", lambda _ids: get_live_agents_data(), scoped=False, max_age=10),
+    Dataset("metrics", lambda _ids: get_live_metrics_data(), scoped=False, max_age=5),
+    Dataset(
+        "neural", lambda _ids: get_neural_readiness_status(), scoped=False, max_age=60
+    ),
+)
+
+# Datasets each dashboard page subscribes to
+DASHBOARD_DATASETS = {
+    "cortex": (
+        "threats",
+        "agents",
+        "metrics",
+        "threat_score",
+        "events",
+        "neural",
+        "posture",
+        "signals",
+        "incidents",
+    ),
+    "soc": ("threats", "events", "posture", "incidents", "signals"),
+    "agents": ("agents", "metrics"),
+    "system": ("metrics",),
+    "neural": ("neural",),
+}
+
+live_engine = LiveUpdateEngine(LIVE_DATASETS, _source_versions)
+
+
 class DashboardUpdater:
-    """Real-time dashboard data updater"""
+    """Pushes dataset deltas to subscribed rooms as the store changes."""
 
-    def __init__(self, socketio_instance):
+    def __init__(self, socketio_instance, engine: LiveUpdateEngine):
         self.socketio = socketio_instance
+        self.engine = engine
         self.running = False
-        self._prev_incident_count = 0
-        self._prev_signal_count = 0
+        self._prev_counts = {"incidents": 0, "signals": 0}
 
     def start_updates(self):
         """Start real-time data updates"""
@@ -167,98 +255,47 @@ class DashboardUpdater:
         logger.info("Dashboard updater stopped")
 
     def _update_loop(self):
-        """Main update loop for real-time data"""
+        """Check watermarks and push deltas for the datasets that changed"""
         while self.running:
             try:
-                # Update every 5 seconds
-                time.sleep(5)
-
-                if len(active_connections) > 0:
-                    # Collect all real-time data — isolate each fetch so
-                    # one failure doesn't kill the entire update cycle.
-                    updates = {"timestamp": time.time()}
-
-                    try:
-                        incident_data = _get_live_incidents()
-                        updates["incidents"] = incident_data["incidents"]
-                        updates["incident_count"] = incident_data["incident_count"]
-                    except Exception:
-                        incident_data = {"incidents": [], "incident_count": 0}
-                        updates["incidents"] = []
-                        updates["incident_count"] = 0
-
-                    for key, fn in (
-                        ("threats", get_live_threats_data),
-                        ("agents", get_live_agents_data),
-                        ("metrics", get_live_metrics_data),
-                        ("threat_score", calculate_threat_score),
-                        ("events", get_event_clustering_data),
-                        ("neural", get_neural_readiness_status),
-                        ("posture", _get_live_posture),
-                        ("signals", _get_live_signals),
-                    ):
-                        try:
-                            updates[key] = fn()
-                        except Exception as exc:
-                            logger.debug("Update fetch '%s' failed: %s", key, exc)
-                            updates[key] = {}
-
-                    # Broadcast per-org so tenants only see their own data.
-                    # Collect unique org_ids from connected clients.
-                    org_ids = {
-                        conn.get("org_id", "default")
-                        for conn in active_connections.values()
-                    }
-
-                    for oid in org_ids:
-                        org_room = f"org-{oid}"
-                        self.socketio.emit(
-                            "dashboard_update",
-                            updates,
-                            namespace="/dashboard",
-                            to=org_room,
-                        )
-
-                        # Push incident update to SOC sub-room on change
-                        if incident_data["incident_count"] != self._prev_incident_count:
-                            self.socketio.emit(
-                                "incidents_update",
-                                incident_data,
-                                namespace="/dashboard",
-                                to=f"org-{oid}-soc",
-                            )
-
-                        # Push signal update to SOC sub-room on change
-                        signal_data = updates.get("signals", {})
-                        sig_count = (
-                            signal_data.get("signal_count", 0)
-                            if isinstance(signal_data, dict)
-                            else 0
-                        )
-                        if sig_count != self._prev_signal_count:
-                            self.socketio.emit(
-                                "signals_update",
-                                signal_data,
-                                namespace="/dashboard",
-                                to=f"org-{oid}-soc",
-                            )
-
-                    self._prev_incident_count = incident_data["incident_count"]
-                    self._prev_signal_count = (
-                        signal_data.get("signal_count", 0)
-                        if isinstance(signal_data, dict)
-                        else 0
+                time.sleep(_POLL_INTERVAL_SECONDS)
+                if not active_connections:
+                    continue
+
+                deltas = self.engine.tick()
+                for room, payload in deltas:
+                    self.socketio.emit(
+                        "dashboard_delta", payload, namespace="/dashboard", to=room
                     )
+                    if payload["dataset"] in self._prev_counts:
+                        self._push_soc(payload["dataset"])
 
-                    logger.debug(f"Sent updates to {len(active_connections)} clients")
+                if deltas:
+                    logger.debug("Pushed %d dataset deltas", len(deltas))
 
             except Exception as e:
                 logger.error(f"Error in update loop: {str(e)}")
                 time.sleep(1)  # Brief pause on error
 
+    def _push_soc(self, name: str) -> None:
+        """Legacy SOC events: full incident/signal list when the count changes."""
+        data = self.engine.current(SHARED_SCOPE, name)
+        if not isinstance(data, dict):
+            return
+        count = data.get("incident_count" if name == "incidents" else "signal_count", 0)
+        if count == self._prev_counts[name]:
+            return
+        self._prev_counts[name] = count
+        event = "incidents_update" if name == "incidents" else "signals_update"
+        org_ids = {
+            conn.get("org_id", "default") for conn in active_connections.values()
+        }
+        for oid in org_ids:
+            self.socketio.emit(event, data, namespace="/dashboard", to=f"org-{oid}-soc")
+
 
 # Global updater instance
-updater = DashboardUpdater(socketio)
+updater = DashboardUpdater(socketio, live_engine)
 
 
 @socketio.on("connect", namespace="/dashboard")
@@ -288,6 +325,12 @@ def handle_connect(_auth=None):
             if not result.is_valid:
                 logger.warning("WebSocket connect rejected: invalid session")
                 return False
+
+            # Resolve what this user may see once; datasets are computed
+            # per scope, not per client.
+            from .dashboard.org_scope import get_allowed_device_ids
+
+            device_ids, is_admin = get_allowed_device_ids(result.user)
     except Exception as e:
         logger.error("WebSocket auth check failed: %s", e)
         return False
@@ -296,11 +339,16 @@ def handle_connect(_auth=None):
 
     # Extract org_id from the validated session for room scoping
     user_org_id = getattr(result.user, "org_id", None) or "default"
+    scope = SHARED_SCOPE if is_admin else f"org-{user_org_id}"
+    live_engine.set_scope(scope, device_ids)
 
     active_connections[client_id] = {
         "connected_at": time.time(),
         "rooms": [],
         "org_id": user_org_id,
+        "scope": scope,
+        "dashboards": set(),
+        "datasets": set(),
     }
 
     # Auto-join the org-level room so broadcasts are tenant-scoped
@@ -312,21 +360,18 @@ def handle_connect(_auth=None):
     if len(active_connections) == 1:
         updater.start_updates()
 
-    # Send initial data
-    incident_data = _get_live_incidents()
-    initial_data = {
-        "threats": get_live_threats_data(),
-        "agents": get_live_agents_data(),
-        "metrics": get_live_metrics_data(),
-        "threat_score": calculate_threat_score(),
-        "events": get_event_clustering_data(),
-        "neural": get_neural_readiness_status(),
-        "incidents": incident_data["incidents"],
-        "incident_count": incident_data["incident_count"],
-        "timestamp": time.time(),
-    }
+    # Data follows on join_dashboard as a dashboard_snapshot
+
 
-    emit("initial_data", initial_data)
+def _emit_snapshot(conn: dict, names) -> None:
+    """Send the full current value of ``names`` to the requesting client."""
+    emit(
+        "dashboard_snapshot",
+        {
+            "datasets": live_engine.snapshot(conn["scope"], names),
+            "timestamp": time.time(),
+        },
+    )
 
 
 @socketio.on("disconnect", namespace="/dashboard")
@@ -340,8 +385,9 @@ def handle_disconnect(reason=None):
 
     client_id = flask_request.sid
 
-    if client_id in active_connections:
-        del active_connections[client_id]
+    conn = active_connections.pop(client_id, None)
+    if conn is not None:
+        live_engine.unsubscribe(conn["scope"], conn["datasets"])
         logger.info(f"Dashboard client disconnected: {client_id}")
 
     # Stop updater if no connections
@@ -363,8 +409,18 @@ def handle_join_dashboard(data):
 
     join_room(scoped_room)
 
-    if client_id in active_connections:
-        active_connections[client_id]["rooms"].append(scoped_room)
+    conn = active_connections.get(client_id)
+    if conn is None:
+        return
+    conn["rooms"].append(scoped_room)
+
+    # Subscribe to this page's datasets; deltas arrive via live-* rooms
+    names = DASHBOARD_DATASETS.get(dashboard_type, DASHBOARD_DATASETS["cortex"])
+    new = [n for n in names if n not in conn["datasets"]]
+    for room in live_engine.subscribe(conn["scope"], new):
+        join_room(room)
+    conn["datasets"].update(new)
+    conn["dashboards"].add(dashboard_type)
 
     logger.info(
         "Client %s joined dashboard: %s (room=%s)",
@@ -373,6 +429,7 @@ def handle_join_dashboard(data):
         scoped_room,
     )
     emit("joined_dashboard", {"dashboard": dashboard_type})
+    _emit_snapshot(conn, names)
 
 
 @socketio.on("leave_dashboard", namespace="/dashboard")
@@ -388,11 +445,21 @@ def handle_leave_dashboard(data):
 
     leave_room(scoped_room)
 
-    if (
-        client_id in active_connections
-        and scoped_room in active_connections[client_id]["rooms"]
-    ):
-        active_connections[client_id]["rooms"].remove(scoped_room)
+    conn = active_connections.get(client_id)
+    if conn is not None:
+        if scoped_room in conn["rooms"]:
+            conn["rooms"].remove(scoped_room)
+        conn["dashboards"].discard(dashboard_type)
+
+        # Drop datasets no remaining dashboard on this client needs
+        needed = set()
+        for dash in conn["dashboards"]:
+            needed.update(DASHBOARD_DATASETS.get(dash, DASHBOARD_DATASETS["cortex"]))
+        dropped = conn["datasets"] - needed
+        for name in dropped:
+            leave_room(live_engine.room(conn["scope"], name))
+        live_engine.unsubscribe(conn["scope"], dropped)
+        conn["datasets"] -= dropped
 
     logger.info("Client %s left dashboard: %s", client_id, dashboard_type)
     emit("left_dashboard", {"dashboard": dashboard_type})
@@ -400,52 +467,27 @@ def handle_leave_dashboard(data):
 
 @socketio.on("request_update", namespace="/dashboard")
 def handle_request_update(data):
-    """Handle manual update request from client"""
+    """Resend full snapshots (client resync after a seq gap, or manual refresh).
+
+    ``data`` may name ``datasets`` directly or a ``dashboard`` whose
+    datasets to resend; only datasets the client subscribed to are sent.
+    """
     from flask import request as flask_request
 
-    dashboard_type = data.get("dashboard", "all")
+    data = data or {}
     client_id = flask_request.sid
+    conn = active_connections.get(client_id)
+    if conn is None:
+        return
 
     try:
-        if dashboard_type == "all" or dashboard_type == "cortex":
-            updates = {
-                "threats": get_live_threats_data(),
-                "agents": get_live_agents_data(),
-                "metrics": get_live_metrics_data(),
-                "threat_score": calculate_threat_score(),
-                "timestamp": time.time(),
-            }
-            emit("dashboard_update", updates)
-
-        elif dashboard_type == "soc":
-            soc_incidents = _get_live_incidents()
-            updates = {
-                "threats": get_live_threats_data(),
-                "events": get_event_clustering_data(),
-                "incidents": soc_incidents["incidents"],
-                "incident_count": soc_incidents["incident_count"],
-                "timestamp": time.time(),
-            }
-            emit("soc_update", updates)
-
-        elif dashboard_type == "agents":
-            updates = {"agents": get_live_agents_data(), "timestamp": time.time()}
-            emit("agents_update", updates)
-
-        elif dashboard_type == "system":
-            updates = {"metrics": get_live_metrics_data(), "timestamp": time.time()}
-            emit("system_update", updates)
-
-        elif dashboard_type == "neural":
-            updates = {
-                "neural": get_neural_readiness_status(),
-                "timestamp": time.time(),
-            }
-            emit("neural_update", updates)
+        names = data.get("datasets")
+        if not names:
+            dashboard_type = data.get("dashboard", "all")
+            names = DASHBOARD_DATASETS.get(dashboard_type, sorted(conn["datasets"]))
+        _emit_snapshot(conn, [n for n in names if n in conn["datasets"]])
 
-        logger.debug(
-            f"Manual update sent to client {client_id} for dashboard {dashboard_type}"
-        )
+        logger.debug("Snapshot sent to client %s for %s", client_id, names)
 
     except Exception as e:
         logger.error(f"Error handling update request: {str(e)}")
@@ -463,6 +505,7 @@ def get_connection_stats():
     return {
         "active_connections": len(active_connections),
         "updater_running": updater.running,
+        "live": live_engine.stats(),
         "connections": {
             client_id: {
                 "connected_at": conn["connected_at"],